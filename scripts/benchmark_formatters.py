@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Report formatting benchmark
+Times the analysis formatters and message chunking on synthetic analyses
+
+Usage:
+    python scripts/benchmark_formatters.py                   # current tree
+    python scripts/benchmark_formatters.py --baseline HEAD~1 # compare with a git revision
+    python scripts/benchmark_formatters.py --stocks 50 --repeat 20 --json
+
+Analyses are produced by the real analysis pipeline on seeded random-walk
+price series, so no network access is needed. With --baseline, the
+formatter modules are loaded from that git revision as well, every output
+is checked to be byte-identical, and the speedup is reported.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import importlib.util
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.bot.services import analysis_service  # noqa: E402
+import src.bot.utils.formatters as bot_formatters  # noqa: E402
+import src.core.formatters as core_formatters  # noqa: E402
+
+HORIZONS = ['1week', '2weeks', '1month', '3months', '6months', '1year']
+MODES = ['balanced', 'conservative', 'aggressive']
+DRIFTS = [-0.003, -0.001, 0.0, 0.001, 0.002, 0.004]
+
+
+def synthetic_prices(seed: int, drift: float, days: int = 300) -> pd.DataFrame:
+    """Seeded random-walk OHLCV frame in the shape fetch_stock_data returns"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, 0.015, days)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(close * (1 + rng.uniform(0, 0.02, days)), np.maximum(open_, close))
+    low = np.minimum(close * (1 - rng.uniform(0, 0.02, days)), np.minimum(open_, close))
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close,
+         'volume': rng.integers(100_000, 1_000_000, days).astype(float)},
+        index=pd.bdate_range(end='2026-01-30', periods=days)
+    )
+
+
+def synthetic_analyses(count: int) -> List[Dict]:
+    """Run the analysis pipeline over `count` synthetic stocks"""
+    analyses = []
+    for i in range(count):
+        prices = synthetic_prices(i, DRIFTS[i % len(DRIFTS)])
+        with patch.object(analysis_service, 'fetch_stock_data', lambda symbol, period: prices):
+            analyses.append(analysis_service.analyze_stock(
+                f'SYN{i}.NS', mode=MODES[i % len(MODES)], horizon=HORIZONS[i % len(HORIZONS)]
+            ))
+    return analyses
+
+
+def load_baseline(revision: str, module_path: str) -> ModuleType:
+    """Load a module's source from a git revision under a private name"""
+    source = subprocess.run(
+        ['git', 'show', f'{revision}:{module_path}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    name = 'baseline_' + module_path.replace('/', '_').removesuffix('.py')
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader(name, loader=None))
+    exec(compile(source, f'{revision}:{module_path}', 'exec'), module.__dict__)
+    return module
+
+
+def workloads(core: ModuleType, bot: ModuleType, analyses: List[Dict]) -> Dict[str, Callable[[], list]]:
+    """Named callables rendering every analysis once"""
+    reports = [core.format_analysis_comprehensive(a, 'bot') for a in analyses]
+    long_text = '\n\n'.join(reports)
+    return {
+        'comprehensive (bot)': lambda: [core.format_analysis_comprehensive(a, 'bot') for a in analyses],
+        'comprehensive (cli)': lambda: [core.format_analysis_comprehensive(a, 'cli') for a in analyses],
+        'position sizing': lambda: [core.format_position_sizing(a, 100000, 'bot') for a in analyses],
+        'comparison table': lambda: [core.format_comparison_table(analyses, 'bot')],
+        'condensed alert': lambda: [bot.format_analysis_condensed(a) for a in analyses],
+        'full (bot utils)': lambda: [bot.format_analysis_full(a) for a in analyses],
+        'chunk reports': lambda: [core.chunk_message(r * 3) for r in reports],
+        'chunk digest': lambda: [core.chunk_message(long_text)],
+    }
+
+
+def time_workload(func: Callable[[], list], repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report formatting benchmark')
+    parser.add_argument('--stocks', type=int, default=30, help='Number of synthetic analyses')
+    parser.add_argument('--repeat', type=int, default=10, help='Timing repetitions (best is kept)')
+    parser.add_argument('--baseline', help='Git revision to compare against (e.g. HEAD~1)')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    analyses = synthetic_analyses(max(1, args.stocks))
+    current = workloads(core_formatters, bot_formatters, analyses)
+    baseline = None
+    if args.baseline:
+        baseline = workloads(
+            load_baseline(args.baseline, 'src/core/formatters.py'),
+            load_baseline(args.baseline, 'src/bot/utils/formatters.py'),
+            analyses
+        )
+
+    results = {}
+    for name, func in current.items():
+        row = {'current_ms': time_workload(func, args.repeat)}
+        if baseline:
+            if baseline[name]() != func():
+                raise SystemExit(f"Output of '{name}' differs from {args.baseline}")
+            row['baseline_ms'] = time_workload(baseline[name], args.repeat)
+            row['speedup'] = row['baseline_ms'] / row['current_ms']
+        results[name] = row
+
+    if args.json:
+        print(json.dumps({'stocks': len(analyses), 'baseline': args.baseline, 'results': results},
+                         indent=2, sort_keys=True))
+        return
+
+    print(f"\nFormatter benchmark: {len(analyses)} analyses, best of {args.repeat}")
+    if baseline:
+        print(f"Outputs identical to {args.baseline}\n")
+        print(f"  {'workload':<22} {'baseline ms':>12} {'current ms':>11} {'speedup':>8}")
+        for name, row in results.items():
+            print(f"  {name:<22} {row['baseline_ms']:>12.2f} {row['current_ms']:>11.2f} {row['speedup']:>7.2f}x")
+    else:
+        print()
+        for name, row in results.items():
+            print(f"  {name:<22} {row['current_ms']:>9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
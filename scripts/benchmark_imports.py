@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark
+Reports per-module import cost using the interpreter's -X importtime output
+
+Usage:
+    python scripts/benchmark_imports.py                      # src.bot.bot
+    python scripts/benchmark_imports.py src.bot.handlers.analyze --top 15
+    python scripts/benchmark_imports.py src.bot.bot --repeat 5 --json
+
+Each run imports the module in a fresh interpreter, so numbers reflect a
+cold start (after OS file caching). With --repeat, per-module figures are
+the median across runs.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_once(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    Import a module in a fresh interpreter
+
+    Args:
+        module: Dotted module path
+
+    Returns:
+        (wall seconds for the whole process, module -> (self_us, cumulative_us))
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return wall, timings
+
+
+def benchmark(module: str, repeat: int) -> Dict:
+    """
+    Median import timings over several cold runs
+
+    Args:
+        module: Dotted module path
+        repeat: Number of runs
+
+    Returns:
+        Dictionary with wall time, target cumulative time and per-module stats
+    """
+    walls: List[float] = []
+    samples: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for _ in range(repeat):
+        wall, timings = run_once(module)
+        walls.append(wall)
+        for name, values in timings.items():
+            samples[name].append(values)
+
+    modules = {
+        name: {
+            'self_ms': statistics.median(v[0] for v in values) / 1000,
+            'cumulative_ms': statistics.median(v[1] for v in values) / 1000,
+        }
+        for name, values in samples.items()
+    }
+
+    packages: Dict[str, float] = defaultdict(float)
+    for name, stats in modules.items():
+        packages[name.split('.')[0]] += stats['self_ms']
+
+    return {
+        'module': module,
+        'runs': repeat,
+        'process_wall_ms': statistics.median(walls) * 1000,
+        'import_ms': modules.get(module, {}).get('cumulative_ms', 0.0),
+        'modules': modules,
+        'packages': dict(packages),
+    }
+
+
+def print_report(result: Dict, top: int):
+    """Print the slowest modules and packages"""
+    print(f"\nImport benchmark: {result['module']} ({result['runs']} run(s), median)")
+    print(f"  Process start to import done: {result['process_wall_ms']:8.1f} ms")
+    print(f"  Import of target (cumulative): {result['import_ms']:8.1f} ms")
+
+    print(f"\nTop {top} packages by self time:")
+    for name, ms in sorted(result['packages'].items(), key=lambda x: -x[1])[:top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    print(f"\nTop {top} project modules by cumulative time:")
+    project = [(n, s) for n, s in result['modules'].items() if n.startswith('src.')]
+    for name, stats in sorted(project, key=lambda x: -x[1]['cumulative_ms'])[:top]:
+        print(f"  {stats['cumulative_ms']:8.1f} ms  (self {stats['self_ms']:6.1f})  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-module import time benchmark')
+    parser.add_argument('module', nargs='?', default='src.bot.bot', help='Module to import')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of cold runs')
+    parser.add_argument('--top', type=int, default=20, help='Rows per table')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of tables')
+    args = parser.parse_args()
+
+    result = benchmark(args.module, max(1, args.repeat))
+    if args.json:
+        print(json.dumps(result, indent=2, sort_keys=True))
+    else:
+        print_report(result, args.top)
+
+
+if __name__ == '__main__':
+    main()
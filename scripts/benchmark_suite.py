@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite
+Times the analysis, pattern, backtest, scan and formatting hot paths
+
+Usage:
+    python scripts/benchmark_suite.py                          # full suite, table
+    python scripts/benchmark_suite.py --quick                  # smaller sizes
+    python scripts/benchmark_suite.py --output bench.json      # save results
+    python scripts/benchmark_suite.py --compare bench.json     # flag regressions
+    python scripts/benchmark_suite.py --only indicators patterns --repeat 10
+
+Every workload runs on deterministic synthetic OHLCV data (random walks,
+up/down trends, gap-heavy series and flat stretches) and the data fetchers
+are stubbed, so no network access is needed and two runs on the same
+machine time exactly the same work. Results are written as JSON; with
+--compare, each workload's median is checked against a saved run and the
+script exits non-zero if any got slower by more than --threshold.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Benchmark scans must not write to the real scan archive
+os.environ['ENABLE_SCAN_ARCHIVE'] = 'false'
+
+from src.bot.services import analysis_service, backtest_service  # noqa: E402
+from src.bot.services.on_demand_analysis_service import OnDemandAnalysisService  # noqa: E402
+import src.bot.utils.formatters as bot_formatters  # noqa: E402
+import src.core.formatters as core_formatters  # noqa: E402
+from src.core import timing  # noqa: E402
+from src.core.indicators import calculate_all_indicators  # noqa: E402
+from src.core.patterns import detect_all_patterns  # noqa: E402
+
+REGIMES = ['random_walk', 'trend_up', 'trend_down', 'gaps', 'flat']
+HORIZONS = ['1week', '2weeks', '1month', '3months', '6months', '1year']
+MODES = ['balanced', 'conservative', 'aggressive']
+
+# Workload sizes (full, --quick)
+SIZES = {
+    'full': {'frames': 50, 'days': 300, 'scan_symbols': 4000, 'backtests': 3},
+    'quick': {'frames': 10, 'days': 300, 'scan_symbols': 200, 'backtests': 1},
+}
+DEFAULT_THRESHOLD = 0.15  # 15% slower median counts as a regression
+
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+
+def synthetic_ohlcv(seed: int, regime: str = 'random_walk', days: int = 300) -> pd.DataFrame:
+    """
+    Seeded OHLCV frame in the shape fetch_stock_data returns
+
+    Args:
+        seed: Random seed (same seed and regime give identical frames)
+        regime: One of REGIMES
+        days: Number of trading days
+
+    Returns:
+        OHLCV DataFrame indexed by business day
+    """
+    if regime not in REGIMES:
+        raise ValueError(f"Unknown regime '{regime}'. Must be one of: {', '.join(REGIMES)}")
+
+    rng = np.random.default_rng(seed)
+    drift = {'trend_up': 0.004, 'trend_down': -0.004}.get(regime, 0.0)
+    returns = rng.normal(drift, 0.015, days)
+
+    if regime == 'gaps':
+        # Occasional overnight gaps of 4-10% in either direction
+        gap_days = rng.random(days) < 0.05
+        returns[gap_days] += rng.choice([-1, 1], gap_days.sum()) * rng.uniform(0.04, 0.10, gap_days.sum())
+    elif regime == 'flat':
+        # Suspended/illiquid stretches where the price does not move at all
+        start = rng.integers(days // 4, days // 2)
+        returns[start:start + days // 5] = 0.0
+
+    close = 100 * np.exp(np.cumsum(returns))
+    open_ = np.r_[close[0], close[:-1]]
+    if regime == 'gaps':
+        open_ = open_ * np.exp(np.r_[0.0, returns[1:]] * 0.8)
+    wick = rng.uniform(0, 0.02, days)
+    volume = rng.integers(100_000, 1_000_000, days).astype(float)
+
+    high = np.maximum(open_, close) * (1 + wick)
+    low = np.minimum(open_, close) * (1 - wick)
+    if regime == 'flat':
+        still = np.r_[False, returns[1:] == 0.0]
+        open_[still] = high[still] = low[still] = close[still]
+        volume[still] = 0.0
+
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=pd.bdate_range(end='2026-01-30', periods=days)
+    )
+
+
+def synthetic_universe(count: int, days: int = 300) -> Dict[str, pd.DataFrame]:
+    """
+    Synthetic symbols cycling through all regimes
+
+    Args:
+        count: Number of symbols
+        days: Trading days per symbol
+
+    Returns:
+        Dictionary of symbol -> OHLCV frame
+    """
+    return {
+        f'SYN{i:04d}.NS': synthetic_ohlcv(i, REGIMES[i % len(REGIMES)], days)
+        for i in range(count)
+    }
+
+
+def stub_fetcher(universe: Dict[str, pd.DataFrame]) -> Callable:
+    """fetch_stock_data replacement serving frames from memory"""
+    def fetch(symbol: str, period: str = '1y') -> pd.DataFrame:
+        if symbol not in universe:
+            raise ValueError(f"No data for {symbol}")
+        return universe[symbol]
+    return fetch
+
+
+# =============================================================================
+# WORKLOADS
+# =============================================================================
+
+def _analyze_all(symbols: List[str]) -> List[Dict]:
+    return [
+        analysis_service.analyze_stock(
+            symbol, mode=MODES[i % len(MODES)], horizon=HORIZONS[i % len(HORIZONS)]
+        )
+        for i, symbol in enumerate(symbols)
+    ]
+
+
+def _scan(symbols: List[str]) -> List[Dict]:
+    """The on-demand market scan loop without the database round trips"""
+    service = OnDemandAnalysisService.__new__(OnDemandAnalysisService)
+    stocks = [{'ticker': s, 'sector': 'Synthetic', 'market_cap': 'Large Cap'} for s in symbols]
+    return asyncio.run(service._analyze_stocks(stocks, min_confidence=0.0, min_risk_reward=0.0))
+
+
+def build_workloads(sizes: Dict) -> Dict[str, Dict]:
+    """
+    Named workloads with their inputs prepared
+
+    Args:
+        sizes: Entry of SIZES
+
+    Returns:
+        Dictionary of name -> {'func', 'items', 'repeat_scale'}
+    """
+    frames = synthetic_universe(sizes['frames'], sizes['days'])
+    symbols = list(frames)
+    scan_universe = synthetic_universe(sizes['scan_symbols'], sizes['days'])
+    backtest_symbols = symbols[:sizes['backtests']]
+
+    with patch.object(analysis_service, 'fetch_stock_data', stub_fetcher(frames)):
+        analyses = _analyze_all(symbols)
+    reports = [core_formatters.format_analysis_comprehensive(a, 'bot') for a in analyses]
+
+    return {
+        'indicators': {
+            'func': lambda: [calculate_all_indicators(df, 'medium') for df in frames.values()],
+            'items': len(frames), 'repeat_scale': 1.0,
+        },
+        'patterns': {
+            'func': lambda: [detect_all_patterns(df) for df in frames.values()],
+            'items': len(frames), 'repeat_scale': 1.0,
+        },
+        'analyze_stock': {
+            'func': lambda: _analyze_all(symbols),
+            'patch': (analysis_service, stub_fetcher(frames)),
+            'items': len(symbols), 'repeat_scale': 1.0,
+        },
+        'backtest': {
+            'func': lambda: [backtest_service.backtest_strategy(s, 365, timeframe='short') for s in backtest_symbols],
+            'patch': (backtest_service, stub_fetcher(frames)),
+            'items': len(backtest_symbols), 'repeat_scale': 0.0,
+        },
+        'scan': {
+            'func': lambda: _scan(list(scan_universe)),
+            'patch': (analysis_service, stub_fetcher(scan_universe)),
+            'items': len(scan_universe), 'repeat_scale': 0.0,
+        },
+        'formatters': {
+            'func': lambda: [
+                (core_formatters.format_analysis_comprehensive(a, 'bot'),
+                 core_formatters.format_position_sizing(a, 100000, 'bot'),
+                 bot_formatters.format_analysis_condensed(a))
+                for a in analyses
+            ] + [core_formatters.format_comparison_table(analyses, 'bot'),
+                 core_formatters.chunk_message('\n\n'.join(reports))],
+            'items': len(analyses), 'repeat_scale': 1.0,
+        },
+    }
+
+
+def run_workload(workload: Dict, repeat: int) -> Dict:
+    """
+    Time one workload
+
+    Slow workloads (repeat_scale 0) run once without a warm-up; the others
+    run once to warm caches and then `repeat` times.
+
+    Args:
+        workload: Entry of build_workloads()
+        repeat: Timed repetitions for fast workloads
+
+    Returns:
+        Timing statistics in milliseconds
+    """
+    runs = max(1, int(round(repeat * workload['repeat_scale'])))
+    target = workload.get('patch')
+
+    def call():
+        # The backtest prints per-day errors during warm-up
+        with contextlib.redirect_stdout(io.StringIO()):
+            if target is None:
+                return workload['func']()
+            with patch.object(target[0], 'fetch_stock_data', target[1]):
+                return workload['func']()
+
+    if workload['repeat_scale']:
+        call()
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(samples)
+    return {
+        'runs': runs,
+        'items': workload['items'],
+        'best_ms': round(min(samples), 3),
+        'median_ms': round(median, 3),
+        'per_item_ms': round(median / max(1, workload['items']), 4),
+    }
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> Dict[str, Dict]:
+    """
+    Compare per-item medians with a saved run
+
+    Args:
+        current: Results of this run
+        baseline: Results loaded from a previous run
+        threshold: Allowed slowdown as a fraction (0.15 = 15%)
+
+    Returns:
+        Dictionary of workload -> {'baseline_ms', 'current_ms', 'change', 'regression'}
+        for workloads present in both runs
+    """
+    rows = {}
+    for name, row in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        change = row['per_item_ms'] / base['per_item_ms'] - 1 if base['per_item_ms'] else 0.0
+        rows[name] = {
+            'baseline_ms': base['per_item_ms'],
+            'current_ms': row['per_item_ms'],
+            'change': round(change, 4),
+            'regression': change > threshold,
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite')
+    parser.add_argument('--quick', action='store_true', help='Smaller workloads for a fast check')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions for fast workloads')
+    parser.add_argument('--only', nargs='+', metavar='WORKLOAD', help='Run only these workloads')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Results JSON from an earlier run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed per-item slowdown before flagging (fraction)')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    # The scan logs every symbol; keep the output readable
+    logging.disable(logging.WARNING)
+
+    profile = 'quick' if args.quick else 'full'
+    workloads = build_workloads(SIZES[profile])
+    if args.only:
+        unknown = set(args.only) - set(workloads)
+        if unknown:
+            parser.error(f"Unknown workloads: {', '.join(sorted(unknown))} (choose from {', '.join(workloads)})")
+        workloads = {name: w for name, w in workloads.items() if name in args.only}
+
+    timing.reset()
+    timing.enable()
+    results = {}
+    for name, workload in workloads.items():
+        if not args.json:
+            print(f"  running {name}...", file=sys.stderr)
+        results[name] = run_workload(workload, args.repeat)
+    stages = timing.snapshot('analysis.')
+    timing.disable()
+
+    report = {
+        'meta': {
+            'profile': profile,
+            'sizes': SIZES[profile],
+            'repeat': args.repeat,
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+        'stages': stages,
+    }
+
+    comparison = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('profile') != profile:
+            print(f"Warning: baseline profile is {baseline.get('meta', {}).get('profile')}, this run is {profile}",
+                  file=sys.stderr)
+        comparison = compare(report, baseline, args.threshold)
+        report['comparison'] = {'baseline': args.compare, 'threshold': args.threshold, 'workloads': comparison}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        meta = report['meta']
+        print(f"\nBenchmark suite ({profile}) at {meta['revision'] or 'working tree'}, Python {meta['python']}\n")
+        print(f"  {'workload':<14} {'items':>6} {'runs':>5} {'median ms':>11} {'per item ms':>12}")
+        for name, row in results.items():
+            print(f"  {name:<14} {row['items']:>6} {row['runs']:>5} {row['median_ms']:>11.1f} {row['per_item_ms']:>12.3f}")
+        if stages:
+            print("\n  analysis stages (p50 / p95 ms)")
+            for name, row in stages.items():
+                print(f"    {name:<24} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f}")
+        if comparison:
+            print(f"\n  vs {args.compare} (threshold {args.threshold:.0%})")
+            for name, row in comparison.items():
+                flag = '  REGRESSION' if row['regression'] else ''
+                print(f"    {name:<14} {row['baseline_ms']:>10.3f} -> {row['current_ms']:>10.3f} {row['change']:>+8.1%}{flag}")
+
+    if comparison and any(row['regression'] for row in comparison.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Pattern reliability calibration
+Measures chart pattern hit rates and time to target over a universe's history
+
+Usage:
+    python scripts/calibrate_patterns.py --universe data/stock_tickers_enhanced.csv \\
+        --period 10y --workers 8 --cache /tmp/history.pkl
+    python scripts/calibrate_patterns.py --symbols RELIANCE.NS TCS.NS --dry-run
+    python scripts/calibrate_patterns.py --synthetic 50 --output-dir /tmp/calibration
+
+Each run writes the next pattern_calibration_vNNNN.json to the calibration
+directory (data/pattern_calibration by default, or PATTERN_CALIBRATION_DIR).
+get_pattern_horizon uses the newest version; delete it to roll back. With
+--events, every detected pattern and its outcome are also written as CSV.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from parameter_sweep import load_histories  # noqa: E402
+from src.cli.stock_analyzer_pro import load_universe  # noqa: E402
+from src.core.config import PATTERN_HORIZONS, DEFAULT_PATTERN_HORIZON  # noqa: E402
+from src.core.pattern_calibration import (  # noqa: E402
+    CALIBRATION_DIR, DEFAULT_MAX_BARS, DEFAULT_MIN_EVENTS, calibrate_patterns, save_calibration
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pattern reliability calibration')
+    data = parser.add_mutually_exclusive_group(required=True)
+    data.add_argument('--symbols', nargs='+', help='Symbols to calibrate on')
+    data.add_argument('--universe', '-u', help='Universe file (CSV with a ticker column or plain list)')
+    data.add_argument('--synthetic', type=int, metavar='N', help='Use N synthetic histories (offline)')
+    parser.add_argument('--period', default='10y', help='History period to fetch (default: 10y)')
+    parser.add_argument('--cache', help='Pickle file to read and store fetched histories')
+
+    parser.add_argument('--max-bars', type=int, default=DEFAULT_MAX_BARS,
+                        help='Bars to follow each pattern before it expires')
+    parser.add_argument('--min-events', type=int, default=DEFAULT_MIN_EVENTS,
+                        help='Resolved events needed to replace a pattern\'s static values')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--output-dir', default=CALIBRATION_DIR, help='Calibration table directory')
+    parser.add_argument('--events', help='Also write every pattern event to this CSV file')
+    parser.add_argument('--dry-run', action='store_true', help='Print the table without saving it')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from benchmark_suite import synthetic_universe
+        histories = synthetic_universe(args.synthetic, days=2500)
+    else:
+        if args.symbols:
+            symbols = [symbol.upper() for symbol in args.symbols]
+        else:
+            symbols = [stock['ticker'] for stock in load_universe(args.universe)]
+        histories = load_histories(symbols, args.period, args.cache)
+    if not histories:
+        parser.error('No price histories to calibrate on')
+
+    logging.disable(logging.WARNING)
+    print(f"  calibrating on {len(histories)} symbols with {args.workers} worker(s)...", file=sys.stderr)
+    started = time.perf_counter()
+
+    def progress(done, total):
+        print(f"\r  {done}/{total} symbols", end='', file=sys.stderr, flush=True)
+
+    table, events = calibrate_patterns(
+        histories, max_bars=args.max_bars, min_events=args.min_events,
+        workers=args.workers, progress=progress
+    )
+    print(f"\n  {len(events)} pattern events over {table['bars']} bars "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    if args.events and events:
+        with open(args.events, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(events[0]))
+            writer.writeheader()
+            writer.writerows(events)
+
+    print(f"\n  {'pattern':<38} {'events':>6} {'hit':>5} {'fail':>5} {'exp':>4} "
+          f"{'reliability':>16} {'days (p25-p75)':>16}")
+    for name, stats in table['patterns'].items():
+        static = PATTERN_HORIZONS.get(name, DEFAULT_PATTERN_HORIZON)
+        reliability = f"{stats['reliability']:.0%}" if stats['reliability'] is not None else '-'
+        days = f"{stats['min_days']}-{stats['max_days']}" if stats['min_days'] is not None else '-'
+        flag = '' if stats['calibrated'] else '  (too few)'
+        print(f"  {name:<38} {stats['events']:>6} {stats['hit']:>5} {stats['failed']:>5} {stats['expired']:>4} "
+              f"{reliability:>6} (was {static['reliability']:.0%}) "
+              f"{days:>7} (was {static['min_days']}-{static['max_days']}){flag}")
+
+    if not args.dry_run:
+        path = save_calibration(table, args.output_dir)
+        print(f"\n  saved {path}")
+
+
+if __name__ == '__main__':
+    main()
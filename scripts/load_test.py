@@ -0,0 +1,791 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test
+Drives the real bot handlers with simulated users, Bot API and market data
+
+Usage:
+    python scripts/load_test.py                                 # 500 users, default mix
+    python scripts/load_test.py --users 100 --ramp 10 --json
+    python scripts/load_test.py --mix analyze=5,scan=1,papertrade=4 --concurrency 8
+    python scripts/load_test.py --replay-dir data/replay --fetch-latency-ms 300
+
+The application comes from create_bot_application(), with two replacements:
+- A simulated Bot API (SimulatedBotAPI). It records every call, adds
+  network latency and enforces Telegram's flood limits, answering with 429s
+  like the real API.
+- A timed update processor that keeps the production concurrency (one
+  update at a time unless --concurrency says otherwise).
+Synthetic Update objects go through the application's update queue exactly
+as polled updates would.
+
+yahooquery.Ticker is replaced by a replay provider. It serves CSV files
+from --replay-dir when present and deterministic synthetic history
+otherwise, with optional per-request latency. The morning jobs (pending
+trade execution, BUY execution, position monitoring and alert checks) run
+periodically while the users are active.
+
+The report covers, per command step:
+- latency percentiles: time to first reply, queue wait and total
+- throughput, errors and rate-limited requests
+- event-loop lag
+- SQLite statement times, including time spent waiting for the shared
+  connection or database lock
+- Bot API calls and 429s
+
+Everything runs offline against a throwaway database.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# The bot reads its configuration at import time: point it at a throwaway
+# database and a dummy token before anything from src is imported (worker
+# processes re-import this module and inherit the same database)
+if 'LOADTEST_DATABASE_URL' not in os.environ:
+    os.environ['LOADTEST_DATABASE_URL'] = f"sqlite:///{tempfile.mkdtemp(prefix='loadtest_')}/loadtest.db"
+os.environ['DATABASE_URL'] = os.environ['LOADTEST_DATABASE_URL']
+os.environ['TELEGRAM_BOT_TOKEN'] = '123456:LOADTEST'
+os.environ['TELEGRAM_ADMIN_IDS'] = ''
+os.environ['RATE_LIMIT_STATE_FILE'] = ''
+os.environ['INTRADAY_INDICATOR_STATE_FILE'] = ''
+os.environ['ENABLE_SCAN_ARCHIVE'] = 'false'
+
+from sqlalchemy import event  # noqa: E402
+from telegram import Update  # noqa: E402
+from telegram.ext import BaseUpdateProcessor  # noqa: E402
+from telegram.request import BaseRequest, RequestData  # noqa: E402
+
+from scripts.benchmark_suite import REGIMES, synthetic_ohlcv  # noqa: E402
+from src.bot.bot import create_bot_application  # noqa: E402
+from src.bot.database import db as bot_db  # noqa: E402
+from src.bot.services.on_demand_analysis_service import OnDemandAnalysisService  # noqa: E402
+
+BOT_USER = {'id': 123456, 'is_bot': True, 'first_name': 'LoadTest', 'username': 'loadtest_bot'}
+FIRST_USER_ID = 10_000_000
+
+# Symbols users ask about (kept small so per-symbol caches behave like a real morning)
+SYMBOLS = [
+    'RELIANCE.NS', 'TCS.NS', 'INFY.NS', 'HDFCBANK.NS', 'ICICIBANK.NS', 'SBIN.NS',
+    'ITC.NS', 'LT.NS', 'AXISBANK.NS', 'BHARTIARTL.NS', 'MARUTI.NS', 'TATAMOTORS.NS',
+    'SUNPHARMA.NS', 'WIPRO.NS', 'HCLTECH.NS', 'ASIANPAINT.NS', 'KOTAKBANK.NS', 'TITAN.NS',
+]
+
+# Scenario name -> steps. '/...' steps are commands, others are button presses
+# (callback data); {symbol} is filled per user.
+SCENARIOS: Dict[str, List[str]] = {
+    'analyze': ['/analyze {symbol}'],
+    'scan': ['/scanmarket', 'scan_analyze'],
+    'papertrade': ['/papertrade start', '/papertrade status', 'papertrade_stock:{symbol}'],
+}
+DEFAULT_MIX = 'analyze=6,scan=1,papertrade=3'
+
+RATE_LIMITED_TEXT = 'Rate limit exceeded'
+
+# Bot API methods that count against Telegram's flood limits
+LIMITED_METHODS = {
+    'sendMessage', 'sendPhoto', 'sendDocument', 'sendMediaGroup', 'copyMessage', 'forwardMessage',
+    'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup', 'editMessageMedia',
+}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of millisecond samples"""
+    if not samples:
+        return {'count': 0}
+    values = np.asarray(samples)
+    return {
+        'count': len(samples),
+        'p50_ms': round(float(np.percentile(values, 50)), 1),
+        'p95_ms': round(float(np.percentile(values, 95)), 1),
+        'p99_ms': round(float(np.percentile(values, 99)), 1),
+        'max_ms': round(float(values.max()), 1),
+    }
+
+
+# =============================================================================
+# SIMULATED BOT API
+# =============================================================================
+
+class _Bucket:
+    """Token bucket refilled continuously"""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def wait(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class SimulatedBotAPI(BaseRequest):
+    """
+    In-process stand-in for api.telegram.org
+
+    Sending and editing methods are limited per chat and globally. Requests
+    over a limit get a 429 with retry_after, like the real API.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        on_send: Optional[Callable[[int, str, Dict], None]] = None
+    ):
+        """
+        Initialize simulated API
+
+        Args:
+            latency: Seconds added to every call
+            global_rate: Messages per second across all chats
+            chat_rate: Messages per second per chat
+            chat_burst: Messages a chat may send back to back
+            on_send: Called with (chat_id, method, parameters) for every accepted send
+        """
+        self.latency = latency
+        self.on_send = on_send
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._global = _Bucket(global_rate, global_rate, time.monotonic())
+        self._chats: Dict[int, _Bucket] = {}
+        self._message_ids = itertools.count(1_000_000)
+
+        self.calls: Counter = Counter()
+        self.rejected: Counter = Counter()
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return 5.0
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _throttle(self, chat_id: int) -> float:
+        """Consume a send token, or return the retry delay"""
+        now = time.monotonic()
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = _Bucket(self._chat_rate, self._chat_burst, now)
+        wait = max(bucket.wait(now), self._global.wait(now))
+        if wait:
+            return wait
+        bucket.tokens -= 1
+        self._global.tokens -= 1
+        return 0.0
+
+    def _message(self, chat_id: int, params: Dict, message_id: Optional[int] = None) -> Dict:
+        return {
+            'message_id': message_id or next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+            'text': params.get('text') or params.get('caption') or '',
+        }
+
+    def _result(self, method: str, chat_id: int, params: Dict):
+        if method == 'getMe':
+            return BOT_USER
+        if method.startswith('send') and method != 'sendChatAction' or method in ('copyMessage', 'forwardMessage'):
+            return self._message(chat_id, params)
+        if method.startswith('edit'):
+            if params.get('inline_message_id'):
+                return True
+            return self._message(chat_id, params, params.get('message_id'))
+        return True
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=BaseRequest.DEFAULT_NONE,
+        write_timeout=BaseRequest.DEFAULT_NONE,
+        connect_timeout=BaseRequest.DEFAULT_NONE,
+        pool_timeout=BaseRequest.DEFAULT_NONE,
+    ) -> Tuple[int, bytes]:
+        api_method = url.rsplit('/', 1)[-1]
+        params = request_data.parameters if request_data is not None else {}
+        self.calls[api_method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        try:
+            chat_id = int(params.get('chat_id', 0))
+        except (TypeError, ValueError):
+            chat_id = 0
+
+        if api_method in LIMITED_METHODS:
+            retry_after = self._throttle(chat_id)
+            if retry_after:
+                self.rejected[api_method] += 1
+                body = {
+                    'ok': False, 'error_code': 429,
+                    'description': f'Too Many Requests: retry after {math.ceil(retry_after)}',
+                    'parameters': {'retry_after': math.ceil(retry_after)},
+                }
+                return 429, json.dumps(body).encode()
+            if self.on_send:
+                self.on_send(chat_id, api_method, params)
+        elif api_method == 'answerCallbackQuery' and self.on_send:
+            self.on_send(0, api_method, params)
+
+        body = {'ok': True, 'result': self._result(api_method, chat_id, params)}
+        return 200, json.dumps(body).encode()
+
+
+# =============================================================================
+# REPLAY MARKET DATA
+# =============================================================================
+
+PERIOD_DAYS = {'1d': 1, '5d': 5, '1mo': 21, '3mo': 63, '6mo': 126, '1y': 252, '2y': 504, '5y': 1260, 'max': 1260}
+
+
+class ReplayMarket:
+    """Daily history per symbol from CSV files or deterministic synthesis"""
+
+    def __init__(self, replay_dir: Optional[str] = None, days: int = 600, latency: float = 0.0):
+        """
+        Initialize provider
+
+        Args:
+            replay_dir: Directory of <SYMBOL>.csv files (date index, lowercase OHLCV)
+            days: Length of synthesized histories
+            latency: Seconds each history request blocks (simulated network)
+        """
+        self.replay_dir = Path(replay_dir) if replay_dir else None
+        self.days = days
+        self.latency = latency
+        self.requests = 0
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def daily(self, symbol: str) -> pd.DataFrame:
+        """Full daily history for a symbol"""
+        with self._lock:
+            frame = self._frames.get(symbol)
+        if frame is not None:
+            return frame
+
+        path = self.replay_dir / f'{symbol}.csv' if self.replay_dir else None
+        if path is not None and path.exists():
+            frame = pd.read_csv(path, index_col=0, parse_dates=True)
+            frame.columns = [c.lower() for c in frame.columns]
+        else:
+            seed = zlib.crc32(symbol.encode())
+            frame = synthetic_ohlcv(seed, REGIMES[seed % len(REGIMES)], self.days)
+
+        with self._lock:
+            self._frames[symbol] = frame
+        return frame
+
+    def ticker_class(self):
+        """yahooquery.Ticker replacement bound to this provider"""
+        market = self
+
+        class ReplayTicker:
+            def __init__(self, symbols, **kwargs):
+                self.symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+
+            def history(self, period: str = '1y', interval: str = '1d', **kwargs) -> pd.DataFrame:
+                market.requests += 1
+                if market.latency:
+                    time.sleep(market.latency)
+                days = PERIOD_DAYS.get(period, 252)
+                frames = {symbol: market.daily(symbol).tail(days) for symbol in self.symbols}
+                return pd.concat(frames, names=['symbol', 'date'])
+
+            @property
+            def quote_type(self) -> Dict:
+                return {s: {'longName': s.split('.')[0], 'exchange': 'NSI'} for s in self.symbols}
+
+        return ReplayTicker
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+class TimedUpdateProcessor(BaseUpdateProcessor):
+    """Update processor that reports when each update starts and finishes"""
+
+    def __init__(self, max_concurrent_updates: int, on_start: Callable, on_done: Callable):
+        super().__init__(max_concurrent_updates)
+        self.on_start = on_start
+        self.on_done = on_done
+
+    async def do_process_update(self, update, coroutine):
+        self.on_start(update)
+        try:
+            await coroutine
+        finally:
+            self.on_done(update)
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+class LoadRecorder:
+    """Per-step latency, reply and error bookkeeping"""
+
+    def __init__(self):
+        self._pending: Dict[int, Dict] = {}
+        self._chat_pending: Dict[int, Dict] = {}
+        self.queue_wait = defaultdict(list)
+        self.service = defaultdict(list)
+        self.total = defaultdict(list)
+        self.first_reply = defaultdict(list)
+        self.completed: Counter = Counter()
+        self.timeouts: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.error_types: Counter = Counter()
+        self.throttled: Counter = Counter()
+
+    def submitted(self, update_id: int, label: str, chat_id: int) -> asyncio.Event:
+        entry = {'label': label, 'chat_id': chat_id, 'enqueued': time.perf_counter(),
+                 'replied': False, 'done': asyncio.Event()}
+        self._pending[update_id] = entry
+        self._chat_pending[chat_id] = entry
+        return entry['done']
+
+    def started(self, update):
+        entry = self._pending.get(update.update_id)
+        if entry:
+            entry['started'] = time.perf_counter()
+            self.queue_wait[entry['label']].append((entry['started'] - entry['enqueued']) * 1000)
+
+    def finished(self, update):
+        entry = self._pending.pop(update.update_id, None)
+        if not entry:
+            return
+        now = time.perf_counter()
+        label = entry['label']
+        self.service[label].append((now - entry.get('started', now)) * 1000)
+        self.total[label].append((now - entry['enqueued']) * 1000)
+        self.completed[label] += 1
+        entry['done'].set()
+
+    def timed_out(self, update_id: int):
+        entry = self._pending.pop(update_id, None)
+        if entry:
+            self.timeouts[entry['label']] += 1
+
+    def on_send(self, chat_id: int, method: str, params: Dict):
+        entry = self._chat_pending.get(chat_id)
+        text = str(params.get('text') or '')
+        if entry is None:
+            return
+        if RATE_LIMITED_TEXT in text:
+            self.throttled[entry['label']] += 1
+        if not entry['replied']:
+            entry['replied'] = True
+            self.first_reply[entry['label']].append((time.perf_counter() - entry['enqueued']) * 1000)
+
+    async def on_error(self, update, context):
+        label = 'background'
+        if isinstance(update, Update):
+            entry = self._pending.get(update.update_id)
+            label = entry['label'] if entry else 'unknown'
+        self.errors[label] += 1
+        self.error_types[type(context.error).__name__] += 1
+
+
+class EventLoopMonitor:
+    """Measures how late the event loop wakes a sleeping task"""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.lag: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.append(max(0.0, loop.time() - expected) * 1000)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class DatabaseMonitor:
+    """
+    Statement timings from SQLAlchemy engine events
+
+    The bot shares one SQLite connection across threads, so statement time
+    includes waiting for that connection and for the database lock.
+    """
+
+    SLOW_MS = 100
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.reads: List[float] = []
+        self.writes: List[float] = []
+        self.locked = 0
+        self._local = threading.local()
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(self._local, 'start', None)
+        if start is None:
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        kind = statement.lstrip()[:6].upper()
+        (self.reads if kind in ('SELECT', 'PRAGMA') else self.writes).append(elapsed)
+
+    def _error(self, context):
+        if 'locked' in str(context.original_exception).lower():
+            self.locked += 1
+
+    def attach(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before)
+        event.listen(self.engine, 'after_cursor_execute', self._after)
+        event.listen(self.engine, 'handle_error', self._error)
+
+    def detach(self):
+        event.remove(self.engine, 'before_cursor_execute', self._before)
+        event.remove(self.engine, 'after_cursor_execute', self._after)
+        event.remove(self.engine, 'handle_error', self._error)
+
+    def summary(self) -> Dict:
+        return {
+            'reads': percentiles(self.reads),
+            'writes': percentiles(self.writes),
+            'slow_statements': sum(1 for ms in self.reads + self.writes if ms >= self.SLOW_MS),
+            'locked_errors': self.locked,
+        }
+
+
+# =============================================================================
+# SIMULATED USERS
+# =============================================================================
+
+class UpdateFactory:
+    """Builds Update objects the way Telegram would deliver them"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    @staticmethod
+    def _user(user_id: int) -> Dict:
+        return {'id': user_id, 'is_bot': False, 'first_name': f'Load{user_id}', 'username': f'load{user_id}'}
+
+    def _message(self, user_id: int, text: str) -> Dict:
+        message = {
+            'message_id': next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            'text': text,
+        }
+        if text.startswith('/'):
+            message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+        return message
+
+    def command(self, user_id: int, text: str) -> Update:
+        data = {'update_id': next(self._update_ids), 'message': self._message(user_id, text)}
+        return Update.de_json(data, self.bot)
+
+    def button(self, user_id: int, callback_data: str) -> Update:
+        message = self._message(user_id, 'menu')
+        message['from'] = BOT_USER
+        data = {
+            'update_id': next(self._update_ids),
+            'callback_query': {
+                'id': str(next(self._update_ids)),
+                'from': self._user(user_id),
+                'chat_instance': str(user_id),
+                'data': callback_data,
+                'message': message,
+            },
+        }
+        return Update.de_json(data, self.bot)
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """'analyze=6,scan=1' -> normalized weights"""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}'. Must be one of: {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def step_label(step: str) -> str:
+    """Report label of a scenario step ('/analyze {symbol}' -> '/analyze')"""
+    return step.split('{')[0].rstrip(' :')
+
+
+async def run_user(
+    application, factory: UpdateFactory, recorder: LoadRecorder, user_id: int,
+    steps: List[str], symbol: str, start_delay: float, think: float, timeout: float, rng: random.Random
+):
+    """One closed-loop user: each step waits for the previous one to finish"""
+    await asyncio.sleep(start_delay)
+    for step in steps:
+        text = step.format(symbol=symbol)
+        update = factory.command(user_id, text) if step.startswith('/') else factory.button(user_id, text)
+        done = recorder.submitted(update.update_id, step_label(step), user_id)
+        await application.update_queue.put(update)
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        except asyncio.TimeoutError:
+            recorder.timed_out(update.update_id)
+            return
+        await asyncio.sleep(rng.expovariate(1 / think) if think > 0 else 0)
+
+
+async def run_morning_jobs(application, interval: float, stop: asyncio.Event, durations: Dict[str, List[float]]):
+    """Run the market-open jobs repeatedly until stopped"""
+    from src.bot.services.alert_service import AlertService
+    from src.bot.services.paper_trading_scheduler import PaperTradingScheduler
+
+    alert_service = AlertService(application.bot)
+    paper = PaperTradingScheduler(application)
+    jobs = {
+        'execute_pending_trades': paper._execute_pending_trades,
+        'execute_buy_signals': paper._execute_buy_signals,
+        'monitor_positions': paper._monitor_positions,
+        'check_alerts': alert_service.check_all_alerts,
+    }
+
+    async def timed(name, job):
+        start = time.perf_counter()
+        try:
+            await job()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Job {name} failed: {e}")
+        durations[name].append((time.perf_counter() - start) * 1000)
+
+    while not stop.is_set():
+        await asyncio.gather(*(timed(name, job) for name, job in jobs.items()))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+# =============================================================================
+# RUN
+# =============================================================================
+
+async def run_load_test(args) -> Dict:
+    """Run one load test and return the report"""
+    recorder = LoadRecorder()
+    api = SimulatedBotAPI(
+        latency=args.api_latency_ms / 1000, global_rate=args.global_rate,
+        chat_rate=args.chat_rate, chat_burst=args.chat_burst, on_send=recorder.on_send
+    )
+    processor = TimedUpdateProcessor(args.concurrency, recorder.started, recorder.finished)
+    application = create_bot_application(request=api, update_processor=processor)
+    application.add_error_handler(recorder.on_error)
+
+    bot_db.init_db()
+    db_monitor = DatabaseMonitor(bot_db.engine)
+    loop_monitor = EventLoopMonitor()
+    factory = UpdateFactory(application.bot)
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    sessions = []
+    for i in range(args.users):
+        scenario = rng.choices(names, weights)[0]
+        sessions.append((FIRST_USER_ID + i, scenario, rng.choice(SYMBOLS), rng.uniform(0, args.ramp)))
+
+    job_durations = defaultdict(list)
+    stop_jobs = asyncio.Event()
+
+    await application.initialize()
+    await application.start()
+    db_monitor.attach()
+    loop_monitor.start()
+    jobs_task = asyncio.create_task(
+        run_morning_jobs(application, args.job_interval, stop_jobs, job_durations)
+    ) if args.jobs else None
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            run_user(application, factory, recorder, user_id, SCENARIOS[scenario], symbol,
+                     delay, args.think, args.timeout, random.Random(user_id))
+            for user_id, scenario, symbol, delay in sessions
+        ))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop_jobs.set()
+        if jobs_task:
+            await jobs_task
+        await loop_monitor.stop()
+        db_monitor.detach()
+        await application.stop()
+        await application.shutdown()
+
+    steps = {}
+    for label in sorted(set(recorder.completed) | set(recorder.timeouts) | set(recorder.first_reply)):
+        steps[label] = {
+            'completed': recorder.completed[label],
+            'timeouts': recorder.timeouts[label],
+            'errors': recorder.errors[label],
+            'rate_limited': recorder.throttled[label],
+            'throughput_per_s': round(recorder.completed[label] / elapsed, 3),
+            'first_reply': percentiles(recorder.first_reply[label]),
+            'queue_wait': percentiles(recorder.queue_wait[label]),
+            'total': percentiles(recorder.total[label]),
+        }
+
+    return {
+        'config': {
+            'users': args.users, 'mix': mix, 'ramp_s': args.ramp, 'think_s': args.think,
+            'concurrency': args.concurrency, 'api_latency_ms': args.api_latency_ms,
+            'fetch_latency_ms': args.fetch_latency_ms, 'scan_universe': args.scan_universe,
+            'jobs': args.jobs, 'seed': args.seed,
+        },
+        'duration_s': round(elapsed, 2),
+        'updates_per_s': round(sum(recorder.completed.values()) / elapsed, 3),
+        'steps': steps,
+        'event_loop_lag': percentiles(loop_monitor.lag),
+        'database': db_monitor.summary(),
+        'bot_api': {'calls': dict(api.calls), 'rejected_429': dict(api.rejected)},
+        'errors': {'by_step': dict(recorder.errors), 'by_type': dict(recorder.error_types)},
+        'jobs': {name: percentiles(samples) for name, samples in job_durations.items()},
+    }
+
+
+def print_report(report: Dict):
+    """Human-readable summary"""
+    config = report['config']
+    print(f"\nLoad test: {config['users']} users over {config['ramp_s']}s ramp, "
+          f"concurrency {config['concurrency']}, {report['duration_s']}s, "
+          f"{report['updates_per_s']} updates/s\n")
+    print(f"  {'step':<24} {'done':>5} {'t/o':>4} {'err':>4} {'429/rl':>6} "
+          f"{'reply p50':>10} {'reply p95':>10} {'queue p95':>10} {'total p95':>10} {'total max':>10}")
+    for label, row in report['steps'].items():
+        reply, queue, total = row['first_reply'], row['queue_wait'], row['total']
+        print(f"  {label:<24} {row['completed']:>5} {row['timeouts']:>4} {row['errors']:>4} "
+              f"{row['rate_limited']:>6} {reply.get('p50_ms', 0):>10.0f} {reply.get('p95_ms', 0):>10.0f} "
+              f"{queue.get('p95_ms', 0):>10.0f} {total.get('p95_ms', 0):>10.0f} {total.get('max_ms', 0):>10.0f}")
+
+    lag = report['event_loop_lag']
+    print(f"\n  event loop lag: p50 {lag.get('p50_ms', 0)} ms, p99 {lag.get('p99_ms', 0)} ms, "
+          f"max {lag.get('max_ms', 0)} ms")
+    db = report['database']
+    print(f"  database: reads p95 {db['reads'].get('p95_ms', 0)} ms, writes p95 {db['writes'].get('p95_ms', 0)} ms, "
+          f"max {max(db['reads'].get('max_ms', 0), db['writes'].get('max_ms', 0))} ms, "
+          f"{db['slow_statements']} slow, {db['locked_errors']} locked")
+    api = report['bot_api']
+    print(f"  bot api: {sum(api['calls'].values())} calls, {sum(api['rejected_429'].values())} rejected with 429")
+    for name, row in report['jobs'].items():
+        print(f"  job {name}: {row.get('count', 0)} runs, p50 {row.get('p50_ms', 0)} ms, max {row.get('max_ms', 0)} ms")
+    if report['errors']['by_type']:
+        print(f"  errors: {report['errors']['by_type']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline end-to-end load test')
+    parser.add_argument('--users', type=int, default=500, help='Simulated users')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Scenario weights (scenarios: {', '.join(SCENARIOS)})")
+    parser.add_argument('--ramp', type=float, default=30.0, help='Seconds over which users arrive')
+    parser.add_argument('--think', type=float, default=2.0, help='Mean seconds between a user\'s steps')
+    parser.add_argument('--timeout', type=float, default=600.0, help='Seconds a user waits for one step')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Updates processed at once (1 matches the production default)')
+    parser.add_argument('--api-latency-ms', type=float, default=50.0, help='Simulated Bot API round trip')
+    parser.add_argument('--global-rate', type=float, default=30.0, help='Bot API messages/s across chats')
+    parser.add_argument('--chat-rate', type=float, default=1.0, help='Bot API messages/s per chat')
+    parser.add_argument('--chat-burst', type=float, default=3.0, help='Back-to-back messages allowed per chat')
+    parser.add_argument('--fetch-latency-ms', type=float, default=0.0, help='Simulated market data latency')
+    parser.add_argument('--replay-dir', help='Directory of <SYMBOL>.csv daily histories to replay')
+    parser.add_argument('--scan-universe', type=int, default=100,
+                        help='Stocks per market scan (the full list has ~4,400; cost is linear)')
+    parser.add_argument('--no-jobs', dest='jobs', action='store_false', help='Do not run the morning jobs')
+    parser.add_argument('--job-interval', type=float, default=30.0, help='Seconds between morning job rounds')
+    parser.add_argument('--seed', type=int, default=1, help='Scenario assignment seed')
+    parser.add_argument('--output', help='Write the report JSON to this file')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    parser.add_argument('--verbose', action='store_true', help='Keep the bot\'s own logging')
+    args = parser.parse_args()
+
+    # Handlers log (and print) their own failures; the report counts what matters
+    quiet = not args.verbose
+    if quiet:
+        logging.disable(logging.ERROR)
+
+    market = ReplayMarket(args.replay_dir, latency=args.fetch_latency_ms / 1000)
+    load_metadata = OnDemandAnalysisService._load_stock_metadata
+
+    def limited_metadata(service):
+        return load_metadata(service).head(args.scan_universe)
+
+    with patch('yahooquery.Ticker', market.ticker_class()), \
+            patch.object(OnDemandAnalysisService, '_load_stock_metadata', limited_metadata), \
+            contextlib.redirect_stdout(io.StringIO() if quiet else sys.stdout):
+        report = asyncio.run(run_load_test(args))
+    report['market_data_requests'] = market.requests
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
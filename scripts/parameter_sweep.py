@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Strategy parameter sweep
+Scores a grid (or random sample) of strategy parameters on historical signals
+
+Usage:
+    python scripts/parameter_sweep.py --space space.json --synthetic 20
+    python scripts/parameter_sweep.py --space space.json --symbols RELIANCE.NS TCS.NS --period 5y
+    python scripts/parameter_sweep.py --space space.json --universe data/stock_tickers_enhanced.csv \\
+        --samples 200 --workers 8 --cache /tmp/history.pkl --output sweep.csv
+
+The space file maps dotted config paths to the values to try, e.g.
+
+    {
+        "RISK_MODES.balanced.atr_stop_multiplier": [1.5, 2.0, 2.5],
+        "RISK_MODES.balanced.min_risk_reward": [1.5, 2.0],
+        "HARD_FILTERS.block_buy.0.value": [75, 80, 85],
+        "TIMEFRAME_CONFIGS.medium.rsi_period": [14, 21]
+    }
+
+Every BUY signal in the history is scored as a trade entered at that bar's
+close and closed at its target, its stop or after --holding-bars (the
+horizon's average length by default). See src/core/sweep.py.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.cli.stock_analyzer_pro import load_history, load_universe  # noqa: E402
+from src.core.config import INVESTMENT_HORIZONS, RISK_MODES  # noqa: E402
+from src.core.sweep import ParameterSweep, expand_grid, rank_results, sample_parameters  # noqa: E402
+
+RESULT_FIELDS = [
+    'index', 'trades', 'wins', 'losses', 'timeouts', 'unresolved',
+    'hit_rate', 'expectancy_pct', 'expectancy_r', 'avg_win_pct', 'avg_loss_pct',
+]
+
+
+def load_histories(symbols: List[str], period: str, cache: str = None, threads: int = 8) -> Dict[str, pd.DataFrame]:
+    """
+    Daily histories for the symbols, read from and added to an optional pickle cache
+
+    Symbols that fail to download are reported and left out.
+    """
+    histories = {}
+    if cache and os.path.exists(cache):
+        with open(cache, 'rb') as f:
+            histories = pickle.load(f)
+
+    missing = [symbol for symbol in symbols if symbol not in histories]
+    if missing:
+        print(f"  fetching {len(missing)} histories ({period})...", file=sys.stderr)
+
+        def fetch(symbol):
+            try:
+                return symbol, load_history(symbol, period)
+            except ValueError as e:
+                print(f"  skipping {symbol}: {e}", file=sys.stderr)
+                return symbol, None
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for symbol, df in pool.map(fetch, missing):
+                if df is not None:
+                    histories[symbol] = df
+
+        if cache:
+            with open(cache, 'wb') as f:
+                pickle.dump(histories, f)
+
+    return {symbol: histories[symbol] for symbol in symbols if symbol in histories}
+
+
+def write_results(results: List[Dict], path: str):
+    """Write results as JSON or, for a .csv path, one row per parameter set"""
+    if not path.endswith('.csv'):
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        return
+
+    parameter_keys = list(results[0]['parameters']) if results else []
+    signal_keys = list(results[0]['signals']) if results else []
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS + [f'signals_{key}' for key in signal_keys] + parameter_keys)
+        for result in results:
+            writer.writerow(
+                [result[field] for field in RESULT_FIELDS]
+                + [result['signals'].get(key, 0) for key in signal_keys]
+                + [result['parameters'].get(key) for key in parameter_keys]
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strategy parameter sweep')
+    parser.add_argument('--space', required=True, help='JSON file mapping config paths to value lists')
+    parser.add_argument('--samples', type=int, help='Random sample of this many sets instead of the full grid')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for --samples')
+
+    data = parser.add_mutually_exclusive_group()
+    data.add_argument('--symbols', nargs='+', help='Symbols to sweep over')
+    data.add_argument('--universe', '-u', help='Universe file (CSV with a ticker column or plain list)')
+    data.add_argument('--synthetic', type=int, metavar='N', help='Use N synthetic histories (offline)')
+    parser.add_argument('--period', default='5y', help='History period to fetch (default: 5y)')
+    parser.add_argument('--cache', help='Pickle file to read and store fetched histories')
+
+    parser.add_argument('--mode', '-m', choices=list(RISK_MODES), default='balanced')
+    parser.add_argument('--horizon', choices=list(INVESTMENT_HORIZONS), default='3months')
+    parser.add_argument('--holding-bars', type=int, help='Bars to hold a trade (default: horizon average)')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--min-trades', type=int, default=10, help='Minimum trades for the ranking')
+    parser.add_argument('--top', type=int, default=10, help='Rows in the ranking table')
+    parser.add_argument('--output', '-o', help='Write all results to a .json or .csv file')
+    args = parser.parse_args()
+
+    with open(args.space) as f:
+        space = json.load(f)
+    if not space or not all(isinstance(values, list) and values for values in space.values()):
+        parser.error('--space must map each parameter to a non-empty list of values')
+
+    parameter_sets = sample_parameters(space, args.samples, args.seed) if args.samples else expand_grid(space)
+
+    if args.synthetic:
+        from benchmark_suite import synthetic_universe
+        histories = synthetic_universe(args.synthetic, days=1000)
+    else:
+        if args.symbols:
+            symbols = [symbol.upper() for symbol in args.symbols]
+        else:
+            symbols = [stock['ticker'] for stock in load_universe(args.universe)]
+        histories = load_histories(symbols, args.period, args.cache)
+    if not histories:
+        parser.error('No price histories to sweep over')
+
+    # Pattern detection logs per bar; keep the output readable
+    logging.disable(logging.WARNING)
+
+    try:
+        sweep = ParameterSweep(
+            histories, mode=args.mode, horizon=args.horizon,
+            holding_bars=args.holding_bars, workers=args.workers
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"  sweeping {len(parameter_sets)} parameter sets over {len(histories)} symbols "
+          f"with {sweep.workers} worker(s)...", file=sys.stderr)
+    started = time.perf_counter()
+
+    def progress(done, total):
+        print(f"\r  {done}/{total} sets", end='', file=sys.stderr, flush=True)
+
+    try:
+        results = sweep.run(parameter_sets, progress=progress)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - started
+    print(f"\n  done in {elapsed:.1f}s", file=sys.stderr)
+    for symbol, reason in sweep.skipped.items():
+        print(f"  skipped {symbol}: {reason}", file=sys.stderr)
+
+    if args.output:
+        write_results(results, args.output)
+
+    ranked = rank_results(results, args.min_trades)
+    print(f"\nTop {min(args.top, len(ranked))} of {len(results)} sets "
+          f"({args.mode}, {args.horizon}, at least {args.min_trades} trades)\n")
+    print(f"  {'#':>4} {'trades':>7} {'hit %':>7} {'exp %':>7} {'exp R':>6} {'avg win':>8} {'avg loss':>9}  parameters")
+    for result in ranked[:args.top]:
+        params = ', '.join(f"{key.split('.', 1)[1]}={value}" for key, value in result['parameters'].items())
+        print(f"  {result['index']:>4} {result['trades']:>7} {result['hit_rate']:>7.1f} "
+              f"{result['expectancy_pct']:>7.2f} {result['expectancy_r']:>6.2f} "
+              f"{result['avg_win_pct']:>8.2f} {result['avg_loss_pct']:>9.2f}  {params}")
+
+
+if __name__ == '__main__':
+    main()
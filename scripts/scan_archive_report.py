@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Scan archive report
+Distribution and drift of scan results, read from the columnar scan archive
+
+Usage:
+    python scripts/scan_archive_report.py
+    python scripts/scan_archive_report.py --start 2026-01-01 --period W --source daily_scan
+    python scripts/scan_archive_report.py --symbols RELIANCE.NS TCS.NS --columns confidence rsi
+    python scripts/scan_archive_report.py --compact-before 2026-06-01
+
+Replaces reading STRONG BUY counts out of the logs: every analyzed symbol
+of every scan is in the archive (data/scan_archive by default, or
+SCAN_ARCHIVE_DIR), including the ones that were not signalled.
+
+Author: Harsh Kandhway
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.bot.config import SCAN_ARCHIVE_DIR  # noqa: E402
+from src.core.scan_archive import BLOCK_REASON_SEPARATOR, ScanArchive  # noqa: E402
+
+DEFAULT_DRIFT_COLUMNS = ['confidence', 'overall_score_pct', 'risk_reward']
+
+
+def print_counts(title: str, counts: dict, total: int):
+    print(f"\n  {title}")
+    for value, count in counts.items():
+        print(f"    {value or '(none)':<40} {count:>9} {count / total:>7.1%}")
+
+
+def print_block_reasons(archive: ScanArchive, filters: dict, top: int):
+    """Most common buy/sell block reasons (rows can have several)"""
+    reasons = {}
+    for combined, count in archive.value_counts('block_reasons', **filters).items():
+        for reason in filter(None, combined.split(BLOCK_REASON_SEPARATOR)):
+            reasons[reason] = reasons.get(reason, 0) + count
+    print("\n  Top block reasons")
+    for reason, count in sorted(reasons.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {count:>9}  {reason}")
+
+
+def print_drift(archive: ScanArchive, column: str, period: str, filters: dict):
+    stats = archive.period_stats(column, period, percentiles=(10, 25, 50, 75, 90), **filters)
+    print(f"\n  {column} by period")
+    print(f"    {'period':<12} {'rows':>9} {'mean':>8} {'p10':>8} {'p25':>8} {'p50':>8} {'p75':>8} {'p90':>8}")
+    for i, period_start in enumerate(stats['period']):
+        print(f"    {str(period_start):<12} {stats['count'][i]:>9} {stats['mean'][i]:>8.2f} "
+              + ' '.join(f"{stats[p][i]:>8.2f}" for p in ('p10', 'p25', 'p50', 'p75', 'p90')))
+
+
+def print_strong_buys(archive: ScanArchive, filters: dict):
+    """STRONG BUY share per day, and how many near-misses were blocked"""
+    data = archive.query(['timestamp', 'recommendation', 'is_buy_blocked', 'confidence'], **filters)
+    if not len(data['timestamp']):
+        return
+    days = data['timestamp'].astype('datetime64[D]')
+    strong = np.char.find(data['recommendation'].astype(str), 'STRONG BUY') >= 0
+    near_miss = data['is_buy_blocked'] & (data['confidence'] >= 70)
+
+    print("\n  STRONG BUY per day")
+    print(f"    {'day':<12} {'rows':>9} {'strong buy':>11} {'blocked >=70%':>14}")
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    rows = np.bincount(inverse)
+    strong_counts = np.bincount(inverse, weights=strong)
+    near_counts = np.bincount(inverse, weights=near_miss)
+    for i, day in enumerate(unique_days):
+        print(f"    {str(day):<12} {rows[i]:>9} {int(strong_counts[i]):>11} {int(near_counts[i]):>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scan archive distribution and drift report')
+    parser.add_argument('--archive', default=SCAN_ARCHIVE_DIR, help='Archive directory')
+    parser.add_argument('--start', help='First date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Last date (YYYY-MM-DD)')
+    parser.add_argument('--source', nargs='+', help='Only these scan sources (daily_scan, on_demand, screen)')
+    parser.add_argument('--symbols', nargs='+', help='Only these symbols')
+    parser.add_argument('--period', default='M', choices=['D', 'W', 'M', 'Y'], help='Drift period (default: M)')
+    parser.add_argument('--columns', nargs='+', default=DEFAULT_DRIFT_COLUMNS, help='Numeric columns to track')
+    parser.add_argument('--top', type=int, default=10, help='Block reasons shown')
+    parser.add_argument('--compact-before', metavar='DATE',
+                        help='First merge the segments of every day before DATE')
+    args = parser.parse_args()
+
+    archive = ScanArchive(args.archive)
+    started = time.perf_counter()
+
+    if args.compact_before:
+        merged = sum(archive.compact(day) for day in archive.partitions(end=args.compact_before)
+                     if day < date.fromisoformat(args.compact_before))
+        print(f"  compacted {merged} segments", file=sys.stderr)
+
+    filters = {
+        'start': args.start,
+        'end': args.end,
+        'sources': args.source,
+        'symbols': [symbol.upper() for symbol in args.symbols] if args.symbols else None,
+    }
+    days = archive.partitions(args.start, args.end)
+    if not days:
+        parser.error(f"No archived scans in {args.archive}")
+
+    counts = archive.value_counts('recommendation_type', **filters)
+    total = sum(counts.values())
+    if not total:
+        parser.error('No archived rows match the filters')
+    print(f"  {total} rows from {days[0]} to {days[-1]}")
+
+    print_counts('Sources', archive.value_counts('source', **filters), total)
+    print_counts('Recommendation type', counts, total)
+    print_counts('Recommendation', archive.value_counts('recommendation', **filters), total)
+    print_block_reasons(archive, filters, args.top)
+    for column in args.columns:
+        print_drift(archive, column, args.period, filters)
+    print_strong_buys(archive, filters)
+
+    print(f"\n  report built in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
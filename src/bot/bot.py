@@ -5,16 +5,23 @@ Initializes and runs the Telegram bot
 Author: Harsh Kandhway
 """
 
+import asyncio
+import importlib
 import logging
+import time
+from typing import Callable, Dict, List, Optional
+
 from telegram import Update
 from telegram.ext import (
     Application,
+    BaseUpdateProcessor,
     CommandHandler,
     MessageHandler,
     filters,
     CallbackQueryHandler,
     ContextTypes
 )
+from telegram.request import BaseRequest
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from src.bot.config import (
@@ -22,7 +29,11 @@ from src.bot.config import (
     TELEGRAM_ADMIN_IDS,
     validate_config,
     BOT_NAME,
-    ALERT_CHECK_INTERVAL_MINUTES
+    ALERT_CHECK_INTERVAL_MINUTES,
+    ENABLE_INTRADAY_DATA,
+    INTRADAY_REFRESH_SECONDS,
+    ENABLE_STAGE_TIMING,
+    STAGE_TIMING_LOG_INTERVAL_MINUTES
 )
 from src.bot.handlers.start import (
     start_command,
@@ -31,54 +42,12 @@ from src.bot.handlers.start import (
     menu_command,
     unknown_command
 )
-from src.bot.handlers.analyze import (
-    analyze_command,
-    quick_analyze_command
-)
-from src.bot.handlers.watchlist import (
-    watchlist_command
-)
-from src.bot.handlers.settings import (
-    settings_command,
-    setmode_command,
-    sethorizon_command,
-    settimeframe_command,
-    setcapital_command,
-    reset_settings_command,
-    handle_settings_callback,
-    handle_capital_input
-)
-from src.bot.handlers.compare import (
-    compare_command
-)
-from src.bot.handlers.alerts import (
-    alerts_command,
-    alert_command,
-    deletealert_command,
-    clearalerts_command
-)
-from src.bot.handlers.portfolio import (
-    portfolio_command
-)
-from src.bot.handlers.search import (
-    search_command
-)
-from src.bot.handlers.schedule import (
-    schedule_command
-)
-from src.bot.handlers.backtest import (
-    backtest_command
-)
-from src.bot.handlers.paper_trading import (
-    papertrade_command
-)
-from src.bot.handlers.callbacks import (
-    handle_callback_query
-)
 from src.bot.handlers.on_demand_signals import (
-    register_on_demand_handlers
+    register_on_demand_handlers,
+    scan_market_command
 )
-from src.bot.services.alert_service import AlertService
+from src.bot.middleware.rate_limiter import charge_update, register_rate_limiter, save_rate_limiter_state
+from src.core import timing
 
 # Configure logging
 import os
@@ -166,6 +135,91 @@ async def authorization_filter(update, context):
     return True
 
 
+# =============================================================================
+# LAZY HANDLER LOADING
+# =============================================================================
+
+# Modules behind lazy handlers, imported on first use or by the warm-up task
+LAZY_HANDLER_MODULES: List[str] = []
+
+# Heavy service modules preloaded by the warm-up task (analysis stack)
+WARMUP_MODULES: List[str] = [
+    'src.bot.services.analysis_service',
+    'src.core.formatters',
+    'src.bot.services.alert_service',
+    'src.bot.services.scheduler_service',
+    'src.bot.services.report_dispatcher',
+    'src.bot.services.on_demand_analysis_service',
+    'src.bot.services.export_service',
+]
+
+
+def lazy_handler(module_path: str, name: str) -> Callable:
+    """
+    Handler callback that imports its module on first use
+    
+    The import runs in a worker thread so a cold first command never
+    blocks the event loop for other users.
+    
+    Args:
+        module_path: Dotted module path (e.g. 'src.bot.handlers.analyze')
+        name: Handler function name in that module
+    
+    Returns:
+        Async handler callback
+    """
+    if module_path not in LAZY_HANDLER_MODULES:
+        LAZY_HANDLER_MODULES.append(module_path)
+    resolved = None
+    
+    async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        nonlocal resolved
+        if resolved is None:
+            module = await asyncio.get_running_loop().run_in_executor(
+                None, importlib.import_module, module_path
+            )
+            resolved = getattr(module, name)
+        return await resolved(update, context)
+    
+    handler.__name__ = handler.__qualname__ = name
+    return handler
+
+
+def warm_up_imports() -> float:
+    """
+    Import the analysis stack and every lazy handler module
+    
+    Returns:
+        Seconds spent importing
+    """
+    start = time.perf_counter()
+    for module_path in WARMUP_MODULES + LAZY_HANDLER_MODULES:
+        try:
+            importlib.import_module(module_path)
+        except Exception as e:
+            logger.error(f"Warm-up import of {module_path} failed: {e}", exc_info=True)
+    return time.perf_counter() - start
+
+
+# Handlers reached from menu buttons and pending text input; those not
+# already imported above load in a worker thread like the command handlers
+TEXT_INPUT_HANDLERS: Dict[str, Callable] = {
+    'awaiting_capital_input': lazy_handler('src.bot.handlers.settings', 'handle_capital_input'),
+    'awaiting_alert_time_input': lazy_handler('src.bot.handlers.settings', 'handle_alert_time_input'),
+}
+
+MENU_COMMAND_HANDLERS: Dict[str, Callable] = {
+    '/watchlist': lazy_handler('src.bot.handlers.watchlist', 'watchlist_command'),
+    '/alerts': lazy_handler('src.bot.handlers.alerts', 'alerts_command'),
+    '/portfolio': lazy_handler('src.bot.handlers.portfolio', 'portfolio_command'),
+    '/papertrade': lazy_handler('src.bot.handlers.paper_trading', 'papertrade_command'),
+    '/settings': lazy_handler('src.bot.handlers.settings', 'settings_command'),
+    '/help': help_command,
+    '/menu': start_command,
+    '/scanmarket': scan_market_command,
+}
+
+
 async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle text messages including main menu button clicks and custom inputs.
@@ -184,17 +238,14 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
         return
     
-    # Handle custom capital input if awaiting
-    if context.user_data.get('awaiting_capital_input'):
-        from src.bot.handlers.settings import handle_capital_input
-        await handle_capital_input(update, context)
-        return
-    
-    # Handle custom alert time input if awaiting
-    if context.user_data.get('awaiting_alert_time_input'):
-        from src.bot.handlers.settings import handle_alert_time_input
-        await handle_alert_time_input(update, context)
-        return
+    # Handle custom capital / alert time input if awaiting
+    # Plain text is invisible to the rate limiting middleware, so these
+    # routes charge the same buckets themselves
+    for flag, input_handler in TEXT_INPUT_HANDLERS.items():
+        if context.user_data.get(flag):
+            if await charge_update(update, 'text_input'):
+                await input_handler(update, context)
+            return
     
     # Route main menu button clicks to commands
     menu_routes = {
@@ -236,24 +287,6 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 "_Separate symbols with spaces_",
                 parse_mode='Markdown'
             )
-        elif command == '/watchlist':
-            from src.bot.handlers.watchlist import watchlist_command
-            await watchlist_command(update, context)
-        elif command == '/alerts':
-            from src.bot.handlers.alerts import alerts_command
-            await alerts_command(update, context)
-        elif command == '/portfolio':
-            from src.bot.handlers.portfolio import portfolio_command
-            await portfolio_command(update, context)
-        elif command == '/papertrade':
-            from src.bot.handlers.paper_trading import papertrade_command
-            await papertrade_command(update, context)
-        elif command == '/settings':
-            from src.bot.handlers.settings import settings_command
-            await settings_command(update, context)
-        elif command == '/help':
-            from src.bot.handlers.start import help_command
-            await help_command(update, context)
         elif command == '/schedule':
             await update.message.reply_text(
                 "📅 *Scheduled Reports*\n\n"
@@ -265,12 +298,9 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 "_Example: `/schedule daily 09:00`_",
                 parse_mode='Markdown'
             )
-        elif command == '/menu':
-            from src.bot.handlers.start import start_command
-            await start_command(update, context)
-        elif command == '/scanmarket':
-            from src.bot.handlers.on_demand_signals import scan_market_command
-            await scan_market_command(update, context)
+        elif command in MENU_COMMAND_HANDLERS:
+            if await charge_update(update, command.lstrip('/')):
+                await MENU_COMMAND_HANDLERS[command](update, context)
         return
     
     # If no match, suggest using commands
@@ -284,87 +314,6 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
 
 
-async def send_scheduled_reports(bot):
-    """
-    Send scheduled reports to users
-    
-    Args:
-        bot: Telegram bot instance
-    """
-    from src.bot.database.db import get_db_context, get_all_active_scheduled_reports
-    from src.bot.services.report_service import (
-        generate_watchlist_report,
-        generate_portfolio_report,
-        generate_combined_report
-    )
-    from datetime import datetime, time
-    
-    try:
-        with get_db_context() as db:
-            reports = get_all_active_scheduled_reports(db)
-            
-            current_time = datetime.now().time()
-            current_hour = current_time.hour
-            current_minute = current_time.minute
-            
-            for report in reports:
-                try:
-                    # Parse frequency (simple format: "HH:MM" for daily)
-                    if ':' in report.frequency:
-                        parts = report.frequency.split(':')
-                        if len(parts) == 2:
-                            scheduled_hour = int(parts[0])
-                            scheduled_minute = int(parts[1])
-                            
-                            # Check if it's time to send (within same hour and minute)
-                            if current_hour == scheduled_hour and current_minute == scheduled_minute:
-                                # Check if already sent today
-                                if report.last_sent:
-                                    last_sent_date = report.last_sent.date()
-                                    today = datetime.now().date()
-                                    if last_sent_date == today:
-                                        continue  # Already sent today
-                                
-                                # Generate and send report
-                                user = report.user
-                                telegram_id = user.telegram_id
-                                
-                                try:
-                                    if report.report_type == 'watchlist':
-                                        message = generate_watchlist_report(db, telegram_id)
-                                    elif report.report_type == 'portfolio':
-                                        message = generate_portfolio_report(db, telegram_id)
-                                    elif report.report_type == 'combined':
-                                        message = generate_combined_report(db, telegram_id)
-                                    else:
-                                        continue
-                                    
-                                    # Send message
-                                    await bot.send_message(
-                                        chat_id=telegram_id,
-                                        text=message,
-                                        parse_mode='Markdown'
-                                    )
-                                    
-                                    # Update last_sent
-                                    from datetime import datetime as dt
-                                    report.last_sent = dt.utcnow()
-                                    db.commit()
-                                except Exception as send_error:
-                                    logger.error(f"Error sending report to {telegram_id}: {send_error}")
-                                    continue
-                                
-                                logger.info(
-                                    f"Sent {report.report_type} report to user {telegram_id}"
-                                )
-                except Exception as e:
-                    logger.error(f"Error sending scheduled report {report.id}: {e}")
-                    continue
-                    
-    except Exception as e:
-        logger.error(f"Error in send_scheduled_reports: {e}", exc_info=True)
-
-
 async def error_handler(update, context):
     """
     Handle errors in the bot
@@ -386,10 +335,18 @@ async def error_handler(update, context):
         logger.error(f"Could not send error message to user: {e}")
 
 
-def create_bot_application() -> Application:
+def create_bot_application(
+    request: Optional[BaseRequest] = None,
+    update_processor: Optional[BaseUpdateProcessor] = None
+) -> Application:
     """
     Create and configure the bot application
     
+    Args:
+        request: Bot API transport (default: HTTP to api.telegram.org;
+            the load-test harness passes a simulated API)
+        update_processor: Update concurrency policy (default: one update at a time)
+    
     Returns:
         Configured Application instance
     
@@ -402,7 +359,15 @@ def create_bot_application() -> Application:
     
     # Create application
     logger.info(f"Creating bot application: {BOT_NAME}")
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    builder = Application.builder().token(TELEGRAM_BOT_TOKEN)
+    if request is not None:
+        builder = builder.request(request).get_updates_request(request)
+    if update_processor is not None:
+        builder = builder.concurrent_updates(update_processor)
+    application = builder.build()
+    
+    # Rate limiting runs before every other handler (group -1)
+    register_rate_limiter(application)
     
     # Add command handlers
     logger.info("Registering command handlers...")
@@ -413,49 +378,50 @@ def create_bot_application() -> Application:
     application.add_handler(CommandHandler("about", about_command))
     application.add_handler(CommandHandler("menu", menu_command))
     
-    # Analysis commands
-    application.add_handler(CommandHandler("analyze", analyze_command))
-    application.add_handler(CommandHandler("quick", quick_analyze_command))
-    application.add_handler(CommandHandler("compare", compare_command))
-    
-    # Watchlist commands
-    application.add_handler(CommandHandler("watchlist", watchlist_command))
-    
-    # Settings commands
-    application.add_handler(CommandHandler("settings", settings_command))
-    application.add_handler(CommandHandler("setmode", setmode_command))
-    application.add_handler(CommandHandler("sethorizon", sethorizon_command))
-    application.add_handler(CommandHandler("settimeframe", settimeframe_command))
-    application.add_handler(CommandHandler("setcapital", setcapital_command))
-    application.add_handler(CommandHandler("resetsettings", reset_settings_command))
-    
-    # Alert commands
-    application.add_handler(CommandHandler("alerts", alerts_command))
-    application.add_handler(CommandHandler("alert", alert_command))
-    application.add_handler(CommandHandler("deletealert", deletealert_command))
-    application.add_handler(CommandHandler("clearalerts", clearalerts_command))
-    
-    # Portfolio commands
-    application.add_handler(CommandHandler("portfolio", portfolio_command))
-    
-    # Search commands
-    application.add_handler(CommandHandler("search", search_command))
-    
-    # Schedule commands
-    application.add_handler(CommandHandler("schedule", schedule_command))
-    
-    # Backtest commands
-    application.add_handler(CommandHandler("backtest", backtest_command))
-    
-    # Paper trading commands
-    application.add_handler(CommandHandler("papertrade", papertrade_command))
+    # Everything below imports its module on first use (see lazy_handler)
+    lazy_commands = [
+        # Analysis commands
+        ("analyze", "src.bot.handlers.analyze", "analyze_command"),
+        ("quick", "src.bot.handlers.analyze", "quick_analyze_command"),
+        ("compare", "src.bot.handlers.compare", "compare_command"),
+        # Watchlist commands
+        ("watchlist", "src.bot.handlers.watchlist", "watchlist_command"),
+        # Settings commands
+        ("settings", "src.bot.handlers.settings", "settings_command"),
+        ("setmode", "src.bot.handlers.settings", "setmode_command"),
+        ("sethorizon", "src.bot.handlers.settings", "sethorizon_command"),
+        ("settimeframe", "src.bot.handlers.settings", "settimeframe_command"),
+        ("setcapital", "src.bot.handlers.settings", "setcapital_command"),
+        ("resetsettings", "src.bot.handlers.settings", "reset_settings_command"),
+        # Alert commands
+        ("alerts", "src.bot.handlers.alerts", "alerts_command"),
+        ("alert", "src.bot.handlers.alerts", "alert_command"),
+        ("deletealert", "src.bot.handlers.alerts", "deletealert_command"),
+        ("clearalerts", "src.bot.handlers.alerts", "clearalerts_command"),
+        # Portfolio commands
+        ("portfolio", "src.bot.handlers.portfolio", "portfolio_command"),
+        # Search commands
+        ("search", "src.bot.handlers.search", "search_command"),
+        # Schedule commands
+        ("schedule", "src.bot.handlers.schedule", "schedule_command"),
+        # Backtest commands
+        ("backtest", "src.bot.handlers.backtest", "backtest_command"),
+        # Paper trading commands
+        ("papertrade", "src.bot.handlers.paper_trading", "papertrade_command"),
+        # Admin commands
+        ("timings", "src.bot.handlers.admin", "timings_command"),
+    ]
+    for command, module_path, name in lazy_commands:
+        application.add_handler(CommandHandler(command, lazy_handler(module_path, name)))
     
     # On-Demand BUY Signals - MUST be registered BEFORE general callback handler
     register_on_demand_handlers(application)
     logger.info("✅ On-demand signals handlers registered")
     
     # Callback query handler for inline buttons
-    application.add_handler(CallbackQueryHandler(handle_callback_query))
+    application.add_handler(CallbackQueryHandler(
+        lazy_handler("src.bot.handlers.callbacks", "handle_callback_query")
+    ))
     
     # Text message handler for main menu buttons and custom inputs
     application.add_handler(MessageHandler(
@@ -484,6 +450,13 @@ async def post_init(application: Application):
     """
     logger.info("Bot post-initialization...")
     
+    # Per-stage timing instrumentation (no-op unless enabled)
+    if ENABLE_STAGE_TIMING:
+        timing.enable()
+        logger.info(
+            f"Stage timing enabled - logging every {STAGE_TIMING_LOG_INTERVAL_MINUTES} minute(s)"
+        )
+    
     # Initialize paper trading logger
     try:
         from src.bot.utils.paper_trading_logger import setup_paper_trading_logger
@@ -514,8 +487,27 @@ async def post_init(application: Application):
     else:
         logger.warning("No admin IDs configured - bot is open to everyone!")
     
+    # Heavy imports and service start-up run in the background so that
+    # polling starts (and /start is answered) without waiting for them
+    application.bot_data['warmup_task'] = asyncio.create_task(
+        start_background_services(application)
+    )
+
+
+async def start_background_services(application: Application):
+    """
+    Warm up the analysis stack, then start alert and scheduler services
+    
+    Args:
+        application: Bot application
+    """
+    elapsed = await asyncio.get_running_loop().run_in_executor(None, warm_up_imports)
+    logger.info(f"Warm-up imports finished in {elapsed:.2f}s")
+    
     # Initialize alert service and scheduler
     try:
+        from src.bot.services.alert_service import AlertService
+        
         logger.info("Starting alert service...")
         alert_service = AlertService(application.bot)
         alert_service.start()
@@ -531,16 +523,29 @@ async def post_init(application: Application):
             replace_existing=True
         )
         
-        # Add scheduled reports job (runs every hour to check for scheduled reports)
-        scheduler.add_job(
-            send_scheduled_reports,
-            'interval',
-            minutes=60,
-            args=[application.bot],
-            id='send_scheduled_reports',
-            name='Send scheduled reports',
-            replace_existing=True
-        )
+        # Intraday bar ingestion for symbols alerts and paper trading follow
+        if ENABLE_INTRADAY_DATA:
+            from src.bot.services.intraday_service import get_intraday_service
+            scheduler.add_job(
+                get_intraday_service().refresh_tracked,
+                'interval',
+                seconds=INTRADAY_REFRESH_SECONDS,
+                id='refresh_intraday_bars',
+                name='Refresh intraday bars',
+                replace_existing=True
+            )
+        
+        # Periodic structured log line with per-stage timing histograms
+        if timing.is_enabled():
+            scheduler.add_job(
+                timing.log_snapshot,
+                'interval',
+                minutes=STAGE_TIMING_LOG_INTERVAL_MINUTES,
+                args=[logging.getLogger('stage_timings')],
+                id='log_stage_timings',
+                name='Log stage timings',
+                replace_existing=True
+            )
         
         scheduler.start()
         
@@ -552,7 +557,10 @@ async def post_init(application: Application):
             f"Alert service started. Checking alerts every "
             f"{ALERT_CHECK_INTERVAL_MINUTES} minute(s)"
         )
-        logger.info("Scheduled reports service started. Checking every hour.")
+        
+        # Scheduled reports wake exactly when the next batch is due
+        from src.bot.services.report_dispatcher import get_report_dispatcher
+        await get_report_dispatcher(application.bot).start()
         
         # Start daily BUY alerts scheduler
         try:
@@ -579,6 +587,10 @@ async def post_shutdown(application: Application):
     
     # Stop alert service
     try:
+        warmup_task = application.bot_data.get('warmup_task')
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+        
         if 'alert_service' in application.bot_data:
             alert_service = application.bot_data['alert_service']
             alert_service.stop()
@@ -588,6 +600,22 @@ async def post_shutdown(application: Application):
             scheduler = application.bot_data['scheduler']
             scheduler.shutdown()
             logger.info("Scheduler stopped")
+        
+        from src.bot.services.report_dispatcher import get_report_dispatcher
+        dispatcher = get_report_dispatcher()
+        if dispatcher:
+            await dispatcher.stop()
+        
+        from src.bot.services.chart_service import get_chart_service
+        get_chart_service().shutdown()
+        
+        from src.bot.services.export_service import get_export_service
+        get_export_service().shutdown()
+        
+        from src.bot.services.intraday_service import get_intraday_service
+        get_intraday_service().save_indicator_state()
+        
+        save_rate_limiter_state()
     except Exception as e:
         logger.error(f"Error stopping services: {e}")
     
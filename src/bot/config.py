@@ -50,9 +50,30 @@ RATE_LIMITS: Dict[str, Dict[str, int]] = {
     'backtest': {'max_calls': 5, 'per_minutes': 1440},  # 5 per day
     'chart': {'max_calls': 15, 'per_minutes': 60},
     'portfolio': {'max_calls': 20, 'per_minutes': 60},
-    'global': {'max_calls': MAX_REQUESTS_PER_HOUR, 'per_minutes': 60},
+    'scan': {'max_calls': 4, 'per_minutes': 60},
+    'global': {'max_calls': MAX_REQUESTS_PER_HOUR, 'per_minutes': 60},  # In cost units
 }
 
+# Cost of each action against the per-user 'global' budget
+# Menu navigation and other unlisted callbacks are free; unlisted commands cost 1
+RATE_LIMIT_COSTS: Dict[str, int] = {
+    'quick': 1,
+    'analyze': 2,
+    'chart': 2,
+    'portfolio': 1,
+    'compare': 4,
+    'backtest': 8,
+    'watchlist_analyze': 8,
+    'scan': 20,
+}
+
+# Market scans per user, enforced by the scan service itself so it also
+# applies when ENABLE_RATE_LIMITING is off (cached results are not charged)
+SCAN_COOLDOWN: Dict[str, int] = {'max_calls': int(os.getenv('SCAN_LIMIT_PER_HOUR', '100')), 'per_minutes': 60}
+
+# Optional JSON file so buckets survive restarts (empty = in-memory only)
+RATE_LIMIT_STATE_FILE = os.getenv('RATE_LIMIT_STATE_FILE', '')
+
 # =============================================================================
 # ALERT SYSTEM
 # =============================================================================
@@ -62,12 +83,90 @@ ALERT_CHECK_INTERVAL_MINUTES = ALERT_CHECK_INTERVAL // 60  # Convert to minutes
 MAX_ALERTS_PER_USER = int(os.getenv('MAX_ALERTS_PER_USER', '20'))
 ALERT_COOLDOWN_MINUTES = int(os.getenv('ALERT_COOLDOWN_MINUTES', '60'))  # 1 hour between same alert triggers
 
+# =============================================================================
+# INTRADAY DATA
+# =============================================================================
+
+ENABLE_INTRADAY_DATA = os.getenv('ENABLE_INTRADAY_DATA', 'true').lower() == 'true'
+INTRADAY_BAR_INTERVAL = os.getenv('INTRADAY_BAR_INTERVAL', '5m')  # Ingested bar size ('1m' or '5m')
+INTRADAY_BUFFER_BARS = int(os.getenv('INTRADAY_BUFFER_BARS', '2000'))  # Ring buffer size per symbol
+INTRADAY_REFRESH_SECONDS = int(os.getenv('INTRADAY_REFRESH_SECONDS', '60'))  # Ingestion interval
+INTRADAY_MAX_AGE_SECONDS = int(os.getenv('INTRADAY_MAX_AGE_SECONDS', '300'))  # Older prices fall back to daily
+INTRADAY_TRACK_MINUTES = int(os.getenv('INTRADAY_TRACK_MINUTES', '30'))  # Unrequested symbols stop refreshing
+
+# Optional JSON checkpoint of streaming indicator state (empty = rebuilt from bars after restart)
+INTRADAY_INDICATOR_STATE_FILE = os.getenv('INTRADAY_INDICATOR_STATE_FILE', '')
+
 # =============================================================================
 # CACHE SETTINGS
 # =============================================================================
 
 CACHE_EXPIRY_MINUTES = int(os.getenv('CACHE_EXPIRY_MINUTES', '15'))
 ENABLE_ANALYSIS_CACHE = os.getenv('ENABLE_ANALYSIS_CACHE', 'false').lower() == 'true'
+ANALYSIS_VARIANT_CACHE_SIZE = int(os.getenv('ANALYSIS_VARIANT_CACHE_SIZE', '128'))  # Symbols with all mode/horizon results in memory
+
+# =============================================================================
+# MULTI-STOCK ANALYSIS (/compare, watchlist analysis)
+# =============================================================================
+
+MULTI_ANALYSIS_WORKERS = int(os.getenv('MULTI_ANALYSIS_WORKERS', '8'))  # Concurrent fetches and analyses
+COMPARE_BENCHMARK = os.getenv('COMPARE_BENCHMARK', '^NSEI')  # Index for /compare beta and relative strength (empty = basket)
+
+# =============================================================================
+# CHART SETTINGS
+# =============================================================================
+
+ENABLE_CHARTS = os.getenv('ENABLE_CHARTS', 'true').lower() == 'true'
+CHART_RENDER_WORKERS = int(os.getenv('CHART_RENDER_WORKERS', '2'))  # Render processes
+CHART_CACHE_DIR = os.getenv('CHART_CACHE_DIR', 'data/charts')
+CHART_MEMORY_CACHE_SIZE = int(os.getenv('CHART_MEMORY_CACHE_SIZE', '64'))  # Images kept in memory
+CHART_BARS = int(os.getenv('CHART_BARS', '120'))  # Candles drawn per chart
+
+# =============================================================================
+# EXPORT SETTINGS
+# =============================================================================
+
+EXPORT_PDF_WORKERS = int(os.getenv('EXPORT_PDF_WORKERS', '1'))  # PDF layout processes
+EXPORT_CACHE_SIZE = int(os.getenv('EXPORT_CACHE_SIZE', '32'))  # Finished exports kept in memory
+EXPORT_STREAM_BATCH = int(os.getenv('EXPORT_STREAM_BATCH', '500'))  # Rows fetched per batch
+
+# =============================================================================
+# SCAN ARCHIVE SETTINGS
+# =============================================================================
+
+ENABLE_SCAN_ARCHIVE = os.getenv('ENABLE_SCAN_ARCHIVE', 'true').lower() == 'true'
+SCAN_ARCHIVE_DIR = os.getenv('SCAN_ARCHIVE_DIR', 'data/scan_archive')  # Date-partitioned columnar scan results
+
+# =============================================================================
+# WATCHLIST DIGEST SETTINGS
+# =============================================================================
+
+ENABLE_WATCHLIST_DIGESTS = os.getenv('ENABLE_WATCHLIST_DIGESTS', 'true').lower() == 'true'
+WATCHLIST_DIGEST_TIME = os.getenv('WATCHLIST_DIGEST_TIME', '16:15')  # After the 15:30 close (HH:MM, DEFAULT_TIMEZONE)
+WATCHLIST_DIGEST_RETENTION_DAYS = int(os.getenv('WATCHLIST_DIGEST_RETENTION_DAYS', '30'))
+
+# =============================================================================
+# EXPOSURE CHECK SETTINGS (paper trading position admission)
+# =============================================================================
+
+ENABLE_EXPOSURE_CHECKS = os.getenv('ENABLE_EXPOSURE_CHECKS', 'true').lower() == 'true'
+EXPOSURE_DIR = os.getenv('EXPOSURE_DIR', 'data/exposure')  # Nightly correlation / sector matrix
+EXPOSURE_BUILD_TIME = os.getenv('EXPOSURE_BUILD_TIME', '17:00')  # After the close (HH:MM, DEFAULT_TIMEZONE)
+EXPOSURE_LOOKBACK_BARS = int(os.getenv('EXPOSURE_LOOKBACK_BARS', '126'))  # Daily returns per correlation
+EXPOSURE_FETCH_BATCH = int(os.getenv('EXPOSURE_FETCH_BATCH', '200'))  # Symbols fetched per history request
+EXPOSURE_MAX_SECTOR_PCT = float(os.getenv('EXPOSURE_MAX_SECTOR_PCT', '30.0'))  # Of session capital
+EXPOSURE_MAX_MARKET_CAP_PCT = float(os.getenv('EXPOSURE_MAX_MARKET_CAP_PCT', '100.0'))  # Of session capital (100 = off)
+EXPOSURE_CORRELATION_LIMIT = float(os.getenv('EXPOSURE_CORRELATION_LIMIT', '0.7'))  # Pairs at or above move together
+EXPOSURE_MAX_CORRELATED = int(os.getenv('EXPOSURE_MAX_CORRELATED', '2'))  # Correlated holdings that block an entry
+EXPOSURE_MIN_DOWNSIZE_PCT = float(os.getenv('EXPOSURE_MIN_DOWNSIZE_PCT', '25.0'))  # Smaller entries are rejected
+
+# =============================================================================
+# SCHEDULED REPORT DISPATCH
+# =============================================================================
+
+REPORT_SENDS_PER_SECOND = float(os.getenv('REPORT_SENDS_PER_SECOND', '25'))  # Telegram allows ~30 messages/s per bot
+REPORT_MISSED_GRACE_MINUTES = int(os.getenv('REPORT_MISSED_GRACE_MINUTES', '60'))  # Older missed sends are skipped
+REPORT_DISPATCH_MAX_SLEEP_SECONDS = int(os.getenv('REPORT_DISPATCH_MAX_SLEEP_SECONDS', '60'))  # Picks up new schedules
 
 # =============================================================================
 # LOGGING
@@ -76,6 +175,10 @@ ENABLE_ANALYSIS_CACHE = os.getenv('ENABLE_ANALYSIS_CACHE', 'false').lower() == '
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = os.getenv('LOG_FILE', 'logs/bot.log')
 
+# Per-stage timing histograms (/timings admin command + periodic log line)
+ENABLE_STAGE_TIMING = os.getenv('ENABLE_STAGE_TIMING', 'false').lower() == 'true'
+STAGE_TIMING_LOG_INTERVAL_MINUTES = int(os.getenv('STAGE_TIMING_LOG_INTERVAL_MINUTES', '15'))
+
 # =============================================================================
 # TIMEZONE
 # =============================================================================
@@ -113,6 +216,7 @@ PAPER_TRADING_DEFAULT_CAPITAL = float(os.getenv('PAPER_TRADING_DEFAULT_CAPITAL',
 PAPER_TRADING_DEFAULT_MAX_POSITIONS = int(os.getenv('PAPER_TRADING_DEFAULT_MAX_POSITIONS', '15'))
 PAPER_TRADING_DEFAULT_RISK_PCT = float(os.getenv('PAPER_TRADING_DEFAULT_RISK_PCT', '1.0'))
 PAPER_TRADING_MONITOR_INTERVAL = int(os.getenv('PAPER_TRADING_MONITOR_INTERVAL', '300'))  # 5 minutes
+PAPER_TRADING_PNL_MARK_INTERVAL = int(os.getenv('PAPER_TRADING_PNL_MARK_INTERVAL', '1800'))  # Unrealized P&L write-back, 30 minutes
 PAPER_TRADING_MAX_POSITION_SIZE_PCT = float(os.getenv('PAPER_TRADING_MAX_POSITION_SIZE_PCT', '20.0'))
 
 # Dry-run mode (testing without database modifications)
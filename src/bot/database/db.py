@@ -7,16 +7,20 @@ Author: Harsh Kandhway
 
 import os
 import sys
-from typing import Generator, Optional, List, Dict, Any
+from typing import Callable, Generator, Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, func, insert, inspect, select, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
-from src.bot.database.models import Base, User, UserSettings, DailyBuySignal
-from src.bot.config import DATABASE_URL
-from datetime import datetime
+from src.bot.database.models import (
+    Base, User, UserSettings, DailyBuySignal, PaperPosition, ScheduledReport, SchemaVersion, UserSignalRequest,
+    UserSignalResponse
+)
+from src.bot.config import DATABASE_URL, DEFAULT_TIMEZONE
+from datetime import datetime, time, timedelta
 
 
 def safe_print(message: str):
@@ -94,236 +98,208 @@ def get_db_context():
 
 def init_db():
     """
-    Initialize database - create all tables
+    Initialize database - create all tables and apply pending migrations
     """
     # Ensure data directory exists
     if 'sqlite' in DATABASE_URL:
         db_path = DATABASE_URL.replace('sqlite:///', '')
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
     
+    is_new_database = not inspect(engine).has_table('users')
+    
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
-    # Run migrations to add new columns
-    migrate_database()
+    if is_new_database:
+        # Fresh schema already matches the models - record every step as applied
+        stamp_schema_version()
+    else:
+        migrate_database()
     
     safe_print("✅ Database initialized successfully!")
 
 
-def migrate_database():
+# =============================================================================
+# SCHEMA MIGRATIONS
+# =============================================================================
+
+# Ordered registry of (version, name, step). Each step receives a connection
+# inside its own transaction and must be safe to run against a schema that
+# already has the change (older databases were patched ad hoc).
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = []
+
+
+def migration(version: int, name: str):
     """
-    Run migrations to add new columns to existing tables.
-    SQLite doesn't support ADD COLUMN IF NOT EXISTS, so we check first.
+    Register a migration step
+
+    Args:
+        version: Schema version the step upgrades to (strictly increasing)
+        name: Short description stored in schema_version
+    """
+    def decorator(step: Callable[[Connection], None]):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} registered out of order")
+        MIGRATIONS.append((version, name, step))
+        return step
+    return decorator
+
+
+def _columns(conn: Connection, table: str) -> List[str]:
+    """Current column names of a table"""
+    return [col['name'] for col in inspect(conn).get_columns(table)]
+
+
+def _add_columns(conn: Connection, table: str, columns: List[Tuple[str, str]]):
+    """Add (name, DDL type/default) columns that do not exist yet"""
+    existing = _columns(conn, table)
+    for name, ddl in columns:
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+            safe_print(f"✅ Added {table}.{name} column")
+
+
+@migration(1, 'user_settings daily alerts and horizon')
+def _migrate_user_settings_alerts(conn: Connection):
+    """Daily BUY alert settings and investment horizon"""
+    _add_columns(conn, 'user_settings', [
+        ('investment_horizon', "VARCHAR(20) DEFAULT '3months'"),
+        ('daily_buy_alerts_enabled', 'BOOLEAN DEFAULT 0'),
+        ('daily_buy_alert_time', "VARCHAR(10) DEFAULT '09:00'"),
+        ('last_daily_alert_sent', 'DATETIME'),
+    ])
+    # Deprecated - using unified formatter
+    if 'beginner_mode' in _columns(conn, 'user_settings'):
+        conn.execute(text("ALTER TABLE user_settings DROP COLUMN beginner_mode"))
+        safe_print("✅ Removed deprecated beginner_mode column")
+
+
+@migration(2, 'user_settings paper trading columns')
+def _migrate_user_settings_paper_trading(conn: Connection):
+    """Paper trading settings (renames legacy columns first)"""
+    # Rename old column names first so their data is preserved
+    renames = [
+        ('paper_trading_capital', 'paper_trading_default_capital'),
+        ('paper_trading_risk_per_trade_pct', 'paper_trading_risk_percentage'),
+    ]
+    for old, new in renames:
+        columns = _columns(conn, 'user_settings')
+        if old in columns and new not in columns:
+            conn.execute(text(f"ALTER TABLE user_settings RENAME COLUMN {old} TO {new}"))
+            safe_print(f"✅ Renamed {old} -> {new} (data preserved)")
+
+    _add_columns(conn, 'user_settings', [
+        ('paper_trading_enabled', 'BOOLEAN DEFAULT 0'),
+        ('paper_trading_default_capital', 'FLOAT DEFAULT 500000.0'),
+        ('paper_trading_max_positions', 'INTEGER DEFAULT 15'),
+        ('paper_trading_risk_percentage', 'FLOAT DEFAULT 1.0'),
+        ('paper_trading_monitor_interval_seconds', 'INTEGER DEFAULT 300'),
+        ('paper_trading_max_position_size_pct', 'FLOAT DEFAULT 20.0'),
+        ('paper_trading_buy_execution_time', "VARCHAR(5) DEFAULT '09:20'"),
+        ('paper_trading_daily_summary_time', "VARCHAR(5) DEFAULT '16:00'"),
+        ('paper_trading_weekly_summary_time', "VARCHAR(5) DEFAULT '18:00'"),
+        ('paper_trading_position_rebalance_time', "VARCHAR(5) DEFAULT '11:00'"),
+        ('paper_trading_entry_price_tolerance_pct', 'FLOAT DEFAULT 3.0'),
+    ])
+
+
+@migration(3, 'composite indexes for hot queries')
+def _migrate_composite_indexes(conn: Connection):
+    """Create multi-column indexes declared on the models"""
+    # Open positions per session and per-user request history
+    for table in (PaperPosition.__table__, UserSignalRequest.__table__):
+        for index in table.indexes:
+            if len(index.columns) > 1:
+                index.create(conn, checkfirst=True)
+
+
+@migration(4, 'scheduled report dispatch index')
+def _migrate_scheduled_report_dispatch(conn: Connection):
+    """Creation time and the due-report index used by the report dispatcher"""
+    _add_columns(conn, 'scheduled_reports', [('created_at', 'DATETIME')])
+    for index in ScheduledReport.__table__.indexes:
+        if len(index.columns) > 1:
+            index.create(conn, checkfirst=True)
+
+
+@migration(5, 'on-demand signal tables')
+def _migrate_on_demand_signals(conn: Connection):
+    """
+    Scan request/response tables (replaces the standalone
+    migrations/add_on_demand_signals.py script)
+    """
+    for table in (UserSignalRequest.__table__, UserSignalResponse.__table__):
+        table.create(conn, checkfirst=True)
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    # Same columns as the model indexes above; created by the old script
+    for name in (
+        'idx_user_signal_requests_user_id', 'idx_user_signal_requests_timestamp',
+        'idx_user_signal_responses_request_id', 'idx_user_signal_responses_user_id',
+    ):
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def get_schema_version(conn: Connection) -> int:
+    """
+    Highest applied migration version
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Version number (0 if no migration has been recorded)
     """
-    from sqlalchemy import text, inspect
-    
-    try:
-        inspector = inspect(engine)
-        
-        # Check if user_settings table exists
-        if 'user_settings' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('user_settings')]
-            
-            # Add investment_horizon column if it doesn't exist
-            if 'investment_horizon' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN investment_horizon VARCHAR(20) DEFAULT '3months'"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added investment_horizon column")
-            
-            # Add daily_buy_alerts_enabled column if it doesn't exist
-            if 'daily_buy_alerts_enabled' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN daily_buy_alerts_enabled BOOLEAN DEFAULT 0"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added daily_buy_alerts_enabled column")
-            
-            # Add daily_buy_alert_time column if it doesn't exist
-            if 'daily_buy_alert_time' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN daily_buy_alert_time VARCHAR(10) DEFAULT '09:00'"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added daily_buy_alert_time column")
-            
-            # Add last_daily_alert_sent column if it doesn't exist (for tracking alert status)
-            if 'last_daily_alert_sent' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN last_daily_alert_sent DATETIME"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added last_daily_alert_sent column")
-            
-            # Remove beginner_mode column if it exists (deprecated - using unified formatter)
-            if 'beginner_mode' in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings DROP COLUMN beginner_mode"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Removed deprecated beginner_mode column")
-
-            # =====================================================================
-            # PAPER TRADING MIGRATION - RENAME OLD COLUMNS
-            # =====================================================================
-            # Safely rename old column names to new names while preserving data
-            # This handles the migration from old schema to new schema
-            
-            # Rename paper_trading_capital -> paper_trading_default_capital
-            if 'paper_trading_capital' in columns and 'paper_trading_default_capital' not in columns:
-                try:
-                    with engine.connect() as conn:
-                        conn.execute(text(
-                            "ALTER TABLE user_settings RENAME COLUMN paper_trading_capital TO paper_trading_default_capital"
-                        ))
-                        conn.commit()
-                    safe_print("✅ Renamed paper_trading_capital -> paper_trading_default_capital (data preserved)")
-                except Exception as e:
-                    safe_print(f"⚠️ Could not rename paper_trading_capital: {e}")
-            
-            # Rename paper_trading_risk_per_trade_pct -> paper_trading_risk_percentage
-            if 'paper_trading_risk_per_trade_pct' in columns and 'paper_trading_risk_percentage' not in columns:
-                try:
-                    with engine.connect() as conn:
-                        conn.execute(text(
-                            "ALTER TABLE user_settings RENAME COLUMN paper_trading_risk_per_trade_pct TO paper_trading_risk_percentage"
-                        ))
-                        conn.commit()
-                    safe_print("✅ Renamed paper_trading_risk_per_trade_pct -> paper_trading_risk_percentage (data preserved)")
-                except Exception as e:
-                    safe_print(f"⚠️ Could not rename paper_trading_risk_per_trade_pct: {e}")
-            
-            # =====================================================================
-            # PAPER TRADING MIGRATION - ADD NEW COLUMNS
-            # =====================================================================
-            # Now add any missing new columns with proper defaults
-            # IMPORTANT: SQLAlchemy caches schema, so we need to dispose and recreate engine
-            # to get accurate column list after renames
-            
-            # Dispose old engine to clear schema cache
-            engine.dispose()
-            
-            # Create new engine and inspector to get fresh schema
-            from sqlalchemy import create_engine as _create_engine
-            from src.bot.config import DATABASE_URL
-            new_engine = _create_engine(
-                DATABASE_URL,
-                connect_args={'check_same_thread': False} if 'sqlite' in DATABASE_URL else {},
-                poolclass=StaticPool if 'sqlite' in DATABASE_URL else None,
-                echo=False
-            )
-            new_inspector = inspect(new_engine)
-            columns = [col['name'] for col in new_inspector.get_columns('user_settings')]
-            
-            # Add paper_trading_enabled if it doesn't exist
-            if 'paper_trading_enabled' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_enabled BOOLEAN DEFAULT 0"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_enabled column")
-            
-            # Add paper_trading_default_capital if it doesn't exist
-            if 'paper_trading_default_capital' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_default_capital FLOAT DEFAULT 500000.0"
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_default_capital FLOAT DEFAULT 500000.0"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_default_capital column")
-            
-            # Add paper_trading_max_positions if it doesn't exist
-            if 'paper_trading_max_positions' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_max_positions INTEGER DEFAULT 15"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_max_positions column")
-            
-            # Add paper_trading_risk_percentage if it doesn't exist
-            if 'paper_trading_risk_percentage' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_risk_percentage FLOAT DEFAULT 1.0"
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_risk_percentage FLOAT DEFAULT 1.0"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_risk_percentage column")
-            
-            # Add paper_trading_monitor_interval_seconds if it doesn't exist
-            if 'paper_trading_monitor_interval_seconds' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_monitor_interval_seconds INTEGER DEFAULT 300"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_monitor_interval_seconds column")
-            
-            # Add paper_trading_max_position_size_pct if it doesn't exist
-            if 'paper_trading_max_position_size_pct' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_max_position_size_pct FLOAT DEFAULT 20.0"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_max_position_size_pct column")
-            
-            # Add paper_trading_buy_execution_time if it doesn't exist
-            if 'paper_trading_buy_execution_time' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_buy_execution_time VARCHAR(5) DEFAULT '09:20'"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_buy_execution_time column")
-            
-            # Add paper_trading_daily_summary_time if it doesn't exist
-            if 'paper_trading_daily_summary_time' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_daily_summary_time VARCHAR(5) DEFAULT '16:00'"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_daily_summary_time column")
-            
-            # Add paper_trading_weekly_summary_time if it doesn't exist
-            if 'paper_trading_weekly_summary_time' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_weekly_summary_time VARCHAR(5) DEFAULT '18:00'"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_weekly_summary_time column")
-            
-            # Add paper_trading_position_rebalance_time if it doesn't exist
-            if 'paper_trading_position_rebalance_time' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_position_rebalance_time VARCHAR(5) DEFAULT '11:00'"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_position_rebalance_time column")
-            
-            # Add paper_trading_entry_price_tolerance_pct if it doesn't exist
-            if 'paper_trading_entry_price_tolerance_pct' not in columns:
-                with new_engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE user_settings ADD COLUMN paper_trading_entry_price_tolerance_pct FLOAT DEFAULT 3.0"
-                    ))
-                    conn.commit()
-                    safe_print("✅ Added paper_trading_entry_price_tolerance_pct column")
+    return conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+
+
+def stamp_schema_version(version: Optional[int] = None):
+    """
+    Mark migrations up to `version` as applied without running them
+
+    Args:
+        version: Target version (defaults to the latest registered)
+    """
+    target = MIGRATIONS[-1][0] if version is None else version
+    with engine.begin() as conn:
+        current = get_schema_version(conn)
+        rows = [
+            {'version': v, 'name': name, 'applied_at': datetime.utcnow()}
+            for v, name, _ in MIGRATIONS if current < v <= target
+        ]
+        if rows:
+            conn.execute(insert(SchemaVersion), rows)
+
+
+def migrate_database() -> int:
+    """
+    Apply pending migrations in version order, one transaction per step
+
+    A failing step is rolled back and stops the run; later steps are
+    retried on the next startup.
+
+    Returns:
+        Number of migrations applied
+    """
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+
+    pending = [m for m in MIGRATIONS if m[0] > current]
+    applied = 0
+    for version, name, step in pending:
+        try:
+            with engine.begin() as conn:
+                step(conn)
+                conn.execute(insert(SchemaVersion).values(
+                    version=version, name=name, applied_at=datetime.utcnow()
+                ))
+        except Exception as e:
+            safe_print(f"⚠️ Migration {version} ({name}) failed: {e}")
+            break
+        applied += 1
+        safe_print(f"✅ Applied migration {version}: {name}")
     
-    except Exception as e:
-        safe_print(f"⚠️ Migration warning: {e}")
+    return applied
 
 
 def drop_db():
@@ -928,6 +904,46 @@ def update_portfolio_position(
 # SCHEDULED REPORTS MANAGEMENT
 # =============================================================================
 
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def next_report_time(frequency: str, after: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Next send time of a report schedule, strictly after `after`
+    
+    Schedules are wall-clock times in DEFAULT_TIMEZONE: "HH:MM" (daily) or
+    "Monday HH:MM" (weekly).
+    
+    Args:
+        frequency: Schedule string
+        after: Naive UTC time (defaults to now)
+    
+    Returns:
+        Naive UTC datetime, or None if the schedule cannot be parsed
+    """
+    import pytz
+    
+    parts = (frequency or '').strip().lower().split()
+    weekday = None
+    if len(parts) == 2 and parts[0] in WEEKDAYS:
+        weekday = WEEKDAYS.index(parts[0])
+        parts = parts[1:]
+    try:
+        hours, minutes = (int(p) for p in parts[0].split(':'))
+        at = time(hours, minutes)
+    except (IndexError, ValueError):
+        return None
+    
+    tz = pytz.timezone(DEFAULT_TIMEZONE)
+    local_after = pytz.utc.localize(after or datetime.utcnow()).astimezone(tz)
+    day = local_after.date()
+    while True:
+        candidate = tz.localize(datetime.combine(day, at))
+        if candidate > local_after and (weekday is None or day.weekday() == weekday):
+            return candidate.astimezone(pytz.utc).replace(tzinfo=None)
+        day += timedelta(days=1)
+
+
 def get_user_scheduled_reports(db: Session, telegram_id: int, active_only: bool = True) -> List:
     """
     Get user's scheduled reports
@@ -987,7 +1003,8 @@ def create_scheduled_report(
         report_type=report_type,
         frequency=frequency,
         symbols=json.dumps(symbols) if symbols else None,
-        is_active=True
+        is_active=True,
+        next_scheduled=next_report_time(frequency)
     )
     
     db.add(report)
@@ -1047,6 +1064,8 @@ def update_scheduled_report_status(db: Session, report_id: int, is_active: bool)
         return False
     
     report.is_active = is_active
+    if is_active:
+        report.next_scheduled = next_report_time(report.frequency)
     db.commit()
     return True
 
@@ -1068,6 +1087,42 @@ def get_all_active_scheduled_reports(db: Session) -> List:
     ).all()
 
 
+def get_due_scheduled_reports(db: Session, now: Optional[datetime] = None) -> List:
+    """
+    Active scheduled reports whose next send time has passed
+    
+    Args:
+        db: Database session
+        now: Naive UTC time (defaults to now)
+    
+    Returns:
+        List of ScheduledReport objects, earliest first
+    """
+    from src.bot.database.models import ScheduledReport
+    
+    return db.query(ScheduledReport).filter(
+        ScheduledReport.is_active == True,
+        ScheduledReport.next_scheduled <= (now or datetime.utcnow())
+    ).order_by(ScheduledReport.next_scheduled).all()
+
+
+def get_next_report_due(db: Session) -> Optional[datetime]:
+    """
+    Earliest next send time across active scheduled reports
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        Naive UTC datetime, or None if nothing is scheduled
+    """
+    from src.bot.database.models import ScheduledReport
+    
+    return db.query(func.min(ScheduledReport.next_scheduled)).filter(
+        ScheduledReport.is_active == True
+    ).scalar()
+
+
 def get_subscribed_users_for_daily_buy_alerts(db: Session) -> List[User]:
     """
     Get all users subscribed to daily BUY alerts
@@ -203,11 +203,16 @@ class ScheduledReport(Base):
     symbols = Column(Text)  # JSON list of symbols
     is_active = Column(Boolean, default=True, index=True)
     last_sent = Column(DateTime)
-    next_scheduled = Column(DateTime)
+    next_scheduled = Column(DateTime)  # UTC; the dispatcher sleeps until the earliest one
+    created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationship
     user = relationship("User", back_populates="scheduled_reports")
     
+    __table_args__ = (
+        Index('ix_scheduled_report_due', 'is_active', 'next_scheduled'),
+    )
+    
     @hybrid_property
     def symbol_list(self):
         """Get symbols as list"""
@@ -344,6 +349,64 @@ class DailyBuySignal(Base):
         return f"<DailyBuySignal symbol={self.symbol} date={self.analysis_date} type={self.recommendation_type}>"
 
 
+class WatchlistDigest(Base):
+    """Watchlist digest model - after-close snapshot of one watched symbol, shared by all users"""
+    __tablename__ = 'watchlist_digests'
+    
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String(50), nullable=False, index=True)
+    digest_date = Column(DateTime, nullable=False)  # Trading day (midnight, exchange time)
+    current_price = Column(Float)
+    change_pct = Column(Float)  # Change vs previous close
+    recommendation = Column(String(100))  # Balanced mode
+    recommendation_type = Column(String(20))
+    confidence = Column(Float)
+    rsi = Column(Float)
+    rsi_zone = Column(String(30))
+    snapshot_data = Column(Text)  # JSON: per-mode results, EMA/MACD state, patterns
+    changes_data = Column(Text)  # JSON list of changes vs the previous digest
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # One digest per symbol per trading day
+    __table_args__ = (
+        UniqueConstraint('symbol', 'digest_date', name='uix_digest_symbol_date'),
+        Index('ix_watchlist_digest_date', 'digest_date'),
+    )
+    
+    @hybrid_property
+    def snapshot(self):
+        """Get snapshot as dict"""
+        if self.snapshot_data:
+            try:
+                return json.loads(self.snapshot_data)
+            except json.JSONDecodeError:
+                return {}
+        return {}
+    
+    @snapshot.setter
+    def snapshot(self, value):
+        """Set snapshot from dict"""
+        self.snapshot_data = json.dumps(value, default=str) if value else None
+    
+    @hybrid_property
+    def changes(self):
+        """Get changes as list"""
+        if self.changes_data:
+            try:
+                return json.loads(self.changes_data)
+            except json.JSONDecodeError:
+                return []
+        return []
+    
+    @changes.setter
+    def changes(self, value):
+        """Set changes from list"""
+        self.changes_data = json.dumps(value, default=str) if value else None
+    
+    def __repr__(self):
+        return f"<WatchlistDigest symbol={self.symbol} date={self.digest_date}>"
+
+
 class PendingAlert(Base):
     """Pending alert model - tracks failed alerts that need retry"""
     __tablename__ = 'pending_alerts'
@@ -413,6 +476,7 @@ class PaperTradingSession(Base):
     positions = relationship("PaperPosition", back_populates="session", cascade="all, delete-orphan")
     trades = relationship("PaperTrade", back_populates="session", cascade="all, delete-orphan")
     analytics = relationship("PaperTradeAnalytics", back_populates="session", cascade="all, delete-orphan")
+    aggregates = relationship("PaperTradeAggregate", back_populates="session", cascade="all, delete-orphan")
     logs = relationship("PaperTradingLog", back_populates="session", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -463,6 +527,7 @@ class PaperPosition(Base):
     __table_args__ = (
         UniqueConstraint('session_id', 'symbol', name='uix_session_symbol'),
         Index('ix_paper_position_open', 'is_open'),
+        Index('ix_paper_position_session_open', 'session_id', 'is_open'),
         Index('ix_paper_position_entry_date', 'entry_date'),
     )
 
@@ -690,6 +755,159 @@ class PaperTradeAnalytics(Base):
         return f"<PaperTradeAnalytics id={self.id} period={self.period_type} trades={self.trades_count} win_rate={self.win_rate_pct}%>"
 
 
+class PaperTradeAggregate(Base):
+    """Running performance aggregates - updated incrementally on every trade exit"""
+    __tablename__ = 'paper_trade_aggregates'
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey('paper_trading_sessions.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # Bucket Definition
+    scope = Column(String(20), nullable=False)  # 'session', 'recommendation', 'daily'
+    scope_key = Column(String(50), nullable=False, default='')  # '', recommendation type, or exit date (YYYY-MM-DD)
+
+    # Counts
+    trades_count = Column(Integer, default=0, nullable=False)
+    winning_trades = Column(Integer, default=0, nullable=False)
+    losing_trades = Column(Integer, default=0, nullable=False)
+
+    # P&L Sums
+    sum_pnl = Column(Float, default=0.0, nullable=False)
+    sum_pnl_sq = Column(Float, default=0.0, nullable=False)
+    gross_profit = Column(Float, default=0.0, nullable=False)
+    gross_loss = Column(Float, default=0.0, nullable=False)
+    sum_r_multiple = Column(Float, default=0.0, nullable=False)
+    sum_r_multiple_sq = Column(Float, default=0.0, nullable=False)
+    sum_days_held = Column(Float, default=0.0, nullable=False)
+
+    # Extremes
+    best_trade_pnl = Column(Float, nullable=True)
+    worst_trade_pnl = Column(Float, nullable=True)
+
+    # Winner-side Sums
+    win_sum_pnl_pct = Column(Float, default=0.0, nullable=False)
+    win_sum_r_multiple = Column(Float, default=0.0, nullable=False)
+    win_sum_confidence = Column(Float, default=0.0, nullable=False)
+    win_sum_days_held = Column(Float, default=0.0, nullable=False)
+
+    # Loser-side Sums (absolute values)
+    loss_sum_pnl_pct = Column(Float, default=0.0, nullable=False)
+    loss_sum_confidence = Column(Float, default=0.0, nullable=False)
+    loss_sum_days_held = Column(Float, default=0.0, nullable=False)
+
+    # Exit Statistics
+    stop_loss_exits = Column(Integer, default=0, nullable=False)
+    premature_stops = Column(Integer, default=0, nullable=False)  # STOP_LOSS exits that were in profit at some point
+    loser_premature_stops = Column(Integer, default=0, nullable=False)
+    exit_reasons = Column(Text)  # JSON: {"STOP_LOSS": 5, "TARGET_HIT": 8, ...}
+    loser_exit_reasons = Column(Text)  # JSON: exit reasons of losing trades only
+
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('session_id', 'scope', 'scope_key', name='uix_aggregate_bucket'),
+    )
+
+    # Relationships
+    session = relationship("PaperTradingSession", back_populates="aggregates")
+
+    def add_trade(self, trade: "PaperTrade"):
+        """Fold a closed trade into the running aggregates"""
+        pnl = trade.pnl or 0.0
+        r_multiple = trade.r_multiple or 0.0
+        days_held = trade.days_held or 0
+        confidence = trade.entry_confidence or 0.0
+        premature = trade.exit_reason == 'STOP_LOSS' and (trade.max_unrealized_gain or 0) > 0
+
+        self.trades_count = (self.trades_count or 0) + 1
+        self.sum_pnl = (self.sum_pnl or 0.0) + pnl
+        self.sum_pnl_sq = (self.sum_pnl_sq or 0.0) + pnl * pnl
+        self.sum_r_multiple = (self.sum_r_multiple or 0.0) + r_multiple
+        self.sum_r_multiple_sq = (self.sum_r_multiple_sq or 0.0) + r_multiple * r_multiple
+        self.sum_days_held = (self.sum_days_held or 0.0) + days_held
+        self.best_trade_pnl = pnl if self.best_trade_pnl is None else max(self.best_trade_pnl, pnl)
+        self.worst_trade_pnl = pnl if self.worst_trade_pnl is None else min(self.worst_trade_pnl, pnl)
+
+        reasons = self.exit_reasons_data
+        reasons[trade.exit_reason] = reasons.get(trade.exit_reason, 0) + 1
+        self.exit_reasons_data = reasons
+
+        if trade.exit_reason == 'STOP_LOSS':
+            self.stop_loss_exits = (self.stop_loss_exits or 0) + 1
+            if premature:
+                self.premature_stops = (self.premature_stops or 0) + 1
+
+        if trade.is_winner:
+            self.winning_trades = (self.winning_trades or 0) + 1
+            self.gross_profit = (self.gross_profit or 0.0) + pnl
+            self.win_sum_pnl_pct = (self.win_sum_pnl_pct or 0.0) + (trade.pnl_pct or 0.0)
+            self.win_sum_r_multiple = (self.win_sum_r_multiple or 0.0) + r_multiple
+            self.win_sum_confidence = (self.win_sum_confidence or 0.0) + confidence
+            self.win_sum_days_held = (self.win_sum_days_held or 0.0) + days_held
+        else:
+            self.losing_trades = (self.losing_trades or 0) + 1
+            self.gross_loss = (self.gross_loss or 0.0) + abs(pnl)
+            self.loss_sum_pnl_pct = (self.loss_sum_pnl_pct or 0.0) + abs(trade.pnl_pct or 0.0)
+            self.loss_sum_confidence = (self.loss_sum_confidence or 0.0) + confidence
+            self.loss_sum_days_held = (self.loss_sum_days_held or 0.0) + days_held
+            if premature:
+                self.loser_premature_stops = (self.loser_premature_stops or 0) + 1
+            loser_reasons = self.loser_exit_reasons_data
+            loser_reasons[trade.exit_reason] = loser_reasons.get(trade.exit_reason, 0) + 1
+            self.loser_exit_reasons_data = loser_reasons
+
+    def pnl_std(self) -> float:
+        """Population standard deviation of trade P&L"""
+        return self._std(self.sum_pnl, self.sum_pnl_sq)
+
+    def r_multiple_std(self) -> float:
+        """Population standard deviation of trade R-multiples"""
+        return self._std(self.sum_r_multiple, self.sum_r_multiple_sq)
+
+    def _std(self, total: float, total_sq: float) -> float:
+        """Standard deviation from running sum and sum of squares"""
+        if not self.trades_count:
+            return 0.0
+        mean = (total or 0.0) / self.trades_count
+        variance = (total_sq or 0.0) / self.trades_count - mean * mean
+        return max(variance, 0.0) ** 0.5
+
+    @hybrid_property
+    def exit_reasons_data(self):
+        """Get exit reasons breakdown as dict"""
+        if self.exit_reasons:
+            try:
+                return json.loads(self.exit_reasons)
+            except json.JSONDecodeError:
+                return {}
+        return {}
+
+    @exit_reasons_data.setter
+    def exit_reasons_data(self, value):
+        """Set exit reasons breakdown from dict"""
+        self.exit_reasons = json.dumps(value) if value else None
+
+    @hybrid_property
+    def loser_exit_reasons_data(self):
+        """Get losing trades' exit reasons as dict"""
+        if self.loser_exit_reasons:
+            try:
+                return json.loads(self.loser_exit_reasons)
+            except json.JSONDecodeError:
+                return {}
+        return {}
+
+    @loser_exit_reasons_data.setter
+    def loser_exit_reasons_data(self, value):
+        """Set losing trades' exit reasons from dict"""
+        self.loser_exit_reasons = json.dumps(value) if value else None
+
+    def __repr__(self):
+        return f"<PaperTradeAggregate session_id={self.session_id} scope={self.scope}:{self.scope_key} trades={self.trades_count}>"
+
+
 class PaperTradingLog(Base):
     """Paper trading log model - detailed audit trail of all system actions"""
     __tablename__ = 'paper_trading_logs'
@@ -844,6 +1062,10 @@ class UserSignalRequest(Base):
     cached = Column(Boolean, default=False)
     error_message = Column(Text)
     
+    __table_args__ = (
+        Index('ix_signal_request_user_time', 'user_id', 'request_timestamp'),
+    )
+    
     # Relationships
     responses = relationship("UserSignalResponse", back_populates="request", cascade="all, delete-orphan")
     
@@ -882,3 +1104,19 @@ class UserSignalResponse(Base):
     
     def __repr__(self):
         return f"<UserSignalResponse {self.ticker} - {self.recommendation_type} - {self.confidence:.1f}%>"
+
+
+# =============================================================================
+# SCHEMA VERSIONING
+# =============================================================================
+
+class SchemaVersion(Base):
+    """Applied database migrations (one row per migration step)"""
+    __tablename__ = 'schema_version'
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SchemaVersion {self.version} - {self.name}>"
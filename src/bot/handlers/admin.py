@@ -0,0 +1,91 @@
+"""
+Admin Command Handlers
+Operator-only commands for inspecting the running bot
+
+Author: Harsh Kandhway
+"""
+
+import logging
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from ..config import TELEGRAM_ADMIN_IDS, EMOJI
+from ..utils.validators import parse_command_args
+from src.core import timing
+
+logger = logging.getLogger(__name__)
+
+
+def is_admin(user_id: int) -> bool:
+    """
+    Check if user is a configured admin
+
+    Unlike general authorization, an empty admin list grants nobody access.
+
+    Args:
+        user_id: Telegram user ID
+
+    Returns:
+        True if user is an admin
+    """
+    return user_id in TELEGRAM_ADMIN_IDS
+
+
+def format_timings(stats: dict) -> str:
+    """
+    Format stage timing statistics as a monospace table
+
+    Args:
+        stats: Output of timing.snapshot()
+
+    Returns:
+        Markdown message
+    """
+    lines = [
+        f"{'stage':<36}{'n':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}",
+    ]
+    for name, stat in stats.items():
+        lines.append(
+            f"{name:<36}{stat['count']:>6}{stat['errors']:>5}"
+            f"{stat['p50_ms']:>9.1f}{stat['p95_ms']:>9.1f}{stat['p99_ms']:>9.1f}"
+        )
+    return "⏱ *Stage timings* (ms)\n\n```\n" + "\n".join(lines) + "\n```"
+
+
+async def timings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Handle /timings command (admin only)
+
+    Usage:
+        /timings          - Show per-stage latency percentiles
+        /timings PREFIX   - Only stages starting with PREFIX (e.g. analysis)
+        /timings reset    - Clear collected samples
+    """
+    user_id = update.effective_user.id
+
+    if not is_admin(user_id):
+        await update.message.reply_text(f"{EMOJI['error']} This command is for administrators only.")
+        logger.warning(f"Non-admin user {user_id} attempted /timings")
+        return
+
+    args = parse_command_args(update.message.text, 'timings')
+
+    if args and args[0].lower() == 'reset':
+        timing.reset()
+        await update.message.reply_text(f"{EMOJI['success']} Stage timings reset.")
+        return
+
+    if not timing.is_enabled():
+        await update.message.reply_text(
+            f"{EMOJI['info']} Stage timing is disabled.\n\n"
+            f"Set `ENABLE_STAGE_TIMING=true` in your .env and restart the bot.",
+            parse_mode='Markdown'
+        )
+        return
+
+    stats = timing.snapshot(args[0] if args else None)
+    if not stats:
+        await update.message.reply_text(f"{EMOJI['info']} No timing samples collected yet.")
+        return
+
+    await update.message.reply_text(format_timings(stats), parse_mode='Markdown')
@@ -8,7 +8,8 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from src.bot.config import EMOJI, ERROR_MESSAGES
-from src.bot.services.analysis_service import analyze_stock
+from src.bot.services.analysis_service import get_analysis_variant
+from src.bot.services.chart_service import get_chart_service
 from src.core.formatters import (
     format_analysis_comprehensive,
     format_error, chunk_message
@@ -16,18 +17,23 @@ from src.core.formatters import (
 from src.bot.utils.keyboards import create_analysis_action_keyboard
 from src.bot.utils.validators import validate_stock_symbol, parse_command_args
 from src.bot.database.db import get_user_settings, get_db_context
+from src.core.timing import stage
 
 logger = logging.getLogger(__name__)
 
 
-def analyze_stock_with_settings(symbol: str, user_id: int, db) -> dict:
+def analyze_stock_with_settings(symbol: str, user_id: int, db, refresh: bool = False) -> dict:
     """
     Analyze a stock using user settings from database.
     
+    Results come from the symbol's cached mode/horizon set, so changing
+    settings re-renders without a new download.
+    
     Args:
         symbol: Stock ticker symbol
         user_id: User ID to fetch settings for
         db: Database session
+        refresh: Re-analyze even if a recent result set is cached
     
     Returns:
         Analysis dictionary with results, or dict with 'error' key if failed
@@ -47,9 +53,7 @@ def analyze_stock_with_settings(symbol: str, user_id: int, db) -> dict:
             timeframe = settings.timeframe or timeframe
             horizon = getattr(settings, 'investment_horizon', None) or horizon
         
-        # Perform analysis (cache disabled by default to respect horizon changes)
-        analysis = analyze_stock(symbol, mode=mode, timeframe=timeframe, horizon=horizon, use_cache=False)
-        return analysis
+        return get_analysis_variant(symbol, mode=mode, timeframe=timeframe, horizon=horizon, refresh=refresh)
         
     except ValueError as e:
         logger.error(f"Analysis failed for {symbol}: {e}")
@@ -118,9 +122,12 @@ async def analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         except Exception as e:
             logger.warning(f"Could not fetch user settings: {e}")
 
-        # Perform analysis (cache disabled by default to respect horizon changes)
+        # Served from the symbol's mode/horizon set, so settings changes re-render instantly
         try:
-            analysis = analyze_stock(symbol, mode=mode, timeframe=timeframe, horizon=horizon, use_cache=False)
+            analysis = get_analysis_variant(
+                symbol, mode=mode, timeframe=timeframe, horizon=horizon,
+                include_chart_data=True
+            )
         except ValueError as e:
             error_msg = str(e)
             
@@ -161,11 +168,12 @@ async def analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Format analysis result using comprehensive formatter
         try:
-            formatted_result = format_analysis_comprehensive(
-                analysis,
-                output_mode='bot',
-                horizon=horizon
-            )
+            with stage('analysis.format'):
+                formatted_result = format_analysis_comprehensive(
+                    analysis,
+                    output_mode='bot',
+                    horizon=horizon
+                )
         except Exception as e:
             logger.error(f"Error formatting analysis: {e}")
             formatted_result = f"{EMOJI['error']} Error formatting results. Please try again."
@@ -196,6 +204,9 @@ async def analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     parse_mode='Markdown'
                 )
         
+        # Attach chart (rendered off the event loop, shared across users per bar)
+        await get_chart_service().send_analysis_chart(context.bot, update.effective_chat.id, analysis)
+        
         logger.info(f"User {user_id} analyzed {symbol} (mode={mode}, timeframe={timeframe}, horizon={horizon})")
         
     except Exception as e:
@@ -262,9 +273,9 @@ async def quick_analyze_command(update: Update, context: ContextTypes.DEFAULT_TY
         except Exception as e:
             logger.warning(f"Could not fetch user settings: {e}")
         
-        # Perform analysis (cache disabled by default to respect horizon changes)
+        # Served from the symbol's mode/horizon set, so settings changes re-render instantly
         try:
-            analysis = analyze_stock(symbol, mode=mode, timeframe=timeframe, horizon=horizon, use_cache=False)
+            analysis = get_analysis_variant(symbol, mode=mode, timeframe=timeframe, horizon=horizon)
         except ValueError as e:
             error_msg = str(e)
             
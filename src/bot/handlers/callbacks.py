@@ -11,6 +11,7 @@ Examples:
     - "settings_mode:conservative"
 """
 
+import asyncio
 import logging
 import json
 from typing import Optional
@@ -29,7 +30,9 @@ from ..database.db import (
     get_user_alerts,
     delete_alert
 )
-from ..services.analysis_service import analyze_stock, get_current_price
+from ..services.analysis_service import analyze_stock, get_analysis_variant, get_current_price
+from ..services.chart_service import get_chart_service
+from ..services.watchlist_digest_service import get_watchlist_digest_service
 from src.core.formatters import (
     format_analysis_comprehensive,
     format_success,
@@ -334,7 +337,11 @@ async def handle_watchlist_menu(query, context, params: list) -> None:
             )
             return
         
-        message = format_watchlist(watchlist)
+        settings = get_user_settings(db, user_id)
+        digests = get_watchlist_digest_service().get_user_summaries(
+            db, user_id, settings.risk_mode if settings else 'balanced'
+        )
+        message = format_watchlist(watchlist, digests=digests)
         keyboard = create_watchlist_menu_keyboard([w.symbol for w in watchlist])
         
         await query.edit_message_text(
@@ -633,7 +640,8 @@ async def handle_analyze_refresh(query, context, params: list) -> None:
             analysis = analyze_stock_with_settings(
                 symbol=symbol,
                 user_id=user_id,
-                db=db
+                db=db,
+                refresh=True
             )
             
             if analysis and 'error' not in analysis:
@@ -809,12 +817,12 @@ async def handle_analyze_full(query, context, params: list) -> None:
         horizon = getattr(settings, 'investment_horizon', None) or '3months'
         
         # Perform analysis
-        analysis_result = analyze_stock(
+        analysis_result = get_analysis_variant(
             symbol=symbol,
             mode=mode,
             timeframe=timeframe,
             horizon=horizon,
-            use_cache=False
+            include_chart_data=True
         )
         
         if 'error' in analysis_result:
@@ -851,6 +859,9 @@ async def handle_analyze_full(query, context, params: list) -> None:
                 text=chunk,
                 parse_mode='Markdown'
             )
+        
+        # Same cached chart as /analyze for this symbol and bar
+        await get_chart_service().send_analysis_chart(context.bot, query.message.chat_id, analysis_result)
 
 
 # ============================================================================
@@ -946,13 +957,36 @@ async def handle_chart(query, context, params: list) -> None:
         return
     
     symbol = params[0]
-    await query.edit_message_text(
-        f"📊 *Chart for {symbol}*\n\n"
-        f"Chart generation coming soon!\n\n"
-        f"For now, use external charting tools or visit:\n"
-        f"https://in.tradingview.com/chart/?symbol=NSE:{symbol.replace('.NS', '')}",
-        parse_mode='Markdown'
-    )
+    await query.answer("📊 Preparing chart...")
+    
+    user_id = query.from_user.id
+    with get_db_context() as db:
+        settings = get_user_settings(db, user_id)
+        mode = settings.risk_mode if settings and settings.risk_mode else 'balanced'
+        timeframe = settings.timeframe if settings and settings.timeframe else 'medium'
+        horizon = getattr(settings, 'investment_horizon', None) or '3months'
+    
+    try:
+        loop = asyncio.get_running_loop()
+        analysis = await loop.run_in_executor(
+            None,
+            lambda: get_analysis_variant(
+                symbol, mode=mode, timeframe=timeframe, horizon=horizon,
+                include_chart_data=True
+            )
+        )
+        sent = await get_chart_service().send_analysis_chart(context.bot, query.message.chat_id, analysis)
+    except Exception as e:
+        logger.warning(f"Chart analysis failed for {symbol}: {e}")
+        sent = False
+    
+    if not sent:
+        await query.edit_message_text(
+            f"📊 *Chart for {symbol}*\n\n"
+            f"Chart is not available right now. You can view it at:\n"
+            f"https://in.tradingview.com/chart/?symbol=NSE:{symbol.replace('.NS', '')}",
+            parse_mode='Markdown'
+        )
 
 
 async def handle_portfolio_add(query, context, params: list) -> None:
@@ -1071,6 +1105,7 @@ async def handle_watchlist_analyze(query, context) -> None:
 
     user_id = query.from_user.id
     
+    # Read what is needed, then release the session before analyzing
     with get_db_context() as db:
         watchlist = get_user_watchlist(db, user_id)
         
@@ -1080,59 +1115,58 @@ async def handle_watchlist_analyze(query, context) -> None:
         
         settings = get_user_settings(db, user_id)
         symbols = [w.symbol for w in watchlist]
+        mode = settings.risk_mode if settings else 'balanced'
+        timeframe = settings.timeframe if settings else 'medium'
+    
+    # Show progress message
+    await query.edit_message_text(
+        f"🔍 Analyzing {len(symbols)} stock(s) from your watchlist...\n\n"
+        f"This may take a moment."
+    )
+    
+    try:
+        # Fetch and analyze all stocks concurrently, off the event loop
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, analyze_multiple_stocks, symbols, mode, timeframe)
         
-        # Show progress message
-        await query.edit_message_text(
-            f"🔍 Analyzing {len(symbols)} stock(s) from your watchlist...\n\n"
-            f"This may take a moment."
-        )
-        
-        try:
-            # Analyze all stocks
-            results = analyze_multiple_stocks(
-                symbols=symbols,
-                mode=settings.risk_mode if settings else 'balanced',
-                timeframe=settings.timeframe if settings else 'medium'
-            )
-            
-            # Filter successful results (successful ones don't have 'error' key)
-            successful_results = [r for r in results if not r.get('error', False)]
-            failed_results = [r for r in results if r.get('error', False)]
-            
-            if not successful_results:
-                await query.edit_message_text(
-                    format_error(
-                        "Failed to analyze any stocks.\n\n"
-                        "Please check if the symbols are valid and try again."
-                    )
-                )
-                return
-            
-            # Format comparison table
-            message = format_comparison_table(successful_results)
-            
-            # Add failed stocks warning if any
-            if failed_results:
-                failed_symbols = [r['symbol'] for r in failed_results]
-                message += f"\n\n⚠️ Failed to analyze: {', '.join(failed_symbols)}"
-            
-            # Handle long messages
-            chunks = chunk_message(message)
-            
-            # Edit message with first chunk
-            await query.edit_message_text(chunks[0], parse_mode='Markdown')
-            
-            # Send remaining chunks as new messages
-            for chunk in chunks[1:]:
-                await query.message.reply_text(chunk, parse_mode='Markdown')
-            
-            logger.info(f"User {user_id} analyzed watchlist: {len(successful_results)} successful, {len(failed_results)} failed")
+        # Filter successful results (successful ones don't have 'error' key)
+        successful_results = [r for r in results if not r.get('error', False)]
+        failed_results = [r for r in results if r.get('error', False)]
         
-        except Exception as e:
-            logger.error(f"Error analyzing watchlist: {e}", exc_info=True)
+        if not successful_results:
             await query.edit_message_text(
-                format_error(f"An error occurred during analysis: {str(e)}")
+                format_error(
+                    "Failed to analyze any stocks.\n\n"
+                    "Please check if the symbols are valid and try again."
+                )
             )
+            return
+        
+        # Format comparison table
+        message = format_comparison_table(successful_results)
+        
+        # Add failed stocks warning if any
+        if failed_results:
+            failed_symbols = [r['symbol'] for r in failed_results]
+            message += f"\n\n⚠️ Failed to analyze: {', '.join(failed_symbols)}"
+        
+        # Handle long messages
+        chunks = chunk_message(message)
+        
+        # Edit message with first chunk
+        await query.edit_message_text(chunks[0], parse_mode='Markdown')
+        
+        # Send remaining chunks as new messages
+        for chunk in chunks[1:]:
+            await query.message.reply_text(chunk, parse_mode='Markdown')
+        
+        logger.info(f"User {user_id} analyzed watchlist: {len(successful_results)} successful, {len(failed_results)} failed")
+    
+    except Exception as e:
+        logger.error(f"Error analyzing watchlist: {e}", exc_info=True)
+        await query.edit_message_text(
+            format_error(f"An error occurred during analysis: {str(e)}")
+        )
 
 
 async def handle_watchlist_clear_confirm(query, context) -> None:
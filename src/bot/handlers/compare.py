@@ -4,15 +4,17 @@ Stock Comparison Handler
 This module handles the /compare command for comparing multiple stocks side-by-side.
 """
 
+import asyncio
 import logging
 from typing import List
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from ..database.db import get_db_context, get_or_create_user, get_user_settings
-from ..services.analysis_service import analyze_multiple_stocks
+from ..services.analysis_service import compare_stocks
 from src.core.formatters import (
     format_comparison_table,
+    format_relative_metrics,
     format_error,
     format_warning,
     chunk_message
@@ -113,76 +115,79 @@ async def compare_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
     
     try:
+        # Read settings, then release the session before the slow part
         with get_db_context() as db:
-            user = get_or_create_user(db, user_id, username)
+            get_or_create_user(db, user_id, username)
             settings = get_user_settings(db, user_id)
-            
-            # Analyze all stocks
-            results = analyze_multiple_stocks(
-                symbols=symbols,
-                mode=settings.risk_mode,
-                timeframe=settings.timeframe
-            )
-            
-            # Filter successful results (successful ones don't have 'error' key)
-            successful_results = [r for r in results if 'error' not in r]
-            failed_results = [r for r in results if 'error' in r]
-            
-            if not successful_results:
-                await progress_msg.edit_text(
-                    format_error(
-                        "Failed to analyze any of the provided stocks.\n\n"
-                        "Possible reasons:\n"
-                        "• Invalid symbols\n"
-                        "• Network issues\n"
-                        "• Data not available\n\n"
-                        "Please check the symbols and try again."
-                    )
-                )
-                return
-            
-            if len(successful_results) < 2:
-                await progress_msg.edit_text(
-                    format_warning(
-                        f"Only 1 stock analyzed successfully.\n\n"
-                        f"Comparison requires at least 2 stocks.\n\n"
-                        f"Failed: {', '.join([r['symbol'] for r in failed_results])}"
-                    )
+            mode, timeframe = settings.risk_mode, settings.timeframe
+        
+        # Fetch and analyze all symbols concurrently, off the event loop
+        loop = asyncio.get_running_loop()
+        comparison = await loop.run_in_executor(None, compare_stocks, symbols, mode, timeframe)
+        results = comparison['results']
+        
+        # Filter successful results (successful ones don't have 'error' key)
+        successful_results = [r for r in results if 'error' not in r]
+        failed_results = [r for r in results if 'error' in r]
+        
+        if not successful_results:
+            await progress_msg.edit_text(
+                format_error(
+                    "Failed to analyze any of the provided stocks.\n\n"
+                    "Possible reasons:\n"
+                    "• Invalid symbols\n"
+                    "• Network issues\n"
+                    "• Data not available\n\n"
+                    "Please check the symbols and try again."
                 )
-                return
-            
-            # Format comparison table
-            message = format_comparison_table(successful_results, output_mode='bot')
-            
-            # Add failed stocks warning if any
-            if failed_results:
-                failed_symbols = [r['symbol'] for r in failed_results]
-                message += f"\n\n⚠️ *Failed to analyze:* {', '.join(failed_symbols)}"
-            
-            # Add footer
-            message += (
-                f"\n\n━━━━━━━━━━━━━━━━━━━━\n"
-                f"💡 *Click buttons below to analyze any stock in detail.*"
             )
-            
-            # Create keyboard with analyze buttons for each symbol
-            successful_symbols = [r['symbol'] for r in successful_results]
-            keyboard = create_comparison_keyboard(successful_symbols)
-            
-            # Handle long messages
-            chunks = chunk_message(message)
-            
-            # Edit progress message with first chunk and keyboard
-            await progress_msg.edit_text(chunks[0], parse_mode='Markdown', reply_markup=keyboard)
-            
-            # Send remaining chunks (without keyboard)
-            for chunk in chunks[1:]:
-                await update.message.reply_text(chunk, parse_mode='Markdown')
-            
-            logger.info(
-                f"User {user_id} compared {len(symbols)} stocks: "
-                f"{len(successful_results)} successful, {len(failed_results)} failed"
+            return
+        
+        if len(successful_results) < 2:
+            await progress_msg.edit_text(
+                format_warning(
+                    f"Only 1 stock analyzed successfully.\n\n"
+                    f"Comparison requires at least 2 stocks.\n\n"
+                    f"Failed: {', '.join([r['symbol'] for r in failed_results])}"
+                )
             )
+            return
+        
+        # Format comparison table
+        message = format_comparison_table(successful_results, output_mode='bot')
+        
+        if comparison['relative']:
+            message += "\n\n" + format_relative_metrics(comparison['relative'], output_mode='bot')
+        
+        # Add failed stocks warning if any
+        if failed_results:
+            failed_symbols = [r['symbol'] for r in failed_results]
+            message += f"\n\n⚠️ *Failed to analyze:* {', '.join(failed_symbols)}"
+        
+        # Add footer
+        message += (
+            f"\n\n━━━━━━━━━━━━━━━━━━━━\n"
+            f"💡 *Click buttons below to analyze any stock in detail.*"
+        )
+        
+        # Create keyboard with analyze buttons for each symbol
+        successful_symbols = [r['symbol'] for r in successful_results]
+        keyboard = create_comparison_keyboard(successful_symbols)
+        
+        # Handle long messages
+        chunks = chunk_message(message)
+        
+        # Edit progress message with first chunk and keyboard
+        await progress_msg.edit_text(chunks[0], parse_mode='Markdown', reply_markup=keyboard)
+        
+        # Send remaining chunks (without keyboard)
+        for chunk in chunks[1:]:
+            await update.message.reply_text(chunk, parse_mode='Markdown')
+        
+        logger.info(
+            f"User {user_id} compared {len(symbols)} stocks: "
+            f"{len(successful_results)} successful, {len(failed_results)} failed"
+        )
     
     except Exception as e:
         logger.error(f"Error comparing stocks: {e}", exc_info=True)
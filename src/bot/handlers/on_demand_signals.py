@@ -10,13 +10,13 @@ Author: Harsh Kandhway
 Date: January 19, 2026
 """
 
+import asyncio
+import importlib
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
 
 from src.bot.database.db import get_db_context
-from src.bot.services.on_demand_analysis_service import get_on_demand_analysis_service
-from src.bot.services.export_service import export_to_csv, export_to_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +32,27 @@ SECTORS = [
 # Market caps
 MARKET_CAPS = ["Large Cap", "Mid Cap", "Small Cap"]
 
+# Loaded on first use (see _import_off_loop); bot.py warms them up at startup
+ANALYSIS_SERVICE_MODULE = 'src.bot.services.on_demand_analysis_service'
+EXPORT_SERVICE_MODULE = 'src.bot.services.export_service'
+
+
+async def _import_off_loop(module_path: str):
+    """
+    Import a module in a worker thread
+
+    A cold import of the analysis stack takes seconds; running it here keeps
+    the event loop serving other users. Already-imported modules return at
+    once from sys.modules.
+
+    Args:
+        module_path: Dotted module path
+
+    Returns:
+        The imported module
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, importlib.import_module, module_path)
+
 
 def format_current_filters(filters: dict) -> str:
     """Format current filters for display"""
@@ -400,8 +421,11 @@ async def scan_analyze_callback(update: Update, context: ContextTypes.DEFAULT_TY
     await query.edit_message_text("🔄 Analyzing market... This may take a moment.")
     
     try:
+        # Imported off the loop: pulls in pandas and the analysis stack
+        analysis_module = await _import_off_loop(ANALYSIS_SERVICE_MODULE)
+        
         with get_db_context() as db:
-            service = get_on_demand_analysis_service(db)
+            service = analysis_module.get_on_demand_analysis_service(db)
             result = await service.analyze_on_demand(
                 user_id=user_id,
                 sectors=filters.get('sectors'),
@@ -466,20 +490,20 @@ async def export_csv_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
     user_id = query.from_user.id
     
     try:
-        with get_db_context() as db:
-            csv_path = await export_to_csv(db, request_id, user_id)
-            
-            # Send file
-            with open(csv_path, 'rb') as f:
-                await context.bot.send_document(
-                    chat_id=user_id,
-                    document=f,
-                    filename=f"buy_signals_{request_id}.csv",
-                    caption="📄 *BUY Signals - CSV Export*\n\nYour scan results in CSV format.",
-                    parse_mode='Markdown'
-                )
-            
-            await query.answer("✅ CSV sent!", show_alert=True)
+        export_module = await _import_off_loop(EXPORT_SERVICE_MODULE)
+        
+        # Built off the event loop and cached per request; sent from memory
+        artifact = await export_module.export_to_csv(request_id, user_id)
+        
+        await context.bot.send_document(
+            chat_id=user_id,
+            document=artifact.data,
+            filename=artifact.filename,
+            caption="📄 *BUY Signals - CSV Export*\n\nYour scan results in CSV format.",
+            parse_mode='Markdown'
+        )
+        
+        await query.answer("✅ CSV sent!", show_alert=True)
     
     except Exception as e:
         logger.error(f"CSV export error: {e}", exc_info=True)
@@ -495,20 +519,20 @@ async def export_pdf_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
     user_id = query.from_user.id
     
     try:
-        with get_db_context() as db:
-            pdf_path = await export_to_pdf(db, request_id, user_id)
-            
-            # Send file
-            with open(pdf_path, 'rb') as f:
-                await context.bot.send_document(
-                    chat_id=user_id,
-                    document=f,
-                    filename=f"buy_signals_{request_id}.pdf",
-                    caption="📑 *BUY Signals - PDF Report*\n\nYour scan results in PDF format.",
-                    parse_mode='Markdown'
-                )
-            
-            await query.answer("✅ PDF sent!", show_alert=True)
+        export_module = await _import_off_loop(EXPORT_SERVICE_MODULE)
+        
+        # Built off the event loop and cached per request; sent from memory
+        artifact = await export_module.export_to_pdf(request_id, user_id)
+        
+        await context.bot.send_document(
+            chat_id=user_id,
+            document=artifact.data,
+            filename=artifact.filename,
+            caption="📑 *BUY Signals - PDF Report*\n\nYour scan results in PDF format.",
+            parse_mode='Markdown'
+        )
+        
+        await query.answer("✅ PDF sent!", show_alert=True)
     
     except Exception as e:
         logger.error(f"PDF export error: {e}", exc_info=True)
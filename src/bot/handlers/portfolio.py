@@ -117,6 +117,10 @@ async def show_portfolio(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 message += f"\n*{pos['symbol']}*\n"
                 message += f"  Shares: {format_number(pos['shares'], 2)}\n"
                 message += f"  Avg Price: {CURRENCY_SYMBOL}{format_number(pos['avg_buy_price'])}\n"
+                if not pos.get('price_available', True):
+                    message += f"  Invested: {CURRENCY_SYMBOL}{format_number(pos['invested_value'])}\n"
+                    message += "  Current: Price unavailable\n"
+                    continue
                 message += f"  Current: {CURRENCY_SYMBOL}{format_number(pos['current_price'])}\n"
                 message += f"  Invested: {CURRENCY_SYMBOL}{format_number(pos['invested_value'])}\n"
                 message += f"  Value: {CURRENCY_SYMBOL}{format_number(pos['current_value'])}\n"
@@ -19,11 +19,19 @@ from ..database.db import (
 )
 from ..utils.formatters import format_success, format_error
 from ..utils.validators import parse_command_args, validate_time
+from ..services.report_dispatcher import get_report_dispatcher
 from ..config import EMOJI, MAX_SCHEDULED_REPORTS
 
 logger = logging.getLogger(__name__)
 
 
+def _wake_dispatcher() -> None:
+    """Let the report dispatcher pick up a new or re-enabled schedule immediately."""
+    dispatcher = get_report_dispatcher()
+    if dispatcher:
+        dispatcher.wake()
+
+
 async def schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle /schedule command.
@@ -157,6 +165,7 @@ async def schedule_add(update: Update, context: ContextTypes.DEFAULT_TYPE, args:
             )
             
             if report:
+                _wake_dispatcher()
                 await update.message.reply_text(
                     format_success(
                         f"✓ Scheduled report created!\n\n"
@@ -257,6 +266,7 @@ async def schedule_toggle(update: Update, context: ContextTypes.DEFAULT_TYPE, ar
             success = update_scheduled_report_status(db, report_id, new_status)
             
             if success:
+                _wake_dispatcher()
                 status_text = "activated" if new_status else "paused"
                 await update.message.reply_text(
                     format_success(f"✓ Scheduled report #{report_id} {status_text}")
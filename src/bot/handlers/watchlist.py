@@ -9,6 +9,7 @@ This module handles all watchlist-related commands:
 - /watchlist clear - Clear entire watchlist
 """
 
+import asyncio
 import logging
 from typing import List
 from telegram import Update
@@ -23,6 +24,7 @@ from ..database.db import (
     get_user_settings
 )
 from ..services.analysis_service import analyze_stock, analyze_multiple_stocks
+from ..services.watchlist_digest_service import get_watchlist_digest_service
 from src.core.formatters import (
     format_watchlist,
     format_analysis_comprehensive,
@@ -114,8 +116,12 @@ async def show_watchlist(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
             return
         
-        # Format watchlist
-        message = format_watchlist(watchlist)
+        # Format watchlist with the latest after-close digests
+        settings = get_user_settings(db, user_id)
+        digests = get_watchlist_digest_service().get_user_summaries(
+            db, user_id, settings.risk_mode if settings else 'balanced'
+        )
+        message = format_watchlist(watchlist, digests=digests)
         
         # Create keyboard with action buttons
         symbols = [w.symbol for w in watchlist]
@@ -240,6 +246,7 @@ async def watchlist_analyze(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     username = update.effective_user.username
     
+    # Read what is needed, then release the session before analyzing
     with get_db_context() as db:
         user = get_or_create_user(db, user_id, username)
         watchlist = get_user_watchlist(db, user_id)
@@ -252,59 +259,57 @@ async def watchlist_analyze(update: Update, context: ContextTypes.DEFAULT_TYPE)
         
         settings = get_user_settings(db, user_id)
         symbols = [w.symbol for w in watchlist]
+        mode, timeframe = settings.risk_mode, settings.timeframe
+    
+    # Show progress message
+    progress_msg = await update.message.reply_text(
+        f"🔍 Analyzing {len(symbols)} stock(s) from your watchlist...\n\n"
+        f"This may take a moment."
+    )
+    
+    try:
+        # Fetch and analyze all stocks concurrently, off the event loop
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, analyze_multiple_stocks, symbols, mode, timeframe)
         
-        # Show progress message
-        progress_msg = await update.message.reply_text(
-            f"🔍 Analyzing {len(symbols)} stock(s) from your watchlist...\n\n"
-            f"This may take a moment."
-        )
-        
-        try:
-            # Analyze all stocks
-            results = analyze_multiple_stocks(
-                symbols=symbols,
-                mode=settings.risk_mode,
-                timeframe=settings.timeframe
-            )
-            
-            # Filter successful results (successful ones don't have 'error' key)
-            successful_results = [r for r in results if not r.get('error', False)]
-            failed_results = [r for r in results if r.get('error', False)]
-            
-            if not successful_results:
-                await progress_msg.edit_text(
-                    format_error(
-                        "Failed to analyze any stocks.\n\n"
-                        "Please check if the symbols are valid and try again."
-                    )
-                )
-                return
-            
-            # Format comparison table
-            message = format_comparison_table(successful_results)
-            
-            # Add failed stocks warning if any
-            if failed_results:
-                failed_symbols = [r['symbol'] for r in failed_results]
-                message += f"\n\n⚠️ Failed to analyze: {', '.join(failed_symbols)}"
-            
-            # Handle long messages
-            chunks = chunk_message(message)
-            
-            # Edit progress message with first chunk
-            await progress_msg.edit_text(chunks[0], parse_mode='Markdown')
-            
-            # Send remaining chunks
-            for chunk in chunks[1:]:
-                await update.message.reply_text(chunk, parse_mode='Markdown')
-            
-            logger.info(f"User {user_id} analyzed watchlist: {len(successful_results)} successful, {len(failed_results)} failed")
+        # Filter successful results (successful ones don't have 'error' key)
+        successful_results = [r for r in results if not r.get('error', False)]
+        failed_results = [r for r in results if r.get('error', False)]
         
-        except Exception as e:
-            logger.error(f"Error analyzing watchlist: {e}", exc_info=True)
+        if not successful_results:
             await progress_msg.edit_text(
-                format_error(f"An error occurred during analysis: {str(e)}")
+                format_error(
+                    "Failed to analyze any stocks.\n\n"
+                    "Please check if the symbols are valid and try again."
+                )
             )
+            return
+        
+        # Format comparison table
+        message = format_comparison_table(successful_results)
+        
+        # Add failed stocks warning if any
+        if failed_results:
+            failed_symbols = [r['symbol'] for r in failed_results]
+            message += f"\n\n⚠️ Failed to analyze: {', '.join(failed_symbols)}"
+        
+        # Handle long messages
+        chunks = chunk_message(message)
+        
+        # Edit progress message with first chunk
+        await progress_msg.edit_text(chunks[0], parse_mode='Markdown')
+        
+        # Send remaining chunks
+        for chunk in chunks[1:]:
+            await update.message.reply_text(chunk, parse_mode='Markdown')
+        
+        logger.info(f"User {user_id} analyzed watchlist: {len(successful_results)} successful, {len(failed_results)} failed")
+    
+    except Exception as e:
+        logger.error(f"Error analyzing watchlist: {e}", exc_info=True)
+        await progress_msg.edit_text(
+            format_error(f"An error occurred during analysis: {str(e)}")
+        )
 
 
 async def watchlist_clear(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
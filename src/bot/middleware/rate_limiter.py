@@ -0,0 +1,380 @@
+"""
+Rate Limiting Middleware
+Per-user token buckets with cost weights, checked before any handler runs
+
+Each user has one 'global' bucket measured in cost units (a market scan
+costs far more than a quote) plus one bucket per limited action from
+RATE_LIMITS measured in calls. Buckets refill continuously, so a user who
+has been idle gets their full allowance back without any cleanup job.
+All state lives in memory; it can optionally be written to a JSON file on
+shutdown and reloaded on start so a restart does not reset everyone.
+
+Author: Harsh Kandhway
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import Application, ApplicationHandlerStop, ContextTypes, TypeHandler
+
+from src.bot.config import (
+    ENABLE_RATE_LIMITING,
+    ERROR_MESSAGES,
+    RATE_LIMITS,
+    RATE_LIMIT_COSTS,
+    RATE_LIMIT_STATE_FILE,
+    SCAN_COOLDOWN,
+    TELEGRAM_ADMIN_IDS,
+)
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_LIMIT = 'global'
+
+# Callback actions (prefix before ':') that trigger expensive work
+# Anything not listed here is menu navigation and is not charged
+CALLBACK_ACTIONS: Dict[str, str] = {
+    'analyze': 'analyze',
+    'analyze_full': 'analyze',
+    'analyze_quick': 'quick',
+    'chart': 'chart',
+    'watchlist_analyze': 'watchlist_analyze',
+    'scan_analyze': 'scan',
+}
+
+# Buckets idle long enough to be full again carry no information
+_PRUNE_EVERY = 1000
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check"""
+    allowed: bool
+    retry_after: float = 0.0
+    limit: str = ''
+
+
+class TokenBucket:
+    """Continuously refilling token bucket"""
+
+    __slots__ = ('capacity', 'refill_rate', 'tokens', 'updated')
+
+    def __init__(self, capacity: float, refill_rate: float, now: float):
+        """
+        Args:
+            capacity: Maximum tokens (burst size)
+            refill_rate: Tokens added per second
+            now: Current time
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        """Add tokens earned since the last update"""
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+            self.updated = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 if available now)"""
+        if cost > self.capacity:
+            return math.inf
+        missing = cost - self.tokens
+        return 0.0 if missing <= 0 else missing / self.refill_rate
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket would be full at `now`"""
+        return self.tokens + (now - self.updated) * self.refill_rate >= self.capacity
+
+
+class RateLimiter:
+    """In-memory per-user, per-action rate limiter"""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, int]]] = None,
+        costs: Optional[Dict[str, int]] = None,
+        exempt_user_ids: Optional[list] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            limits: action -> {'max_calls', 'per_minutes'} (defaults to RATE_LIMITS)
+            costs: action -> cost against the global budget (defaults to RATE_LIMIT_COSTS)
+            exempt_user_ids: Users never limited (defaults to admins)
+            clock: Time source in seconds (wall clock so state can be persisted)
+        """
+        self.limits = RATE_LIMITS if limits is None else limits
+        self.costs = RATE_LIMIT_COSTS if costs is None else costs
+        self.exempt_user_ids = set(TELEGRAM_ADMIN_IDS if exempt_user_ids is None else exempt_user_ids)
+        self.clock = clock
+        self._buckets: Dict[Tuple[int, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._checks = 0
+
+    def cost_of(self, action: str) -> int:
+        """Global budget cost of an action (unlisted actions cost 1)"""
+        return self.costs.get(action, 1)
+
+    def check(self, user_id: int, action: str, cost: Optional[int] = None) -> RateLimitResult:
+        """
+        Charge one call of `action` to a user if every bucket allows it
+
+        Nothing is charged when the call is rejected.
+
+        Args:
+            user_id: Telegram user ID
+            action: Action key (command name or mapped callback action)
+            cost: Override for the global budget cost
+
+        Returns:
+            RateLimitResult with the binding limit and wait time if rejected
+        """
+        if user_id in self.exempt_user_ids:
+            return RateLimitResult(True)
+
+        cost = self.cost_of(action) if cost is None else cost
+        charges = []
+        if GLOBAL_LIMIT in self.limits and cost > 0:
+            charges.append((GLOBAL_LIMIT, cost))
+        if action in self.limits and action != GLOBAL_LIMIT:
+            charges.append((action, 1))
+        if not charges:
+            return RateLimitResult(True)
+
+        with self._lock:
+            now = self.clock()
+            self._checks += 1
+            if self._checks % _PRUNE_EVERY == 0:
+                self._prune(now)
+
+            buckets = []
+            for name, amount in charges:
+                bucket = self._bucket(user_id, name, now)
+                bucket.refill(now)
+                wait = bucket.wait_time(amount)
+                if wait > 0:
+                    return RateLimitResult(False, wait, name)
+                buckets.append((bucket, amount))
+
+            for bucket, amount in buckets:
+                bucket.tokens -= amount
+
+        return RateLimitResult(True)
+
+    def reset(self, user_id: Optional[int] = None):
+        """
+        Drop bucket state
+
+        Args:
+            user_id: Only reset this user (defaults to everyone)
+        """
+        with self._lock:
+            if user_id is None:
+                self._buckets.clear()
+            else:
+                for key in [k for k in self._buckets if k[0] == user_id]:
+                    del self._buckets[key]
+
+    def save(self, path: str):
+        """
+        Write non-full buckets to a JSON file (atomic replace)
+
+        Args:
+            path: File path
+        """
+        with self._lock:
+            now = self.clock()
+            state = [
+                [user_id, name, bucket.tokens, bucket.updated]
+                for (user_id, name), bucket in self._buckets.items()
+                if not bucket.is_full(now)
+            ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'saved_at': now, 'buckets': state}, f)
+        os.replace(tmp_path, path)
+        logger.info("Saved %d rate limit buckets to %s", len(state), path)
+
+    def load(self, path: str):
+        """
+        Restore buckets written by save() (missing or corrupt files are ignored)
+
+        Args:
+            path: File path
+        """
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable rate limit state %s: %s", path, e)
+            return
+
+        restored = 0
+        with self._lock:
+            for user_id, name, tokens, updated in state.get('buckets', []):
+                if name not in self.limits:
+                    continue
+                bucket = self._bucket(int(user_id), name, updated)
+                bucket.tokens = min(bucket.capacity, float(tokens))
+                restored += 1
+        logger.info("Restored %d rate limit buckets from %s", restored, path)
+
+    def _bucket(self, user_id: int, name: str, now: float) -> TokenBucket:
+        """Get or create a user's bucket for one limit"""
+        key = (user_id, name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limit = self.limits[name]
+            capacity = float(limit['max_calls'])
+            bucket = TokenBucket(capacity, capacity / (limit['per_minutes'] * 60), now)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _prune(self, now: float):
+        """Forget buckets that have refilled completely"""
+        for key in [k for k, b in self._buckets.items() if b.is_full(now)]:
+            del self._buckets[key]
+
+
+def classify_update(update: Update) -> Optional[str]:
+    """
+    Map an update to the action key it should be charged as
+
+    Slash commands are charged under their command name; callbacks only
+    when their action is listed in CALLBACK_ACTIONS.
+
+    Args:
+        update: Incoming update
+
+    Returns:
+        Action key, or None if the update is free
+    """
+    if update.callback_query and update.callback_query.data:
+        action = update.callback_query.data.split(':', 1)[0]
+        return CALLBACK_ACTIONS.get(action)
+
+    message = update.message
+    if message and message.text and message.text.startswith('/'):
+        command = message.text.split(maxsplit=1)[0][1:].split('@', 1)[0].lower()
+        return command or None
+
+    return None
+
+
+async def charge_update(update: Update, action: str) -> bool:
+    """
+    Charge an action to the update's user, replying if they are over budget
+
+    Used by the middleware and by routes it cannot classify on its own
+    (main menu buttons and pending text input are plain text messages).
+
+    Args:
+        update: Incoming update
+        action: Action key to charge
+
+    Returns:
+        True if the update may be handled, False if it was rejected
+    """
+    user = update.effective_user
+    if not ENABLE_RATE_LIMITING or user is None:
+        return True
+
+    result = get_rate_limiter().check(user.id, action)
+    if result.allowed:
+        return True
+
+    minutes = max(1, math.ceil(result.retry_after / 60)) if math.isfinite(result.retry_after) else 60
+    text = ERROR_MESSAGES['rate_limit'].format(minutes=minutes)
+    logger.info("Rate limited user %s on %s (%s limit, retry in %.0fs)",
+                user.id, action, result.limit, result.retry_after)
+
+    if update.callback_query:
+        await update.callback_query.answer(text, show_alert=True)
+    elif update.effective_message:
+        await update.effective_message.reply_text(text)
+    return False
+
+
+async def rate_limit_middleware(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Reject updates from users over their budget before any handler runs
+
+    Raises:
+        ApplicationHandlerStop: If the update is rate limited
+    """
+    if update.effective_user is None:
+        return
+
+    action = classify_update(update)
+    if action is None:
+        return
+
+    if not await charge_update(update, action):
+        raise ApplicationHandlerStop
+
+
+def register_rate_limiter(application: Application):
+    """
+    Install the rate limiter ahead of all other handlers
+
+    Args:
+        application: Bot application
+    """
+    if not ENABLE_RATE_LIMITING:
+        logger.info("Rate limiting disabled")
+        return
+
+    limiter = get_rate_limiter()
+    if RATE_LIMIT_STATE_FILE:
+        limiter.load(RATE_LIMIT_STATE_FILE)
+
+    application.add_handler(TypeHandler(Update, rate_limit_middleware), group=-1)
+
+
+def save_rate_limiter_state():
+    """Persist bucket state if a state file is configured"""
+    if ENABLE_RATE_LIMITING and RATE_LIMIT_STATE_FILE and _rate_limiter is not None:
+        _rate_limiter.save(RATE_LIMIT_STATE_FILE)
+
+
+# Singleton instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get singleton instance of RateLimiter
+
+    Returns:
+        RateLimiter instance
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+_scan_limiter: Optional[RateLimiter] = None
+
+
+def get_scan_limiter() -> RateLimiter:
+    """
+    Get singleton scan cooldown limiter (independent of ENABLE_RATE_LIMITING)
+
+    Returns:
+        RateLimiter with a single 'scan' limit from SCAN_COOLDOWN
+    """
+    global _scan_limiter
+    if _scan_limiter is None:
+        _scan_limiter = RateLimiter(limits={'scan': SCAN_COOLDOWN}, costs={})
+    return _scan_limiter
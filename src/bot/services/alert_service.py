@@ -23,8 +23,10 @@ from ..database.db import (
 )
 from ..database.models import Alert
 from .analysis_service import get_current_price, analyze_stock
+from .intraday_service import get_intraday_service
 from ..utils.formatters import format_success, format_warning
 from ..config import ALERT_CHECK_INTERVAL_MINUTES
+from src.core.timing import mark_failed, timed
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +50,7 @@ class AlertService:
         self.is_running = False
         logger.info("Alert service initialized")
     
+    @timed('alerts.check_all')
     async def check_all_alerts(self) -> Dict[str, Any]:
         """
         Check all active alerts across all users.
@@ -76,6 +79,9 @@ class AlertService:
                 
                 logger.info(f"Checking {len(alerts)} active alerts")
                 
+                # Keep price-alert symbols on the intraday refresh list
+                get_intraday_service().track({a.symbol for a in alerts if a.alert_type == 'price'})
+                
                 for alert in alerts:
                     try:
                         stats['checked'] += 1
@@ -117,9 +123,11 @@ class AlertService:
             error_msg = f"Error in check_all_alerts: {str(e)}"
             stats['errors'].append(error_msg)
             logger.error(error_msg, exc_info=True)
+            mark_failed()
         
         return stats
     
+    @timed('alerts.check_one')
     async def _check_alert(self, alert: Alert) -> bool:
         """
         Check if an alert condition is met.
@@ -145,14 +153,20 @@ class AlertService:
             logger.error(f"Error checking alert {alert.id}: {e}", exc_info=True)
             return False
     
+    async def _get_price(self, symbol: str) -> Optional[float]:
+        """Fresh intraday price, falling back to a daily fetch."""
+        price = get_intraday_service().latest_price(symbol)
+        if price is not None:
+            return price
+        
+        # Run in executor to avoid blocking
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, get_current_price, symbol)
+    
     async def _check_price_alert(self, alert: Alert) -> bool:
         """Check price alert condition."""
         try:
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            current_price = await loop.run_in_executor(
-                _executor, get_current_price, alert.symbol
-            )
+            current_price = await self._get_price(alert.symbol)
             
             condition = alert.params
             operator = condition.get('operator')
@@ -301,11 +315,7 @@ class AlertService:
     async def _format_price_alert_notification(self, alert: Alert) -> str:
         """Format price alert notification."""
         try:
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            current_price = await loop.run_in_executor(
-                _executor, get_current_price, alert.symbol
-            )
+            current_price = await self._get_price(alert.symbol)
             target_price = alert.params.get('value')
             
             message = (
@@ -5,33 +5,43 @@ Wraps core analysis modules and provides bot-friendly interface
 Author: Harsh Kandhway
 """
 
-import sys
 import os
+import time
 import logging
-from typing import Dict, Optional, Any, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, List, Iterable, Tuple
 from datetime import datetime, timedelta
 
 import pandas as pd
 
-logger = logging.getLogger(__name__)
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
-
-from src.core.config import TIMEFRAME_CONFIGS, RISK_MODES
+from src.core.config import (
+    TIMEFRAME_CONFIGS, DAILY_TIMEFRAMES, RISK_MODES, INVESTMENT_HORIZONS, DEFAULT_HORIZON
+)
+from src.core.correlation import align_closes, calculate_relative_metrics
 from src.core.indicators import calculate_all_indicators
 from src.core.signals import (
     check_hard_filters, calculate_all_signals, get_confidence_level,
-    determine_recommendation, generate_reasoning, generate_action_plan
+    determine_recommendation, generate_reasoning, generate_action_plan,
+    calculate_overall_score
 )
 from src.core.risk_management import (
     calculate_targets, calculate_stoploss, validate_risk_reward,
-    calculate_trailing_stops, estimate_time_to_target, calculate_safety_score
+    calculate_trailing_stops, estimate_time_to_target, calculate_safety_score,
+    select_horizon_target
 )
+from src.core.timing import stage, timed
 
-from src.bot.config import ENABLE_ANALYSIS_CACHE, CACHE_EXPIRY_MINUTES
+from src.bot.config import (
+    ENABLE_ANALYSIS_CACHE, CACHE_EXPIRY_MINUTES, ANALYSIS_VARIANT_CACHE_SIZE,
+    MULTI_ANALYSIS_WORKERS, COMPARE_BENCHMARK
+)
 from src.bot.database.db import get_db_context
 from src.bot.database.models import AnalysisCache
+from src.bot.services.chart_service import build_chart_data
+
+logger = logging.getLogger(__name__)
 
 
 def fetch_stock_data(symbol: str, period: str = '1y') -> pd.DataFrame:
@@ -62,26 +72,92 @@ def fetch_stock_data(symbol: str, period: str = '1y') -> pd.DataFrame:
         if isinstance(df.index, pd.MultiIndex):
             df = df.reset_index(level=0, drop=True)
         
-        # Handle timezone issues - convert to naive datetime
-        # If index is already DatetimeIndex with timezone, convert to UTC then remove tz
-        if isinstance(df.index, pd.DatetimeIndex):
+        return _normalize_history_index(df)
+        
+    except Exception as e:
+        raise ValueError(f"Failed to fetch data for {symbol}: {str(e)}")
+
+
+def _normalize_history_index(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a history's index to naive (UTC) datetimes"""
+    # Handle timezone issues - convert to naive datetime
+    # If index is already DatetimeIndex with timezone, convert to UTC then remove tz
+    if isinstance(df.index, pd.DatetimeIndex):
+        if df.index.tz is not None:
+            df.index = df.index.tz_convert('UTC').tz_localize(None)
+    else:
+        # Convert to datetime, handling timezone-aware values
+        try:
+            df.index = pd.to_datetime(df.index, utc=True)
+            # If conversion succeeded with UTC, remove timezone
             if df.index.tz is not None:
                 df.index = df.index.tz_convert('UTC').tz_localize(None)
+        except (ValueError, TypeError):
+            # If UTC conversion fails, try without timezone
+            df.index = pd.to_datetime(df.index, utc=False)
+    
+    return df
+
+
+def fetch_multiple_stock_data(symbols: List[str], period: str = '1y') -> Dict[str, pd.DataFrame]:
+    """
+    Fetch historical data for several symbols concurrently
+    
+    One yahooquery request set is issued for all symbols at once (up to
+    MULTI_ANALYSIS_WORKERS in flight); symbols it does not return are
+    retried individually.
+    
+    Args:
+        symbols: Stock ticker symbols
+        period: Data period
+    
+    Returns:
+        Dictionary of symbol -> OHLCV DataFrame (failed symbols are left out)
+    """
+    histories = {}
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return histories
+    
+    try:
+        from yahooquery import Ticker
+        
+        with stage('analysis.fetch_batch'):
+            ticker = Ticker(symbols, asynchronous=True, max_workers=min(MULTI_ANALYSIS_WORKERS, len(symbols)))
+            df = ticker.history(period=period, interval='1d')
+        if isinstance(df, pd.DataFrame) and not df.empty and isinstance(df.index, pd.MultiIndex):
+            frames = df.groupby(level=0, sort=False)
+        elif isinstance(df, dict):
+            # yahooquery returns a dict when some symbols failed
+            frames = (
+                (symbol, frame) for symbol, frame in df.items()
+                if isinstance(frame, pd.DataFrame)
+            )
         else:
-            # Convert to datetime, handling timezone-aware values
+            frames = ()
+        for symbol, frame in frames:
+            if isinstance(frame.index, pd.MultiIndex):
+                frame = frame.reset_index(level=0, drop=True)
+            if not frame.empty:
+                histories[symbol] = _normalize_history_index(frame)
+    except Exception as e:
+        logger.debug(f"Batched history fetch failed, falling back to per-symbol: {e}")
+    
+    missing = [symbol for symbol in symbols if symbol not in histories]
+    if missing:
+        def fetch(symbol):
             try:
-                df.index = pd.to_datetime(df.index, utc=True)
-                # If conversion succeeded with UTC, remove timezone
-                if df.index.tz is not None:
-                    df.index = df.index.tz_convert('UTC').tz_localize(None)
-            except (ValueError, TypeError):
-                # If UTC conversion fails, try without timezone
-                df.index = pd.to_datetime(df.index, utc=False)
-        
-        return df
+                return symbol, fetch_stock_data(symbol, period)
+            except ValueError as e:
+                logger.warning(str(e))
+                return symbol, None
         
-    except Exception as e:
-        raise ValueError(f"Failed to fetch data for {symbol}: {str(e)}")
+        with ThreadPoolExecutor(max_workers=min(MULTI_ANALYSIS_WORKERS, len(missing))) as pool:
+            for symbol, df in pool.map(fetch, missing):
+                if df is not None:
+                    histories[symbol] = df
+    
+    return histories
 
 
 def get_cached_analysis(symbol: str, mode: str, timeframe: str, horizon: str = '3months') -> Optional[Dict]:
@@ -162,138 +238,170 @@ def save_analysis_cache(symbol: str, mode: str, timeframe: str, analysis: Dict):
         print(f"Warning: Failed to cache analysis: {e}")
 
 
-def analyze_stock(
+# ============================================================================
+# ANALYSIS STAGES
+# ============================================================================
+# Indicators and patterns depend only on the timeframe, signals and stops
+# only on the mode; targets are priced for every horizon at once. The
+# stages below let analyze_stock_variants share that work across
+# (mode, horizon) combinations.
+
+def _load_indicators(
     symbol: str,
-    mode: str = 'balanced',
-    timeframe: str = 'medium',
-    horizon: str = '3months',
-    use_cache: bool = False
-) -> Dict[str, Any]:
+    timeframe: str,
+    history: Optional[pd.DataFrame] = None
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
-    Analyze a stock with technical indicators
+    Fetch daily history and calculate indicators for a timeframe
     
     Args:
         symbol: Stock ticker symbol
-        mode: Risk mode (conservative, balanced, aggressive)
-        timeframe: Analysis timeframe (short, medium)
-        horizon: Investment horizon (1week, 2weeks, 1month, 3months, 6months, 1year)
-        use_cache: Whether to use cached results
+        timeframe: Analysis timeframe
+        history: Already fetched daily history (skips the download)
     
     Returns:
-        Analysis dictionary with all results
+        Tuple of (OHLCV DataFrame, indicators)
     
     Raises:
-        ValueError: If symbol is invalid or analysis fails
+        ValueError: If fetching fails, history is too short or indicators fail
     """
-    # Validate inputs
-    symbol = symbol.strip().upper()
-    
-    if not symbol:
-        raise ValueError("Symbol cannot be empty")
-    
-    if mode not in RISK_MODES:
-        raise ValueError(f"Invalid mode: {mode}")
-    
-    if timeframe not in TIMEFRAME_CONFIGS:
-        raise ValueError(f"Invalid timeframe: {timeframe}")
-    
-    # Check cache first (disabled by default)
-    if use_cache and ENABLE_ANALYSIS_CACHE:
-        cached = get_cached_analysis(symbol, mode, timeframe, horizon)
-        if cached:
-            # Verify cached horizon matches requested horizon
-            if cached.get('horizon') == horizon:
-                return cached
-    
-    # Get configuration
-    tf_config = TIMEFRAME_CONFIGS[timeframe]
-    data_period = tf_config['data_period']
+    data_period = TIMEFRAME_CONFIGS[timeframe]['data_period']
     
     # Fetch data
-    try:
-        df = fetch_stock_data(symbol, data_period)
-    except Exception as e:
-        raise ValueError(f"Data fetch failed: {str(e)}")
+    if history is not None:
+        df = history
+    else:
+        try:
+            with stage('analysis.fetch'):
+                df = fetch_stock_data(symbol, data_period)
+        except Exception as e:
+            raise ValueError(f"Data fetch failed: {str(e)}")
     
     if df.empty or len(df) < 50:
         raise ValueError(f"Insufficient data for {symbol}")
     
-    # Calculate indicators
+    # Calculate indicators (includes pattern detection, timed separately as analysis.patterns)
     try:
-        indicators = calculate_all_indicators(df, timeframe)
+        with stage('analysis.indicators'):
+            indicators = calculate_all_indicators(df, timeframe)
     except Exception as e:
         raise ValueError(f"Indicator calculation failed: {str(e)}")
     
-    # Check hard filters
-    is_buy_blocked, buy_block_reasons = check_hard_filters(indicators, 'buy')
-    is_sell_blocked, sell_block_reasons = check_hard_filters(indicators, 'sell')
+    return df, indicators
+
+
+def _evaluate_mode(indicators: Dict[str, Any], mode: str, horizon: str = DEFAULT_HORIZON) -> Dict[str, Any]:
+    """
+    Compute the mode-dependent parts of an analysis (shared by all horizons)
     
-    # Calculate signals and confidence
-    signal_data = calculate_all_signals(indicators, mode)
-    confidence = signal_data['confidence']
-    confidence_level = get_confidence_level(confidence)
+    Args:
+        indicators: Output of calculate_all_indicators
+        mode: Risk mode
+        horizon: Horizon selected on the targets (others are re-selected later)
+    
+    Returns:
+        Dictionary of filters, signals, targets for every horizon and stops
+    """
+    with stage('analysis.signals'):
+        # Check hard filters
+        is_buy_blocked, buy_block_reasons = check_hard_filters(indicators, 'buy')
+        is_sell_blocked, sell_block_reasons = check_hard_filters(indicators, 'sell')
+        
+        # Calculate signals and confidence
+        signal_data = calculate_all_signals(indicators, mode)
     
-    # Get price and key indicators
     current_price = indicators['current_price']
     atr = indicators['atr']
     support = indicators['support']
     resistance = indicators['resistance']
-    fib_extensions = indicators['fib_extensions']
     
     # Always calculate long targets for beginners
     direction = 'long'
     
-    # Get strongest pattern for pattern-based target calculation
-    strongest_pattern = indicators.get('strongest_pattern')
-    
-    # Calculate targets (with horizon for multi-timeframe targets + pattern integration)
-    target_data = calculate_targets(
-        current_price, atr, resistance, support,
-        fib_extensions, mode, direction, horizon,
-        strongest_pattern  # NEW: Pass pattern for measured move integration
-    )
+    with stage('analysis.risk'):
+        # Targets are priced for every horizon, so other horizons only re-select
+        target_data = calculate_targets(
+            current_price, atr, resistance, support,
+            indicators['fib_extensions'], mode, direction, horizon,
+            indicators.get('strongest_pattern')  # Pattern measured move integration
+        )
+        
+        # Calculate stop loss
+        stop_data = calculate_stoploss(
+            current_price, atr, support, resistance, mode, direction
+        )
     
-    # Calculate stop loss
-    stop_data = calculate_stoploss(
-        current_price, atr, support, resistance, mode, direction
-    )
+    with stage('analysis.risk_plan'):
+        # Calculate trailing stops
+        trailing_data = calculate_trailing_stops(current_price, atr, mode)
     
-    # Validate risk/reward
-    risk_reward, rr_valid, rr_explanation = validate_risk_reward(
-        current_price,
-        target_data['recommended_target'],
-        stop_data['recommended_stop'],
-        mode
-    )
+    return {
+        'is_buy_blocked': is_buy_blocked,
+        'buy_block_reasons': buy_block_reasons,
+        'is_sell_blocked': is_sell_blocked,
+        'sell_block_reasons': sell_block_reasons,
+        'signal_data': signal_data,
+        'target_data': target_data,
+        'stop_data': stop_data,
+        'trailing_data': trailing_data,
+    }
+
+
+def _evaluate_horizon(
+    symbol: str,
+    timeframe: str,
+    indicators: Dict[str, Any],
+    mode: str,
+    horizon: str,
+    mode_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Complete an analysis for one horizon from shared indicator and mode data
     
-    # Calculate overall score percentage for recommendation logic
-    # This matches the formatter's scoring logic (max 10 points)
-    trend_signals = signal_data.get('trend_signals', {})
-    momentum_signals = signal_data.get('momentum_signals', {})
-    pattern_signals = signal_data.get('pattern_signals', {})
+    Args:
+        symbol: Stock ticker symbol
+        timeframe: Analysis timeframe
+        indicators: Output of calculate_all_indicators
+        mode: Risk mode
+        horizon: Investment horizon
+        mode_data: Output of _evaluate_mode for the same mode
     
-    # Trend score (max 3): price vs EMAs, EMA alignment, ADX
-    trend_bullish = sum(1 for _, d in trend_signals.values() if d == 'bullish')
-    trend_score = min(3, max(0, trend_bullish))
+    Returns:
+        Analysis dictionary (same shape as analyze_stock)
+    """
+    is_buy_blocked = mode_data['is_buy_blocked']
+    buy_block_reasons = mode_data['buy_block_reasons']
+    is_sell_blocked = mode_data['is_sell_blocked']
+    sell_block_reasons = mode_data['sell_block_reasons']
+    signal_data = mode_data['signal_data']
+    stop_data = mode_data['stop_data']
+    trailing_data = mode_data['trailing_data']
     
-    # Momentum score (max 3): RSI, MACD, ADX
-    momentum_bullish = sum(1 for _, d in momentum_signals.values() if d == 'bullish')
-    momentum_score = min(3, max(0, momentum_bullish))
+    confidence = signal_data['confidence']
+    confidence_level = get_confidence_level(confidence)
     
-    # Volume score (max 1): volume confirmation (high volume = bullish)
-    vol_ratio = indicators.get('volume_ratio', 1.0)
-    volume_score = 1 if (vol_ratio >= 1.5) else 0
+    # Get price and key indicators
+    current_price = indicators['current_price']
+    atr = indicators['atr']
     
-    # Pattern score (max 3): pattern type and bias
-    pattern_bullish = sum(1 for _, d in pattern_signals.values() if d == 'bullish')
-    pattern_bias = indicators.get('pattern_bias', 'neutral')
-    pattern_score = min(3, max(0, pattern_bullish + (1 if pattern_bias == 'bullish' else 0)))
+    # Get strongest pattern for contradiction detection
+    strongest_pattern = indicators.get('strongest_pattern')
     
-    # Risk score (max 1): R:R validity
-    risk_score = 1 if rr_valid else 0
+    with stage('analysis.risk'):
+        target_data = mode_data['target_data']
+        if target_data.get('selected_horizon', horizon) != horizon:
+            target_data = select_horizon_target(target_data, horizon, mode)
+        
+        # Validate risk/reward
+        risk_reward, rr_valid, rr_explanation = validate_risk_reward(
+            current_price,
+            target_data['recommended_target'],
+            stop_data['recommended_stop'],
+            mode
+        )
     
-    total_bullish = trend_score + momentum_score + volume_score + pattern_score + risk_score
-    overall_score_pct = (total_bullish / 10) * 100
+    # Overall score percentage for recommendation logic (matches the formatter)
+    overall_score_pct = calculate_overall_score(indicators, signal_data, rr_valid)
     
     # Count bullish indicators for professional validation (multiple confirmations)
     all_signals = signal_data.get('signals', {})
@@ -347,35 +455,33 @@ def analyze_stock(
         indicators, is_blocked
     )
     
-    # Calculate trailing stops
-    trailing_data = calculate_trailing_stops(current_price, atr, mode)
-    
-    # Calculate time estimate for target
-    time_estimate = estimate_time_to_target(
-        current_price,
-        target_data['recommended_target'],
-        atr,
-        indicators['atr_percent'],
-        indicators['momentum'],
-        indicators['adx'],
-        horizon
-    )
-    
-    # Calculate safety score
-    safety_score = calculate_safety_score(
-        confidence,
-        risk_reward,
-        indicators['adx'],
-        indicators['rsi'],
-        is_blocked,
-        horizon
-    )
+    with stage('analysis.risk_plan'):
+        # Calculate time estimate for target
+        time_estimate = estimate_time_to_target(
+            current_price,
+            target_data['recommended_target'],
+            atr,
+            indicators['atr_percent'],
+            indicators['momentum'],
+            indicators['adx'],
+            horizon
+        )
+        
+        # Calculate safety score
+        safety_score = calculate_safety_score(
+            confidence,
+            risk_reward,
+            indicators['adx'],
+            indicators['rsi'],
+            is_blocked,
+            horizon
+        )
     
     # Compile analysis result
     analysis = {
         'symbol': symbol,
         'mode': mode,
-        'timeframe': tf_config['name'],
+        'timeframe': TIMEFRAME_CONFIGS[timeframe]['name'],
         'horizon': horizon,
         'current_price': current_price,
         'indicators': indicators,
@@ -404,44 +510,313 @@ def analyze_stock(
         'analyzed_at': datetime.utcnow().isoformat(),
     }
     
+    return analysis
+
+
+@timed('analysis.total')
+def analyze_stock(
+    symbol: str,
+    mode: str = 'balanced',
+    timeframe: str = 'medium',
+    horizon: str = '3months',
+    use_cache: bool = False,
+    include_chart_data: bool = False,
+    history: Optional[pd.DataFrame] = None
+) -> Dict[str, Any]:
+    """
+    Analyze a stock with technical indicators
+    
+    Args:
+        symbol: Stock ticker symbol
+        mode: Risk mode (conservative, balanced, aggressive)
+        timeframe: Analysis timeframe (short, medium)
+        horizon: Investment horizon (1week, 2weeks, 1month, 3months, 6months, 1year)
+        use_cache: Whether to use cached results
+        include_chart_data: Attach price history and overlay levels for chart rendering
+        history: Already fetched daily history (see fetch_multiple_stock_data)
+    
+    Returns:
+        Analysis dictionary with all results
+    
+    Raises:
+        ValueError: If symbol is invalid or analysis fails
+    """
+    # Validate inputs
+    symbol = symbol.strip().upper()
+    
+    if not symbol:
+        raise ValueError("Symbol cannot be empty")
+    
+    if mode not in RISK_MODES:
+        raise ValueError(f"Invalid mode: {mode}")
+    
+    # Intraday timeframes run on IntradayService bars, not daily history
+    if timeframe not in DAILY_TIMEFRAMES:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    
+    # Check cache first (disabled by default)
+    if use_cache and ENABLE_ANALYSIS_CACHE:
+        cached = get_cached_analysis(symbol, mode, timeframe, horizon)
+        if cached:
+            # Verify cached horizon matches requested horizon
+            if cached.get('horizon') == horizon:
+                return cached
+    
+    df, indicators = _load_indicators(symbol, timeframe, history)
+    analysis = _evaluate_horizon(
+        symbol, timeframe, indicators, mode, horizon,
+        _evaluate_mode(indicators, mode, horizon)
+    )
+    
     # Cache the result (only if caching is enabled)
     if use_cache and ENABLE_ANALYSIS_CACHE:
         save_analysis_cache(symbol, mode, timeframe, analysis)
     
+    # Chart payload is attached after caching to keep cached rows small
+    if include_chart_data:
+        analysis['chart_data'] = build_chart_data(df, indicators)
+    
+    return analysis
+
+
+@timed('analysis.variants')
+def analyze_stock_variants(
+    symbol: str,
+    timeframe: str = 'medium',
+    modes: Optional[Iterable[str]] = None,
+    horizons: Optional[Iterable[str]] = None,
+    include_chart_data: bool = False,
+    history: Optional[pd.DataFrame] = None
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Analyze a stock for several (mode, horizon) combinations in one pass
+    
+    History, indicators and patterns are computed once for the timeframe,
+    signals, stops and horizon targets once per mode. Each entry is the
+    same dictionary analyze_stock returns for that mode and horizon.
+    
+    Args:
+        symbol: Stock ticker symbol
+        timeframe: Analysis timeframe (short, medium)
+        modes: Risk modes to evaluate (default: all)
+        horizons: Investment horizons to evaluate (default: all)
+        include_chart_data: Attach one shared chart payload to every entry
+        history: Already fetched daily history (see fetch_multiple_stock_data)
+    
+    Returns:
+        Dictionary keyed by (mode, horizon)
+    
+    Raises:
+        ValueError: If an input is invalid or analysis fails
+    """
+    symbol = symbol.strip().upper()
+    modes = list(modes) if modes else list(RISK_MODES)
+    horizons = list(horizons) if horizons else list(INVESTMENT_HORIZONS)
+    
+    if not symbol:
+        raise ValueError("Symbol cannot be empty")
+    
+    for mode in modes:
+        if mode not in RISK_MODES:
+            raise ValueError(f"Invalid mode: {mode}")
+    
+    for horizon in horizons:
+        if horizon not in INVESTMENT_HORIZONS:
+            raise ValueError(f"Invalid horizon: {horizon}")
+    
+    if timeframe not in DAILY_TIMEFRAMES:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    
+    df, indicators = _load_indicators(symbol, timeframe, history)
+    chart_data = build_chart_data(df, indicators) if include_chart_data else None
+    
+    variants = {}
+    for mode in modes:
+        mode_data = _evaluate_mode(indicators, mode, horizons[0])
+        for horizon in horizons:
+            analysis = _evaluate_horizon(symbol, timeframe, indicators, mode, horizon, mode_data)
+            if chart_data is not None:
+                analysis['chart_data'] = chart_data
+            variants[(mode, horizon)] = analysis
+    
+    return variants
+
+
+# ============================================================================
+# VARIANT CACHE
+# ============================================================================
+# Full (mode, horizon) sets per symbol and timeframe, so a /settings change
+# re-renders from memory instead of re-downloading and re-analyzing.
+
+_variant_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+_variant_lock = threading.Lock()
+
+
+def get_analysis_variant(
+    symbol: str,
+    mode: str = 'balanced',
+    timeframe: str = 'medium',
+    horizon: str = '3months',
+    refresh: bool = False,
+    include_chart_data: bool = False
+) -> Dict[str, Any]:
+    """
+    Get one analysis from the symbol's cached (mode, horizon) set
+    
+    The first call for a symbol and timeframe analyzes every mode and
+    horizon; later calls within CACHE_EXPIRY_MINUTES pick their entry
+    from memory.
+    
+    Args:
+        symbol: Stock ticker symbol
+        mode: Risk mode
+        timeframe: Analysis timeframe (short, medium)
+        horizon: Investment horizon
+        refresh: Ignore any cached set and re-analyze
+        include_chart_data: Include the chart payload
+    
+    Returns:
+        Analysis dictionary (same shape as analyze_stock)
+    
+    Raises:
+        ValueError: If an input is invalid or analysis fails
+    """
+    symbol = symbol.strip().upper()
+    key = (symbol, timeframe)
+    
+    if mode not in RISK_MODES:
+        raise ValueError(f"Invalid mode: {mode}")
+    
+    if horizon not in INVESTMENT_HORIZONS:
+        raise ValueError(f"Invalid horizon: {horizon}")
+    
+    variants = None
+    if not refresh:
+        with _variant_lock:
+            entry = _variant_cache.get(key)
+            if entry and time.monotonic() - entry[0] < CACHE_EXPIRY_MINUTES * 60:
+                _variant_cache.move_to_end(key)
+                variants = entry[1]
+    
+    if variants is None:
+        variants = analyze_stock_variants(symbol, timeframe, include_chart_data=True)
+        with _variant_lock:
+            _variant_cache[key] = (time.monotonic(), variants)
+            _variant_cache.move_to_end(key)
+            while len(_variant_cache) > ANALYSIS_VARIANT_CACHE_SIZE:
+                _variant_cache.popitem(last=False)
+    
+    # Copy so callers can annotate the result without touching the cache
+    analysis = dict(variants[(mode, horizon)])
+    if not include_chart_data:
+        analysis.pop('chart_data', None)
     return analysis
 
 
+def clear_variant_cache(symbol: Optional[str] = None):
+    """
+    Drop cached analysis sets
+    
+    Args:
+        symbol: Only drop this symbol's sets (default: everything)
+    """
+    with _variant_lock:
+        if symbol is None:
+            _variant_cache.clear()
+            return
+        symbol = symbol.strip().upper()
+        for key in [k for k in _variant_cache if k[0] == symbol]:
+            del _variant_cache[key]
+
+
+@timed('analysis.multiple')
 def analyze_multiple_stocks(
     symbols: List[str],
     mode: str = 'balanced',
-    timeframe: str = 'medium'
+    timeframe: str = 'medium',
+    horizon: str = '3months',
+    histories: Optional[Dict[str, pd.DataFrame]] = None
 ) -> List[Dict[str, Any]]:
     """
     Analyze multiple stocks
     
+    Histories are fetched for all symbols at once, then analyzed on up to
+    MULTI_ANALYSIS_WORKERS threads. Blocking: call it from an executor in
+    async code.
+    
     Args:
         symbols: List of stock symbols
         mode: Risk mode
         timeframe: Timeframe
+        horizon: Investment horizon
+        histories: Already fetched histories (default: fetched here)
     
     Returns:
-        List of analysis dictionaries
+        List of analysis dictionaries, in symbol order
     """
-    results = []
+    if not symbols:
+        return []
     
-    for symbol in symbols:
+    if histories is None:
+        histories = fetch_multiple_stock_data(symbols, TIMEFRAME_CONFIGS[timeframe]['data_period'])
+    
+    def analyze(symbol):
         try:
-            analysis = analyze_stock(symbol, mode, timeframe)
-            results.append(analysis)
+            # Symbols missing from the batch fetch their own history
+            return analyze_stock(symbol, mode, timeframe, horizon, history=histories.get(symbol))
         except Exception as e:
             # Include error in results
-            results.append({
+            return {
                 'symbol': symbol,
                 'error': True,
                 'error_message': str(e)
-            })
+            }
+    
+    with ThreadPoolExecutor(max_workers=min(MULTI_ANALYSIS_WORKERS, len(symbols))) as pool:
+        return list(pool.map(analyze, symbols))
+
+
+def compare_stocks(
+    symbols: List[str],
+    mode: str = 'balanced',
+    timeframe: str = 'medium',
+    horizon: str = '3months',
+    benchmark: Optional[str] = COMPARE_BENCHMARK
+) -> Dict[str, Any]:
+    """
+    Analyze stocks side by side with relative strength, correlation and beta
+    
+    The benchmark is fetched together with the stocks; if it is unavailable
+    the stocks are measured against their equal-weighted basket.
+    
+    Args:
+        symbols: Stock symbols
+        mode: Risk mode
+        timeframe: Timeframe
+        horizon: Investment horizon
+        benchmark: Index symbol to measure against (None for the basket)
+    
+    Returns:
+        Dictionary with 'results' (as analyze_multiple_stocks) and
+        'relative' (calculate_relative_metrics output, or None if the
+        histories do not overlap enough)
+    """
+    period = TIMEFRAME_CONFIGS[timeframe]['data_period']
+    histories = fetch_multiple_stock_data(list(symbols) + ([benchmark] if benchmark else []), period)
+    results = analyze_multiple_stocks(symbols, mode, timeframe, horizon, histories)
+    
+    analyzed = [r['symbol'] for r in results if not r.get('error', False)]
+    if benchmark not in histories:
+        benchmark = None
+    relative = None
+    if len(analyzed) >= 2 or (analyzed and benchmark):
+        try:
+            closes = align_closes({s: histories[s] for s in analyzed + ([benchmark] if benchmark else [])})
+            relative = calculate_relative_metrics(closes, benchmark)
+        except ValueError as e:
+            logger.warning(f"Skipping relative metrics for {', '.join(analyzed)}: {e}")
     
-    return results
+    return {'results': results, 'relative': relative}
 
 
 def get_current_price(symbol: str) -> Optional[float]:
@@ -475,10 +850,28 @@ def get_multiple_prices(symbols: List[str]) -> Dict[str, float]:
     """
     prices = {}
     
+    if not symbols:
+        return prices
+    
+    # Single batched request for all symbols
+    try:
+        from yahooquery import Ticker
+        
+        df = Ticker(list(symbols)).history(period='5d', interval='1d')
+        if isinstance(df, pd.DataFrame) and not df.empty and isinstance(df.index, pd.MultiIndex):
+            last_close = df['close'].groupby(level=0).last()
+            for symbol, price in last_close.items():
+                if pd.notna(price) and price:
+                    prices[symbol] = float(price)
+    except Exception as e:
+        logger.debug(f"Batched price fetch failed, falling back to per-symbol: {e}")
+    
+    # Fall back to single fetches for anything the batch did not return
     for symbol in symbols:
-        price = get_current_price(symbol)
-        if price:
-            prices[symbol] = price
+        if symbol not in prices:
+            price = get_current_price(symbol)
+            if price:
+                prices[symbol] = price
     
     return prices
 
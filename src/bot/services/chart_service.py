@@ -0,0 +1,426 @@
+"""
+Chart Service
+Renders candlestick charts off the event loop with a content-addressed cache
+
+Charts are drawn with matplotlib/mplfinance in a separate process pool so
+rendering never blocks the bot's event loop. Each image is keyed by a hash
+of (symbol, last bar, overlay set, size); the same chart requested by many
+users, or again from the daily-alert "full report" button, is rendered once
+per symbol per bar and served from memory or disk afterwards.
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from src.bot.config import (
+    ENABLE_CHARTS, CHART_RENDER_WORKERS, CHART_CACHE_DIR,
+    CHART_MEMORY_CACHE_SIZE, CHART_BARS
+)
+
+logger = logging.getLogger(__name__)
+
+# Available overlays
+OVERLAY_EMA = 'ema'
+OVERLAY_BOLLINGER = 'bollinger'
+OVERLAY_LEVELS = 'levels'  # Support / resistance
+OVERLAY_PATTERNS = 'patterns'  # Detected pattern levels
+
+DEFAULT_OVERLAYS = (OVERLAY_EMA, OVERLAY_BOLLINGER, OVERLAY_LEVELS, OVERLAY_PATTERNS)
+DEFAULT_CHART_SIZE = (1200, 800)  # Pixels
+CHART_DPI = 100
+
+EMA_COLORS = ('#2962ff', '#ff6d00', '#ab47bc', '#455a64')
+PATTERN_LEVEL_FIELDS = ('neckline', 'breakout_level', 'measured_target', 'invalidation_level')
+
+
+def build_chart_data(df: pd.DataFrame, indicators: Dict) -> Dict:
+    """
+    Extract a compact, serializable chart payload from analysis inputs
+
+    The full fetched history is kept so EMAs/Bollinger Bands have their
+    warm-up period; only the last CHART_BARS candles are drawn.
+
+    Args:
+        df: OHLCV DataFrame used for the analysis
+        indicators: Output of calculate_all_indicators
+
+    Returns:
+        Dictionary of plain lists and floats (JSON and pickle friendly)
+    """
+    close = df['close'].astype(float)
+    config = indicators.get('config', {})
+
+    pattern_levels = []
+    for pattern in indicators.get('chart_patterns') or []:
+        levels = {
+            field: round(float(getattr(pattern, field)), 4)
+            for field in PATTERN_LEVEL_FIELDS
+            if getattr(pattern, field, None) is not None
+        }
+        if levels:
+            pattern_levels.append({'name': pattern.name, 'levels': levels})
+
+    return {
+        'dates': [ts.strftime('%Y-%m-%d') for ts in pd.DatetimeIndex(df.index)],
+        'open': _column(df, 'open', close),
+        'high': _column(df, 'high', close),
+        'low': _column(df, 'low', close),
+        'close': [round(v, 4) for v in close.tolist()],
+        'volume': _column(df, 'volume', close * 0),
+        'ema_periods': [
+            indicators.get('ema_fast_period'), indicators.get('ema_medium_period'),
+            indicators.get('ema_slow_period'), indicators.get('ema_trend_period')
+        ],
+        'bb_period': config.get('bb_period', 20),
+        'bb_std': config.get('bb_std', 2),
+        'support': indicators.get('support'),
+        'resistance': indicators.get('resistance'),
+        'pattern_levels': pattern_levels,
+    }
+
+
+def _column(df: pd.DataFrame, name: str, fallback: pd.Series) -> list:
+    """Column as rounded floats, or the fallback series if missing"""
+    series = df[name] if name in df.columns else fallback
+    return [round(float(v), 4) for v in series.fillna(0).tolist()]
+
+
+def chart_cache_key(
+    symbol: str,
+    chart_data: Dict,
+    overlays: Iterable[str] = DEFAULT_OVERLAYS,
+    size: Tuple[int, int] = DEFAULT_CHART_SIZE
+) -> str:
+    """
+    Content hash of (symbol, last bar, overlay set, size)
+
+    Overlay parameters (EMA periods, band settings, levels) are part of the
+    overlay set, so users on different timeframes get different images.
+
+    Args:
+        symbol: Stock symbol
+        chart_data: Output of build_chart_data
+        overlays: Overlays to draw
+        size: Image size in pixels (width, height)
+
+    Returns:
+        Hex digest
+    """
+    overlays = sorted(set(overlays))
+    last_bar = [chart_data['dates'][-1]] + [
+        chart_data[col][-1] for col in ('open', 'high', 'low', 'close', 'volume')
+    ]
+
+    overlay_spec = {}
+    if OVERLAY_EMA in overlays:
+        overlay_spec[OVERLAY_EMA] = chart_data['ema_periods']
+    if OVERLAY_BOLLINGER in overlays:
+        overlay_spec[OVERLAY_BOLLINGER] = [chart_data['bb_period'], chart_data['bb_std']]
+    if OVERLAY_LEVELS in overlays:
+        overlay_spec[OVERLAY_LEVELS] = [chart_data['support'], chart_data['resistance']]
+    if OVERLAY_PATTERNS in overlays:
+        overlay_spec[OVERLAY_PATTERNS] = chart_data['pattern_levels']
+
+    content = json.dumps(
+        [symbol.upper(), last_bar, overlay_spec, list(size), CHART_BARS],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def render_chart_png(
+    symbol: str,
+    chart_data: Dict,
+    overlays: Tuple[str, ...],
+    size: Tuple[int, int]
+) -> bytes:
+    """
+    Render a candlestick chart to PNG bytes (runs inside a worker process)
+
+    Args:
+        symbol: Stock symbol
+        chart_data: Output of build_chart_data
+        overlays: Overlays to draw
+        size: Image size in pixels (width, height)
+
+    Returns:
+        PNG image bytes
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import mplfinance as mpf
+
+    df = pd.DataFrame(
+        {
+            'Open': chart_data['open'],
+            'High': chart_data['high'],
+            'Low': chart_data['low'],
+            'Close': chart_data['close'],
+            'Volume': chart_data['volume'],
+        },
+        index=pd.DatetimeIndex(chart_data['dates'])
+    )
+    close = df['Close']
+    view = slice(-CHART_BARS, None)
+
+    addplots = []
+    if OVERLAY_EMA in overlays:
+        for period, color in zip(chart_data['ema_periods'], EMA_COLORS):
+            if not period:
+                continue
+            ema = close.ewm(span=period, adjust=False, min_periods=period).mean().iloc[view]
+            if ema.notna().any():
+                addplots.append(mpf.make_addplot(ema, color=color, width=1.0))
+
+    if OVERLAY_BOLLINGER in overlays:
+        period = chart_data['bb_period']
+        middle = close.rolling(period).mean()
+        band = close.rolling(period).std(ddof=0) * chart_data['bb_std']
+        for series in (middle + band, middle - band):
+            series = series.iloc[view]
+            if series.notna().any():
+                addplots.append(mpf.make_addplot(series, color='#90a4ae', width=0.8, linestyle='--'))
+
+    levels, colors = [], []
+    if OVERLAY_LEVELS in overlays:
+        for level, color in ((chart_data['support'], '#2e7d32'), (chart_data['resistance'], '#c62828')):
+            if level:
+                levels.append(float(level))
+                colors.append(color)
+    if OVERLAY_PATTERNS in overlays:
+        for pattern in chart_data['pattern_levels']:
+            for level in pattern['levels'].values():
+                levels.append(float(level))
+                colors.append('#f9a825')
+
+    plot_kwargs = {
+        'type': 'candle',
+        'style': 'yahoo',
+        'title': symbol,
+        'volume': bool(df['Volume'].iloc[view].any()),
+        'figsize': (size[0] / CHART_DPI, size[1] / CHART_DPI),
+        'returnfig': True,
+    }
+    if addplots:
+        plot_kwargs['addplot'] = addplots
+    if levels:
+        plot_kwargs['hlines'] = dict(hlines=levels, colors=colors, linestyle='-.', linewidths=0.8)
+
+    fig, _ = mpf.plot(df.iloc[view], **plot_kwargs)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=CHART_DPI, bbox_inches='tight')
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+
+class ChartService:
+    """Process-pool chart renderer with in-flight de-duplication and caching"""
+
+    def __init__(
+        self,
+        max_workers: int = CHART_RENDER_WORKERS,
+        cache_dir: Optional[str] = CHART_CACHE_DIR,
+        memory_cache_size: int = CHART_MEMORY_CACHE_SIZE
+    ):
+        """
+        Initialize chart service
+
+        Args:
+            max_workers: Render worker processes
+            cache_dir: Directory for cached PNGs (None disables the disk cache)
+            memory_cache_size: Number of images kept in memory (LRU)
+        """
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.memory_cache_size = memory_cache_size
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.renders = 0
+        self.hits = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Lazily start the render pool ('spawn' so workers never inherit the event loop)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    async def get_chart(
+        self,
+        symbol: str,
+        chart_data: Optional[Dict],
+        overlays: Iterable[str] = DEFAULT_OVERLAYS,
+        size: Tuple[int, int] = DEFAULT_CHART_SIZE
+    ) -> Optional[bytes]:
+        """
+        Get chart PNG, rendering it at most once per content key
+
+        Args:
+            symbol: Stock symbol
+            chart_data: Output of build_chart_data (e.g. analysis['chart_data'])
+            overlays: Overlays to draw
+            size: Image size in pixels (width, height)
+
+        Returns:
+            PNG bytes, or None if charts are disabled or rendering failed
+        """
+        if not ENABLE_CHARTS or not chart_data or not chart_data.get('dates'):
+            return None
+
+        overlays = tuple(sorted(set(overlays)))
+        key = chart_cache_key(symbol, chart_data, overlays, size)
+
+        image = self._memory_get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        # Another request is already producing this exact chart
+        if key in self._inflight:
+            self.hits += 1
+            return await asyncio.shield(self._inflight[key])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+
+        try:
+            image = await loop.run_in_executor(None, self._disk_get, key)
+            if image is not None:
+                self.hits += 1
+            else:
+                image = await loop.run_in_executor(
+                    self._get_executor(), render_chart_png, symbol, chart_data, overlays, size
+                )
+                self.renders += 1
+                await loop.run_in_executor(None, self._disk_put, key, image)
+                logger.info("Rendered chart for %s (%d bytes, key %s)", symbol, len(image), key[:12])
+
+            self._memory_put(key, image)
+            future.set_result(image)
+            return image
+
+        except Exception as e:
+            logger.warning("Chart rendering failed for %s: %s", symbol, e)
+            future.set_result(None)
+            return None
+
+        finally:
+            self._inflight.pop(key, None)
+
+    async def send_analysis_chart(self, bot, chat_id: int, analysis: Dict) -> bool:
+        """
+        Send the chart for an analysis as a photo
+
+        Chart failures never break the text report, so errors are logged
+        and reported as False.
+
+        Args:
+            bot: Telegram bot instance
+            chat_id: Chat to send to
+            analysis: analyze_stock result with include_chart_data=True
+
+        Returns:
+            True if a chart was sent
+        """
+        symbol = analysis.get('symbol', '')
+        try:
+            image = await self.get_chart(symbol, analysis.get('chart_data'))
+            if image is None:
+                return False
+
+            await bot.send_photo(
+                chat_id=chat_id,
+                photo=image,
+                caption=f"📊 {symbol} - {analysis.get('timeframe', '')} chart"
+            )
+            return True
+
+        except Exception as e:
+            logger.warning("Could not send chart for %s: %s", symbol, e)
+            return False
+
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        """LRU lookup"""
+        image = self._memory.get(key)
+        if image is not None:
+            self._memory.move_to_end(key)
+        return image
+
+    def _memory_put(self, key: str, image: bytes):
+        """LRU insert with eviction"""
+        self._memory[key] = image
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        """Cache file path for a key"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        """Read cached PNG from disk if present"""
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _disk_put(self, key: str, image: bytes):
+        """Write PNG to the disk cache (atomic rename)"""
+        path = self._disk_path(key)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(image)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write chart cache %s: %s", path, e)
+
+    def shutdown(self):
+        """Stop render workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_chart_service: Optional[ChartService] = None
+
+
+def get_chart_service() -> ChartService:
+    """
+    Get the shared chart service (one render pool and cache per bot process)
+
+    Returns:
+        ChartService instance
+    """
+    global _chart_service
+    if _chart_service is None:
+        _chart_service = ChartService()
+    return _chart_service
@@ -2,158 +2,248 @@
 Export Service for BUY Signals
 Generate CSV and PDF reports from scan results
 
+Exports never touch the event loop thread: rows are read with a lean column
+query (no ORM objects) on a worker thread and streamed straight into an
+in-memory buffer, and PDFs are laid out in a separate process. Scan results
+are immutable once stored, so finished artifacts are cached by
+(request_id, format) and repeated export taps are served from memory.
+
 Author: Harsh Kandhway
 Date: January 19, 2026
 """
 
+import asyncio
+import csv
+import io
+import json
 import logging
-import os
-from pathlib import Path
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict
-import json
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
 
-import pandas as pd
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 
+from src.bot.config import EXPORT_CACHE_SIZE, EXPORT_PDF_WORKERS, EXPORT_STREAM_BATCH
+from src.bot.database.db import get_db_context
 from src.bot.database.models import UserSignalRequest, UserSignalResponse
 
 logger = logging.getLogger(__name__)
 
+FORMAT_CSV = 'csv'
+FORMAT_PDF = 'pdf'
+
+PDF_ROW_LIMIT = 50  # Rows shown in the PDF table
+
+CSV_HEADER = (
+    'Symbol', 'Sector', 'Market Cap', 'Recommendation', 'Confidence (%)',
+    'Risk:Reward', 'Current Price (₹)', 'Target Price (₹)', 'Stop Loss (₹)',
+    'Upside (%)', 'Risk (%)', 'ETF', 'Timestamp'
+)
+
+# Lean column set shared by both formats (order matters for row unpacking)
+SIGNAL_COLUMNS = (
+    UserSignalResponse.ticker,
+    UserSignalResponse.sector,
+    UserSignalResponse.market_cap,
+    UserSignalResponse.recommendation_type,
+    UserSignalResponse.confidence,
+    UserSignalResponse.risk_reward,
+    UserSignalResponse.current_price,
+    UserSignalResponse.target,
+    UserSignalResponse.stop_loss,
+    UserSignalResponse.is_etf,
+    UserSignalResponse.sent_at,
+)
+
+
+class ExportArtifact(NamedTuple):
+    """A finished export ready to send"""
+    filename: str
+    data: bytes
+    rows: int
 
-async def export_to_csv(db: Session, request_id: int, user_id: int) -> str:
+
+def _load_request(db, request_id: int, user_id: int) -> Dict:
     """
-    Export scan results to CSV
-    
+    Fetch request metadata, checking ownership
+
+    Raises:
+        ValueError: If the request does not exist or belongs to another user
+    """
+    row = db.execute(
+        select(
+            UserSignalRequest.id,
+            UserSignalRequest.total_stocks_analyzed,
+            UserSignalRequest.total_signals_found,
+            UserSignalRequest.analysis_duration_seconds,
+            UserSignalRequest.sectors,
+            UserSignalRequest.market_caps,
+        ).where(
+            UserSignalRequest.id == request_id,
+            UserSignalRequest.user_id == user_id
+        )
+    ).first()
+
+    if row is None:
+        raise ValueError("Request not found or unauthorized")
+    return dict(row._mapping)
+
+
+def _signal_rows(db, request_id: int, limit: Optional[int] = None) -> Iterator[Tuple]:
+    """Stream signal rows (highest confidence first) in batches"""
+    stmt = select(*SIGNAL_COLUMNS).where(
+        UserSignalResponse.request_id == request_id
+    ).order_by(UserSignalResponse.confidence.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_STREAM_BATCH))
+    for partition in result.partitions():
+        yield from partition
+
+
+def _csv_row(row: Tuple) -> Tuple:
+    """Convert one signal row to CSV values"""
+    (ticker, sector, market_cap, rec_type, confidence, risk_reward,
+     price, target, stop_loss, is_etf, sent_at) = row
+
+    upside_pct = ((target / price - 1) * 100) if target else 0
+    risk_pct = ((price / stop_loss - 1) * 100) if stop_loss else 0
+
+    return (
+        ticker,
+        sector or 'Unknown',
+        market_cap or 'Unknown',
+        rec_type,
+        round(confidence, 2),
+        round(risk_reward, 2),
+        round(price, 2),
+        round(target, 2) if target else '',
+        round(stop_loss, 2) if stop_loss else '',
+        round(upside_pct, 2),
+        round(risk_pct, 2),
+        'Yes' if is_etf else 'No',
+        sent_at.strftime('%Y-%m-%d %H:%M:%S'),
+    )
+
+
+def build_csv_export(db, request_id: int, user_id: int) -> ExportArtifact:
+    """
+    Stream scan results into CSV bytes (runs on a worker thread)
+
     Args:
         db: Database session
         request_id: Request ID to export
         user_id: User ID (for validation)
-    
+
     Returns:
-        Path to generated CSV file
+        ExportArtifact with the CSV document
     """
-    # Get request and signals
-    request = db.query(UserSignalRequest).filter(
-        UserSignalRequest.id == request_id,
-        UserSignalRequest.user_id == user_id
-    ).first()
-    
-    if not request:
-        raise ValueError("Request not found or unauthorized")
-    
-    signals = db.query(UserSignalResponse).filter(
-        UserSignalResponse.request_id == request_id
-    ).order_by(UserSignalResponse.confidence.desc()).all()
-    
-    # Convert to DataFrame
-    data = []
-    for signal in signals:
-        upside_pct = ((signal.target / signal.current_price - 1) * 100) if signal.target else 0
-        risk_pct = ((signal.current_price / signal.stop_loss - 1) * 100) if signal.stop_loss else 0
-        
-        data.append({
-            'Symbol': signal.ticker,
-            'Sector': signal.sector or 'Unknown',
-            'Market Cap': signal.market_cap or 'Unknown',
-            'Recommendation': signal.recommendation_type,
-            'Confidence (%)': round(signal.confidence, 2),
-            'Risk:Reward': round(signal.risk_reward, 2),
-            'Current Price (₹)': round(signal.current_price, 2),
-            'Target Price (₹)': round(signal.target, 2) if signal.target else '',
-            'Stop Loss (₹)': round(signal.stop_loss, 2) if signal.stop_loss else '',
-            'Upside (%)': round(upside_pct, 2),
-            'Risk (%)': round(risk_pct, 2),
-            'ETF': 'Yes' if signal.is_etf else 'No',
-            'Timestamp': signal.sent_at.strftime('%Y-%m-%d %H:%M:%S')
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create exports directory
-    export_dir = Path('exports') / str(user_id)
-    export_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate filename
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"buy_signals_{request_id}_{timestamp}.csv"
-    filepath = export_dir / filename
-    
-    # Save CSV
-    df.to_csv(filepath, index=False)
-    
-    logger.info(f"CSV exported: {filepath} ({len(signals)} signals)")
-    
-    return str(filepath)
-
-
-async def export_to_pdf(db: Session, request_id: int, user_id: int) -> str:
+    _load_request(db, request_id, user_id)
+
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+    writer = csv.writer(text, lineterminator='\n')
+    writer.writerow(CSV_HEADER)
+
+    rows = 0
+    for row in _signal_rows(db, request_id):
+        writer.writerow(_csv_row(row))
+        rows += 1
+
+    text.flush()
+    data = buffer.getvalue()
+    text.close()
+
+    return ExportArtifact(f"buy_signals_{request_id}.csv", data, rows)
+
+
+def collect_pdf_payload(db, request_id: int, user_id: int) -> Dict:
     """
-    Export scan results to PDF
-    
-    Note: Requires fpdf2 library
-    Install: pip install fpdf2
-    
+    Gather the plain data a PDF report needs (runs on a worker thread)
+
+    Only the rows shown in the table are loaded; the total is a COUNT.
+
     Args:
         db: Database session
         request_id: Request ID to export
         user_id: User ID (for validation)
-    
+
+    Returns:
+        Picklable payload for render_pdf_bytes
+    """
+    request = _load_request(db, request_id, user_id)
+    total = db.execute(
+        select(func.count()).select_from(UserSignalResponse).where(
+            UserSignalResponse.request_id == request_id
+        )
+    ).scalar_one()
+
+    return {
+        'request': request,
+        'rows': list(_signal_rows(db, request_id, limit=PDF_ROW_LIMIT)),
+        'total': total,
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S IST'),
+    }
+
+
+def render_pdf_bytes(payload: Dict) -> bytes:
+    """
+    Lay out the PDF report (runs inside a worker process)
+
+    Note: Requires fpdf2 library
+    Install: pip install fpdf2
+
+    Args:
+        payload: Output of collect_pdf_payload
+
     Returns:
-        Path to generated PDF file
+        PDF document bytes
     """
     try:
         from fpdf import FPDF
     except ImportError:
         raise ImportError("fpdf2 not installed. Run: pip install fpdf2")
-    
-    # Get request and signals
-    request = db.query(UserSignalRequest).filter(
-        UserSignalRequest.id == request_id,
-        UserSignalRequest.user_id == user_id
-    ).first()
-    
-    if not request:
-        raise ValueError("Request not found or unauthorized")
-    
-    signals = db.query(UserSignalResponse).filter(
-        UserSignalResponse.request_id == request_id
-    ).order_by(UserSignalResponse.confidence.desc()).all()
-    
-    # Create PDF
+
+    request = payload['request']
+    rows = payload['rows']
+    total = payload['total']
+
     pdf = FPDF()
     pdf.add_page()
-    
+
     # Title
     pdf.set_font('Arial', 'B', 16)
     pdf.cell(0, 10, 'BUY Signals Market Scan Report', ln=True, align='C')
     pdf.ln(5)
-    
+
     # Metadata
     pdf.set_font('Arial', '', 10)
-    pdf.cell(0, 6, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S IST')}", ln=True)
-    pdf.cell(0, 6, f"Request ID: {request.id}", ln=True)
-    pdf.cell(0, 6, f"Total Stocks Analyzed: {request.total_stocks_analyzed:,}", ln=True)
-    pdf.cell(0, 6, f"BUY Signals Found: {request.total_signals_found}", ln=True)
-    pdf.cell(0, 6, f"Analysis Duration: {request.analysis_duration_seconds:.1f}s", ln=True)
+    pdf.cell(0, 6, f"Generated: {payload['generated_at']}", ln=True)
+    pdf.cell(0, 6, f"Request ID: {request['id']}", ln=True)
+    pdf.cell(0, 6, f"Total Stocks Analyzed: {request['total_stocks_analyzed']:,}", ln=True)
+    pdf.cell(0, 6, f"BUY Signals Found: {request['total_signals_found']}", ln=True)
+    pdf.cell(0, 6, f"Analysis Duration: {request['analysis_duration_seconds']:.1f}s", ln=True)
     pdf.ln(5)
-    
+
     # Filters
-    if request.sectors or request.market_caps:
+    if request['sectors'] or request['market_caps']:
         pdf.set_font('Arial', 'B', 11)
         pdf.cell(0, 6, 'Filters Applied:', ln=True)
         pdf.set_font('Arial', '', 10)
-        
-        if request.sectors:
-            sectors = json.loads(request.sectors)
+
+        if request['sectors']:
+            sectors = json.loads(request['sectors'])
             pdf.cell(0, 6, f"  Sectors: {', '.join(sectors)}", ln=True)
-        
-        if request.market_caps:
-            caps = json.loads(request.market_caps)
+
+        if request['market_caps']:
+            caps = json.loads(request['market_caps'])
             pdf.cell(0, 6, f"  Market Cap: {', '.join(caps)}", ln=True)
-        
+
         pdf.ln(5)
-    
+
     # Table header
     pdf.set_font('Arial', 'B', 8)
     pdf.cell(30, 6, 'Symbol', 1)
@@ -165,42 +255,202 @@ async def export_to_pdf(db: Session, request_id: int, user_id: int) -> str:
     pdf.cell(22, 6, 'Target', 1)
     pdf.cell(15, 6, 'Cap', 1)
     pdf.ln()
-    
+
     # Table rows
     pdf.set_font('Arial', '', 7)
-    for idx, signal in enumerate(signals[:50], 1):  # Limit to 50 for PDF
-        pdf.cell(30, 5, signal.ticker[:18], 1)
-        pdf.cell(35, 5, (signal.sector or 'Others')[:18], 1)
-        pdf.cell(20, 5, signal.recommendation_type[:8], 1)
-        pdf.cell(15, 5, f"{signal.confidence:.1f}%", 1)
-        pdf.cell(12, 5, f"{signal.risk_reward:.2f}", 1)
-        pdf.cell(22, 5, f"Rs.{signal.current_price:.2f}", 1)
-        pdf.cell(22, 5, f"Rs.{signal.target:.2f}" if signal.target else "-", 1)
-        pdf.cell(15, 5, (signal.market_cap or 'Unknown')[:5], 1)
+    for (ticker, sector, market_cap, rec_type, confidence, risk_reward,
+         price, target, _stop_loss, _is_etf, _sent_at) in rows:
+        pdf.cell(30, 5, ticker[:18], 1)
+        pdf.cell(35, 5, (sector or 'Others')[:18], 1)
+        pdf.cell(20, 5, rec_type[:8], 1)
+        pdf.cell(15, 5, f"{confidence:.1f}%", 1)
+        pdf.cell(12, 5, f"{risk_reward:.2f}", 1)
+        pdf.cell(22, 5, f"Rs.{price:.2f}", 1)
+        pdf.cell(22, 5, f"Rs.{target:.2f}" if target else "-", 1)
+        pdf.cell(15, 5, (market_cap or 'Unknown')[:5], 1)
         pdf.ln()
-    
-    if len(signals) > 50:
+
+    if total > PDF_ROW_LIMIT:
         pdf.ln(5)
         pdf.set_font('Arial', 'I', 8)
-        pdf.cell(0, 6, f"Note: Showing top 50 of {len(signals)} signals", ln=True)
-    
+        pdf.cell(0, 6, f"Note: Showing top {PDF_ROW_LIMIT} of {total} signals", ln=True)
+
     # Footer
     pdf.ln(10)
     pdf.set_font('Arial', 'I', 8)
     pdf.cell(0, 6, 'Disclaimer: This is for informational purposes only. Not investment advice.', ln=True, align='C')
-    
-    # Create exports directory
-    export_dir = Path('exports') / str(user_id)
-    export_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate filename
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"buy_signals_{request_id}_{timestamp}.pdf"
-    filepath = export_dir / filename
-    
-    # Save PDF
-    pdf.output(str(filepath))
-    
-    logger.info(f"PDF exported: {filepath} ({len(signals)} signals)")
-    
-    return str(filepath)
+
+    return bytes(pdf.output())
+
+
+class ExportService:
+    """Off-loop exporter with per-request artifact caching"""
+
+    def __init__(
+        self,
+        max_workers: int = EXPORT_PDF_WORKERS,
+        cache_size: int = EXPORT_CACHE_SIZE,
+        session_factory: Callable = get_db_context
+    ):
+        """
+        Initialize export service
+
+        Args:
+            max_workers: PDF worker processes
+            cache_size: Number of finished artifacts kept in memory (LRU)
+            session_factory: Context manager yielding a database session
+        """
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.session_factory = session_factory
+        # (request_id, format) -> (owner user_id, artifact)
+        self._cache: "OrderedDict[Tuple[int, str], Tuple[int, ExportArtifact]]" = OrderedDict()
+        # (request_id, format, user_id) -> future of a build in progress
+        self._inflight: Dict[Tuple[int, str, int], asyncio.Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.builds = 0
+        self.hits = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Lazily start the PDF pool ('spawn' so workers never inherit the event loop)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    async def get_export(self, request_id: int, user_id: int, fmt: str) -> ExportArtifact:
+        """
+        Get an export artifact, building it at most once per (request_id, format)
+
+        Args:
+            request_id: Request ID to export
+            user_id: User ID (for validation)
+            fmt: FORMAT_CSV or FORMAT_PDF
+
+        Returns:
+            ExportArtifact
+
+        Raises:
+            ValueError: Unknown format, missing request or another user's request
+            ImportError: If fpdf2 is not installed (PDF only)
+        """
+        if fmt not in (FORMAT_CSV, FORMAT_PDF):
+            raise ValueError(f"Unknown export format: {fmt}")
+
+        key = (request_id, fmt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            owner, artifact = cached
+            if owner != user_id:
+                raise ValueError("Request not found or unauthorized")
+            self.hits += 1
+            return artifact
+
+        # The same user already has this export building. Builds are shared
+        # per caller, not per request, so another user's failed ownership
+        # check never fails the owner's tap (each build checks its own caller)
+        flight = (request_id, fmt, user_id)
+        if flight in self._inflight:
+            artifact = await asyncio.shield(self._inflight[flight])
+            self.hits += 1
+            return artifact
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[flight] = future
+
+        try:
+            if fmt == FORMAT_CSV:
+                artifact = await loop.run_in_executor(None, self._with_session, build_csv_export, request_id, user_id)
+            else:
+                payload = await loop.run_in_executor(None, self._with_session, collect_pdf_payload, request_id, user_id)
+                data = await loop.run_in_executor(self._get_executor(), render_pdf_bytes, payload)
+                artifact = ExportArtifact(f"buy_signals_{request_id}.pdf", data, len(payload['rows']))
+
+            self.builds += 1
+            self._cache_put(key, (user_id, artifact))
+            future.set_result(artifact)
+            logger.info("Built %s export for request %s (%d rows, %d bytes)",
+                        fmt.upper(), request_id, artifact.rows, len(artifact.data))
+            return artifact
+
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise; mark retrieved so a lone failure is not logged as unhandled
+            future.exception()
+            raise
+
+        finally:
+            self._inflight.pop(flight, None)
+
+    def _with_session(self, builder: Callable, request_id: int, user_id: int):
+        """Run a builder with its own session (sessions are not shared across threads)"""
+        with self.session_factory() as db:
+            return builder(db, request_id, user_id)
+
+    def _cache_get(self, key: Tuple[int, str]) -> Optional[Tuple[int, ExportArtifact]]:
+        """LRU lookup"""
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+        return entry
+
+    def _cache_put(self, key: Tuple[int, str], entry: Tuple[int, ExportArtifact]):
+        """LRU insert with eviction"""
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def shutdown(self):
+        """Stop PDF workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_export_service: Optional[ExportService] = None
+
+
+def get_export_service() -> ExportService:
+    """
+    Get singleton instance of ExportService
+
+    Returns:
+        ExportService instance
+    """
+    global _export_service
+    if _export_service is None:
+        _export_service = ExportService()
+    return _export_service
+
+
+async def export_to_csv(request_id: int, user_id: int) -> ExportArtifact:
+    """
+    Export scan results to CSV
+
+    Args:
+        request_id: Request ID to export
+        user_id: User ID (for validation)
+
+    Returns:
+        ExportArtifact with the CSV document
+    """
+    return await get_export_service().get_export(request_id, user_id, FORMAT_CSV)
+
+
+async def export_to_pdf(request_id: int, user_id: int) -> ExportArtifact:
+    """
+    Export scan results to PDF
+
+    Args:
+        request_id: Request ID to export
+        user_id: User ID (for validation)
+
+    Returns:
+        ExportArtifact with the PDF document
+    """
+    return await get_export_service().get_export(request_id, user_id, FORMAT_PDF)
@@ -0,0 +1,197 @@
+"""
+Exposure Service
+Builds the nightly correlation / sector exposure matrix for the tradable
+universe and answers position admission checks from it
+
+The build fetches daily bars for every non-ETF symbol in the universe
+file in batches, keeps only the closes and writes an ExposureMatrix
+generation to EXPOSURE_DIR. Admission checks at market open only index
+into the memory-mapped matrix, so they cost microseconds per signal.
+
+Author: Harsh Kandhway
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from src.bot.config import (
+    ENABLE_EXPOSURE_CHECKS,
+    EXPOSURE_CORRELATION_LIMIT,
+    EXPOSURE_DIR,
+    EXPOSURE_FETCH_BATCH,
+    EXPOSURE_LOOKBACK_BARS,
+    EXPOSURE_MAX_CORRELATED,
+    EXPOSURE_MAX_MARKET_CAP_PCT,
+    EXPOSURE_MAX_SECTOR_PCT,
+    EXPOSURE_MIN_DOWNSIZE_PCT,
+)
+from src.bot.services.analysis_service import fetch_multiple_stock_data
+from src.core.exposure import ExposureMatrix, check_admission
+from src.core.timing import timed
+
+logger = logging.getLogger(__name__)
+
+UNIVERSE_CSV = os.path.join(os.path.dirname(__file__), '../../../data/stock_tickers_enhanced.csv')
+
+
+def load_universe(path: str = UNIVERSE_CSV) -> Dict[str, Tuple[str, str]]:
+    """
+    Tradable symbols with their sector and market-cap bucket
+
+    Args:
+        path: Universe CSV (ticker, sector, market_cap, is_etf columns)
+
+    Returns:
+        Dictionary of symbol -> (sector, market cap), ETFs excluded
+    """
+    df = pd.read_csv(path)
+    if 'is_etf' in df.columns:
+        df = df[df['is_etf'] == False]
+    sectors = df['sector'] if 'sector' in df.columns else pd.Series('', index=df.index)
+    caps = df['market_cap'] if 'market_cap' in df.columns else pd.Series('', index=df.index)
+
+    universe = {}
+    for ticker, sector, cap in zip(df['ticker'], sectors.fillna(''), caps.fillna('')):
+        symbol = str(ticker).strip().upper()
+        if symbol:
+            universe[symbol] = (str(sector).strip(), str(cap).strip())
+    return universe
+
+
+class ExposureService:
+    """Owns the current exposure matrix and the admission limits"""
+
+    def __init__(self, root: str = EXPOSURE_DIR, universe_path: str = UNIVERSE_CSV, enabled: bool = ENABLE_EXPOSURE_CHECKS):
+        """
+        Initialize exposure service
+
+        Args:
+            root: Directory holding the matrix generations
+            universe_path: Universe CSV
+            enabled: When False every admission check passes unchanged
+        """
+        self.root = root
+        self.universe_path = universe_path
+        self.enabled = enabled
+        self._matrix: Optional[ExposureMatrix] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def matrix(self) -> Optional[ExposureMatrix]:
+        """Current matrix, loaded from disk on first use (None before the first build)"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._matrix = ExposureMatrix.load(self.root)
+                    self._loaded = True
+                    if self._matrix is not None:
+                        logger.info(
+                            f"Loaded exposure matrix: {len(self._matrix)} symbols, "
+                            f"built {self._matrix.meta.get('created_at')}"
+                        )
+        return self._matrix
+
+    @property
+    def active(self) -> bool:
+        """Whether admission checks apply (enabled and a matrix has been built)"""
+        return self.enabled and self.matrix is not None
+
+    def reload(self) -> Optional[ExposureMatrix]:
+        """Re-read the newest generation from disk (e.g. after another process built it)"""
+        with self._lock:
+            self._loaded = False
+        return self.matrix
+
+    @timed('exposure.build')
+    def build(self, histories: Optional[Dict[str, pd.DataFrame]] = None) -> ExposureMatrix:
+        """
+        Build, save and switch to a new exposure matrix
+
+        Args:
+            histories: Symbol -> OHLCV DataFrame (fetched for the whole
+                       universe in EXPOSURE_FETCH_BATCH batches when omitted)
+
+        Returns:
+            The new ExposureMatrix
+        """
+        universe = load_universe(self.universe_path)
+        symbols = list(universe)
+
+        closes = {}
+        if histories is None:
+            for start in range(0, len(symbols), EXPOSURE_FETCH_BATCH):
+                batch = symbols[start:start + EXPOSURE_FETCH_BATCH]
+                for symbol, df in fetch_multiple_stock_data(batch, period='1y').items():
+                    closes[symbol] = _daily_closes(df)
+        else:
+            closes = {symbol: _daily_closes(df) for symbol, df in histories.items()}
+
+        frame = pd.concat(closes, axis=1).sort_index() if closes else pd.DataFrame()
+        matrix = ExposureMatrix.build(frame, universe, EXPOSURE_LOOKBACK_BARS)
+        path = matrix.save(self.root)
+
+        with self._lock:
+            self._matrix = ExposureMatrix.load(self.root) or matrix
+            self._loaded = True
+
+        logger.info(
+            f"Exposure matrix built: {len(matrix)} symbols, {len(closes)} with history, "
+            f"{matrix.meta['bars']} bars -> {path}"
+        )
+        return matrix
+
+    def check(self, symbol: str, value: float, holdings: Dict[str, float], equity: float) -> Dict[str, Any]:
+        """
+        Admission check for a new position under the configured limits
+
+        Args:
+            symbol: Candidate symbol
+            value: Requested position value
+            holdings: Symbol -> value of open (and already staged) positions
+            equity: Session capital the percentage limits refer to
+
+        Returns:
+            check_admission result; allowed with the requested value when
+            checks are disabled or no matrix has been built yet
+        """
+        matrix = self.matrix if self.enabled else None
+        if matrix is None:
+            return {'allowed': True, 'value': value, 'reason': None, 'correlated': {}, 'sector': '', 'market_cap': ''}
+
+        return check_admission(
+            matrix, symbol, value, holdings, equity,
+            max_sector_pct=EXPOSURE_MAX_SECTOR_PCT,
+            max_market_cap_pct=EXPOSURE_MAX_MARKET_CAP_PCT,
+            correlation_limit=EXPOSURE_CORRELATION_LIMIT,
+            max_correlated=EXPOSURE_MAX_CORRELATED,
+            min_fraction=EXPOSURE_MIN_DOWNSIZE_PCT / 100.0
+        )
+
+
+def _daily_closes(df: pd.DataFrame) -> pd.Series:
+    """Close series with one value per calendar date"""
+    close = df['close'].astype(float)
+    close.index = pd.DatetimeIndex(close.index).normalize()
+    return close[~close.index.duplicated(keep='last')]
+
+
+# Global service instance
+_exposure_service: Optional[ExposureService] = None
+
+
+def get_exposure_service() -> ExposureService:
+    """
+    Get or create the exposure service
+
+    Returns:
+        ExposureService instance
+    """
+    global _exposure_service
+    if _exposure_service is None:
+        _exposure_service = ExposureService()
+    return _exposure_service
@@ -0,0 +1,297 @@
+"""
+Intraday Data Service
+Keeps fresh intraday bars for the symbols alerts and paper trading follow
+
+Consumers call track() with the symbols they care about and read prices or
+bars from memory; a scheduler job calls refresh_tracked() every
+INTRADAY_REFRESH_SECONDS during market hours, which downloads the newest
+bars for all tracked symbols in batched requests and appends them to the
+per-symbol ring buffers (src.core.intraday). The first download for a symbol
+backfills a few sessions, later ones only fetch the current session.
+live_indicators() keeps streaming indicator state per symbol, so each read
+only applies the bars completed since the previous one.
+Nothing on the consumer path touches the network: a symbol without fresh
+bars is simply missing and callers fall back to the daily fetchers.
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.bot.config import (
+    ENABLE_INTRADAY_DATA, INTRADAY_BAR_INTERVAL, INTRADAY_BUFFER_BARS,
+    INTRADAY_INDICATOR_STATE_FILE, INTRADAY_MAX_AGE_SECONDS, INTRADAY_TRACK_MINUTES
+)
+from src.core.config import TIMEFRAME_CONFIGS
+from src.core.indicators import calculate_all_indicators
+from src.core.intraday import BAR_TIMEFRAMES, IntradayStore
+from src.core.streaming_indicators import IndicatorEngine
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_PERIOD = '5d'  # First download for a symbol
+INCREMENTAL_PERIOD = '1d'  # Later downloads
+
+
+def fetch_intraday_history(symbols: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch intraday bars for several symbols in one request
+
+    Args:
+        symbols: Stock symbols
+        period: Yahoo period ('1d', '5d', ...)
+        interval: Bar size ('1m', '5m', ...)
+
+    Returns:
+        Dictionary of symbol -> OHLCV frame with a naive-UTC DatetimeIndex
+    """
+    from yahooquery import Ticker
+
+    df = Ticker(list(symbols)).history(period=period, interval=interval)
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return {}
+
+    if not isinstance(df.index, pd.MultiIndex):
+        df = pd.concat({symbols[0]: df})
+
+    frames = {}
+    for symbol, frame in df.groupby(level=0):
+        frame = frame.reset_index(level=0, drop=True)
+        # Mixed exchange offsets come back as objects; normalise to naive UTC
+        frame.index = pd.to_datetime(frame.index, utc=True).tz_localize(None)
+        frames[symbol] = frame
+    return frames
+
+
+class IntradayService:
+    """Tracked-symbol intraday bar ingestion"""
+
+    def __init__(
+        self,
+        interval: str = INTRADAY_BAR_INTERVAL,
+        capacity: int = INTRADAY_BUFFER_BARS,
+        max_age_seconds: float = INTRADAY_MAX_AGE_SECONDS,
+        track_seconds: float = INTRADAY_TRACK_MINUTES * 60,
+        fetcher: Callable = fetch_intraday_history,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize intraday service
+
+        Args:
+            interval: Bar size to ingest
+            capacity: Bars kept per symbol
+            max_age_seconds: Prices whose newest bar ended longer ago are treated as missing
+            track_seconds: Symbols not requested for this long stop refreshing
+            fetcher: Function (symbols, period, interval) -> {symbol: frame}
+            clock: Wall clock
+        """
+        self.interval = interval
+        self.max_age_seconds = max_age_seconds
+        self.track_seconds = track_seconds
+        self.fetcher = fetcher
+        self.clock = clock
+        self.store = IntradayStore(capacity, clock, BAR_TIMEFRAMES.get(interval, 60))
+        self.engine = IndicatorEngine('intraday')
+        self._engine_lock = threading.Lock()
+        self._tracked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.refreshes = 0
+
+    # =========================================================================
+    # CONSUMER API (memory only)
+    # =========================================================================
+
+    def track(self, symbols: Iterable[str]):
+        """Ask for symbols to be included in the next refreshes"""
+        now = self.clock()
+        with self._lock:
+            for symbol in symbols:
+                self._tracked[symbol] = now
+
+    @property
+    def tracked(self) -> List[str]:
+        """Symbols currently refreshed"""
+        with self._lock:
+            return list(self._tracked)
+
+    def latest_price(self, symbol: str) -> Optional[float]:
+        """
+        Fresh intraday price for a symbol
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Close of the newest bar, or None if missing or stale
+        """
+        return self.store.latest_price(symbol, self.max_age_seconds)
+
+    def latest_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        Fresh intraday prices (missing or stale symbols are omitted)
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dictionary of symbol -> price
+        """
+        return self.store.latest_prices(symbols, self.max_age_seconds)
+
+    def bars(self, symbol: str, timeframe: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Stored bars for a symbol, optionally resampled ('15m', '1h', '1d', ...)
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Target timeframe (None keeps the ingested bars)
+
+        Returns:
+            OHLCV frame, or None if nothing is stored
+        """
+        return self.store.bars(symbol, timeframe)
+
+    def indicators(self, symbol: str) -> Optional[Dict]:
+        """
+        Indicators on intraday bars using the 'intraday' timeframe config
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            calculate_all_indicators result, or None if no bars are stored
+
+        Raises:
+            ValueError: If too few bars are stored yet
+        """
+        bars = self.bars(symbol, TIMEFRAME_CONFIGS['intraday']['bar_interval'])
+        if bars is None:
+            return None
+        return calculate_all_indicators(bars, timeframe='intraday')
+
+    def live_indicators(self, symbol: str) -> Optional[Dict]:
+        """
+        Streaming indicators on intraday bars, including the forming bar
+
+        Only bars completed since the previous call are applied to the
+        symbol's state; the forming bar is previewed without being stored.
+        Covers the EMA, RSI, MACD, ADX, ATR, Bollinger, stochastic and volume
+        keys of indicators().
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Dictionary of indicator values, or None if no bars are stored
+        """
+        bars = self.bars(symbol, TIMEFRAME_CONFIGS['intraday']['bar_interval'])
+        if bars is None:
+            return None
+        with self._engine_lock:
+            return self.engine.update(symbol, bars, partial_last=True)
+
+    def save_indicator_state(self, path: str = INTRADAY_INDICATOR_STATE_FILE):
+        """Checkpoint streaming indicator state (no-op without a path)"""
+        if path:
+            with self._engine_lock:
+                self.engine.save(path)
+
+    def load_indicator_state(self, path: str = INTRADAY_INDICATOR_STATE_FILE) -> int:
+        """Restore checkpointed indicator state, returning the number of symbols"""
+        if not path:
+            return 0
+        with self._engine_lock:
+            return self.engine.load(path)
+
+    # =========================================================================
+    # INGESTION
+    # =========================================================================
+
+    def _expire_tracked(self) -> List[str]:
+        """Drop symbols nobody asked for recently, returning those still tracked"""
+        cutoff = self.clock() - self.track_seconds
+        with self._lock:
+            expired = [s for s, seen in self._tracked.items() if seen < cutoff]
+            for symbol in expired:
+                del self._tracked[symbol]
+            tracked = list(self._tracked)
+        if expired:
+            self.store.discard(expired)
+            with self._engine_lock:
+                for symbol in expired:
+                    self.engine.discard(symbol)
+        return tracked
+
+    def refresh(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Download and append the newest bars (blocking)
+
+        Args:
+            symbols: Symbols to refresh (default: all tracked symbols)
+
+        Returns:
+            Dictionary of symbol -> number of new bars stored
+        """
+        symbols = list(symbols) if symbols is not None else self._expire_tracked()
+        if not symbols:
+            return {}
+
+        backfill, incremental = [], []
+        for symbol in symbols:
+            (backfill if self.store.last_time(symbol) is None else incremental).append(symbol)
+
+        added = {}
+        for group, period in ((backfill, BACKFILL_PERIOD), (incremental, INCREMENTAL_PERIOD)):
+            if not group:
+                continue
+            try:
+                frames = self.fetcher(group, period, self.interval)
+            except Exception as e:
+                logger.warning(f"Intraday fetch failed for {len(group)} symbols: {e}")
+                continue
+            for symbol, frame in frames.items():
+                added[symbol] = self.store.ingest(symbol, frame)
+
+        self.refreshes += 1
+        logger.debug(f"Intraday refresh: {sum(added.values())} new bars for {len(added)} symbols")
+        return added
+
+    async def refresh_tracked(self):
+        """Scheduler job: refresh tracked symbols while the market is open"""
+        if not ENABLE_INTRADAY_DATA:
+            return
+
+        from src.bot.services.market_hours_service import get_market_hours_service
+        if not get_market_hours_service().is_market_open():
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.refresh)
+
+
+_intraday_service: Optional[IntradayService] = None
+
+
+def get_intraday_service() -> IntradayService:
+    """
+    Get singleton instance of IntradayService
+
+    Returns:
+        IntradayService instance
+    """
+    global _intraday_service
+    if _intraday_service is None:
+        _intraday_service = IntradayService()
+        try:
+            _intraday_service.load_indicator_state()
+        except Exception as e:
+            logger.warning(f"Could not restore indicator state: {e}")
+    return _intraday_service
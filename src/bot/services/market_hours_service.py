@@ -1,16 +1,18 @@
 """
 Market Hours Service
 Determines if NSE/BSE is open for trading
-Handles market hours, weekends, and holidays
+Handles market hours, weekends, and holidays via the shared trading calendar
 
 Author: Harsh Kandhway
 """
 
 import logging
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time
 from typing import Optional
 import pytz
 
+from src.core.trading_calendar import SESSION_CLOSE, SESSION_OPEN, get_trading_calendar
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,38 +20,24 @@ class MarketHoursService:
     """Service to check NSE/BSE market hours and holidays"""
 
     # Market timing (IST)
-    MARKET_OPEN = time(9, 15)   # 9:15 AM IST
-    MARKET_CLOSE = time(15, 30)  # 3:30 PM IST
+    MARKET_OPEN = SESSION_OPEN    # 9:15 AM IST
+    MARKET_CLOSE = SESSION_CLOSE  # 3:30 PM IST
     TIMEZONE = pytz.timezone('Asia/Kolkata')
 
-    # NSE/BSE Holidays for 2026 (major holidays)
-    # Format: (month, day) tuples
-    HOLIDAYS_2026 = [
-        (1, 26),   # Republic Day
-        (3, 14),   # Holi
-        (4, 6),    # Mahavir Jayanti
-        (4, 10),   # Good Friday
-        (4, 14),   # Dr. Ambedkar Jayanti
-        (5, 1),    # Maharashtra Day
-        (8, 15),   # Independence Day
-        (10, 2),   # Gandhi Jayanti / Dussehra
-        (10, 20),  # Diwali - Lakshmi Pujan
-        (10, 21),  # Diwali - Balipratipada
-        (11, 5),   # Guru Nanak Jayanti
-        (12, 25),  # Christmas
-    ]
-
-    # Islamic holidays (approximate dates for 2026 - vary by moon sighting)
-    ISLAMIC_HOLIDAYS_2026 = [
-        (4, 4),    # Eid al-Fitr (Ramadan)
-        (6, 16),   # Eid ul-Adha (Bakri Eid)
-        (8, 22),   # Ganesh Chaturthi
-    ]
-
     def __init__(self):
         """Initialize market hours service"""
-        self.all_holidays_2026 = set(self.HOLIDAYS_2026 + self.ISLAMIC_HOLIDAYS_2026)
-        logger.info("MarketHoursService initialized with %d holidays", len(self.all_holidays_2026))
+        # Holidays and session times live in the shared trading calendar
+        self.calendar = get_trading_calendar()
+        logger.info("MarketHoursService initialized with %d sessions (%d-%d)",
+                    len(self.calendar), self.calendar.start_year, self.calendar.end_year)
+
+    def _localize(self, when: Optional[datetime]) -> datetime:
+        """Current time or `when` as an IST datetime (naive input is IST)"""
+        if when is None:
+            return datetime.now(self.TIMEZONE)
+        if when.tzinfo is None:
+            return self.TIMEZONE.localize(when)
+        return when.astimezone(self.TIMEZONE)
 
     def is_market_open(self, check_time: Optional[datetime] = None) -> bool:
         """
@@ -61,39 +49,13 @@ class MarketHoursService:
         Returns:
             True if market is open, False otherwise
         """
-        if check_time is None:
-            check_time = datetime.now(self.TIMEZONE)
-        elif check_time.tzinfo is None:
-            # Convert naive datetime to IST
-            check_time = self.TIMEZONE.localize(check_time)
-        else:
-            # Convert to IST if different timezone
-            check_time = check_time.astimezone(self.TIMEZONE)
-
-        logger.info(f"Market hours check: input_time={check_time}, weekday={check_time.weekday()}, time={check_time.strftime('%H:%M:%S IST')}")
-
-        # Check if weekend (Saturday=5, Sunday=6)
-        if check_time.weekday() >= 5:
-            logger.info("Market closed: Weekend (%s)", check_time.strftime('%A'))
-            return False
-
-        # Check if holiday
-        if self._is_holiday(check_time.date()):
-            logger.info("Market closed: Holiday (%s)", check_time.date())
-            return False
-
-        # Check market hours
-        current_time = check_time.time()
-        is_open = self.MARKET_OPEN <= current_time <= self.MARKET_CLOSE
-
-        if is_open:
-            logger.info("Market is OPEN at %s (between %s and %s)", check_time.strftime('%H:%M:%S'), self.MARKET_OPEN.strftime('%H:%M'), self.MARKET_CLOSE.strftime('%H:%M'))
-        else:
-            logger.info("Market closed: Outside trading hours (%s, market hours: %s-%s)", check_time.strftime('%H:%M:%S'), self.MARKET_OPEN.strftime('%H:%M'), self.MARKET_CLOSE.strftime('%H:%M'))
-
+        check_time = self._localize(check_time)
+        is_open = self.calendar.is_open(check_time)
+        logger.debug("Market %s at %s", "OPEN" if is_open else "closed",
+                     check_time.strftime('%Y-%m-%d %H:%M:%S %Z'))
         return is_open
 
-    def _is_holiday(self, check_date: datetime.date) -> bool:
+    def _is_holiday(self, check_date: date) -> bool:
         """
         Check if given date is a market holiday
 
@@ -103,13 +65,7 @@ class MarketHoursService:
         Returns:
             True if holiday, False otherwise
         """
-        # Only check holidays for 2026 (extend this for future years)
-        if check_date.year == 2026:
-            return (check_date.month, check_date.day) in self.all_holidays_2026
-
-        # For other years, return False (extend holiday calendar as needed)
-        logger.warning("Holiday calendar not available for year %d", check_date.year)
-        return False
+        return check_date.weekday() < 5 and not self.calendar.is_trading_day(check_date)
 
     def get_next_market_open(self, from_time: Optional[datetime] = None) -> datetime:
         """
@@ -121,51 +77,9 @@ class MarketHoursService:
         Returns:
             Datetime of next market open
         """
-        if from_time is None:
-            from_time = datetime.now(self.TIMEZONE)
-        elif from_time.tzinfo is None:
-            from_time = self.TIMEZONE.localize(from_time)
-        else:
-            from_time = from_time.astimezone(self.TIMEZONE)
-
-        # Start checking from current time
-        check_time = from_time
-
-        # If currently during market hours, return next day's open
-        if self.is_market_open(check_time):
-            check_time = check_time.replace(
-                hour=self.MARKET_CLOSE.hour,
-                minute=self.MARKET_CLOSE.minute,
-                second=0,
-                microsecond=0
-            ) + timedelta(minutes=1)  # Move past market close
-
-        # Find next valid trading day
-        max_iterations = 30  # Prevent infinite loop (check up to 30 days)
-        for _ in range(max_iterations):
-            # Set to market open time
-            next_open = check_time.replace(
-                hour=self.MARKET_OPEN.hour,
-                minute=self.MARKET_OPEN.minute,
-                second=0,
-                microsecond=0
-            )
-
-            # If we've passed market open time today, try tomorrow
-            if check_time.time() > self.MARKET_OPEN:
-                next_open += timedelta(days=1)
-
-            # Check if this is a valid trading day
-            if next_open.weekday() < 5 and not self._is_holiday(next_open.date()):
-                logger.info("Next market open: %s", next_open.strftime('%Y-%m-%d %H:%M %Z'))
-                return next_open
-
-            # Move to next day
-            check_time = next_open + timedelta(days=1)
-
-        # Fallback (should never reach here)
-        logger.error("Could not find next market open within 30 days")
-        return check_time
+        next_open = self.calendar.next_open(self._localize(from_time)).astimezone(self.TIMEZONE)
+        logger.debug("Next market open: %s", next_open.strftime('%Y-%m-%d %H:%M %Z'))
+        return next_open
 
     def get_next_market_close(self, from_time: Optional[datetime] = None) -> datetime:
         """
@@ -177,33 +91,23 @@ class MarketHoursService:
         Returns:
             Datetime of next market close
         """
-        if from_time is None:
-            from_time = datetime.now(self.TIMEZONE)
-        elif from_time.tzinfo is None:
-            from_time = self.TIMEZONE.localize(from_time)
-        else:
-            from_time = from_time.astimezone(self.TIMEZONE)
-
-        # If market is currently open, return today's close
-        if self.is_market_open(from_time):
-            next_close = from_time.replace(
-                hour=self.MARKET_CLOSE.hour,
-                minute=self.MARKET_CLOSE.minute,
-                second=0,
-                microsecond=0
-            )
-            logger.info("Next market close: %s", next_close.strftime('%Y-%m-%d %H:%M %Z'))
-            return next_close
-
-        # Otherwise, get next market open and return its close
-        next_open = self.get_next_market_open(from_time)
-        next_close = next_open.replace(
-            hour=self.MARKET_CLOSE.hour,
-            minute=self.MARKET_CLOSE.minute
-        )
-        logger.info("Next market close: %s", next_close.strftime('%Y-%m-%d %H:%M %Z'))
+        next_close = self.calendar.next_close(self._localize(from_time)).astimezone(self.TIMEZONE)
+        logger.debug("Next market close: %s", next_close.strftime('%Y-%m-%d %H:%M %Z'))
         return next_close
 
+    def get_next_session_time(self, at: time, from_time: Optional[datetime] = None) -> datetime:
+        """
+        Next time-of-day `at` on a trading day, strictly after `from_time`
+
+        Args:
+            at: IST time of day (e.g. 9:20 for BUY execution)
+            from_time: Starting time (defaults to now)
+
+        Returns:
+            Datetime of the next scheduled run
+        """
+        return self.calendar.next_session_time(self._localize(from_time), at).astimezone(self.TIMEZONE)
+
     def seconds_until_market_open(self, from_time: Optional[datetime] = None) -> int:
         """
         Calculate seconds until next market open
@@ -214,12 +118,7 @@ class MarketHoursService:
         Returns:
             Number of seconds until next market open
         """
-        if from_time is None:
-            from_time = datetime.now(self.TIMEZONE)
-        elif from_time.tzinfo is None:
-            from_time = self.TIMEZONE.localize(from_time)
-        else:
-            from_time = from_time.astimezone(self.TIMEZONE)
+        from_time = self._localize(from_time)
 
         next_open = self.get_next_market_open(from_time)
         seconds = int((next_open - from_time).total_seconds())
@@ -237,12 +136,7 @@ class MarketHoursService:
         Returns:
             Number of seconds until next market close
         """
-        if from_time is None:
-            from_time = datetime.now(self.TIMEZONE)
-        elif from_time.tzinfo is None:
-            from_time = self.TIMEZONE.localize(from_time)
-        else:
-            from_time = from_time.astimezone(self.TIMEZONE)
+        from_time = self._localize(from_time)
 
         next_close = self.get_next_market_close(from_time)
         seconds = int((next_close - from_time).total_seconds())
@@ -250,7 +144,7 @@ class MarketHoursService:
         logger.debug("Seconds until market close: %d (%.1f hours)", seconds, seconds / 3600)
         return max(0, seconds)
 
-    def is_market_day(self, check_date: Optional[datetime.date] = None) -> bool:
+    def is_market_day(self, check_date: Optional[date] = None) -> bool:
         """
         Check if given date is a trading day (not weekend or holiday)
 
@@ -262,13 +156,7 @@ class MarketHoursService:
         """
         if check_date is None:
             check_date = datetime.now(self.TIMEZONE).date()
-
-        # Check weekend
-        if check_date.weekday() >= 5:
-            return False
-
-        # Check holiday
-        return not self._is_holiday(check_date)
+        return self.calendar.is_trading_day(check_date)
 
     def get_market_status_summary(self) -> dict:
         """
@@ -8,6 +8,7 @@ import time
 import hashlib
 import json
 import asyncio
+import contextlib
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
@@ -15,8 +16,11 @@ from datetime import datetime, timedelta
 import pandas as pd
 from sqlalchemy.orm import Session
 
+from src.bot.config import ENABLE_SCAN_ARCHIVE, SCAN_ARCHIVE_DIR, SCAN_COOLDOWN
 from src.bot.database.models import UserSignalRequest, UserSignalResponse
+from src.bot.middleware.rate_limiter import get_scan_limiter
 from src.bot.services.analysis_service import analyze_stock
+from src.core.scan_archive import ScanArchiveWriter
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +32,6 @@ class OnDemandAnalysisService:
     """Service for on-demand BUY signal analysis"""
     
     CACHE_DURATION_MINUTES = 15  # Cache results for 15 minutes
-    RATE_LIMIT_PER_HOUR = 100  # Max 5 requests/hour/user
     
     def __init__(self, db_session: Session):
         self.db = db_session
@@ -75,16 +78,16 @@ class OnDemandAnalysisService:
         """
         start_time = time.time()
         
-        # Check rate limit
-        if not self._check_rate_limit(user_id):
-            raise ValueError(f"Rate limit exceeded. Max {self.RATE_LIMIT_PER_HOUR} requests/hour.")
-        
         # Check cache
         cached_result = self._get_cached_result(user_id, sectors, market_caps, include_etf)
         if cached_result:
             logger.info(f"Returning cached result for user {user_id}")
             return cached_result
         
+        # Scan cooldown; applies even when the rate limiting middleware is off
+        if not get_scan_limiter().check(user_id, 'scan').allowed:
+            raise ValueError(f"Rate limit exceeded. Max {SCAN_COOLDOWN['max_calls']} scans/hour.")
+        
         # Filter stocks
         filtered_stocks = self._filter_stocks(sectors, market_caps, include_etf)
         total_stocks = len(filtered_stocks)
@@ -95,8 +98,12 @@ class OnDemandAnalysisService:
         # User feedback: NO stock limit - analyze all filtered stocks
         logger.info(f"Analyzing {total_stocks} stocks (no limit applied)")
         
-        # Analyze stocks
-        signals = await self._analyze_stocks(filtered_stocks, min_confidence, min_risk_reward)
+        # Analyze stocks; every result (not just BUYs) goes to the columnar scan archive
+        archive_writer = (
+            ScanArchiveWriter(SCAN_ARCHIVE_DIR, 'on_demand') if ENABLE_SCAN_ARCHIVE else contextlib.nullcontext()
+        )
+        with archive_writer as archive:
+            signals = await self._analyze_stocks(filtered_stocks, min_confidence, min_risk_reward, archive)
         
         # Save request to database
         request_record = self._save_request(
@@ -157,9 +164,10 @@ class OnDemandAnalysisService:
         self,
         stocks: List[Dict],
         min_confidence: float,
-        min_risk_reward: float
+        min_risk_reward: float,
+        archive: Optional[ScanArchiveWriter] = None
     ) -> List[Dict]:
-        """Analyze stocks and return BUY signals"""
+        """Analyze stocks and return BUY signals (every result is also added to archive, if given)"""
         signals = []
         errors = []
         total_stocks = len(stocks)
@@ -181,6 +189,9 @@ class OnDemandAnalysisService:
                     False        # use_cache
                 )
                 
+                if archive:
+                    archive.add(result)
+                
                 # Log result for each stock
                 rec = result['recommendation_type']
                 conf = result['confidence']
@@ -221,17 +232,6 @@ class OnDemandAnalysisService:
         
         return signals
     
-    def _check_rate_limit(self, user_id: int) -> bool:
-        """Check if user has exceeded rate limit"""
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        
-        count = self.db.query(UserSignalRequest).filter(
-            UserSignalRequest.user_id == user_id,
-            UserSignalRequest.request_timestamp >= one_hour_ago
-        ).count()
-        
-        return count < self.RATE_LIMIT_PER_HOUR
-    
     def _get_cached_result(
         self,
         user_id: int,
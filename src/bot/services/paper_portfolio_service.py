@@ -6,7 +6,7 @@ Author: Harsh Kandhway
 """
 
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from sqlalchemy.orm import Session
@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from src.bot.database.models import (
     PaperTradingSession, PaperPosition
 )
+from src.bot.services.exposure_service import get_exposure_service
 
 logger = logging.getLogger(__name__)
 
@@ -196,6 +197,89 @@ class PaperPortfolioService:
                     session.current_positions, session.max_positions, available)
         return True
 
+    def get_open_holdings(self, session: PaperTradingSession) -> Dict[str, float]:
+        """
+        Get entry value of every open position
+
+        Args:
+            session: Paper trading session
+
+        Returns:
+            Dictionary of symbol -> position value
+        """
+        rows = self.db.query(PaperPosition.symbol, PaperPosition.position_value).filter(
+            PaperPosition.session_id == session.id,
+            PaperPosition.is_open == True
+        ).all()
+
+        holdings: Dict[str, float] = {}
+        for symbol, value in rows:
+            holdings[symbol] = holdings.get(symbol, 0.0) + (value or 0.0)
+        return holdings
+
+    def check_exposure(
+        self,
+        session: PaperTradingSession,
+        symbol: str,
+        sizing: Dict,
+        holdings: Optional[Dict[str, float]] = None
+    ) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Apply the sector / correlation concentration limits to a sized entry
+
+        Uses the nightly exposure matrix: entries that move with too many
+        open positions are rejected, entries that would push a sector or
+        market-cap bucket over its limit are downsized (or rejected when
+        little room is left).
+
+        Args:
+            session: Paper trading session
+            symbol: Symbol to enter
+            sizing: Result of calculate_position_size
+            holdings: Symbol -> value of open and already staged positions
+                      (loaded from the database when omitted)
+
+        Returns:
+            Tuple of (sizing to use, error_message)
+        """
+        exposure_service = get_exposure_service()
+        if not exposure_service.active:
+            return sizing, None
+
+        if holdings is None:
+            holdings = self.get_open_holdings(session)
+
+        equity = session.current_capital + sum(holdings.values())
+        admission = exposure_service.check(symbol, sizing['position_value'], holdings, equity)
+
+        if not admission['allowed']:
+            logger.info("Exposure check rejected %s: %s", symbol, admission['reason'])
+            return None, admission['reason']
+
+        if admission['value'] >= sizing['position_value']:
+            return sizing, None
+
+        entry_price = sizing['entry_price']
+        shares = int(admission['value'] / entry_price)
+        if shares <= 0:
+            return None, admission['reason']
+
+        position_value = shares * entry_price
+        risk_amount = shares * sizing['risk_per_share']
+        logger.info(
+            "Exposure check downsized %s from %d to %d shares: %s",
+            symbol, sizing['shares'], shares, admission['reason']
+        )
+        return {
+            **sizing,
+            'shares': shares,
+            'position_value': position_value,
+            'risk_amount': risk_amount,
+            'actual_risk_pct': (risk_amount / session.current_capital) * 100,
+            'position_size_pct': (position_value / session.current_capital) * 100,
+            'exposure_note': admission['reason']
+        }, None
+
     def calculate_unrealized_pnl(
         self,
         position: PaperPosition,
@@ -2,24 +2,43 @@
 Paper Trade Analysis Service
 Analyzes performance and generates improvement recommendations
 
+Performance statistics are read from PaperTradeAggregate rows (counts,
+sums, sums of squares and extremes per session, recommendation type and
+exit day) that are updated incrementally as each trade closes, so reports
+cost a handful of row reads regardless of session length.
+
 Author: Harsh Kandhway
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
-import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, or_
 
 from src.bot.database.models import (
-    PaperTradingSession, PaperTrade, PaperTradeAnalytics
+    PaperTradingSession, PaperTrade, PaperTradeAnalytics, PaperTradeAggregate
 )
 
 logger = logging.getLogger(__name__)
 
+# Aggregate bucket scopes
+SCOPE_SESSION = 'session'
+SCOPE_RECOMMENDATION = 'recommendation'
+SCOPE_DAILY = 'daily'
+
+# Additive PaperTradeAggregate columns (extremes and JSON breakdowns merge separately)
+AGGREGATE_SUM_FIELDS = (
+    'trades_count', 'winning_trades', 'losing_trades',
+    'sum_pnl', 'sum_pnl_sq', 'gross_profit', 'gross_loss',
+    'sum_r_multiple', 'sum_r_multiple_sq', 'sum_days_held',
+    'win_sum_pnl_pct', 'win_sum_r_multiple', 'win_sum_confidence', 'win_sum_days_held',
+    'loss_sum_pnl_pct', 'loss_sum_confidence', 'loss_sum_days_held',
+    'stop_loss_exits', 'premature_stops', 'loser_premature_stops',
+)
+
 
 class PaperTradeAnalysisService:
     """Service for analyzing paper trading performance and generating insights"""
@@ -33,6 +52,68 @@ class PaperTradeAnalysisService:
         """
         self.db = db_session
 
+    def record_trade(self, trade: PaperTrade):
+        """
+        Fold a newly closed trade into the session's running aggregates
+
+        Updates the session, recommendation-type and exit-day buckets. The
+        caller owns the transaction (no commit here). If the session has no
+        aggregates yet (e.g. trades predating aggregates), they are rebuilt
+        from the full trade history instead, which includes this trade.
+
+        Args:
+            trade: Closed trade (added to the session, may be unflushed)
+        """
+        keys = self._bucket_keys(trade)
+        existing = self._load_buckets(trade.session_id, keys)
+
+        if (SCOPE_SESSION, '') not in existing:
+            self.db.flush()
+            self.rebuild_aggregates(trade.session_id)
+            return
+
+        for scope, scope_key in keys:
+            bucket = existing.get((scope, scope_key))
+            if bucket is None:
+                bucket = self._new_bucket(trade.session_id, scope, scope_key)
+            bucket.add_trade(trade)
+
+    def rebuild_aggregates(self, session_id: int) -> Dict:
+        """
+        Recompute all aggregates of a session from its trade history
+
+        Used to backfill sessions whose trades predate the aggregates
+        table. The caller owns the transaction (no commit here).
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Dictionary of (scope, scope_key) -> PaperTradeAggregate
+        """
+        self.db.query(PaperTradeAggregate).filter(
+            PaperTradeAggregate.session_id == session_id
+        ).delete(synchronize_session=False)
+
+        trades = self.db.query(PaperTrade).filter(
+            PaperTrade.session_id == session_id
+        ).order_by(PaperTrade.id).all()
+
+        buckets = {}
+        for trade in trades:
+            for scope, scope_key in self._bucket_keys(trade):
+                bucket = buckets.get((scope, scope_key))
+                if bucket is None:
+                    bucket = self._new_bucket(session_id, scope, scope_key)
+                    buckets[(scope, scope_key)] = bucket
+                bucket.add_trade(trade)
+
+        self.db.flush()
+
+        logger.info("Rebuilt performance aggregates for session %d from %d trades", session_id, len(trades))
+
+        return buckets
+
     def calculate_daily_analytics(
         self,
         session: PaperTradingSession,
@@ -48,27 +129,14 @@ class PaperTradeAnalysisService:
         Returns:
             PaperTradeAnalytics record
         """
-        # Get trades that closed today
         day_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
         day_end = day_start + timedelta(days=1)
 
-        trades = self.db.query(PaperTrade).filter(
-            PaperTrade.session_id == session.id,
-            PaperTrade.exit_date >= day_start,
-            PaperTrade.exit_date < day_end
-        ).all()
-
-        # Calculate metrics
-        metrics = self._calculate_metrics(trades, session, day_start, day_end)
-        metrics['period_type'] = 'daily'
+        # Trades that closed today
+        bucket = self._merge_buckets(self._daily_buckets(session, day_start, day_end))
 
-        # Create analytics record
-        analytics = PaperTradeAnalytics(**metrics)
-
-        # Save to database
-        self.db.add(analytics)
-        self.db.commit()
-        self.db.refresh(analytics)
+        metrics = self._calculate_metrics(bucket, session, day_start, day_end)
+        analytics = self._save_analytics(session, 'daily', metrics)
 
         logger.info(
             "📊 Daily analytics calculated: %d trades, %.1f%% win rate, profit factor %.2f",
@@ -94,22 +162,11 @@ class PaperTradeAnalysisService:
         """
         week_end = week_start + timedelta(days=7)
 
-        trades = self.db.query(PaperTrade).filter(
-            PaperTrade.session_id == session.id,
-            PaperTrade.exit_date >= week_start,
-            PaperTrade.exit_date < week_end
-        ).all()
-
-        # Calculate metrics
-        metrics = self._calculate_metrics(trades, session, week_start, week_end)
-        metrics['period_type'] = 'weekly'
-
-        # Create analytics record
-        analytics = PaperTradeAnalytics(**metrics)
+        # Sum of the week's daily buckets
+        bucket = self._merge_buckets(self._daily_buckets(session, week_start, week_end))
 
-        self.db.add(analytics)
-        self.db.commit()
-        self.db.refresh(analytics)
+        metrics = self._calculate_metrics(bucket, session, week_start, week_end)
+        analytics = self._save_analytics(session, 'weekly', metrics)
 
         logger.info(
             "📊 Weekly analytics calculated: %d trades, %.1f%% win rate, profit factor %.2f",
@@ -118,18 +175,53 @@ class PaperTradeAnalysisService:
 
         return analytics
 
+    def _save_analytics(
+        self,
+        session: PaperTradingSession,
+        period_type: str,
+        metrics: Dict
+    ) -> PaperTradeAnalytics:
+        """
+        Insert or refresh the analytics record for a period
+
+        Args:
+            session: Paper trading session
+            period_type: 'daily' or 'weekly'
+            metrics: Output of _calculate_metrics
+
+        Returns:
+            PaperTradeAnalytics record
+        """
+        analytics = self.db.query(PaperTradeAnalytics).filter(
+            PaperTradeAnalytics.session_id == session.id,
+            PaperTradeAnalytics.period_type == period_type,
+            PaperTradeAnalytics.period_start == metrics['period_start']
+        ).first()
+
+        if analytics is None:
+            analytics = PaperTradeAnalytics(period_type=period_type, **metrics)
+            self.db.add(analytics)
+        else:
+            for key, value in metrics.items():
+                setattr(analytics, key, value)
+
+        self.db.commit()
+        self.db.refresh(analytics)
+
+        return analytics
+
     def _calculate_metrics(
         self,
-        trades: List[PaperTrade],
+        bucket: PaperTradeAggregate,
         session: PaperTradingSession,
         period_start: datetime,
         period_end: datetime
     ) -> Dict:
         """
-        Calculate performance metrics for a set of trades
+        Calculate performance metrics from a period's aggregates
 
         Args:
-            trades: List of trades
+            bucket: Aggregates of the trades closed in the period
             session: Paper trading session
             period_start: Period start date
             period_end: Period end date
@@ -137,35 +229,24 @@ class PaperTradeAnalysisService:
         Returns:
             Dictionary of metrics
         """
-        # Separate winners and losers
-        winners = [t for t in trades if t.is_winner]
-        losers = [t for t in trades if not t.is_winner]
-
-        # Trade statistics
-        trades_count = len(trades)
-        winning_trades = len(winners)
-        losing_trades = len(losers)
+        trades_count = bucket.trades_count
+        winning_trades = bucket.winning_trades
+        losing_trades = bucket.losing_trades
         win_rate_pct = (winning_trades / trades_count * 100) if trades_count > 0 else 0
 
         # P&L metrics
-        gross_profit = sum(t.pnl for t in winners) if winners else 0
-        gross_loss = sum(abs(t.pnl) for t in losers) if losers else 0
+        gross_profit = bucket.gross_profit
+        gross_loss = bucket.gross_loss
         net_pnl = gross_profit - gross_loss
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
 
         # Performance metrics
-        avg_win = np.mean([t.pnl for t in winners]) if winners else 0
-        avg_loss = np.mean([abs(t.pnl) for t in losers]) if losers else 0
-        avg_r_multiple = np.mean([t.r_multiple for t in trades]) if trades else 0
-        best_trade_pnl = max([t.pnl for t in trades]) if trades else 0
-        worst_trade_pnl = min([t.pnl for t in trades]) if trades else 0
-        avg_hold_time_days = np.mean([t.days_held for t in trades]) if trades else 0
-
-        # Exit reasons breakdown
-        exit_reasons = {}
-        for trade in trades:
-            reason = trade.exit_reason
-            exit_reasons[reason] = exit_reasons.get(reason, 0) + 1
+        avg_win = gross_profit / winning_trades if winning_trades else 0
+        avg_loss = gross_loss / losing_trades if losing_trades else 0
+        avg_r_multiple = bucket.sum_r_multiple / trades_count if trades_count else 0
+        best_trade_pnl = bucket.best_trade_pnl if trades_count else 0
+        worst_trade_pnl = bucket.worst_trade_pnl if trades_count else 0
+        avg_hold_time_days = bucket.sum_days_held / trades_count if trades_count else 0
 
         # Capital metrics
         starting_capital = session.current_capital - net_pnl
@@ -181,6 +262,14 @@ class PaperTradeAnalysisService:
         # Get max concurrent positions (from session tracking)
         max_concurrent_positions = session.max_positions  # Simplified
 
+        # Dispersion stats come free with the running sums of squares
+        insights = None
+        if trades_count:
+            insights = self._dict_to_json({
+                'pnl_std': bucket.pnl_std(),
+                'r_multiple_std': bucket.r_multiple_std()
+            })
+
         return {
             'session_id': session.id,
             'period_start': period_start,
@@ -204,8 +293,8 @@ class PaperTradeAnalysisService:
             'ending_capital': ending_capital,
             'period_return_pct': period_return_pct,
             'max_drawdown_pct': max_drawdown_pct,
-            'exit_reasons_breakdown': self._dict_to_json(exit_reasons),
-            'insights': None  # Will be populated separately
+            'exit_reasons_breakdown': self._dict_to_json(bucket.exit_reasons_data),
+            'insights': insights
         }
 
     def analyze_winning_trades(self, session: PaperTradingSession) -> Dict:
@@ -218,38 +307,34 @@ class PaperTradeAnalysisService:
         Returns:
             Analysis of winning patterns
         """
-        winners = self.db.query(PaperTrade).filter(
-            PaperTrade.session_id == session.id,
-            PaperTrade.is_winner == True
-        ).all()
+        totals = self._session_bucket(session.id)
 
-        if not winners:
+        if totals is None or not totals.winning_trades:
             return {'total_winners': 0, 'message': 'No winning trades yet'}
 
-        # Group by signal type
-        by_signal = defaultdict(list)
-        for trade in winners:
-            by_signal[trade.recommendation_type].append(trade)
-
-        # Find best signal type
+        # Per signal type statistics
         signal_stats = {}
-        for signal_type, trades in by_signal.items():
-            signal_stats[signal_type] = {
-                'count': len(trades),
-                'avg_pnl': np.mean([t.pnl for t in trades]),
-                'avg_pnl_pct': np.mean([t.pnl_pct for t in trades]),
-                'avg_r_multiple': np.mean([t.r_multiple for t in trades]),
-                'avg_confidence': np.mean([t.entry_confidence for t in trades]),
-                'avg_hold_days': np.mean([t.days_held for t in trades])
+        for bucket in self._recommendation_buckets(session.id):
+            wins = bucket.winning_trades
+            if not wins:
+                continue
+            signal_stats[bucket.scope_key] = {
+                'count': wins,
+                'avg_pnl': bucket.gross_profit / wins,
+                'avg_pnl_pct': bucket.win_sum_pnl_pct / wins,
+                'avg_r_multiple': bucket.win_sum_r_multiple / wins,
+                'avg_confidence': bucket.win_sum_confidence / wins,
+                'avg_hold_days': bucket.win_sum_days_held / wins
             }
 
         best_signal_type = max(signal_stats.keys(), key=lambda k: signal_stats[k]['count'])
 
         # Overall statistics
-        avg_win_pct = np.mean([t.pnl_pct for t in winners])
-        avg_r_multiple = np.mean([t.r_multiple for t in winners])
-        avg_confidence = np.mean([t.entry_confidence for t in winners])
-        avg_hold_days = np.mean([t.days_held for t in winners])
+        total_winners = totals.winning_trades
+        avg_win_pct = totals.win_sum_pnl_pct / total_winners
+        avg_r_multiple = totals.win_sum_r_multiple / total_winners
+        avg_confidence = totals.win_sum_confidence / total_winners
+        avg_hold_days = totals.win_sum_days_held / total_winners
 
         # Common patterns
         patterns = []
@@ -261,7 +346,7 @@ class PaperTradeAnalysisService:
             patterns.append(f"Strong R:R performance: {avg_r_multiple:.2f}R average")
 
         return {
-            'total_winners': len(winners),
+            'total_winners': total_winners,
             'avg_win_pct': avg_win_pct,
             'avg_r_multiple': avg_r_multiple,
             'avg_confidence': avg_confidence,
@@ -281,59 +366,52 @@ class PaperTradeAnalysisService:
         Returns:
             Analysis of losing patterns
         """
-        losers = self.db.query(PaperTrade).filter(
-            PaperTrade.session_id == session.id,
-            PaperTrade.is_winner == False
-        ).all()
+        totals = self._session_bucket(session.id)
 
-        if not losers:
+        if totals is None or not totals.losing_trades:
             return {'total_losers': 0, 'message': 'No losing trades yet'}
 
-        # Exit reasons breakdown
-        exit_reasons = defaultdict(int)
-        for trade in losers:
-            exit_reasons[trade.exit_reason] += 1
+        total_losers = totals.losing_trades
 
         # Premature stop-outs (trades that reversed after hitting stop)
-        premature_stops = sum(1 for t in losers if t.exit_reason == 'STOP_LOSS' and t.max_unrealized_gain > 0)
-
-        # Group by signal type
-        by_signal = defaultdict(list)
-        for trade in losers:
-            by_signal[trade.recommendation_type].append(trade)
+        premature_stops = totals.loser_premature_stops
 
+        # Per signal type statistics
         signal_stats = {}
-        for signal_type, trades in by_signal.items():
-            signal_stats[signal_type] = {
-                'count': len(trades),
-                'avg_loss': np.mean([abs(t.pnl) for t in trades]),
-                'avg_loss_pct': np.mean([abs(t.pnl_pct) for t in trades]),
-                'avg_confidence': np.mean([t.entry_confidence for t in trades])
+        for bucket in self._recommendation_buckets(session.id):
+            losses = bucket.losing_trades
+            if not losses:
+                continue
+            signal_stats[bucket.scope_key] = {
+                'count': losses,
+                'avg_loss': bucket.gross_loss / losses,
+                'avg_loss_pct': bucket.loss_sum_pnl_pct / losses,
+                'avg_confidence': bucket.loss_sum_confidence / losses
             }
 
         # Find worst performing signal type
         worst_signal_type = max(signal_stats.keys(), key=lambda k: signal_stats[k]['count']) if signal_stats else None
 
         # Overall statistics
-        avg_loss_pct = np.mean([abs(t.pnl_pct) for t in losers])
-        avg_confidence = np.mean([t.entry_confidence for t in losers])
+        avg_loss_pct = totals.loss_sum_pnl_pct / total_losers
+        avg_confidence = totals.loss_sum_confidence / total_losers
 
         # Common patterns
         patterns = []
-        if premature_stops > len(losers) * 0.3:
-            patterns.append(f"{premature_stops}/{len(losers)} losses were premature stop-outs")
+        if premature_stops > total_losers * 0.3:
+            patterns.append(f"{premature_stops}/{total_losers} losses were premature stop-outs")
 
-        if worst_signal_type and signal_stats[worst_signal_type]['count'] > len(losers) * 0.4:
+        if worst_signal_type and signal_stats[worst_signal_type]['count'] > total_losers * 0.4:
             patterns.append(f"{worst_signal_type} signals have high loss rate ({signal_stats[worst_signal_type]['count']} losses)")
 
         if avg_confidence < 65:
             patterns.append(f"Low avg confidence on losers: {avg_confidence:.1f}%")
 
         return {
-            'total_losers': len(losers),
+            'total_losers': total_losers,
             'avg_loss_pct': avg_loss_pct,
             'avg_confidence': avg_confidence,
-            'exit_reasons': dict(exit_reasons),
+            'exit_reasons': totals.loser_exit_reasons_data,
             'premature_stops': premature_stops,
             'worst_signal_type': worst_signal_type,
             'signal_stats': signal_stats,
@@ -352,73 +430,62 @@ class PaperTradeAnalysisService:
         Returns:
             List of recommendations with priority and expected impact
         """
-        all_trades = self.db.query(PaperTrade).filter(
-            PaperTrade.session_id == session.id
-        ).all()
+        totals = self._session_bucket(session.id)
+        total_trades = totals.trades_count if totals else 0
 
-        if len(all_trades) < 10:
+        if total_trades < 10:
             return [{
                 'category': 'INSUFFICIENT_DATA',
                 'priority': 'INFO',
                 'recommendation': 'Need more trades for recommendations',
-                'rationale': f'Only {len(all_trades)} trades completed (need 10+ for statistical validity)',
+                'rationale': f'Only {total_trades} trades completed (need 10+ for statistical validity)',
                 'expected_impact': 'N/A'
             }]
 
         recommendations = []
-
-        # Analyze signal type performance
-        signal_performance = defaultdict(lambda: {'wins': 0, 'losses': 0, 'total_pnl': 0})
-
-        for trade in all_trades:
-            signal_type = trade.recommendation_type
-            if trade.is_winner:
-                signal_performance[signal_type]['wins'] += 1
-            else:
-                signal_performance[signal_type]['losses'] += 1
-            signal_performance[signal_type]['total_pnl'] += trade.pnl
+        by_signal = {bucket.scope_key: bucket for bucket in self._recommendation_buckets(session.id)}
 
         # Recommendation 1: Filter weak signal types
-        for signal_type, perf in signal_performance.items():
-            total = perf['wins'] + perf['losses']
-            win_rate = (perf['wins'] / total * 100) if total > 0 else 0
+        for signal_type, perf in by_signal.items():
+            total = perf.trades_count
+            win_rate = (perf.winning_trades / total * 100) if total > 0 else 0
 
             if win_rate < 50 and signal_type == 'WEAK BUY' and total >= 5:
                 recommendations.append({
                     'category': 'SIGNAL_FILTERING',
                     'priority': 'HIGH',
                     'recommendation': f'Avoid {signal_type} signals with confidence <70%',
-                    'rationale': f'Only {win_rate:.0f}% win rate for {signal_type} signals ({perf["wins"]}/{total})',
-                    'expected_impact': f'Reduce losing trades by {(total - perf["wins"]) / len(all_trades) * 100:.0f}%',
+                    'rationale': f'Only {win_rate:.0f}% win rate for {signal_type} signals ({perf.winning_trades}/{total})',
+                    'expected_impact': f'Reduce losing trades by {(total - perf.winning_trades) / total_trades * 100:.0f}%',
                     'data_support': {
                         'sample_size': total,
                         'win_rate': win_rate,
-                        'losses': perf['losses']
+                        'losses': perf.losing_trades
                     }
                 })
 
         # Recommendation 2: Premature stop-outs
-        stop_loss_exits = [t for t in all_trades if t.exit_reason == 'STOP_LOSS']
-        if len(stop_loss_exits) > len(all_trades) * 0.3:  # >30% stopped out
-            premature = sum(1 for t in stop_loss_exits if t.max_unrealized_gain > 0)
-            if premature > len(stop_loss_exits) * 0.3:
+        stop_loss_exits = totals.stop_loss_exits
+        if stop_loss_exits > total_trades * 0.3:  # >30% stopped out
+            premature = totals.premature_stops
+            if premature > stop_loss_exits * 0.3:
                 recommendations.append({
                     'category': 'RISK_MANAGEMENT',
                     'priority': 'HIGH',
                     'recommendation': 'Widen stop losses for high-confidence entries (>75%)',
-                    'rationale': f'{premature}/{len(stop_loss_exits)} stop-outs reversed (premature exits)',
+                    'rationale': f'{premature}/{stop_loss_exits} stop-outs reversed (premature exits)',
                     'expected_impact': 'Reduce false stop-outs by 30%',
                     'data_support': {
-                        'total_stops': len(stop_loss_exits),
+                        'total_stops': stop_loss_exits,
                         'premature_stops': premature,
-                        'premature_pct': (premature / len(stop_loss_exits) * 100) if stop_loss_exits else 0
+                        'premature_pct': (premature / stop_loss_exits * 100) if stop_loss_exits else 0
                     }
                 })
 
         # Recommendation 3: Optimize position sizing
-        strong_buy_trades = [t for t in all_trades if t.recommendation_type == 'STRONG BUY']
-        if strong_buy_trades:
-            strong_buy_win_rate = sum(1 for t in strong_buy_trades if t.is_winner) / len(strong_buy_trades)
+        strong_buy = by_signal.get('STRONG BUY')
+        if strong_buy and strong_buy.trades_count:
+            strong_buy_win_rate = strong_buy.winning_trades / strong_buy.trades_count
             if strong_buy_win_rate > 0.75:
                 recommendations.append({
                     'category': 'POSITION_SIZING',
@@ -427,18 +494,17 @@ class PaperTradeAnalysisService:
                     'rationale': f'{strong_buy_win_rate * 100:.0f}% win rate on STRONG BUY - underutilized opportunity',
                     'expected_impact': 'Increase overall profit by 15-20%',
                     'data_support': {
-                        'sample_size': len(strong_buy_trades),
+                        'sample_size': strong_buy.trades_count,
                         'win_rate': strong_buy_win_rate * 100
                     }
                 })
 
         # Recommendation 4: Hold time optimization
-        winners = [t for t in all_trades if t.is_winner]
-        losers = [t for t in all_trades if not t.is_winner]
+        has_winners_and_losers = totals.winning_trades > 0 and totals.losing_trades > 0
 
-        if winners and losers:
-            avg_winner_hold = np.mean([t.days_held for t in winners])
-            avg_loser_hold = np.mean([t.days_held for t in losers])
+        if has_winners_and_losers:
+            avg_winner_hold = totals.win_sum_days_held / totals.winning_trades
+            avg_loser_hold = totals.loss_sum_days_held / totals.losing_trades
 
             if avg_winner_hold > avg_loser_hold * 1.5:
                 recommendations.append({
@@ -454,9 +520,9 @@ class PaperTradeAnalysisService:
                 })
 
         # Recommendation 5: Confidence threshold
-        if winners and losers:
-            avg_winner_conf = np.mean([t.entry_confidence for t in winners])
-            avg_loser_conf = np.mean([t.entry_confidence for t in losers])
+        if has_winners_and_losers:
+            avg_winner_conf = totals.win_sum_confidence / totals.winning_trades
+            avg_loser_conf = totals.loss_sum_confidence / totals.losing_trades
 
             if avg_winner_conf > avg_loser_conf + 5:  # 5% difference
                 recommendations.append({
@@ -479,6 +545,110 @@ class PaperTradeAnalysisService:
 
         return recommendations
 
+    @staticmethod
+    def _bucket_keys(trade: PaperTrade) -> List[Tuple[str, str]]:
+        """Aggregate buckets a trade contributes to"""
+        exit_date = trade.exit_date or datetime.utcnow()
+        return [
+            (SCOPE_SESSION, ''),
+            (SCOPE_RECOMMENDATION, trade.recommendation_type or ''),
+            (SCOPE_DAILY, exit_date.date().isoformat()),
+        ]
+
+    def _new_bucket(self, session_id: int, scope: str, scope_key: str) -> PaperTradeAggregate:
+        """Create and add an empty aggregate bucket"""
+        bucket = PaperTradeAggregate(session_id=session_id, scope=scope, scope_key=scope_key)
+        for field in AGGREGATE_SUM_FIELDS:
+            setattr(bucket, field, 0)
+        self.db.add(bucket)
+        return bucket
+
+    def _load_buckets(self, session_id: int, keys: List[Tuple[str, str]]) -> Dict:
+        """Load specific buckets of a session in one query"""
+        rows = self.db.query(PaperTradeAggregate).filter(
+            PaperTradeAggregate.session_id == session_id,
+            or_(*[
+                and_(PaperTradeAggregate.scope == scope, PaperTradeAggregate.scope_key == scope_key)
+                for scope, scope_key in keys
+            ])
+        ).all()
+        return {(row.scope, row.scope_key): row for row in rows}
+
+    def _session_bucket(self, session_id: int) -> Optional[PaperTradeAggregate]:
+        """
+        Get session-wide aggregates, backfilling from trade history if missing
+
+        Returns:
+            Session bucket, or None if the session has no trades
+        """
+        bucket = self.db.query(PaperTradeAggregate).filter(
+            PaperTradeAggregate.session_id == session_id,
+            PaperTradeAggregate.scope == SCOPE_SESSION
+        ).first()
+
+        if bucket is None:
+            has_trades = self.db.query(PaperTrade.id).filter(
+                PaperTrade.session_id == session_id
+            ).first() is not None
+            if not has_trades:
+                return None
+            bucket = self.rebuild_aggregates(session_id)[(SCOPE_SESSION, '')]
+            self.db.commit()
+
+        return bucket
+
+    def _recommendation_buckets(self, session_id: int) -> List[PaperTradeAggregate]:
+        """Per recommendation type buckets, in order of first trade"""
+        return self.db.query(PaperTradeAggregate).filter(
+            PaperTradeAggregate.session_id == session_id,
+            PaperTradeAggregate.scope == SCOPE_RECOMMENDATION
+        ).order_by(PaperTradeAggregate.id).all()
+
+    def _daily_buckets(
+        self,
+        session: PaperTradingSession,
+        period_start: datetime,
+        period_end: datetime
+    ) -> List[PaperTradeAggregate]:
+        """Daily buckets for exit dates in [period_start, period_end)"""
+        self._session_bucket(session.id)
+
+        keys = []
+        day = period_start.date()
+        while day < period_end.date():
+            keys.append(day.isoformat())
+            day += timedelta(days=1)
+
+        return self.db.query(PaperTradeAggregate).filter(
+            PaperTradeAggregate.session_id == session.id,
+            PaperTradeAggregate.scope == SCOPE_DAILY,
+            PaperTradeAggregate.scope_key.in_(keys)
+        ).all()
+
+    @staticmethod
+    def _merge_buckets(buckets: List[PaperTradeAggregate]) -> PaperTradeAggregate:
+        """Combine buckets into one transient (unsaved) aggregate"""
+        merged = PaperTradeAggregate()
+        for field in AGGREGATE_SUM_FIELDS:
+            setattr(merged, field, sum(getattr(b, field) or 0 for b in buckets))
+
+        best = [b.best_trade_pnl for b in buckets if b.best_trade_pnl is not None]
+        worst = [b.worst_trade_pnl for b in buckets if b.worst_trade_pnl is not None]
+        merged.best_trade_pnl = max(best) if best else None
+        merged.worst_trade_pnl = min(worst) if worst else None
+
+        exit_reasons = defaultdict(int)
+        loser_exit_reasons = defaultdict(int)
+        for bucket in buckets:
+            for reason, count in bucket.exit_reasons_data.items():
+                exit_reasons[reason] += count
+            for reason, count in bucket.loser_exit_reasons_data.items():
+                loser_exit_reasons[reason] += count
+        merged.exit_reasons_data = dict(exit_reasons)
+        merged.loser_exit_reasons_data = dict(loser_exit_reasons)
+
+        return merged
+
     async def generate_daily_summary(self, session: PaperTradingSession) -> Dict:
         """
         Generate complete daily summary
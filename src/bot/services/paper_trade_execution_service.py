@@ -17,6 +17,8 @@ from src.bot.database.models import (
     PaperTradingLog, DailyBuySignal
 )
 from src.bot.services.paper_portfolio_service import PaperPortfolioService
+from src.bot.services.paper_trade_analysis_service import PaperTradeAnalysisService
+from src.bot.services.position_exit_monitor import get_position_exit_monitor
 from src.bot.utils.paper_trading_logger import get_paper_trading_logger
 from src.bot.config import PAPER_TRADING_DRY_RUN
 
@@ -46,6 +48,7 @@ class PaperTradeExecutionService:
         """
         self.db = db_session
         self.portfolio_service = PaperPortfolioService(db_session)
+        self.analysis_service = PaperTradeAnalysisService(db_session)
 
     def validate_entry(
         self,
@@ -111,9 +114,10 @@ class PaperTradeExecutionService:
         Steps:
         1. Validate entry
         2. Calculate position size (1% risk rule)
-        3. Create PaperPosition record
-        4. Update session stats
-        5. Create log entry
+        3. Apply sector / correlation exposure limits
+        4. Create PaperPosition record
+        5. Update session stats
+        6. Create log entry
 
         Args:
             session: Paper trading session
@@ -146,6 +150,17 @@ class PaperTradeExecutionService:
             logger.error("Position sizing failed for %s: %s", signal.symbol, sizing['error'])
             return None
 
+        # Sector / correlation concentration limits (may downsize the entry)
+        sizing, exposure_error = self.portfolio_service.check_exposure(session, signal.symbol, sizing)
+
+        if exposure_error:
+            logger.warning("Exposure check failed for %s: %s", signal.symbol, exposure_error)
+            self._create_log(
+                session, 'WARNING', 'ENTRY', signal.symbol,
+                f"Entry rejected: {exposure_error}"
+            )
+            return None
+
         # Improvement #2: DRY-RUN MODE CHECK
         if PAPER_TRADING_DRY_RUN:
             logger.info(
@@ -159,7 +174,70 @@ class PaperTradeExecutionService:
             )
             return None  # Don't create position in dry-run mode
 
-        # Create position
+        # Create position and update session
+        position = self.stage_entry(session, signal, current_price, sizing)
+
+        # Save to database
+        self.db.commit()
+        self.db.refresh(position)
+        get_position_exit_monitor().add([position])
+
+        # Create log
+        self._create_log(
+            session, 'TRADE', 'ENTRY', signal.symbol,
+            f"Position opened: {sizing['shares']} shares @ ₹{current_price:.2f}",
+            details={
+                'position_id': position.id,
+                'entry_price': current_price,
+                'shares': sizing['shares'],
+                'position_value': sizing['position_value'],
+                'target': signal.target,
+                'stop_loss': signal.stop_loss,
+                'risk_reward': signal.risk_reward,
+                'confidence': signal.confidence,
+                'recommendation': signal.recommendation_type
+            },
+            position_id=position.id
+        )
+
+        logger.info(
+            "✅ Position opened: %s - %d shares @ ₹%.2f = ₹%.2f (Target: ₹%.2f, Stop: ₹%.2f, R:R: %.2f)",
+            signal.symbol, sizing['shares'], current_price, sizing['position_value'],
+            signal.target, signal.stop_loss, signal.risk_reward
+        )
+
+        # Improvement #1: Log to dedicated paper trading log
+        pt_logger.info(
+            f"ENTRY | Session {session.id} | User {session.user_id} | "
+            f"{signal.symbol} | {sizing['shares']:.2f} shares @ ₹{current_price:.2f} | "
+            f"Value: ₹{sizing['position_value']:.2f} | Target: ₹{signal.target:.2f} | "
+            f"Stop: ₹{signal.stop_loss:.2f} | R:R: {signal.risk_reward:.2f} | Conf: {signal.confidence:.1f}%"
+        )
+
+        return position
+
+    def stage_entry(
+        self,
+        session: PaperTradingSession,
+        signal: DailyBuySignal,
+        current_price: float,
+        sizing: Dict
+    ) -> PaperPosition:
+        """
+        Build a new position and apply it to the session without committing
+
+        Used by enter_position and by batch executors that commit many
+        entries in a single transaction.
+
+        Args:
+            session: Paper trading session
+            signal: Buy signal (may be transient / not persisted)
+            current_price: Entry price
+            sizing: Result of PaperPortfolioService.calculate_position_size
+
+        Returns:
+            Pending (added, uncommitted) PaperPosition
+        """
         position = PaperPosition(
             session_id=session.id,
             symbol=signal.symbol,
@@ -199,42 +277,7 @@ class PaperTradeExecutionService:
         session.current_capital -= sizing['position_value']  # Reduce capital by position value
         session.updated_at = datetime.utcnow()
 
-        # Save to database
         self.db.add(position)
-        self.db.commit()
-        self.db.refresh(position)
-
-        # Create log
-        self._create_log(
-            session, 'TRADE', 'ENTRY', signal.symbol,
-            f"Position opened: {sizing['shares']} shares @ ₹{current_price:.2f}",
-            details={
-                'position_id': position.id,
-                'entry_price': current_price,
-                'shares': sizing['shares'],
-                'position_value': sizing['position_value'],
-                'target': signal.target,
-                'stop_loss': signal.stop_loss,
-                'risk_reward': signal.risk_reward,
-                'confidence': signal.confidence,
-                'recommendation': signal.recommendation_type
-            },
-            position_id=position.id
-        )
-
-        logger.info(
-            "✅ Position opened: %s - %d shares @ ₹%.2f = ₹%.2f (Target: ₹%.2f, Stop: ₹%.2f, R:R: %.2f)",
-            signal.symbol, sizing['shares'], current_price, sizing['position_value'],
-            signal.target, signal.stop_loss, signal.risk_reward
-        )
-
-        # Improvement #1: Log to dedicated paper trading log
-        pt_logger.info(
-            f"ENTRY | Session {session.id} | User {session.user_id} | "
-            f"{signal.symbol} | {sizing['shares']:.2f} shares @ ₹{current_price:.2f} | "
-            f"Value: ₹{sizing['position_value']:.2f} | Target: ₹{signal.target:.2f} | "
-            f"Stop: ₹{signal.stop_loss:.2f} | R:R: {signal.risk_reward:.2f} | Conf: {signal.confidence:.1f}%"
-        )
 
         return position
 
@@ -250,7 +293,7 @@ class PaperTradeExecutionService:
         Steps:
         1. Calculate realized P&L and R-multiple
         2. Create PaperTrade record (historical)
-        3. Update session stats
+        3. Update session stats and running performance aggregates
         4. Close position (is_open = False)
         5. Create log entry
 
@@ -365,10 +408,12 @@ class PaperTradeExecutionService:
         position.unrealized_pnl = 0.0  # Now realized
         position.unrealized_pnl_pct = 0.0
 
-        # Save to database
+        # Save to database (running aggregates are updated in the same transaction)
         self.db.add(trade)
+        self.analysis_service.record_trade(trade)
         self.db.commit()
         self.db.refresh(trade)
+        get_position_exit_monitor().remove([position.id])
 
         # Create log
         self._create_log(
@@ -482,6 +527,32 @@ class PaperTradeExecutionService:
             position_id: Position ID (optional)
             trade_id: Trade ID (optional)
         """
+        self.stage_log(
+            session, log_level, category, symbol, message,
+            details=details, position_id=position_id, trade_id=trade_id
+        )
+        self.db.commit()
+
+    def stage_log(
+        self,
+        session: PaperTradingSession,
+        log_level: str,
+        category: str,
+        symbol: str,
+        message: str,
+        details: Optional[Dict] = None,
+        position_id: Optional[int] = None,
+        trade_id: Optional[int] = None
+    ) -> PaperTradingLog:
+        """
+        Add log entry to the current transaction without committing
+
+        Args:
+            Same as _create_log
+
+        Returns:
+            Pending PaperTradingLog
+        """
         log = PaperTradingLog(
             session_id=session.id,
             timestamp=datetime.utcnow(),
@@ -495,7 +566,8 @@ class PaperTradeExecutionService:
         )
 
         self.db.add(log)
-        self.db.commit()
+
+        return log
 
 
 def get_paper_trade_execution_service(db_session: Session) -> PaperTradeExecutionService:
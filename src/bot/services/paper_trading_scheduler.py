@@ -7,7 +7,6 @@ Author: Harsh Kandhway
 
 import asyncio
 import logging
-import json
 from datetime import datetime, time, timedelta
 from typing import Optional
 
@@ -17,6 +16,8 @@ from src.bot.services.market_hours_service import get_market_hours_service
 from src.bot.services.paper_trading_service import get_paper_trading_service
 from src.bot.services.paper_trade_analysis_service import get_paper_trade_analysis_service
 from src.bot.database.db import get_db_context
+from src.bot.config import PAPER_TRADING_MONITOR_INTERVAL
+from src.core.timing import mark_failed, timed
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ class PaperTradingScheduler:
     POSITION_REBALANCE_TIME = time(11, 0) # 11:00 AM - Mid-market
 
     # Monitoring interval
-    MONITOR_INTERVAL_SECONDS = 300  # 5 minutes
+    MONITOR_INTERVAL_SECONDS = PAPER_TRADING_MONITOR_INTERVAL  # default 5 minutes
 
     def __init__(self, application: Application):
         """
@@ -110,29 +111,8 @@ class PaperTradingScheduler:
             try:
                 now = datetime.now(self.market_hours.TIMEZONE)
 
-                # Check if today is a trading day
-                if not self.market_hours.is_market_day(now.date()):
-                    # Wait until next market day
-                    next_open = self.market_hours.get_next_market_open(now)
-                    sleep_seconds = (next_open - now).total_seconds()
-                    logger.debug("Waiting for next trading day: %d seconds", sleep_seconds)
-                    await asyncio.sleep(min(sleep_seconds, 3600))  # Max 1 hour sleep
-                    continue
-
-                # Calculate next execution time (9:20 AM today or tomorrow)
-                target_time = now.replace(
-                    hour=self.BUY_EXECUTION_TIME.hour,
-                    minute=self.BUY_EXECUTION_TIME.minute,
-                    second=0,
-                    microsecond=0
-                )
-
-                # If already past 9:20 AM today, schedule for next trading day
-                if now >= target_time:
-                    target_time += timedelta(days=1)
-                    # Find next trading day
-                    while not self.market_hours.is_market_day(target_time.date()):
-                        target_time += timedelta(days=1)
+                # Next 9:20 AM on a trading day (today if still ahead)
+                target_time = self.market_hours.get_next_session_time(self.BUY_EXECUTION_TIME, now)
 
                 # Wait until target time
                 sleep_seconds = (target_time - now).total_seconds()
@@ -198,27 +178,8 @@ class PaperTradingScheduler:
             try:
                 now = datetime.now(self.market_hours.TIMEZONE)
 
-                # Check if today is a trading day
-                if not self.market_hours.is_market_day(now.date()):
-                    # Wait until next market day
-                    next_open = self.market_hours.get_next_market_open(now)
-                    sleep_seconds = (next_open - now).total_seconds()
-                    await asyncio.sleep(min(sleep_seconds, 3600))
-                    continue
-
-                # Calculate next summary time (4:00 PM today or next trading day)
-                target_time = now.replace(
-                    hour=self.DAILY_SUMMARY_TIME.hour,
-                    minute=self.DAILY_SUMMARY_TIME.minute,
-                    second=0,
-                    microsecond=0
-                )
-
-                # If already past 4:00 PM today, schedule for next trading day
-                if now >= target_time:
-                    target_time += timedelta(days=1)
-                    while not self.market_hours.is_market_day(target_time.date()):
-                        target_time += timedelta(days=1)
+                # Next 4:00 PM on a trading day (today if still ahead)
+                target_time = self.market_hours.get_next_session_time(self.DAILY_SUMMARY_TIME, now)
 
                 # Wait until target time
                 sleep_seconds = (target_time - now).total_seconds()
@@ -292,25 +253,8 @@ class PaperTradingScheduler:
             try:
                 now = datetime.now(self.market_hours.TIMEZONE)
 
-                # Check if today is a trading day
-                if not self.market_hours.is_market_day(now.date()):
-                    next_open = self.market_hours.get_next_market_open(now)
-                    sleep_seconds = (next_open - now).total_seconds()
-                    await asyncio.sleep(min(sleep_seconds, 3600))
-                    continue
-
-                # Calculate next rebalancing time
-                target_time = now.replace(
-                    hour=self.POSITION_REBALANCE_TIME.hour,
-                    minute=self.POSITION_REBALANCE_TIME.minute,
-                    second=0,
-                    microsecond=0
-                )
-
-                if now >= target_time:
-                    target_time += timedelta(days=1)
-                    while not self.market_hours.is_market_day(target_time.date()):
-                        target_time += timedelta(days=1)
+                # Next rebalancing time on a trading day
+                target_time = self.market_hours.get_next_session_time(self.POSITION_REBALANCE_TIME, now)
 
                 sleep_seconds = (target_time - now).total_seconds()
                 await asyncio.sleep(sleep_seconds)
@@ -325,135 +269,44 @@ class PaperTradingScheduler:
                 logger.error("Error in position rebalancing: %s", str(e), exc_info=True)
                 await asyncio.sleep(3600)
 
+    @timed('paper_trading.execute_pending_trades')
     async def _execute_pending_trades(self):
-        """Execute pending paper trades that were queued when market was closed"""
-        from ..database.models import PendingPaperTrade, DailyBuySignal, PaperPosition
-        from ..services.paper_trade_execution_service import get_paper_trade_execution_service
-        from ..services.analysis_service import get_current_price
-        from datetime import datetime
-        import asyncio
-        
+        """
+        Execute pending paper trades that were queued when market was closed
+
+        Delegates to PendingTradeBatchExecutor, which loads all pending trades
+        and open positions up front, fetches each symbol's price once and
+        commits one transaction per session.
+        """
+        from ..services.pending_trade_executor import get_pending_trade_batch_executor
+
         logger.info("📋 Executing pending paper trades...")
-        
+
         try:
             with get_db_context() as db:
-                # Get all pending trades
-                pending_trades = db.query(PendingPaperTrade).filter(
-                    PendingPaperTrade.status == 'PENDING'
-                ).all()
-                
-                if not pending_trades:
+                executor = get_pending_trade_batch_executor(db)
+                result = await executor.execute_all()
+
+                if not result['pending']:
                     logger.info("No pending trades to execute")
                     return
-                
-                logger.info(f"Found {len(pending_trades)} pending trades")
-                
-                executed = 0
-                failed = 0
-                
-                for pending in pending_trades:
+
+                executed = result['executed']
+                failed = result['failed']
+
+                logger.info(
+                    f"Pending trades execution complete: {executed} executed, {failed} failed, "
+                    f"{result['cancelled']} cancelled (of {result['pending']})"
+                )
+
+                # Send individual trade execution notifications
+                for user_id, symbol, position in result['opened']:
                     try:
-                        # Check if session is still active
-                        session = pending.session
-                        if not session or not session.is_active:
-                            pending.status = 'CANCELLED'
-                            pending.error_message = "Session no longer active"
-                            db.commit()
-                            continue
-                        
-                        # Check if already have position
-                        existing = db.query(PaperPosition).filter(
-                            PaperPosition.session_id == session.id,
-                            PaperPosition.symbol == pending.symbol,
-                            PaperPosition.is_open == True
-                        ).first()
-                        
-                        if existing:
-                            pending.status = 'CANCELLED'
-                            pending.error_message = "Already have position"
-                            db.commit()
-                            continue
-                        
-                        # Get signal data
-                        signal_data = pending.signal_data_dict
-                        
-                        # Create DailyBuySignal from stored data
-                        signal = DailyBuySignal(
-                            symbol=pending.symbol,
-                            analysis_date=datetime.utcnow(),
-                            recommendation=signal_data.get('recommendation', ''),
-                            recommendation_type=signal_data.get('recommendation_type', 'BUY'),
-                            current_price=signal_data.get('current_price', 0.0),
-                            target=signal_data.get('target'),
-                            stop_loss=signal_data.get('stop_loss'),
-                            risk_reward=signal_data.get('risk_reward', 0.0),
-                            confidence=signal_data.get('confidence', 0.0),
-                            overall_score_pct=signal_data.get('overall_score_pct', 50.0),
-                            analysis_data=json.dumps(signal_data.get('analysis', {}), default=str)
+                        await self._send_trade_execution_notification(
+                            user_id, symbol, position, "individual"
                         )
-                        db.add(signal)
-                        db.flush()
-                        
-                        # Get current price
-                        loop = asyncio.get_event_loop()
-                        current_price = await loop.run_in_executor(None, get_current_price, pending.symbol)
-                        
-                        if current_price is None:
-                            current_price = signal.current_price
-                        
-                        # Execute trade
-                        execution_service = get_paper_trade_execution_service(db)
-                        
-                        # Validate
-                        is_valid, error_msg = execution_service.validate_entry(session, signal, current_price)
-                        
-                        if not is_valid:
-                            pending.status = 'FAILED'
-                            pending.error_message = error_msg
-                            pending.execution_attempts += 1
-                            pending.last_attempt_at = datetime.utcnow()
-                            db.commit()
-                            failed += 1
-                            logger.warning(f"Pending trade validation failed for {pending.symbol}: {error_msg}")
-                            continue
-                        
-                        # Enter position
-                        position = await execution_service.enter_position(session, signal, current_price)
-                        
-                        if position:
-                            pending.status = 'EXECUTED'
-                            pending.position_id = position.id
-                            pending.executed_at = datetime.utcnow()
-                            executed += 1
-                            logger.info(f"Executed pending trade for {pending.symbol}")
-
-                            # Send individual trade execution notification
-                            try:
-                                await self._send_trade_execution_notification(
-                                    session.user_id, pending.symbol, position, "individual"
-                                )
-                            except Exception as notify_error:
-                                logger.error(f"Failed to send individual trade notification: {notify_error}")
-
-                        else:
-                            pending.status = 'FAILED'
-                            pending.error_message = "Position entry returned None"
-                            pending.execution_attempts += 1
-                            pending.last_attempt_at = datetime.utcnow()
-                            failed += 1
-                        
-                        db.commit()
-                        
-                    except Exception as e:
-                        logger.error(f"Error executing pending trade {pending.id}: {e}", exc_info=True)
-                        pending.status = 'FAILED'
-                        pending.error_message = str(e)[:200]
-                        pending.execution_attempts += 1
-                        pending.last_attempt_at = datetime.utcnow()
-                        failed += 1
-                        db.commit()
-                
-                logger.info(f"Pending trades execution complete: {executed} executed, {failed} failed")
+                    except Exception as notify_error:
+                        logger.error(f"Failed to send individual trade notification: {notify_error}")
 
                 # Send summary notification if any trades were executed
                 if executed > 0:
@@ -464,6 +317,7 @@ class PaperTradingScheduler:
 
         except Exception as e:
             logger.error(f"Error executing pending trades: {e}", exc_info=True)
+            mark_failed()
 
     async def _send_buy_signals_summary_notification(self, result: dict):
         """Send personalized summary notification for buy signals execution"""
@@ -569,6 +423,7 @@ class PaperTradingScheduler:
         except Exception as e:
             logger.error(f"Failed to send summary notifications: {e}")
 
+    @timed('paper_trading.execute_buy_signals')
     async def _execute_buy_signals(self):
         """Execute BUY signals for all active sessions"""
         logger.info("🎯 Executing BUY signals...")
@@ -599,7 +454,9 @@ class PaperTradingScheduler:
 
         except Exception as e:
             logger.error("Failed to execute BUY signals: %s", str(e), exc_info=True)
+            mark_failed()
 
+    @timed('paper_trading.monitor_positions')
     async def _monitor_positions(self):
         """Monitor all open positions"""
         try:
@@ -619,7 +476,9 @@ class PaperTradingScheduler:
 
         except Exception as e:
             logger.error("Failed to monitor positions: %s", str(e), exc_info=True)
+            mark_failed()
 
+    @timed('paper_trading.daily_summary')
     async def _generate_daily_summary(self):
         """Generate and send daily summary"""
         logger.info("📊 Generating daily summary...")
@@ -649,7 +508,9 @@ class PaperTradingScheduler:
 
         except Exception as e:
             logger.error("Failed to generate daily summary: %s", str(e), exc_info=True)
+            mark_failed()
 
+    @timed('paper_trading.weekly_summary')
     async def _generate_weekly_summary(self):
         """Generate and send weekly summary"""
         logger.info("📈 Generating weekly summary...")
@@ -678,7 +539,9 @@ class PaperTradingScheduler:
 
         except Exception as e:
             logger.error("Failed to generate weekly summary: %s", str(e), exc_info=True)
+            mark_failed()
 
+    @timed('paper_trading.rebalance_positions')
     async def _rebalance_positions(self):
         """Validate and rebalance positions"""
         logger.debug("⚖️ Performing position rebalancing check...")
@@ -710,6 +573,7 @@ class PaperTradingScheduler:
 
         except Exception as e:
             logger.error("Failed to rebalance positions: %s", str(e), exc_info=True)
+            mark_failed()
 
 
 # Module-level instance (will be set by scheduler_service)
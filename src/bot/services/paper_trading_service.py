@@ -9,9 +9,10 @@ import logging
 import asyncio
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+from collections import defaultdict
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, update, bindparam, func
 
 from src.bot.database.models import (
     PaperTradingSession, PaperPosition, PaperTrade,
@@ -19,7 +20,10 @@ from src.bot.database.models import (
 )
 from src.bot.services.paper_portfolio_service import PaperPortfolioService
 from src.bot.services.paper_trade_execution_service import PaperTradeExecutionService
-from src.bot.services.analysis_service import get_current_price
+from src.bot.services.analysis_service import get_current_price, get_multiple_prices
+from src.bot.services.intraday_service import get_intraday_service
+from src.bot.services.position_exit_monitor import get_position_exit_monitor
+from src.bot.config import PAPER_TRADING_PNL_MARK_INTERVAL
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +43,7 @@ class PaperTradingService:
         self.db = db_session
         self.portfolio_service = PaperPortfolioService(db_session)
         self.execution_service = PaperTradeExecutionService(db_session)
+        self.exit_monitor = get_position_exit_monitor()
         self.notification_callback = notification_callback
 
     async def start_session(
@@ -350,6 +355,14 @@ class PaperTradingService:
         3. Trailing stop hit → EXIT
         4. Update trailing stop if in profit
 
+        Open positions are indexed by symbol in the process-wide
+        PositionExitMonitor, which entries and exits keep up to date; it is
+        only reloaded when it no longer matches the database. Each symbol is
+        priced once and only positions whose thresholds were crossed are
+        loaded and exited. Between P&L marks (PAPER_TRADING_PNL_MARK_INTERVAL)
+        only new highs and ratcheted trailing stops are written back; at a
+        mark every open position gets its unrealized P&L in one bulk update.
+
         Args:
             session_id: Specific session ID (optional, otherwise all active)
 
@@ -373,8 +386,102 @@ class PaperTradingService:
             'details': []
         }
 
+        if not sessions:
+            return results
+
+        session_results = {
+            s.id: {'monitored': 0, 'exited': 0, 'trailing_updated': 0} for s in sessions
+        }
+
+        monitor = self.exit_monitor
+        self._sync_exit_monitor()
+
+        for monitored_id, count in monitor.session_counts().items():
+            if monitored_id in session_results:
+                session_results[monitored_id]['monitored'] = count
+
+        symbols = monitor.symbols_for(session_results.keys())
+
+        prices = {}
+        if symbols:
+            # Fresh intraday bars first; daily fetch only for symbols without them
+            intraday = get_intraday_service()
+            intraday.track(symbols)
+            prices = intraday.latest_prices(symbols)
+            missing = [s for s in symbols if s not in prices]
+            if missing:
+                loop = asyncio.get_event_loop()
+                prices.update(await loop.run_in_executor(None, get_multiple_prices, missing))
+
+        now = datetime.utcnow()
+        mark = (
+            monitor.marked_at is None
+            or (now - monitor.marked_at).total_seconds() >= PAPER_TRADING_PNL_MARK_INTERVAL
+        )
+        updates = []
+        exits = {}
+
+        for symbol in symbols:
+            current_price = prices.get(symbol)
+
+            if current_price is None:
+                logger.warning("Could not get current price for %s", symbol)
+                continue
+
+            evaluation = monitor.evaluate(symbol, current_price, now, mark=mark, session_ids=session_results.keys())
+            updates.extend(evaluation['updates'])
+
+            for position_id in evaluation['trailing_updated']:
+                session_results[evaluation['session_ids'][position_id]]['trailing_updated'] += 1
+
+            for position_id, exit_reason in evaluation['exits'].items():
+                exits[position_id] = (exit_reason, current_price)
+
+        try:
+            self._bulk_update_positions(updates)
+            self.db.commit()
+            if mark and not session_id:
+                monitor.marked_at = now
+        except Exception as e:
+            logger.error("Error updating monitored positions: %s", str(e))
+            self.db.rollback()
+            # The in-memory highs / trailing stops are ahead of the database now
+            monitor.invalidate()
+
+        if exits:
+            positions = self.db.query(PaperPosition).filter(
+                PaperPosition.id.in_(list(exits.keys())),
+                PaperPosition.is_open == True
+            ).all()
+
+            for position in positions:
+                exit_reason, current_price = exits[position.id]
+                try:
+                    pnl_data = self.portfolio_service.calculate_unrealized_pnl(position, current_price)
+                    position.current_price = current_price
+                    position.unrealized_pnl = pnl_data['unrealized_pnl']
+                    position.unrealized_pnl_pct = pnl_data['unrealized_pnl_pct']
+                    position.days_held = (now - position.entry_date).days
+
+                    logger.info(
+                        "%s for %s: ₹%.2f (stop ₹%.2f, target ₹%.2f, trailing %s)",
+                        exit_reason, position.symbol, current_price,
+                        position.stop_loss_price, position.target_price,
+                        f"₹{position.trailing_stop:.2f}" if position.trailing_stop else "-"
+                    )
+
+                    # Exits drop the position from the monitor; a failed one is retried next tick
+                    await self.execution_service.exit_position(
+                        position, current_price, exit_reason
+                    )
+                    session_results[position.session_id]['exited'] += 1
+
+                except Exception as e:
+                    logger.error("Error exiting position %s: %s", position.symbol, str(e))
+                    self.db.rollback()
+
         for session in sessions:
-            session_result = await self._monitor_session_positions(session)
+            session_result = session_results[session.id]
             results['positions_monitored'] += session_result['monitored']
             results['positions_exited'] += session_result['exited']
             results['trailing_stops_updated'] += session_result['trailing_updated']
@@ -385,93 +492,71 @@ class PaperTradingService:
             })
 
         logger.debug(
-            "📊 Position monitoring: %d positions, %d exits, %d trailing stops updated",
+            "📊 Position monitoring: %d positions, %d exits, %d trailing stops updated, %d rows written%s",
             results['positions_monitored'], results['positions_exited'],
-            results['trailing_stops_updated']
+            results['trailing_stops_updated'], len(updates), " (P&L mark)" if mark else ""
         )
 
         return results
 
-    async def _monitor_session_positions(self, session: PaperTradingSession) -> Dict:
+    def _sync_exit_monitor(self):
         """
-        Monitor positions for a specific session
+        Reload the exit monitor if it does not match the open positions in the database
 
-        Args:
-            session: Paper trading session
-
-        Returns:
-            Monitoring summary for this session
+        Entries and exits update the monitor directly; the fingerprint
+        check (count, ID sum and stop/target sums) catches positions opened,
+        closed or re-priced elsewhere (another process, a manual edit or a
+        different database) with one aggregate query instead of a reload.
         """
-        positions = self.db.query(PaperPosition).filter(
-            PaperPosition.session_id == session.id,
-            PaperPosition.is_open == True
-        ).all()
-
-        result = {'monitored': len(positions), 'exited': 0, 'trailing_updated': 0}
-
-        for position in positions:
-            try:
-                # Get current price (run in executor since it's synchronous)
-                loop = asyncio.get_event_loop()
-                current_price = await loop.run_in_executor(None, get_current_price, position.symbol)
-
-                if current_price is None:
-                    logger.warning("Could not get current price for %s", position.symbol)
-                    continue
-
-                # Update position price and P&L
-                pnl_data = self.portfolio_service.calculate_unrealized_pnl(position, current_price)
-                position.current_price = current_price
-                position.unrealized_pnl = pnl_data['unrealized_pnl']
-                position.unrealized_pnl_pct = pnl_data['unrealized_pnl_pct']
-
-                # Update days held
-                position.days_held = (datetime.utcnow() - position.entry_date).days
-
-                # Check exit conditions (priority order)
-                exit_reason = None
-
-                # 1. Stop loss
-                if current_price <= position.stop_loss_price:
-                    exit_reason = 'STOP_LOSS'
-                    logger.info("🛑 Stop loss hit for %s: ₹%.2f <= ₹%.2f",
-                               position.symbol, current_price, position.stop_loss_price)
-
-                # 2. Target
-                elif current_price >= position.target_price:
-                    exit_reason = 'TARGET_HIT'
-                    logger.info("🎯 Target hit for %s: ₹%.2f >= ₹%.2f",
-                               position.symbol, current_price, position.target_price)
-
-                # 3. Trailing stop
-                elif position.trailing_stop and current_price <= position.trailing_stop:
-                    exit_reason = 'TRAILING_STOP'
-                    logger.info("📉 Trailing stop hit for %s: ₹%.2f <= ₹%.2f",
-                               position.symbol, current_price, position.trailing_stop)
-
-                # Exit if triggered
-                if exit_reason:
-                    await self.execution_service.exit_position(
-                        position, current_price, exit_reason
-                    )
-                    result['exited'] += 1
+        monitor = self.exit_monitor
+        bind = self.db.get_bind()
+        open_positions = self.db.query(PaperPosition).join(
+            PaperTradingSession, PaperPosition.session_id == PaperTradingSession.id
+        ).filter(
+            PaperPosition.is_open == True,
+            PaperTradingSession.is_active == True
+        )
 
-                # Update trailing stop if in profit
-                elif pnl_data['unrealized_pnl'] > 0:
-                    new_trailing = await self.execution_service.update_trailing_stop(
-                        position, current_price
-                    )
-                    if new_trailing:
-                        result['trailing_updated'] += 1
+        if monitor.source is bind:
+            aggregate = open_positions.with_entities(
+                func.count(PaperPosition.id),
+                func.coalesce(func.sum(PaperPosition.id), 0),
+                func.coalesce(func.sum(PaperPosition.stop_loss_price), 0.0),
+                func.coalesce(func.sum(PaperPosition.target_price), 0.0)
+            ).one()
+            if monitor.make_fingerprint(*aggregate) == monitor.fingerprint:
+                return
+
+        # Lean column query - full ORM objects are only loaded for exits
+        rows = open_positions.with_entities(
+            PaperPosition.id, PaperPosition.session_id, PaperPosition.symbol,
+            PaperPosition.shares, PaperPosition.position_value,
+            PaperPosition.stop_loss_price, PaperPosition.target_price,
+            PaperPosition.trailing_stop, PaperPosition.highest_price,
+            PaperPosition.recommendation_type, PaperPosition.entry_date
+        ).all()
+        monitor.load(rows, source=bind)
+        logger.info("Loaded %d open positions into the exit monitor", len(rows))
 
-                # Commit updates
-                self.db.commit()
+    def _bulk_update_positions(self, updates: List[Dict]):
+        """
+        Write mark-to-market column updates with one executemany per column set
 
-            except Exception as e:
-                logger.error("Error monitoring position %s: %s", position.symbol, str(e))
-                self.db.rollback()
+        Args:
+            updates: Mappings with 'id' plus the columns to set
+        """
+        table = PaperPosition.__table__
+        by_columns = defaultdict(list)
+        for mapping in updates:
+            by_columns[tuple(sorted(k for k in mapping if k != 'id'))].append(
+                {('b_' + k): v for k, v in mapping.items()}
+            )
 
-        return result
+        for columns, rows in by_columns.items():
+            statement = update(table).where(table.c.id == bindparam('b_id')).values(
+                {column: bindparam('b_' + column) for column in columns}
+            )
+            self.db.execute(statement, rows)
 
     async def get_session_status(self, session_id: int) -> Dict:
         """
@@ -0,0 +1,342 @@
+"""
+Pending Trade Batch Executor
+Executes queued PendingPaperTrade rows in bulk at market open
+
+All pending trades and the open positions of their sessions are loaded
+in two queries, prices are fetched once per distinct symbol, and every
+session's entries are validated and sized in memory before being
+committed in a single transaction per session.
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from src.bot.database.models import (
+    PendingPaperTrade, PaperTradingSession, PaperPosition, DailyBuySignal
+)
+from src.bot.services.paper_portfolio_service import PaperPortfolioService
+from src.bot.services.paper_trade_execution_service import PaperTradeExecutionService
+from src.bot.services.position_exit_monitor import get_position_exit_monitor
+from src.bot.services.analysis_service import get_multiple_prices
+from src.bot.utils.paper_trading_logger import get_paper_trading_logger
+from src.bot.config import PAPER_TRADING_DRY_RUN
+
+logger = logging.getLogger(__name__)
+pt_logger = get_paper_trading_logger()
+
+
+class PendingTradeBatchExecutor:
+    """Batch executor for pending paper trades queued while market was closed"""
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize batch executor
+
+        Args:
+            db_session: Database session
+        """
+        self.db = db_session
+        self.portfolio_service = PaperPortfolioService(db_session)
+        self.execution_service = PaperTradeExecutionService(db_session)
+
+    async def execute_all(self) -> Dict:
+        """
+        Execute every PENDING trade
+
+        Steps:
+        1. Load pending trades with their sessions (query 1)
+        2. Load open positions for those sessions (query 2)
+        3. Fetch one price per distinct symbol
+        4. Validate and size per session in memory
+        5. Commit positions, logs and status updates per session
+
+        Returns:
+            Execution summary with counts and the list of opened positions
+            as (user_id, symbol, position) tuples
+        """
+        result = {
+            'pending': 0,
+            'executed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'opened': []
+        }
+
+        pending_trades = self.db.query(PendingPaperTrade).options(
+            joinedload(PendingPaperTrade.session)
+        ).filter(
+            PendingPaperTrade.status == 'PENDING'
+        ).order_by(PendingPaperTrade.requested_at).all()
+
+        if not pending_trades:
+            return result
+
+        result['pending'] = len(pending_trades)
+
+        # Group by session, cancelling trades whose session went away
+        by_session: Dict[int, List[PendingPaperTrade]] = defaultdict(list)
+        sessions: Dict[int, PaperTradingSession] = {}
+
+        for pending in pending_trades:
+            session = pending.session
+            if not session or not session.is_active:
+                self._mark(pending, 'CANCELLED', "Session no longer active")
+                result['cancelled'] += 1
+                continue
+            sessions[session.id] = session
+            by_session[session.id].append(pending)
+
+        if not by_session:
+            self.db.commit()
+            return result
+
+        held = self._load_open_holdings(list(by_session.keys()))
+
+        # One price fetch per distinct symbol
+        symbols = sorted({p.symbol for trades in by_session.values() for p in trades})
+        loop = asyncio.get_event_loop()
+        prices = await loop.run_in_executor(None, get_multiple_prices, symbols)
+
+        logger.info(
+            "Executing %d pending trades across %d session(s), %d distinct symbols (%d priced)",
+            sum(len(t) for t in by_session.values()), len(by_session), len(symbols), len(prices)
+        )
+
+        for session_id, trades in by_session.items():
+            session_result = self._execute_session(
+                sessions[session_id], trades, held[session_id], prices
+            )
+            result['executed'] += session_result['executed']
+            result['failed'] += session_result['failed']
+            result['cancelled'] += session_result['cancelled']
+            result['opened'].extend(session_result['opened'])
+
+        return result
+
+    def _load_open_holdings(self, session_ids: List[int]) -> Dict[int, Dict[str, float]]:
+        """
+        Get open positions for the given sessions in one query
+
+        Args:
+            session_ids: Session IDs
+
+        Returns:
+            Dictionary of session_id -> {symbol: position value}
+        """
+        rows = self.db.query(
+            PaperPosition.session_id, PaperPosition.symbol, PaperPosition.position_value
+        ).filter(
+            PaperPosition.session_id.in_(session_ids),
+            PaperPosition.is_open == True
+        ).all()
+
+        held: Dict[int, Dict[str, float]] = defaultdict(dict)
+        for session_id, symbol, value in rows:
+            held[session_id][symbol] = held[session_id].get(symbol, 0.0) + (value or 0.0)
+        return held
+
+    def _execute_session(
+        self,
+        session: PaperTradingSession,
+        trades: List[PendingPaperTrade],
+        held: Dict[str, float],
+        prices: Dict[str, float]
+    ) -> Dict:
+        """
+        Validate, size and stage all pending trades of one session, then commit once
+
+        Args:
+            session: Active paper trading session
+            trades: Pending trades of this session (oldest first)
+            held: Symbol -> value of positions already open in this session
+                  (staged entries are added as they are made)
+            prices: symbol -> current price
+
+        Returns:
+            Session execution summary
+        """
+        result = {'executed': 0, 'failed': 0, 'cancelled': 0, 'opened': []}
+        staged: List[Tuple[PendingPaperTrade, PaperPosition, DailyBuySignal, Dict]] = []
+
+        try:
+            for pending in trades:
+                if pending.symbol in held:
+                    self._mark(pending, 'CANCELLED', "Already have position")
+                    result['cancelled'] += 1
+                    continue
+
+                signal = self._build_signal(pending)
+                current_price = prices.get(pending.symbol) or signal.current_price
+
+                sizing, error = self._validate(session, signal, current_price, held)
+                if error:
+                    self._mark(pending, 'FAILED', error, attempted=True)
+                    result['failed'] += 1
+                    logger.warning("Pending trade validation failed for %s: %s", pending.symbol, error)
+                    continue
+
+                if PAPER_TRADING_DRY_RUN:
+                    pt_logger.info(
+                        f"[DRY RUN] Would ENTRY | Session {session.id} | {signal.symbol} | "
+                        f"{sizing['shares']:.2f} shares @ ₹{current_price:.2f} | Value: ₹{sizing['position_value']:.2f}"
+                    )
+                    self._mark(pending, 'FAILED', "Dry run - position not opened", attempted=True)
+                    result['failed'] += 1
+                    continue
+
+                position = self.execution_service.stage_entry(session, signal, current_price, sizing)
+                held[pending.symbol] = sizing['position_value']
+                staged.append((pending, position, signal, sizing))
+
+            if staged:
+                # Assign position IDs so logs and pending rows can reference them
+                self.db.flush()
+
+            now = datetime.utcnow()
+            for pending, position, signal, sizing in staged:
+                pending.status = 'EXECUTED'
+                pending.position_id = position.id
+                pending.executed_at = now
+                self.execution_service.stage_log(
+                    session, 'TRADE', 'ENTRY', signal.symbol,
+                    f"Position opened: {sizing['shares']} shares @ ₹{position.entry_price:.2f}",
+                    details={
+                        'position_id': position.id,
+                        'pending_trade_id': pending.id,
+                        'entry_price': position.entry_price,
+                        'shares': sizing['shares'],
+                        'position_value': sizing['position_value'],
+                        'target': signal.target,
+                        'stop_loss': signal.stop_loss,
+                        'risk_reward': signal.risk_reward,
+                        'confidence': signal.confidence,
+                        'recommendation': signal.recommendation_type
+                    },
+                    position_id=position.id
+                )
+
+            self.db.commit()
+
+        except Exception as e:
+            logger.error("Error executing pending trades for session %d: %s", session.id, e, exc_info=True)
+            self.db.rollback()
+            self._fail_session(trades, str(e))
+            return {'executed': 0, 'failed': len(trades), 'cancelled': 0, 'opened': []}
+
+        get_position_exit_monitor().add([position for _, position, _, _ in staged])
+
+        for pending, position, signal, sizing in staged:
+            result['executed'] += 1
+            result['opened'].append((session.user_id, pending.symbol, position))
+            pt_logger.info(
+                f"ENTRY | Session {session.id} | User {session.user_id} | "
+                f"{signal.symbol} | {sizing['shares']:.2f} shares @ ₹{position.entry_price:.2f} | "
+                f"Value: ₹{sizing['position_value']:.2f} | Target: ₹{signal.target:.2f} | "
+                f"Stop: ₹{signal.stop_loss:.2f} | R:R: {signal.risk_reward:.2f} | Conf: {signal.confidence:.1f}% | Pending"
+            )
+
+        return result
+
+    def _validate(
+        self,
+        session: PaperTradingSession,
+        signal: DailyBuySignal,
+        current_price: float,
+        held: Dict[str, float]
+    ) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        In-memory equivalent of PaperTradeExecutionService.validate_entry
+
+        Duplicate symbols are handled by the caller; this checks sizing,
+        capital / position limits, price drift and sector / correlation
+        exposure against the session's already-staged state.
+
+        Returns:
+            Tuple of (sizing, error_message)
+        """
+        if not signal.stop_loss or not signal.target:
+            return None, "Missing target or stop loss in signal data"
+
+        sizing = self.portfolio_service.calculate_position_size(
+            session, current_price, signal.stop_loss
+        )
+
+        if 'error' in sizing:
+            return None, sizing['error']
+
+        if not self.portfolio_service.can_open_position(session, sizing['position_value']):
+            return None, "Position limit reached or insufficient capital"
+
+        if signal.current_price:
+            max_drift = PaperTradeExecutionService.MAX_PRICE_DRIFT_PCT
+            price_drift_pct = abs((current_price - signal.current_price) / signal.current_price * 100)
+            if price_drift_pct > max_drift:
+                return None, f"Price moved {price_drift_pct:.1f}% from signal (max: {max_drift}%)"
+
+        return self.portfolio_service.check_exposure(session, signal.symbol, sizing, held)
+
+    @staticmethod
+    def _build_signal(pending: PendingPaperTrade) -> DailyBuySignal:
+        """
+        Build a transient (never persisted) signal from the queued signal data
+
+        Args:
+            pending: Pending trade
+
+        Returns:
+            Unsaved DailyBuySignal carrying the entry parameters
+        """
+        signal_data = pending.signal_data_dict
+        return DailyBuySignal(
+            symbol=pending.symbol,
+            analysis_date=pending.requested_at,
+            recommendation=signal_data.get('recommendation', ''),
+            recommendation_type=signal_data.get('recommendation_type', 'BUY'),
+            current_price=signal_data.get('current_price', 0.0),
+            target=signal_data.get('target'),
+            stop_loss=signal_data.get('stop_loss'),
+            risk_reward=signal_data.get('risk_reward', 0.0),
+            confidence=signal_data.get('confidence', 0.0),
+            overall_score_pct=signal_data.get('overall_score_pct', 50.0),
+            analysis_data=json.dumps(signal_data.get('analysis', {}), default=str)
+        )
+
+    @staticmethod
+    def _mark(pending: PendingPaperTrade, status: str, message: str, attempted: bool = False):
+        """Set terminal status on a pending trade (committed with its session batch)"""
+        pending.status = status
+        pending.error_message = message
+        if attempted:
+            pending.execution_attempts = (pending.execution_attempts or 0) + 1
+            pending.last_attempt_at = datetime.utcnow()
+
+    def _fail_session(self, trades: List[PendingPaperTrade], error: str):
+        """Mark all trades of a session as failed after its transaction was rolled back"""
+        try:
+            for pending in trades:
+                self._mark(pending, 'FAILED', error[:200], attempted=True)
+            self.db.commit()
+        except Exception as e:
+            logger.error("Could not record failure for pending trades: %s", e)
+            self.db.rollback()
+
+
+def get_pending_trade_batch_executor(db_session: Session) -> PendingTradeBatchExecutor:
+    """
+    Factory function to create pending trade batch executor
+
+    Args:
+        db_session: Database session
+
+    Returns:
+        PendingTradeBatchExecutor instance
+    """
+    return PendingTradeBatchExecutor(db_session)
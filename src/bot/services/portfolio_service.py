@@ -51,7 +51,8 @@ def calculate_position_pnl(
 
 def calculate_portfolio_summary(
     db: Session,
-    telegram_id: int
+    telegram_id: int,
+    prices: Optional[Dict[str, float]] = None
 ) -> Dict[str, Any]:
     """
     Calculate portfolio summary with P&L for all positions
@@ -59,9 +60,13 @@ def calculate_portfolio_summary(
     Args:
         db: Database session
         telegram_id: Telegram user ID
+        prices: Prefetched symbol -> price (skips the batch fetch; symbols
+                missing from it are fetched individually)
     
     Returns:
-        Dictionary with portfolio summary
+        Dictionary with portfolio summary. Positions whose price could not
+        be fetched at all are valued at their buy price, flagged with
+        price_available=False and listed in 'prices_unavailable'.
     """
     positions = get_user_portfolio(db, telegram_id)
     
@@ -72,27 +77,33 @@ def calculate_portfolio_summary(
             'total_current_value': 0.0,
             'total_pnl': 0.0,
             'total_pnl_percent': 0.0,
-            'positions': []
+            'positions': [],
+            'prices_unavailable': []
         }
     
     # Get current prices for all symbols
     symbols = [pos.symbol for pos in positions]
-    current_prices = get_multiple_prices(symbols)
+    current_prices = get_multiple_prices(symbols) if prices is None else prices
     
     total_invested = 0.0
     total_current_value = 0.0
     position_details = []
+    unavailable = []
     
     for position in positions:
         current_price = current_prices.get(position.symbol)
         
         if current_price is None:
-            # Try to fetch individually
+            # Missing from the batch - try to fetch individually
             try:
                 current_price = get_current_price(position.symbol)
-            except Exception:
-                logger.warning(f"Could not fetch price for {position.symbol}")
-                current_price = position.avg_buy_price  # Fallback to buy price
+            except Exception as e:
+                logger.warning(f"Could not fetch price for {position.symbol}: {e}")
+        
+        price_available = current_price is not None
+        if not price_available:
+            unavailable.append(position.symbol)
+            current_price = position.avg_buy_price  # Keeps totals neutral; flagged in reports
         
         pnl_data = calculate_position_pnl(
             position.shares,
@@ -112,6 +123,7 @@ def calculate_portfolio_summary(
             'current_value': pnl_data['current_value'],
             'pnl': pnl_data['pnl'],
             'pnl_percent': pnl_data['pnl_percent'],
+            'price_available': price_available,
             'notes': position.notes
         })
     
@@ -124,6 +136,7 @@ def calculate_portfolio_summary(
         'total_current_value': total_current_value,
         'total_pnl': total_pnl,
         'total_pnl_percent': total_pnl_percent,
-        'positions': position_details
+        'positions': position_details,
+        'prices_unavailable': unavailable
     }
 
@@ -0,0 +1,391 @@
+"""
+Position Exit Monitor
+Threshold-indexed view of open paper positions for fast exit detection
+
+Open positions are grouped by symbol. For each symbol the stop-loss,
+target and trailing-stop thresholds are kept in sorted arrays, so a price
+update finds the crossed positions with a binary search instead of
+checking every position. Mark-to-market P&L for all positions in a
+symbol is computed in one vectorized pass.
+
+One monitor (get_position_exit_monitor) lives for the whole process and
+is kept in step with entries and exits, so monitoring ticks do not reload
+and re-sort every open position.
+
+Author: Harsh Kandhway
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.bot.config import PAPER_TRADING_TRAILING_STOP
+
+logger = logging.getLogger(__name__)
+
+# Price sums in fingerprints are compared at this precision
+FINGERPRINT_DECIMALS = 4
+
+# Per-position arrays of a SymbolBook (kept aligned by index)
+BOOK_ARRAYS = (
+    'position_ids', 'session_ids', 'shares', 'entry_value', 'stop', 'target',
+    'trailing', 'highest', 'trailing_pct', 'entry_dates'
+)
+
+
+class SymbolBook:
+    """Array-backed thresholds for all open positions in one symbol"""
+
+    __slots__ = (
+        'symbol', 'position_ids', 'session_ids', 'shares', 'entry_value',
+        'stop', 'target', 'trailing', 'highest', 'trailing_pct', 'entry_dates',
+        '_stop_order', '_stop_sorted', '_target_order', '_target_sorted',
+        '_trail_order', '_trail_sorted'
+    )
+
+    def __init__(self, symbol: str, rows: List, trailing_pcts: Dict[str, float]):
+        """
+        Build book from position rows
+
+        Args:
+            symbol: Stock symbol
+            rows: Objects with id, session_id, shares, position_value,
+                  stop_loss_price, target_price, trailing_stop, highest_price,
+                  recommendation_type and entry_date attributes
+            trailing_pcts: Trailing stop percentage by recommendation type
+        """
+        self.symbol = symbol
+        self.position_ids = np.array([r.id for r in rows], dtype=np.int64)
+        self.session_ids = np.array([r.session_id for r in rows], dtype=np.int64)
+        self.shares = np.array([r.shares for r in rows], dtype=float)
+        self.entry_value = np.array([r.position_value for r in rows], dtype=float)
+        self.stop = np.array([r.stop_loss_price for r in rows], dtype=float)
+        self.target = np.array([r.target_price for r in rows], dtype=float)
+        # A falsy trailing stop (None / 0) means "not active"
+        self.trailing = np.array([r.trailing_stop or np.nan for r in rows], dtype=float)
+        self.highest = np.array(
+            [r.highest_price if r.highest_price is not None else np.nan for r in rows], dtype=float
+        )
+        self.trailing_pct = np.array(
+            [trailing_pcts.get(r.recommendation_type, 0.20) for r in rows], dtype=float
+        )
+        self.entry_dates = np.array([r.entry_date for r in rows], dtype='datetime64[s]')
+        self._index()
+
+    def __len__(self) -> int:
+        return len(self.position_ids)
+
+    def _index(self):
+        """(Re)build the sorted stop-loss, target and trailing-stop indexes"""
+        self._stop_order = np.argsort(self.stop, kind='stable')
+        self._stop_sorted = self.stop[self._stop_order]
+        self._target_order = np.argsort(self.target, kind='stable')
+        self._target_sorted = self.target[self._target_order]
+        self._index_trailing()
+
+    def extend(self, other: 'SymbolBook'):
+        """
+        Append the positions of another book for the same symbol
+
+        Args:
+            other: Book built from the new positions
+        """
+        for name in BOOK_ARRAYS:
+            setattr(self, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+        self._index()
+
+    def keep(self, mask: np.ndarray):
+        """
+        Keep only the positions selected by a boolean mask
+
+        Args:
+            mask: One flag per position
+        """
+        for name in BOOK_ARRAYS:
+            setattr(self, name, getattr(self, name)[mask])
+        self._index()
+
+    def _index_trailing(self):
+        """(Re)build the sorted trailing-stop index over active trailing stops"""
+        active = np.flatnonzero(~np.isnan(self.trailing))
+        order = active[np.argsort(self.trailing[active], kind='stable')]
+        self._trail_order = order
+        self._trail_sorted = self.trailing[order]
+
+    def crossed(self, price: float) -> Dict[int, str]:
+        """
+        Find positions whose exit thresholds are crossed at this price
+
+        Args:
+            price: Current price
+
+        Returns:
+            Dictionary of book index -> exit reason
+        """
+        exits: Dict[int, str] = {}
+
+        # Lowest priority first so higher priorities overwrite:
+        # stop loss > target > trailing stop
+        idx = np.searchsorted(self._trail_sorted, price, side='left')
+        for i in self._trail_order[idx:]:
+            exits[int(i)] = 'TRAILING_STOP'
+
+        idx = np.searchsorted(self._target_sorted, price, side='right')
+        for i in self._target_order[:idx]:
+            exits[int(i)] = 'TARGET_HIT'
+
+        idx = np.searchsorted(self._stop_sorted, price, side='left')
+        for i in self._stop_order[idx:]:
+            exits[int(i)] = 'STOP_LOSS'
+
+        return exits
+
+
+class PositionExitMonitor:
+    """Symbol-indexed exit monitor for open paper positions"""
+
+    def __init__(self, trailing_pcts: Dict[str, float]):
+        """
+        Initialize monitor
+
+        Args:
+            trailing_pcts: Trailing stop percentage by recommendation type
+        """
+        self.trailing_pcts = trailing_pcts
+        self.books: Dict[str, SymbolBook] = {}
+        # Where the index was loaded from (None = reload before use) and
+        # when unrealized P&L was last written for every position
+        self.source: Any = None
+        self.marked_at: Optional[datetime] = None
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols with at least one open position"""
+        return sorted(self.books.keys())
+
+    @property
+    def position_count(self) -> int:
+        """Total number of indexed positions"""
+        return sum(len(book) for book in self.books.values())
+
+    @staticmethod
+    def make_fingerprint(count: int, id_sum: int, stop_sum: float, target_sum: float) -> Tuple:
+        """
+        Comparable summary of a set of open positions
+
+        The stop-loss and target sums catch threshold edits, which the
+        monitor's own writes (mark-to-market, trailing stop) never touch.
+        Sums are rounded so float summation order cannot force a reload.
+
+        Args:
+            count: Number of positions
+            id_sum: Sum of position IDs
+            stop_sum: Sum of stop-loss prices (NULLs as 0)
+            target_sum: Sum of target prices (NULLs as 0)
+
+        Returns:
+            Fingerprint tuple
+        """
+        return (
+            int(count), int(id_sum),
+            round(float(stop_sum), FINGERPRINT_DECIMALS), round(float(target_sum), FINGERPRINT_DECIMALS)
+        )
+
+    @property
+    def fingerprint(self) -> Tuple:
+        """make_fingerprint of the indexed positions, to compare with the database"""
+        books = self.books.values()
+        return self.make_fingerprint(
+            self.position_count,
+            sum(int(book.position_ids.sum()) for book in books),
+            sum(float(np.nansum(book.stop)) for book in books),
+            sum(float(np.nansum(book.target)) for book in books),
+        )
+
+    def session_counts(self) -> Dict[int, int]:
+        """Number of indexed positions per session"""
+        counts: Dict[int, int] = defaultdict(int)
+        for book in self.books.values():
+            for session_id in book.session_ids.tolist():
+                counts[session_id] += 1
+        return dict(counts)
+
+    def symbols_for(self, session_ids: Iterable[int]) -> List[str]:
+        """Symbols with at least one open position in the given sessions"""
+        wanted = list(session_ids)
+        return sorted(symbol for symbol, book in self.books.items() if np.isin(book.session_ids, wanted).any())
+
+    def load(self, rows: Iterable, source: Any = None):
+        """
+        Replace the index with the given open positions
+
+        Args:
+            rows: Position rows (ORM objects or column tuples with matching names)
+            source: What the rows were loaded from (e.g. the database engine)
+        """
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[row.symbol].append(row)
+
+        self.books = {
+            symbol: SymbolBook(symbol, symbol_rows, self.trailing_pcts)
+            for symbol, symbol_rows in grouped.items()
+        }
+        self.source = source
+        self.marked_at = None
+
+    def invalidate(self):
+        """Force a reload before the next use (e.g. after a failed write)"""
+        self.source = None
+
+    def add(self, rows: Iterable):
+        """
+        Index newly opened positions
+
+        Args:
+            rows: Position rows; positions already in the index are skipped
+        """
+        grouped = defaultdict(list)
+        for row in rows:
+            book = self.books.get(row.symbol)
+            if book is None or row.id not in book.position_ids:
+                grouped[row.symbol].append(row)
+
+        for symbol, symbol_rows in grouped.items():
+            new_book = SymbolBook(symbol, symbol_rows, self.trailing_pcts)
+            if symbol in self.books:
+                self.books[symbol].extend(new_book)
+            else:
+                self.books[symbol] = new_book
+
+    def evaluate(
+        self,
+        symbol: str,
+        price: float,
+        now: Optional[datetime] = None,
+        mark: bool = True,
+        session_ids: Optional[Iterable[int]] = None
+    ) -> Dict:
+        """
+        Evaluate one price update for a symbol
+
+        Steps:
+        1. Binary-search the sorted thresholds for crossed positions
+        2. Vectorized mark-to-market for every position in the symbol
+        3. Vectorized trailing stop ratchet for non-exiting positions in profit
+
+        Args:
+            symbol: Stock symbol
+            price: Current price
+            now: Evaluation time (default: utcnow)
+            mark: Include mark-to-market columns for every non-exiting
+                  position; otherwise only positions with a new high or a
+                  ratcheted trailing stop get an update
+            session_ids: Only evaluate positions of these sessions (default: all)
+
+        Returns:
+            Dictionary with 'exits' (position_id -> reason), 'updates'
+            (column mappings to write), 'trailing_updated'
+            (position IDs whose trailing stop moved) and per-position
+            'session_ids' for bookkeeping
+        """
+        book = self.books.get(symbol)
+        if book is None:
+            return {'exits': {}, 'updates': [], 'trailing_updated': [], 'session_ids': {}}
+
+        now = now or datetime.utcnow()
+        if session_ids is None:
+            selected = np.ones(len(book), dtype=bool)
+        else:
+            selected = np.isin(book.session_ids, list(session_ids))
+        crossed = {i: reason for i, reason in book.crossed(price).items() if selected[i]}
+
+        # Mark-to-market
+        current_value = book.shares * price
+        pnl = current_value - book.entry_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = np.where(book.entry_value > 0, pnl / book.entry_value * 100, 0.0)
+        days_held = ((np.datetime64(now, 's') - book.entry_dates) // np.timedelta64(1, 'D')).astype(int)
+
+        # Trailing stop ratchet (only for positions in profit that are not exiting)
+        exiting = np.zeros(len(book), dtype=bool)
+        if crossed:
+            exiting[list(crossed.keys())] = True
+        in_profit = (pnl > 0) & ~exiting & selected
+
+        new_high = in_profit & ~(book.highest >= price)
+        highest = np.where(in_profit, np.fmax(book.highest, price), book.highest)
+        candidate = price * (1 - book.trailing_pct)
+        no_trailing = np.isnan(book.trailing)
+        ratchet = in_profit & np.where(no_trailing, candidate > book.stop, candidate > book.trailing)
+        trailing = np.where(ratchet, candidate, book.trailing)
+
+        book.highest = highest
+        if ratchet.any():
+            book.trailing = trailing
+            book._index_trailing()
+
+        ids = book.position_ids.tolist()
+        updates = []
+        write = (selected & ~exiting) if mark else (new_high | ratchet)
+        for i in np.flatnonzero(write):
+            mapping = {'id': ids[i]}
+            if mark:
+                mapping.update({
+                    'current_price': price,
+                    'unrealized_pnl': float(pnl[i]),
+                    'unrealized_pnl_pct': float(pnl_pct[i]),
+                    'days_held': int(days_held[i]),
+                })
+            if in_profit[i]:
+                mapping['highest_price'] = float(highest[i])
+            if ratchet[i]:
+                mapping['trailing_stop'] = float(trailing[i])
+            updates.append(mapping)
+
+        return {
+            'exits': {ids[i]: reason for i, reason in crossed.items()},
+            'updates': updates,
+            'trailing_updated': [ids[i] for i in np.flatnonzero(ratchet)],
+            'session_ids': dict(zip(ids, book.session_ids.tolist())),
+        }
+
+    def remove(self, position_ids: Iterable[int]):
+        """
+        Drop closed positions from the index
+
+        Args:
+            position_ids: IDs of positions that were exited
+        """
+        drop = set(position_ids)
+        if not drop:
+            return
+
+        for symbol, book in list(self.books.items()):
+            keep = ~np.isin(book.position_ids, list(drop))
+            if keep.all():
+                continue
+            if not keep.any():
+                del self.books[symbol]
+                continue
+            book.keep(keep)
+
+
+# Global monitor instance
+_position_exit_monitor: Optional[PositionExitMonitor] = None
+
+
+def get_position_exit_monitor() -> PositionExitMonitor:
+    """
+    Get or create the process-wide exit monitor
+
+    Returns:
+        PositionExitMonitor instance
+    """
+    global _position_exit_monitor
+    if _position_exit_monitor is None:
+        _position_exit_monitor = PositionExitMonitor(PAPER_TRADING_TRAILING_STOP)
+    return _position_exit_monitor
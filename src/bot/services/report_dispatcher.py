@@ -0,0 +1,278 @@
+"""
+Scheduled Report Dispatcher
+Sends scheduled watchlist/portfolio reports at their exact minute
+
+Every active ScheduledReport carries its next send time (UTC,
+next_scheduled, indexed). The dispatcher sleeps until the earliest one,
+claims every report due at that moment, quotes the union of their symbols
+in one batched call, renders all reports from those prices and sends them
+concurrently, paced by a shared token bucket so the bot stays under
+Telegram's broadcast limit.
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from src.bot.config import (
+    REPORT_DISPATCH_MAX_SLEEP_SECONDS,
+    REPORT_MISSED_GRACE_MINUTES,
+    REPORT_SENDS_PER_SECOND,
+)
+from src.bot.database.db import (
+    get_db_context,
+    get_due_scheduled_reports,
+    get_next_report_due,
+    next_report_time,
+)
+from src.bot.database.models import ScheduledReport
+from src.bot.middleware.rate_limiter import TokenBucket
+from src.bot.services.analysis_service import get_multiple_prices
+from src.bot.services.report_service import REPORT_TYPES, generate_report, report_symbols
+from src.core.timing import timed
+
+logger = logging.getLogger(__name__)
+
+
+class SendThrottle:
+    """Paces outgoing messages across all concurrent senders"""
+
+    def __init__(self, per_second: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            per_second: Sustained messages per second (also the burst size)
+            clock: Monotonic time source in seconds
+        """
+        self._bucket = TokenBucket(max(1.0, per_second), per_second, clock())
+        self._clock = clock
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until one message may be sent"""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._bucket.refill(now)
+                wait = self._bucket.wait_time(1)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self._bucket.tokens -= 1
+
+
+class ReportDispatcher:
+    """Wakes when the next scheduled reports are due and sends them as one batch"""
+
+    def __init__(
+        self,
+        bot,
+        session_factory: Callable = get_db_context,
+        sends_per_second: float = REPORT_SENDS_PER_SECOND
+    ):
+        """
+        Initialize dispatcher
+
+        Args:
+            bot: Telegram bot instance
+            session_factory: Context manager yielding a database session
+            sends_per_second: Outgoing message rate shared by all reports
+        """
+        self.bot = bot
+        self._session_factory = session_factory
+        self.throttle = SendThrottle(sends_per_second)
+        self.is_running = False
+        self.task = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def start(self):
+        """Start the dispatch loop"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._wake = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+        logger.info("Scheduled report dispatcher started")
+
+    async def stop(self):
+        """Stop the dispatch loop"""
+        self.is_running = False
+        if self.task:
+            self.task.cancel()
+        logger.info("Scheduled report dispatcher stopped")
+
+    def wake(self):
+        """Re-read the schedule now (call after creating or enabling a report)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self):
+        """Sleep until the earliest due report, then dispatch everything due"""
+        self.backfill_schedules()
+        while self.is_running:
+            try:
+                with self._session_factory() as db:
+                    next_due = get_next_report_due(db)
+
+                wait = REPORT_DISPATCH_MAX_SLEEP_SECONDS
+                if next_due is not None:
+                    wait = min(wait, (next_due - datetime.utcnow()).total_seconds())
+
+                if wait > 0:
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self.dispatch_due()
+
+            except asyncio.CancelledError:
+                logger.info("Report dispatcher task cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in report dispatcher: {e}", exc_info=True)
+                await asyncio.sleep(REPORT_DISPATCH_MAX_SLEEP_SECONDS)
+
+    def backfill_schedules(self, now: Optional[datetime] = None) -> int:
+        """
+        Give active reports without a next send time one
+
+        Args:
+            now: Naive UTC time (defaults to now)
+
+        Returns:
+            Number of reports updated
+        """
+        now = now or datetime.utcnow()
+        with self._session_factory() as db:
+            reports = db.query(ScheduledReport).filter(
+                ScheduledReport.is_active == True,
+                ScheduledReport.next_scheduled.is_(None)
+            ).all()
+            for report in reports:
+                report.next_scheduled = next_report_time(report.frequency, now)
+            db.commit()
+        if reports:
+            logger.info(f"Scheduled next send time for {len(reports)} report(s)")
+        return len(reports)
+
+    @timed('reports.dispatch')
+    async def dispatch_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Send every report whose time has come
+
+        Due reports are moved to their next slot before anything is sent,
+        so a crash mid-batch never sends a report twice. Reports more than
+        REPORT_MISSED_GRACE_MINUTES late (e.g. the bot was down) are skipped.
+
+        Args:
+            now: Naive UTC time (defaults to now)
+
+        Returns:
+            Dictionary with due, sent, failed, skipped and symbols counts
+        """
+        now = now or datetime.utcnow()
+        grace = timedelta(minutes=REPORT_MISSED_GRACE_MINUTES)
+        loop = asyncio.get_running_loop()
+        stats = {'due': 0, 'sent': 0, 'failed': 0, 'skipped': 0, 'symbols': 0}
+
+        with self._session_factory() as db:
+            jobs = []
+            for report in get_due_scheduled_reports(db, now):
+                stats['due'] += 1
+                scheduled = report.next_scheduled
+                report.next_scheduled = next_report_time(report.frequency, now)
+                if now - scheduled > grace or report.report_type not in REPORT_TYPES:
+                    stats['skipped'] += 1
+                    continue
+                jobs.append({
+                    'id': report.id,
+                    'telegram_id': report.user.telegram_id,
+                    'report_type': report.report_type,
+                })
+
+            symbols = sorted({
+                symbol for job in jobs
+                for symbol in report_symbols(db, job['telegram_id'], job['report_type'])
+            })
+            db.commit()
+
+        if not jobs:
+            return stats
+
+        stats['symbols'] = len(symbols)
+        try:
+            prices = await loop.run_in_executor(None, get_multiple_prices, symbols) if symbols else {}
+        except Exception as e:
+            logger.warning(f"Report price prefetch failed: {e}")
+            prices = {}
+
+        messages = await loop.run_in_executor(None, self._render_all, jobs, prices)
+
+        results = await asyncio.gather(
+            *(self._send(job, messages.get(job['id'])) for job in jobs)
+        )
+        delivered = [job['id'] for job, ok in zip(jobs, results) if ok]
+
+        if delivered:
+            with self._session_factory() as db:
+                db.query(ScheduledReport).filter(ScheduledReport.id.in_(delivered)).update(
+                    {ScheduledReport.last_sent: datetime.utcnow()}, synchronize_session=False
+                )
+                db.commit()
+
+        stats['sent'] = len(delivered)
+        stats['failed'] = len(jobs) - len(delivered)
+        logger.info(
+            f"Scheduled reports: {stats['sent']} sent, {stats['failed']} failed, "
+            f"{stats['skipped']} skipped, {stats['symbols']} symbols quoted"
+        )
+        return stats
+
+    def _render_all(self, jobs: List[Dict[str, Any]], prices: Dict[str, float]) -> Dict[int, str]:
+        """Render every report from the shared prices in one session"""
+        messages = {}
+        with self._session_factory() as db:
+            for job in jobs:
+                try:
+                    messages[job['id']] = generate_report(db, job['telegram_id'], job['report_type'], prices)
+                except Exception as e:
+                    logger.error(f"Error generating {job['report_type']} report for {job['telegram_id']}: {e}")
+        return messages
+
+    async def _send(self, job: Dict[str, Any], message: Optional[str]) -> bool:
+        """Send one rendered report under the shared throttle"""
+        if not message:
+            return False
+        await self.throttle.acquire()
+        try:
+            await self.bot.send_message(chat_id=job['telegram_id'], text=message, parse_mode='Markdown')
+            return True
+        except Exception as e:
+            logger.error(f"Error sending report to {job['telegram_id']}: {e}")
+            return False
+
+
+# Global dispatcher instance
+_dispatcher: Optional[ReportDispatcher] = None
+
+
+def get_report_dispatcher(bot=None) -> Optional[ReportDispatcher]:
+    """
+    Get or create the report dispatcher
+
+    Args:
+        bot: Telegram bot instance (required for first call)
+
+    Returns:
+        ReportDispatcher instance (None before it has been created)
+    """
+    global _dispatcher
+    if _dispatcher is None and bot is not None:
+        _dispatcher = ReportDispatcher(bot)
+    return _dispatcher
@@ -13,23 +13,89 @@ from sqlalchemy.orm import Session
 
 from ..database.db import (
     get_user_watchlist,
-    get_user_settings
+    get_user_settings,
+    get_user_portfolio
 )
 from ..services.portfolio_service import calculate_portfolio_summary
-from ..services.analysis_service import get_current_price
+from ..services.analysis_service import get_multiple_prices
+from ..services.watchlist_digest_service import get_watchlist_digest_service, summarize_digest
 from ..utils.formatters import format_number, format_percentage
 from ..config import CURRENCY_SYMBOL, EMOJI
 
 logger = logging.getLogger(__name__)
 
+REPORT_WATCHLIST_LIMIT = 10
+REPORT_TYPES = ('watchlist', 'portfolio', 'combined')
 
-def generate_watchlist_report(db: Session, telegram_id: int) -> str:
+
+def report_symbols(db: Session, telegram_id: int, report_type: str) -> List[str]:
+    """
+    Symbols a report needs live quotes for
+    
+    Watchlist symbols covered by a digest are not listed. The scheduled
+    report dispatcher quotes the union across all due reports in one call.
+    
+    Args:
+        db: Database session
+        telegram_id: Telegram user ID
+        report_type: watchlist, portfolio or combined
+    
+    Returns:
+        List of symbols
+    """
+    symbols = []
+    if report_type in ('watchlist', 'combined'):
+        shown = [item.symbol for item in get_user_watchlist(db, telegram_id)[:REPORT_WATCHLIST_LIMIT]]
+        digest = get_watchlist_digest_service().get_user_digest(db, telegram_id)
+        covered = {entry['symbol'] for entry in digest['entries']}
+        symbols.extend(symbol for symbol in shown if symbol not in covered)
+    if report_type in ('portfolio', 'combined'):
+        symbols.extend(position.symbol for position in get_user_portfolio(db, telegram_id))
+    return list(dict.fromkeys(symbols))
+
+
+def generate_report(
+    db: Session,
+    telegram_id: int,
+    report_type: str,
+    prices: Optional[Dict[str, float]] = None
+) -> Optional[str]:
+    """
+    Generate a report by type
+    
+    Args:
+        db: Database session
+        telegram_id: Telegram user ID
+        report_type: watchlist, portfolio or combined
+        prices: Prefetched symbol -> price (see report_symbols)
+    
+    Returns:
+        Formatted report string, or None for an unknown report type
+    """
+    if report_type == 'watchlist':
+        return generate_watchlist_report(db, telegram_id, prices)
+    if report_type == 'portfolio':
+        return generate_portfolio_report(db, telegram_id, prices)
+    if report_type == 'combined':
+        return generate_combined_report(db, telegram_id, prices)
+    return None
+
+
+def generate_watchlist_report(
+    db: Session,
+    telegram_id: int,
+    prices: Optional[Dict[str, float]] = None
+) -> str:
     """
     Generate watchlist summary report
     
+    Reads the shared after-close digests; only symbols without a digest
+    (e.g. added since the last close) are priced live, in one batch.
+    
     Args:
         db: Database session
         telegram_id: Telegram user ID
+        prices: Prefetched symbol -> price (skips the live fetch)
     
     Returns:
         Formatted report string
@@ -39,41 +105,68 @@ def generate_watchlist_report(db: Session, telegram_id: int) -> str:
     if not watchlist:
         return f"{EMOJI['watchlist']} *Watchlist Report*\n\nYour watchlist is empty."
     
-    message = f"{EMOJI['watchlist']} *Watchlist Report*\n\n"
-    message += f"*{len(watchlist)} stocks in watchlist*\n\n"
+    settings = get_user_settings(db, telegram_id)
+    mode = settings.risk_mode if settings and settings.risk_mode else 'balanced'
+    digest = get_watchlist_digest_service().get_user_digest(db, telegram_id)
+    digests = {entry['symbol']: summarize_digest(entry, mode) for entry in digest['entries']}
     
-    for item in watchlist[:10]:  # Limit to 10 for report
+    message = f"{EMOJI['watchlist']} *Watchlist Report*\n\n"
+    message += f"*{len(watchlist)} stocks in watchlist*"
+    if digest['digest_date']:
+        message += f" _(close of {digest['digest_date'].strftime('%d %b')})_"
+    message += "\n\n"
+    
+    shown = watchlist[:REPORT_WATCHLIST_LIMIT]
+    missing = [item.symbol for item in shown if item.symbol not in digests]
+    try:
+        if prices is not None:
+            live_prices = prices
+        else:
+            live_prices = get_multiple_prices(missing) if missing else {}
+    except Exception as e:
+        logger.warning(f"Could not fetch prices for {', '.join(missing)}: {e}")
+        live_prices = {}
+    
+    for item in shown:
         symbol = item.symbol
-        try:
-            current_price = get_current_price(symbol)
-            if current_price:
-                message += f"• *{symbol}*: {CURRENCY_SYMBOL}{format_number(current_price)}\n"
-            else:
-                message += f"• *{symbol}*: Price unavailable\n"
-        except Exception as e:
-            logger.warning(f"Could not fetch price for {symbol}: {e}")
-            message += f"• *{symbol}*: Error fetching price\n"
-    
-    if len(watchlist) > 10:
-        message += f"\n... and {len(watchlist) - 10} more stocks"
+        summary = digests.get(symbol)
+        if summary:
+            message += (
+                f"• *{symbol}*: {CURRENCY_SYMBOL}{format_number(summary['price'])} "
+                f"({format_percentage(summary['change_pct'])}) - {summary['recommendation']}\n"
+            )
+            for highlight in summary['highlights']:
+                message += f"   ↳ {highlight}\n"
+        elif live_prices.get(symbol):
+            message += f"• *{symbol}*: {CURRENCY_SYMBOL}{format_number(live_prices[symbol])}\n"
+        else:
+            message += f"• *{symbol}*: Price unavailable\n"
+    
+    if len(watchlist) > REPORT_WATCHLIST_LIMIT:
+        message += f"\n... and {len(watchlist) - REPORT_WATCHLIST_LIMIT} more stocks"
     
     message += f"\n\n_Generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_"
     
     return message
 
 
-def generate_portfolio_report(db: Session, telegram_id: int) -> str:
+def generate_portfolio_report(
+    db: Session,
+    telegram_id: int,
+    prices: Optional[Dict[str, float]] = None
+) -> str:
     """
     Generate portfolio performance report
     
     Args:
         db: Database session
         telegram_id: Telegram user ID
+        prices: Prefetched symbol -> price (skips the live fetch)
     
     Returns:
         Formatted report string
     """
-    portfolio_summary = calculate_portfolio_summary(db, telegram_id)
+    portfolio_summary = calculate_portfolio_summary(db, telegram_id, prices)
     
     if portfolio_summary['total_positions'] == 0:
         return f"{EMOJI['portfolio']} *Portfolio Report*\n\nYour portfolio is empty."
@@ -89,7 +182,10 @@ def generate_portfolio_report(db: Session, telegram_id: int) -> str:
     pnl_emoji = EMOJI['profit'] if pnl >= 0 else EMOJI['loss']
     
     message += f"• Total P&L: {pnl_emoji} {CURRENCY_SYMBOL}{format_number(pnl)} "
-    message += f"({format_percentage(pnl_percent)})\n\n"
+    message += f"({format_percentage(pnl_percent)})\n"
+    if portfolio_summary.get('prices_unavailable'):
+        message += f"• Price unavailable (valued at cost): {', '.join(portfolio_summary['prices_unavailable'])}\n"
+    message += "\n"
     
     message += "*Top Positions:*\n"
     # Sort by absolute P&L
@@ -100,8 +196,11 @@ def generate_portfolio_report(db: Session, telegram_id: int) -> str:
     )
     
     for pos in sorted_positions[:5]:  # Top 5
-        pos_pnl_emoji = EMOJI['profit'] if pos['pnl'] >= 0 else EMOJI['loss']
         message += f"\n*{pos['symbol']}*\n"
+        if not pos.get('price_available', True):
+            message += "  P&L: Price unavailable\n"
+            continue
+        pos_pnl_emoji = EMOJI['profit'] if pos['pnl'] >= 0 else EMOJI['loss']
         message += f"  P&L: {pos_pnl_emoji} {CURRENCY_SYMBOL}{format_number(pos['pnl'])} "
         message += f"({format_percentage(pos['pnl_percent'])})\n"
     
@@ -110,19 +209,24 @@ def generate_portfolio_report(db: Session, telegram_id: int) -> str:
     return message
 
 
-def generate_combined_report(db: Session, telegram_id: int) -> str:
+def generate_combined_report(
+    db: Session,
+    telegram_id: int,
+    prices: Optional[Dict[str, float]] = None
+) -> str:
     """
     Generate combined watchlist and portfolio report
     
     Args:
         db: Database session
         telegram_id: Telegram user ID
+        prices: Prefetched symbol -> price (skips the live fetch)
     
     Returns:
         Formatted report string
     """
-    watchlist_report = generate_watchlist_report(db, telegram_id)
-    portfolio_report = generate_portfolio_report(db, telegram_id)
+    watchlist_report = generate_watchlist_report(db, telegram_id, prices)
+    portfolio_report = generate_portfolio_report(db, telegram_id, prices)
     
     return f"{watchlist_report}\n\n{portfolio_report}"
 
@@ -14,12 +14,20 @@ import pytz
 from telegram import Bot
 from telegram.ext import Application
 
-from src.bot.config import TELEGRAM_BOT_TOKEN, DEFAULT_TIMEZONE
+from src.bot.config import (
+    TELEGRAM_BOT_TOKEN, DEFAULT_TIMEZONE, ENABLE_SCAN_ARCHIVE, SCAN_ARCHIVE_DIR,
+    ENABLE_WATCHLIST_DIGESTS, WATCHLIST_DIGEST_TIME, ENABLE_EXPOSURE_CHECKS, EXPOSURE_BUILD_TIME
+)
 from src.bot.database.db import get_db_context
 from src.bot.database.models import User, UserSettings, DailyBuySignal
 from src.bot.services.analysis_service import analyze_stock
 from src.bot.utils.formatters import format_analysis_full
 from src.bot.services.notification_service import send_daily_buy_alerts
+from src.bot.services.market_hours_service import get_market_hours_service
+from src.bot.services.watchlist_digest_service import get_watchlist_digest_service
+from src.bot.services.exposure_service import get_exposure_service
+from src.core.scan_archive import ScanArchiveWriter
+from src.core.timing import mark_failed, timed
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +48,8 @@ class DailyBuyAlertsScheduler:
         self.analysis_task = None
         self.notification_task = None
         self.retry_task = None
+        self.digest_task = None
+        self.exposure_task = None
 
         # Paper trading scheduler (NEW)
         self.paper_trading_scheduler = None
@@ -62,6 +72,14 @@ class DailyBuyAlertsScheduler:
         # Start retry task (runs every 2 minutes to retry failed alerts)
         self.retry_task = asyncio.create_task(self._run_retry_checker())
 
+        # Start watchlist digest task (runs once after each trading day's close)
+        if ENABLE_WATCHLIST_DIGESTS:
+            self.digest_task = asyncio.create_task(self._run_watchlist_digests())
+
+        # Start exposure matrix task (rebuilt once after each trading day's close)
+        if ENABLE_EXPOSURE_CHECKS:
+            self.exposure_task = asyncio.create_task(self._run_exposure_build())
+
         logger.info("Daily BUY Alerts Scheduler started")
 
         # Start paper trading scheduler (NEW)
@@ -87,6 +105,10 @@ class DailyBuyAlertsScheduler:
             self.notification_task.cancel()
         if self.retry_task:
             self.retry_task.cancel()
+        if self.digest_task:
+            self.digest_task.cancel()
+        if self.exposure_task:
+            self.exposure_task.cancel()
         
         # Stop paper trading scheduler
         if self.paper_trading_scheduler:
@@ -104,11 +126,9 @@ class DailyBuyAlertsScheduler:
             try:
                 # Run analysis at 4:15 AM IST (for testing - normally 6:00 AM before market opens)
                 now = datetime.now(pytz.timezone(DEFAULT_TIMEZONE))
-                target_time = now.replace(hour=4, minute=15, second=0, microsecond=0)
                 
-                # If already past 6 AM today, schedule for tomorrow
-                if now > target_time:
-                    target_time += timedelta(days=1)
+                # Only trading days get a fresh scan (no new bars on weekends/holidays)
+                target_time = get_market_hours_service().get_next_session_time(time(4, 15), now)
                 
                 # Calculate seconds until target time
                 wait_seconds = (target_time - now).total_seconds()
@@ -132,6 +152,56 @@ class DailyBuyAlertsScheduler:
                 # Wait 1 hour before retrying on error
                 await asyncio.sleep(3600)
     
+    async def _run_watchlist_digests(self):
+        """Build the shared watchlist digests after each trading day's close"""
+        digest_time = datetime.strptime(WATCHLIST_DIGEST_TIME, '%H:%M').time()
+        while self.is_running:
+            try:
+                now = datetime.now(pytz.timezone(DEFAULT_TIMEZONE))
+                target_time = get_market_hours_service().get_next_session_time(digest_time, now)
+                wait_seconds = (target_time - now).total_seconds()
+                
+                logger.info(f"Watchlist digests scheduled for {target_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+                await asyncio.sleep(wait_seconds)
+                
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(
+                    None, get_watchlist_digest_service().build_digests,
+                    get_watchlist_digest_service().session_day(target_time)
+                )
+                
+            except asyncio.CancelledError:
+                logger.info("Watchlist digest task cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in watchlist digest task: {e}", exc_info=True)
+                # Wait 1 hour before retrying on error
+                await asyncio.sleep(3600)
+    
+    async def _run_exposure_build(self):
+        """Rebuild the correlation / sector exposure matrix after each trading day's close"""
+        build_time = datetime.strptime(EXPOSURE_BUILD_TIME, '%H:%M').time()
+        while self.is_running:
+            try:
+                now = datetime.now(pytz.timezone(DEFAULT_TIMEZONE))
+                target_time = get_market_hours_service().get_next_session_time(build_time, now)
+                wait_seconds = (target_time - now).total_seconds()
+                
+                logger.info(f"Exposure matrix build scheduled for {target_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+                await asyncio.sleep(wait_seconds)
+                
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, get_exposure_service().build)
+                
+            except asyncio.CancelledError:
+                logger.info("Exposure matrix task cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in exposure matrix task: {e}", exc_info=True)
+                # Wait 1 hour before retrying on error
+                await asyncio.sleep(3600)
+    
+    @timed('scheduler.daily_scan')
     async def _analyze_all_stocks(self):
         """
         Analyze all stocks from CSV and save BUY signals to database
@@ -166,6 +236,7 @@ class DailyBuyAlertsScheduler:
                     stocks.append(symbol)
         except Exception as e:
             logger.error(f"Error reading stock tickers CSV: {e}")
+            mark_failed()
             return
         
         logger.info(f"Analyzing {len(stocks)} stocks for BUY signals...")
@@ -179,61 +250,73 @@ class DailyBuyAlertsScheduler:
         errors = 0
         analyzed = 0
         
-        # Analyze each stock
-        for i, symbol in enumerate(stocks, 1):
-            try:
-                # Analyze stock (run in executor since analyze_stock is synchronous)
-                loop = asyncio.get_event_loop()
-                # Use functools.partial to avoid lambda closure issues
-                from functools import partial
-                analysis = await loop.run_in_executor(
-                    None,
-                    partial(
-                        analyze_stock,
-                        symbol=symbol,
-                        mode=mode,
-                        timeframe=timeframe,
-                        horizon=horizon,
-                        use_cache=False
+        # Every result (not just BUYs) goes to the columnar scan archive
+        archive = ScanArchiveWriter(SCAN_ARCHIVE_DIR, 'daily_scan') if ENABLE_SCAN_ARCHIVE else None
+        
+        try:
+            # Analyze each stock
+            for i, symbol in enumerate(stocks, 1):
+                try:
+                    # Analyze stock (run in executor since analyze_stock is synchronous)
+                    loop = asyncio.get_event_loop()
+                    # Use functools.partial to avoid lambda closure issues
+                    from functools import partial
+                    analysis = await loop.run_in_executor(
+                        None,
+                        partial(
+                            analyze_stock,
+                            symbol=symbol,
+                            mode=mode,
+                            timeframe=timeframe,
+                            horizon=horizon,
+                            use_cache=False
+                        )
                     )
-                )
                 
-                analyzed += 1
+                    analyzed += 1
+                    if archive:
+                        archive.add(analysis)
                 
-                # Check if it's a BUY signal
-                recommendation_type = analysis.get('recommendation_type', '')
-                recommendation = analysis.get('recommendation', '')
+                    # Check if it's a BUY signal
+                    recommendation_type = analysis.get('recommendation_type', '')
+                    recommendation = analysis.get('recommendation', '')
                 
-                # Filter for BUY signals (STRONG BUY, BUY, WEAK BUY)
-                # Exclude "AVOID - BUY BLOCKED" and other blocked signals
-                is_buy_signal = (
-                    recommendation_type == 'BUY' and 
-                    'BLOCKED' not in recommendation.upper() and
-                    'AVOID' not in recommendation.upper()
-                )
+                    # Filter for BUY signals (STRONG BUY, BUY, WEAK BUY)
+                    # Exclude "AVOID - BUY BLOCKED" and other blocked signals
+                    is_buy_signal = (
+                        recommendation_type == 'BUY' and 
+                        'BLOCKED' not in recommendation.upper() and
+                        'AVOID' not in recommendation.upper()
+                    )
                 
-                if is_buy_signal:
-                    # Save to database
-                    await self._save_buy_signal(symbol, analysis)
-                    buy_signals.append(symbol)
+                    if is_buy_signal:
+                        # Save to database
+                        await self._save_buy_signal(symbol, analysis)
+                        buy_signals.append(symbol)
                     
-                    if len(buy_signals) % 10 == 0:
-                        logger.info(f"Found {len(buy_signals)} BUY signals so far...")
+                        if len(buy_signals) % 10 == 0:
+                            logger.info(f"Found {len(buy_signals)} BUY signals so far...")
                 
-                # Progress logging
-                if i % 100 == 0:
-                    logger.info(f"Progress: {i}/{len(stocks)} stocks analyzed ({analyzed} successful, {errors} errors)")
+                    # Progress logging
+                    if i % 100 == 0:
+                        logger.info(f"Progress: {i}/{len(stocks)} stocks analyzed ({analyzed} successful, {errors} errors)")
                 
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.1)
+                    # Small delay to avoid rate limiting
+                    await asyncio.sleep(0.1)
                 
-            except Exception as e:
-                errors += 1
-                if errors <= 10:  # Log first 10 errors
-                    logger.warning(f"Error analyzing {symbol}: {e}")
-                continue
+                except Exception as e:
+                    errors += 1
+                    if errors <= 10:  # Log first 10 errors
+                        logger.warning(f"Error analyzing {symbol}: {e}")
+                    continue
+        finally:
+            if archive:
+                archive.close()
+                logger.info(f"Archived {archive.rows} scan results to {SCAN_ARCHIVE_DIR}")
         
         logger.info(f"Daily analysis complete: {len(buy_signals)} BUY signals found from {analyzed} successful analyses ({errors} errors)")
+        if stocks and not analyzed:
+            mark_failed()
         
         # Store summary in database
         with get_db_context() as db:
@@ -245,6 +328,7 @@ class DailyBuyAlertsScheduler:
             db.commit()
             logger.info(f"Cleaned up {deleted} old BUY signals")
     
+    @timed('scheduler.save_signal')
     async def _save_buy_signal(self, symbol: str, analysis: Dict[str, Any]):
         """
         Save BUY signal to database
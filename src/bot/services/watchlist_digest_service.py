@@ -0,0 +1,410 @@
+"""
+Watchlist Digest Service
+After-close snapshot of every watched symbol, shared by all users
+
+Once per trading day, after the close, every distinct symbol on any
+watchlist is analyzed once (all risk modes in one pass) and stored as a
+compact digest together with what changed since the previous digest:
+recommendation changes, EMA and MACD crossings, new patterns and RSI zone
+changes. A user's watchlist view and scheduled watchlist report are then a
+join of their watchlist against the latest digests, so the work scales with
+distinct symbols rather than users x watchlist size.
+
+Author: Harsh Kandhway
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import pytz
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from src.bot.config import (
+    DEFAULT_TIMEZONE, MULTI_ANALYSIS_WORKERS, WATCHLIST_DIGEST_RETENTION_DAYS, WATCHLIST_DIGEST_TIME
+)
+from src.bot.database.db import get_db_context
+from src.bot.database.models import User, Watchlist, WatchlistDigest
+from src.bot.services.analysis_service import analyze_stock_variants, fetch_multiple_stock_data
+from src.bot.services.market_hours_service import get_market_hours_service
+from src.core.config import DEFAULT_HORIZON, TIMEFRAME_CONFIGS
+from src.core.timing import mark_failed, timed
+
+logger = logging.getLogger(__name__)
+
+DIGEST_TIMEFRAME = 'medium'
+PRIMARY_MODE = 'balanced'  # Mode stored in the digest's own recommendation columns
+EMA_KEYS = ('fast', 'medium', 'trend')
+
+
+# =============================================================================
+# SNAPSHOTS AND CHANGES
+# =============================================================================
+
+def build_snapshot(variants: Dict[tuple, Dict[str, Any]], history: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compact digest of one symbol's analysis
+
+    Args:
+        variants: analyze_stock_variants result for DEFAULT_HORIZON
+        history: Daily history the analysis ran on
+
+    Returns:
+        JSON-serializable snapshot
+    """
+    indicators = next(iter(variants.values()))['indicators']
+    closes = history['close']
+    change_pct = (closes.iloc[-1] / closes.iloc[-2] - 1) * 100 if len(closes) > 1 else 0.0
+
+    return {
+        'price': round(float(indicators['current_price']), 2),
+        'change_pct': round(float(change_pct), 2),
+        'modes': {
+            mode: {
+                'recommendation': analysis['recommendation'],
+                'recommendation_type': analysis['recommendation_type'],
+                'confidence': round(float(analysis['confidence']), 1),
+            }
+            for (mode, _), analysis in variants.items()
+        },
+        'rsi': round(float(indicators['rsi']), 1),
+        'rsi_zone': indicators['rsi_zone'],
+        'ema_above': {
+            f"EMA {indicators[f'ema_{key}_period']}": indicators[f'price_vs_{key}_ema'] == 'above'
+            for key in EMA_KEYS
+        },
+        'macd_above_signal': bool(indicators['macd_above_signal']),
+        'ema_alignment': indicators['ema_alignment'],
+        'market_phase': indicators['market_phase'],
+        'patterns': sorted({pattern.name for pattern in indicators.get('all_patterns', [])}),
+        'support': round(float(indicators['support']), 2),
+        'resistance': round(float(indicators['resistance']), 2),
+    }
+
+
+def diff_snapshots(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    What changed between two digests of the same symbol
+
+    Args:
+        previous: Earlier snapshot (None for a symbol's first digest)
+        current: New snapshot
+
+    Returns:
+        List of change dictionaries, each with a 'type' of recommendation,
+        ema_cross, macd_cross, rsi_zone or pattern
+    """
+    if not previous:
+        return []
+
+    changes = []
+    for mode, result in current['modes'].items():
+        before = previous.get('modes', {}).get(mode)
+        if before and before['recommendation'] != result['recommendation']:
+            changes.append({
+                'type': 'recommendation', 'mode': mode,
+                'from': before['recommendation'], 'to': result['recommendation'],
+            })
+
+    for ema, above in current['ema_above'].items():
+        was_above = previous.get('ema_above', {}).get(ema)
+        if was_above is not None and was_above != above:
+            changes.append({'type': 'ema_cross', 'ema': ema, 'direction': 'above' if above else 'below'})
+
+    was_above_signal = previous.get('macd_above_signal')
+    if was_above_signal is not None and was_above_signal != current['macd_above_signal']:
+        changes.append({'type': 'macd_cross', 'direction': 'bullish' if current['macd_above_signal'] else 'bearish'})
+
+    if previous.get('rsi_zone') and previous['rsi_zone'] != current['rsi_zone']:
+        changes.append({'type': 'rsi_zone', 'from': previous['rsi_zone'], 'to': current['rsi_zone']})
+
+    for name in sorted(set(current['patterns']) - set(previous.get('patterns', []))):
+        changes.append({'type': 'pattern', 'name': name})
+
+    return changes
+
+
+def describe_change(change: Dict[str, Any]) -> str:
+    """One-line description of a change (Markdown-safe)"""
+    kind = change['type']
+    if kind == 'recommendation':
+        return f"{change['from']} → {change['to']}"
+    if kind == 'ema_cross':
+        return f"Closed {change['direction']} {change['ema']}"
+    if kind == 'macd_cross':
+        return f"MACD {change['direction']} crossover"
+    if kind == 'rsi_zone':
+        return f"RSI {change['from'].replace('_', ' ')} → {change['to'].replace('_', ' ')}"
+    if kind == 'pattern':
+        return f"New pattern: {change['name']}"
+    return kind
+
+
+def summarize_digest(digest: Dict[str, Any], mode: str = PRIMARY_MODE) -> Dict[str, Any]:
+    """
+    A digest as one user sees it
+
+    Args:
+        digest: Entry from WatchlistDigestService.get_user_digest
+        mode: The user's risk mode
+
+    Returns:
+        Dictionary with digest_date, price, change_pct, recommendation,
+        confidence and highlights (descriptions of changes; other modes' recommendation
+        changes are left out)
+    """
+    snapshot = digest['snapshot']
+    result = snapshot.get('modes', {}).get(mode) or snapshot.get('modes', {}).get(PRIMARY_MODE, {})
+    return {
+        'digest_date': digest['digest_date'],
+        'price': digest['current_price'],
+        'change_pct': digest['change_pct'],
+        'recommendation': result.get('recommendation'),
+        'confidence': result.get('confidence'),
+        'rsi': digest['rsi'],
+        'highlights': [
+            describe_change(change) for change in digest['changes']
+            if change['type'] != 'recommendation' or change['mode'] == mode
+        ],
+    }
+
+
+def _digest_dict(row: WatchlistDigest) -> Dict[str, Any]:
+    return {
+        'symbol': row.symbol,
+        'digest_date': row.digest_date,
+        'current_price': row.current_price,
+        'change_pct': row.change_pct,
+        'recommendation': row.recommendation,
+        'recommendation_type': row.recommendation_type,
+        'confidence': row.confidence,
+        'rsi': row.rsi,
+        'rsi_zone': row.rsi_zone,
+        'snapshot': row.snapshot,
+        'changes': row.changes,
+    }
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+
+class WatchlistDigestService:
+    """Builds the shared after-close digests and joins them per user"""
+
+    def __init__(self, session_factory: Callable = get_db_context, workers: int = MULTI_ANALYSIS_WORKERS):
+        """
+        Initialize digest service
+
+        Args:
+            session_factory: Context manager yielding a database session
+            workers: Threads analyzing symbols
+        """
+        self._session_factory = session_factory
+        self.workers = max(1, workers)
+
+    @staticmethod
+    def session_day(now: Optional[datetime] = None) -> datetime:
+        """Trading day a digest built now belongs to (midnight, exchange time, naive)"""
+        now = now or datetime.now(pytz.timezone(DEFAULT_TIMEZONE))
+        return datetime(now.year, now.month, now.day)
+
+    @staticmethod
+    def current_session_day(now: Optional[datetime] = None) -> datetime:
+        """
+        Trading day of the newest digest that should exist by now
+
+        Today once its digest time (WATCHLIST_DIGEST_TIME) has passed on a
+        trading day, otherwise the previous trading session. Older digests
+        are stale: the after-close build failed or is disabled.
+
+        Args:
+            now: Current time (default: now in DEFAULT_TIMEZONE)
+
+        Returns:
+            Trading day (midnight, exchange time, naive)
+        """
+        tz = pytz.timezone(DEFAULT_TIMEZONE)
+        now = tz.localize(now) if now and now.tzinfo is None else (now or datetime.now(tz)).astimezone(tz)
+        calendar = get_market_hours_service().calendar
+        today = now.date()
+        digest_time = datetime.strptime(WATCHLIST_DIGEST_TIME, '%H:%M').time()
+
+        if calendar.is_trading_day(today) and now >= calendar.session_at(today, digest_time):
+            day = today
+        else:
+            day = calendar.add_trading_days(today, -1)
+        return datetime(day.year, day.month, day.day)
+
+    @timed('digest.build')
+    def build_digests(self, digest_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Analyze every watched symbol once and store the day's digests
+
+        Blocking; run it in an executor from async code. Re-running for the
+        same day replaces that day's digests.
+
+        Args:
+            digest_date: Trading day to store (defaults to today)
+
+        Returns:
+            Dictionary with symbols, stored, failed (symbols) and changes
+        """
+        digest_date = digest_date or self.session_day()
+
+        with self._session_factory() as db:
+            symbols = [symbol for (symbol,) in db.query(Watchlist.symbol).distinct().order_by(Watchlist.symbol)]
+            previous = self._latest_before(db, digest_date)
+
+        stats = {'symbols': len(symbols), 'stored': 0, 'failed': [], 'changes': 0}
+        if not symbols:
+            return stats
+
+        histories = fetch_multiple_stock_data(symbols, TIMEFRAME_CONFIGS[DIGEST_TIMEFRAME]['data_period'])
+
+        def analyze(symbol):
+            history = histories.get(symbol)
+            if history is None:
+                return symbol, None
+            try:
+                variants = analyze_stock_variants(
+                    symbol, DIGEST_TIMEFRAME, horizons=[DEFAULT_HORIZON], history=history
+                )
+                return symbol, build_snapshot(variants, history)
+            except Exception as e:
+                logger.warning(f"Watchlist digest failed for {symbol}: {e}")
+                return symbol, None
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(symbols))) as pool:
+            snapshots = dict(pool.map(analyze, symbols))
+
+        rows = []
+        for symbol, snapshot in snapshots.items():
+            if snapshot is None:
+                stats['failed'].append(symbol)
+                continue
+            primary = snapshot['modes'].get(PRIMARY_MODE) or next(iter(snapshot['modes'].values()))
+            changes = diff_snapshots(previous.get(symbol), snapshot)
+            stats['changes'] += len(changes)
+            row = WatchlistDigest(
+                symbol=symbol,
+                digest_date=digest_date,
+                current_price=snapshot['price'],
+                change_pct=snapshot['change_pct'],
+                recommendation=primary['recommendation'],
+                recommendation_type=primary['recommendation_type'],
+                confidence=primary['confidence'],
+                rsi=snapshot['rsi'],
+                rsi_zone=snapshot['rsi_zone'],
+            )
+            row.snapshot = snapshot
+            row.changes = changes
+            rows.append(row)
+
+        with self._session_factory() as db:
+            db.query(WatchlistDigest).filter(
+                WatchlistDigest.digest_date == digest_date,
+                WatchlistDigest.symbol.in_([row.symbol for row in rows])
+            ).delete(synchronize_session=False)
+            db.add_all(rows)
+            db.query(WatchlistDigest).filter(
+                WatchlistDigest.digest_date < digest_date - timedelta(days=WATCHLIST_DIGEST_RETENTION_DAYS)
+            ).delete(synchronize_session=False)
+            db.commit()
+
+        stats['stored'] = len(rows)
+        if not rows:
+            mark_failed()  # Every symbol failed; count the run as an error
+        logger.info(
+            f"Watchlist digests for {digest_date:%Y-%m-%d}: {stats['stored']}/{stats['symbols']} symbols, "
+            f"{stats['changes']} changes, {len(stats['failed'])} failed"
+        )
+        return stats
+
+    @staticmethod
+    def _latest_before(db: Session, digest_date: datetime) -> Dict[str, Dict[str, Any]]:
+        """Each symbol's most recent snapshot from before digest_date"""
+        latest = db.query(
+            WatchlistDigest.symbol,
+            func.max(WatchlistDigest.digest_date).label('digest_date')
+        ).filter(WatchlistDigest.digest_date < digest_date).group_by(WatchlistDigest.symbol).subquery()
+
+        rows = db.query(WatchlistDigest).join(latest, and_(
+            WatchlistDigest.symbol == latest.c.symbol,
+            WatchlistDigest.digest_date == latest.c.digest_date
+        ))
+        return {row.symbol: row.snapshot for row in rows}
+
+    def get_user_digest(self, db: Session, telegram_id: int, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        A user's watchlist joined with the latest digests
+
+        Args:
+            db: Database session
+            telegram_id: Telegram user ID
+            now: Current time for the staleness check (default: now)
+
+        Returns:
+            Dictionary with digest_date (None if no current digest exists;
+            digests older than the last trading session are ignored),
+            entries (digest dicts in watchlist order) and missing (watched
+            symbols without a digest for that day)
+        """
+        digest_date = db.query(func.max(WatchlistDigest.digest_date)).filter(
+            WatchlistDigest.digest_date >= self.current_session_day(now)
+        ).scalar()
+
+        rows = db.query(Watchlist.symbol, WatchlistDigest).join(
+            User, Watchlist.user_id == User.id
+        ).outerjoin(WatchlistDigest, and_(
+            WatchlistDigest.symbol == Watchlist.symbol,
+            WatchlistDigest.digest_date == digest_date
+        )).filter(User.telegram_id == telegram_id).order_by(Watchlist.added_at.desc()).all()
+
+        return {
+            'digest_date': digest_date,
+            'entries': [_digest_dict(digest) for _, digest in rows if digest is not None],
+            'missing': [symbol for symbol, digest in rows if digest is None],
+        }
+
+    def get_user_summaries(
+        self,
+        db: Session,
+        telegram_id: int,
+        mode: str = PRIMARY_MODE,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Symbol -> summarize_digest output for a user's watchlist
+
+        Args:
+            db: Database session
+            telegram_id: Telegram user ID
+            mode: The user's risk mode
+            now: Current time for the staleness check (default: now)
+
+        Returns:
+            Summaries for the watched symbols that have a current digest
+        """
+        digest = self.get_user_digest(db, telegram_id, now)
+        return {entry['symbol']: summarize_digest(entry, mode) for entry in digest['entries']}
+
+
+# Global service instance
+_digest_service: Optional[WatchlistDigestService] = None
+
+
+def get_watchlist_digest_service() -> WatchlistDigestService:
+    """
+    Get or create the watchlist digest service
+
+    Returns:
+        WatchlistDigestService instance
+    """
+    global _digest_service
+    if _digest_service is None:
+        _digest_service = WatchlistDigestService()
+    return _digest_service
@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 from src.bot.config import EMOJI, MAX_MESSAGE_LENGTH, CURRENCY_SYMBOL
+from src.core.rendering import chunk_text
 
 
 def escape_markdown(text: str) -> str:
@@ -73,24 +74,7 @@ def chunk_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> List[str]:
     Returns:
         List of message chunks
     """
-    if len(text) <= max_length:
-        return [text]
-    
-    chunks = []
-    current_chunk = ""
-    
-    for line in text.split('\n'):
-        if len(current_chunk) + len(line) + 1 <= max_length:
-            current_chunk += line + '\n'
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.rstrip())
-            current_chunk = line + '\n'
-    
-    if current_chunk:
-        chunks.append(current_chunk.rstrip())
-    
-    return chunks
+    return chunk_text(text, max_length)
 
 
 def format_analysis_summary(analysis: Dict[str, Any]) -> str:
@@ -168,7 +152,7 @@ def format_analysis_full(analysis: Dict[str, Any]) -> str:
         emoji = EMOJI['hold']
     
     # Header
-    message = f"""
+    parts = [f"""
 {'='*40}
 {EMOJI['chart']} **{symbol} - ANALYSIS**
 Mode: {mode} | Timeframe: {timeframe}
@@ -176,39 +160,40 @@ Mode: {mode} | Timeframe: {timeframe}
 
 {EMOJI['money']} **Current Price:** {CURRENCY_SYMBOL}{format_number(price)}
 
-"""
+"""]
+    add = parts.append
     
     # Market Regime
     phase = indicators['market_phase'].replace('_', ' ').title()
     adx = indicators['adx']
     trend_strength = indicators['adx_strength'].replace('_', ' ').title()
     
-    message += f"""
+    add(f"""
 {EMOJI['info']} **Market Regime**
 {'-'*40}
 Phase: {phase}
 Trend Strength: {trend_strength} (ADX: {format_number(adx, 1)})
 
-"""
+""")
     
     # Key Indicators
     rsi = indicators['rsi']
     macd_hist = indicators['macd_hist']
     volume_ratio = indicators['volume_ratio']
     
-    message += f"""
+    add(f"""
 {EMOJI['chart']} **Key Indicators**
 {'-'*40}
 RSI ({indicators['rsi_period']}): {format_number(rsi, 1)} - {indicators['rsi_zone'].replace('_', ' ').title()}
 MACD Histogram: {format_number(macd_hist, 4)}
 Volume Ratio: {format_number(volume_ratio, 2)}x average
-"""
+""")
     
     # Divergence warning if present
     if indicators['divergence'] != 'none':
         div_emoji = EMOJI['warning']
         div_text = indicators['divergence'].upper()
-        message += f"\n{div_emoji} **{div_text} DIVERGENCE DETECTED**"
+        add(f"\n{div_emoji} **{div_text} DIVERGENCE DETECTED**")
     
     # Chart Pattern Analysis
     strongest_pattern = indicators.get('strongest_pattern')
@@ -217,13 +202,13 @@ Volume Ratio: {format_number(volume_ratio, 2)}x average
     bearish_count = indicators.get('pattern_bearish_count', 0)
     
     if strongest_pattern or bullish_count > 0 or bearish_count > 0:
-        message += f"""
+        add(f"""
 
 📊 **Chart Patterns**
 {'-'*40}
 Pattern Bias: {pattern_bias.upper()}
 Bullish Patterns: {bullish_count} | Bearish Patterns: {bearish_count}
-"""
+""")
         if strongest_pattern and hasattr(strongest_pattern, 'name'):
             try:
                 p_name = getattr(strongest_pattern, 'name', 'Unknown')
@@ -232,32 +217,32 @@ Bullish Patterns: {bullish_count} | Bearish Patterns: {bearish_count}
                 p_strength = strongest_pattern.strength.value.upper() if hasattr(strongest_pattern, 'strength') and hasattr(strongest_pattern.strength, 'value') else 'UNKNOWN'
                 p_action = getattr(strongest_pattern, 'action', 'Check chart')
                 
-                message += f"""
+                add(f"""
 Key Pattern: **{p_name}** ({p_conf}%)
 Type: {p_type} | Strength: {p_strength}
 Action: {p_action}
-"""
+""")
             except Exception:
-                message += "\nKey Pattern: Pattern detected (check chart)\n"
+                add("\nKey Pattern: Pattern detected (check chart)\n")
     
-    message += "\n"
+    add("\n")
     
     # Recommendation Box
-    message += f"""
+    add(f"""
 {'='*40}
 {EMOJI['target']} **RECOMMENDATION**
 {'='*40}
 {emoji} **{recommendation}**
 Confidence: {format_number(confidence, 0)}% ({confidence_level})
 
-"""
+""")
     
     # Hard filter warnings
     if analysis['is_buy_blocked']:
-        message += f"{EMOJI['warning']} **BUY BLOCKED:**\n"
+        add(f"{EMOJI['warning']} **BUY BLOCKED:**\n")
         for reason in analysis['buy_block_reasons'][:2]:  # Limit to 2 reasons
-            message += f"• {reason}\n"
-        message += "\n"
+            add(f"• {reason}\n")
+        add("\n")
     
     # Targets and Stop Loss
     target = target_data['recommended_target']
@@ -265,7 +250,7 @@ Confidence: {format_number(confidence, 0)}% ({confidence_level})
     stop = stop_data['recommended_stop']
     stop_pct = stop_data['recommended_stop_pct']
     
-    message += f"""
+    add(f"""
 {EMOJI['target']} **TARGETS**
 {'-'*40}
 Target: {CURRENCY_SYMBOL}{format_number(target)} ({format_percentage(target_pct)})
@@ -278,30 +263,30 @@ Stop: {CURRENCY_SYMBOL}{format_number(stop)} ({format_percentage(-stop_pct)})
 {EMOJI['info']} **RISK/REWARD**
 {'-'*40}
 Ratio: {format_number(risk_reward, 2)}:1
-"""
+""")
     
     if rr_valid:
-        message += f"{EMOJI['success']} Meets minimum requirements\n"
+        add(f"{EMOJI['success']} Meets minimum requirements\n")
     else:
-        message += f"{EMOJI['warning']} Below minimum threshold\n"
+        add(f"{EMOJI['warning']} Below minimum threshold\n")
     
-    message += "\n"
+    add("\n")
     
     # Key Reasoning (top 3)
-    message += f"""
+    add(f"""
 {EMOJI['info']} **KEY POINTS**
 {'-'*40}
-"""
+""")
     for i, reason in enumerate(analysis['reasoning'][:3], 1):
         # Shorten reason if too long
         if len(reason) > 80:
             reason = reason[:77] + "..."
-        message += f"{i}. {reason}\n"
+        add(f"{i}. {reason}\n")
     
-    message += f"\n{'='*40}\n"
-    message += f"\n*Developed by Harsh Kandhway*\n"
+    add(f"\n{'='*40}\n")
+    add(f"\n*Developed by Harsh Kandhway*\n")
     
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_comparison_table(analyses: List[Dict[str, Any]]) -> str:
@@ -314,11 +299,12 @@ def format_comparison_table(analyses: List[Dict[str, Any]]) -> str:
     Returns:
         Formatted comparison table
     """
-    message = f"""
+    parts = [f"""
 {EMOJI['compare']} **STOCK COMPARISON**
 {'='*40}
 
-"""
+"""]
+    add = parts.append
     
     for analysis in analyses:
         symbol = analysis['symbol']
@@ -335,17 +321,17 @@ def format_comparison_table(analyses: List[Dict[str, Any]]) -> str:
         else:
             emoji = EMOJI['hold']
         
-        message += f"""
+        add(f"""
 **{symbol}**
 Price: {CURRENCY_SYMBOL}{format_number(price)} | {emoji} {rec}
 Confidence: {format_number(conf, 0)}% | R:R: {format_number(rr, 2)}:1
 {'-'*40}
 
-"""
+""")
     
-    message += f"\n*Developed by Harsh Kandhway*\n"
+    add(f"\n*Developed by Harsh Kandhway*\n")
     
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_watchlist(watchlist: List, show_details: bool = False) -> str:
@@ -362,11 +348,12 @@ def format_watchlist(watchlist: List, show_details: bool = False) -> str:
     if not watchlist:
         return f"{EMOJI['info']} Your watchlist is empty.\n\nUse /watchlist add [SYMBOL] to add stocks."
     
-    message = f"""
+    parts = [f"""
 {EMOJI['watchlist']} **YOUR WATCHLIST** ({len(watchlist)} stocks)
 {'='*40}
 
-"""
+"""]
+    add = parts.append
     
     for item in watchlist:
         # Handle both Watchlist objects and dictionaries
@@ -382,18 +369,18 @@ def format_watchlist(watchlist: List, show_details: bool = False) -> str:
             added_at = getattr(item, 'added_at', None)
             notes = getattr(item, 'notes', None)
         
-        message += f"{EMOJI['chart']} **{symbol}**\n"
+        add(f"{EMOJI['chart']} **{symbol}**\n")
         
         if show_details and added_at:
             added_date = added_at.strftime('%b %d, %Y') if isinstance(added_at, datetime) else added_at
-            message += f"   Added: {added_date}\n"
+            add(f"   Added: {added_date}\n")
         
         if show_details and notes:
-            message += f"   Notes: {notes}\n"
+            add(f"   Notes: {notes}\n")
         
-        message += "\n"
+        add("\n")
     
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_alert(alert) -> str:
@@ -460,17 +447,18 @@ def format_alert_list(alerts: List[Dict]) -> str:
     if not alerts:
         return f"{EMOJI['info']} You have no active alerts.\n\nUse /alert to set up alerts."
     
-    message = f"""
+    parts = [f"""
 {EMOJI['alert']} **YOUR ALERTS** ({len(alerts)} active)
 {'='*40}
 
-"""
+"""]
+    add = parts.append
     
     for alert in alerts:
-        message += format_alert(alert) + "\n"
-        message += f"{'-'*40}\n\n"
+        add(format_alert(alert) + "\n")
+        add(f"{'-'*40}\n\n")
     
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_portfolio(portfolio: List[Dict], current_prices: Optional[Dict[str, float]] = None) -> str:
@@ -487,11 +475,12 @@ def format_portfolio(portfolio: List[Dict], current_prices: Optional[Dict[str, f
     if not portfolio:
         return f"{EMOJI['info']} Your portfolio is empty.\n\nUse /portfolio add [SYMBOL] [SHARES] [PRICE] to add positions."
     
-    message = f"""
+    parts = [f"""
 {EMOJI['portfolio']} **YOUR PORTFOLIO** ({len(portfolio)} positions)
 {'='*40}
 
-"""
+"""]
+    add = parts.append
     
     total_investment = 0
     total_current_value = 0
@@ -504,10 +493,10 @@ def format_portfolio(portfolio: List[Dict], current_prices: Optional[Dict[str, f
         
         total_investment += investment
         
-        message += f"{EMOJI['chart']} **{symbol}**\n"
-        message += f"   Shares: {format_number(shares, 2)}\n"
-        message += f"   Avg Price: {CURRENCY_SYMBOL}{format_number(avg_price)}\n"
-        message += f"   Investment: {CURRENCY_SYMBOL}{format_number(investment)}\n"
+        add(f"{EMOJI['chart']} **{symbol}**\n")
+        add(f"   Shares: {format_number(shares, 2)}\n")
+        add(f"   Avg Price: {CURRENCY_SYMBOL}{format_number(avg_price)}\n")
+        add(f"   Investment: {CURRENCY_SYMBOL}{format_number(investment)}\n")
         
         # If current prices provided, calculate P&L
         if current_prices and symbol in current_prices:
@@ -519,11 +508,11 @@ def format_portfolio(portfolio: List[Dict], current_prices: Optional[Dict[str, f
             total_current_value += current_value
             
             pnl_emoji = EMOJI['profit'] if pnl >= 0 else EMOJI['loss']
-            message += f"   Current: {CURRENCY_SYMBOL}{format_number(current_price)}\n"
-            message += f"   Value: {CURRENCY_SYMBOL}{format_number(current_value)}\n"
-            message += f"   P&L: {pnl_emoji} {CURRENCY_SYMBOL}{format_number(pnl)} ({format_percentage(pnl_pct)})\n"
+            add(f"   Current: {CURRENCY_SYMBOL}{format_number(current_price)}\n")
+            add(f"   Value: {CURRENCY_SYMBOL}{format_number(current_value)}\n")
+            add(f"   P&L: {pnl_emoji} {CURRENCY_SYMBOL}{format_number(pnl)} ({format_percentage(pnl_pct)})\n")
         
-        message += "\n"
+        add("\n")
     
     # Portfolio Summary
     if current_prices and total_current_value > 0:
@@ -531,16 +520,16 @@ def format_portfolio(portfolio: List[Dict], current_prices: Optional[Dict[str, f
         total_pnl_pct = (total_pnl / total_investment) * 100
         pnl_emoji = EMOJI['profit'] if total_pnl >= 0 else EMOJI['loss']
         
-        message += f"""
+        add(f"""
 {'='*40}
 {EMOJI['info']} **PORTFOLIO SUMMARY**
 {'='*40}
 Total Investment: {CURRENCY_SYMBOL}{format_number(total_investment)}
 Current Value: {CURRENCY_SYMBOL}{format_number(total_current_value)}
 Total P&L: {pnl_emoji} {CURRENCY_SYMBOL}{format_number(total_pnl)} ({format_percentage(total_pnl_pct)})
-"""
+""")
     
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_error(error_message: str, command: Optional[str] = None) -> str:
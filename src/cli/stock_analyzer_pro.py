@@ -18,6 +18,7 @@ Usage:
     python stock_analyzer_pro.py SYMBOL1 SYMBOL2 ...
     python stock_analyzer_pro.py RELIANCE.NS --horizon 3months
     python stock_analyzer_pro.py TCS.NS --horizon 1month --capital 50000
+    python stock_analyzer_pro.py --screen --sector Healthcare --cap "Large Cap" --workers 8
 
 Author: Harsh Kandhway
 Version: 3.0 (Beginner-Friendly Edition)
@@ -25,8 +26,12 @@ Version: 3.0 (Beginner-Friendly Edition)
 
 import sys
 import os
+import csv
+import json
 import argparse
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional, TextIO, Tuple
 from datetime import datetime
 
 import pandas as pd
@@ -36,9 +41,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.core.config import (
     DEFAULT_MODE, DEFAULT_TIMEFRAME, DEFAULT_TICKERS, DEFAULT_HORIZON,
-    TIMEFRAME_CONFIGS, RISK_MODES, CURRENCY_SYMBOL, INVESTMENT_HORIZONS
+    TIMEFRAME_CONFIGS, RISK_MODES, CURRENCY_SYMBOL, INVESTMENT_HORIZONS,
+    DEFAULT_ALLOCATION_METHOD, MAX_POSITION_PCT
 )
+from src.core.allocation import ALLOCATION_METHODS
 from src.core.indicators import calculate_all_indicators
+from src.core.scan_archive import ScanArchiveWriter
 from src.core.signals import (
     check_hard_filters, calculate_all_signals, get_confidence_level,
     determine_recommendation, generate_reasoning, generate_action_plan
@@ -64,55 +72,70 @@ def print_welcome():
     print("=" * 60)
 
 
-def fetch_data(symbol: str, period: str = '1y') -> pd.DataFrame:
-    """Fetch historical data from Yahoo Finance"""
+def load_history(symbol: str, period: str = '1y') -> pd.DataFrame:
+    """
+    Fetch and validate daily history from Yahoo Finance
+
+    Args:
+        symbol: Stock ticker symbol
+        period: Data period
+
+    Returns:
+        DataFrame with OHLCV data
+
+    Raises:
+        ValueError: If the symbol is invalid or no usable data is returned
+    """
     if not symbol or not isinstance(symbol, str):
-        print(f"  ❌ Error: Invalid symbol '{symbol}'")
-        return pd.DataFrame()
+        raise ValueError(f"Invalid symbol '{symbol}'")
     
     try:
         ticker = Ticker(symbol)
         df = ticker.history(period=period, interval='1d')
-        
-        if isinstance(df, str):
-            print(f"  ❌ Error fetching {symbol}: {df}")
-            return pd.DataFrame()
-        
-        if not isinstance(df, pd.DataFrame):
-            print(f"  ❌ Error: Unexpected data type for {symbol}")
-            return pd.DataFrame()
-        
-        if df.empty:
-            print(f"  ⚠️ No data available for {symbol}")
-            return pd.DataFrame()
-        
-        required_columns = ['close', 'high', 'low', 'open']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            print(f"  ❌ Missing data columns for {symbol}")
-            return pd.DataFrame()
-        
-        if len(df) < 50:
-            print(f"  ⚠️ Limited data for {symbol} - results may be less accurate")
-        
-        if df['close'].isna().all():
-            print(f"  ❌ No valid price data for {symbol}")
-            return pd.DataFrame()
-        
-        if isinstance(df.index, pd.MultiIndex):
-            df = df.reset_index(level=0, drop=True)
-        
-        if not isinstance(df.index, pd.DatetimeIndex):
-            try:
-                df.index = pd.to_datetime(df.index)
-            except (ValueError, TypeError):
-                pass
-        
-        return df
-        
     except Exception as e:
-        print(f"  ❌ Error fetching {symbol}: {e}")
+        raise ValueError(f"Error fetching {symbol}: {e}")
+    
+    if isinstance(df, str):
+        raise ValueError(f"Error fetching {symbol}: {df}")
+    
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"Unexpected data type for {symbol}")
+    
+    if df.empty:
+        raise ValueError(f"No data available for {symbol}")
+    
+    required_columns = ['close', 'high', 'low', 'open']
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing data columns for {symbol}")
+    
+    if df['close'].isna().all():
+        raise ValueError(f"No valid price data for {symbol}")
+    
+    if isinstance(df.index, pd.MultiIndex):
+        df = df.reset_index(level=0, drop=True)
+    
+    if not isinstance(df.index, pd.DatetimeIndex):
+        try:
+            df.index = pd.to_datetime(df.index)
+        except (ValueError, TypeError):
+            pass
+    
+    return df
+
+
+def fetch_data(symbol: str, period: str = '1y') -> pd.DataFrame:
+    """Fetch historical data from Yahoo Finance"""
+    try:
+        df = load_history(symbol, period)
+    except ValueError as e:
+        print(f"  ❌ Error: {e}")
         return pd.DataFrame()
+    
+    if len(df) < 50:
+        print(f"  ⚠️ Limited data for {symbol} - results may be less accurate")
+    
+    return df
 
 
 def analyze_stock(
@@ -385,6 +408,266 @@ def select_horizon_interactive() -> str:
         return '3months'
 
 
+# ============================================================================
+# HEADLESS SCREENER
+# ============================================================================
+
+ENHANCED_UNIVERSE_FILE = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'stock_tickers_enhanced.csv'
+)
+
+SCREEN_FIELDS = [
+    'symbol', 'sector', 'market_cap', 'recommendation_type', 'confidence',
+    'risk_reward', 'rr_valid', 'price', 'target', 'stop_loss', 'safety_stars', 'error',
+]
+
+SCREEN_FORMATS = ('jsonl', 'csv')
+
+
+def load_universe(
+    path: Optional[str] = None,
+    sectors: Optional[List[str]] = None,
+    market_caps: Optional[List[str]] = None,
+    include_etf: Optional[bool] = False
+) -> List[Dict]:
+    """
+    Load the symbols to screen from a universe file
+    
+    CSV files need a 'ticker' column; sector, market cap and ETF filters
+    apply when the matching columns exist (as in the enhanced ticker CSV).
+    Any other file is read as one symbol per line with '#' comments.
+    
+    Args:
+        path: Universe file (defaults to data/stock_tickers_enhanced.csv)
+        sectors: Sectors to keep (case-insensitive)
+        market_caps: Market cap buckets to keep (case-insensitive)
+        include_etf: True for ETFs only, False for stocks only, None for both
+    
+    Returns:
+        List of dicts with 'ticker', 'sector' and 'market_cap'
+    """
+    path = path or ENHANCED_UNIVERSE_FILE
+    
+    if path.lower().endswith('.csv'):
+        df = pd.read_csv(path)
+        if 'ticker' not in df.columns:
+            raise ValueError(f"{path} has no 'ticker' column")
+        
+        if sectors and 'sector' in df.columns:
+            wanted = {s.lower() for s in sectors}
+            df = df[df['sector'].astype(str).str.lower().isin(wanted)]
+        
+        if market_caps and 'market_cap' in df.columns:
+            wanted = {c.lower() for c in market_caps}
+            df = df[df['market_cap'].astype(str).str.lower().isin(wanted)]
+        
+        if include_etf is not None and 'is_etf' in df.columns:
+            is_etf = df['is_etf'].astype(str).str.lower() == 'true'
+            df = df[is_etf] if include_etf else df[~is_etf]
+        
+        stocks = [
+            {
+                'ticker': row['ticker'],
+                'sector': row.get('sector'),
+                'market_cap': row.get('market_cap'),
+            }
+            for row in df.to_dict('records')
+        ]
+    else:
+        with open(path, encoding='utf-8') as f:
+            lines = [line.split('#', 1)[0].strip() for line in f]
+        stocks = [{'ticker': line, 'sector': None, 'market_cap': None} for line in lines if line]
+    
+    # Normalise and de-duplicate while keeping file order
+    seen = set()
+    universe = []
+    for stock in stocks:
+        ticker = str(stock['ticker']).strip().upper()
+        if ticker and ticker not in seen:
+            seen.add(ticker)
+            universe.append({**stock, 'ticker': ticker})
+    
+    return universe
+
+
+def build_screen_row(stock: Dict, analysis: Optional[Dict] = None, error: Optional[str] = None) -> Dict:
+    """
+    Build the compact one-line result for a screened symbol
+    
+    Args:
+        stock: Universe entry with 'ticker', 'sector' and 'market_cap'
+        analysis: Result of analyze_stock, if the symbol was analyzed
+        error: Error message, if fetching or analysis failed
+    
+    Returns:
+        Dict keyed by SCREEN_FIELDS
+    """
+    row = dict.fromkeys(SCREEN_FIELDS)
+    row['symbol'] = stock['ticker']
+    row['sector'] = stock.get('sector')
+    row['market_cap'] = stock.get('market_cap')
+    row['error'] = error
+    
+    if analysis is not None:
+        row['recommendation_type'] = analysis['recommendation_type']
+        row['confidence'] = round(float(analysis['confidence']), 1)
+        row['risk_reward'] = round(float(analysis['risk_reward']), 2)
+        row['rr_valid'] = bool(analysis['rr_valid'])
+        row['price'] = round(float(analysis['current_price']), 2)
+        row['target'] = round(float(analysis['target']), 2)
+        row['stop_loss'] = round(float(analysis['stop_loss']), 2)
+        row['safety_stars'] = analysis.get('safety_score', {}).get('stars')
+    
+    return row
+
+
+class ScreenWriter:
+    """Streams screener rows as JSON Lines or CSV, flushing every row"""
+    
+    def __init__(self, stream: TextIO, fmt: str = 'jsonl'):
+        if fmt not in SCREEN_FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        self.rows = 0
+        self._csv = csv.DictWriter(stream, fieldnames=SCREEN_FIELDS) if fmt == 'csv' else None
+    
+    def write(self, row: Dict):
+        """Write one row and flush so consumers see it immediately"""
+        if self._csv is not None:
+            if self.rows == 0:
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + '\n')
+        self.stream.flush()
+        self.rows += 1
+
+
+def screen_symbol(
+    stock: Dict,
+    mode: str,
+    timeframe: str,
+    horizon: str,
+    data_period: str
+) -> Tuple[Optional[Dict], Dict]:
+    """
+    Fetch and analyze one universe entry without printing
+    
+    Returns:
+        Tuple of (analysis or None, compact row)
+    """
+    try:
+        df = load_history(stock['ticker'], data_period)
+        analysis = analyze_stock(stock['ticker'], df, mode, timeframe, horizon)
+    except Exception as e:
+        return None, build_screen_row(stock, error=str(e))
+    
+    analysis['sector'] = stock.get('sector')
+    analysis['market_cap'] = stock.get('market_cap')
+    return analysis, build_screen_row(stock, analysis)
+
+
+def run_screen(
+    stocks: List[Dict],
+    writer: ScreenWriter,
+    mode: str = DEFAULT_MODE,
+    horizon: str = DEFAULT_HORIZON,
+    workers: int = 4,
+    archive: Optional[ScanArchiveWriter] = None
+) -> List[Dict]:
+    """
+    Screen a universe with parallel workers, streaming rows as they finish
+    
+    Rows are written in completion order from the calling thread, so the
+    writer never needs locking. Ctrl+C cancels pending symbols and returns
+    what has been analyzed so far.
+    
+    Args:
+        stocks: Universe entries from load_universe
+        writer: Destination for the compact rows
+        mode: Risk mode
+        horizon: Investment horizon
+        workers: Number of worker threads
+        archive: Scan archive that also receives every successful analysis
+    
+    Returns:
+        List of successful analyses
+    """
+    horizon_config = INVESTMENT_HORIZONS[horizon]
+    timeframe = horizon_config['timeframe_key']
+    data_period = horizon_config['data_period']
+    
+    analyses = []
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = [
+            executor.submit(screen_symbol, stock, mode, timeframe, horizon, data_period)
+            for stock in stocks
+        ]
+        for future in as_completed(futures):
+            analysis, row = future.result()
+            writer.write(row)
+            if analysis is not None:
+                analyses.append(analysis)
+                if archive is not None:
+                    archive.add(analysis)
+    except KeyboardInterrupt:
+        print(f"\n  ⚠️ Interrupted - screened {writer.rows}/{len(stocks)} symbols", file=sys.stderr)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return analyses
+
+
+def main_screen(args: argparse.Namespace):
+    """Run the non-interactive screener from parsed arguments"""
+    horizon = args.horizon or DEFAULT_HORIZON
+    include_etf = {'exclude': False, 'only': True, 'include': None}[args.etf]
+    
+    if args.universe:
+        stocks = load_universe(args.universe, args.sector, args.cap, include_etf)
+    elif args.symbols:
+        tickers = dict.fromkeys(s.strip().upper() for s in args.symbols if s.strip())
+        stocks = [{'ticker': t, 'sector': None, 'market_cap': None} for t in tickers]
+    else:
+        stocks = load_universe(None, args.sector, args.cap, include_etf)
+    
+    if not stocks:
+        print("  ❌ No symbols matched the screen filters", file=sys.stderr)
+        return
+    
+    to_stdout = args.output in (None, '-')
+    stream = sys.stdout if to_stdout else open(args.output, 'w', newline='', encoding='utf-8')
+    archive = ScanArchiveWriter(args.archive, 'screen') if args.archive else None
+    try:
+        analyses = run_screen(
+            stocks, ScreenWriter(stream, args.format), args.mode, horizon, args.workers, archive
+        )
+    except BrokenPipeError:
+        # Downstream reader (e.g. `head`) has gone away; stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    finally:
+        if not to_stdout:
+            stream.close()
+        if archive is not None:
+            archive.close()
+    
+    if not analyses:
+        print("  ❌ No symbols could be analyzed", file=sys.stderr)
+        return
+    
+    # Keep the streamed rows machine-readable; tables go to stderr then
+    top = sorted(analyses, key=lambda a: a['confidence'], reverse=True)[:args.top]
+    with redirect_stdout(sys.stderr if to_stdout else sys.stdout):
+        print(f"\n  Screened {len(stocks)} symbols - {len(analyses)} analyzed, "
+              f"top {len(top)} by confidence:")
+        print_summary_table(top)
+        if args.compare:
+            print_portfolio_ranking(top)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -396,13 +679,16 @@ Examples:
   python stock_analyzer_pro.py TCS.NS --horizon 3months
   python stock_analyzer_pro.py INFY.NS --horizon 1month --capital 50000
   python stock_analyzer_pro.py SILVERBEES.NS GOLDBEES.NS --compare
+  python stock_analyzer_pro.py --screen --sector "Financial Services" --workers 8 > signals.jsonl
+  python stock_analyzer_pro.py --screen --universe watchlist.txt --format csv -o out.csv
+  python stock_analyzer_pro.py --screen --archive data/scan_archive > /dev/null
         """
     )
     
     parser.add_argument(
         'symbols',
         nargs='*',
-        default=DEFAULT_TICKERS,
+        default=None,
         help='Stock symbols to analyze (e.g., RELIANCE.NS TCS.NS)'
     )
     
@@ -433,6 +719,20 @@ Examples:
         help='Compare multiple stocks and rank them'
     )
     
+    parser.add_argument(
+        '--allocation',
+        choices=ALLOCATION_METHODS,
+        default=DEFAULT_ALLOCATION_METHOD,
+        help=f'How --compare splits --capital (default: {DEFAULT_ALLOCATION_METHOD})'
+    )
+    
+    parser.add_argument(
+        '--max-position-pct',
+        type=float,
+        default=MAX_POSITION_PCT,
+        help=f'Largest allocation to one stock, in %% of capital (default: {MAX_POSITION_PCT:g})'
+    )
+    
     parser.add_argument(
         '--simple', '-s',
         action='store_true',
@@ -446,8 +746,82 @@ Examples:
         help='Show advanced technical details'
     )
     
+    screen = parser.add_argument_group('screener (non-interactive)')
+    
+    screen.add_argument(
+        '--screen',
+        action='store_true',
+        help='Screen a universe in parallel and stream one result per line'
+    )
+    
+    screen.add_argument(
+        '--universe', '-u',
+        default=None,
+        help='Universe file: CSV with a ticker column or one symbol per line '
+             '(default: symbols given, else data/stock_tickers_enhanced.csv)'
+    )
+    
+    screen.add_argument(
+        '--sector',
+        nargs='+',
+        default=None,
+        help='Only screen these sectors (CSV universes)'
+    )
+    
+    screen.add_argument(
+        '--cap',
+        nargs='+',
+        default=None,
+        help='Only screen these market caps, e.g. "Large Cap" (CSV universes)'
+    )
+    
+    screen.add_argument(
+        '--etf',
+        choices=['exclude', 'include', 'only'],
+        default='exclude',
+        help='ETF handling for CSV universes (default: exclude)'
+    )
+    
+    screen.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=4,
+        help='Parallel workers (default: 4)'
+    )
+    
+    screen.add_argument(
+        '--format', '-f',
+        choices=list(SCREEN_FORMATS),
+        default='jsonl',
+        help='Streamed row format (default: jsonl)'
+    )
+    
+    screen.add_argument(
+        '--output', '-o',
+        default=None,
+        help='Write rows to this file instead of stdout'
+    )
+    
+    screen.add_argument(
+        '--archive',
+        default=None,
+        metavar='DIR',
+        help='Also append every analysis to the scan archive in DIR'
+    )
+    
+    screen.add_argument(
+        '--top',
+        type=int,
+        default=20,
+        help='Analyses shown in the closing tables (default: 20)'
+    )
+    
     args = parser.parse_args()
     
+    if args.screen:
+        main_screen(args)
+        return
+    
     # Print welcome
     print_welcome()
     
@@ -468,15 +842,17 @@ Examples:
     data_period = horizon_config['data_period']
     
     # Validate symbols
-    if not args.symbols:
+    symbols = args.symbols or DEFAULT_TICKERS
+    if not symbols:
         print("\n  ❌ No stocks specified. Please provide stock symbols.")
         print("  Example: python stock_analyzer_pro.py RELIANCE.NS TCS.NS")
         return
     
     # Analyze each stock
     analyses = []
+    histories = {}
     
-    for symbol in args.symbols:
+    for symbol in symbols:
         if not symbol or len(symbol.strip()) == 0:
             continue
         
@@ -492,6 +868,7 @@ Examples:
         try:
             analysis = analyze_stock(symbol, df, args.mode, timeframe, horizon)
             analyses.append(analysis)
+            histories[symbol] = df
         except ValueError as e:
             print(f"  ❌ Error analyzing {symbol}: {e}")
             continue
@@ -525,7 +902,12 @@ Examples:
             print_portfolio_ranking(analyses)
             
             if capital:
-                allocation_data = calculate_portfolio_allocation(analyses, capital, args.mode)
+                allocation_data = calculate_portfolio_allocation(
+                    analyses, capital, args.mode,
+                    histories=histories,
+                    method=args.allocation,
+                    max_position_pct=args.max_position_pct
+                )
                 print_portfolio_allocation(allocation_data, capital)
 
 
@@ -2,24 +2,42 @@
 Core analysis modules for stock market analysis
 """
 
-from .config import (
-    DEFAULT_MODE, DEFAULT_TIMEFRAME, DEFAULT_TICKERS,
-    TIMEFRAME_CONFIGS, RISK_MODES, CURRENCY_SYMBOL
-)
-from .indicators import calculate_all_indicators
-from .signals import (
-    check_hard_filters, calculate_all_signals, get_confidence_level,
-    determine_recommendation, generate_reasoning, generate_action_plan
-)
-from .risk_management import (
-    calculate_targets, calculate_stoploss, validate_risk_reward,
-    calculate_trailing_stops, calculate_position_size,
-    generate_no_trade_explanation, calculate_portfolio_allocation
-)
-from .output import (
-    print_full_report, print_summary_table, print_portfolio_ranking,
-    print_portfolio_allocation, print_disclaimer
-)
+import importlib
+
+# Names re-exported from submodules. They are resolved on first access so
+# that importing a light submodule (e.g. src.core.timing) does not pull in
+# pandas and the whole analysis stack.
+_EXPORTS = {
+    'config': (
+        'DEFAULT_MODE', 'DEFAULT_TIMEFRAME', 'DEFAULT_TICKERS',
+        'TIMEFRAME_CONFIGS', 'RISK_MODES', 'CURRENCY_SYMBOL'
+    ),
+    'indicators': ('calculate_all_indicators',),
+    'signals': (
+        'check_hard_filters', 'calculate_all_signals', 'get_confidence_level',
+        'determine_recommendation', 'generate_reasoning', 'generate_action_plan'
+    ),
+    'risk_management': (
+        'calculate_targets', 'calculate_stoploss', 'validate_risk_reward',
+        'calculate_trailing_stops', 'calculate_position_size',
+        'generate_no_trade_explanation', 'calculate_portfolio_allocation'
+    ),
+    'output': (
+        'print_full_report', 'print_summary_table', 'print_portfolio_ranking',
+        'print_portfolio_allocation', 'print_disclaimer'
+    ),
+}
+_EXPORT_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'DEFAULT_MODE', 'DEFAULT_TIMEFRAME', 'DEFAULT_TICKERS',
@@ -33,6 +51,3 @@ __all__ = [
     'print_full_report', 'print_summary_table', 'print_portfolio_ranking',
     'print_portfolio_allocation', 'print_disclaimer'
 ]
-
-
-
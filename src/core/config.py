@@ -131,6 +131,7 @@ TIMEFRAME_CONFIGS = {
         'momentum_period': 5,
         'divergence_lookback': 10,
         'volume_avg_period': 10,
+        'min_bars': 100,
     },
     'medium': {
         'name': 'MEDIUM-TERM',
@@ -153,9 +154,38 @@ TIMEFRAME_CONFIGS = {
         'momentum_period': 10,
         'divergence_lookback': 14,
         'volume_avg_period': 20,
+        'min_bars': 200,
+    },
+    # Runs on intraday bars from src.core.intraday (not on daily history)
+    'intraday': {
+        'name': 'INTRADAY',
+        'description': 'Optimized for same-day monitoring on 15-minute bars',
+        'data_period': '5d',
+        'bar_interval': '15m',
+        'ema_fast': 9,
+        'ema_medium': 21,
+        'ema_slow': 50,
+        'ema_trend': 100,
+        'rsi_period': 14,
+        'macd_fast': 12,
+        'macd_slow': 26,
+        'macd_signal': 9,
+        'atr_period': 14,
+        'adx_period': 14,
+        'bb_period': 20,
+        'bb_std': 2,
+        'support_lookback': 25,  # One session of 15-minute bars
+        'resistance_lookback': 25,
+        'momentum_period': 8,
+        'divergence_lookback': 14,
+        'volume_avg_period': 25,
+        'min_bars': 100,
     }
 }
 
+# Timeframes analysed on daily history
+DAILY_TIMEFRAMES = [name for name, config in TIMEFRAME_CONFIGS.items() if 'bar_interval' not in config]
+
 # =============================================================================
 # MARKET HEALTH THRESHOLDS (Beginner-Friendly Scoring)
 # =============================================================================
@@ -655,6 +685,8 @@ DEFAULT_MODE = 'balanced'
 DEFAULT_TIMEFRAME = 'medium'
 DEFAULT_HORIZON = '3months'
 DEFAULT_TICKERS = ['SILVERBEES.NS', 'GOLDBEES.NS']
+DEFAULT_ALLOCATION_METHOD = 'risk_parity'  # inverse_vol, risk_parity, mean_variance or confidence
+MAX_POSITION_PCT = 20.0  # Per-position cap for allocations (matches the bot's PAPER_TRADING_MAX_POSITION_SIZE_PCT)
 
 # =============================================================================
 # DISPLAY SETTINGS
@@ -769,21 +801,20 @@ TRADING_DAYS_PER_YEAR = 252
 
 def get_expected_dates(horizon_key: str) -> dict:
     """Calculate expected buy/sell dates based on horizon"""
-    from datetime import datetime, timedelta
+    from datetime import datetime
+    from .trading_calendar import get_trading_calendar
     
     horizon = INVESTMENT_HORIZONS.get(horizon_key, INVESTMENT_HORIZONS['3months'])
     today = datetime.now()
+    calendar = get_trading_calendar()
     
-    # Skip weekends for buy date
-    buy_date = today
-    if buy_date.weekday() >= 5:  # Weekend
-        days_until_monday = 7 - buy_date.weekday()
-        buy_date = buy_date + timedelta(days=days_until_monday)
+    # Buy on the next trading session (today if the market trades today)
+    buy_date = datetime.combine(calendar.add_trading_days(today, 0), today.time())
     
-    # Calculate sell dates (business days approximation)
-    min_sell = buy_date + timedelta(days=int(horizon['min_days'] * 7 / 5))
-    max_sell = buy_date + timedelta(days=int(horizon['max_days'] * 7 / 5))
-    expected_sell = buy_date + timedelta(days=int(horizon['avg_days'] * 7 / 5))
+    # Sell dates counted in trading sessions from the buy date
+    min_sell = datetime.combine(calendar.add_trading_days(buy_date, horizon['min_days']), today.time())
+    max_sell = datetime.combine(calendar.add_trading_days(buy_date, horizon['max_days']), today.time())
+    expected_sell = datetime.combine(calendar.add_trading_days(buy_date, horizon['avg_days']), today.time())
     
     return {
         'buy_date': buy_date,
@@ -0,0 +1,123 @@
+"""
+Cross-Stock Return Statistics for Stock Analyzer Pro
+Aligns daily closes on a shared date index and derives relative strength,
+correlation and beta for a group of stocks in one vectorized step
+
+Author: Harsh Kandhway
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import TRADING_DAYS_PER_YEAR
+
+DEFAULT_LOOKBACK_BARS = 126  # ~6 months of daily returns
+MIN_OVERLAP_BARS = 20        # Shared bars needed for meaningful statistics
+
+
+def align_closes(histories: Dict[str, pd.DataFrame], lookback: Optional[int] = DEFAULT_LOOKBACK_BARS) -> pd.DataFrame:
+    """
+    Daily closes of several symbols on the dates they all traded
+
+    Timestamps are normalized to dates first, so a live intraday bar lines
+    up with the other symbols' daily bars.
+
+    Args:
+        histories: Symbol -> OHLCV DataFrame with a DatetimeIndex
+        lookback: Keep only the last lookback returns (None keeps everything)
+
+    Returns:
+        DataFrame of closes, one column per symbol, oldest date first
+
+    Raises:
+        ValueError: If fewer than MIN_OVERLAP_BARS dates are shared
+    """
+    closes = {}
+    for symbol, df in histories.items():
+        close = df['close'].astype(float)
+        close.index = pd.DatetimeIndex(close.index).normalize()
+        closes[symbol] = close[~close.index.duplicated(keep='last')]
+
+    aligned = pd.concat(closes, axis=1, join='inner').dropna().sort_index()
+    if lookback:
+        aligned = aligned.iloc[-(lookback + 1):]
+
+    if len(aligned) <= MIN_OVERLAP_BARS:
+        raise ValueError(f"Only {len(aligned)} shared trading days across {', '.join(histories)}")
+    return aligned
+
+
+def calculate_relative_metrics(closes: pd.DataFrame, benchmark: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Relative strength, correlation and beta for every column of aligned closes
+
+    Args:
+        closes: Output of align_closes
+        benchmark: Column to measure against (e.g. '^NSEI'); it is left out
+                   of the results. Without one, the equal-weighted basket of
+                   all columns is the benchmark.
+
+    Returns:
+        Dictionary with:
+            symbols: Symbols in column order
+            benchmark: Benchmark name ('basket' without a benchmark column)
+            bars: Number of daily returns used
+            correlation: Symbol x symbol return correlation matrix
+            metrics: Symbol -> {return_pct, relative_strength, beta,
+                     benchmark_correlation, avg_correlation, volatility_pct}
+    """
+    symbols = [column for column in closes.columns if column != benchmark]
+    prices = closes[symbols].to_numpy(dtype=float)
+    returns = np.diff(np.log(prices), axis=0)
+
+    if benchmark is not None:
+        benchmark_prices = closes[benchmark].to_numpy(dtype=float)
+        benchmark_returns = np.diff(np.log(benchmark_prices))
+        benchmark_name = benchmark
+    else:
+        benchmark_returns = returns.mean(axis=1)
+        benchmark_name = 'basket'
+
+    total_return = prices[-1] / prices[0] - 1
+    benchmark_total = np.exp(benchmark_returns.sum()) - 1
+
+    centered = returns - returns.mean(axis=0)
+    benchmark_centered = benchmark_returns - benchmark_returns.mean()
+    covariance = centered.T @ benchmark_centered
+    benchmark_variance = benchmark_centered @ benchmark_centered
+    stock_norms = np.sqrt((centered ** 2).sum(axis=0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = covariance / benchmark_variance
+        benchmark_correlation = covariance / (stock_norms * np.sqrt(benchmark_variance))
+        correlation = np.corrcoef(returns, rowvar=False) if len(symbols) > 1 else np.ones((1, 1))
+        avg_correlation = (
+            (np.nansum(correlation, axis=1) - 1) / (len(symbols) - 1) if len(symbols) > 1
+            else np.full(1, np.nan)
+        )
+    volatility = returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    def _round(value, digits):
+        return round(float(value), digits) if np.isfinite(value) else None
+
+    metrics = {
+        symbol: {
+            'return_pct': _round(total_return[i] * 100, 2),
+            'relative_strength': _round((1 + total_return[i]) / (1 + benchmark_total), 3),
+            'beta': _round(beta[i], 2),
+            'benchmark_correlation': _round(benchmark_correlation[i], 2),
+            'avg_correlation': _round(avg_correlation[i], 2),
+            'volatility_pct': _round(volatility[i] * 100, 1),
+        }
+        for i, symbol in enumerate(symbols)
+    }
+
+    return {
+        'symbols': symbols,
+        'benchmark': benchmark_name,
+        'bars': len(returns),
+        'correlation': np.atleast_2d(correlation),
+        'metrics': metrics,
+    }
@@ -0,0 +1,429 @@
+"""
+Correlation and Sector Exposure Matrix for Stock Analyzer Pro
+Precomputed pairwise return correlations plus sector / market-cap labels
+for the whole tradable universe, used to keep new positions from piling
+into one sector or into names that move in lockstep
+
+A build is stored as one generation directory:
+
+    <root>/20260112-171502-048213/
+        meta.json           symbols, label dictionaries, build details
+        correlation.npy     N x N int8 (correlation x 127, -128 = unknown)
+        sector.npy          int16 code per symbol
+        market_cap.npy      int8 code per symbol
+    <root>/CURRENT          name of the newest complete generation
+
+The correlation matrix is memory-mapped on load, so a 4,000-symbol
+universe costs ~20 MB of page cache and every lookup is an index into it.
+
+Author: Harsh Kandhway
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DEFAULT_EXPOSURE_LOOKBACK_BARS = 126  # ~6 months of daily returns
+MIN_PAIR_BARS = 40                     # Shared returns needed to trust a pair's correlation
+CORRELATION_SCALE = 127                # int8 quantization step is 1/127 (~0.008)
+UNKNOWN_CORRELATION = -128
+BLOCK_ROWS = 512                       # Rows of the matrix computed at a time
+KEEP_GENERATIONS = 2                   # Older builds are deleted after a successful save
+
+# Sectors too broad to count as concentration (the universe file's catch-all)
+UNCLASSIFIED_SECTORS = ('', 'Others', 'Unknown')
+
+
+# =============================================================================
+# CORRELATION
+# =============================================================================
+
+def quantized_correlation(
+    closes: pd.DataFrame,
+    min_pair_bars: int = MIN_PAIR_BARS,
+    block_rows: int = BLOCK_ROWS
+) -> np.ndarray:
+    """
+    Pairwise daily log-return correlations, quantized to int8
+
+    Unlike align_closes, symbols do not have to share every date: each
+    pair is measured over the days both traded, with its means and
+    variances taken over those shared days only (masked sums of x, y, x^2,
+    y^2 and xy, five matrix products). The matrix is built in row blocks
+    to keep peak memory near a few blocks of the result.
+
+    Args:
+        closes: Daily closes, one column per symbol, NaN where a symbol
+                did not trade, oldest date first
+        min_pair_bars: Pairs with fewer shared returns are UNKNOWN_CORRELATION
+        block_rows: Rows computed per matrix product
+
+    Returns:
+        N x N int8 matrix of round(correlation * CORRELATION_SCALE)
+    """
+    prices = closes.to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(np.log(np.where(prices > 0, prices, np.nan)), axis=0)
+
+    valid = np.isfinite(returns)
+    counts = valid.sum(axis=0)
+    filled = np.where(valid, returns, 0.0)
+    mean = filled.sum(axis=0) / np.maximum(counts, 1)
+    # Shifting each symbol by its own mean leaves every pair's overlap
+    # correlation unchanged but keeps the sums below well conditioned
+    x = np.where(valid, returns - mean, 0.0)
+    std = np.sqrt((x ** 2).sum(axis=0) / np.maximum(counts, 1))
+    usable = (counts >= min_pair_bars) & (std > 0)
+
+    x = np.where(usable, x, 0.0)
+    x2 = x ** 2
+    mask = (valid & usable).astype(np.float64)
+
+    n = prices.shape[1]
+    matrix = np.full((n, n), UNKNOWN_CORRELATION, dtype=np.int8)
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        rows = slice(start, stop)
+        overlap = mask[:, rows].T @ mask
+        sum_x = x[:, rows].T @ mask
+        sum_y = mask[:, rows].T @ x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = x[:, rows].T @ x - sum_x * sum_y / overlap
+            var_x = x2[:, rows].T @ mask - sum_x ** 2 / overlap
+            var_y = mask[:, rows].T @ x2 - sum_y ** 2 / overlap
+            block = cov / np.sqrt(var_x * var_y)
+        codes = np.rint(np.clip(block, -1.0, 1.0) * CORRELATION_SCALE)
+        known = (overlap >= min_pair_bars) & (var_x > 0) & (var_y > 0) & np.isfinite(codes)
+        matrix[rows] = np.where(known, codes, UNKNOWN_CORRELATION).astype(np.int8)
+
+    diagonal = np.arange(n)
+    matrix[diagonal, diagonal] = np.where(usable, CORRELATION_SCALE, UNKNOWN_CORRELATION)
+    return matrix
+
+
+def _encode_labels(values: Sequence[str], dtype) -> Tuple[np.ndarray, List[str]]:
+    """Dictionary-encode string labels"""
+    names, codes = np.unique(np.asarray([value or '' for value in values], dtype=str), return_inverse=True)
+    return codes.astype(dtype), names.tolist()
+
+
+# =============================================================================
+# MATRIX
+# =============================================================================
+
+class ExposureMatrix:
+    """Correlation, sector and market-cap lookups for a symbol universe"""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        correlation: np.ndarray,
+        sector_codes: np.ndarray,
+        sectors: Sequence[str],
+        market_cap_codes: np.ndarray,
+        market_caps: Sequence[str],
+        meta: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            symbols: Universe symbols in matrix order
+            correlation: N x N int8 quantized correlations
+            sector_codes: Sector code per symbol (index into sectors)
+            sectors: Sector names
+            market_cap_codes: Market-cap code per symbol (index into market_caps)
+            market_caps: Market-cap bucket names
+            meta: Build details (created_at, bars, lookback)
+        """
+        self.symbols = list(symbols)
+        self.correlation_codes = correlation
+        self.sector_codes = sector_codes
+        self.sectors = list(sectors)
+        self.market_cap_codes = market_cap_codes
+        self.market_caps = list(market_caps)
+        self.meta = meta or {}
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def build(
+        cls,
+        closes: pd.DataFrame,
+        labels: Dict[str, Tuple[str, str]],
+        lookback: Optional[int] = DEFAULT_EXPOSURE_LOOKBACK_BARS,
+        min_pair_bars: int = MIN_PAIR_BARS
+    ) -> 'ExposureMatrix':
+        """
+        Build from daily closes and universe labels
+
+        Args:
+            closes: Daily closes, one column per symbol (NaN where missing)
+            labels: Symbol -> (sector, market cap). Every labelled symbol is
+                    in the universe; those without closes get sector and
+                    market-cap lookups but unknown correlations.
+            lookback: Keep only the last lookback returns (None keeps everything)
+            min_pair_bars: Shared returns needed per pair
+
+        Returns:
+            ExposureMatrix
+        """
+        symbols = list(dict.fromkeys(list(labels) + list(closes.columns)))
+        closes = closes.sort_index().reindex(columns=symbols)
+        if lookback:
+            closes = closes.iloc[-(lookback + 1):]
+
+        sector_codes, sectors = _encode_labels([labels.get(s, ('', ''))[0] for s in symbols], np.int16)
+        cap_codes, caps = _encode_labels([labels.get(s, ('', ''))[1] for s in symbols], np.int8)
+
+        return cls(
+            symbols,
+            quantized_correlation(closes, min_pair_bars),
+            sector_codes, sectors, cap_codes, caps,
+            {
+                'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+                'bars': max(len(closes) - 1, 0),
+                'lookback': lookback,
+                'last_date': closes.index[-1].strftime('%Y-%m-%d') if len(closes) else None,
+            }
+        )
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def index(self, symbol: str) -> Optional[int]:
+        """Matrix row of a symbol (None if outside the universe)"""
+        return self._index.get(symbol)
+
+    def correlation(self, a: str, b: str) -> Optional[float]:
+        """Return correlation of two symbols (None if either is unknown)"""
+        i, j = self._index.get(a), self._index.get(b)
+        if i is None or j is None:
+            return None
+        code = int(self.correlation_codes[i, j])
+        return None if code == UNKNOWN_CORRELATION else code / CORRELATION_SCALE
+
+    def correlations(self, symbol: str, others: Sequence[str]) -> Dict[str, float]:
+        """Correlations of one symbol with several others (unknown pairs left out)"""
+        i = self._index.get(symbol)
+        if i is None:
+            return {}
+        known = [(other, self._index[other]) for other in others if other in self._index]
+        if not known:
+            return {}
+        codes = self.correlation_codes[i, [j for _, j in known]]
+        return {
+            other: int(code) / CORRELATION_SCALE
+            for (other, _), code in zip(known, codes) if code != UNKNOWN_CORRELATION
+        }
+
+    def sector(self, symbol: str) -> str:
+        """Sector of a symbol ('' if unknown)"""
+        i = self._index.get(symbol)
+        return '' if i is None else self.sectors[self.sector_codes[i]]
+
+    def market_cap(self, symbol: str) -> str:
+        """Market-cap bucket of a symbol ('' if unknown)"""
+        i = self._index.get(symbol)
+        return '' if i is None else self.market_caps[self.market_cap_codes[i]]
+
+    def exposure(self, holdings: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """
+        Holding value per sector and per market-cap bucket
+
+        Args:
+            holdings: Symbol -> position value
+
+        Returns:
+            Dictionary with 'sector' and 'market_cap' maps of label -> value
+            (symbols outside the universe count under '')
+        """
+        table: Dict[str, Dict[str, float]] = {'sector': {}, 'market_cap': {}}
+        for symbol, value in holdings.items():
+            for key, label in (('sector', self.sector(symbol)), ('market_cap', self.market_cap(symbol))):
+                table[key][label] = table[key].get(label, 0.0) + value
+        return table
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def save(self, root: str) -> str:
+        """
+        Write as a new generation and point CURRENT at it
+
+        Readers holding the previous generation keep working: its files are
+        only removed once KEEP_GENERATIONS newer builds exist.
+
+        Args:
+            root: Exposure directory
+
+        Returns:
+            Path of the generation directory
+        """
+        os.makedirs(root, exist_ok=True)
+        name = f"{datetime.utcnow():%Y%m%d-%H%M%S-%f}"
+        tmp_path = os.path.join(root, f".tmp-{name}")
+        os.makedirs(tmp_path)
+        try:
+            np.save(os.path.join(tmp_path, 'correlation.npy'), np.asarray(self.correlation_codes), allow_pickle=False)
+            np.save(os.path.join(tmp_path, 'sector.npy'), np.asarray(self.sector_codes), allow_pickle=False)
+            np.save(os.path.join(tmp_path, 'market_cap.npy'), np.asarray(self.market_cap_codes), allow_pickle=False)
+            with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+                json.dump({
+                    **self.meta,
+                    'schema_version': SCHEMA_VERSION,
+                    'symbols': self.symbols,
+                    'sectors': self.sectors,
+                    'market_caps': self.market_caps,
+                }, f)
+            path = os.path.join(root, name)
+            os.rename(tmp_path, path)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        pointer = os.path.join(root, f".CURRENT-{name}")
+        with open(pointer, 'w') as f:
+            f.write(name)
+        os.replace(pointer, os.path.join(root, 'CURRENT'))
+
+        generations = sorted(entry for entry in os.listdir(root) if not entry.startswith('.') and entry != 'CURRENT')
+        for old in generations[:-KEEP_GENERATIONS]:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, root: str) -> Optional['ExposureMatrix']:
+        """
+        Open the newest generation, memory-mapping the correlation matrix
+
+        Args:
+            root: Exposure directory
+
+        Returns:
+            ExposureMatrix, or None if nothing has been built yet
+        """
+        try:
+            with open(os.path.join(root, 'CURRENT')) as f:
+                path = os.path.join(root, f.read().strip())
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            correlation = np.load(os.path.join(path, 'correlation.npy'), mmap_mode='r')
+            sector_codes = np.load(os.path.join(path, 'sector.npy'))
+            market_cap_codes = np.load(os.path.join(path, 'market_cap.npy'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load exposure matrix from {root}: {e}")
+            return None
+
+        if meta.get('schema_version') != SCHEMA_VERSION:
+            logger.warning(f"Ignoring exposure matrix with schema {meta.get('schema_version')} in {root}")
+            return None
+
+        symbols = meta.pop('symbols')
+        sectors = meta.pop('sectors')
+        market_caps = meta.pop('market_caps')
+        return cls(symbols, correlation, sector_codes, sectors, market_cap_codes, market_caps, meta)
+
+
+# =============================================================================
+# ADMISSION
+# =============================================================================
+
+def check_admission(
+    matrix: ExposureMatrix,
+    symbol: str,
+    value: float,
+    holdings: Dict[str, float],
+    equity: float,
+    max_sector_pct: float = 30.0,
+    max_market_cap_pct: float = 100.0,
+    correlation_limit: float = 0.7,
+    max_correlated: int = 2,
+    min_fraction: float = 0.25
+) -> Dict[str, Any]:
+    """
+    Decide whether a new position fits the portfolio's concentration limits
+
+    A candidate is rejected when max_correlated holdings already have a
+    return correlation of at least correlation_limit with it. Otherwise it
+    is downsized to the room left under the sector and market-cap limits,
+    and rejected if that room is below min_fraction of the requested value.
+    Unclassified sectors and symbols outside the universe are not limited.
+
+    Args:
+        matrix: Exposure matrix
+        symbol: Candidate symbol
+        value: Requested position value
+        holdings: Symbol -> value of positions already held
+        equity: Portfolio value the percentage limits refer to
+        max_sector_pct: Maximum share of equity in one sector
+        max_market_cap_pct: Maximum share of equity in one market-cap bucket
+        correlation_limit: Correlation at which two positions count as one bet
+        max_correlated: Correlated holdings that block a new entry
+        min_fraction: Smallest acceptable share of the requested value
+
+    Returns:
+        Dictionary with:
+            allowed: Whether the position may be opened
+            value: Position value to use (<= value)
+            reason: Why it was rejected or downsized (None if neither)
+            correlated: Held symbols at or above correlation_limit -> correlation
+            sector: Candidate sector
+            market_cap: Candidate market-cap bucket
+    """
+    correlated = {
+        other: rho for other, rho in matrix.correlations(symbol, [s for s in holdings if s != symbol]).items()
+        if rho >= correlation_limit
+    }
+    sector = matrix.sector(symbol)
+    market_cap = matrix.market_cap(symbol)
+    result = {
+        'allowed': True,
+        'value': value,
+        'reason': None,
+        'correlated': correlated,
+        'sector': sector,
+        'market_cap': market_cap,
+    }
+
+    if max_correlated > 0 and len(correlated) >= max_correlated:
+        names = ', '.join(f"{s} ({rho:.2f})" for s, rho in sorted(correlated.items(), key=lambda item: -item[1]))
+        result.update(allowed=False, value=0.0, reason=f"Moves with {len(correlated)} open positions: {names}")
+        return result
+
+    exposure = matrix.exposure(holdings)
+    limits = []
+    if equity > 0 and sector not in UNCLASSIFIED_SECTORS:
+        limits.append((f"{sector} sector", exposure['sector'].get(sector, 0.0), max_sector_pct))
+    if equity > 0 and market_cap:
+        limits.append((market_cap, exposure['market_cap'].get(market_cap, 0.0), max_market_cap_pct))
+
+    for label, held, limit_pct in limits:
+        room = max(equity * limit_pct / 100.0 - held, 0.0)
+        if room >= result['value']:
+            continue
+        if room < value * min_fraction:
+            result.update(
+                allowed=False, value=0.0,
+                reason=f"{label} already at {held / equity * 100:.1f}% of capital (limit {limit_pct:.0f}%)"
+            )
+            return result
+        result.update(value=room, reason=f"Downsized to stay within {limit_pct:.0f}% {label} limit")
+
+    return result
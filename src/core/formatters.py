@@ -11,9 +11,14 @@ Consolidates all formatting logic into one place with:
 Author: Harsh Kandhway
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
+from src.core.rendering import (
+    chunk_text, emoji_table, get_templates, horizon_note, render_factors
+)
+
 # Import config from both bot and core
 try:
     from src.bot.config import EMOJI, MAX_MESSAGE_LENGTH, CURRENCY_SYMBOL as BOT_CURRENCY
@@ -57,56 +62,10 @@ def _get_emoji(name: str, output_mode: str) -> str:
     Returns:
         Emoji for bot, ASCII for CLI
     """
-    # Emoji mappings
-    emoji_map = {
-        # Basic indicators
-        'check': ('✅', '[Y]'),
-        'cross': ('❌', '[X]'),
-        'warning': ('⚠️', '[!]'),
-        'neutral': ('⚪', '[?]'),
-
-        # Arrows and indicators
-        'up': ('📈', '[UP]'),
-        'down': ('📉', '[DOWN]'),
-        'arrow': ('→', '->'),
-        'bullet': ('•', '*'),
-
-        # Financial
-        'money': ('💰', '$'),
-        'profit': ('💰', '[+]'),
-        'loss': ('📉', '[-]'),
-        'target': ('🎯', '[TARGET]'),
-        'stop': ('🛡️', '[STOP]'),
-
-        # Symbols
-        'star': ('⭐', '*'),
-        'star_empty': ('☆', 'o'),
-        'blocked': ('🚫', '[BLOCKED]'),
-        'success': ('✅', '[OK]'),
-        'error': ('❌', '[ERR]'),
-
-        # Chart/Analysis
-        'chart': ('📊', '[CHART]'),
-        'analyze': ('🔍', '[ANALYZE]'),
-        'info': ('ℹ️', '[INFO]'),
-        'compare': ('⚖️', '[COMPARE]'),
-
-        # Actions
-        'buy': ('🟢', '[BUY]'),
-        'sell': ('🔴', '[SELL]'),
-        'hold': ('🟡', '[HOLD]'),
-
-        # Other
-        'loading': ('⏳', '[...]'),
-        'watchlist': ('👁️', '[WATCH]'),
-        'portfolio': ('💼', '[PORTFOLIO]'),
-        'alert': ('🔔', '[ALERT]'),
-    }
-
-    emoji, ascii_equiv = emoji_map.get(name, ('', ''))
-    return emoji if output_mode == 'bot' else ascii_equiv
+    return emoji_table(output_mode).get(name, '')
 
 
+@lru_cache(maxsize=256)
 def _format_box_top(width: int, output_mode: str, style: str = 'double') -> str:
     """
     Format box top/bottom line
@@ -127,6 +86,7 @@ def _format_box_top(width: int, output_mode: str, style: str = 'double') -> str:
         return char * width
 
 
+@lru_cache(maxsize=256)
 def _format_section_header(title: str, output_mode: str) -> str:
     """
     Format section header
@@ -145,6 +105,7 @@ def _format_section_header(title: str, output_mode: str) -> str:
         return f"\n{'='*width}\n  {title}\n{'='*width}\n"
 
 
+@lru_cache(maxsize=256)
 def _format_progress_bar(score: int, max_score: int, output_mode: str) -> str:
     """
     Format visual progress bar
@@ -206,24 +167,7 @@ def chunk_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> List[str]:
     Returns:
         List of message chunks
     """
-    if len(text) <= max_length:
-        return [text]
-
-    chunks = []
-    current_chunk = ""
-
-    for line in text.split('\n'):
-        if len(current_chunk) + len(line) + 1 <= max_length:
-            current_chunk += line + '\n'
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.rstrip())
-            current_chunk = line + '\n'
-
-    if current_chunk:
-        chunks.append(current_chunk.rstrip())
-
-    return chunks
+    return chunk_text(text, max_length)
 
 
 # ============================================================================
@@ -285,6 +229,9 @@ def format_analysis_comprehensive(
     safety = analysis.get('safety_score', {})
     time_estimate = analysis.get('time_estimate', {})
 
+    icons = emoji_table(output_mode)
+    templates = get_templates(output_mode)
+
     # Calculate values for examples
     if capital is None:
         capital = 10000  # Default example capital
@@ -327,13 +274,13 @@ def format_analysis_comprehensive(
     if indicators['price_vs_trend_ema'] == 'above':
         trend_score += 1
         trend_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             "Price above long-term average",
             "Bullish"
         ))
     else:
         trend_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             "Price below long-term average",
             "Bearish"
         ))
@@ -341,19 +288,19 @@ def format_analysis_comprehensive(
     if 'uptrend' in indicators['market_phase']:
         trend_score += 1
         trend_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             f"Market in {indicators['market_phase'].replace('_', ' ')}",
             "Bullish"
         ))
     elif 'downtrend' in indicators['market_phase']:
         trend_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             f"Market in {indicators['market_phase'].replace('_', ' ')}",
             "Bearish"
         ))
     else:
         trend_factors.append((
-            _get_emoji('neutral', output_mode),
+            icons['neutral'],
             "Market moving sideways",
             "Neutral"
         ))
@@ -362,19 +309,19 @@ def format_analysis_comprehensive(
     if ema_alignment in ['strong_bullish', 'bullish']:
         trend_score += 1
         trend_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             "All moving averages aligned UP",
             "Strong signal"
         ))
     elif ema_alignment in ['strong_bearish', 'bearish']:
         trend_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             "All moving averages aligned DOWN",
             "Weak signal"
         ))
     else:
         trend_factors.append((
-            _get_emoji('neutral', output_mode),
+            icons['neutral'],
             "Moving averages mixed",
             "No clear signal"
         ))
@@ -388,19 +335,19 @@ def format_analysis_comprehensive(
     if rsi_zone in ['oversold', 'extremely_oversold']:
         momentum_score += 1
         momentum_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             f"RSI at {rsi:.0f} (Oversold)",
             "May bounce up soon"
         ))
     elif rsi_zone in ['overbought', 'extremely_overbought']:
         momentum_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             f"RSI at {rsi:.0f} (Overbought)",
             "May fall soon"
         ))
     else:
         momentum_factors.append((
-            _get_emoji('neutral', output_mode),
+            icons['neutral'],
             f"RSI at {rsi:.0f} (Neutral)",
             "No extreme"
         ))
@@ -409,13 +356,13 @@ def format_analysis_comprehensive(
     if macd_hist > 0:
         momentum_score += 1
         momentum_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             "MACD positive",
             "Upward momentum"
         ))
     else:
         momentum_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             "MACD negative",
             "Downward momentum"
         ))
@@ -424,13 +371,13 @@ def format_analysis_comprehensive(
     if adx >= 25:
         momentum_score += 1
         momentum_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             f"ADX at {adx:.0f} (Strong trend)",
             "Trend is reliable"
         ))
     else:
         momentum_factors.append((
-            _get_emoji('warning', output_mode),
+            icons['warning'],
             f"ADX at {adx:.0f} (Weak trend)",
             "Trend may reverse"
         ))
@@ -443,19 +390,19 @@ def format_analysis_comprehensive(
     if vol_ratio >= 1.5:
         volume_score += 1
         volume_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             f"Volume {vol_ratio:.1f}x average",
             "High interest"
         ))
     elif vol_ratio >= 0.8:
         volume_factors.append((
-            _get_emoji('neutral', output_mode),
+            icons['neutral'],
             f"Volume {vol_ratio:.1f}x average",
             "Normal activity"
         ))
     else:
         volume_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             f"Volume {vol_ratio:.1f}x average",
             "Low interest"
         ))
@@ -477,25 +424,25 @@ def format_analysis_comprehensive(
             if pattern_type == 'bullish':
                 pattern_score += 2
                 pattern_factors.append((
-                    _get_emoji('check', output_mode),
+                    icons['check'],
                     f"{pattern_name} ({pattern_conf}%)",
                     pattern_action
                 ))
             elif pattern_type == 'bearish':
                 pattern_factors.append((
-                    _get_emoji('cross', output_mode),
+                    icons['cross'],
                     f"{pattern_name} ({pattern_conf}%)",
                     pattern_action
                 ))
             else:
                 pattern_factors.append((
-                    _get_emoji('neutral', output_mode),
+                    icons['neutral'],
                     f"{pattern_name} ({pattern_conf}%)",
                     "Neutral pattern"
                 ))
         except Exception:
             pattern_factors.append((
-                _get_emoji('neutral', output_mode),
+                icons['neutral'],
                 "Pattern detected",
                 "Check chart"
             ))
@@ -512,13 +459,13 @@ def format_analysis_comprehensive(
     if rr_valid:
         risk_score += 1
         risk_factors.append((
-            _get_emoji('check', output_mode),
+            icons['check'],
             f"Risk/Reward {risk_reward:.1f}:1",
             f"Meets minimum {min_rr:.1f}:1 for {mode} mode"
         ))
     else:
         risk_factors.append((
-            _get_emoji('cross', output_mode),
+            icons['cross'],
             f"Risk/Reward {risk_reward:.1f}:1",
             f"Below minimum {min_rr:.1f}:1 for {mode} mode"
         ))
@@ -528,7 +475,7 @@ def format_analysis_comprehensive(
     if is_blocked:
         block_reason = analysis.get('buy_block_reasons', ['Risk too high'])[0] if analysis.get('buy_block_reasons') else 'Risk too high'
         risk_factors.append((
-            _get_emoji('blocked', output_mode),
+            icons['blocked'],
             "Hard filter triggered",
             block_reason
         ))
@@ -555,198 +502,77 @@ def format_analysis_comprehensive(
     # START BUILDING THE MESSAGE
     # =========================================================================
 
-    message = ""
+    parts = []
+    add = parts.append
 
     # =========================================================================
     # SECTION 1: HEADER & QUICK VERDICT
     # =========================================================================
 
-    if output_mode == 'bot':
-        # Bot-style header with box drawing
-        if rec_type == 'BUY':
-            verdict_box = f"""
-╔══════════════════════════════════╗
-║  🟢 *{symbol}* - *BUY*
-║
-║  ✅ Good opportunity to invest
-║  💪 Confidence: {confidence:.0f}%
-╚══════════════════════════════════╝"""
-        elif rec_type == 'HOLD':
-            verdict_box = f"""
-╔══════════════════════════════════╗
-║  🟡 *{symbol}* - *WAIT*
-║
-║  ⏳ Not the right time yet
-║  🔍 Confidence: {confidence:.0f}%
-╚══════════════════════════════════╝"""
-        else:
-            verdict_box = f"""
-╔══════════════════════════════════╗
-║  🔴 *{symbol}* - *AVOID*
-║
-║  ❌ Conditions are unfavorable
-║  ⚠️ Confidence: {confidence:.0f}%
-╚══════════════════════════════════╝"""
-
-        message += verdict_box + f"""
-
-💰 *Price:* Rs {format_number(price)}
-🛡️ *Safety:* {safety_emoji} ({safety_rating})
-
-"""
-    else:
-        # CLI-style header with ASCII
-        box_width = 60
-        if rec_type == 'BUY':
-            message += f"\n{'='*box_width}\n"
-            message += f"  [BUY] {symbol} - GOOD OPPORTUNITY\n"
-            message += f"  Confidence: {confidence:.0f}%\n"
-            message += f"{'='*box_width}\n"
-        elif rec_type == 'HOLD':
-            message += f"\n{'='*box_width}\n"
-            message += f"  [WAIT] {symbol} - NOT THE RIGHT TIME\n"
-            message += f"  Confidence: {confidence:.0f}%\n"
-            message += f"{'='*box_width}\n"
-        else:
-            message += f"\n{'='*box_width}\n"
-            message += f"  [AVOID] {symbol} - UNFAVORABLE CONDITIONS\n"
-            message += f"  Confidence: {confidence:.0f}%\n"
-            message += f"{'='*box_width}\n"
-
-        message += f"\nPrice: Rs {format_number(price)}\n"
-        message += f"Safety: {safety_emoji} ({safety_rating})\n"
+    verdict = rec_type if rec_type in ('BUY', 'HOLD') else 'AVOID'
+    add(templates['verdict_' + verdict].format(symbol=symbol, confidence=confidence))
+    add(templates['price_line'].format(
+        price=format_number(price), safety_emoji=safety_emoji, safety_rating=safety_rating
+    ))
 
     # =========================================================================
     # SECTION 2: DECISION BREAKDOWN - WHY THIS RECOMMENDATION?
     # =========================================================================
 
-    message += _format_section_header("WHY THIS RECOMMENDATION?", output_mode)
+    add(_format_section_header("WHY THIS RECOMMENDATION?", output_mode))
 
-    # Trend Section
-    if output_mode == 'bot':
-        message += f"*📈 TREND ANALYSIS* ({trend_score}/3 bullish)\n"
-        for emoji, factor, meaning in trend_factors:
-            message += f"\n   {emoji} {factor}\n      ↳ _{meaning}_"
-        message += "\n\n"
-    else:
-        message += f"\n[TREND ANALYSIS] ({trend_score}/3 bullish)\n"
-        message += f"{'-'*50}\n"
-        for emoji, factor, meaning in trend_factors:
-            message += f"\n  {emoji} {factor}\n       -> {meaning}"
-        message += "\n\n"
+    # Trend, momentum and volume sections
+    add(templates['trend_title'].format(score=trend_score))
+    add(render_factors(trend_factors, output_mode))
+    add("\n\n")
 
-    # Momentum Section
-    if output_mode == 'bot':
-        message += f"*⚡ MOMENTUM* ({momentum_score}/3 bullish)\n"
-        for emoji, factor, meaning in momentum_factors:
-            message += f"\n   {emoji} {factor}\n      ↳ _{meaning}_"
-        message += "\n\n"
-    else:
-        message += f"[MOMENTUM] ({momentum_score}/3 bullish)\n"
-        message += f"{'-'*50}\n"
-        for emoji, factor, meaning in momentum_factors:
-            message += f"\n  {emoji} {factor}\n       -> {meaning}"
-        message += "\n\n"
+    add(templates['momentum_title'].format(score=momentum_score))
+    add(render_factors(momentum_factors, output_mode))
+    add("\n\n")
 
-    # Volume Section
-    if output_mode == 'bot':
-        message += f"*📊 VOLUME* ({volume_score}/1 bullish)\n"
-        for emoji, factor, meaning in volume_factors:
-            message += f"\n   {emoji} {factor}\n      ↳ _{meaning}_"
-        message += "\n\n"
-    else:
-        message += f"[VOLUME] ({volume_score}/1 bullish)\n"
-        message += f"{'-'*50}\n"
-        for emoji, factor, meaning in volume_factors:
-            message += f"\n  {emoji} {factor}\n       -> {meaning}"
-        message += "\n\n"
+    add(templates['volume_title'].format(score=volume_score))
+    add(render_factors(volume_factors, output_mode))
+    add("\n\n")
 
     # Pattern Section (if patterns exist)
     if pattern_factors:
-        if output_mode == 'bot':
-            message += f"*🔮 CHART PATTERNS* ({pattern_score}/3 bullish)\n"
-            for emoji, factor, meaning in pattern_factors:
-                message += f"\n   {emoji} {factor}\n      ↳ _{meaning}_"
-
-            # Add conflict warning if needed
-            if strongest_pattern and hasattr(strongest_pattern, 'type'):
-                try:
-                    pattern_type = strongest_pattern.type.value if hasattr(strongest_pattern.type, 'value') else str(strongest_pattern.type)
-                    pattern_bullish = pattern_type == 'bullish'
-                except Exception:
-                    pattern_bullish = False
-
-                if pattern_bullish and rec_type in ['SELL', 'BLOCKED']:
-                    message += "\n\n   ⚠️ *CONFLICT:* Pattern says BUY but other factors say AVOID\n"
-                    message += "   _Wait for trend to confirm the pattern_"
-                elif not pattern_bullish and rec_type == 'BUY':
-                    message += "\n\n   ⚠️ *CAUTION:* Pattern is bearish - use tight stop loss"
-            message += "\n\n"
-        else:
-            message += f"[CHART PATTERNS] ({pattern_score}/3 bullish)\n"
-            message += f"{'-'*50}\n"
-            for emoji, factor, meaning in pattern_factors:
-                message += f"\n  {emoji} {factor}\n       -> {meaning}"
+        add(templates['pattern_title'].format(score=pattern_score))
+        add(render_factors(pattern_factors, output_mode))
 
-            # Conflict warning for CLI
-            if strongest_pattern and hasattr(strongest_pattern, 'type'):
-                try:
-                    pattern_type = strongest_pattern.type.value if hasattr(strongest_pattern.type, 'value') else str(strongest_pattern.type)
-                    pattern_bullish = pattern_type == 'bullish'
-                except Exception:
-                    pattern_bullish = False
+        # Add conflict warning if needed
+        if strongest_pattern and hasattr(strongest_pattern, 'type'):
+            try:
+                pattern_type = strongest_pattern.type.value if hasattr(strongest_pattern.type, 'value') else str(strongest_pattern.type)
+                pattern_bullish = pattern_type == 'bullish'
+            except Exception:
+                pattern_bullish = False
 
-                if pattern_bullish and rec_type in ['SELL', 'BLOCKED']:
-                    message += "\n\n  [!] CONFLICT: Pattern says BUY but other factors say AVOID\n"
-                    message += "      Wait for trend to confirm the pattern"
-                elif not pattern_bullish and rec_type == 'BUY':
-                    message += "\n\n  [!] CAUTION: Pattern is bearish - use tight stop loss"
-            message += "\n\n"
+            if pattern_bullish and rec_type in ['SELL', 'BLOCKED']:
+                add(templates['pattern_conflict'])
+            elif not pattern_bullish and rec_type == 'BUY':
+                add(templates['pattern_caution'])
+        add("\n\n")
 
     # Risk Section
-    if output_mode == 'bot':
-        message += f"*⚖️ RISK ASSESSMENT*\n"
-        for emoji, factor, meaning in risk_factors:
-            message += f"\n   {emoji} {factor}\n      ↳ _{meaning}_"
-        message += "\n\n"
-    else:
-        message += f"[RISK ASSESSMENT]\n"
-        message += f"{'-'*50}\n"
-        for emoji, factor, meaning in risk_factors:
-            message += f"\n  {emoji} {factor}\n       -> {meaning}"
-        message += "\n\n"
+    add(templates['risk_title'])
+    add(render_factors(risk_factors, output_mode))
+    add("\n\n")
 
     # =========================================================================
     # OVERALL SCORE
     # =========================================================================
 
     score_bar = _format_progress_bar(total_bullish, max_score, output_mode)
-
-    if output_mode == 'bot':
-        message += f"""
-📊 *OVERALL SCORE*
-
-{score_bar} {total_bullish}/{max_score}
-_Individual factors score (trend, momentum, volume, patterns, risk)_
-
-"""
-    else:
-        message += f"""{'='*60}
-  OVERALL SCORE
-{'='*60}
-{score_bar} {total_bullish}/{max_score}
-(Individual factors: trend, momentum, volume, patterns, risk)
-
-"""
+    add(templates['score_block'].format(bar=score_bar, score=total_bullish, max_score=max_score))
 
     # Score interpretation
     if is_blocked:
         if output_mode == 'bot':
-            message += "🚫 *BLOCKED BY SAFETY FILTERS*\n"
-            message += "_Despite good scores, risk factors prevent entry_\n\n"
+            add("🚫 *BLOCKED BY SAFETY FILTERS*\n")
+            add("_Despite good scores, risk factors prevent entry_\n\n")
         else:
-            message += "[BLOCKED] BLOCKED BY SAFETY FILTERS\n"
-            message += "Despite good scores, risk factors prevent entry\n\n"
+            add("[BLOCKED] BLOCKED BY SAFETY FILTERS\n")
+            add("Despite good scores, risk factors prevent entry\n\n")
     elif rec_type == 'BUY':
         # Check actual recommendation string to match conditions message
         recommendation_upper = recommendation.upper()
@@ -754,70 +580,70 @@ _Individual factors score (trend, momentum, volume, patterns, risk)_
         if 'STRONG BUY' in recommendation_upper:
             msg_text = "STRONG BUY CONDITIONS" if output_mode == 'cli' else "*STRONG BUY CONDITIONS*"
             detail = "Most indicators are bullish" if output_mode == 'cli' else "_Most indicators are bullish_"
-            check_emoji = _get_emoji('check', output_mode)
-            message += f"{check_emoji} {msg_text}\n" if output_mode == 'bot' else f"{check_emoji} {msg_text}\n"
-            message += f"{detail}\n\n" if output_mode == 'bot' else f"{detail}\n\n"
+            check_emoji = icons['check']
+            add(f"{check_emoji} {msg_text}\n" if output_mode == 'bot' else f"{check_emoji} {msg_text}\n")
+            add(f"{detail}\n\n" if output_mode == 'bot' else f"{detail}\n\n")
         elif 'WEAK BUY' in recommendation_upper:
             msg_text = "WEAK BUY CONDITIONS"
             detail = "Few bullish signals, higher risk"
-            warn_emoji = _get_emoji('warning', output_mode)
-            message += f"{warn_emoji} {msg_text}\n" if output_mode == 'bot' else f"{warn_emoji} {msg_text}\n"
-            message += f"_{detail}_\n\n" if output_mode == 'bot' else f"{detail}\n\n"
+            warn_emoji = icons['warning']
+            add(f"{warn_emoji} {msg_text}\n" if output_mode == 'bot' else f"{warn_emoji} {msg_text}\n")
+            add(f"_{detail}_\n\n" if output_mode == 'bot' else f"{detail}\n\n")
         elif score_pct >= 70:
             # Regular BUY with high score
             msg_text = "STRONG BUY CONDITIONS" if output_mode == 'cli' else "*STRONG BUY CONDITIONS*"
             detail = "Most indicators are bullish" if output_mode == 'cli' else "_Most indicators are bullish_"
-            check_emoji = _get_emoji('check', output_mode)
-            message += f"{check_emoji} {msg_text}\n" if output_mode == 'bot' else f"{check_emoji} {msg_text}\n"
-            message += f"{detail}\n\n" if output_mode == 'bot' else f"{detail}\n\n"
+            check_emoji = icons['check']
+            add(f"{check_emoji} {msg_text}\n" if output_mode == 'bot' else f"{check_emoji} {msg_text}\n")
+            add(f"{detail}\n\n" if output_mode == 'bot' else f"{detail}\n\n")
         elif score_pct >= 50:
             msg_text = "MODERATE BUY CONDITIONS"
             detail = "Mixed signals, proceed with caution"
             if output_mode == 'bot':
-                message += f"🟡 *{msg_text}*\n_{detail}_\n\n"
+                add(f"🟡 *{msg_text}*\n_{detail}_\n\n")
             else:
-                message += f"[?] {msg_text}\n{detail}\n\n"
+                add(f"[?] {msg_text}\n{detail}\n\n")
         else:
             msg_text = "WEAK BUY CONDITIONS"
             detail = "Few bullish signals, higher risk"
-            warn_emoji = _get_emoji('warning', output_mode)
-            message += f"{warn_emoji} {msg_text}\n" if output_mode == 'bot' else f"{warn_emoji} {msg_text}\n"
-            message += f"_{detail}_\n\n" if output_mode == 'bot' else f"{detail}\n\n"
+            warn_emoji = icons['warning']
+            add(f"{warn_emoji} {msg_text}\n" if output_mode == 'bot' else f"{warn_emoji} {msg_text}\n")
+            add(f"_{detail}_\n\n" if output_mode == 'bot' else f"{detail}\n\n")
             
             # Add strong warning if score is very low
             if score_pct < 30:
                 if output_mode == 'bot':
-                    message += f"⚠️ *CRITICAL WARNING:* Score is only {total_bullish}/10 ({score_pct:.0f}%).\n"
-                    message += f"_This BUY recommendation is based on risk/reward ratio only._\n"
-                    message += f"_All technical indicators are bearish. Proceed with extreme caution or wait for better entry._\n\n"
+                    add(f"⚠️ *CRITICAL WARNING:* Score is only {total_bullish}/10 ({score_pct:.0f}%).\n")
+                    add(f"_This BUY recommendation is based on risk/reward ratio only._\n")
+                    add(f"_All technical indicators are bearish. Proceed with extreme caution or wait for better entry._\n\n")
                 else:
-                    message += f"[!] CRITICAL WARNING: Score is only {total_bullish}/10 ({score_pct:.0f}%).\n"
-                    message += f"This BUY recommendation is based on risk/reward ratio only.\n"
-                    message += f"All technical indicators are bearish. Proceed with extreme caution or wait for better entry.\n\n"
+                    add(f"[!] CRITICAL WARNING: Score is only {total_bullish}/10 ({score_pct:.0f}%).\n")
+                    add(f"This BUY recommendation is based on risk/reward ratio only.\n")
+                    add(f"All technical indicators are bearish. Proceed with extreme caution or wait for better entry.\n\n")
     elif rec_type == 'HOLD':
         if output_mode == 'bot':
-            message += "⏸️ *NEUTRAL CONDITIONS*\n_Not enough conviction to buy or sell_\n\n"
+            add("⏸️ *NEUTRAL CONDITIONS*\n_Not enough conviction to buy or sell_\n\n")
         else:
-            message += "[HOLD] NEUTRAL CONDITIONS\nNot enough conviction to buy or sell\n\n"
+            add("[HOLD] NEUTRAL CONDITIONS\nNot enough conviction to buy or sell\n\n")
     else:
         if score_pct <= 30:
-            cross_emoji = _get_emoji('cross', output_mode)
-            message += f"{cross_emoji} STRONG SELL CONDITIONS\n" if output_mode == 'bot' else f"{cross_emoji} STRONG SELL CONDITIONS\n"
-            message += "_Most indicators are bearish_\n\n" if output_mode == 'bot' else "Most indicators are bearish\n\n"
+            cross_emoji = icons['cross']
+            add(f"{cross_emoji} STRONG SELL CONDITIONS\n" if output_mode == 'bot' else f"{cross_emoji} STRONG SELL CONDITIONS\n")
+            add("_Most indicators are bearish_\n\n" if output_mode == 'bot' else "Most indicators are bearish\n\n")
         else:
-            warn_emoji = _get_emoji('warning', output_mode)
-            message += f"{warn_emoji} AVOID - Unfavorable conditions\n\n" if output_mode == 'bot' else f"{warn_emoji} AVOID - Unfavorable conditions\n\n"
+            warn_emoji = icons['warning']
+            add(f"{warn_emoji} AVOID - Unfavorable conditions\n\n" if output_mode == 'bot' else f"{warn_emoji} AVOID - Unfavorable conditions\n\n")
 
     # Continue with remaining sections in next part...
     # (This is getting long, I'll continue in the actual implementation)
 
-    message += "\n"
+    add("\n")
 
     # =========================================================================
     # SECTION 3: ACTION PLAN
     # =========================================================================
 
-    message += _format_section_header("YOUR ACTION PLAN", output_mode)
+    add(_format_section_header("YOUR ACTION PLAN", output_mode))
 
     if rec_type == 'BUY':
         # Check if this is a WEAK BUY with R:R warning
@@ -825,7 +651,7 @@ _Individual factors score (trend, momentum, volume, patterns, risk)_
         
         if output_mode == 'bot':
             if is_rr_warning:
-                message += f"""🟡 *RECOMMENDED: {recommendation}*
+                add(f"""🟡 *RECOMMENDED: {recommendation}*
 
 ⚠️ *Warning:* Risk/Reward is slightly below minimum ({risk_reward:.2f}:1 vs {min_rr:.1f}:1 required)
 However, technical indicators are strong ({score_pct:.0f}% score, {confidence:.0f}% confidence)
@@ -836,35 +662,30 @@ However, technical indicators are strong ({score_pct:.0f}% score, {confidence:.0
 *Target:* Rs {format_number(target)} (+{profit_pct:.1f}%)
 *Stop Loss:* Rs {format_number(stop)} (-{loss_pct:.1f}%)
 
-"""
+""")
             else:
-                message += f"""✅ *RECOMMENDED: {recommendation}*
+                add(f"""✅ *RECOMMENDED: {recommendation}*
 
 *Entry:* Rs {format_number(price)} (current price)
 *Target:* Rs {format_number(target)} (+{profit_pct:.1f}%)
 *Stop Loss:* Rs {format_number(stop)} (-{loss_pct:.1f}%)
 
-"""
+""")
         else:
-            message += f"""[BUY] RECOMMENDED: BUY
+            add(f"""[BUY] RECOMMENDED: BUY
 
 Entry: Rs {format_number(price)} (current price)
 Target: Rs {format_number(target)} (+{profit_pct:.1f}%)
 Stop Loss: Rs {format_number(stop)} (-{loss_pct:.1f}%)
 
-"""
+""")
 
         # Show timeline
         selected_horizon = analysis.get('horizon', '3months')
         horizon_name = target_data.get('horizon_targets', {}).get(selected_horizon, {}).get('horizon_name', '3 Months')
         recommended_timeframe = target_data.get('recommended_timeframe', 90)
 
-        if output_mode == 'bot':
-            message += f"*Investment Horizon:* {horizon_name} (~{recommended_timeframe} days)\n"
-            message += f"_Target based on your selected timeframe_\n\n"
-        else:
-            message += f"Investment Horizon: {horizon_name} (~{recommended_timeframe} days)\n"
-            message += f"Target based on your selected timeframe\n\n"
+        add(horizon_note(output_mode, horizon_name, recommended_timeframe))
 
         # Estimated date
         if time_estimate and time_estimate.get('estimated_date'):
@@ -872,68 +693,34 @@ Stop Loss: Rs {format_number(stop)} (-{loss_pct:.1f}%)
             if isinstance(est_date, datetime):
                 date_str = est_date.strftime('%d %b %Y')
                 if output_mode == 'bot':
-                    message += f"*Estimated Target Date:* {date_str}\n\n"
+                    add(f"*Estimated Target Date:* {date_str}\n\n")
                 else:
-                    message += f"Estimated Target Date: {date_str}\n\n"
+                    add(f"Estimated Target Date: {date_str}\n\n")
 
         # Example calculation
         if output_mode == 'bot':
-            message += f"""*Example with Rs 10,000:*
+            add(f"""*Example with Rs 10,000:*
    Buy {shares} shares @ Rs {format_number(price)}
    ✅ Profit if target hit: Rs {format_number(potential_profit)} (+{profit_pct:.1f}%)
    ❌ Loss if stop hit: Rs {format_number(potential_loss)} (-{loss_pct:.1f}%)
-"""
+""")
         else:
-            message += f"""Example with Rs 10,000:
+            add(f"""Example with Rs 10,000:
    Buy {shares} shares @ Rs {format_number(price)}
    [+] Profit if target hit: Rs {format_number(potential_profit)} (+{profit_pct:.1f}%)
    [-] Loss if stop hit: Rs {format_number(potential_loss)} (-{loss_pct:.1f}%)
-"""
+""")
 
     elif rec_type == 'HOLD':
         support = indicators.get('support', price * 0.95)
-        if output_mode == 'bot':
-            message += f"""⏳ *RECOMMENDED: WAIT*
-
-Do not buy now. Wait for:
-   • Price to drop to Rs {format_number(support)} (better entry)
-   • OR trend to strengthen
-
-Check again in: 1-2 weeks
-"""
-        else:
-            message += f"""[WAIT] RECOMMENDED: WAIT
-
-Do not buy now. Wait for:
-   * Price to drop to Rs {format_number(support)} (better entry)
-   * OR trend to strengthen
-
-Check again in: 1-2 weeks
-"""
+        add(templates['hold_plan'].format(support=format_number(support)))
 
     else:  # AVOID
-        if output_mode == 'bot':
-            message += f"""❌ *RECOMMENDED: AVOID*
-
-Do not buy this stock now.
-
-*Why to avoid:*
-"""
-        else:
-            message += f"""[AVOID] RECOMMENDED: AVOID
-
-Do not buy this stock now.
-
-Why to avoid:
-"""
+        add(templates['avoid_plan'])
 
         # Show key reasons
         if analysis.get('buy_block_reasons'):
-            for reason in analysis['buy_block_reasons'][:3]:
-                if output_mode == 'bot':
-                    message += f"   • {reason}\n"
-                else:
-                    message += f"   * {reason}\n"
+            reasons = analysis['buy_block_reasons'][:3]
         else:
             reasons = []
             if 'downtrend' in indicators['market_phase']:
@@ -943,30 +730,9 @@ Why to avoid:
             if not rr_valid:
                 reasons.append("Risk/reward ratio is unfavorable")
 
-            for reason in reasons:
-                if output_mode == 'bot':
-                    message += f"   • {reason}\n"
-                else:
-                    message += f"   * {reason}\n"
-
-        if output_mode == 'bot':
-            message += f"""
-*When conditions might improve:*
-   • When trend turns upward
-   • When RSI shows oversold (below 30)
-   • When a bullish pattern confirms
-
-Check again in: 2-3 weeks
-"""
-        else:
-            message += f"""
-When conditions might improve:
-   * When trend turns upward
-   * When RSI shows oversold (below 30)
-   * When a bullish pattern confirms
-
-Check again in: 2-3 weeks
-"""
+        reason_line = templates['avoid_reason']
+        parts.extend(reason_line.format(reason) for reason in reasons)
+        add(templates['avoid_improve'])
 
     # =========================================================================
     # SECTION 4: TARGETS BY INVESTMENT HORIZON
@@ -974,12 +740,12 @@ Check again in: 2-3 weeks
 
     horizon_targets = target_data.get('horizon_targets', {})
     if horizon_targets and rec_type == 'BUY':
-        message += _format_section_header("TARGETS BY INVESTMENT HORIZON", output_mode)
+        add(_format_section_header("TARGETS BY INVESTMENT HORIZON", output_mode))
 
         if output_mode == 'bot':
-            message += "_Opportunities across different timeframes_\n\n"
+            add("_Opportunities across different timeframes_\n\n")
         else:
-            message += "Opportunities across different timeframes\n\n"
+            add("Opportunities across different timeframes\n\n")
 
         # Sort horizons by timeframe
         sorted_horizons = sorted(
@@ -997,35 +763,35 @@ Check again in: 2-3 weeks
 
             if output_mode == 'bot':
                 recommended_tag = " ⭐ *RECOMMENDED*" if is_recommended else ""
-                message += f"{emoji} *{name}* (~{days} days){recommended_tag}\n"
-                message += f"   Target: Rs {format_number(target_price)} (+{target_pct:.1f}%)\n"
+                add(f"{emoji} *{name}* (~{days} days){recommended_tag}\n")
+                add(f"   Target: Rs {format_number(target_price)} (+{target_pct:.1f}%)\n")
                 if is_recommended:
-                    message += f"   _Your selected investment period_\n"
-                message += "\n"
+                    add(f"   _Your selected investment period_\n")
+                add("\n")
             else:
                 recommended_tag = " * RECOMMENDED" if is_recommended else ""
-                message += f"{name} (~{days} days){recommended_tag}\n"
-                message += f"   Target: Rs {format_number(target_price)} (+{target_pct:.1f}%)\n"
+                add(f"{name} (~{days} days){recommended_tag}\n")
+                add(f"   Target: Rs {format_number(target_price)} (+{target_pct:.1f}%)\n")
                 if is_recommended:
-                    message += f"   (Your selected investment period)\n"
-                message += "\n"
+                    add(f"   (Your selected investment period)\n")
+                add("\n")
 
         if output_mode == 'bot':
-            message += "_All targets shown - pick your preferred timeline_\n\n"
+            add("_All targets shown - pick your preferred timeline_\n\n")
         else:
-            message += "All targets shown - pick your preferred timeline\n\n"
+            add("All targets shown - pick your preferred timeline\n\n")
 
     # =========================================================================
     # SECTION 5: PATTERN-BASED TARGET (if exists)
     # =========================================================================
 
     if target_data.get('has_pattern_target') and rec_type == 'BUY':
-        message += _format_section_header("PATTERN-BASED TARGET", output_mode)
+        add(_format_section_header("PATTERN-BASED TARGET", output_mode))
 
         if output_mode == 'bot':
-            message += "_Industry-standard measured move calculation_\n\n"
+            add("_Industry-standard measured move calculation_\n\n")
         else:
-            message += "Industry-standard measured move calculation\n\n"
+            add("Industry-standard measured move calculation\n\n")
 
         pattern_name = target_data.get('pattern_name', 'Unknown')
         pattern_target = target_data.get('pattern_target')
@@ -1037,45 +803,45 @@ Check again in: 2-3 weeks
 
         reliability_pct = int((pattern_reliability or 0) * 100)
         reliability_stars = min(5, max(1, reliability_pct // 20))
-        star_emoji = _get_emoji('star', output_mode)
+        star_emoji = icons['star']
         stars_display = star_emoji * reliability_stars
 
         if output_mode == 'bot':
-            message += f"*Pattern:* {pattern_name}\n"
-            message += f"*Reliability:* {reliability_pct}% {stars_display}\n\n"
+            add(f"*Pattern:* {pattern_name}\n")
+            add(f"*Reliability:* {reliability_pct}% {stars_display}\n\n")
 
             if pattern_target:
-                message += f"📎 *Measured Move Target:* Rs {format_number(pattern_target)} (+{pattern_target_pct:.1f}%)\n"
+                add(f"📎 *Measured Move Target:* Rs {format_number(pattern_target)} (+{pattern_target_pct:.1f}%)\n")
 
             if pattern_invalidation:
-                message += f"🚫 *Pattern Invalid If:* Price drops below Rs {format_number(pattern_invalidation)}\n"
+                add(f"🚫 *Pattern Invalid If:* Price drops below Rs {format_number(pattern_invalidation)}\n")
 
             if pattern_min_days and pattern_max_days:
-                message += f"⏱️ *Expected Timeframe:* {pattern_min_days}-{pattern_max_days} days\n"
+                add(f"⏱️ *Expected Timeframe:* {pattern_min_days}-{pattern_max_days} days\n")
 
             if target_data.get('pattern_horizon_warning'):
-                message += f"\n⚠️ *Notice:* {target_data['pattern_horizon_warning']}\n"
+                add(f"\n⚠️ *Notice:* {target_data['pattern_horizon_warning']}\n")
 
-            message += "\n_Pattern targets are based on classical technical analysis_\n"
-            message += "_Measured move = pattern height projected from breakout_\n\n"
+            add("\n_Pattern targets are based on classical technical analysis_\n")
+            add("_Measured move = pattern height projected from breakout_\n\n")
         else:
-            message += f"Pattern: {pattern_name}\n"
-            message += f"Reliability: {reliability_pct}% {stars_display}\n\n"
+            add(f"Pattern: {pattern_name}\n")
+            add(f"Reliability: {reliability_pct}% {stars_display}\n\n")
 
             if pattern_target:
-                message += f"Measured Move Target: Rs {format_number(pattern_target)} (+{pattern_target_pct:.1f}%)\n"
+                add(f"Measured Move Target: Rs {format_number(pattern_target)} (+{pattern_target_pct:.1f}%)\n")
 
             if pattern_invalidation:
-                message += f"Pattern Invalid If: Price drops below Rs {format_number(pattern_invalidation)}\n"
+                add(f"Pattern Invalid If: Price drops below Rs {format_number(pattern_invalidation)}\n")
 
             if pattern_min_days and pattern_max_days:
-                message += f"Expected Timeframe: {pattern_min_days}-{pattern_max_days} days\n"
+                add(f"Expected Timeframe: {pattern_min_days}-{pattern_max_days} days\n")
 
             if target_data.get('pattern_horizon_warning'):
-                message += f"\n[!] Notice: {target_data['pattern_horizon_warning']}\n"
+                add(f"\n[!] Notice: {target_data['pattern_horizon_warning']}\n")
 
-            message += "\nPattern targets are based on classical technical analysis\n"
-            message += "Measured move = pattern height projected from breakout\n\n"
+            add("\nPattern targets are based on classical technical analysis\n")
+            add("Measured move = pattern height projected from breakout\n\n")
 
     # =========================================================================
     # SECTION 6: KEY PRICE LEVELS
@@ -1084,10 +850,10 @@ Check again in: 2-3 weeks
     support = indicators.get('support', price * 0.95)
     resistance = indicators.get('resistance', price * 1.05)
 
-    message += _format_section_header("KEY PRICE LEVELS", output_mode)
+    add(_format_section_header("KEY PRICE LEVELS", output_mode))
 
     if output_mode == 'bot':
-        message += f"""
+        add(f"""
 Current: Rs {format_number(price)}
 
 🔺 Resistance: Rs {format_number(resistance)} (+{((resistance-price)/price)*100:.1f}%)
@@ -1096,9 +862,9 @@ Current: Rs {format_number(price)}
 🔻 Support: Rs {format_number(support)} ({((support-price)/price)*100:.1f}%)
    ↓ Price may bounce here
 
-"""
+""")
     else:
-        message += f"""
+        add(f"""
 Current: Rs {format_number(price)}
          |
 [UP] Resistance: Rs {format_number(resistance)} (+{((resistance-price)/price)*100:.1f}%)
@@ -1107,65 +873,65 @@ Current: Rs {format_number(price)}
 [DOWN] Support: Rs {format_number(support)} ({((support-price)/price)*100:.1f}%)
               Price may bounce here
 
-"""
+""")
 
     # =========================================================================
     # SECTION 7: MARKET CONDITIONS
     # =========================================================================
 
-    message += _format_section_header("MARKET CONDITIONS", output_mode)
+    add(_format_section_header("MARKET CONDITIONS", output_mode))
 
     phase = indicators['market_phase'].replace('_', ' ').title()
     adx_strength = indicators['adx_strength'].replace('_', ' ').title()
 
     if output_mode == 'bot':
-        message += f"""Market Phase: {phase}
+        add(f"""Market Phase: {phase}
 Trend Strength: {adx_strength} (ADX: {format_number(adx, 1)})
 Momentum: RSI {format_number(rsi, 1)} - {rsi_zone.replace('_', ' ').title()}
 Volume: {format_number(vol_ratio, 2)}x average
 
-"""
+""")
     else:
-        message += f"""Market Phase: {phase}
+        add(f"""Market Phase: {phase}
 Trend Strength: {adx_strength} (ADX: {format_number(adx, 1)})
 Momentum: RSI {format_number(rsi, 1)} - {rsi_zone.replace('_', ' ').title()}
 Volume: {format_number(vol_ratio, 2)}x average
 
-"""
+""")
 
     # Divergence warning
     if indicators.get('divergence', 'none') != 'none':
         div_text = indicators['divergence'].upper()
-        warn_emoji = _get_emoji('warning', output_mode)
+        warn_emoji = icons['warning']
         if output_mode == 'bot':
-            message += f"{warn_emoji} *{div_text} DIVERGENCE DETECTED*\n\n"
+            add(f"{warn_emoji} *{div_text} DIVERGENCE DETECTED*\n\n")
         else:
-            message += f"{warn_emoji} {div_text} DIVERGENCE DETECTED\n\n"
+            add(f"{warn_emoji} {div_text} DIVERGENCE DETECTED\n\n")
 
     # =========================================================================
     # SECTION 8: TECHNICAL INDICATORS DETAIL
     # =========================================================================
 
-    message += _format_section_header("TECHNICAL INDICATORS DETAIL", output_mode)
+    add(_format_section_header("TECHNICAL INDICATORS DETAIL", output_mode))
 
     rsi_period = indicators.get('rsi_period', 14)
 
     if output_mode == 'bot':
-        message += f"""RSI ({rsi_period}): {format_number(rsi, 1)} - {rsi_zone.replace('_', ' ').title()}
+        add(f"""RSI ({rsi_period}): {format_number(rsi, 1)} - {rsi_zone.replace('_', ' ').title()}
 MACD Histogram: {format_number(macd_hist, 4)}
 ADX: {format_number(adx, 1)} - Trend is {adx_strength}
 Volume Ratio: {format_number(vol_ratio, 2)}x average
 EMA Alignment: {ema_alignment.replace('_', ' ').title()}
 
-"""
+""")
     else:
-        message += f"""RSI ({rsi_period}): {format_number(rsi, 1)} - {rsi_zone.replace('_', ' ').title()}
+        add(f"""RSI ({rsi_period}): {format_number(rsi, 1)} - {rsi_zone.replace('_', ' ').title()}
 MACD Histogram: {format_number(macd_hist, 4)}
 ADX: {format_number(adx, 1)} - Trend is {adx_strength}
 Volume Ratio: {format_number(vol_ratio, 2)}x average
 EMA Alignment: {ema_alignment.replace('_', ' ').title()}
 
-"""
+""")
 
     # =========================================================================
     # SECTION 9: CHART PATTERNS
@@ -1177,18 +943,18 @@ EMA Alignment: {ema_alignment.replace('_', ' ').title()}
     bearish_count = indicators.get('pattern_bearish_count', 0)
 
     if strongest_pattern or candlestick_patterns or chart_patterns:
-        message += _format_section_header("CHART PATTERNS", output_mode)
+        add(_format_section_header("CHART PATTERNS", output_mode))
 
         if output_mode == 'bot':
-            message += f"""Pattern Bias: {pattern_bias.upper()}
+            add(f"""Pattern Bias: {pattern_bias.upper()}
 Bullish Patterns: {bullish_count} | Bearish Patterns: {bearish_count}
 
-"""
+""")
         else:
-            message += f"""Pattern Bias: {pattern_bias.upper()}
+            add(f"""Pattern Bias: {pattern_bias.upper()}
 Bullish Patterns: {bullish_count} | Bearish Patterns: {bearish_count}
 
-"""
+""")
 
         # Strongest pattern
         if strongest_pattern and strongest_pattern is not None:
@@ -1199,9 +965,9 @@ Bullish Patterns: {bullish_count} | Bearish Patterns: {bearish_count}
                 # Skip if pattern name is invalid or empty
                 if not p_name or p_name == 'Unknown Pattern' or p_name == '' or p_conf == 0:
                     if output_mode == 'bot':
-                        message += "Key Pattern: No significant pattern detected\n\n"
+                        add("Key Pattern: No significant pattern detected\n\n")
                     else:
-                        message += "Key Pattern: No significant pattern detected\n\n"
+                        add("Key Pattern: No significant pattern detected\n\n")
                 else:
                     # Get pattern type
                     if hasattr(strongest_pattern, 'type'):
@@ -1224,17 +990,17 @@ Bullish Patterns: {bullish_count} | Bearish Patterns: {bearish_count}
                     p_action = getattr(strongest_pattern, 'action', 'Check chart')
 
                     if output_mode == 'bot':
-                        message += f"""Key Pattern: *{p_name}* ({p_conf}%)
+                        add(f"""Key Pattern: *{p_name}* ({p_conf}%)
 Type: {p_type} | Strength: {p_strength}
 Action: {p_action}
 
-"""
+""")
                     else:
-                        message += f"""Key Pattern: {p_name} ({p_conf}%)
+                        add(f"""Key Pattern: {p_name} ({p_conf}%)
 Type: {p_type} | Strength: {p_strength}
 Action: {p_action}
 
-"""
+""")
             except Exception as e:
                 # Fallback if pattern object structure is different
                 try:
@@ -1242,19 +1008,19 @@ Action: {p_action}
                     p_conf = getattr(strongest_pattern, 'confidence', 0)
                     if p_name and p_name != 'Unknown Pattern' and p_conf > 0:
                         if output_mode == 'bot':
-                            message += f"Key Pattern: *{p_name}* ({p_conf}%)\n\n"
+                            add(f"Key Pattern: *{p_name}* ({p_conf}%)\n\n")
                         else:
-                            message += f"Key Pattern: {p_name} ({p_conf}%)\n\n"
+                            add(f"Key Pattern: {p_name} ({p_conf}%)\n\n")
                     else:
                         if output_mode == 'bot':
-                            message += "Key Pattern: No significant pattern detected\n\n"
+                            add("Key Pattern: No significant pattern detected\n\n")
                         else:
-                            message += "Key Pattern: No significant pattern detected\n\n"
+                            add("Key Pattern: No significant pattern detected\n\n")
                 except Exception:
                     if output_mode == 'bot':
-                        message += "Key Pattern: No significant pattern detected\n\n"
+                        add("Key Pattern: No significant pattern detected\n\n")
                     else:
-                        message += "Key Pattern: No significant pattern detected\n\n"
+                        add("Key Pattern: No significant pattern detected\n\n")
 
     # =========================================================================
     # SECTION 10: INVESTMENT CHECKLIST - REMOVED FROM MAIN OUTPUT
@@ -1275,47 +1041,47 @@ Action: {p_action}
     # SECTION 13: SAFETY & RISK SUMMARY
     # =========================================================================
 
-    message += _format_section_header("SAFETY & RISK SUMMARY", output_mode)
+    add(_format_section_header("SAFETY & RISK SUMMARY", output_mode))
 
     safety_advice = safety.get('advice', 'Moderate risk investment')
     risk_factors = safety.get('risk_factors', [])
     investor_profile = safety.get('suitable_for', 'Investors with moderate risk tolerance')
 
     if output_mode == 'bot':
-        message += f"""Safety Score: {safety_emoji} {safety_stars}/5 stars
+        add(f"""Safety Score: {safety_emoji} {safety_stars}/5 stars
 Rating: {safety_rating}
 
 {safety_advice}
 
 Suitable For: {investor_profile}
 
-"""
+""")
         if risk_factors:
-            message += "*Risk Factors:*\\n"
+            add("*Risk Factors:*\\n")
             for rf in risk_factors[:3]:
-                message += f"   • {rf}\\n"
-            message += "\\n"
+                add(f"   • {rf}\\n")
+            add("\\n")
     else:
-        message += f"""Safety Score: {safety_emoji} {safety_stars}/5 stars
+        add(f"""Safety Score: {safety_emoji} {safety_stars}/5 stars
 Rating: {safety_rating}
 
 {safety_advice}
 
 Suitable For: {investor_profile}
 
-"""
+""")
         if risk_factors:
-            message += "Risk Factors:\n"
+            add("Risk Factors:\n")
             for rf in risk_factors[:3]:
-                message += f"   * {rf}\n"
-            message += "\n"
+                add(f"   * {rf}\n")
+            add("\n")
 
     # =========================================================================
     # SECTION 14: TIMELINE ESTIMATE
     # =========================================================================
 
     if time_estimate:
-        message += _format_section_header("TIMELINE ESTIMATE", output_mode)
+        add(_format_section_header("TIMELINE ESTIMATE", output_mode))
 
         earliest = time_estimate.get('earliest_date')
         estimated = time_estimate.get('estimated_date')
@@ -1323,40 +1089,35 @@ Suitable For: {investor_profile}
         trading_days = time_estimate.get('trading_days', 0)
 
         if output_mode == 'bot':
-            message += f"""Hold Duration: Approximately {trading_days} trading days
+            add(f"""Hold Duration: Approximately {trading_days} trading days
 
-"""
+""")
             if isinstance(earliest, datetime):
-                message += f"Earliest Sell: {earliest.strftime('%d %b %Y')}\n"
+                add(f"Earliest Sell: {earliest.strftime('%d %b %Y')}\n")
             if isinstance(estimated, datetime):
-                message += f"Expected Sell: {estimated.strftime('%d %b %Y')}\n"
+                add(f"Expected Sell: {estimated.strftime('%d %b %Y')}\n")
             if isinstance(latest, datetime):
-                message += f"Latest Sell: {latest.strftime('%d %b %Y')}\n"
-            message += "\n"
+                add(f"Latest Sell: {latest.strftime('%d %b %Y')}\n")
+            add("\n")
         else:
-            message += f"""Hold Duration: Approximately {trading_days} trading days
+            add(f"""Hold Duration: Approximately {trading_days} trading days
 
-"""
+""")
             if isinstance(earliest, datetime):
-                message += f"Earliest Sell: {earliest.strftime('%d %b %Y')}\n"
+                add(f"Earliest Sell: {earliest.strftime('%d %b %Y')}\n")
             if isinstance(estimated, datetime):
-                message += f"Expected Sell: {estimated.strftime('%d %b %Y')}\n"
+                add(f"Expected Sell: {estimated.strftime('%d %b %Y')}\n")
             if isinstance(latest, datetime):
-                message += f"Latest Sell: {latest.strftime('%d %b %Y')}\n"
-            message += "\n"
+                add(f"Latest Sell: {latest.strftime('%d %b %Y')}\n")
+            add("\n")
 
     # =========================================================================
     # SECTION 15: FOOTER (TIPS FOR BEGINNERS and DISCLAIMER removed per user request)
     # =========================================================================
 
-    if output_mode == 'bot':
-        message += f"\n_Stock Analyzer Pro by Harsh Kandhway_\n"
-    else:
-        message += f"\n{'='*60}\n"
-        message += f"  Developed by Harsh Kandhway | Stock Analyzer Pro v3.0\n"
-        message += f"{'='*60}\n"
+    add(templates['footer'])
 
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_position_sizing(
@@ -1454,7 +1215,7 @@ def format_position_sizing(
         checks.append(("Good risk/reward ratio", False, "Risk may exceed reward"))
     
     if output_mode == 'bot':
-        message = f"""💰 *POSITION SIZING FOR {symbol}*
+        parts = [f"""💰 *POSITION SIZING FOR {symbol}*
 
 *Your Capital:* Rs {capital:,.0f}
 
@@ -1478,26 +1239,27 @@ def format_position_sizing(
 *INVESTMENT CHECKLIST*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-"""
+"""]
+        add = parts.append
         # Add checklist items
         for check_name, passed_check, explanation in checks:
             emoji = '✅' if passed_check else '❌'
-            message += f"{emoji} *{check_name}*\n   _{explanation}_\n\n"
+            add(f"{emoji} *{check_name}*\n   _{explanation}_\n\n")
         
         # Summary
-        message += f"*Passed {checks_passed}/{len(checks)} checks*\n"
+        add(f"*Passed {checks_passed}/{len(checks)} checks*\n")
         if checks_passed >= 4:
-            message += f"✅ *Good investment opportunity!*\n\n"
+            add(f"✅ *Good investment opportunity!*\n\n")
         elif checks_passed >= 3:
-            message += f"🟡 *Moderate opportunity* - proceed with caution\n\n"
+            add(f"🟡 *Moderate opportunity* - proceed with caution\n\n")
         else:
-            message += f"❌ *Not recommended at this time*\n\n"
+            add(f"❌ *Not recommended at this time*\n\n")
         
-        message += "💡 *Tip:* This calculation assumes you're willing to risk 1% of your capital on this trade. Adjust your position size based on your risk tolerance.\n\n"
+        add("💡 *Tip:* This calculation assumes you're willing to risk 1% of your capital on this trade. Adjust your position size based on your risk tolerance.\n\n")
         
         # Add "When to Sell" section
         partial_target = price + (target - price) * 0.5
-        message += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        add(f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 *WHEN TO SELL - SET ALERTS*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1520,9 +1282,9 @@ Set Price Alerts for These Levels:
    • Set these alerts in your trading app
    • Don't change stop loss to avoid loss - discipline is key!
    • Review your position every week
-"""
+""")
     else:
-        message = f"""POSITION SIZING FOR {symbol}
+        parts = [f"""POSITION SIZING FOR {symbol}
 
 Your Capital: Rs {capital:,.0f}
 
@@ -1546,26 +1308,27 @@ Confidence: {analysis['confidence']:.0f}%
 INVESTMENT CHECKLIST
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-"""
+"""]
+        add = parts.append
         # Add checklist items
         for check_name, passed_check, explanation in checks:
             emoji = '[Y]' if passed_check else '[X]'
-            message += f"{emoji} {check_name}\n     {explanation}\n\n"
+            add(f"{emoji} {check_name}\n     {explanation}\n\n")
         
         # Summary
-        message += f"Passed {checks_passed}/{len(checks)} checks\n"
+        add(f"Passed {checks_passed}/{len(checks)} checks\n")
         if checks_passed >= 4:
-            message += f"[Y] Good investment opportunity!\n\n"
+            add(f"[Y] Good investment opportunity!\n\n")
         elif checks_passed >= 3:
-            message += f"[?] Moderate opportunity - proceed with caution\n\n"
+            add(f"[?] Moderate opportunity - proceed with caution\n\n")
         else:
-            message += f"[X] Not recommended at this time\n\n"
+            add(f"[X] Not recommended at this time\n\n")
         
-        message += "Tip: This calculation assumes you're willing to risk 1% of your capital on this trade.\n\n"
+        add("Tip: This calculation assumes you're willing to risk 1% of your capital on this trade.\n\n")
         
         # Add "When to Sell" section
         partial_target = price + (target - price) * 0.5
-        message += f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        add(f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 WHEN TO SELL - SET ALERTS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1588,9 +1351,9 @@ IMPORTANT:
    * Set these alerts in your trading app
    * Don't change stop loss to avoid loss - discipline is key!
    * Review your position every week
-"""
+""")
     
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 # ============================================================================
@@ -1612,11 +1375,12 @@ def format_comparison_table(
         Formatted comparison table
     """
     if output_mode == 'bot':
-        message = f"""
+        parts = [f"""
 {_get_emoji('compare', 'bot')} *STOCK COMPARISON*
 {'='*40}
 
-"""
+"""]
+        add = parts.append
 
         for analysis in analyses:
             symbol = analysis['symbol']
@@ -1633,34 +1397,150 @@ def format_comparison_table(
             else:
                 emoji = _get_emoji('hold', 'bot')
 
-            message += f"""
+            add(f"""
 *{symbol}*
 Price: Rs {format_number(price)} | {emoji} {rec}
 Confidence: {format_number(conf, 0)}% | R:R: {format_number(rr, 2)}:1
 {'-'*40}
 
-"""
+""")
 
-        message += f"\\n_Developed by Harsh Kandhway_\\n"
+        add(f"\\n_Developed by Harsh Kandhway_\\n")
 
     else:
-        message = f"\n{'='*80}\n  STOCK COMPARISON\n{'='*80}\n\n"
-        message += f"  {'Stock':<15} {'Price':>10} {'Action':>12} {'Confidence':>10} {'R:R':>10}\n"
-        message += f"  {'-'*70}\n"
+        parts = [f"\n{'='*80}\n  STOCK COMPARISON\n{'='*80}\n\n"]
+        add = parts.append
+        add(f"  {'Stock':<15} {'Price':>10} {'Action':>12} {'Confidence':>10} {'R:R':>10}\n")
+        add(f"  {'-'*70}\n")
 
         for a in analyses:
             rec = a['recommendation'].replace('STRONG ', '').replace('WEAK ', '')[:10]
-            message += f"  {a['symbol']:<15} Rs {a['current_price']:>8,.2f} {rec:>12} {a['confidence']:>9.0f}% {a['risk_reward']:>9.2f}:1\n"
+            add(f"  {a['symbol']:<15} Rs {a['current_price']:>8,.2f} {rec:>12} {a['confidence']:>9.0f}% {a['risk_reward']:>9.2f}:1\n")
+
+        add(f"\n{'='*80}\n")
 
-        message += f"\n{'='*80}\n"
+    return ''.join(parts).strip()
 
-    return message.strip()
+
+def format_relative_metrics(
+    relative: Dict[str, Any],
+    output_mode: str = 'bot'
+) -> str:
+    """
+    Format relative strength, correlation and beta for compared stocks
+
+    Args:
+        relative: Output of calculate_relative_metrics
+        output_mode: 'bot' or 'cli'
+
+    Returns:
+        Formatted table
+    """
+    benchmark = 'equal-weight basket' if relative['benchmark'] == 'basket' else relative['benchmark']
+    rows = [
+        (symbol, m['return_pct'], m['relative_strength'], m['beta'], m['avg_correlation'], m['volatility_pct'])
+        for symbol, m in relative['metrics'].items()
+    ]
+
+    if output_mode == 'bot':
+        parts = [
+            f"{_get_emoji('chart', 'bot')} *RELATIVE PERFORMANCE*\n"
+            f"vs {benchmark}, last {relative['bars']} trading days\n\n"
+        ]
+        for symbol, ret, rs, beta, corr, vol in rows:
+            parts.append(
+                f"*{symbol}*\n"
+                f"Return: {format_percentage(ret)} | RS: {format_number(rs, 2)}\n"
+                f"Beta: {format_number(beta, 2)} | Corr: {format_number(corr, 2)} | "
+                f"Vol: {format_number(vol, 1)}%\n\n"
+            )
+        parts.append("_RS > 1 beat the benchmark; Corr is the average with the other stocks._")
+    else:
+        parts = [f"\n  RELATIVE PERFORMANCE vs {benchmark} ({relative['bars']} days)\n"]
+        parts.append(f"  {'Stock':<15} {'Return':>9} {'RS':>7} {'Beta':>7} {'Corr':>7} {'Vol':>8}\n")
+        parts.append(f"  {'-'*58}\n")
+        for symbol, ret, rs, beta, corr, vol in rows:
+            parts.append(
+                f"  {symbol:<15} {format_percentage(ret):>9} {format_number(rs, 2):>7} "
+                f"{format_number(beta, 2):>7} {format_number(corr, 2):>7} {format_number(vol, 1):>7}%\n"
+            )
+
+    return ''.join(parts).strip()
+
+
+METHOD_LABELS = {
+    'confidence': 'confidence-weighted',
+    'inverse_vol': 'inverse volatility',
+    'risk_parity': 'risk parity',
+    'mean_variance': 'mean-variance',
+}
+
+
+def format_allocation(
+    allocation: Dict[str, Any],
+    capital: float,
+    output_mode: str = 'cli'
+) -> str:
+    """
+    Format a suggested capital split across stocks
+
+    Args:
+        allocation: Output of calculate_portfolio_allocation
+        capital: Capital that was allocated
+        output_mode: 'bot' or 'cli'
+
+    Returns:
+        Formatted allocation table
+    """
+    method = METHOD_LABELS.get(allocation.get('method'), allocation.get('method') or '')
+    positions = allocation['investable']
+    currency = BOT_CURRENCY if output_mode == 'bot' else CURRENCY_SYMBOL
+
+    if output_mode == 'bot':
+        parts = [f"{_get_emoji('portfolio', 'bot')} *SUGGESTED ALLOCATION* ({method})\n\n"]
+        for p in positions:
+            risk = f" | Risk: {format_number(p['risk_contribution_pct'], 1)}%" if p.get('risk_contribution_pct') is not None else ''
+            parts.append(
+                f"*{p['symbol']}*: {p['shares']} @ {currency}{format_number(p['entry_price'])}\n"
+                f"Weight: {format_number(p['weight_pct'], 1)}% | {currency}{format_number(p['allocated_amount'])}{risk}\n\n"
+            )
+    else:
+        parts = [f"\n  SUGGESTED ALLOCATION - {method} ({currency}{format_number(capital)})\n"]
+        if positions:
+            parts.append(f"  {'Stock':<15} {'Shares':>8} {'Price':>12} {'Amount':>14} {'Weight':>8} {'Risk':>7}\n")
+            parts.append(f"  {'-'*68}\n")
+        for p in positions:
+            risk = format_number(p['risk_contribution_pct'], 1) + '%' if p.get('risk_contribution_pct') is not None else '-'
+            parts.append(
+                f"  {p['symbol']:<15} {p['shares']:>8} {format_number(p['entry_price']):>12} "
+                f"{format_number(p['allocated_amount']):>14} {format_number(p['weight_pct'], 1) + '%':>8} {risk:>7}\n"
+            )
+
+    indent = '  ' if output_mode == 'cli' else ''
+    if positions:
+        parts.append(
+            f"{indent}Invested: {currency}{format_number(allocation['total_allocated'])} | "
+            f"Cash: {currency}{format_number(allocation['cash_remaining'])}\n"
+        )
+        if allocation.get('volatility_pct') is not None:
+            parts.append(
+                f"{indent}Portfolio volatility: {format_number(allocation['volatility_pct'], 1)}%/yr | "
+                f"Avg correlation: {format_number(allocation.get('avg_correlation'), 2)}\n"
+            )
+    else:
+        parts.append(f"{indent}{allocation.get('explanation', 'Nothing to allocate.')}\n")
+
+    for item in allocation.get('not_recommended', []):
+        parts.append(f"{indent}Skipped {item['symbol']}: {item['reason']}\n")
+
+    return ''.join(parts).rstrip()
 
 
 def format_watchlist(
     watchlist: List,
     output_mode: str = 'bot',
-    show_details: bool = False
+    show_details: bool = False,
+    digests: Optional[Dict[str, Dict]] = None
 ) -> str:
     """
     Format watchlist for display
@@ -1669,24 +1549,31 @@ def format_watchlist(
         watchlist: List of watchlist items
         output_mode: 'bot' or 'cli'
         show_details: Whether to show additional details
+        digests: Symbol -> after-close digest summary (digest_date, price,
+                 change_pct, recommendation, highlights) to show under each
+                 symbol
 
     Returns:
         Formatted watchlist string
     """
     if not watchlist:
         if output_mode == 'bot':
-            return f"{_get_emoji('info', 'bot')} Your watchlist is empty.\\n\\nUse /watchlist add \\[SYMBOL\\] to add stocks\\."
+            return f"{_get_emoji('info', 'bot')} Your watchlist is empty.\n\nUse /watchlist add \\[SYMBOL\\] to add stocks."
         else:
             return "[INFO] Your watchlist is empty.\n\nUse the watchlist command to add stocks."
 
     if output_mode == 'bot':
-        message = f"""
-{_get_emoji('watchlist', 'bot')} *YOUR WATCHLIST* \\({len(watchlist)} stocks\\)
+        parts = [f"""
+{_get_emoji('watchlist', 'bot')} *YOUR WATCHLIST* ({len(watchlist)} stocks)
 {'='*40}
 
-"""
+"""]
+        add = parts.append
     else:
-        message = f"\n{'='*60}\n  YOUR WATCHLIST ({len(watchlist)} stocks)\n{'='*60}\n\n"
+        parts = [f"\n{'='*60}\n  YOUR WATCHLIST ({len(watchlist)} stocks)\n{'='*60}\n\n"]
+        add = parts.append
+
+    digests = digests or {}
 
     for item in watchlist:
         # Handle both dict and object
@@ -1698,31 +1585,45 @@ def format_watchlist(
             symbol = item.symbol
             added_at = getattr(item, 'added_at', None)
             notes = getattr(item, 'notes', None)
+        digest = digests.get(symbol)
+        as_of = ''
+        if digest and digest.get('digest_date'):
+            as_of = f" | close of {digest['digest_date'].strftime('%d %b')}"
 
         if output_mode == 'bot':
-            message += f"{_get_emoji('chart', 'bot')} *{symbol}*\\n"
+            add(f"{_get_emoji('chart', 'bot')} *{symbol}*\n")
+
+            if digest:
+                add(f"   {BOT_CURRENCY}{digest['price']:,.2f} | {digest['change_pct']:+.2f}% | {digest['recommendation']}{as_of}\n")
+                for highlight in digest['highlights']:
+                    add(f"   ↳ {highlight}\n")
 
             if show_details and added_at:
                 added_date = added_at.strftime('%b %d, %Y') if isinstance(added_at, datetime) else added_at
-                message += f"   Added: {added_date}\\n"
+                add(f"   Added: {added_date}\n")
 
             if show_details and notes:
-                message += f"   Notes: {notes}\\n"
+                add(f"   Notes: {notes}\n")
 
-            message += "\\n"
+            add("\n")
         else:
-            message += f"  * {symbol}\n"
+            add(f"  * {symbol}\n")
+
+            if digest:
+                add(f"     {CURRENCY_SYMBOL}{digest['price']:,.2f} | {digest['change_pct']:+.2f}% | {digest['recommendation']}{as_of}\n")
+                for highlight in digest['highlights']:
+                    add(f"     -> {highlight}\n")
 
             if show_details and added_at:
                 added_date = added_at.strftime('%b %d, %Y') if isinstance(added_at, datetime) else added_at
-                message += f"     Added: {added_date}\n"
+                add(f"     Added: {added_date}\n")
 
             if show_details and notes:
-                message += f"     Notes: {notes}\n"
+                add(f"     Notes: {notes}\n")
 
-            message += "\n"
+            add("\n")
 
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 def format_portfolio(
@@ -1748,13 +1649,15 @@ def format_portfolio(
             return "[INFO] Your portfolio is empty.\n\nUse the portfolio command to add positions."
 
     if output_mode == 'bot':
-        message = f"""
+        parts = [f"""
 {_get_emoji('portfolio', 'bot')} *YOUR PORTFOLIO* \\({len(portfolio)} positions\\)
 {'='*40}
 
-"""
+"""]
+        add = parts.append
     else:
-        message = f"\n{'='*60}\n  YOUR PORTFOLIO ({len(portfolio)} positions)\n{'='*60}\n\n"
+        parts = [f"\n{'='*60}\n  YOUR PORTFOLIO ({len(portfolio)} positions)\n{'='*60}\n\n"]
+        add = parts.append
 
     total_investment = 0
     total_current_value = 0
@@ -1768,15 +1671,15 @@ def format_portfolio(
         total_investment += investment
 
         if output_mode == 'bot':
-            message += f"{_get_emoji('chart', 'bot')} *{symbol}*\\n"
-            message += f"   Shares: {format_number(shares, 2)}\\n"
-            message += f"   Avg Price: Rs {format_number(avg_price)}\\n"
-            message += f"   Investment: Rs {format_number(investment)}\\n"
+            add(f"{_get_emoji('chart', 'bot')} *{symbol}*\\n")
+            add(f"   Shares: {format_number(shares, 2)}\\n")
+            add(f"   Avg Price: Rs {format_number(avg_price)}\\n")
+            add(f"   Investment: Rs {format_number(investment)}\\n")
         else:
-            message += f"  * {symbol}\n"
-            message += f"     Shares: {format_number(shares, 2)}\n"
-            message += f"     Avg Price: Rs {format_number(avg_price)}\n"
-            message += f"     Investment: Rs {format_number(investment)}\n"
+            add(f"  * {symbol}\n")
+            add(f"     Shares: {format_number(shares, 2)}\n")
+            add(f"     Avg Price: Rs {format_number(avg_price)}\n")
+            add(f"     Investment: Rs {format_number(investment)}\n")
 
         # If current prices provided, calculate P&L
         if current_prices and symbol in current_prices:
@@ -1790,15 +1693,15 @@ def format_portfolio(
             pnl_emoji = _get_emoji('profit' if pnl >= 0 else 'loss', output_mode)
 
             if output_mode == 'bot':
-                message += f"   Current: Rs {format_number(current_price)}\\n"
-                message += f"   Value: Rs {format_number(current_value)}\\n"
-                message += f"   P&L: {pnl_emoji} Rs {format_number(pnl)} \\({format_percentage(pnl_pct)}\\)\\n"
+                add(f"   Current: Rs {format_number(current_price)}\\n")
+                add(f"   Value: Rs {format_number(current_value)}\\n")
+                add(f"   P&L: {pnl_emoji} Rs {format_number(pnl)} \\({format_percentage(pnl_pct)}\\)\\n")
             else:
-                message += f"     Current: Rs {format_number(current_price)}\n"
-                message += f"     Value: Rs {format_number(current_value)}\n"
-                message += f"     P&L: {pnl_emoji} Rs {format_number(pnl)} ({format_percentage(pnl_pct)})\n"
+                add(f"     Current: Rs {format_number(current_price)}\n")
+                add(f"     Value: Rs {format_number(current_value)}\n")
+                add(f"     P&L: {pnl_emoji} Rs {format_number(pnl)} ({format_percentage(pnl_pct)})\n")
 
-        message += "\\n" if output_mode == 'bot' else "\n"
+        add("\\n" if output_mode == 'bot' else "\n")
 
     # Portfolio Summary
     if current_prices and total_current_value > 0:
@@ -1807,25 +1710,25 @@ def format_portfolio(
         pnl_emoji = _get_emoji('profit' if total_pnl >= 0 else 'loss', output_mode)
 
         if output_mode == 'bot':
-            message += f"""
+            add(f"""
 {'='*40}
 {_get_emoji('info', 'bot')} *PORTFOLIO SUMMARY*
 {'='*40}
 Total Investment: Rs {format_number(total_investment)}
 Current Value: Rs {format_number(total_current_value)}
 Total P&L: {pnl_emoji} Rs {format_number(total_pnl)} \\({format_percentage(total_pnl_pct)}\\)
-"""
+""")
         else:
-            message += f"""
+            add(f"""
 {'='*60}
   PORTFOLIO SUMMARY
 {'='*60}
 Total Investment: Rs {format_number(total_investment)}
 Current Value: Rs {format_number(total_current_value)}
 Total P&L: {pnl_emoji} Rs {format_number(total_pnl)} ({format_percentage(total_pnl_pct)})
-"""
+""")
 
-    return message.strip()
+    return ''.join(parts).strip()
 
 
 # ============================================================================
@@ -1938,18 +1841,20 @@ def format_alert_list(alerts: List[Dict], output_mode: str = 'bot') -> str:
     alert_emoji = _get_emoji('alert', output_mode)
 
     if output_mode == 'bot':
-        message = f"""
+        parts = [f"""
 {alert_emoji} *YOUR ALERTS* \\({len(alerts)} active\\)
 {'='*40}
 
-"""
+"""]
+        add = parts.append
         for alert in alerts:
-            message += format_alert(alert, output_mode) + "\\n"
-            message += f"{'-'*40}\\n\\n"
+            add(format_alert(alert, output_mode) + "\\n")
+            add(f"{'-'*40}\\n\\n")
     else:
-        message = f"\n{'='*60}\n  YOUR ALERTS ({len(alerts)} active)\n{'='*60}\n\n"
+        parts = [f"\n{'='*60}\n  YOUR ALERTS ({len(alerts)} active)\n{'='*60}\n\n"]
+        add = parts.append
         for alert in alerts:
-            message += format_alert(alert, output_mode) + "\n"
-            message += f"{'-'*60}\n\n"
+            add(format_alert(alert, output_mode) + "\n")
+            add(f"{'-'*60}\n\n")
 
-    return message.strip()
+    return ''.join(parts).strip()
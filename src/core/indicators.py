@@ -15,6 +15,7 @@ from ta.volume import OnBalanceVolumeIndicator
 
 from .config import TIMEFRAME_CONFIGS, FIBONACCI_RETRACEMENT, FIBONACCI_EXTENSION
 from .patterns import detect_all_patterns
+from .timing import stage
 
 
 def calculate_emas(close: pd.Series, config: dict) -> Dict[str, pd.Series]:
@@ -44,47 +45,73 @@ def calculate_emas(close: pd.Series, config: dict) -> Dict[str, pd.Series]:
     return emas
 
 
-def calculate_rsi(close: pd.Series, config: dict) -> Dict[str, any]:
-    """Calculate RSI indicator"""
-    rsi_indicator = RSIIndicator(close, window=config['rsi_period'])
-    rsi = rsi_indicator.rsi()
-    
-    latest_rsi = rsi.iloc[-1] if len(rsi) > 0 and not pd.isna(rsi.iloc[-1]) else 50
-    
-    # Determine RSI zone
+def classify_rsi_zone(latest_rsi: float) -> str:
+    """Map an RSI value to its zone"""
     if latest_rsi >= 80:
-        zone = 'extremely_overbought'
+        return 'extremely_overbought'
     elif latest_rsi >= 70:
-        zone = 'overbought'
+        return 'overbought'
     elif latest_rsi >= 60:
-        zone = 'slightly_overbought'
+        return 'slightly_overbought'
     elif latest_rsi >= 40:
-        zone = 'neutral'
+        return 'neutral'
     elif latest_rsi >= 30:
-        zone = 'slightly_oversold'
+        return 'slightly_oversold'
     elif latest_rsi >= 20:
-        zone = 'oversold'
+        return 'oversold'
     else:
-        zone = 'extremely_oversold'
+        return 'extremely_oversold'
+
+
+def classify_rsi_direction(latest_rsi: float, rsi_5_ago: float) -> str:
+    """RSI direction from the value 5 bars ago"""
+    if latest_rsi > rsi_5_ago + 5:
+        return 'rising'
+    elif latest_rsi < rsi_5_ago - 5:
+        return 'falling'
+    return 'neutral'
+
+
+def calculate_rsi(close: pd.Series, config: dict) -> Dict[str, any]:
+    """Calculate RSI indicator"""
+    rsi_indicator = RSIIndicator(close, window=config['rsi_period'])
+    rsi = rsi_indicator.rsi()
+    
+    latest_rsi = rsi.iloc[-1] if len(rsi) > 0 and not pd.isna(rsi.iloc[-1]) else 50
     
     # RSI direction (trending up or down)
     rsi_direction = 'neutral'
     if len(rsi) >= 5:
         rsi_5_ago = rsi.iloc[-5] if not pd.isna(rsi.iloc[-5]) else latest_rsi
-        if latest_rsi > rsi_5_ago + 5:
-            rsi_direction = 'rising'
-        elif latest_rsi < rsi_5_ago - 5:
-            rsi_direction = 'falling'
+        rsi_direction = classify_rsi_direction(latest_rsi, rsi_5_ago)
     
     return {
         'rsi_series': rsi,
         'rsi': latest_rsi,
-        'rsi_zone': zone,
+        'rsi_zone': classify_rsi_zone(latest_rsi),
         'rsi_direction': rsi_direction,
         'rsi_period': config['rsi_period']
     }
 
 
+def classify_macd_crossover(latest_hist: float, prev_hist: float) -> str:
+    """MACD crossover from the last two histogram values"""
+    if latest_hist > 0 and prev_hist <= 0:
+        return 'bullish'
+    elif latest_hist < 0 and prev_hist >= 0:
+        return 'bearish'
+    return 'none'
+
+
+def classify_hist_direction(latest_hist: float, hist_3_ago: float) -> str:
+    """MACD histogram direction from the value 3 bars ago"""
+    if latest_hist > hist_3_ago:
+        return 'expanding'
+    elif latest_hist < hist_3_ago:
+        return 'contracting'
+    return 'neutral'
+
+
 def calculate_macd(close: pd.Series, config: dict) -> Dict[str, any]:
     """Calculate MACD indicator"""
     macd_indicator = MACD(
@@ -106,19 +133,13 @@ def calculate_macd(close: pd.Series, config: dict) -> Dict[str, any]:
     crossover = 'none'
     if len(histogram) >= 2:
         prev_hist = histogram.iloc[-2] if not pd.isna(histogram.iloc[-2]) else 0
-        if latest_hist > 0 and prev_hist <= 0:
-            crossover = 'bullish'
-        elif latest_hist < 0 and prev_hist >= 0:
-            crossover = 'bearish'
+        crossover = classify_macd_crossover(latest_hist, prev_hist)
     
     # Histogram direction
     hist_direction = 'neutral'
     if len(histogram) >= 3:
         hist_3_ago = histogram.iloc[-3] if not pd.isna(histogram.iloc[-3]) else latest_hist
-        if latest_hist > hist_3_ago:
-            hist_direction = 'expanding'
-        elif latest_hist < hist_3_ago:
-            hist_direction = 'contracting'
+        hist_direction = classify_hist_direction(latest_hist, hist_3_ago)
     
     return {
         'macd_line': macd_line,
@@ -134,6 +155,29 @@ def calculate_macd(close: pd.Series, config: dict) -> Dict[str, any]:
     }
 
 
+def classify_adx_strength(latest_adx: float) -> str:
+    """Map an ADX value to a trend strength"""
+    if latest_adx >= 60:
+        return 'very_strong_trend'
+    elif latest_adx >= 40:
+        return 'strong_trend'
+    elif latest_adx >= 25:
+        return 'trend'
+    elif latest_adx >= 20:
+        return 'weak_trend'
+    else:
+        return 'no_trend'
+
+
+def classify_di_direction(plus_di: float, minus_di: float) -> str:
+    """Trend direction from the directional indicators"""
+    if plus_di > minus_di + 5:
+        return 'bullish'
+    elif minus_di > plus_di + 5:
+        return 'bearish'
+    return 'neutral'
+
+
 def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, config: dict) -> Dict[str, any]:
     """Calculate ADX indicator for trend strength"""
     adx_indicator = ADXIndicator(high, low, close, window=config['adx_period'])
@@ -146,35 +190,30 @@ def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, config: dic
     latest_plus_di = plus_di.iloc[-1] if len(plus_di) > 0 and not pd.isna(plus_di.iloc[-1]) else 25
     latest_minus_di = minus_di.iloc[-1] if len(minus_di) > 0 and not pd.isna(minus_di.iloc[-1]) else 25
     
-    # Determine trend strength
-    if latest_adx >= 60:
-        strength = 'very_strong_trend'
-    elif latest_adx >= 40:
-        strength = 'strong_trend'
-    elif latest_adx >= 25:
-        strength = 'trend'
-    elif latest_adx >= 20:
-        strength = 'weak_trend'
-    else:
-        strength = 'no_trend'
-    
-    # Trend direction from DI
-    trend_direction = 'neutral'
-    if latest_plus_di > latest_minus_di + 5:
-        trend_direction = 'bullish'
-    elif latest_minus_di > latest_plus_di + 5:
-        trend_direction = 'bearish'
-    
     return {
         'adx': latest_adx,
         'plus_di': latest_plus_di,
         'minus_di': latest_minus_di,
-        'adx_strength': strength,
-        'adx_trend_direction': trend_direction,
+        'adx_strength': classify_adx_strength(latest_adx),
+        'adx_trend_direction': classify_di_direction(latest_plus_di, latest_minus_di),
         'trend_exists': latest_adx >= 25,
     }
 
 
+def classify_volatility(atr_percent: float) -> str:
+    """Map ATR as a percentage of price to a volatility level"""
+    if atr_percent >= 5:
+        return 'very_high'
+    elif atr_percent >= 3:
+        return 'high'
+    elif atr_percent >= 1.5:
+        return 'normal'
+    elif atr_percent >= 0.75:
+        return 'low'
+    else:
+        return 'very_low'
+
+
 def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, config: dict) -> Dict[str, any]:
     """Calculate ATR for volatility"""
     atr_indicator = AverageTrueRange(high, low, close, window=config['atr_period'])
@@ -184,25 +223,25 @@ def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, config: dic
     latest_price = close.iloc[-1]
     atr_percent = (latest_atr / latest_price) * 100
     
-    # Volatility level
-    if atr_percent >= 5:
-        volatility = 'very_high'
-    elif atr_percent >= 3:
-        volatility = 'high'
-    elif atr_percent >= 1.5:
-        volatility = 'normal'
-    elif atr_percent >= 0.75:
-        volatility = 'low'
-    else:
-        volatility = 'very_low'
-    
     return {
         'atr': latest_atr,
         'atr_percent': atr_percent,
-        'volatility_level': volatility,
+        'volatility_level': classify_volatility(atr_percent),
     }
 
 
+def classify_bb_position(price: float, upper: float, middle: float, lower: float) -> str:
+    """Position of the price within the Bollinger Bands"""
+    if price > upper:
+        return 'above_upper'
+    elif price > middle:
+        return 'upper_half'
+    elif price > lower:
+        return 'lower_half'
+    else:
+        return 'below_lower'
+
+
 def calculate_bollinger_bands(close: pd.Series, config: dict) -> Dict[str, any]:
     """Calculate Bollinger Bands"""
     bb = BollingerBands(close, window=config['bb_period'], window_dev=config['bb_std'])
@@ -221,26 +260,30 @@ def calculate_bollinger_bands(close: pd.Series, config: dict) -> Dict[str, any]:
     
     latest_price = close.iloc[-1]
     
-    # Position within bands
-    if latest_price > latest_upper:
-        position = 'above_upper'
-    elif latest_price > latest_middle:
-        position = 'upper_half'
-    elif latest_price > latest_lower:
-        position = 'lower_half'
-    else:
-        position = 'below_lower'
-    
     return {
         'bb_upper': latest_upper,
         'bb_middle': latest_middle,
         'bb_lower': latest_lower,
         'bb_percent': latest_percent_b,
         'bb_bandwidth': latest_bandwidth,
-        'bb_position': position,
+        'bb_position': classify_bb_position(latest_price, latest_upper, latest_middle, latest_lower),
     }
 
 
+def classify_stoch_zone(latest_k: float) -> str:
+    """Map a stochastic %K value to its zone"""
+    if latest_k >= 85:
+        return 'extremely_overbought'
+    elif latest_k >= 80:
+        return 'overbought'
+    elif latest_k <= 15:
+        return 'extremely_oversold'
+    elif latest_k <= 20:
+        return 'oversold'
+    else:
+        return 'neutral'
+
+
 def calculate_stochastic(high: pd.Series, low: pd.Series, close: pd.Series, config: dict) -> Dict[str, any]:
     """Calculate Stochastic Oscillator"""
     stoch = StochasticOscillator(high, low, close, window=14, smooth_window=3)
@@ -251,25 +294,37 @@ def calculate_stochastic(high: pd.Series, low: pd.Series, close: pd.Series, conf
     latest_k = stoch_k.iloc[-1] if len(stoch_k) > 0 and not pd.isna(stoch_k.iloc[-1]) else 50
     latest_d = stoch_d.iloc[-1] if len(stoch_d) > 0 and not pd.isna(stoch_d.iloc[-1]) else 50
     
-    # Determine zone
-    if latest_k >= 85:
-        zone = 'extremely_overbought'
-    elif latest_k >= 80:
-        zone = 'overbought'
-    elif latest_k <= 15:
-        zone = 'extremely_oversold'
-    elif latest_k <= 20:
-        zone = 'oversold'
-    else:
-        zone = 'neutral'
-    
     return {
         'stoch_k': latest_k,
         'stoch_d': latest_d,
-        'stoch_zone': zone,
+        'stoch_zone': classify_stoch_zone(latest_k),
     }
 
 
+def classify_volume_level(volume_ratio: float) -> str:
+    """Map latest/average volume to a volume level"""
+    if volume_ratio >= 2.0:
+        return 'very_high'
+    elif volume_ratio >= 1.5:
+        return 'high'
+    elif volume_ratio >= 0.7:
+        return 'normal'
+    elif volume_ratio >= 0.5:
+        return 'low'
+    else:
+        return 'very_low'
+
+
+def classify_obv_trend(latest_obv: float, obv_10_ago: float) -> str:
+    """OBV trend from the value 10 bars ago"""
+    obv_change = (latest_obv - obv_10_ago) / abs(obv_10_ago) * 100 if obv_10_ago != 0 else 0
+    if obv_change > 5:
+        return 'rising'
+    elif obv_change < -5:
+        return 'falling'
+    return 'neutral'
+
+
 def calculate_volume_indicators(df: pd.DataFrame, config: dict) -> Dict[str, any]:
     """Calculate volume-based indicators"""
     close = df['close']
@@ -288,27 +343,11 @@ def calculate_volume_indicators(df: pd.DataFrame, config: dict) -> Dict[str, any
     obv_trend = 'neutral'
     if len(obv) >= 10:
         obv_10_ago = obv.iloc[-10] if not pd.isna(obv.iloc[-10]) else obv.iloc[-1]
-        obv_change = (obv.iloc[-1] - obv_10_ago) / abs(obv_10_ago) * 100 if obv_10_ago != 0 else 0
-        if obv_change > 5:
-            obv_trend = 'rising'
-        elif obv_change < -5:
-            obv_trend = 'falling'
-    
-    # Volume level
-    if volume_ratio >= 2.0:
-        volume_level = 'very_high'
-    elif volume_ratio >= 1.5:
-        volume_level = 'high'
-    elif volume_ratio >= 0.7:
-        volume_level = 'normal'
-    elif volume_ratio >= 0.5:
-        volume_level = 'low'
-    else:
-        volume_level = 'very_low'
+        obv_trend = classify_obv_trend(obv.iloc[-1], obv_10_ago)
     
     return {
         'volume_ratio': volume_ratio,
-        'volume_level': volume_level,
+        'volume_level': classify_volume_level(volume_ratio),
         'avg_volume': avg_volume,
         'latest_volume': latest_volume,
         'obv_trend': obv_trend,
@@ -370,6 +409,15 @@ def detect_divergence(
     return 'none'
 
 
+def classify_level_proximity(distance_percent: float) -> str:
+    """Proximity of a support/resistance level from its distance in percent"""
+    if distance_percent <= 2:
+        return 'very_close'
+    elif distance_percent <= 5:
+        return 'close'
+    return 'far'
+
+
 def calculate_support_resistance(df: pd.DataFrame, config: dict) -> Dict[str, any]:
     """Calculate support and resistance levels"""
     high = df['high']
@@ -392,21 +440,6 @@ def calculate_support_resistance(df: pd.DataFrame, config: dict) -> Dict[str, an
     distance_to_resistance = ((recent_high - current_price) / current_price) * 100
     distance_to_support = ((current_price - recent_low) / current_price) * 100
     
-    # Proximity assessment
-    if distance_to_resistance <= 2:
-        resistance_proximity = 'very_close'
-    elif distance_to_resistance <= 5:
-        resistance_proximity = 'close'
-    else:
-        resistance_proximity = 'far'
-    
-    if distance_to_support <= 2:
-        support_proximity = 'very_close'
-    elif distance_to_support <= 5:
-        support_proximity = 'close'
-    else:
-        support_proximity = 'far'
-    
     return {
         'resistance': recent_high,
         'support': recent_low,
@@ -414,8 +447,8 @@ def calculate_support_resistance(df: pd.DataFrame, config: dict) -> Dict[str, an
         'low_52w': all_time_low,
         'distance_to_resistance': distance_to_resistance,
         'distance_to_support': distance_to_support,
-        'resistance_proximity': resistance_proximity,
-        'support_proximity': support_proximity,
+        'resistance_proximity': classify_level_proximity(distance_to_resistance),
+        'support_proximity': classify_level_proximity(distance_to_support),
     }
 
 
@@ -445,6 +478,19 @@ def calculate_fibonacci_levels(high: float, low: float, current_price: float) ->
     }
 
 
+def classify_momentum(momentum: float) -> str:
+    """Momentum direction from the percent change over the momentum period"""
+    if momentum > 5:
+        return 'strong_up'
+    elif momentum > 2:
+        return 'up'
+    elif momentum < -5:
+        return 'strong_down'
+    elif momentum < -2:
+        return 'down'
+    return 'neutral'
+
+
 def calculate_momentum(close: pd.Series, config: dict) -> Dict[str, any]:
     """Calculate price momentum"""
     period = config['momentum_period']
@@ -460,31 +506,60 @@ def calculate_momentum(close: pd.Series, config: dict) -> Dict[str, any]:
     
     momentum = ((current - past) / past) * 100
     
-    if momentum > 5:
-        direction = 'strong_up'
-    elif momentum > 2:
-        direction = 'up'
-    elif momentum < -5:
-        direction = 'strong_down'
-    elif momentum < -2:
-        direction = 'down'
-    else:
-        direction = 'neutral'
-    
     return {
         'momentum': momentum,
-        'momentum_direction': direction,
+        'momentum_direction': classify_momentum(momentum),
         'momentum_period': period,
     }
 
 
+def combine_divergence(rsi_divergence: str, macd_divergence: str) -> str:
+    """Combined divergence signal (bearish takes precedence)"""
+    if rsi_divergence == 'bearish' or macd_divergence == 'bearish':
+        return 'bearish'
+    elif rsi_divergence == 'bullish' or macd_divergence == 'bullish':
+        return 'bullish'
+    return 'none'
+
+
+def classify_ema_alignment(price: float, fast: float, medium: float, slow: float, trend: float) -> str:
+    """EMA alignment (bullish: fast > medium > slow > trend)"""
+    if fast > medium > slow > trend:
+        return 'strong_bullish'
+    elif price > trend and fast > medium:
+        return 'bullish'
+    elif fast < medium < slow < trend:
+        return 'strong_bearish'
+    elif price < trend and fast < medium:
+        return 'bearish'
+    return 'neutral'
+
+
+def classify_market_phase(ema_alignment: str, price: float, ema_trend: float, trend_exists: bool) -> str:
+    """Market phase from EMA alignment, the trend EMA and ADX trend presence"""
+    if ema_alignment == 'strong_bullish' and trend_exists:
+        return 'strong_uptrend'
+    elif price > ema_trend and trend_exists:
+        return 'uptrend'
+    elif price > ema_trend and not trend_exists:
+        return 'weak_uptrend'
+    elif ema_alignment == 'strong_bearish' and trend_exists:
+        return 'strong_downtrend'
+    elif price < ema_trend and trend_exists:
+        return 'downtrend'
+    elif price < ema_trend and not trend_exists:
+        return 'weak_downtrend'
+    return 'consolidation'
+
+
 def calculate_all_indicators(df: pd.DataFrame, timeframe: str = 'medium') -> Dict[str, any]:
     """
     Calculate all technical indicators for analysis
     
     Args:
         df: DataFrame with OHLCV data
-        timeframe: 'short' or 'medium'
+        timeframe: 'short' or 'medium' for daily bars, 'intraday' for
+                   intraday bars (see src.core.intraday)
     
     Returns:
         Dictionary containing all calculated indicators
@@ -501,7 +576,7 @@ def calculate_all_indicators(df: pd.DataFrame, timeframe: str = 'medium') -> Dic
     
     # Validate timeframe
     if timeframe not in TIMEFRAME_CONFIGS:
-        raise ValueError(f"Invalid timeframe '{timeframe}'. Must be 'short' or 'medium'")
+        raise ValueError(f"Invalid timeframe '{timeframe}'. Must be one of: {', '.join(TIMEFRAME_CONFIGS)}")
     
     config = TIMEFRAME_CONFIGS[timeframe]
     
@@ -511,8 +586,8 @@ def calculate_all_indicators(df: pd.DataFrame, timeframe: str = 'medium') -> Dic
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
-    # Check minimum data length (need at least 200 days for medium, 100 for short)
-    min_length = 200 if timeframe == 'medium' else 100
+    # Check minimum data length (200 bars for medium, 100 for short and intraday)
+    min_length = config['min_bars']
     if len(df) < min_length:
         raise ValueError(
             f"Insufficient data: {len(df)} rows, need at least {min_length} "
@@ -556,13 +631,7 @@ def calculate_all_indicators(df: pd.DataFrame, timeframe: str = 'medium') -> Dic
     rsi_divergence = detect_divergence(close, rsi_data['rsi_series'], config['divergence_lookback'])
     macd_divergence = detect_divergence(close, macd_data['histogram'], config['divergence_lookback'])
     
-    # Combined divergence signal
-    if rsi_divergence == 'bearish' or macd_divergence == 'bearish':
-        divergence = 'bearish'
-    elif rsi_divergence == 'bullish' or macd_divergence == 'bullish':
-        divergence = 'bullish'
-    else:
-        divergence = 'none'
+    divergence = combine_divergence(rsi_divergence, macd_divergence)
     
     # EMA alignment check
     latest_ema_fast = emas['ema_fast'].iloc[-1] if not pd.isna(emas['ema_fast'].iloc[-1]) else current_price
@@ -570,37 +639,17 @@ def calculate_all_indicators(df: pd.DataFrame, timeframe: str = 'medium') -> Dic
     latest_ema_slow = emas['ema_slow'].iloc[-1] if not pd.isna(emas['ema_slow'].iloc[-1]) else current_price
     latest_ema_trend = emas['ema_trend'].iloc[-1] if len(emas['ema_trend']) > 0 and not pd.isna(emas['ema_trend'].iloc[-1]) else current_price
     
-    # EMA alignment (bullish: fast > medium > slow > trend)
-    if latest_ema_fast > latest_ema_medium > latest_ema_slow > latest_ema_trend:
-        ema_alignment = 'strong_bullish'
-    elif current_price > latest_ema_trend and latest_ema_fast > latest_ema_medium:
-        ema_alignment = 'bullish'
-    elif latest_ema_fast < latest_ema_medium < latest_ema_slow < latest_ema_trend:
-        ema_alignment = 'strong_bearish'
-    elif current_price < latest_ema_trend and latest_ema_fast < latest_ema_medium:
-        ema_alignment = 'bearish'
-    else:
-        ema_alignment = 'neutral'
-    
-    # Market phase determination
-    if ema_alignment == 'strong_bullish' and adx_data['trend_exists']:
-        market_phase = 'strong_uptrend'
-    elif current_price > latest_ema_trend and adx_data['trend_exists']:
-        market_phase = 'uptrend'
-    elif current_price > latest_ema_trend and not adx_data['trend_exists']:
-        market_phase = 'weak_uptrend'
-    elif ema_alignment == 'strong_bearish' and adx_data['trend_exists']:
-        market_phase = 'strong_downtrend'
-    elif current_price < latest_ema_trend and adx_data['trend_exists']:
-        market_phase = 'downtrend'
-    elif current_price < latest_ema_trend and not adx_data['trend_exists']:
-        market_phase = 'weak_downtrend'
-    else:
-        market_phase = 'consolidation'
+    ema_alignment = classify_ema_alignment(
+        current_price, latest_ema_fast, latest_ema_medium, latest_ema_slow, latest_ema_trend
+    )
+    market_phase = classify_market_phase(
+        ema_alignment, current_price, latest_ema_trend, adx_data['trend_exists']
+    )
     
     # Detect chart patterns
     try:
-        pattern_data = detect_all_patterns(df)
+        with stage('analysis.patterns'):
+            pattern_data = detect_all_patterns(df)
     except Exception as e:
         # If pattern detection fails, use empty patterns
         pattern_data = {
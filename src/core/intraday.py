@@ -0,0 +1,364 @@
+"""
+Intraday Bar Store and Resampling Engine
+Append-only per-symbol ring buffers of minute bars, resampled on demand
+
+Minute (or 5-minute) bars are ingested into fixed-capacity numpy ring
+buffers, one per symbol. Ingestion is append-only: bars at or before the
+newest stored bar are dropped, except that a bar with the same timestamp as
+the newest one replaces it (the live bar is still forming). Larger bars
+(15m, 1h, daily) are built on demand with a vectorized group-by over bucket
+boundaries, so alerts and position monitoring can read fresh prices and
+bars without re-downloading daily history.
+
+Timestamps are naive UTC, matching the frames returned by the data fetchers.
+Intraday buckets are anchored at the NSE/BSE session open (09:15 IST), so
+hourly bars run 09:15-10:15, 10:15-11:15, ...; daily bars are labelled with
+the IST trading date at midnight, like daily history.
+
+Author: Harsh Kandhway
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# TIMEFRAMES
+# ============================================================================
+
+# Bar timeframe -> width in seconds
+BAR_TIMEFRAMES: Dict[str, int] = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '1h': 3600,
+    '1d': 86400,
+}
+
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+SESSION_OPEN_UTC_SECONDS = 3 * 3600 + 45 * 60  # 09:15 IST
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def bucket_starts(epoch_seconds: np.ndarray, timeframe: str) -> np.ndarray:
+    """
+    Start of the bar each timestamp falls into
+
+    Args:
+        epoch_seconds: UTC epoch seconds (int64)
+        timeframe: Key of BAR_TIMEFRAMES
+
+    Returns:
+        Bucket labels as epoch seconds (daily buckets are IST midnight as naive time)
+    """
+    if timeframe not in BAR_TIMEFRAMES:
+        raise ValueError(f"Invalid bar timeframe '{timeframe}'. Must be one of: {', '.join(BAR_TIMEFRAMES)}")
+
+    width = BAR_TIMEFRAMES[timeframe]
+    if timeframe == '1d':
+        return (epoch_seconds + IST_OFFSET_SECONDS) // width * width
+
+    anchor = SESSION_OPEN_UTC_SECONDS % width
+    return (epoch_seconds - anchor) // width * width + anchor
+
+
+def _to_epoch_seconds(index: pd.Index) -> np.ndarray:
+    """Naive-UTC DatetimeIndex to int64 epoch seconds"""
+    return pd.DatetimeIndex(index).as_unit('s').asi8
+
+
+def _to_index(epoch_seconds: np.ndarray) -> pd.DatetimeIndex:
+    """Int64 epoch seconds to naive-UTC DatetimeIndex"""
+    return pd.DatetimeIndex(epoch_seconds.astype('datetime64[s]')).as_unit('us')
+
+
+def aggregate_bars(
+    epoch_seconds: np.ndarray, values: np.ndarray, timeframe: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate sorted bars into larger bars
+
+    Args:
+        epoch_seconds: Sorted bar timestamps (int64 UTC epoch seconds)
+        values: Array of shape (5, n) with open, high, low, close, volume rows
+        timeframe: Target timeframe (key of BAR_TIMEFRAMES)
+
+    Returns:
+        Tuple of (bucket timestamps, aggregated values of shape (5, m))
+    """
+    if len(epoch_seconds) == 0:
+        return epoch_seconds[:0], values[:, :0]
+
+    buckets = bucket_starts(epoch_seconds, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    out = np.empty((5, len(starts)), dtype=float)
+    out[0] = values[0, starts]
+    out[1] = np.maximum.reduceat(values[1], starts)
+    out[2] = np.minimum.reduceat(values[2], starts)
+    out[3] = values[3, ends]
+    out[4] = np.add.reduceat(values[4], starts)
+    return buckets[starts], out
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Resample an OHLCV frame to a larger bar timeframe
+
+    The last bar may be partial (still forming) and is kept.
+
+    Args:
+        df: Frame with a naive-UTC DatetimeIndex and lowercase OHLCV columns
+        timeframe: Target timeframe (key of BAR_TIMEFRAMES)
+
+    Returns:
+        Resampled OHLCV frame
+    """
+    if df.empty:
+        return df[list(OHLCV_COLUMNS)].copy()
+
+    df = df.sort_index()
+    values = df[list(OHLCV_COLUMNS)].to_numpy(dtype=float).T
+    times, out = aggregate_bars(_to_epoch_seconds(df.index), values, timeframe)
+    return pd.DataFrame(dict(zip(OHLCV_COLUMNS, out)), index=_to_index(times))
+
+
+# ============================================================================
+# RING BUFFER
+# ============================================================================
+
+class BarRingBuffer:
+    """
+    Fixed-capacity append-only buffer of OHLCV bars for one symbol
+
+    When full, the oldest bars are overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize buffer
+
+        Args:
+            capacity: Maximum bars kept
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((5, capacity), dtype=float)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """Timestamp of the newest bar (epoch seconds)"""
+        if self._size == 0:
+            return None
+        return int(self._times[(self._start + self._size - 1) % self.capacity])
+
+    @property
+    def last_close(self) -> Optional[float]:
+        """Close of the newest bar"""
+        if self._size == 0:
+            return None
+        return float(self._values[3, (self._start + self._size - 1) % self.capacity])
+
+    def append(self, epoch_seconds: np.ndarray, values: np.ndarray) -> int:
+        """
+        Append bars newer than the newest stored bar
+
+        Args:
+            epoch_seconds: Sorted bar timestamps (int64 UTC epoch seconds)
+            values: Array of shape (5, n) with open, high, low, close, volume rows
+
+        Returns:
+            Number of new bars stored (a replaced live bar is not counted)
+        """
+        last = self.last_time
+        if last is not None and len(epoch_seconds):
+            # Replace the still-forming newest bar, drop anything older
+            same = np.flatnonzero(epoch_seconds == last)
+            if len(same):
+                self._values[:, (self._start + self._size - 1) % self.capacity] = values[:, same[-1]]
+            keep = epoch_seconds > last
+            epoch_seconds = epoch_seconds[keep]
+            values = values[:, keep]
+
+        count = len(epoch_seconds)
+        if count == 0:
+            return 0
+
+        if count > self.capacity:
+            epoch_seconds = epoch_seconds[-self.capacity:]
+            values = values[:, -self.capacity:]
+
+        positions = (self._start + self._size + np.arange(len(epoch_seconds))) % self.capacity
+        self._times[positions] = epoch_seconds
+        self._values[:, positions] = values
+
+        overflow = max(0, self._size + len(epoch_seconds) - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self.capacity, self._size + len(epoch_seconds))
+        return count
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stored bars in chronological order
+
+        Returns:
+            Tuple of (timestamps, values of shape (5, n))
+        """
+        order = (self._start + np.arange(self._size)) % self.capacity
+        return self._times[order], self._values[:, order]
+
+    def to_frame(self, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """
+        Stored bars as an OHLCV frame, optionally resampled
+
+        Args:
+            timeframe: Target timeframe (None keeps the ingested bars)
+
+        Returns:
+            OHLCV frame with a naive-UTC DatetimeIndex
+        """
+        times, values = self.arrays()
+        if timeframe is not None:
+            times, values = aggregate_bars(times, values, timeframe)
+        return pd.DataFrame(dict(zip(OHLCV_COLUMNS, values)), index=_to_index(times))
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class IntradayStore:
+    """Thread-safe collection of per-symbol bar buffers"""
+
+    def __init__(self, capacity: int = 2000, clock=time.time, bar_seconds: int = 60):
+        """
+        Initialize store
+
+        Args:
+            capacity: Bars kept per symbol
+            clock: Wall clock used for freshness checks (epoch seconds)
+            bar_seconds: Width of the ingested bars; a bar is labelled with
+                         its start, so its close is this much newer
+        """
+        self.capacity = capacity
+        self.clock = clock
+        self.bar_seconds = bar_seconds
+        self._buffers: Dict[str, BarRingBuffer] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def symbols(self):
+        """Symbols with stored bars"""
+        with self._lock:
+            return list(self._buffers)
+
+    def ingest(self, symbol: str, df: pd.DataFrame) -> int:
+        """
+        Append bars for a symbol
+
+        Args:
+            symbol: Stock symbol
+            df: Frame with a naive-UTC DatetimeIndex and lowercase OHLCV columns
+
+        Returns:
+            Number of new bars stored
+        """
+        df = df.dropna(subset=['close']).sort_index()
+        df = df[~df.index.duplicated(keep='last')]
+        values = df.reindex(columns=list(OHLCV_COLUMNS)).fillna({'volume': 0.0}).to_numpy(dtype=float).T
+        times = _to_epoch_seconds(df.index)
+
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = self._buffers[symbol] = BarRingBuffer(self.capacity)
+            return buffer.append(times, values)
+
+    def bars(self, symbol: str, timeframe: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Bars for a symbol, optionally resampled
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Target timeframe (None keeps the ingested bars)
+
+        Returns:
+            OHLCV frame, or None if nothing is stored
+        """
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None or len(buffer) == 0:
+                return None
+            times, values = buffer.arrays()
+
+        if timeframe is not None:
+            times, values = aggregate_bars(times, values, timeframe)
+        return pd.DataFrame(dict(zip(OHLCV_COLUMNS, values)), index=_to_index(times))
+
+    def latest_price(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        """
+        Close of the newest bar if the market data itself is recent enough
+
+        Freshness is judged by the newest bar's timestamp, not by when it was
+        ingested: re-downloading a feed that stopped updating does not make
+        its last bar current. The bar's own width is allowed on top of
+        max_age_seconds since the close of a bar starting at t is from up to
+        t + bar_seconds.
+
+        Args:
+            symbol: Stock symbol
+            max_age_seconds: Maximum seconds between the newest bar's end and now
+
+        Returns:
+            Price or None
+        """
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None or len(buffer) == 0:
+                return None
+            if max_age_seconds is not None and self.clock() - (buffer.last_time + self.bar_seconds) > max_age_seconds:
+                return None
+            return buffer.last_close
+
+    def latest_prices(self, symbols: Iterable[str], max_age_seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        Fresh prices for several symbols (stale or missing symbols are omitted)
+
+        Args:
+            symbols: Stock symbols
+            max_age_seconds: Maximum seconds between each newest bar's end and now
+
+        Returns:
+            Dictionary of symbol -> price
+        """
+        prices = {}
+        for symbol in symbols:
+            price = self.latest_price(symbol, max_age_seconds)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+
+    def last_time(self, symbol: str) -> Optional[int]:
+        """Timestamp of the newest stored bar (epoch seconds)"""
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            return buffer.last_time if buffer is not None else None
+
+    def discard(self, symbols: Iterable[str]):
+        """Drop buffers for symbols no longer followed"""
+        with self._lock:
+            for symbol in symbols:
+                self._buffers.pop(symbol, None)
@@ -16,7 +16,7 @@ from datetime import datetime
 from .formatters import (
     format_analysis_comprehensive,
     format_comparison_table,
-    format_portfolio
+    format_allocation
 )
 from .config import CURRENCY_SYMBOL
 
@@ -97,7 +97,7 @@ def print_portfolio_allocation(allocation_data: Dict, capital: float):
         allocation_data: Allocation dictionary with 'investable' and 'not_recommended' lists
         capital: Total capital
     """
-    output = format_portfolio(allocation_data, output_mode='cli')
+    output = format_allocation(allocation_data, capital, output_mode='cli')
     print(output)
 
 
@@ -0,0 +1,392 @@
+"""
+Pattern Reliability Calibration for Stock Analyzer Pro
+Measures how chart patterns actually played out in historical data
+
+PATTERN_HORIZONS holds textbook reliability and timing for each chart
+pattern. Calibration replays chart pattern detection over every bar of a
+universe's history and follows each new pattern forward. It records whether
+the measured_target was reached before the invalidation_level, and after how
+many days. The per-pattern results are written as a versioned JSON table.
+get_pattern_horizon reads the latest table (cached after the first read) and
+uses its reliability and min/max days in place of the static values, for
+patterns with enough resolved events.
+
+Author: Harsh Kandhway
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .patterns import CHART_PATTERN_WINDOW, PatternType, detect_chart_patterns
+
+logger = logging.getLogger(__name__)
+
+# Calibration tables live here (override with PATTERN_CALIBRATION_DIR)
+CALIBRATION_DIR = os.environ.get(
+    'PATTERN_CALIBRATION_DIR',
+    str(Path(__file__).resolve().parent.parent.parent / 'data' / 'pattern_calibration')
+)
+CALIBRATION_FILE_PATTERN = re.compile(r'^pattern_calibration_v(\d+)\.json$')
+
+DEFAULT_MAX_BARS = 252   # follow a pattern for up to one trading year
+DEFAULT_MIN_EVENTS = 30  # resolved events needed before a pattern's values are used
+MIN_PATTERN_BARS = 20    # detect_all_patterns needs at least this many bars
+
+# Outcomes of a pattern event
+HIT = 'hit'            # measured target reached first
+FAILED = 'failed'      # invalidation level reached first (or on the same bar)
+EXPIRED = 'expired'    # neither within max_bars
+OPEN = 'open'          # neither, and the history ends before max_bars
+INVALID = 'invalid'    # target or invalidation on the wrong side of the entry
+
+
+# =============================================================================
+# EVENTS
+# =============================================================================
+
+def resolve_pattern_outcome(
+    high: np.ndarray,
+    low: np.ndarray,
+    entry: int,
+    target: float,
+    invalidation: float,
+    bullish: bool,
+    max_bars: int = DEFAULT_MAX_BARS
+) -> Tuple[str, Optional[int]]:
+    """
+    Follow a pattern detected at bar `entry` forward
+
+    Args:
+        high, low: Price arrays
+        entry: Bar position the pattern was detected at
+        target: Measured target
+        invalidation: Invalidation level
+        bullish: Whether the pattern expects a rise
+        max_bars: Bars to follow the pattern for
+
+    Returns:
+        Tuple of (outcome, bars until it was decided or None if open)
+    """
+    future_high = high[entry + 1:entry + 1 + max_bars]
+    future_low = low[entry + 1:entry + 1 + max_bars]
+    if bullish:
+        target_hits = np.flatnonzero(future_high >= target)
+        failures = np.flatnonzero(future_low <= invalidation)
+    else:
+        target_hits = np.flatnonzero(future_low <= target)
+        failures = np.flatnonzero(future_high >= invalidation)
+
+    if len(failures) and (not len(target_hits) or failures[0] <= target_hits[0]):
+        return FAILED, int(failures[0]) + 1
+    if len(target_hits):
+        return HIT, int(target_hits[0]) + 1
+    if entry + max_bars >= len(high):
+        return OPEN, None
+    return EXPIRED, max_bars
+
+
+def collect_pattern_events(
+    df: pd.DataFrame,
+    symbol: str = '',
+    max_bars: int = DEFAULT_MAX_BARS
+) -> List[Dict[str, Any]]:
+    """
+    Every new chart pattern in a history and how it played out
+
+    Detection runs on the window ending at each bar, exactly as
+    detect_all_patterns would see it on that day. A pattern that is still
+    detected on the next bar is the same formation and is not counted again.
+
+    Args:
+        df: OHLCV DataFrame
+        symbol: Symbol stored on the events
+        max_bars: Bars to follow each pattern for
+
+    Returns:
+        List of event dictionaries
+
+    Raises:
+        ValueError: If required columns are missing
+    """
+    missing_columns = [col for col in ('close', 'high', 'low') if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+    high, low, close = (df[col].to_numpy(dtype=float) for col in ('high', 'low', 'close'))
+    dates = df.index if isinstance(df.index, pd.DatetimeIndex) else None
+    # Positional index: the detectors' label slices select the same bars, much faster
+    highs, lows, closes = pd.Series(high), pd.Series(low), pd.Series(close)
+
+    events = []
+    active = set()
+    for end in range(MIN_PATTERN_BARS, len(df) + 1):
+        window = slice(max(0, end - CHART_PATTERN_WINDOW), end)
+        entry = end - 1
+        detected = set()
+        for pattern in detect_chart_patterns(highs.iloc[window], lows.iloc[window], closes.iloc[window]):
+            if pattern.type == PatternType.NEUTRAL or pattern.measured_target is None or pattern.invalidation_level is None:
+                continue
+            detected.add(pattern.name)
+            if pattern.name in active:
+                continue
+
+            bullish = pattern.type == PatternType.BULLISH
+            target, invalidation = float(pattern.measured_target), float(pattern.invalidation_level)
+            if bullish:
+                valid = invalidation < close[entry] < target
+            else:
+                valid = target < close[entry] < invalidation
+
+            if valid:
+                outcome, bars = resolve_pattern_outcome(high, low, entry, target, invalidation, bullish, max_bars)
+            else:
+                outcome, bars = INVALID, None
+            days = bars
+            if bars is not None and dates is not None:
+                days = (dates[entry + bars] - dates[entry]).days
+
+            events.append({
+                'symbol': symbol,
+                'pattern': pattern.name,
+                'type': pattern.type.value,
+                'date': str(dates[entry].date()) if dates is not None else entry,
+                'entry': float(close[entry]),
+                'target': target,
+                'invalidation': invalidation,
+                'outcome': outcome,
+                'bars': bars,
+                'days': days,
+            })
+        active = detected
+
+    return events
+
+
+def _symbol_events(symbol: str, df: pd.DataFrame, max_bars: int) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+    try:
+        return symbol, collect_pattern_events(df, symbol, max_bars), None
+    except ValueError as e:
+        return symbol, [], str(e)
+
+
+# =============================================================================
+# CALIBRATION TABLE
+# =============================================================================
+
+def summarize_events(events: List[Dict[str, Any]], min_events: int = DEFAULT_MIN_EVENTS) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-pattern outcome counts, hit rate and time to target
+
+    min_days and max_days are the 25th and 75th percentiles of the days it
+    took to reach the target. A pattern is marked calibrated when it has at
+    least min_events resolved (hit, failed or expired) events.
+
+    Args:
+        events: Output of collect_pattern_events
+        min_events: Resolved events needed for a pattern to be calibrated
+
+    Returns:
+        Dictionary of pattern name -> statistics
+    """
+    by_pattern: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        by_pattern.setdefault(event['pattern'], []).append(event)
+
+    summary = {}
+    for name in sorted(by_pattern):
+        counts = {outcome: 0 for outcome in (HIT, FAILED, EXPIRED, OPEN, INVALID)}
+        for event in by_pattern[name]:
+            counts[event['outcome']] += 1
+        resolved = counts[HIT] + counts[FAILED] + counts[EXPIRED]
+        days = [event['days'] for event in by_pattern[name] if event['outcome'] == HIT]
+
+        stats = {
+            'events': len(by_pattern[name]),
+            **counts,
+            'resolved': resolved,
+            'reliability': round(counts[HIT] / resolved, 4) if resolved else None,
+            'min_days': None,
+            'max_days': None,
+            'median_days': None,
+            'calibrated': resolved >= min_events,
+        }
+        if days:
+            stats['min_days'] = int(np.floor(np.percentile(days, 25)))
+            stats['max_days'] = max(stats['min_days'], int(np.ceil(np.percentile(days, 75))))
+            stats['median_days'] = float(np.median(days))
+        summary[name] = stats
+    return summary
+
+
+def calibrate_patterns(
+    histories: Dict[str, pd.DataFrame],
+    max_bars: int = DEFAULT_MAX_BARS,
+    min_events: int = DEFAULT_MIN_EVENTS,
+    workers: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Build a calibration table from a universe of daily histories
+
+    Args:
+        histories: OHLCV DataFrames by symbol
+        max_bars: Bars to follow each pattern for
+        min_events: Resolved events needed for a pattern to be calibrated
+        workers: Worker processes (1 runs in this process)
+        progress: Optional callback called with (symbols done, total)
+
+    Returns:
+        Tuple of (calibration table, all events)
+    """
+    events = []
+    skipped = {}
+    done = 0
+
+    def collect(result):
+        nonlocal done
+        symbol, symbol_events, error = result
+        if error:
+            skipped[symbol] = error
+            logger.warning(f"Calibration skipping {symbol}: {error}")
+        events.extend(symbol_events)
+        done += 1
+        if progress:
+            progress(done, len(histories))
+
+    if workers > 1 and len(histories) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(histories))) as pool:
+            futures = [pool.submit(_symbol_events, symbol, df, max_bars) for symbol, df in histories.items()]
+            for future in as_completed(futures):
+                collect(future.result())
+    else:
+        for symbol, df in histories.items():
+            collect(_symbol_events(symbol, df, max_bars))
+
+    events.sort(key=lambda e: (e['symbol'], str(e['date']), e['pattern']))
+    table = {
+        'version': None,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'symbols': len(histories) - len(skipped),
+        'bars': sum(len(df) for symbol, df in histories.items() if symbol not in skipped),
+        'max_bars': max_bars,
+        'min_events': min_events,
+        'patterns': summarize_events(events, min_events),
+    }
+    return table, events
+
+
+def _versions(directory: str) -> Dict[int, str]:
+    """Calibration file paths in a directory by version"""
+    if not os.path.isdir(directory):
+        return {}
+    versions = {}
+    for name in os.listdir(directory):
+        match = CALIBRATION_FILE_PATTERN.match(name)
+        if match:
+            versions[int(match.group(1))] = os.path.join(directory, name)
+    return versions
+
+
+def save_calibration(table: Dict[str, Any], directory: Optional[str] = None) -> str:
+    """
+    Write a calibration table as the next version
+
+    Earlier versions are kept, so a calibration can be rolled back by
+    deleting the newest file.
+
+    Args:
+        table: Output of calibrate_patterns
+        directory: Target directory (defaults to CALIBRATION_DIR)
+
+    Returns:
+        Path of the written file
+    """
+    directory = directory or CALIBRATION_DIR
+    os.makedirs(directory, exist_ok=True)
+    version = max(_versions(directory), default=0) + 1
+    path = os.path.join(directory, f'pattern_calibration_v{version:04d}.json')
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({**table, 'version': version}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+# =============================================================================
+# LOOKUP (used by get_pattern_horizon)
+# =============================================================================
+
+_calibration_cache: Optional[Dict[str, Any]] = None
+_calibration_lock = threading.Lock()
+
+
+def load_calibration(directory: Optional[str] = None, version: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Load a calibration table and make it the one get_pattern_horizon uses
+
+    Args:
+        directory: Directory of calibration files (defaults to CALIBRATION_DIR)
+        version: Version to load (defaults to the newest)
+
+    Returns:
+        The calibration table, or an empty table if there is none
+    """
+    global _calibration_cache
+    versions = _versions(directory or CALIBRATION_DIR)
+    version = version if version is not None else max(versions, default=None)
+
+    table = {'version': None, 'patterns': {}}
+    if version is not None:
+        if version not in versions:
+            raise ValueError(f"No pattern calibration version {version} in {directory or CALIBRATION_DIR}")
+        try:
+            with open(versions[version]) as f:
+                table = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read pattern calibration {versions[version]}: {e}")
+
+    with _calibration_lock:
+        _calibration_cache = table
+    return table
+
+
+def get_calibration() -> Dict[str, Any]:
+    """The active calibration table (the newest version, read once)"""
+    with _calibration_lock:
+        table = _calibration_cache
+    return table if table is not None else load_calibration()
+
+
+def clear_calibration_cache():
+    """Forget the loaded table; the next lookup reads the newest version again"""
+    global _calibration_cache
+    with _calibration_lock:
+        _calibration_cache = None
+
+
+def get_calibrated_horizon(pattern_name: str) -> Dict[str, Any]:
+    """
+    Calibrated reliability and min/max days for a pattern
+
+    Returns:
+        The calibrated fields (empty if the pattern is not calibrated)
+    """
+    stats = get_calibration().get('patterns', {}).get(pattern_name)
+    if not stats or not stats.get('calibrated'):
+        return {}
+    return {
+        key: stats[key]
+        for key in ('reliability', 'min_days', 'max_days')
+        if stats.get(key) is not None
+    }
@@ -86,7 +86,9 @@ class PatternResult:
 def get_pattern_horizon(pattern_name: str) -> Dict:
     """
     Get horizon data for a pattern from PATTERN_HORIZONS config.
-    Returns default values if pattern not found.
+    Returns default values if pattern not found. Reliability and min/max
+    days are replaced by the active calibration table when the pattern has
+    been calibrated (see src.core.pattern_calibration).
     """
     # Import here to avoid circular imports
     try:
@@ -102,7 +104,17 @@ def get_pattern_horizon(pattern_name: str) -> Dict:
             'description': 'Pattern detected'
         }
     
-    return PATTERN_HORIZONS.get(pattern_name, DEFAULT_PATTERN_HORIZON)
+    horizon_data = PATTERN_HORIZONS.get(pattern_name, DEFAULT_PATTERN_HORIZON)
+
+    try:
+        from src.core.pattern_calibration import get_calibrated_horizon
+    except ImportError:
+        return horizon_data
+
+    calibrated = get_calibrated_horizon(pattern_name)
+    if calibrated:
+        horizon_data = {**horizon_data, **calibrated}
+    return horizon_data
 
 
 # =============================================================================
@@ -1396,6 +1408,34 @@ def detect_flag_pennant(
 # MAIN PATTERN DETECTION FUNCTION
 # =============================================================================
 
+# Chart pattern detectors (each looks at most CHART_PATTERN_WINDOW bars back)
+CHART_PATTERN_DETECTORS = (
+    detect_double_top_bottom,
+    detect_head_shoulders,
+    detect_triangle,
+    detect_wedge,
+    detect_flag_pennant,
+)
+CHART_PATTERN_WINDOW = 60
+
+
+def detect_chart_patterns(highs: pd.Series, lows: pd.Series, closes: pd.Series) -> List[PatternResult]:
+    """
+    Run every chart pattern detector, skipping any that fail
+    
+    Only the last CHART_PATTERN_WINDOW bars affect the result.
+    """
+    chart_patterns = []
+    for detector in CHART_PATTERN_DETECTORS:
+        try:
+            p = detector(highs, lows, closes)
+            if p:
+                chart_patterns.append(p)
+        except Exception:
+            continue
+    return chart_patterns
+
+
 def detect_all_patterns(df: pd.DataFrame) -> Dict[str, any]:
     """
     Detect all candlestick and chart patterns
@@ -1442,7 +1482,6 @@ def detect_all_patterns(df: pd.DataFrame) -> Dict[str, any]:
         prev_trend = 'sideways'
     
     candlestick_patterns = []
-    chart_patterns = []
     
     # Detect single candle patterns (most recent candle)
     if candle_props:
@@ -1502,25 +1541,7 @@ def detect_all_patterns(df: pd.DataFrame) -> Dict[str, any]:
                 candlestick_patterns.append(p)
     
     # Detect chart patterns
-    highs_series = df['high']
-    lows_series = df['low']
-    closes_series = df['close']
-    
-    chart_pattern_funcs = [
-        lambda: detect_double_top_bottom(highs_series, lows_series, closes_series),
-        lambda: detect_head_shoulders(highs_series, lows_series, closes_series),
-        lambda: detect_triangle(highs_series, lows_series, closes_series),
-        lambda: detect_wedge(highs_series, lows_series, closes_series),
-        lambda: detect_flag_pennant(highs_series, lows_series, closes_series),
-    ]
-    
-    for func in chart_pattern_funcs:
-        try:
-            p = func()
-            if p:
-                chart_patterns.append(p)
-        except Exception:
-            continue
+    chart_patterns = detect_chart_patterns(df['high'], df['low'], df['close'])
     
     # Analyze patterns
     all_patterns = candlestick_patterns + chart_patterns
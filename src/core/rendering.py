@@ -0,0 +1,306 @@
+"""
+Report Rendering Layer
+Pre-resolved section templates, list-join builders and single-pass chunking
+
+The formatters in src/core/formatters.py render the same skeleton for every
+report: verdict boxes, section headers, factor lists, footers. Everything
+that only depends on the output mode ('bot' or 'cli') is resolved once here
+and cached, so rendering a report is lookups plus formatting of the
+per-stock values. Formatters collect parts in a list and join once at the
+end, and long reports are split for Telegram by slicing the finished text
+in one pass.
+
+Author: Harsh Kandhway
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+# ============================================================================
+# EMOJI TABLES
+# ============================================================================
+
+# name -> (bot emoji, CLI ASCII equivalent)
+EMOJI_PAIRS: Dict[str, Tuple[str, str]] = {
+    # Basic indicators
+    'check': ('✅', '[Y]'),
+    'cross': ('❌', '[X]'),
+    'warning': ('⚠️', '[!]'),
+    'neutral': ('⚪', '[?]'),
+
+    # Arrows and indicators
+    'up': ('📈', '[UP]'),
+    'down': ('📉', '[DOWN]'),
+    'arrow': ('→', '->'),
+    'bullet': ('•', '*'),
+
+    # Financial
+    'money': ('💰', '$'),
+    'profit': ('💰', '[+]'),
+    'loss': ('📉', '[-]'),
+    'target': ('🎯', '[TARGET]'),
+    'stop': ('🛡️', '[STOP]'),
+
+    # Symbols
+    'star': ('⭐', '*'),
+    'star_empty': ('☆', 'o'),
+    'blocked': ('🚫', '[BLOCKED]'),
+    'success': ('✅', '[OK]'),
+    'error': ('❌', '[ERR]'),
+
+    # Chart/Analysis
+    'chart': ('📊', '[CHART]'),
+    'analyze': ('🔍', '[ANALYZE]'),
+    'info': ('ℹ️', '[INFO]'),
+    'compare': ('⚖️', '[COMPARE]'),
+
+    # Actions
+    'buy': ('🟢', '[BUY]'),
+    'sell': ('🔴', '[SELL]'),
+    'hold': ('🟡', '[HOLD]'),
+
+    # Other
+    'loading': ('⏳', '[...]'),
+    'watchlist': ('👁️', '[WATCH]'),
+    'portfolio': ('💼', '[PORTFOLIO]'),
+    'alert': ('🔔', '[ALERT]'),
+}
+
+BOT_EMOJI: Dict[str, str] = {name: pair[0] for name, pair in EMOJI_PAIRS.items()}
+CLI_EMOJI: Dict[str, str] = {name: pair[1] for name, pair in EMOJI_PAIRS.items()}
+
+
+def emoji_table(output_mode: str) -> Dict[str, str]:
+    """
+    Emoji lookup table for an output mode
+
+    Args:
+        output_mode: 'bot' or 'cli' (anything other than 'bot' renders as CLI)
+
+    Returns:
+        Dictionary of emoji name -> rendered symbol
+    """
+    return BOT_EMOJI if output_mode == 'bot' else CLI_EMOJI
+
+
+# ============================================================================
+# SECTION TEMPLATES
+# ============================================================================
+
+_RULE_60 = '=' * 60
+_RULE_50 = '-' * 50
+
+# Templates use str.format fields; literal text is already resolved per mode
+_TEMPLATE_SOURCES: Dict[str, Dict[str, str]] = {
+    'bot': {
+        'verdict_BUY': """
+╔══════════════════════════════════╗
+║  🟢 *{symbol}* - *BUY*
+║
+║  ✅ Good opportunity to invest
+║  💪 Confidence: {confidence:.0f}%
+╚══════════════════════════════════╝""",
+        'verdict_HOLD': """
+╔══════════════════════════════════╗
+║  🟡 *{symbol}* - *WAIT*
+║
+║  ⏳ Not the right time yet
+║  🔍 Confidence: {confidence:.0f}%
+╚══════════════════════════════════╝""",
+        'verdict_AVOID': """
+╔══════════════════════════════════╗
+║  🔴 *{symbol}* - *AVOID*
+║
+║  ❌ Conditions are unfavorable
+║  ⚠️ Confidence: {confidence:.0f}%
+╚══════════════════════════════════╝""",
+        'price_line': """
+
+💰 *Price:* Rs {price}
+🛡️ *Safety:* {safety_emoji} ({safety_rating})
+
+""",
+        'trend_title': "*📈 TREND ANALYSIS* ({score}/3 bullish)\n",
+        'momentum_title': "*⚡ MOMENTUM* ({score}/3 bullish)\n",
+        'volume_title': "*📊 VOLUME* ({score}/1 bullish)\n",
+        'pattern_title': "*🔮 CHART PATTERNS* ({score}/3 bullish)\n",
+        'risk_title': "*⚖️ RISK ASSESSMENT*\n",
+        'factor_line': "\n   {0} {1}\n      ↳ _{2}_",
+        'pattern_conflict': (
+            "\n\n   ⚠️ *CONFLICT:* Pattern says BUY but other factors say AVOID\n"
+            "   _Wait for trend to confirm the pattern_"
+        ),
+        'pattern_caution': "\n\n   ⚠️ *CAUTION:* Pattern is bearish - use tight stop loss",
+        'score_block': """
+📊 *OVERALL SCORE*
+
+{bar} {score}/{max_score}
+_Individual factors score (trend, momentum, volume, patterns, risk)_
+
+""",
+        'hold_plan': """⏳ *RECOMMENDED: WAIT*
+
+Do not buy now. Wait for:
+   • Price to drop to Rs {support} (better entry)
+   • OR trend to strengthen
+
+Check again in: 1-2 weeks
+""",
+        'avoid_plan': """❌ *RECOMMENDED: AVOID*
+
+Do not buy this stock now.
+
+*Why to avoid:*
+""",
+        'avoid_reason': "   • {0}\n",
+        'avoid_improve': """
+*When conditions might improve:*
+   • When trend turns upward
+   • When RSI shows oversold (below 30)
+   • When a bullish pattern confirms
+
+Check again in: 2-3 weeks
+""",
+        'horizon_note': "*Investment Horizon:* {name} (~{days} days)\n_Target based on your selected timeframe_\n\n",
+        'footer': "\n_Stock Analyzer Pro by Harsh Kandhway_\n",
+    },
+    'cli': {
+        'verdict_BUY': "\n" + _RULE_60 + "\n  [BUY] {symbol} - GOOD OPPORTUNITY\n  Confidence: {confidence:.0f}%\n" + _RULE_60 + "\n",
+        'verdict_HOLD': "\n" + _RULE_60 + "\n  [WAIT] {symbol} - NOT THE RIGHT TIME\n  Confidence: {confidence:.0f}%\n" + _RULE_60 + "\n",
+        'verdict_AVOID': "\n" + _RULE_60 + "\n  [AVOID] {symbol} - UNFAVORABLE CONDITIONS\n  Confidence: {confidence:.0f}%\n" + _RULE_60 + "\n",
+        'price_line': "\nPrice: Rs {price}\nSafety: {safety_emoji} ({safety_rating})\n",
+        'trend_title': "\n[TREND ANALYSIS] ({score}/3 bullish)\n" + _RULE_50 + "\n",
+        'momentum_title': "[MOMENTUM] ({score}/3 bullish)\n" + _RULE_50 + "\n",
+        'volume_title': "[VOLUME] ({score}/1 bullish)\n" + _RULE_50 + "\n",
+        'pattern_title': "[CHART PATTERNS] ({score}/3 bullish)\n" + _RULE_50 + "\n",
+        'risk_title': "[RISK ASSESSMENT]\n" + _RULE_50 + "\n",
+        'factor_line': "\n  {0} {1}\n       -> {2}",
+        'pattern_conflict': (
+            "\n\n  [!] CONFLICT: Pattern says BUY but other factors say AVOID\n"
+            "      Wait for trend to confirm the pattern"
+        ),
+        'pattern_caution': "\n\n  [!] CAUTION: Pattern is bearish - use tight stop loss",
+        'score_block': _RULE_60 + "\n  OVERALL SCORE\n" + _RULE_60 + """
+{bar} {score}/{max_score}
+(Individual factors: trend, momentum, volume, patterns, risk)
+
+""",
+        'hold_plan': """[WAIT] RECOMMENDED: WAIT
+
+Do not buy now. Wait for:
+   * Price to drop to Rs {support} (better entry)
+   * OR trend to strengthen
+
+Check again in: 1-2 weeks
+""",
+        'avoid_plan': """[AVOID] RECOMMENDED: AVOID
+
+Do not buy this stock now.
+
+Why to avoid:
+""",
+        'avoid_reason': "   * {0}\n",
+        'avoid_improve': """
+When conditions might improve:
+   * When trend turns upward
+   * When RSI shows oversold (below 30)
+   * When a bullish pattern confirms
+
+Check again in: 2-3 weeks
+""",
+        'horizon_note': "Investment Horizon: {name} (~{days} days)\nTarget based on your selected timeframe\n\n",
+        'footer': "\n" + _RULE_60 + "\n  Developed by Harsh Kandhway | Stock Analyzer Pro v3.0\n" + _RULE_60 + "\n",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def get_templates(output_mode: str) -> Dict[str, str]:
+    """
+    Section templates resolved for an output mode
+
+    Args:
+        output_mode: 'bot' or 'cli' (anything other than 'bot' renders as CLI)
+
+    Returns:
+        Dictionary of template name -> template string
+    """
+    return _TEMPLATE_SOURCES['bot' if output_mode == 'bot' else 'cli']
+
+
+@lru_cache(maxsize=256)
+def horizon_note(output_mode: str, horizon_name: str, days: int) -> str:
+    """
+    Rendered "Investment Horizon" lines, cached per (mode, horizon)
+
+    Args:
+        output_mode: 'bot' or 'cli'
+        horizon_name: Display name of the selected horizon
+        days: Approximate holding period in days
+
+    Returns:
+        Rendered lines
+    """
+    return get_templates(output_mode)['horizon_note'].format(name=horizon_name, days=days)
+
+
+def render_factors(factors: Iterable[Tuple[str, str, str]], output_mode: str) -> str:
+    """
+    Render a factor list (emoji, factor, meaning) as one string
+
+    Args:
+        factors: Factor tuples
+        output_mode: 'bot' or 'cli'
+
+    Returns:
+        Rendered factor lines (no trailing newline)
+    """
+    line = get_templates(output_mode)['factor_line']
+    return ''.join([line.format(*factor) for factor in factors])
+
+
+# ============================================================================
+# CHUNKING
+# ============================================================================
+
+def chunk_text(text: str, max_length: int) -> List[str]:
+    """
+    Split text on line boundaries into chunks of at most max_length characters
+
+    Lines are packed greedily and each chunk is right-stripped; a single line
+    longer than max_length becomes its own (oversized) chunk. Each chunk is
+    found with one rfind for the last line break that still fits and sliced
+    from the original text, instead of being rebuilt line by line.
+
+    Args:
+        text: Text to split
+        max_length: Maximum length per chunk
+
+    Returns:
+        List of chunks
+    """
+    text_length = len(text)
+    if text_length <= max_length:
+        return [text]
+
+    chunks = []
+    start = 0
+    while True:
+        # A chunk of whole lines text[start:end] counts one extra newline,
+        # so it fits while end <= start + max_length - 1
+        limit = start + max_length - 1
+        if text_length <= limit:
+            chunks.append(text[start:].rstrip())
+            break
+
+        end = text.rfind('\n', start, limit + 1)
+        if end < 0:
+            end = text.find('\n', start)
+            if end < 0:
+                chunks.append(text[start:].rstrip())
+                break
+
+        chunks.append(text[start:end].rstrip())
+        start = end + 1
+
+    return chunks
@@ -6,10 +6,17 @@ Author: Harsh Kandhway
 """
 
 from typing import Dict, Tuple, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import math
+
+import numpy as np
+import pandas as pd
+
+from .allocation import RISK_METHODS, allocate
+from .correlation import align_closes
+from .trading_calendar import get_trading_calendar
 from .config import (
-    RISK_MODES, FIBONACCI_EXTENSION, CURRENCY_SYMBOL,
+    RISK_MODES, FIBONACCI_EXTENSION, CURRENCY_SYMBOL, DEFAULT_HORIZON,
     INVESTMENT_HORIZONS, TRADING_DAYS_PER_YEAR, TRADING_DAYS_PER_MONTH
 )
 
@@ -229,6 +236,37 @@ def calculate_targets(
         targets['conservative_target'] = max(targets['atr_target'], targets['support_target'])
         targets['conservative_target_pct'] = ((current_price - targets['conservative_target']) / current_price) * 100
     
+    targets['direction'] = direction
+    
+    return select_horizon_target(targets, horizon, mode)
+
+
+def select_horizon_target(
+    targets: Dict[str, any],
+    horizon: str,
+    mode: str = 'balanced'
+) -> Dict[str, any]:
+    """
+    Mark the selected investment horizon on a calculate_targets result
+    
+    Horizon targets are already computed for every horizon, so switching
+    horizons only needs this step. The input dict is not modified.
+    
+    Args:
+        targets: Result of calculate_targets (any selected horizon)
+        horizon: Investment horizon to recommend
+        mode: Risk mode used for the fallback target
+    
+    Returns:
+        New targets dict with recommended_* fields for the horizon
+    """
+    targets = dict(targets)
+    if 'horizon_targets' in targets:
+        targets['horizon_targets'] = {
+            key: {**data, 'is_recommended': key == horizon}
+            for key, data in targets['horizon_targets'].items()
+        }
+    
     # Recommended target based on SELECTED HORIZON
     if horizon in targets.get('horizon_targets', {}):
         horizon_data = targets['horizon_targets'][horizon]
@@ -264,7 +302,6 @@ def calculate_targets(
                     f"Consider adjusting your timeframe for optimal results."
                 )
     
-    targets['direction'] = direction
     targets['selected_horizon'] = horizon
     
     return targets
@@ -625,10 +662,30 @@ PATIENCE IS KEY:
 def calculate_portfolio_allocation(
     analyses: list,
     capital: float,
-    mode: str = 'balanced'
+    mode: str = 'balanced',
+    histories: Optional[Dict[str, pd.DataFrame]] = None,
+    method: Optional[str] = None,
+    max_position_pct: Optional[float] = None
 ) -> Dict[str, any]:
     """
     Calculate suggested portfolio allocation across multiple stocks
+    
+    With daily histories the split accounts for volatility and correlation
+    (see src.core.allocation); without them capital is split by confidence.
+    
+    Args:
+        analyses: Analysis dictionaries
+        capital: Capital to invest
+        mode: Risk mode
+        histories: Symbol -> daily OHLCV DataFrame for the investable stocks
+        method: One of ALLOCATION_METHODS (default: risk_parity with
+                histories, confidence without)
+        max_position_pct: Per-position cap in percent of capital (None = no cap)
+    
+    Returns:
+        Dictionary with investable (per-position allocation), not_recommended,
+        total_allocated, cash_remaining, num_positions and method; risk
+        methods add volatility_pct, avg_correlation and shrinkage
     """
     investable = []
     not_recommended = []
@@ -654,39 +711,71 @@ def calculate_portfolio_allocation(
             'explanation': "No stocks meet investment criteria. Hold cash.",
         }
     
-    total_confidence = sum(a['confidence'] for a in investable)
+    if method is None:
+        method = 'risk_parity' if histories else 'confidence'
     
-    allocations = []
-    total_allocated = 0
+    returns = closes = None
+    if method in RISK_METHODS:
+        try:
+            closes = align_closes({a['symbol']: histories[a['symbol']] for a in investable})
+            returns = np.diff(np.log(closes.to_numpy()), axis=0)
+        except (KeyError, TypeError, ValueError):
+            # Missing or too little shared history: fall back to conviction weights
+            method = 'confidence'
     
-    for analysis in investable:
-        weight = analysis['confidence'] / total_confidence
-        allocation_amount = capital * weight
-        
-        entry = analysis['current_price']
-        shares = int(allocation_amount / entry)
-        actual_amount = shares * entry
-        
-        allocations.append({
+    prices = np.array([a['current_price'] for a in investable], dtype=float)
+    confidence = np.array([a['confidence'] for a in investable], dtype=float)
+    
+    if method == 'confidence':
+        result = allocate(prices, capital, method, scores=confidence, max_position_pct=max_position_pct)
+    else:
+        horizon = investable[0].get('horizon') or DEFAULT_HORIZON
+        horizon_days = INVESTMENT_HORIZONS.get(horizon, INVESTMENT_HORIZONS['3months'])['avg_days']
+        expected = np.array([a['target'] / a['current_price'] - 1 for a in investable]) * confidence / 100
+        result = allocate(
+            prices, capital, method,
+            returns=returns,
+            scores=confidence,
+            expected_returns=expected,
+            max_position_pct=max_position_pct,
+            horizon_days=horizon_days,
+        )
+    
+    allocations = [
+        {
             'symbol': analysis['symbol'],
             'confidence': analysis['confidence'],
-            'weight_pct': weight * 100,
-            'allocated_amount': actual_amount,
-            'shares': shares,
-            'entry_price': entry,
+            'weight_pct': float(result['weights'][i] * 100),
+            'allocated_amount': float(result['amounts'][i]),
+            'shares': int(result['shares'][i]),
+            'entry_price': analysis['current_price'],
             'stop_loss': analysis['stop_loss'],
             'target': analysis['target'],
-        })
-        
-        total_allocated += actual_amount
+            'risk_contribution_pct': (
+                float(result['risk_contribution'][i] * 100) if result['risk_contribution'] is not None else None
+            ),
+        }
+        for i, analysis in enumerate(investable)
+    ]
+    total_allocated = float(result['amounts'].sum())
     
-    return {
+    allocation = {
         'investable': allocations,
         'not_recommended': not_recommended,
         'total_allocated': total_allocated,
         'cash_remaining': capital - total_allocated,
         'num_positions': len(allocations),
+        'method': method,
     }
+    if closes is not None and method in RISK_METHODS:
+        correlation = np.corrcoef(returns, rowvar=False) if len(investable) > 1 else np.ones((1, 1))
+        off_diagonal = correlation[~np.eye(len(investable), dtype=bool)]
+        allocation.update({
+            'volatility_pct': result['volatility_pct'],
+            'avg_correlation': float(np.nanmean(off_diagonal)) if off_diagonal.size else None,
+            'shrinkage': result['shrinkage'],
+        })
+    return allocation
 
 
 def estimate_time_to_target(
@@ -759,9 +848,6 @@ def estimate_time_to_target(
     # Cap at horizon maximum
     trading_days = min(trading_days, horizon_config['max_days'])
     
-    # Convert to calendar days (5 trading days = 7 calendar days)
-    calendar_days = int(trading_days * 7 / 5)
-    
     # Calculate confidence in estimate
     estimate_confidence = 50  # Base confidence
     
@@ -780,13 +866,15 @@ def estimate_time_to_target(
     
     estimate_confidence = min(85, estimate_confidence)  # Cap at 85%
     
-    # Calculate dates
+    # Calculate dates on the NSE trading calendar (skips weekends and holidays)
     today = datetime.now()
-    target_date = today + timedelta(days=calendar_days)
+    calendar = get_trading_calendar()
+    target_date = datetime.combine(calendar.add_trading_days(today, trading_days), today.time())
+    calendar_days = (target_date - today).days
     
     # Provide date ranges
-    early_date = today + timedelta(days=int(calendar_days * 0.7))
-    late_date = today + timedelta(days=int(calendar_days * 1.4))
+    early_date = datetime.combine(calendar.add_trading_days(today, int(trading_days * 0.7)), today.time())
+    late_date = datetime.combine(calendar.add_trading_days(today, int(trading_days * 1.4)), today.time())
     
     return {
         'trading_days': trading_days,
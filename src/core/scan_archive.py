@@ -0,0 +1,487 @@
+"""
+Scan Result Archive for Stock Analyzer Pro
+Columnar, date-partitioned record of every analyzed symbol in every scan
+
+Each scan appends one row per analyzed symbol (confidence, score, R:R,
+recommendation, key indicator values and block reasons). Rows are buffered
+and written as segments:
+
+    <root>/date=2026-01-12/<scan id>-0001/
+        meta.json           row count, source, string dictionaries
+        confidence.npy      one NumPy array per column
+        symbol.npy          (strings are stored as int32 dictionary codes)
+        ...
+
+Timestamps are stored in UTC; partitions (and query start/end) use the
+exchange (IST) date, so a pre-open or after-midnight scan lands on the
+trading day it belongs to rather than the previous UTC day.
+
+Segments are written to a temporary directory and renamed into place, so
+readers never see a partial segment. Queries memory-map the column files
+they need and return NumPy arrays, which keeps distribution and drift
+analyses over months of scans to a few seconds. compact() merges a day's
+segments into one to keep the file count down.
+
+Author: Harsh Kandhway
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.core.trading_calendar import IST
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DEFAULT_FLUSH_ROWS = 500  # rows buffered before a segment is written
+
+# Column name -> dtype ('category' columns are dictionary-encoded strings)
+COLUMNS = {
+    'timestamp': 'datetime64[s]',
+    'source': 'category',
+    'symbol': 'category',
+    'mode': 'category',
+    'horizon': 'category',
+    'recommendation': 'category',
+    'recommendation_type': 'category',
+    'confidence': 'float32',
+    'overall_score_pct': 'float32',
+    'risk_reward': 'float32',
+    'rr_valid': 'bool',
+    'current_price': 'float64',
+    'target': 'float64',
+    'stop_loss': 'float64',
+    'is_buy_blocked': 'bool',
+    'is_sell_blocked': 'bool',
+    'block_reasons': 'category',
+    'rsi': 'float32',
+    'adx': 'float32',
+    'macd_hist': 'float32',
+    'atr_percent': 'float32',
+    'bb_percent': 'float32',
+    'stoch_k': 'float32',
+    'volume_ratio': 'float32',
+    'momentum': 'float32',
+    'market_phase': 'category',
+    'ema_alignment': 'category',
+    'divergence': 'category',
+    'pattern_bias': 'category',
+}
+
+# Indicator columns copied from analysis['indicators']
+INDICATOR_COLUMNS = (
+    'rsi', 'adx', 'macd_hist', 'atr_percent', 'bb_percent', 'stoch_k',
+    'volume_ratio', 'momentum', 'market_phase', 'ema_alignment',
+    'divergence', 'pattern_bias',
+)
+
+BLOCK_REASON_SEPARATOR = ' | '
+
+
+def record_from_analysis(analysis: Dict[str, Any], source: str, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Archive row for one analysis result
+
+    Missing values become NaN (numbers), False (flags) or '' (strings), so
+    results from any analysis entry point can be archived.
+
+    Args:
+        analysis: Result of analyze_stock
+        source: Name of the scan that produced it (e.g. 'daily_scan')
+        timestamp: Time of the analysis (defaults to now, UTC)
+
+    Returns:
+        Dictionary keyed by COLUMNS
+    """
+    indicators = analysis.get('indicators') or {}
+    reasons = list(analysis.get('buy_block_reasons') or []) + list(analysis.get('sell_block_reasons') or [])
+    values = {
+        **{key: analysis.get(key) for key in COLUMNS},
+        **{key: indicators.get(key) for key in INDICATOR_COLUMNS},
+        'timestamp': timestamp or datetime.utcnow(),
+        'source': source,
+        'block_reasons': BLOCK_REASON_SEPARATOR.join(reasons),
+    }
+
+    record = {}
+    for column, dtype in COLUMNS.items():
+        value = values[column]
+        if dtype == 'category':
+            record[column] = '' if value is None else str(value)
+        elif dtype == 'bool':
+            record[column] = bool(value)
+        elif dtype.startswith('float'):
+            try:
+                record[column] = float(value)
+            except (TypeError, ValueError):
+                record[column] = float('nan')
+        else:
+            record[column] = value
+    return record
+
+
+def _partition_name(day: date) -> str:
+    return f"date={day.isoformat()}"
+
+
+# IST is a fixed UTC offset (no daylight saving)
+_IST_OFFSET = IST.utcoffset(None)
+
+
+def _partition_day(timestamp: datetime) -> date:
+    """Exchange (IST) date of a naive UTC timestamp"""
+    return (timestamp + _IST_OFFSET).date()
+
+
+def _as_date(value: Union[str, date, datetime, None]) -> Optional[date]:
+    if value is None or (isinstance(value, date) and not isinstance(value, datetime)):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(value)
+
+
+def _write_segment(path: str, columns: Dict[str, np.ndarray], meta: Dict[str, Any]):
+    """Write column arrays and metadata to a new segment directory atomically"""
+    tmp_path = os.path.join(os.path.dirname(path), f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_path)
+    try:
+        for column, values in columns.items():
+            np.save(os.path.join(tmp_path, f"{column}.npy"), values, allow_pickle=False)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=1)
+        os.rename(tmp_path, path)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+
+def _encode(values: Dict[str, Sequence[Any]]) -> Dict[str, Any]:
+    """Column arrays and string dictionaries from column values"""
+    columns = {}
+    categories = {}
+    for column, dtype in COLUMNS.items():
+        if dtype == 'category':
+            uniques, codes = np.unique(np.asarray(values[column], dtype=str), return_inverse=True)
+            categories[column] = uniques.tolist()
+            columns[column] = codes.astype(np.int32)
+        else:
+            columns[column] = np.asarray(values[column], dtype=dtype)
+    return {'columns': columns, 'categories': categories}
+
+
+# =============================================================================
+# WRITING
+# =============================================================================
+
+class ScanArchiveWriter:
+    """
+    Buffers one scan's rows and writes them as segments
+
+    Thread-safe; rows can be added from worker threads. Use as a context
+    manager or call close() so the last rows are flushed. Segments that
+    cannot be written are logged and counted in `dropped` rather than raised.
+    """
+
+    def __init__(self, root: str, source: str, flush_rows: int = DEFAULT_FLUSH_ROWS, scan_id: Optional[str] = None):
+        """
+        Args:
+            root: Archive directory
+            source: Name of the scan (stored on every row)
+            flush_rows: Rows buffered before a segment is written
+            scan_id: Segment name prefix (defaults to time and a random suffix)
+        """
+        self.root = root
+        self.source = source
+        self.flush_rows = max(1, flush_rows)
+        self.scan_id = scan_id or f"{datetime.utcnow():%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.rows = 0
+        self.dropped = 0
+        self.segments = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, analysis: Dict[str, Any], timestamp: Optional[datetime] = None):
+        """Buffer one analysis result, writing a segment when the buffer is full"""
+        record = record_from_analysis(analysis, self.source, timestamp)
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.flush_rows:
+                self._flush_locked()
+
+    def flush(self):
+        """Write buffered rows as a segment"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+
+        # A scan running past midnight IST writes to each day's partition
+        by_day: Dict[date, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_day.setdefault(_partition_day(record['timestamp']), []).append(record)
+
+        for day, day_records in by_day.items():
+            encoded = _encode({column: [record[column] for record in day_records] for column in COLUMNS})
+            partition = os.path.join(self.root, _partition_name(day))
+            self.segments += 1
+            try:
+                os.makedirs(partition, exist_ok=True)
+                _write_segment(
+                    os.path.join(partition, f"{self.scan_id}-{self.segments:04d}"),
+                    encoded['columns'],
+                    {
+                        'schema_version': SCHEMA_VERSION,
+                        'rows': len(day_records),
+                        'source': self.source,
+                        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+                        'categories': encoded['categories'],
+                    }
+                )
+            except OSError as e:
+                # The archive is for analytics only; never fail a scan over it
+                self.dropped += len(day_records)
+                logger.error(f"Could not write scan archive segment to {partition}: {e}")
+                continue
+            self.rows += len(day_records)
+
+    def close(self):
+        """Flush remaining rows"""
+        self.flush()
+
+    def __enter__(self) -> 'ScanArchiveWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+class ScanArchive:
+    """Read-only queries over an archive directory"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def partitions(self, start: Union[str, date, None] = None, end: Union[str, date, None] = None) -> List[date]:
+        """Dates that have data, oldest first, optionally limited to [start, end]"""
+        if not os.path.isdir(self.root):
+            return []
+        start, end = _as_date(start), _as_date(end)
+        days = []
+        for name in os.listdir(self.root):
+            if not name.startswith('date='):
+                continue
+            try:
+                day = date.fromisoformat(name[len('date='):])
+            except ValueError:
+                continue
+            if (start is None or day >= start) and (end is None or day <= end):
+                days.append(day)
+        return sorted(days)
+
+    def segments(self, start: Union[str, date, None] = None, end: Union[str, date, None] = None) -> List[str]:
+        """Segment directories in date order"""
+        paths = []
+        for day in self.partitions(start, end):
+            partition = os.path.join(self.root, _partition_name(day))
+            paths.extend(
+                os.path.join(partition, name) for name in sorted(os.listdir(partition))
+                if not name.startswith('.')
+            )
+        return paths
+
+    def query(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Union[str, date, None] = None,
+        end: Union[str, date, None] = None,
+        symbols: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None,
+        decode: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        Column arrays for all rows in a date range
+
+        Args:
+            columns: Columns to return (default: all)
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            symbols: Only rows for these symbols
+            sources: Only rows from these scan sources
+            decode: Return string columns as object arrays (False returns
+                    int32 codes into the 'categories' entry of the result)
+
+        Returns:
+            Dictionary of column -> array (equal lengths). With decode=False
+            it also has 'categories': {column: array of strings}.
+
+        Raises:
+            ValueError: If an unknown column is requested
+        """
+        columns = list(columns or COLUMNS)
+        unknown = [column for column in columns if column not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns: {unknown}. Available: {', '.join(COLUMNS)}")
+
+        symbols = set(symbols) if symbols is not None else None
+        sources = set(sources) if sources is not None else None
+        needed = list(dict.fromkeys(columns + (['symbol'] if symbols else []) + (['source'] if sources else [])))
+        categorical = [column for column in needed if COLUMNS[column] == 'category']
+
+        parts: Dict[str, List[np.ndarray]] = {column: [] for column in needed}
+        dictionaries: Dict[str, Dict[str, int]] = {column: {} for column in categorical}
+
+        for segment in self.segments(start, end):
+            try:
+                with open(os.path.join(segment, 'meta.json')) as f:
+                    meta = json.load(f)
+                arrays = {column: np.load(os.path.join(segment, f"{column}.npy"), mmap_mode='r') for column in needed}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable archive segment {segment}: {e}")
+                continue
+
+            for column in needed:
+                if column in dictionaries:
+                    # Re-map this segment's codes onto the query-wide dictionary
+                    lookup = dictionaries[column]
+                    remap = np.array(
+                        [lookup.setdefault(value, len(lookup)) for value in meta['categories'][column]],
+                        dtype=np.int32
+                    )
+                    parts[column].append(remap[arrays[column]] if len(remap) else np.asarray(arrays[column]))
+                else:
+                    parts[column].append(np.asarray(arrays[column]))
+
+        result = {
+            column: np.concatenate(chunks) if chunks else np.array([], dtype=np.int32 if column in dictionaries else COLUMNS[column])
+            for column, chunks in parts.items()
+        }
+        categories = {
+            column: np.array(list(lookup), dtype=object) for column, lookup in dictionaries.items()
+        }
+
+        mask = None
+        for column, allowed in (('symbol', symbols), ('source', sources)):
+            if allowed is None:
+                continue
+            allowed_codes = [code for code, value in enumerate(categories[column]) if value in allowed]
+            column_mask = np.isin(result[column], allowed_codes)
+            mask = column_mask if mask is None else mask & column_mask
+        if mask is not None:
+            result = {column: values[mask] for column, values in result.items()}
+
+        result = {column: result[column] for column in columns}
+        if decode:
+            for column in columns:
+                if column in categories:
+                    result[column] = categories[column][result[column]] if len(categories[column]) else result[column].astype(object)
+        else:
+            result['categories'] = {column: categories[column] for column in columns if column in categories}
+        return result
+
+    def value_counts(self, column: str, **filters) -> Dict[str, int]:
+        """
+        Row count per value of a string column, most common first
+
+        Args:
+            column: Category column (e.g. 'recommendation_type')
+            **filters: start, end, symbols and sources as for query()
+        """
+        if COLUMNS.get(column) != 'category':
+            raise ValueError(f"{column} is not a string column")
+        data = self.query([column], decode=False, **filters)
+        counts = np.bincount(data[column], minlength=len(data['categories'][column]))
+        order = np.argsort(-counts, kind='stable')
+        return {data['categories'][column][i]: int(counts[i]) for i in order if counts[i]}
+
+    def period_stats(
+        self,
+        column: str,
+        period: str = 'M',
+        percentiles: Sequence[float] = (25, 50, 75),
+        **filters
+    ) -> Dict[str, np.ndarray]:
+        """
+        Per-period count, mean and percentiles of a numeric column (for drift checks)
+
+        Args:
+            column: Numeric column (e.g. 'confidence')
+            period: NumPy datetime unit to group by ('D', 'W', 'M' or 'Y'), in IST
+            percentiles: Percentiles to report
+            **filters: start, end, symbols and sources as for query()
+
+        Returns:
+            Dictionary with 'period' (datetime64 array), 'count', 'mean' and
+            one 'p<N>' array per percentile; NaN values are ignored
+        """
+        if not COLUMNS.get(column, '').startswith('float'):
+            raise ValueError(f"{column} is not a numeric column")
+        data = self.query(['timestamp', column], **filters)
+        values = data[column].astype(np.float64)
+        ist = data['timestamp'] + np.timedelta64(int(_IST_OFFSET.total_seconds()), 's')
+        keys = ist.astype(f'datetime64[{period}]')
+        valid = ~np.isnan(values)
+        keys, values = keys[valid], values[valid]
+
+        periods, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(values[order], np.cumsum(np.bincount(inverse, minlength=len(periods)))[:-1])
+
+        stats = {
+            'period': periods,
+            'count': np.array([len(group) for group in groups], dtype=np.int64),
+            'mean': np.array([group.mean() for group in groups]) if len(periods) else np.array([]),
+        }
+        for p in percentiles:
+            stats[f'p{p:g}'] = np.array([np.percentile(group, p) for group in groups]) if len(periods) else np.array([])
+        return stats
+
+    def compact(self, day: Union[str, date]) -> int:
+        """
+        Merge a day's segments into one
+
+        Run it for days whose scans have finished: rows added to the day
+        while it runs are left in their own segments, and a query running
+        at the same moment can briefly see the rows twice.
+
+        Returns:
+            Number of segments merged (0 if there was nothing to do)
+        """
+        day = _as_date(day)
+        partition = os.path.join(self.root, _partition_name(day))
+        segments = self.segments(day, day)
+        if len(segments) < 2:
+            return 0
+
+        data = self.query(start=day, end=day)
+        rows = len(data['timestamp'])
+        encoded = _encode(data)
+        _write_segment(
+            os.path.join(partition, f"compacted-{uuid.uuid4().hex[:8]}"),
+            encoded['columns'],
+            {
+                'schema_version': SCHEMA_VERSION,
+                'rows': rows,
+                'source': 'compacted',
+                'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+                'categories': encoded['categories'],
+            }
+        )
+        for segment in segments:
+            shutil.rmtree(segment, ignore_errors=True)
+        return len(segments)
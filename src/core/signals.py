@@ -407,6 +407,45 @@ def calculate_all_signals(indicators: Dict, mode: str = 'balanced') -> Dict:
     }
 
 
+def calculate_overall_score(indicators: Dict, signal_data: Dict, rr_valid: bool) -> float:
+    """
+    Overall bullish score percentage used by the recommendation logic
+    
+    Matches the formatter's scoring (max 10 points): trend (3), momentum (3),
+    volume (1), patterns (3) and risk/reward validity (1).
+    
+    Args:
+        indicators: Output of calculate_all_indicators
+        signal_data: Output of calculate_all_signals
+        rr_valid: Whether the risk/reward meets the mode minimum
+    
+    Returns:
+        Score percentage (0-100)
+    """
+    # Trend score (max 3): price vs EMAs, EMA alignment, ADX
+    trend_bullish = sum(1 for _, d in signal_data.get('trend_signals', {}).values() if d == 'bullish')
+    trend_score = min(3, max(0, trend_bullish))
+    
+    # Momentum score (max 3): RSI, MACD, ADX
+    momentum_bullish = sum(1 for _, d in signal_data.get('momentum_signals', {}).values() if d == 'bullish')
+    momentum_score = min(3, max(0, momentum_bullish))
+    
+    # Volume score (max 1): volume confirmation (high volume = bullish)
+    vol_ratio = indicators.get('volume_ratio', 1.0)
+    volume_score = 1 if (vol_ratio >= 1.5) else 0
+    
+    # Pattern score (max 3): pattern type and bias
+    pattern_bullish = sum(1 for _, d in signal_data.get('pattern_signals', {}).values() if d == 'bullish')
+    pattern_bias = indicators.get('pattern_bias', 'neutral')
+    pattern_score = min(3, max(0, pattern_bullish + (1 if pattern_bias == 'bullish' else 0)))
+    
+    # Risk score (max 1): R:R validity
+    risk_score = 1 if rr_valid else 0
+    
+    total_bullish = trend_score + momentum_score + volume_score + pattern_score + risk_score
+    return (total_bullish / 10) * 100
+
+
 def get_confidence_level(confidence: float) -> str:
     """Get confidence level string from confidence percentage"""
     for (low, high), level in CONFIDENCE_LEVELS.items():
@@ -0,0 +1,675 @@
+"""
+Streaming Indicator State
+O(1)-per-bar incremental updates for the recursive and windowed indicators
+
+calculate_all_indicators recomputes every indicator over the full history.
+EMAs, RSI, MACD, ATR and ADX are recursive and Bollinger Bands, stochastics
+and the volume average are fixed windows, so a per-symbol state object can
+absorb one new bar with constant work instead. IndicatorState reproduces the
+`ta` implementations step by step (including their warm-up periods and
+quirks), and snapshot() returns the same keys and fallbacks as the
+corresponding calculate_* functions. The recursive indicators match exactly;
+windowed means and deviations are computed over the window itself, where
+pandas uses running compensated sums, so they agree to floating-point
+rounding.
+
+IndicatorEngine keeps one state per symbol, feeds it only the bars it has
+not seen, rebuilds it from the bar history when the two no longer line up,
+and checkpoints all states to a JSON file.
+
+Support/resistance, divergences, Fibonacci levels and patterns need the full
+history and are not part of the streaming state.
+
+Author: Harsh Kandhway
+"""
+
+import json
+import math
+import os
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import TIMEFRAME_CONFIGS
+from .indicators import (
+    classify_adx_strength, classify_bb_position, classify_di_direction,
+    classify_hist_direction, classify_macd_crossover, classify_obv_trend,
+    classify_rsi_direction, classify_rsi_zone, classify_stoch_zone,
+    classify_volatility, classify_volume_level
+)
+
+NAN = float('nan')
+
+# Fixed windows used by calculate_stochastic
+STOCH_WINDOW = 14
+STOCH_SMOOTH = 3
+
+# Past values kept for direction/trend checks (RSI 5 ago, MACD hist 3 ago, OBV 10 ago)
+RSI_HISTORY = 5
+HIST_HISTORY = 3
+OBV_HISTORY = 10
+
+
+# ============================================================================
+# BUILDING BLOCKS
+# ============================================================================
+
+class _Ewm:
+    """pandas ewm(adjust=False).mean() as a running state"""
+
+    __slots__ = ('alpha', 'old_wt_factor', 'min_periods', 'value', 'nobs')
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.old_wt_factor = 1. - alpha
+        self.min_periods = min_periods
+        self.value = NAN
+        self.nobs = 0
+
+    def update(self, x: float) -> float:
+        """Absorb one value and return the (masked) average"""
+        is_observation = x == x
+        self.nobs += is_observation
+        if self.value == self.value:
+            if is_observation and self.value != x:
+                # Same operation order as pandas' ewm kernel
+                self.value = (self.old_wt_factor * self.value + self.alpha * x) / (self.old_wt_factor + self.alpha)
+        elif is_observation:
+            self.value = x
+        return self.value if self.nobs >= self.min_periods else NAN
+
+    def to_state(self) -> list:
+        return [self.value, self.nobs]
+
+    def load_state(self, state: list):
+        self.value, self.nobs = state
+
+
+class _Window:
+    """Fixed-size numpy ring of the latest values"""
+
+    __slots__ = ('values', 'pos', 'count')
+
+    def __init__(self, size: int):
+        self.values = np.zeros(size, dtype=float)
+        self.pos = 0
+        self.count = 0
+
+    def push(self, x: float):
+        self.values[self.pos] = x
+        self.pos = (self.pos + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    @property
+    def full(self) -> bool:
+        return self.count == len(self.values)
+
+    def ordered(self) -> np.ndarray:
+        """Values oldest first"""
+        if self.count < len(self.values):
+            return self.values[:self.count]
+        return np.concatenate((self.values[self.pos:], self.values[:self.pos]))
+
+    def to_state(self) -> list:
+        return self.ordered().tolist()
+
+    def load_state(self, values: list):
+        self.values[:] = 0.0
+        self.pos = 0
+        self.count = 0
+        for x in values:
+            self.push(x)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Float division with pandas semantics for a zero denominator"""
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+class IndicatorState:
+    """
+    Incremental indicator state for one symbol and timeframe config
+
+    Call update() once per completed bar, in order.
+    """
+
+    __slots__ = (
+        'timeframe', 'bars', 'last_time',
+        'prev_high', 'prev_low', 'prev_close', 'close',
+        # EMAs and MACD
+        'ema_fast', 'ema_medium', 'ema_slow', 'ema_trend',
+        'macd_fast', 'macd_slow', 'macd_signal', 'macd', 'signal', 'hist_history',
+        # RSI
+        'rsi_up', 'rsi_down', 'rsi_history',
+        # ATR
+        'atr_period', 'atr', 'atr_warmup',
+        # ADX
+        'adx_period', 'adx_warmup', 'tr_sum', 'pos_sum', 'neg_sum', 'dx_warmup', 'adx', 'plus_di', 'minus_di',
+        # Bollinger Bands
+        'bb_std', 'bb_window',
+        # Stochastic
+        'stoch_high', 'stoch_low', 'stoch_k_window',
+        # Volume
+        'volume_window', 'obv', 'obv_history',
+    )
+
+    def __init__(self, timeframe: str = 'medium'):
+        """
+        Initialize empty state
+
+        Args:
+            timeframe: Key of TIMEFRAME_CONFIGS
+        """
+        if timeframe not in TIMEFRAME_CONFIGS:
+            raise ValueError(f"Invalid timeframe '{timeframe}'. Must be one of: {', '.join(TIMEFRAME_CONFIGS)}")
+        config = TIMEFRAME_CONFIGS[timeframe]
+
+        self.timeframe = timeframe
+        self.bars = 0
+        self.last_time = None
+        self.prev_high = self.prev_low = self.prev_close = self.close = NAN
+
+        def span(period):
+            return _Ewm(2.0 / (1.0 + period), period)
+
+        self.ema_fast = span(config['ema_fast'])
+        self.ema_medium = span(config['ema_medium'])
+        self.ema_slow = span(config['ema_slow'])
+        self.ema_trend = span(config['ema_trend'])
+
+        self.macd_fast = span(config['macd_fast'])
+        self.macd_slow = span(config['macd_slow'])
+        self.macd_signal = span(config['macd_signal'])
+        self.macd = self.signal = NAN
+        self.hist_history = deque(maxlen=HIST_HISTORY)
+
+        rsi_period = config['rsi_period']
+        self.rsi_up = _Ewm(1 / rsi_period, rsi_period)
+        self.rsi_down = _Ewm(1 / rsi_period, rsi_period)
+        self.rsi_history = deque(maxlen=RSI_HISTORY)
+
+        self.atr_period = config['atr_period']
+        self.atr = 0.0
+        self.atr_warmup = []
+
+        self.adx_period = config['adx_period']
+        self.adx_warmup = [[], [], []]
+        self.tr_sum = self.pos_sum = self.neg_sum = 0.0
+        self.dx_warmup = []
+        self.adx = self.plus_di = self.minus_di = 0.0
+
+        self.bb_std = config['bb_std']
+        self.bb_window = _Window(config['bb_period'])
+
+        self.stoch_high = _Window(STOCH_WINDOW)
+        self.stoch_low = _Window(STOCH_WINDOW)
+        self.stoch_k_window = _Window(STOCH_SMOOTH)
+
+        self.volume_window = _Window(config['volume_avg_period'])
+        self.obv = 0.0
+        self.obv_history = deque(maxlen=OBV_HISTORY)
+
+    # =========================================================================
+    # UPDATE
+    # =========================================================================
+
+    def update(self, high: float, low: float, close: float, volume: float = 0.0, timestamp=None):
+        """
+        Absorb one completed bar
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            volume: Bar volume
+            timestamp: Optional bar time (kept for incremental feeding)
+        """
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+        prev_high, prev_low, prev_close = self.prev_high, self.prev_low, self.prev_close
+        first = self.bars == 0
+
+        # EMAs and MACD
+        self.ema_fast.update(close)
+        self.ema_medium.update(close)
+        self.ema_slow.update(close)
+        self.ema_trend.update(close)
+        self.macd = self.macd_fast.update(close) - self.macd_slow.update(close)
+        self.signal = self.macd_signal.update(self.macd)
+        self.hist_history.append(self.macd - self.signal)
+
+        # RSI (first difference is NaN, which ta turns into a zero move)
+        diff = NAN if first else close - prev_close
+        up = self.rsi_up.update(diff if diff > 0 else 0.0)
+        down = self.rsi_down.update(-diff if diff < 0 else -0.0)
+        if down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + _ratio(up, down)))
+        self.rsi_history.append(rsi)
+
+        # True range (first bar has no previous close)
+        if first:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        self._update_atr(true_range)
+        if not first:
+            self._update_adx(high, low, prev_high, prev_low, prev_close)
+
+        # Bollinger Bands and stochastic windows
+        self.bb_window.push(close)
+        self.stoch_high.push(high)
+        self.stoch_low.push(low)
+        if self.stoch_high.full:
+            lowest = self.stoch_low.values.min()
+            stoch_k = _ratio(100 * (close - lowest), self.stoch_high.values.max() - lowest)
+        else:
+            stoch_k = NAN
+        self.stoch_k_window.push(stoch_k)
+
+        # Volume
+        self.volume_window.push(volume)
+        self.obv += -volume if close < prev_close else volume
+        self.obv_history.append(self.obv)
+
+        self.prev_high, self.prev_low, self.prev_close, self.close = high, low, close, close
+        self.bars += 1
+        self.last_time = timestamp
+
+    def _update_atr(self, true_range: float):
+        """Wilder ATR: plain mean of the first window, then recursive"""
+        window = self.atr_period
+        if self.bars < window:
+            self.atr_warmup.append(true_range)
+            if self.bars == window - 1:
+                self.atr = np.array(self.atr_warmup).mean()
+                self.atr_warmup = []
+        else:
+            self.atr = (self.atr * (window - 1) + true_range) / float(window)
+
+    def _update_adx(self, high: float, low: float, prev_high: float, prev_low: float, prev_close: float):
+        """Wilder-smoothed directional movement, replicating ta.trend.ADXIndicator"""
+        window = self.adx_period
+        movement = max(high, prev_close) - min(low, prev_close)
+        diff_up = high - prev_high
+        diff_down = prev_low - low
+        pos = abs(diff_up if (diff_up > diff_down and diff_up > 0) else 0.0)
+        neg = abs(diff_down if (diff_down > diff_up and diff_down > 0) else 0.0)
+
+        # Bar index of this update; sums cover bars 1..window first
+        t = self.bars
+        if t <= window:
+            for bucket, value in zip(self.adx_warmup, (movement, pos, neg)):
+                bucket.append(value)
+            if t < window:
+                return
+            self.tr_sum, self.pos_sum, self.neg_sum = (np.array(b).sum() for b in self.adx_warmup)
+            self.adx_warmup = [[], [], []]
+        else:
+            self.tr_sum = self.tr_sum - (self.tr_sum / float(window)) + movement
+            self.pos_sum = self.pos_sum - (self.pos_sum / float(window)) + pos
+            self.neg_sum = self.neg_sum - (self.neg_sum / float(window)) + neg
+
+        if self.tr_sum != 0:
+            dip = 100 * (self.pos_sum / self.tr_sum)
+            din = 100 * (self.neg_sum / self.tr_sum)
+        else:
+            dip = din = 0
+        dx = 100 * np.abs((dip - din) / (dip + din)) if dip + din != 0 else 0
+
+        # ta leaves the DI at the first smoothed bar unset
+        self.plus_di, self.minus_di = (dip, din) if t > window else (0.0, 0.0)
+
+        j = t - window
+        if j < window:
+            self.dx_warmup.append(dx)
+            if j == window - 1:
+                self.adx = np.array(self.dx_warmup).mean()
+                self.dx_warmup = []
+        else:
+            self.adx = ((self.adx * (window - 1)) + dx) / float(window)
+
+    # =========================================================================
+    # READ
+    # =========================================================================
+
+    def snapshot(self) -> Dict:
+        """
+        Latest indicator values, keyed and defaulted like calculate_all_indicators
+
+        Returns:
+            Dictionary of indicator values and classifications
+        """
+        if self.bars == 0:
+            raise ValueError("No bars absorbed yet")
+
+        price = self.close
+
+        def latest(ewm: _Ewm) -> float:
+            return ewm.value if ewm.nobs >= ewm.min_periods and ewm.value == ewm.value else price
+
+        ema_fast, ema_medium = latest(self.ema_fast), latest(self.ema_medium)
+        ema_slow, ema_trend = latest(self.ema_slow), latest(self.ema_trend)
+
+        # RSI
+        rsi = self.rsi_history[-1]
+        latest_rsi = rsi if rsi == rsi else 50
+        rsi_direction = 'neutral'
+        if self.bars >= RSI_HISTORY:
+            rsi_5_ago = self.rsi_history[0] if self.rsi_history[0] == self.rsi_history[0] else latest_rsi
+            rsi_direction = classify_rsi_direction(latest_rsi, rsi_5_ago)
+
+        # MACD
+        macd = self.macd if self.macd == self.macd else 0
+        signal = self.signal if self.signal == self.signal else 0
+        hist = self.hist_history[-1] if self.hist_history[-1] == self.hist_history[-1] else 0
+        crossover = 'none'
+        if self.bars >= 2:
+            prev_hist = self.hist_history[-2] if self.hist_history[-2] == self.hist_history[-2] else 0
+            crossover = classify_macd_crossover(hist, prev_hist)
+        hist_direction = 'neutral'
+        if self.bars >= HIST_HISTORY:
+            hist_3_ago = self.hist_history[0] if self.hist_history[0] == self.hist_history[0] else hist
+            hist_direction = classify_hist_direction(hist, hist_3_ago)
+
+        # ATR (ta reports zeros during warm-up)
+        atr = self.atr if self.bars >= self.atr_period else 0.0
+        atr_percent = (atr / price) * 100
+
+        # Bollinger Bands
+        if self.bb_window.full:
+            window = self.bb_window.ordered()
+            middle = window.mean()
+            std = window.std()
+            upper = middle + self.bb_std * std
+            lower = middle - self.bb_std * std
+            percent_b = (price - lower) / (upper - lower) if upper != lower else NAN
+            bandwidth = _ratio((upper - lower), middle) * 100
+        else:
+            middle = upper = lower = percent_b = bandwidth = NAN
+        upper = upper if upper == upper else price * 1.02
+        middle = middle if middle == middle else price
+        lower = lower if lower == lower else price * 0.98
+        percent_b = percent_b if percent_b == percent_b else 0.5
+        bandwidth = bandwidth if bandwidth == bandwidth else 0.04
+
+        # Stochastic
+        stoch_k = self.stoch_k_window.ordered()[-1]
+        stoch_d = self.stoch_k_window.ordered().mean() if self.stoch_k_window.full else NAN
+        stoch_k = stoch_k if stoch_k == stoch_k else 50
+        stoch_d = stoch_d if stoch_d == stoch_d else 50
+
+        # Volume
+        volumes = self.volume_window.ordered()
+        avg_volume = volumes.mean()
+        latest_volume = volumes[-1]
+        volume_ratio = latest_volume / avg_volume if avg_volume > 0 else 1
+        obv_trend = 'neutral'
+        if self.bars >= OBV_HISTORY:
+            obv_trend = classify_obv_trend(self.obv, self.obv_history[0])
+
+        return {
+            'current_price': price,
+            'ema_fast': ema_fast,
+            'ema_medium': ema_medium,
+            'ema_slow': ema_slow,
+            'ema_trend': ema_trend,
+            'rsi': latest_rsi,
+            'rsi_zone': classify_rsi_zone(latest_rsi),
+            'rsi_direction': rsi_direction,
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_hist': hist,
+            'macd_crossover': crossover,
+            'macd_above_zero': macd > 0,
+            'macd_above_signal': macd > signal,
+            'hist_direction': hist_direction,
+            'adx': self.adx,
+            'plus_di': self.plus_di,
+            'minus_di': self.minus_di,
+            'adx_strength': classify_adx_strength(self.adx),
+            'adx_trend_direction': classify_di_direction(self.plus_di, self.minus_di),
+            'trend_exists': self.adx >= 25,
+            'atr': atr,
+            'atr_percent': atr_percent,
+            'volatility_level': classify_volatility(atr_percent),
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'bb_percent': percent_b,
+            'bb_bandwidth': bandwidth,
+            'bb_position': classify_bb_position(price, upper, middle, lower),
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'stoch_zone': classify_stoch_zone(stoch_k),
+            'volume_ratio': volume_ratio,
+            'volume_level': classify_volume_level(volume_ratio),
+            'avg_volume': avg_volume,
+            'latest_volume': latest_volume,
+            'obv_trend': obv_trend,
+        }
+
+    def preview(self, high: float, low: float, close: float, volume: float = 0.0) -> Dict:
+        """
+        Snapshot as if a still-forming bar were appended, without changing state
+
+        Args:
+            high: Bar high so far
+            low: Bar low so far
+            close: Latest price
+            volume: Bar volume so far
+
+        Returns:
+            Dictionary of indicator values
+        """
+        state = self.copy()
+        state.update(high, low, close, volume, self.last_time)
+        return state.snapshot()
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def to_state(self) -> Dict:
+        """Plain (JSON-serialisable) representation"""
+        return {
+            'timeframe': self.timeframe,
+            'bars': self.bars,
+            'last_time': self.last_time,
+            'prev': [self.prev_high, self.prev_low, self.prev_close],
+            'ewm': {name: getattr(self, name).to_state() for name in (
+                'ema_fast', 'ema_medium', 'ema_slow', 'ema_trend',
+                'macd_fast', 'macd_slow', 'macd_signal', 'rsi_up', 'rsi_down'
+            )},
+            'macd': [self.macd, self.signal],
+            'hist_history': list(self.hist_history),
+            'rsi_history': list(self.rsi_history),
+            'atr': [self.atr, self.atr_warmup],
+            'adx': [self.tr_sum, self.pos_sum, self.neg_sum, self.adx_warmup, self.dx_warmup,
+                    self.adx, self.plus_di, self.minus_di],
+            'windows': {name: getattr(self, name).to_state() for name in (
+                'bb_window', 'stoch_high', 'stoch_low', 'stoch_k_window', 'volume_window'
+            )},
+            'obv': [self.obv, list(self.obv_history)],
+        }
+
+    @classmethod
+    def from_state(cls, data: Dict) -> 'IndicatorState':
+        """Rebuild a state saved with to_state()"""
+        state = cls(data['timeframe'])
+        state.bars = data['bars']
+        state.last_time = data['last_time']
+        state.prev_high, state.prev_low, state.prev_close = data['prev']
+        state.close = state.prev_close
+        for name, value in data['ewm'].items():
+            getattr(state, name).load_state(value)
+        state.macd, state.signal = data['macd']
+        state.hist_history.extend(data['hist_history'])
+        state.rsi_history.extend(data['rsi_history'])
+        state.atr, state.atr_warmup = data['atr']
+        (state.tr_sum, state.pos_sum, state.neg_sum, state.adx_warmup, state.dx_warmup,
+         state.adx, state.plus_di, state.minus_di) = data['adx']
+        for name, values in data['windows'].items():
+            getattr(state, name).load_state(values)
+        state.obv, obv_history = data['obv']
+        state.obv_history.extend(obv_history)
+        return state
+
+    def copy(self) -> 'IndicatorState':
+        """Independent copy"""
+        return IndicatorState.from_state(self.to_state())
+
+
+def _epoch_seconds(index: pd.Index) -> Optional[np.ndarray]:
+    """Bar times as int64 epoch seconds (None for non-datetime indexes)"""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit('s').asi8
+    return None
+
+
+def build_state(df: pd.DataFrame, timeframe: str = 'medium') -> IndicatorState:
+    """
+    Replay a full OHLCV history into a new state
+
+    Args:
+        df: Frame with lowercase OHLCV columns (volume optional)
+        timeframe: Key of TIMEFRAME_CONFIGS
+
+    Returns:
+        IndicatorState positioned after the last bar
+    """
+    state = IndicatorState(timeframe)
+    _feed(state, df)
+    return state
+
+
+def _feed(state: IndicatorState, df: pd.DataFrame):
+    """Feed bars in order"""
+    times = _epoch_seconds(df.index)
+    times = times.tolist() if times is not None else [None] * len(df)
+    volume = df['volume'].to_numpy(dtype=float) if 'volume' in df.columns else np.zeros(len(df))
+    rows = zip(times, df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float),
+               df['close'].to_numpy(dtype=float), volume)
+    for timestamp, high, low, close, vol in rows:
+        state.update(high, low, close, vol, timestamp)
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class IndicatorEngine:
+    """Per-symbol indicator states fed incrementally from bar histories"""
+
+    def __init__(self, timeframe: str = 'medium'):
+        """
+        Initialize engine
+
+        Args:
+            timeframe: Key of TIMEFRAME_CONFIGS used for every state
+        """
+        self.timeframe = timeframe
+        self._states: Dict[str, IndicatorState] = {}
+        self.rebuilds = 0
+        self.bars_applied = 0
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._states
+
+    def update(self, symbol: str, bars: pd.DataFrame, partial_last: bool = False) -> Dict:
+        """
+        Bring a symbol's state up to date with its bar history and snapshot it
+
+        Only bars newer than the state's last bar are applied. The state is
+        rebuilt from the full history if it is missing or its last bar is no
+        longer in the history (gap, restart, ring buffer wrap).
+
+        Args:
+            symbol: Stock symbol
+            bars: OHLCV frame with a DatetimeIndex, oldest first
+            partial_last: Treat the last bar as still forming (previewed, not stored)
+
+        Returns:
+            Dictionary of indicator values
+        """
+        if bars.empty:
+            raise ValueError("No bars")
+
+        complete = bars.iloc[:-1] if partial_last else bars
+        times = _epoch_seconds(complete.index)
+        if times is None:
+            raise ValueError("Bars need a DatetimeIndex")
+
+        state = self._states.get(symbol)
+        position = None
+        if state is not None and state.last_time is not None:
+            position = int(np.searchsorted(times, state.last_time))
+            if position >= len(times) or times[position] != state.last_time:
+                position = None
+
+        if position is None:
+            state = self._states[symbol] = build_state(complete, self.timeframe)
+            self.rebuilds += 1
+        else:
+            new = complete.iloc[position + 1:]
+            _feed(state, new)
+            self.bars_applied += len(new)
+
+        if partial_last:
+            last = bars.iloc[-1]
+            return state.preview(last['high'], last['low'], last['close'], last.get('volume', 0.0))
+        return state.snapshot()
+
+    def discard(self, symbol: str):
+        """Forget a symbol's state"""
+        self._states.pop(symbol, None)
+
+    def save(self, path: str):
+        """
+        Checkpoint all states to a JSON file
+
+        Args:
+            path: Destination file
+        """
+        payload = {
+            'timeframe': self.timeframe,
+            'states': {symbol: state.to_state() for symbol, state in self._states.items()},
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """
+        Restore states from a checkpoint (states for another timeframe are ignored)
+
+        Args:
+            path: Checkpoint file
+
+        Returns:
+            Number of states restored
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            payload = json.load(f)
+        if payload.get('timeframe') != self.timeframe:
+            return 0
+        for symbol, data in payload['states'].items():
+            self._states[symbol] = IndicatorState.from_state(data)
+        return len(payload['states'])
@@ -0,0 +1,790 @@
+"""
+Strategy Parameter Sweep Engine for Stock Analyzer Pro
+Scores many strategy parameter sets against the same price histories
+
+A sweep replays the live signal and recommendation layer (hard filters,
+calculate_all_signals, targets, stops, risk/reward and
+determine_recommendation) at every historical bar and scores each parameter
+set by what happened after its BUY signals.
+
+Calling calculate_all_indicators on every prefix of a history would cost
+one full recalculation per bar, so the indicator snapshot of every bar is
+built once from full-length series instead (the `ta` indicators, rolling
+windows and shifts are all causal, so row i equals calculate_all_indicators
+on the first i + 1 bars). These rows only depend on TIMEFRAME_CONFIGS:
+parameter sets that change SIGNAL_WEIGHTS, HARD_FILTERS,
+RECOMMENDATION_THRESHOLDS or RISK_MODES share one set of rows, and pattern
+detection (the slowest part) is shared by every set.
+
+Parameters are dotted paths into the config tables, e.g.
+'RISK_MODES.balanced.atr_stop_multiplier' or 'HARD_FILTERS.block_buy.0.value'
+(list positions are integers). They are applied in place for the duration
+of one evaluation, so in a process pool each worker only changes its own
+copy of the configuration.
+
+Author: Harsh Kandhway
+"""
+
+import itertools
+import logging
+import math
+import random
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from ta.momentum import StochasticOscillator
+from ta.trend import ADXIndicator
+from ta.volatility import AverageTrueRange, BollingerBands
+from ta.volume import OnBalanceVolumeIndicator
+
+from . import config as strategy_config
+from .config import INVESTMENT_HORIZONS, RISK_MODES, TIMEFRAME_CONFIGS
+from .indicators import (
+    calculate_emas, calculate_fibonacci_levels, calculate_macd, calculate_rsi,
+    classify_adx_strength, classify_bb_position, classify_di_direction,
+    classify_ema_alignment, classify_hist_direction, classify_level_proximity,
+    classify_macd_crossover, classify_market_phase, classify_momentum,
+    classify_obv_trend, classify_rsi_direction, classify_rsi_zone,
+    classify_stoch_zone, classify_volatility, classify_volume_level,
+    combine_divergence
+)
+from .patterns import detect_all_patterns
+from .risk_management import calculate_stoploss, calculate_targets, validate_risk_reward
+from .signals import (
+    calculate_all_signals, calculate_overall_score, check_hard_filters,
+    determine_recommendation
+)
+
+logger = logging.getLogger(__name__)
+
+# Config tables a parameter key may start with
+SWEEPABLE_TABLES = (
+    'SIGNAL_WEIGHTS', 'HARD_FILTERS', 'RECOMMENDATION_THRESHOLDS',
+    'RISK_MODES', 'TIMEFRAME_CONFIGS',
+)
+
+RECOMMENDATION_TYPES = ('BUY', 'HOLD', 'SELL', 'BLOCKED')
+
+# Pattern fields used when detection fails (same fallback as calculate_all_indicators)
+NO_PATTERNS = {
+    'pattern_bullish_count': 0,
+    'pattern_bearish_count': 0,
+    'pattern_bullish_score': 0,
+    'pattern_bearish_score': 0,
+    'pattern_bias': 'neutral',
+    'strongest_pattern': None,
+}
+
+
+# ============================================================================
+# PARAMETER SETS
+# ============================================================================
+
+def _resolve(key: str) -> Tuple[Any, Any]:
+    """Container and index/key a dotted parameter path points at"""
+    table, *path = key.split('.')
+    if table not in SWEEPABLE_TABLES or not path:
+        raise ValueError(f"Unknown parameter '{key}': must start with one of {', '.join(SWEEPABLE_TABLES)}")
+
+    container = getattr(strategy_config, table)
+    try:
+        for position, part in enumerate(path):
+            index = int(part) if isinstance(container, list) else part
+            container[index]  # must already exist
+            if position == len(path) - 1:
+                return container, index
+            container = container[index]
+    except (KeyError, IndexError, ValueError, TypeError):
+        pass
+    raise ValueError(f"Unknown parameter '{key}'")
+
+
+@contextmanager
+def override_parameters(params: Dict[str, Any]) -> Iterator[None]:
+    """
+    Temporarily set config values from dotted parameter paths
+
+    The config dicts are shared by reference with the signal, risk and
+    indicator modules, so the new values are seen everywhere until the
+    block exits and the originals are restored.
+
+    Args:
+        params: Mapping of dotted path to value
+
+    Raises:
+        ValueError: If a path does not name an existing config value
+    """
+    targets = [(_resolve(key), value) for key, value in params.items()]
+    originals = []
+    try:
+        for (container, index), value in targets:
+            originals.append((container, index, container[index]))
+            container[index] = value
+        yield
+    finally:
+        for container, index, original in reversed(originals):
+            container[index] = original
+
+
+def expand_grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of a parameter space
+
+    Args:
+        space: Mapping of dotted path to the values to try
+
+    Returns:
+        List of parameter sets (the first key varies slowest)
+    """
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def sample_parameters(space: Dict[str, List[Any]], count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Random distinct combinations of a parameter space
+
+    Combinations are drawn by index, so the full grid is never built even
+    when it is very large.
+
+    Args:
+        space: Mapping of dotted path to the values to try
+        count: Number of parameter sets (the whole grid if it is smaller)
+        seed: Random seed (same seed gives the same sets)
+
+    Returns:
+        List of parameter sets
+    """
+    keys = list(space)
+    sizes = [len(space[key]) for key in keys]
+    total = math.prod(sizes)
+    if count >= total:
+        return expand_grid(space)
+
+    parameter_sets = []
+    for index in random.Random(seed).sample(range(total), count):
+        params = {}
+        for key, size in zip(reversed(keys), reversed(sizes)):
+            index, position = divmod(index, size)
+            params[key] = space[key][position]
+        parameter_sets.append({key: params[key] for key in keys})
+    return parameter_sets
+
+
+def timeframe_parameters(params: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """The TIMEFRAME_CONFIGS overrides of a parameter set, as a hashable key"""
+    return tuple(sorted(
+        (key, value) for key, value in params.items() if key.startswith('TIMEFRAME_CONFIGS.')
+    ))
+
+
+# ============================================================================
+# PER-BAR INDICATOR ROWS
+# ============================================================================
+
+def _fill(series: pd.Series, default) -> np.ndarray:
+    """Series values with NaNs replaced by a scalar or per-bar default"""
+    values = series.to_numpy(dtype=float)
+    return np.where(np.isnan(values), default, values)
+
+
+def _window_divergence(price: np.ndarray, indicator: np.ndarray, lookback: int) -> np.ndarray:
+    """detect_divergence for the window ending at every bar (empty string before the first full window)"""
+    result = np.full(len(price), '', dtype=object)
+    if len(price) < lookback:
+        return result
+
+    half = lookback // 2
+    price_windows = np.lib.stride_tricks.sliding_window_view(price, lookback)
+    indicator_windows = np.lib.stride_tricks.sliding_window_view(indicator, lookback)
+    with warnings.catch_warnings():
+        # All-NaN halves compare as False, like pandas' NaN max/min
+        warnings.simplefilter('ignore', RuntimeWarning)
+        bearish = (
+            (np.nanmax(price_windows[:, half:], axis=1) > np.nanmax(price_windows[:, :half], axis=1))
+            & (np.nanmax(indicator_windows[:, half:], axis=1) < np.nanmax(indicator_windows[:, :half], axis=1))
+        )
+        bullish = (
+            (np.nanmin(price_windows[:, half:], axis=1) < np.nanmin(price_windows[:, :half], axis=1))
+            & (np.nanmin(indicator_windows[:, half:], axis=1) > np.nanmin(indicator_windows[:, :half], axis=1))
+        )
+    result[lookback - 1:] = np.where(bearish, 'bearish', np.where(bullish, 'bullish', 'none'))
+    return result
+
+
+def detect_pattern_rows(df: pd.DataFrame, positions: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Pattern fields for the prefixes ending at the given bar positions
+
+    Args:
+        df: OHLCV DataFrame
+        positions: Bar positions (0-based) to detect patterns at
+
+    Returns:
+        Mapping of bar position to pattern fields
+    """
+    rows = {}
+    for position in positions:
+        try:
+            data = detect_all_patterns(df.iloc[:position + 1])
+        except Exception:
+            rows[position] = dict(NO_PATTERNS)
+            continue
+        rows[position] = {
+            'pattern_bullish_count': data['bullish_count'],
+            'pattern_bearish_count': data['bearish_count'],
+            'pattern_bullish_score': data['bullish_score'],
+            'pattern_bearish_score': data['bearish_score'],
+            'pattern_bias': data['pattern_bias'],
+            'strongest_pattern': data['strongest_pattern'],
+        }
+    return rows
+
+
+def build_indicator_rows(
+    df: pd.DataFrame,
+    timeframe: str = 'medium',
+    patterns: Optional[Dict[int, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Indicator snapshot of every bar that has enough history for analysis
+
+    Row i holds the scalar fields calculate_all_indicators returns for
+    df.iloc[:start + i + 1] (series and pattern lists are left out).
+
+    Args:
+        df: OHLCV DataFrame
+        timeframe: Key of TIMEFRAME_CONFIGS (read when called, so overrides apply)
+        patterns: Pattern rows by bar position; missing positions are
+                  detected and added, so the dict can be reused across timeframes
+
+    Returns:
+        Dictionary with 'rows', 'start' (bar position of the first row) and
+        the 'high', 'low' and 'close' arrays used to score trades
+
+    Raises:
+        ValueError: If the DataFrame is invalid or shorter than min_bars
+    """
+    if timeframe not in TIMEFRAME_CONFIGS:
+        raise ValueError(f"Invalid timeframe '{timeframe}'. Must be one of: {', '.join(TIMEFRAME_CONFIGS)}")
+    config = TIMEFRAME_CONFIGS[timeframe]
+
+    missing_columns = [col for col in ('close', 'high', 'low') if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+    if len(df) < config['min_bars']:
+        raise ValueError(
+            f"Insufficient data: {len(df)} rows, need at least {config['min_bars']} "
+            f"for {timeframe} timeframe"
+        )
+
+    close, high, low = df['close'], df['high'], df['low']
+    if (high < low).any():
+        raise ValueError("Invalid OHLC data: high < low detected")
+    if (high < close).any() or (low > close).any():
+        raise ValueError("Invalid OHLC data: close price outside high/low range")
+    volume = df['volume'] if 'volume' in df.columns else pd.Series(0, index=df.index)
+
+    price = close.to_numpy(dtype=float)
+    start = config['min_bars'] - 1
+
+    # EMAs, RSI and MACD (same fallbacks as the calculate_* functions)
+    emas = calculate_emas(close, config)
+    ema = {name: _fill(emas[name], price) for name in ('ema_fast', 'ema_medium', 'ema_slow', 'ema_trend')}
+
+    rsi_series = calculate_rsi(close, config)['rsi_series']
+    rsi = _fill(rsi_series, 50)
+    rsi_5_ago = _fill(rsi_series.shift(4), rsi)
+
+    macd_data = calculate_macd(close, config)
+    histogram = macd_data['histogram']
+    macd = _fill(macd_data['macd_line'], 0)
+    macd_signal = _fill(macd_data['signal_line'], 0)
+    macd_hist = _fill(histogram, 0)
+    prev_hist = _fill(histogram.shift(1), 0)
+    hist_3_ago = _fill(histogram.shift(2), macd_hist)
+
+    adx_indicator = ADXIndicator(high, low, close, window=config['adx_period'])
+    adx = _fill(adx_indicator.adx(), 20)
+    plus_di = _fill(adx_indicator.adx_pos(), 25)
+    minus_di = _fill(adx_indicator.adx_neg(), 25)
+
+    atr = _fill(AverageTrueRange(high, low, close, window=config['atr_period']).average_true_range(), price * 0.02)
+
+    bb = BollingerBands(close, window=config['bb_period'], window_dev=config['bb_std'])
+    bb_upper = _fill(bb.bollinger_hband(), price * 1.02)
+    bb_middle = _fill(bb.bollinger_mavg(), price)
+    bb_lower = _fill(bb.bollinger_lband(), price * 0.98)
+    bb_percent = _fill(bb.bollinger_pband(), 0.5)
+    bb_bandwidth = _fill(bb.bollinger_wband(), 0.04)
+
+    stoch = StochasticOscillator(high, low, close, window=14, smooth_window=3)
+    stoch_k = _fill(stoch.stoch(), 50)
+    stoch_d = _fill(stoch.stoch_signal(), 50)
+
+    # Volume
+    avg_volume = volume.rolling(config['volume_avg_period'], min_periods=1).mean().to_numpy()
+    latest_volume = volume.to_numpy()
+    obv_series = OnBalanceVolumeIndicator(close, volume).on_balance_volume()
+    obv = obv_series.to_numpy(dtype=float)
+    obv_10_ago = _fill(obv_series.shift(9), obv)
+
+    # Support/resistance over the lookback and the whole history so far
+    lookback = config['support_lookback']
+    resistance = high.rolling(lookback, min_periods=1).max().to_numpy()
+    support = low.rolling(lookback, min_periods=1).min().to_numpy()
+    high_52w = high.cummax().to_numpy()
+    low_52w = low.cummin().to_numpy()
+
+    momentum_period = config['momentum_period']
+    past = close.shift(momentum_period - 1).to_numpy(dtype=float)
+
+    divergence_lookback = config['divergence_lookback']
+    rsi_divergence = _window_divergence(price, rsi_series.to_numpy(dtype=float), divergence_lookback)
+    macd_divergence = _window_divergence(price, histogram.to_numpy(dtype=float), divergence_lookback)
+
+    if patterns is None:
+        patterns = {}
+    missing = [position for position in range(start, len(df)) if position not in patterns]
+    patterns.update(detect_pattern_rows(df, missing))
+
+    rows = []
+    for i in range(start, len(df)):
+        current_price = float(price[i])
+        trend_exists = adx[i] >= 25
+        ema_alignment = classify_ema_alignment(
+            current_price, ema['ema_fast'][i], ema['ema_medium'][i], ema['ema_slow'][i], ema['ema_trend'][i]
+        )
+        atr_percent = (atr[i] / current_price) * 100
+        volume_ratio = latest_volume[i] / avg_volume[i] if avg_volume[i] > 0 else 1
+        distance_to_resistance = ((resistance[i] - current_price) / current_price) * 100
+        distance_to_support = ((current_price - support[i]) / current_price) * 100
+        momentum = ((current_price - past[i]) / past[i]) * 100
+        fib_data = calculate_fibonacci_levels(high_52w[i], low_52w[i], current_price)
+
+        rows.append({
+            'current_price': current_price,
+            'timeframe': timeframe,
+            'ema_fast': ema['ema_fast'][i],
+            'ema_medium': ema['ema_medium'][i],
+            'ema_slow': ema['ema_slow'][i],
+            'ema_trend': ema['ema_trend'][i],
+            'ema_fast_period': emas['ema_fast_period'],
+            'ema_medium_period': emas['ema_medium_period'],
+            'ema_slow_period': emas['ema_slow_period'],
+            'ema_trend_period': emas['ema_trend_period'],
+            'ema_alignment': ema_alignment,
+            'price_vs_trend_ema': 'above' if current_price > ema['ema_trend'][i] else 'below',
+            'price_vs_medium_ema': 'above' if current_price > ema['ema_medium'][i] else 'below',
+            'price_vs_fast_ema': 'above' if current_price > ema['ema_fast'][i] else 'below',
+            'rsi': rsi[i],
+            'rsi_zone': classify_rsi_zone(rsi[i]),
+            'rsi_direction': classify_rsi_direction(rsi[i], rsi_5_ago[i]),
+            'rsi_period': config['rsi_period'],
+            'macd': macd[i],
+            'macd_signal': macd_signal[i],
+            'macd_hist': macd_hist[i],
+            'macd_crossover': classify_macd_crossover(macd_hist[i], prev_hist[i]),
+            'macd_above_zero': macd[i] > 0,
+            'macd_above_signal': macd[i] > macd_signal[i],
+            'hist_direction': classify_hist_direction(macd_hist[i], hist_3_ago[i]),
+            'adx': adx[i],
+            'plus_di': plus_di[i],
+            'minus_di': minus_di[i],
+            'adx_strength': classify_adx_strength(adx[i]),
+            'adx_trend_direction': classify_di_direction(plus_di[i], minus_di[i]),
+            'trend_exists': trend_exists,
+            'atr': atr[i],
+            'atr_percent': atr_percent,
+            'volatility_level': classify_volatility(atr_percent),
+            'bb_upper': bb_upper[i],
+            'bb_middle': bb_middle[i],
+            'bb_lower': bb_lower[i],
+            'bb_percent': bb_percent[i],
+            'bb_bandwidth': bb_bandwidth[i],
+            'bb_position': classify_bb_position(current_price, bb_upper[i], bb_middle[i], bb_lower[i]),
+            'stoch_k': stoch_k[i],
+            'stoch_d': stoch_d[i],
+            'stoch_zone': classify_stoch_zone(stoch_k[i]),
+            'volume_ratio': volume_ratio,
+            'volume_level': classify_volume_level(volume_ratio),
+            'avg_volume': avg_volume[i],
+            'latest_volume': latest_volume[i],
+            'obv_trend': classify_obv_trend(obv[i], obv_10_ago[i]),
+            'resistance': resistance[i],
+            'support': support[i],
+            'high_52w': high_52w[i],
+            'low_52w': low_52w[i],
+            'distance_to_resistance': distance_to_resistance,
+            'distance_to_support': distance_to_support,
+            'resistance_proximity': classify_level_proximity(distance_to_resistance),
+            'support_proximity': classify_level_proximity(distance_to_support),
+            'momentum': momentum,
+            'momentum_direction': classify_momentum(momentum),
+            'momentum_period': momentum_period,
+            **fib_data,
+            'rsi_divergence': rsi_divergence[i],
+            'macd_divergence': macd_divergence[i],
+            'divergence': combine_divergence(rsi_divergence[i], macd_divergence[i]),
+            'market_phase': classify_market_phase(ema_alignment, current_price, ema['ema_trend'][i], trend_exists),
+            **patterns[i],
+        })
+
+    return {
+        'rows': rows,
+        'start': start,
+        'high': high.to_numpy(dtype=float),
+        'low': low.to_numpy(dtype=float),
+        'close': price,
+    }
+
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+def evaluate_bar(indicators: Dict[str, Any], mode: str, horizon: str) -> Tuple[str, float, float]:
+    """
+    Recommendation for one indicator row under the active parameters
+
+    Follows the same steps as the analysis service's per-horizon evaluation.
+
+    Args:
+        indicators: One indicator row
+        mode: Risk mode
+        horizon: Investment horizon
+
+    Returns:
+        Tuple of (recommendation_type, target, stop)
+    """
+    is_buy_blocked, _ = check_hard_filters(indicators, 'buy')
+    is_sell_blocked, _ = check_hard_filters(indicators, 'sell')
+    signal_data = calculate_all_signals(indicators, mode)
+
+    current_price = indicators['current_price']
+    atr = indicators['atr']
+    support = indicators['support']
+    resistance = indicators['resistance']
+    strongest_pattern = indicators.get('strongest_pattern')
+
+    target = calculate_targets(
+        current_price, atr, resistance, support,
+        indicators['fib_extensions'], mode, 'long', horizon, strongest_pattern
+    )['recommended_target']
+    stop = calculate_stoploss(current_price, atr, support, resistance, mode, 'long')['recommended_stop']
+    risk_reward, rr_valid, _ = validate_risk_reward(current_price, target, stop, mode)
+
+    pattern_confidence = 0.0
+    pattern_type = None
+    if strongest_pattern:
+        pattern_confidence = getattr(strongest_pattern, 'confidence', 0.0)
+        pattern_type = getattr(strongest_pattern, 'type', None)
+        if hasattr(pattern_type, 'value'):
+            pattern_type = pattern_type.value
+
+    _, recommendation_type = determine_recommendation(
+        signal_data['confidence'], is_buy_blocked, is_sell_blocked, mode,
+        rr_valid=rr_valid,
+        overall_score_pct=calculate_overall_score(indicators, signal_data, rr_valid),
+        risk_reward=risk_reward,
+        min_rr=RISK_MODES[mode]['min_risk_reward'],
+        adx=indicators.get('adx', 0.0),
+        bullish_indicators_count=sum(
+            1 for _, direction in signal_data.get('signals', {}).values() if direction == 'bullish'
+        ),
+        pattern_confidence=pattern_confidence,
+        pattern_type=pattern_type
+    )
+    return recommendation_type, target, stop
+
+
+def trade_outcome(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry: int,
+    target: float,
+    stop: float,
+    holding_bars: int
+) -> Optional[Tuple[str, float]]:
+    """
+    Result of a long trade entered at the close of bar `entry`
+
+    The stop is assumed to fill first when both levels fall inside the same
+    bar. Trades still open at the end of the data are unresolved.
+
+    Args:
+        high, low, close: Price arrays
+        entry: Bar position of the signal
+        target: Target price
+        stop: Stop price
+        holding_bars: Bars to hold before exiting at the close
+
+    Returns:
+        Tuple of ('win' | 'loss' | 'timeout', return percent) or None if unresolved
+    """
+    entry_price = close[entry]
+    end = entry + holding_bars
+    stop_hits = np.flatnonzero(low[entry + 1:end + 1] <= stop)
+    target_hits = np.flatnonzero(high[entry + 1:end + 1] >= target)
+
+    if len(stop_hits) and (not len(target_hits) or stop_hits[0] <= target_hits[0]):
+        return 'loss', (stop - entry_price) / entry_price * 100
+    if len(target_hits):
+        return 'win', (target - entry_price) / entry_price * 100
+    if end >= len(close):
+        return None
+    return 'timeout', (close[end] - entry_price) / entry_price * 100
+
+
+def evaluate_parameters(
+    matrices: Dict[str, Dict[str, Any]],
+    params: Dict[str, Any],
+    mode: str = 'balanced',
+    horizon: str = '3months',
+    holding_bars: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Score one parameter set over every symbol's indicator rows
+
+    Every BUY bar is an independent trade: entry at the close, exit at the
+    target, the stop or after holding_bars.
+
+    Args:
+        matrices: Output of build_indicator_rows by symbol
+        params: Parameter set (dotted path to value)
+        mode: Risk mode
+        horizon: Investment horizon (targets and default holding period)
+        holding_bars: Bars to hold a trade (defaults to the horizon's avg_days)
+
+    Returns:
+        Dictionary with the parameters, signal counts and trade statistics
+    """
+    holding_bars = holding_bars or INVESTMENT_HORIZONS[horizon]['avg_days']
+    signals = dict.fromkeys(RECOMMENDATION_TYPES, 0)
+    outcomes = {'win': [], 'loss': [], 'timeout': []}
+    r_multiples = []
+    unresolved = 0
+
+    with override_parameters(params):
+        for matrix in matrices.values():
+            high, low, close = matrix['high'], matrix['low'], matrix['close']
+            for position, row in enumerate(matrix['rows'], start=matrix['start']):
+                recommendation_type, target, stop = evaluate_bar(row, mode, horizon)
+                signals[recommendation_type] = signals.get(recommendation_type, 0) + 1
+                if recommendation_type != 'BUY' or not stop < close[position] < target:
+                    continue
+
+                outcome = trade_outcome(high, low, close, position, target, stop, holding_bars)
+                if outcome is None:
+                    unresolved += 1
+                    continue
+                result, return_pct = outcome
+                outcomes[result].append(return_pct)
+                r_multiples.append(return_pct / ((close[position] - stop) / close[position] * 100))
+
+    returns = outcomes['win'] + outcomes['loss'] + outcomes['timeout']
+    trades = len(returns)
+    return {
+        'parameters': params,
+        'signals': signals,
+        'trades': trades,
+        'wins': len(outcomes['win']),
+        'losses': len(outcomes['loss']),
+        'timeouts': len(outcomes['timeout']),
+        'unresolved': unresolved,
+        'hit_rate': len(outcomes['win']) / trades * 100 if trades else 0.0,
+        'expectancy_pct': float(np.mean(returns)) if trades else 0.0,
+        'expectancy_r': float(np.mean(r_multiples)) if trades else 0.0,
+        'avg_win_pct': float(np.mean(outcomes['win'])) if outcomes['win'] else 0.0,
+        'avg_loss_pct': float(np.mean(outcomes['loss'])) if outcomes['loss'] else 0.0,
+    }
+
+
+# ============================================================================
+# PROCESS POOL
+# ============================================================================
+
+# Indicator rows held by each worker process (set by the pool initializer)
+_worker_matrices: Dict[str, Dict[str, Any]] = {}
+
+
+def _init_worker(matrices: Dict[str, Dict[str, Any]]):
+    global _worker_matrices
+    _worker_matrices = matrices
+
+
+def _evaluate_chunk(
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    mode: str,
+    horizon: str,
+    holding_bars: Optional[int]
+) -> List[Tuple[int, Dict[str, Any]]]:
+    return [
+        (index, evaluate_parameters(_worker_matrices, params, mode, horizon, holding_bars))
+        for index, params in chunk
+    ]
+
+
+def _build_matrix(
+    symbol: str,
+    df: pd.DataFrame,
+    timeframe: str,
+    timeframe_params: Tuple[Tuple[str, Any], ...],
+    patterns: Dict[int, Dict[str, Any]]
+) -> Tuple[str, Optional[Dict[str, Any]], Dict[int, Dict[str, Any]], Optional[str]]:
+    try:
+        with override_parameters(dict(timeframe_params)):
+            return symbol, build_indicator_rows(df, timeframe, patterns), patterns, None
+    except ValueError as e:
+        return symbol, None, patterns, str(e)
+
+
+class ParameterSweep:
+    """
+    Evaluates parameter sets over a universe of daily histories
+
+    Indicator rows are built once per distinct set of TIMEFRAME_CONFIGS
+    overrides and patterns once per symbol; both are kept for later runs.
+    """
+
+    def __init__(
+        self,
+        histories: Dict[str, pd.DataFrame],
+        mode: str = 'balanced',
+        horizon: str = '3months',
+        timeframe: Optional[str] = None,
+        holding_bars: Optional[int] = None,
+        workers: int = 1
+    ):
+        """
+        Args:
+            histories: OHLCV DataFrames by symbol
+            mode: Risk mode
+            horizon: Investment horizon
+            timeframe: Indicator timeframe (defaults to the horizon's)
+            holding_bars: Bars to hold a trade (defaults to the horizon's avg_days)
+            workers: Worker processes (1 runs in this process)
+        """
+        if mode not in RISK_MODES:
+            raise ValueError(f"Invalid mode '{mode}'. Must be one of: {', '.join(RISK_MODES)}")
+        if horizon not in INVESTMENT_HORIZONS:
+            raise ValueError(f"Invalid horizon '{horizon}'. Must be one of: {', '.join(INVESTMENT_HORIZONS)}")
+
+        self.histories = histories
+        self.mode = mode
+        self.horizon = horizon
+        self.timeframe = timeframe or INVESTMENT_HORIZONS[horizon]['timeframe_key']
+        self.holding_bars = holding_bars or INVESTMENT_HORIZONS[horizon]['avg_days']
+        self.workers = max(1, workers)
+        self.skipped: Dict[str, str] = {}
+        self._matrices: Dict[Tuple, Dict[str, Dict[str, Any]]] = {}
+        self._patterns: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    def matrices(self, timeframe_params: Tuple[Tuple[str, Any], ...] = ()) -> Dict[str, Dict[str, Any]]:
+        """
+        Indicator rows of every symbol for one set of TIMEFRAME_CONFIGS overrides
+
+        Symbols whose data is invalid or too short are left out and listed
+        in self.skipped.
+        """
+        if timeframe_params in self._matrices:
+            return self._matrices[timeframe_params]
+
+        jobs = [
+            (symbol, df, self.timeframe, timeframe_params, self._patterns.get(symbol, {}))
+            for symbol, df in self.histories.items()
+        ]
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                built = [future.result() for future in as_completed(pool.submit(_build_matrix, *job) for job in jobs)]
+        else:
+            built = [_build_matrix(*job) for job in jobs]
+
+        matrices = {}
+        for symbol, matrix, patterns, error in built:
+            self._patterns[symbol] = patterns
+            if matrix is None:
+                self.skipped[symbol] = error
+                logger.warning(f"Sweep skipping {symbol}: {error}")
+            else:
+                matrices[symbol] = matrix
+
+        self._matrices[timeframe_params] = dict(sorted(matrices.items()))
+        return self._matrices[timeframe_params]
+
+    def run(
+        self,
+        parameter_sets: List[Dict[str, Any]],
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate parameter sets
+
+        Args:
+            parameter_sets: Parameter sets (dotted path to value)
+            progress: Optional callback called with (done, total)
+
+        Returns:
+            One result per parameter set (see evaluate_parameters), in input
+            order, each with its 'index' in parameter_sets
+        """
+        for params in parameter_sets:
+            with override_parameters(params):  # reject unknown keys before any work
+                pass
+
+        groups: Dict[Tuple, List[Tuple[int, Dict[str, Any]]]] = OrderedDict()
+        for index, params in enumerate(parameter_sets):
+            groups.setdefault(timeframe_parameters(params), []).append((index, params))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(parameter_sets)
+        done = 0
+        for timeframe_params, items in groups.items():
+            matrices = self.matrices(timeframe_params)
+
+            if self.workers == 1 or len(items) == 1:
+                for index, params in items:
+                    results[index] = evaluate_parameters(
+                        matrices, params, self.mode, self.horizon, self.holding_bars
+                    )
+                    done += 1
+                    if progress:
+                        progress(done, len(parameter_sets))
+                continue
+
+            chunk_size = max(1, len(items) // (self.workers * 4))
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(chunks)),
+                initializer=_init_worker,
+                initargs=(matrices,)
+            ) as pool:
+                futures = [
+                    pool.submit(_evaluate_chunk, chunk, self.mode, self.horizon, self.holding_bars)
+                    for chunk in chunks
+                ]
+                for future in as_completed(futures):
+                    for index, result in future.result():
+                        results[index] = result
+                        done += 1
+                    if progress:
+                        progress(done, len(parameter_sets))
+
+        for index, result in enumerate(results):
+            result['index'] = index
+        return results
+
+
+def rank_results(results: List[Dict[str, Any]], min_trades: int = 1) -> List[Dict[str, Any]]:
+    """
+    Results with at least min_trades trades, best expectancy first
+
+    Ties are broken by hit rate, then by number of trades.
+    """
+    eligible = [result for result in results if result['trades'] >= min_trades]
+    return sorted(eligible, key=lambda r: (r['expectancy_pct'], r['hit_rate'], r['trades']), reverse=True)
@@ -0,0 +1,268 @@
+"""
+Stage Timing Module
+Low-overhead per-stage timers feeding in-process latency histograms
+
+Usage:
+    with stage('analysis.fetch'):
+        df = fetch_stock_data(symbol)
+
+    @timed('alerts.check_all')
+    async def check_all_alerts(self): ...
+
+Jobs that catch and log their own exceptions call mark_failed() in the
+except block, so the run is counted as an error instead of a fast success.
+
+Timing is disabled by default. While disabled, stage() returns a shared
+no-op context manager and timed() wrappers call straight through, so the
+instrumentation costs one flag check per call. Histograms use fixed
+log-spaced buckets, so recording is O(log buckets) and memory is constant
+however many samples are taken.
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import bisect
+import functools
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+# Bucket upper bounds in seconds: 0.1ms .. ~186s, 19% apart
+_BUCKET_BOUNDS: List[float] = [0.0001 * (1.19 ** i) for i in range(84)]
+
+_enabled = False
+_histograms: Dict[str, "StageHistogram"] = {}
+_registry_lock = threading.Lock()
+_current_stage: ContextVar[Optional["_Stage"]] = ContextVar('current_stage', default=None)
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram for one stage"""
+
+    __slots__ = ('name', 'buckets', 'count', 'errors', 'total', 'max', '_lock')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, error: bool = False):
+        """
+        Add one sample
+
+        Args:
+            seconds: Elapsed time
+            error: Whether the stage raised
+        """
+        index = bisect.bisect_left(_BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            if error:
+                self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Approximate percentile (bucket upper bound, capped at the observed max)
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Latency in seconds (0.0 if no samples)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                bound = _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict:
+        """Summary statistics in milliseconds"""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50) * 1000, 2),
+            'p95_ms': round(self.percentile(95) * 1000, 2),
+            'p99_ms': round(self.percentile(99) * 1000, 2),
+            'max_ms': round(self.max * 1000, 2),
+        }
+
+
+class _NullStage:
+    """Shared no-op context manager used while timing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Context manager that records elapsed time into a histogram"""
+
+    __slots__ = ('histogram', 'start', 'failed', '_token')
+
+    def __init__(self, histogram: StageHistogram):
+        self.histogram = histogram
+        self.start = 0.0
+        self.failed = False
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_stage.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _current_stage.reset(self._token)
+        self.histogram.record(elapsed, error=exc_type is not None or self.failed)
+        return False
+
+
+def _histogram(name: str) -> StageHistogram:
+    """Get or create the histogram for a stage"""
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(name, StageHistogram(name))
+    return histogram
+
+
+def enable():
+    """Turn stage timing on"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Turn stage timing off (collected histograms are kept)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Whether stage timing is on"""
+    return _enabled
+
+
+def stage(name: str):
+    """
+    Time a block of code
+
+    Args:
+        name: Stage name (dotted, e.g. 'analysis.indicators')
+
+    Returns:
+        Context manager
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(_histogram(name))
+
+
+def mark_failed():
+    """
+    Record the innermost running stage as an error when it exits
+
+    For timed jobs that catch and log their own exceptions; without this
+    a failed run would be recorded as a (usually fast) success. No-op while
+    timing is disabled or outside any stage.
+    """
+    current = _current_stage.get()
+    if current is not None:
+        current.failed = True
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator timing every call of a sync or async function
+
+    Args:
+        name: Stage name
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with _Stage(_histogram(name)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(_histogram(name)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def snapshot(prefix: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Summary of all stages
+
+    Args:
+        prefix: Only include stages starting with this prefix
+
+    Returns:
+        Dictionary of stage name -> statistics, sorted by name
+    """
+    with _registry_lock:
+        items = sorted(_histograms.items())
+
+    return {
+        name: histogram.snapshot()
+        for name, histogram in items
+        if prefix is None or name.startswith(prefix)
+    }
+
+
+def reset():
+    """Drop all collected samples"""
+    with _registry_lock:
+        _histograms.clear()
+
+
+def log_snapshot(log: logging.Logger, prefix: Optional[str] = None):
+    """
+    Emit one structured log line with all stage statistics
+
+    Args:
+        log: Logger to write to
+        prefix: Only include stages starting with this prefix
+    """
+    stats = snapshot(prefix)
+    if stats:
+        log.info("stage_timings %s", json.dumps(stats, sort_keys=True))
@@ -0,0 +1,552 @@
+"""
+Trading Calendar Module
+Precomputed NSE/BSE session calendar with binary-search queries
+
+All sessions in the calendar range are built once into sorted arrays of
+open/close epoch seconds, so "is the market open", "when is the next open"
+and "what date is N trading days from here" are a single searchsorted call
+instead of a day-by-day walk. Vectorized variants take NumPy arrays and
+answer many queries at once. A query outside the range rebuilds the
+arrays to cover it; years without a holiday list have weekday sessions.
+
+Timestamps are IST throughout. India has no daylight saving, so IST is a
+fixed UTC+05:30 offset and session boundaries are plain arithmetic.
+
+Author: Harsh Kandhway
+"""
+
+import logging
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+IST = timezone(timedelta(hours=5, minutes=30), 'IST')
+
+SESSION_OPEN = time(9, 15)    # 9:15 AM IST
+SESSION_CLOSE = time(15, 30)  # 3:30 PM IST
+
+# NSE/BSE trading holidays (weekday closures only)
+# Format: year -> (month, day) tuples
+NSE_HOLIDAYS: Dict[int, Tuple[Tuple[int, int], ...]] = {
+    2024: (
+        (1, 22),   # Special holiday
+        (1, 26),   # Republic Day
+        (3, 8),    # Mahashivratri
+        (3, 25),   # Holi
+        (3, 29),   # Good Friday
+        (4, 11),   # Id-ul-Fitr
+        (4, 17),   # Ram Navami
+        (5, 1),    # Maharashtra Day
+        (5, 20),   # General election (Mumbai)
+        (6, 17),   # Bakri Id
+        (7, 17),   # Muharram
+        (8, 15),   # Independence Day
+        (10, 2),   # Gandhi Jayanti
+        (11, 1),   # Diwali - Lakshmi Pujan
+        (11, 15),  # Guru Nanak Jayanti
+        (11, 20),  # Maharashtra assembly election
+        (12, 25),  # Christmas
+    ),
+    2025: (
+        (2, 26),   # Mahashivratri
+        (3, 14),   # Holi
+        (3, 31),   # Id-ul-Fitr
+        (4, 10),   # Mahavir Jayanti
+        (4, 14),   # Dr. Ambedkar Jayanti
+        (4, 18),   # Good Friday
+        (5, 1),    # Maharashtra Day
+        (8, 15),   # Independence Day
+        (8, 27),   # Ganesh Chaturthi
+        (10, 2),   # Gandhi Jayanti / Dussehra
+        (10, 21),  # Diwali - Lakshmi Pujan
+        (10, 22),  # Diwali - Balipratipada
+        (11, 5),   # Guru Nanak Jayanti
+        (12, 25),  # Christmas
+    ),
+    2026: (
+        (1, 26),   # Republic Day
+        (3, 14),   # Holi
+        (4, 4),    # Eid al-Fitr (approximate - moon sighting)
+        (4, 6),    # Mahavir Jayanti
+        (4, 10),   # Good Friday
+        (4, 14),   # Dr. Ambedkar Jayanti
+        (5, 1),    # Maharashtra Day
+        (6, 16),   # Eid ul-Adha (approximate - moon sighting)
+        (8, 15),   # Independence Day
+        (8, 22),   # Ganesh Chaturthi
+        (10, 2),   # Gandhi Jayanti / Dussehra
+        (10, 20),  # Diwali - Lakshmi Pujan
+        (10, 21),  # Diwali - Balipratipada
+        (11, 5),   # Guru Nanak Jayanti
+        (12, 25),  # Christmas
+    ),
+}
+
+# Years past the last published holiday list (or the current year) built up
+# front (weekends only); later queries extend the calendar on demand
+EXTRA_YEARS = 3
+
+# Calendar days spanned by N sessions is at most ~1.6 N; extend with room to spare
+DAYS_PER_SESSION_BOUND = 2
+EXTENSION_MARGIN_DAYS = 14
+
+TimestampLike = Union[datetime, float, int]
+
+
+def _to_epoch(value: TimestampLike) -> float:
+    """Epoch seconds for a datetime (naive = IST) or a number"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=IST)
+        return value.timestamp()
+    return float(value)
+
+
+def _to_datetime64(day: Union[date, datetime, np.datetime64]) -> np.datetime64:
+    """Day-resolution datetime64 for a date (datetimes use their IST date)"""
+    if isinstance(day, datetime):
+        if day.tzinfo is not None:
+            day = day.astimezone(IST)
+        day = day.date()
+    return np.datetime64(day, 'D')
+
+
+def _seconds_of_day(t: time) -> int:
+    """Seconds after midnight"""
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _year_of(day: np.datetime64) -> int:
+    """Calendar year of a datetime64"""
+    return int(np.datetime64(day, 'Y').astype(int)) + 1970
+
+
+def _epoch_day(ts: Union[float, np.ndarray]) -> np.ndarray:
+    """IST date (datetime64[D]) of epoch seconds"""
+    offset = int(IST.utcoffset(None).total_seconds())
+    return (np.asarray(ts, dtype=np.float64) + offset).astype('int64').astype('datetime64[s]').astype('datetime64[D]')
+
+
+class _Sessions(NamedTuple):
+    """One consistent build of the session arrays (replaced whole, never mutated)"""
+    dates: np.ndarray
+    opens: np.ndarray
+    closes: np.ndarray
+    start_year: int
+    end_year: int
+    first_day: np.datetime64
+    last_day: np.datetime64
+
+
+class TradingCalendar:
+    """
+    Sorted arrays of NSE/BSE trading sessions
+
+    Each query reads one _Sessions snapshot, so an extension running in
+    another thread can never pair new dates with old open/close arrays.
+
+    Attributes:
+        session_dates: datetime64[D] array of trading days
+        opens: int64 epoch seconds of each session open
+        closes: int64 epoch seconds of each session close (inclusive)
+    """
+
+    def __init__(
+        self,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        holidays: Optional[Dict[int, Iterable[Tuple[int, int]]]] = None,
+        open_time: time = SESSION_OPEN,
+        close_time: time = SESSION_CLOSE
+    ):
+        """
+        Build the calendar
+
+        Args:
+            start_year: First year (defaults to first year with holidays)
+            end_year: Last year (defaults to the later of the last holiday
+                      year and the current year, plus EXTRA_YEARS)
+            holidays: year -> (month, day) holidays (defaults to NSE_HOLIDAYS)
+            open_time: Session open (IST)
+            close_time: Session close (IST)
+        """
+        holidays = NSE_HOLIDAYS if holidays is None else holidays
+        self.holiday_years = frozenset(holidays)
+        self.open_time = open_time
+        self.close_time = close_time
+        self._holiday_days = np.array(
+            [date(year, month, day) for year, entries in holidays.items()
+             for month, day in entries],
+            dtype='datetime64[D]'
+        )
+        self._lock = threading.Lock()
+
+        latest = max(list(holidays) + [datetime.now(IST).year])
+        self._build(start_year or min(holidays), end_year or latest + EXTRA_YEARS)
+
+    def _build(self, start_year: int, end_year: int):
+        """(Re)build the session arrays for [start_year, end_year]"""
+        days = np.arange(
+            np.datetime64(f'{start_year}-01-01'),
+            np.datetime64(f'{end_year + 1}-01-01'),
+            dtype='datetime64[D]'
+        )
+        trading = np.is_busday(days) & ~np.isin(days, self._holiday_days)
+        session_dates = days[trading]
+
+        # Midnight IST of each session day in epoch seconds
+        offset = int(IST.utcoffset(None).total_seconds())
+        midnight = session_dates.astype('datetime64[s]').astype(np.int64) - offset
+
+        # Published with one reference assignment
+        self._sessions = _Sessions(
+            session_dates,
+            midnight + _seconds_of_day(self.open_time),
+            midnight + _seconds_of_day(self.close_time),
+            start_year,
+            end_year,
+            days[0],
+            days[-1],
+        )
+
+        missing = [y for y in range(start_year, end_year + 1) if y not in self.holiday_years]
+        if missing:
+            logger.debug("Trading calendar has no holiday list for %s (weekends only)", missing)
+        logger.debug("Trading calendar built: %d sessions %d-%d",
+                     len(session_dates), start_year, end_year)
+
+    @property
+    def session_dates(self) -> np.ndarray:
+        return self._sessions.dates
+
+    @property
+    def opens(self) -> np.ndarray:
+        return self._sessions.opens
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self._sessions.closes
+
+    @property
+    def start_year(self) -> int:
+        return self._sessions.start_year
+
+    @property
+    def end_year(self) -> int:
+        return self._sessions.end_year
+
+    def _ensure(self, first: np.datetime64, last: Optional[np.datetime64] = None) -> _Sessions:
+        """
+        Extend the calendar to cover [first, last]
+
+        Years without a holiday list get weekday sessions, so queries far
+        past the published holidays still answer instead of failing.
+
+        Returns:
+            Session snapshot covering the range
+        """
+        last = first if last is None else last
+        sessions = self._sessions
+        if first >= sessions.first_day and last <= sessions.last_day:
+            return sessions
+        with self._lock:
+            sessions = self._sessions
+            start_year = min(sessions.start_year, _year_of(first))
+            end_year = max(sessions.end_year, _year_of(last))
+            if (start_year, end_year) != (sessions.start_year, sessions.end_year):
+                logger.info("Extending trading calendar to %d-%d", start_year, end_year)
+                self._build(start_year, end_year)
+            return self._sessions
+
+    def _ensure_epochs(self, ts: Union[float, np.ndarray]) -> _Sessions:
+        """Extend the calendar to cover epoch timestamps and the sessions after them"""
+        days = _epoch_day(ts)
+        if not days.size:
+            return self._sessions
+        margin = np.timedelta64(EXTENSION_MARGIN_DAYS, 'D')
+        return self._ensure(days.min() - margin, days.max() + margin)
+
+    def _ensure_shift(self, targets: np.ndarray, offsets: np.ndarray) -> _Sessions:
+        """Extend the calendar to cover dates shifted by a number of sessions"""
+        if not targets.size:
+            return self._sessions
+        margin = np.timedelta64(EXTENSION_MARGIN_DAYS, 'D')
+        spans = (offsets * DAYS_PER_SESSION_BOUND).astype('timedelta64[D]')
+        return self._ensure(
+            (targets + np.minimum(spans, 0)).min() - margin, (targets + np.maximum(spans, 0)).max() + margin
+        )
+
+    def __len__(self) -> int:
+        return len(self.session_dates)
+
+    # ------------------------------------------------------------------
+    # Scalar queries
+    # ------------------------------------------------------------------
+
+    def is_open(self, when: TimestampLike) -> bool:
+        """
+        Whether the market is open at a moment (open and close inclusive)
+
+        Args:
+            when: Datetime (naive = IST) or epoch seconds
+
+        Returns:
+            True if inside a session
+        """
+        ts = _to_epoch(when)
+        sessions = self._ensure_epochs(ts)
+        index = int(np.searchsorted(sessions.opens, ts, side='right')) - 1
+        return bool(index >= 0 and ts <= sessions.closes[index])
+
+    def is_trading_day(self, day: Union[date, datetime]) -> bool:
+        """
+        Whether a date has a trading session
+
+        Args:
+            day: Date to check
+
+        Returns:
+            True if trading day
+        """
+        target = _to_datetime64(day)
+        dates = self._ensure(target).dates
+        index = int(np.searchsorted(dates, target))
+        return bool(index < len(dates) and dates[index] == target)
+
+    def next_open(self, when: TimestampLike) -> datetime:
+        """
+        First session open strictly after a moment
+
+        If the market is open at `when`, this is the next session's open.
+
+        Args:
+            when: Datetime (naive = IST) or epoch seconds
+
+        Returns:
+            Timezone-aware IST datetime
+        """
+        ts = _to_epoch(when)
+        sessions = self._ensure_epochs(ts)
+        index = int(np.searchsorted(sessions.opens, ts, side='right'))
+        return self._session_time(sessions, sessions.opens, index)
+
+    def next_close(self, when: TimestampLike) -> datetime:
+        """
+        First session close at or after a moment
+
+        If the market is open at `when`, this is today's close.
+
+        Args:
+            when: Datetime (naive = IST) or epoch seconds
+
+        Returns:
+            Timezone-aware IST datetime
+        """
+        ts = _to_epoch(when)
+        sessions = self._ensure_epochs(ts)
+        index = int(np.searchsorted(sessions.closes, ts, side='left'))
+        return self._session_time(sessions, sessions.closes, index)
+
+    def add_trading_days(self, day: Union[date, datetime], n: int) -> date:
+        """
+        Date `n` trading sessions away from `day`
+
+        n > 0 counts sessions after `day`, n < 0 sessions before it, and
+        n == 0 rolls `day` forward to the nearest session on or after it.
+
+        Args:
+            day: Starting date
+            n: Number of trading days
+
+        Returns:
+            Trading date
+        """
+        target = _to_datetime64(day)
+        sessions = self._ensure_shift(np.array([target]), np.array([n]))
+        index = int(self._shift_indices(sessions, np.array([target]), np.array([n]))[0])
+        self._check_index(sessions, index)
+        return sessions.dates[index].item()
+
+    def trading_days_between(self, start: Union[date, datetime], end: Union[date, datetime]) -> int:
+        """
+        Number of sessions in (start, end]
+
+        Args:
+            start: Exclusive start date
+            end: Inclusive end date
+
+        Returns:
+            Session count (negative if end < start)
+        """
+        start, end = _to_datetime64(start), _to_datetime64(end)
+        dates = self._ensure(min(start, end), max(start, end)).dates
+        lo = np.searchsorted(dates, start, side='right')
+        hi = np.searchsorted(dates, end, side='right')
+        return int(hi - lo)
+
+    def session_at(self, day: Union[date, datetime], at: time) -> datetime:
+        """
+        First moment at time-of-day `at` on a trading day, at or after `day`
+
+        Args:
+            day: Date (or datetime; time-of-day is ignored)
+            at: IST time-of-day
+
+        Returns:
+            Timezone-aware IST datetime
+        """
+        session_day = self.add_trading_days(day, 0)
+        return datetime.combine(session_day, at, tzinfo=IST)
+
+    def next_session_time(self, when: TimestampLike, at: time) -> datetime:
+        """
+        Next moment strictly after `when` that is time-of-day `at` on a trading day
+
+        Used by schedulers for "run at HH:MM on every trading day".
+
+        Args:
+            when: Datetime (naive = IST) or epoch seconds
+            at: IST time-of-day
+
+        Returns:
+            Timezone-aware IST datetime
+        """
+        now = datetime.fromtimestamp(_to_epoch(when), IST)
+        candidate = self.session_at(now.date(), at)
+        if candidate <= now:
+            candidate = datetime.combine(self.add_trading_days(now.date(), 1), at, tzinfo=IST)
+        return candidate
+
+    # ------------------------------------------------------------------
+    # Vectorized queries
+    # ------------------------------------------------------------------
+
+    def is_open_many(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_open
+
+        Args:
+            timestamps: Epoch seconds (any shape)
+
+        Returns:
+            Boolean array of the same shape
+        """
+        ts = np.asarray(timestamps, dtype=np.float64)
+        sessions = self._ensure_epochs(ts)
+        index = np.searchsorted(sessions.opens, ts, side='right') - 1
+        safe = np.clip(index, 0, len(sessions.closes) - 1)
+        return (index >= 0) & (ts <= sessions.closes[safe])
+
+    def is_trading_day_many(self, days: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_trading_day
+
+        Args:
+            days: Array convertible to datetime64[D]
+
+        Returns:
+            Boolean array of the same shape
+        """
+        targets = np.asarray(days, dtype='datetime64[D]')
+        dates = self._ensure(targets.min(), targets.max()).dates if targets.size else self.session_dates
+        index = np.searchsorted(dates, targets)
+        safe = np.clip(index, 0, len(dates) - 1)
+        return (index < len(dates)) & (dates[safe] == targets)
+
+    def next_open_many(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Vectorized next_open
+
+        Args:
+            timestamps: Epoch seconds
+
+        Returns:
+            int64 epoch seconds of the next open for each input
+        """
+        ts = np.asarray(timestamps, dtype=np.float64)
+        sessions = self._ensure_epochs(ts)
+        index = np.searchsorted(sessions.opens, ts, side='right')
+        self._check_index(sessions, index)
+        return sessions.opens[index]
+
+    def next_close_many(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Vectorized next_close
+
+        Args:
+            timestamps: Epoch seconds
+
+        Returns:
+            int64 epoch seconds of the next close for each input
+        """
+        ts = np.asarray(timestamps, dtype=np.float64)
+        sessions = self._ensure_epochs(ts)
+        index = np.searchsorted(sessions.closes, ts, side='left')
+        self._check_index(sessions, index)
+        return sessions.closes[index]
+
+    def add_trading_days_many(self, days: np.ndarray, n: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Vectorized add_trading_days
+
+        Args:
+            days: Array convertible to datetime64[D]
+            n: Trading day offset (scalar or array broadcastable to days)
+
+        Returns:
+            datetime64[D] array of trading dates
+        """
+        targets = np.asarray(days, dtype='datetime64[D]')
+        offsets = np.broadcast_to(np.asarray(n, dtype=np.int64), targets.shape)
+        sessions = self._ensure_shift(targets, offsets)
+        index = self._shift_indices(sessions, targets, offsets)
+        self._check_index(sessions, index)
+        return sessions.dates[index]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _shift_indices(sessions: _Sessions, targets: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Session index `offsets` sessions away from each target date"""
+        # Positive offsets count from the last session on or before the date,
+        # zero/negative offsets from the first session on or after it
+        after = np.searchsorted(sessions.dates, targets, side='right') - 1
+        on_or_after = np.searchsorted(sessions.dates, targets, side='left')
+        return np.where(offsets > 0, after, on_or_after) + offsets
+
+    @classmethod
+    def _session_time(cls, sessions: _Sessions, boundaries: np.ndarray, index: int) -> datetime:
+        """IST datetime of a session boundary"""
+        cls._check_index(sessions, index)
+        return datetime.fromtimestamp(int(boundaries[index]), IST)
+
+    @staticmethod
+    def _check_index(sessions: _Sessions, index):
+        """Raise if a query still ran off the calendar after extending it (a bug)"""
+        index = np.asarray(index)
+        if index.size and (index.min() < 0 or index.max() >= len(sessions.dates)):
+            raise ValueError(
+                f"Query outside trading calendar range {sessions.start_year}-{sessions.end_year}"
+            )
+
+
+_trading_calendar: Optional[TradingCalendar] = None
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """
+    Get the shared NSE/BSE trading calendar (built on first use)
+
+    Returns:
+        TradingCalendar instance
+    """
+    global _trading_calendar
+    if _trading_calendar is None:
+        _trading_calendar = TradingCalendar()
+    return _trading_calendar
@@ -22,7 +22,12 @@ from src.bot.services.analysis_service import (
     validate_symbol,
     get_cached_analysis,
     save_analysis_cache,
-    analyze_multiple_stocks
+    analyze_multiple_stocks,
+    fetch_multiple_stock_data,
+    compare_stocks,
+    analyze_stock_variants,
+    get_analysis_variant,
+    clear_variant_cache
 )
 
 
@@ -245,21 +250,133 @@ class TestAnalysisService(unittest.TestCase):
             
             self.assertIsNone(cached)
     
+    @patch('src.bot.services.analysis_service.fetch_multiple_stock_data')
     @patch('src.bot.services.analysis_service.analyze_stock')
-    def test_analyze_multiple_stocks(self, mock_analyze):
+    def test_analyze_multiple_stocks(self, mock_analyze, mock_fetch):
         """Test analyzing multiple stocks"""
-        mock_analyze.side_effect = [
-            {'symbol': 'STOCK1', 'confidence': 75},
-            {'symbol': 'STOCK2', 'confidence': 80},
-            ValueError("Error")
-        ]
+        mock_fetch.return_value = {'STOCK1': self.sample_df, 'STOCK2': self.sample_df}
+        
+        def analyze(symbol, mode, timeframe, horizon, history=None):
+            # Symbols run concurrently, so answer by symbol rather than call order
+            if symbol == 'STOCK3':
+                raise ValueError("Error")
+            return {'symbol': symbol, 'confidence': 75, 'prefetched': history is not None}
+        mock_analyze.side_effect = analyze
         
         results = analyze_multiple_stocks(['STOCK1', 'STOCK2', 'STOCK3'], 'balanced', 'medium')
         
+        mock_fetch.assert_called_once()
         self.assertEqual(len(results), 3)
         self.assertEqual(results[0]['symbol'], 'STOCK1')
         self.assertEqual(results[1]['symbol'], 'STOCK2')
+        self.assertTrue(results[0]['prefetched'])
         self.assertTrue(results[2]['error'])
+    
+    @patch('yahooquery.Ticker')
+    def test_fetch_multiple_stock_data(self, mock_ticker):
+        """One batched request is split per symbol; missing symbols are fetched alone"""
+        batch = pd.concat({'AAA.NS': self.sample_df, 'BBB.NS': self.sample_df * 2})
+        mock_ticker.return_value.history.return_value = batch
+        
+        with patch('src.bot.services.analysis_service.fetch_stock_data') as mock_single:
+            mock_single.side_effect = ValueError("Failed to fetch data for CCC.NS")
+            histories = fetch_multiple_stock_data(['AAA.NS', 'BBB.NS', 'CCC.NS'], '1y')
+        
+        self.assertEqual(mock_ticker.call_count, 1)
+        self.assertEqual(set(histories), {'AAA.NS', 'BBB.NS'})
+        pd.testing.assert_frame_equal(histories['BBB.NS'], self.sample_df * 2)
+        mock_single.assert_called_once_with('CCC.NS', '1y')
+    
+    @patch('src.bot.services.analysis_service.fetch_stock_data')
+    @patch('src.bot.services.analysis_service.fetch_multiple_stock_data')
+    def test_compare_stocks(self, mock_fetch, mock_single):
+        """Stocks and the benchmark share one fetch and get relative metrics"""
+        mock_fetch.return_value = {
+            'AAA.NS': self.sample_df,
+            'BBB.NS': self.sample_df * 1.5,
+            '^NSEI': self.sample_df * 0.5,
+        }
+        mock_single.side_effect = ValueError("Failed to fetch data for CCC.NS")
+        
+        comparison = compare_stocks(['AAA.NS', 'BBB.NS', 'CCC.NS'], benchmark='^NSEI')
+        
+        mock_fetch.assert_called_once_with(['AAA.NS', 'BBB.NS', 'CCC.NS', '^NSEI'], '1y')
+        self.assertEqual([r['symbol'] for r in comparison['results'][:2]], ['AAA.NS', 'BBB.NS'])
+        self.assertTrue(comparison['results'][2]['error'])
+        relative = comparison['relative']
+        self.assertEqual(relative['benchmark'], '^NSEI')
+        self.assertEqual(relative['symbols'], ['AAA.NS', 'BBB.NS'])
+        # Same returns as the benchmark, just a different price level
+        self.assertEqual(relative['metrics']['BBB.NS']['beta'], 1.0)
+        self.assertEqual(relative['metrics']['BBB.NS']['relative_strength'], 1.0)
+        self.assertEqual(relative['metrics']['AAA.NS']['avg_correlation'], 1.0)
+
+
+class TestAnalysisVariants(unittest.TestCase):
+    """Test single-pass multi-mode, multi-horizon analysis"""
+    
+    def setUp(self):
+        """Set up a random-walk history"""
+        rng = np.random.default_rng(3)
+        close = 100 + np.cumsum(rng.normal(0.05, 1.5, 300))
+        open_ = np.r_[close[0], close[:-1]]
+        spread = rng.uniform(0, 2, 300)
+        self.sample_df = pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) + spread,
+            'low': np.minimum(open_, close) - spread,
+            'close': close,
+            'volume': rng.integers(100000, 1000000, 300).astype(float)
+        }, index=pd.date_range('2024-01-01', periods=300, freq='B'))
+        clear_variant_cache()
+    
+    def tearDown(self):
+        clear_variant_cache()
+    
+    @staticmethod
+    def _comparable(analysis):
+        """Drop wall-clock fields"""
+        return {k: v for k, v in analysis.items() if k not in ('analyzed_at', 'time_estimate')}
+    
+    @patch('src.bot.services.analysis_service.fetch_stock_data')
+    def test_variants_match_single_analysis(self, mock_fetch):
+        """Each entry equals analyze_stock for the same mode and horizon"""
+        mock_fetch.return_value = self.sample_df
+        
+        variants = analyze_stock_variants(
+            'test.ns', 'medium', modes=['conservative', 'aggressive'], horizons=['1week', '6months']
+        )
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(len(variants), 4)
+        
+        for (mode, horizon), analysis in variants.items():
+            with self.subTest(mode=mode, horizon=horizon):
+                single = analyze_stock('TEST.NS', mode, 'medium', horizon)
+                self.assertEqual(repr(self._comparable(analysis)), repr(self._comparable(single)))
+    
+    def test_variants_invalid_horizon(self):
+        """Unknown horizons are rejected before fetching"""
+        with self.assertRaises(ValueError):
+            analyze_stock_variants('TEST.NS', horizons=['10years'])
+    
+    @patch('src.bot.services.analysis_service.fetch_stock_data')
+    def test_settings_changes_reuse_cached_set(self, mock_fetch):
+        """Switching mode or horizon is served without a new fetch"""
+        mock_fetch.return_value = self.sample_df
+        
+        first = get_analysis_variant('TEST.NS', 'balanced', 'medium', '3months')
+        second = get_analysis_variant('TEST.NS', 'aggressive', 'medium', '1week', include_chart_data=True)
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual((second['mode'], second['horizon']), ('aggressive', '1week'))
+        self.assertNotIn('chart_data', first)
+        self.assertIn('chart_data', second)
+        
+        # Callers get copies
+        first['annotated'] = True
+        self.assertNotIn('annotated', get_analysis_variant('TEST.NS', 'balanced', 'medium', '3months'))
+        
+        get_analysis_variant('TEST.NS', 'balanced', 'medium', '3months', refresh=True)
+        self.assertEqual(mock_fetch.call_count, 2)
 
 
 if __name__ == '__main__':
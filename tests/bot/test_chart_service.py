@@ -0,0 +1,125 @@
+"""
+Tests for Chart Service
+Cache keys, caching and in-flight de-duplication (rendering is stubbed)
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bot.services.chart_service import (
+    ChartService, build_chart_data, chart_cache_key, OVERLAY_EMA, OVERLAY_LEVELS
+)
+
+
+@pytest.fixture
+def chart_data():
+    """Chart payload built from synthetic OHLCV data"""
+    dates = pd.date_range('2024-01-01', periods=60, freq='B')
+    close = pd.Series(np.linspace(100, 130, 60), index=dates)
+    df = pd.DataFrame({
+        'open': close - 1, 'high': close + 2, 'low': close - 2,
+        'close': close, 'volume': np.full(60, 1000.0)
+    }, index=dates)
+    indicators = {
+        'config': {'bb_period': 20, 'bb_std': 2},
+        'ema_fast_period': 9, 'ema_medium_period': 21,
+        'ema_slow_period': 50, 'ema_trend_period': 200,
+        'support': 110.0, 'resistance': 131.0,
+        'chart_patterns': [SimpleNamespace(
+            name='Double Bottom', neckline=125.0, breakout_level=None,
+            measured_target=140.0, invalidation_level=118.0
+        )],
+    }
+    return build_chart_data(df, indicators)
+
+
+class TestChartCacheKey:
+    """Test content-addressed cache keys"""
+
+    def test_build_chart_data(self, chart_data):
+        """Payload carries full history and pattern levels"""
+        assert len(chart_data['dates']) == 60
+        assert chart_data['close'][-1] == pytest.approx(130.0)
+        assert chart_data['pattern_levels'] == [{
+            'name': 'Double Bottom',
+            'levels': {'neckline': 125.0, 'measured_target': 140.0, 'invalidation_level': 118.0}
+        }]
+
+    def test_key_depends_on_last_bar_overlays_and_size(self, chart_data):
+        """Same content gives same key; bar, overlays or size changes give a new one"""
+        key = chart_cache_key('TCS.NS', chart_data)
+        assert key == chart_cache_key('tcs.ns', dict(chart_data))
+
+        next_bar = dict(chart_data, close=chart_data['close'][:-1] + [131.0])
+        assert chart_cache_key('TCS.NS', next_bar) != key
+        assert chart_cache_key('TCS.NS', chart_data, overlays=(OVERLAY_EMA,)) != key
+        assert chart_cache_key('TCS.NS', chart_data, size=(800, 600)) != key
+
+        # Overlay order does not matter
+        assert chart_cache_key('TCS.NS', chart_data, overlays=(OVERLAY_LEVELS, OVERLAY_EMA)) == \
+            chart_cache_key('TCS.NS', chart_data, overlays=(OVERLAY_EMA, OVERLAY_LEVELS))
+
+
+class TestChartService:
+    """Test chart caching behaviour"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        """Chart service rendering on threads with a temp disk cache"""
+        service = ChartService(max_workers=2, cache_dir=str(tmp_path), memory_cache_size=2)
+        executor = ThreadPoolExecutor(max_workers=2)
+        service._get_executor = lambda: executor
+        yield service
+        executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_renders_once_for_concurrent_requests(self, service, chart_data):
+        """Concurrent requests for the same chart share one render"""
+        def slow_render(*args):
+            import time
+            time.sleep(0.05)
+            return b'PNG'
+
+        with patch('src.bot.services.chart_service.render_chart_png', side_effect=slow_render) as render:
+            images = await asyncio.gather(*[
+                service.get_chart('TCS.NS', chart_data) for _ in range(5)
+            ])
+            again = await service.get_chart('TCS.NS', chart_data)
+
+        assert images == [b'PNG'] * 5
+        assert again == b'PNG'
+        assert render.call_count == 1
+        assert service.renders == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_survives_new_service(self, service, chart_data, tmp_path):
+        """A fresh service instance reuses images rendered by another"""
+        with patch('src.bot.services.chart_service.render_chart_png', return_value=b'PNG'):
+            await service.get_chart('TCS.NS', chart_data)
+
+        fresh = ChartService(cache_dir=str(tmp_path))
+        with patch('src.bot.services.chart_service.render_chart_png') as render:
+            image = await fresh.get_chart('TCS.NS', chart_data)
+
+        assert image == b'PNG'
+        render.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_render_failure_returns_none(self, service, chart_data):
+        """Render errors never propagate to handlers"""
+        with patch('src.bot.services.chart_service.render_chart_png', side_effect=ImportError('matplotlib')):
+            assert await service.get_chart('TCS.NS', chart_data) is None
+
+        bot = Mock()
+        bot.send_photo = AsyncMock()
+        sent = await service.send_analysis_chart(bot, 1, {'symbol': 'TCS.NS', 'chart_data': None})
+        assert sent is False
+        bot.send_photo.assert_not_called()
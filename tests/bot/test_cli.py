@@ -6,6 +6,10 @@ Tests data fetching and main analysis functions
 import unittest
 import sys
 import os
+import io
+import json
+import tempfile
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
 
@@ -13,7 +17,8 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.cli.stock_analyzer_pro import (
-    fetch_data, analyze_stock, get_capital_interactive
+    fetch_data, analyze_stock, get_capital_interactive,
+    load_universe, build_screen_row, ScreenWriter, run_screen, SCREEN_FIELDS
 )
 
 
@@ -193,6 +198,110 @@ class TestCLI(unittest.TestCase):
         self.assertIn(analysis['recommendation_type'], ['BUY', 'SELL', 'HOLD', 'BLOCKED'])
 
 
+class TestScreener(unittest.TestCase):
+    """Test cases for the headless screener mode"""
+    
+    def setUp(self):
+        """Create a sample history and universe files"""
+        rng = np.random.default_rng(1)
+        dates = pd.date_range('2024-01-01', periods=260, freq='D')
+        prices = pd.Series(100 + np.cumsum(rng.normal(0.1, 1.0, 260)), index=dates)
+        self.sample_df = pd.DataFrame({
+            'open': prices,
+            'high': prices + 1,
+            'low': prices - 1,
+            'close': prices,
+            'volume': 1000000.0,
+        })
+        
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, 'universe.csv')
+        pd.DataFrame({
+            'ticker': ['HDFCBANK.NS', 'TCS.NS', 'NIFTYBEES.NS', 'SMALLCO.NS', 'tcs.ns'],
+            'sector': ['Financial Services', 'Information Technology', 'ETF', 'Financial Services', 'Information Technology'],
+            'market_cap': ['Large Cap', 'Large Cap', 'Large Cap', 'Small Cap', 'Large Cap'],
+            'is_etf': [False, False, True, False, False],
+        }).to_csv(self.csv_path, index=False)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_load_universe_filters(self):
+        """Sector, cap and ETF filters apply to CSV universes"""
+        stocks = load_universe(self.csv_path, sectors=['financial services'], market_caps=['Large Cap'])
+        self.assertEqual([s['ticker'] for s in stocks], ['HDFCBANK.NS'])
+        
+        self.assertEqual(
+            [s['ticker'] for s in load_universe(self.csv_path, include_etf=True)],
+            ['NIFTYBEES.NS']
+        )
+        # Duplicates are dropped after upper-casing
+        self.assertEqual(len(load_universe(self.csv_path, include_etf=None)), 4)
+    
+    def test_load_universe_text_file(self):
+        """Plain files hold one symbol per line with comments"""
+        path = os.path.join(self.tmp.name, 'watchlist.txt')
+        with open(path, 'w') as f:
+            f.write("# banks\nhdfcbank.ns\n\nICICIBANK.NS  # private\nHDFCBANK.NS\n")
+        
+        stocks = load_universe(path)
+        self.assertEqual([s['ticker'] for s in stocks], ['HDFCBANK.NS', 'ICICIBANK.NS'])
+    
+    def test_build_screen_row(self):
+        """Rows carry compact analysis fields or the error"""
+        stock = {'ticker': 'TEST.NS', 'sector': 'IT', 'market_cap': 'Large Cap'}
+        analysis = analyze_stock('TEST.NS', self.sample_df, 'balanced', 'medium')
+        
+        row = build_screen_row(stock, analysis)
+        self.assertEqual(list(row), SCREEN_FIELDS)
+        self.assertEqual(row['recommendation_type'], analysis['recommendation_type'])
+        self.assertIsNone(row['error'])
+        
+        failed = build_screen_row(stock, error='No data')
+        self.assertEqual(failed['error'], 'No data')
+        self.assertIsNone(failed['confidence'])
+    
+    def test_writer_formats(self):
+        """JSON Lines and CSV writers emit one line per row"""
+        row = build_screen_row({'ticker': 'TEST.NS'}, error='boom')
+        
+        stream = io.StringIO()
+        writer = ScreenWriter(stream, 'jsonl')
+        writer.write(row)
+        writer.write(row)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])['error'], 'boom')
+        
+        stream = io.StringIO()
+        writer = ScreenWriter(stream, 'csv')
+        writer.write(row)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[0].split(','), SCREEN_FIELDS)
+        self.assertEqual(len(lines), 2)
+        
+        with self.assertRaises(ValueError):
+            ScreenWriter(stream, 'xml')
+    
+    @patch('src.cli.stock_analyzer_pro.Ticker')
+    def test_run_screen_streams_every_symbol(self, mock_ticker):
+        """Every symbol gets a row; only successes are returned"""
+        def make_ticker(symbol):
+            ticker = MagicMock()
+            ticker.history.return_value = "No data found" if symbol == 'BAD.NS' else self.sample_df
+            return ticker
+        mock_ticker.side_effect = make_ticker
+        
+        stocks = [{'ticker': t, 'sector': None, 'market_cap': None} for t in ('A.NS', 'BAD.NS', 'B.NS')]
+        stream = io.StringIO()
+        analyses = run_screen(stocks, ScreenWriter(stream), workers=3)
+        
+        rows = {r['symbol']: r for r in map(json.loads, stream.getvalue().splitlines())}
+        self.assertEqual(set(rows), {'A.NS', 'BAD.NS', 'B.NS'})
+        self.assertIn('No data found', rows['BAD.NS']['error'])
+        self.assertEqual(sorted(a['symbol'] for a in analyses), ['A.NS', 'B.NS'])
+
+
 if __name__ == '__main__':
     unittest.main()
 
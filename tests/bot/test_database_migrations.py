@@ -0,0 +1,88 @@
+"""
+Tests for Database Schema Migrations
+Version tracking, ordered steps and composite indexes
+
+Author: Harsh Kandhway
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from src.bot.database import db
+from src.bot.database.models import Base
+
+
+@pytest.fixture
+def legacy_engine(tmp_path, monkeypatch):
+    """File database whose schema predates the migration registry"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_paper_position_session_open"))
+        conn.execute(text("DROP INDEX ix_signal_request_user_time"))
+        conn.execute(text("ALTER TABLE user_settings DROP COLUMN investment_horizon"))
+        conn.execute(text(
+            "ALTER TABLE user_settings RENAME COLUMN paper_trading_default_capital TO paper_trading_capital"
+        ))
+        conn.execute(text("DELETE FROM schema_version"))
+    monkeypatch.setattr(db, 'engine', engine)
+    yield engine
+    engine.dispose()
+
+
+class TestMigrations:
+    """Test the migration registry"""
+
+    def test_registry_is_ordered(self):
+        """Versions are strictly increasing"""
+        versions = [version for version, _, _ in db.MIGRATIONS]
+        assert versions == sorted(set(versions))
+
+        with pytest.raises(ValueError):
+            db.migration(versions[-1], 'out of order')(lambda conn: None)
+
+    def test_upgrades_legacy_schema_once(self, legacy_engine):
+        """Pending steps run once, then startup is a single version read"""
+        assert db.migrate_database() == len(db.MIGRATIONS)
+
+        inspector = inspect(legacy_engine)
+        columns = [col['name'] for col in inspector.get_columns('user_settings')]
+        assert 'investment_horizon' in columns
+        assert 'paper_trading_default_capital' in columns
+        assert 'paper_trading_capital' not in columns
+
+        position_indexes = {i['name']: i['column_names'] for i in inspector.get_indexes('paper_positions')}
+        assert position_indexes['ix_paper_position_session_open'] == ['session_id', 'is_open']
+        request_indexes = {i['name'] for i in inspector.get_indexes('user_signal_requests')}
+        assert 'ix_signal_request_user_time' in request_indexes
+
+        with legacy_engine.connect() as conn:
+            assert db.get_schema_version(conn) == db.MIGRATIONS[-1][0]
+        assert db.migrate_database() == 0
+
+    def test_failed_step_stops_and_retries(self, legacy_engine, monkeypatch):
+        """A failing step is not recorded, so it runs again next time"""
+        def broken(conn):
+            raise RuntimeError("boom")
+
+        registry = list(db.MIGRATIONS)
+        monkeypatch.setattr(db, 'MIGRATIONS', [registry[0], (registry[1][0], 'broken', broken)] + registry[2:])
+        assert db.migrate_database() == 1
+
+        monkeypatch.setattr(db, 'MIGRATIONS', registry)
+        assert db.migrate_database() == len(registry) - 1
+
+    def test_on_demand_tables_step(self, legacy_engine):
+        """Databases without the scan tables, or with the old script's indexes, converge on the models"""
+        with legacy_engine.begin() as conn:
+            conn.execute(text("DROP TABLE user_signal_responses"))
+            conn.execute(text("CREATE INDEX idx_user_signal_requests_user_id ON user_signal_requests(user_id)"))
+
+        db.migrate_database()
+
+        inspector = inspect(legacy_engine)
+        response_indexes = {i['name'] for i in inspector.get_indexes('user_signal_responses')}
+        assert {'ix_user_signal_responses_request_id', 'ix_user_signal_responses_user_id'} <= response_indexes
+        request_indexes = {i['name'] for i in inspector.get_indexes('user_signal_requests')}
+        assert 'idx_user_signal_requests_user_id' not in request_indexes
+        assert 'ix_user_signal_requests_user_id' in request_indexes
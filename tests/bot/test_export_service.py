@@ -0,0 +1,179 @@
+"""
+Tests for Export Service
+Streaming CSV export, artifact caching and ownership checks (PDF layout is stubbed)
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.bot.database.models import Base, User, UserSignalRequest, UserSignalResponse
+from src.bot.services.export_service import (
+    CSV_HEADER, FORMAT_CSV, FORMAT_PDF, PDF_ROW_LIMIT, ExportService, build_csv_export
+)
+
+OWNER_ID = 1001
+OTHER_ID = 2002
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory over an in-memory database with one finished scan"""
+    engine = create_engine(
+        'sqlite:///:memory:',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+        echo=False
+    )
+    Base.metadata.create_all(engine)
+    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = TestSessionLocal()
+    db.add_all([User(telegram_id=OWNER_ID), User(telegram_id=OTHER_ID)])
+    request = UserSignalRequest(
+        user_id=OWNER_ID, total_stocks_analyzed=500, total_signals_found=60,
+        analysis_duration_seconds=12.5, sectors='["IT"]'
+    )
+    db.add(request)
+    db.flush()
+    request_id = request.id
+    for i in range(60):
+        db.add(UserSignalResponse(
+            request_id=request_id, user_id=OWNER_ID, ticker=f'STOCK{i}.NS',
+            recommendation='BUY', recommendation_type='BUY',
+            confidence=70 + i * 0.25, risk_reward=2.5, current_price=100.0,
+            target=120.0 if i % 2 else None, stop_loss=95.0,
+            sector='IT' if i % 3 else None, is_etf=(i == 0),
+            sent_at=datetime(2026, 1, 19, 10, 30, 0)
+        ))
+    db.commit()
+    db.close()
+
+    @contextmanager
+    def factory():
+        session = TestSessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    factory.request_id = request_id
+    yield factory
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def service(session_factory):
+    """Export service with PDF layout on a thread pool instead of processes"""
+    service = ExportService(cache_size=4, session_factory=session_factory)
+    executor = ThreadPoolExecutor(max_workers=1)
+    service._get_executor = lambda: executor
+    yield service
+    executor.shutdown(wait=True)
+
+
+class TestCsvExport:
+    """Test streamed CSV content"""
+
+    def test_rows_ordered_and_formatted(self, session_factory):
+        """Every signal is written, highest confidence first, with the legacy columns"""
+        with session_factory() as db:
+            artifact = build_csv_export(db, session_factory.request_id, OWNER_ID)
+
+        rows = list(csv.reader(io.StringIO(artifact.data.decode('utf-8'))))
+        assert tuple(rows[0]) == CSV_HEADER
+        assert artifact.rows == len(rows) - 1 == 60
+        assert artifact.filename == f"buy_signals_{session_factory.request_id}.csv"
+
+        first = dict(zip(CSV_HEADER, rows[1]))
+        assert first['Symbol'] == 'STOCK59.NS'
+        assert first['Confidence (%)'] == '84.75'
+        assert first['Target Price (₹)'] == '120.0'
+        assert first['Upside (%)'] == '20.0'
+        assert first['Risk (%)'] == '5.26'
+        assert first['Timestamp'] == '2026-01-19 10:30:00'
+
+        last = dict(zip(CSV_HEADER, rows[-1]))
+        assert last['Symbol'] == 'STOCK0.NS'
+        assert last['Sector'] == 'Unknown'
+        assert last['Target Price (₹)'] == ''
+        assert last['ETF'] == 'Yes'
+
+    def test_other_user_rejected(self, session_factory):
+        """A request can only be exported by its owner"""
+        with session_factory() as db:
+            with pytest.raises(ValueError):
+                build_csv_export(db, session_factory.request_id, OTHER_ID)
+
+
+class TestExportCaching:
+    """Test per-request artifact cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_taps_reuse_artifact(self, service, session_factory):
+        """Concurrent and repeated exports build the CSV once"""
+        request_id = session_factory.request_id
+        artifacts = await asyncio.gather(*[
+            service.get_export(request_id, OWNER_ID, FORMAT_CSV) for _ in range(3)
+        ])
+        again = await service.get_export(request_id, OWNER_ID, FORMAT_CSV)
+
+        assert service.builds == 1
+        assert service.hits == 3
+        assert all(a is again for a in artifacts)
+
+    @pytest.mark.asyncio
+    async def test_cached_artifact_checks_owner(self, service, session_factory):
+        """A cached export is not served to another user"""
+        request_id = session_factory.request_id
+        await service.get_export(request_id, OWNER_ID, FORMAT_CSV)
+        with pytest.raises(ValueError):
+            await service.get_export(request_id, OTHER_ID, FORMAT_CSV)
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_tap_does_not_fail_owner(self, service, session_factory):
+        """Another user's concurrent tap fails alone; the owner's export still builds"""
+        request_id = session_factory.request_id
+        other, owner = await asyncio.gather(
+            service.get_export(request_id, OTHER_ID, FORMAT_CSV),
+            service.get_export(request_id, OWNER_ID, FORMAT_CSV),
+            return_exceptions=True
+        )
+
+        assert isinstance(other, ValueError)
+        assert owner.rows == 60
+        assert service.builds == 1
+
+    @pytest.mark.asyncio
+    async def test_pdf_payload_is_lean(self, service, session_factory):
+        """PDF layout receives only the table rows plus a total count"""
+        request_id = session_factory.request_id
+        with patch('src.bot.services.export_service.render_pdf_bytes', return_value=b'%PDF') as render:
+            artifact = await service.get_export(request_id, OWNER_ID, FORMAT_PDF)
+            await service.get_export(request_id, OWNER_ID, FORMAT_PDF)
+
+        payload = render.call_args[0][0]
+        assert render.call_count == 1
+        assert payload['total'] == 60
+        assert len(payload['rows']) == PDF_ROW_LIMIT
+        assert payload['request']['sectors'] == '["IT"]'
+        assert artifact.data == b'%PDF'
+        assert artifact.filename.endswith('.pdf')
+
+    @pytest.mark.asyncio
+    async def test_unknown_format_rejected(self, service, session_factory):
+        """Only CSV and PDF are supported"""
+        with pytest.raises(ValueError):
+            await service.get_export(session_factory.request_id, OWNER_ID, 'xlsx')
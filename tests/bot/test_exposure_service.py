@@ -0,0 +1,147 @@
+"""
+Tests for the Exposure Service
+Nightly matrix build and sector / correlation admission at market open
+
+Author: Harsh Kandhway
+"""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bot.database.models import PaperTradingSession, PendingPaperTrade, User
+from src.bot.services.exposure_service import ExposureService, load_universe
+
+UNIVERSE = """ticker,market,sector,sub_sector,market_cap,is_etf
+BANK_A.NS,NSE,Financial Services,Banks,Large Cap,False
+BANK_B.NS,NSE,Financial Services,Banks,Large Cap,False
+BANK_C.NS,NSE,Financial Services,Banks,Mid Cap,False
+NEW.NS,NSE,Financial Services,NBFC,Small Cap,False
+SOFT.NS,NSE,Information Technology,Software,Large Cap,False
+NIFTYBEES.NS,NSE,ETF,Index,Large Cap,True
+"""
+
+
+def _histories(days=150, seed=4):
+    """Three lockstep banks and an independent software name (NEW.NS has no bars yet)"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-06-02', periods=days, freq='B')
+    shared = 0.015 * rng.standard_normal(days)
+
+    def history(returns):
+        return pd.DataFrame({'close': 1000 * np.exp(np.cumsum(returns))}, index=index)
+
+    return {
+        'BANK_A.NS': history(shared + 0.003 * rng.standard_normal(days)),
+        'BANK_B.NS': history(shared + 0.003 * rng.standard_normal(days)),
+        'BANK_C.NS': history(shared + 0.003 * rng.standard_normal(days)),
+        'SOFT.NS': history(0.015 * rng.standard_normal(days)),
+    }
+
+
+@pytest.fixture
+def exposure_service(tmp_path):
+    """Exposure service over a small universe file"""
+    universe = tmp_path / 'universe.csv'
+    universe.write_text(UNIVERSE)
+    return ExposureService(root=str(tmp_path / 'exposure'), universe_path=str(universe), enabled=True)
+
+
+class TestExposureService:
+    """Test building and loading the matrix"""
+
+    def test_load_universe_skips_etfs(self, exposure_service):
+        universe = load_universe(exposure_service.universe_path)
+        assert 'NIFTYBEES.NS' not in universe
+        assert universe['NEW.NS'] == ('Financial Services', 'Small Cap')
+
+    def test_inactive_until_built(self, exposure_service):
+        assert not exposure_service.active
+        result = exposure_service.check('BANK_A.NS', 100000.0, {'BANK_B.NS': 100000.0}, 500000.0)
+        assert result['allowed'] and result['value'] == 100000.0
+
+    def test_build_fetches_in_batches(self, exposure_service):
+        histories = _histories()
+
+        def fetch(symbols, period):
+            return {symbol: histories[symbol] for symbol in symbols if symbol in histories}
+
+        with patch('src.bot.services.exposure_service.EXPOSURE_FETCH_BATCH', 2), \
+                patch('src.bot.services.exposure_service.fetch_multiple_stock_data', side_effect=fetch) as mock_fetch:
+            matrix = exposure_service.build()
+
+        assert mock_fetch.call_count == 3
+        assert len(matrix) == 5
+        assert exposure_service.active
+        assert exposure_service.matrix.correlation('BANK_A.NS', 'BANK_C.NS') > 0.9
+
+        # A fresh service (e.g. after a restart) picks up the saved generation
+        reloaded = ExposureService(root=exposure_service.root, enabled=True)
+        assert reloaded.matrix.sector('SOFT.NS') == 'Information Technology'
+
+
+class TestPendingTradeExposure:
+    """Test admission checks in the market-open batch"""
+
+    @pytest.fixture
+    def test_session(self, test_db):
+        """Create test user and session"""
+        user = User(telegram_id=123456789, username="testuser")
+        test_db.add(user)
+        test_db.commit()
+        session = PaperTradingSession(
+            user_id=user.id, is_active=True,
+            initial_capital=500000.0, current_capital=500000.0, max_positions=15
+        )
+        test_db.add(session)
+        test_db.commit()
+        test_db.refresh(session)
+        return session
+
+    def _queue(self, test_db, session, symbol, price=1000.0):
+        pending = PendingPaperTrade(
+            session_id=session.id,
+            symbol=symbol,
+            requested_by_user_id=session.user_id,
+            signal_data=json.dumps({
+                'symbol': symbol, 'recommendation_type': 'BUY', 'current_price': price,
+                'target': price * 1.1, 'stop_loss': price * 0.95, 'risk_reward': 2.0,
+                'confidence': 75.0, 'overall_score_pct': 80.0
+            }),
+            status='PENDING'
+        )
+        test_db.add(pending)
+        test_db.commit()
+        return pending
+
+    @pytest.mark.asyncio
+    async def test_concentrated_entries_are_downsized_or_rejected(self, test_db, test_session, exposure_service):
+        """Staged entries count toward the limits of later ones in the same batch"""
+        from src.bot.services.pending_trade_executor import PendingTradeBatchExecutor
+
+        exposure_service.build(_histories())
+        queued = {
+            symbol: self._queue(test_db, test_session, symbol)
+            for symbol in ['BANK_A.NS', 'BANK_B.NS', 'BANK_C.NS', 'NEW.NS', 'SOFT.NS']
+        }
+
+        prices = {symbol: 1000.0 for symbol in queued}
+        with patch('src.bot.services.pending_trade_executor.get_multiple_prices', return_value=prices), \
+                patch('src.bot.services.paper_portfolio_service.get_exposure_service', return_value=exposure_service):
+            result = await PendingTradeBatchExecutor(test_db).execute_all()
+
+        assert result['executed'] == 3
+        assert result['failed'] == 2
+        shares = {symbol: position.shares for _, symbol, position in result['opened']}
+        # 1% risk on a 5% stop sizes an entry at 20% of the remaining cash; the
+        # second bank only fits the last 10% of the 30% sector limit
+        assert shares == {'BANK_A.NS': 100, 'BANK_B.NS': 50, 'SOFT.NS': 70}
+
+        correlated = test_db.get(PendingPaperTrade, queued['BANK_C.NS'].id)
+        assert correlated.status == 'FAILED'
+        assert 'Moves with 2 open positions' in correlated.error_message
+        sector = test_db.get(PendingPaperTrade, queued['NEW.NS'].id)
+        assert 'Financial Services sector already at 30.0%' in sector.error_message
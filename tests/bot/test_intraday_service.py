@@ -0,0 +1,111 @@
+"""
+Tests for Intraday Data Service
+Tracked-symbol ingestion and price fallback (downloads are stubbed)
+
+Author: Harsh Kandhway
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bot.services.intraday_service import (
+    BACKFILL_PERIOD, INCREMENTAL_PERIOD, IntradayService
+)
+
+
+def bars(start: str, periods: int, base: float = 100.0) -> pd.DataFrame:
+    """5-minute OHLCV bars starting at a naive-UTC time"""
+    index = pd.date_range(start, periods=periods, freq='5min')
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1,
+        'close': close, 'volume': np.full(periods, 100.0)
+    }, index=index)
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self):
+        self.now = pd.Timestamp('2026-01-05 04:00').timestamp()  # 09:30 IST
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestIntradayService:
+    """Test intraday ingestion"""
+
+    def test_backfill_then_incremental(self, clock):
+        """New symbols are backfilled, known ones only fetch the current session"""
+        fetcher = Mock(side_effect=[
+            {'TCS.NS': bars('2026-01-05 03:45', 20)},
+            {'TCS.NS': bars('2026-01-05 05:20', 5, base=119.0)},
+        ])
+        service = IntradayService(fetcher=fetcher, clock=clock)
+        service.track(['TCS.NS'])
+
+        assert service.refresh() == {'TCS.NS': 20}
+        assert service.refresh() == {'TCS.NS': 4}  # First bar replaces the live bar
+
+        assert fetcher.call_args_list[0].args == (['TCS.NS'], BACKFILL_PERIOD, '5m')
+        assert fetcher.call_args_list[1].args == (['TCS.NS'], INCREMENTAL_PERIOD, '5m')
+        assert service.latest_price('TCS.NS') == 123.0
+        assert len(service.bars('TCS.NS')) == 24
+        assert len(service.bars('TCS.NS', '15m')) == 8
+
+    def test_stale_prices_are_missing(self, clock):
+        """Prices whose newest bar ended longer than the max age ago are omitted"""
+        service = IntradayService(
+            fetcher=Mock(return_value={'TCS.NS': bars('2026-01-05 03:45', 3)}),
+            max_age_seconds=300, clock=clock
+        )
+        service.refresh(['TCS.NS'])
+        assert service.latest_prices(['TCS.NS', 'INFY.NS']) == {'TCS.NS': 102.0}
+
+        clock.now += 301
+        assert service.latest_prices(['TCS.NS']) == {}
+
+    def test_untracked_symbols_expire(self, clock):
+        """Symbols nobody asked for recently stop refreshing and are dropped"""
+        fetcher = Mock(return_value={'TCS.NS': bars('2026-01-05 03:45', 3)})
+        service = IntradayService(fetcher=fetcher, track_seconds=600, clock=clock)
+        service.track(['TCS.NS'])
+        service.refresh()
+
+        clock.now += 601
+        assert service.refresh() == {}
+        assert service.tracked == []
+        assert service.bars('TCS.NS') is None
+        assert fetcher.call_count == 1
+
+    def test_fetch_failure_is_contained(self, clock):
+        """A failed download leaves the service usable"""
+        service = IntradayService(fetcher=Mock(side_effect=RuntimeError('offline')), clock=clock)
+        assert service.refresh(['TCS.NS']) == {}
+        assert service.latest_price('TCS.NS') is None
+
+    def test_live_indicators_apply_new_bars_only(self, clock):
+        """Streaming state is built once and then advanced with completed bars"""
+        history = bars('2026-01-05 03:45', 1500)
+        fetcher = Mock(side_effect=[{'TCS.NS': history.iloc[:1200]}, {'TCS.NS': history.iloc[1200:]}])
+        service = IntradayService(fetcher=fetcher, clock=clock)
+
+        service.refresh(['TCS.NS'])
+        first = service.live_indicators('TCS.NS')
+        service.refresh(['TCS.NS'])
+        latest = service.live_indicators('TCS.NS')
+
+        assert service.engine.rebuilds == 1
+        assert service.engine.bars_applied == 100
+        assert latest['current_price'] == history['close'].iloc[-1]
+        assert latest['ema_fast'] > first['ema_fast']
+        assert service.live_indicators('INFY.NS') is None
@@ -0,0 +1,76 @@
+"""
+Tests for Lazy Handler Loading
+Bot start-up must not import the analysis stack
+
+Author: Harsh Kandhway
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def run_python(code: str) -> str:
+    """Run code in a fresh interpreter (bot.py reconfigures root logging)"""
+    proc = subprocess.run(
+        [sys.executable, '-c', code], cwd=PROJECT_ROOT,
+        capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return proc.stdout.strip().splitlines()[-1]
+
+
+class TestLazyImports:
+    """Test deferred handler imports"""
+
+    def test_bot_import_skips_analysis_stack(self):
+        """Importing the bot module leaves pandas and the analysis service unloaded"""
+        out = run_python(
+            "import sys, src.bot.bot\n"
+            "heavy = ['pandas', 'src.core.formatters', 'src.bot.services.analysis_service',"
+            " 'src.bot.handlers.callbacks']\n"
+            "print([m for m in heavy if m in sys.modules])"
+        )
+        assert out == '[]'
+
+    def test_lazy_handler_resolves_on_first_call(self):
+        """The wrapped handler imports its module once and forwards calls"""
+        out = run_python(
+            "import asyncio, sys\n"
+            "from src.bot.bot import lazy_handler, LAZY_HANDLER_MODULES\n"
+            "handler = lazy_handler('src.bot.handlers.admin', 'format_timings')\n"
+            "assert 'src.bot.handlers.admin' in LAZY_HANDLER_MODULES\n"
+            "import src.bot.handlers.admin as admin\n"
+            "calls = []\n"
+            "async def fake(update, context):\n"
+            "    calls.append((update, context)); return 'ok'\n"
+            "admin.format_timings = fake\n"
+            "print(asyncio.run(handler(1, 2)), calls, handler.__name__)"
+        )
+        assert out == "ok [(1, 2)] format_timings"
+
+    def test_menu_handlers_are_lazy(self):
+        """Menu buttons and text input route through lazy handlers instead of inline imports"""
+        out = run_python(
+            "import sys\n"
+            "from src.bot.bot import LAZY_HANDLER_MODULES, MENU_COMMAND_HANDLERS\n"
+            "modules = ['src.bot.handlers.watchlist', 'src.bot.handlers.settings', 'src.bot.handlers.paper_trading']\n"
+            "print([m in LAZY_HANDLER_MODULES and m not in sys.modules for m in modules],"
+            " MENU_COMMAND_HANDLERS['/watchlist'].__name__)"
+        )
+        assert out == "[True, True, True] watchlist_command"
+
+    def test_scan_services_load_off_loop(self):
+        """Scan and export services are imported by warm-up or a worker thread, not at bot import"""
+        out = run_python(
+            "import asyncio, sys\n"
+            "from src.bot.bot import WARMUP_MODULES\n"
+            "from src.bot.handlers.on_demand_signals import _import_off_loop\n"
+            "modules = ['src.bot.services.on_demand_analysis_service', 'src.bot.services.export_service']\n"
+            "before = [m in sys.modules for m in modules]\n"
+            "module = asyncio.run(_import_off_loop(modules[1]))\n"
+            "print(before, [m in WARMUP_MODULES for m in modules], module.__name__)"
+        )
+        assert out == "[False, False] [True, True] src.bot.services.export_service"
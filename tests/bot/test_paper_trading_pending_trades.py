@@ -548,3 +548,145 @@ class TestPendingTradeExecution:
                         if updated_pending:
                             assert updated_pending.status == 'EXECUTED'
 
+
+
+class TestPendingTradeBatchExecutor:
+    """Test batched execution of pending trades"""
+
+    @pytest.fixture
+    def test_user(self, test_db):
+        """Create test user"""
+        user = User(telegram_id=123456789, username="testuser")
+        test_db.add(user)
+        test_db.commit()
+        test_db.refresh(user)
+        return user
+
+    @pytest.fixture
+    def test_session(self, test_db, test_user):
+        """Create test session"""
+        session = PaperTradingSession(
+            user_id=test_user.id,
+            is_active=True,
+            initial_capital=500000.0,
+            current_capital=500000.0,
+            max_positions=15
+        )
+        test_db.add(session)
+        test_db.commit()
+        test_db.refresh(session)
+        return session
+
+    def _queue(self, test_db, session, user, symbol, price=1000.0):
+        signal_data = {
+            'symbol': symbol,
+            'recommendation_type': 'BUY',
+            'current_price': price,
+            'target': price * 1.1,
+            'stop_loss': price * 0.95,
+            'risk_reward': 2.0,
+            'confidence': 75.0,
+            'overall_score_pct': 80.0
+        }
+        pending = PendingPaperTrade(
+            session_id=session.id,
+            symbol=symbol,
+            requested_by_user_id=user.id,
+            signal_data=json.dumps(signal_data),
+            status='PENDING'
+        )
+        test_db.add(pending)
+        test_db.commit()
+        return pending
+
+    @pytest.mark.asyncio
+    async def test_batch_executes_and_fetches_each_symbol_once(self, test_db, test_session, test_user):
+        """Each distinct symbol is priced once and all entries commit together"""
+        from src.bot.services.pending_trade_executor import PendingTradeBatchExecutor
+
+        other_user = User(telegram_id=987654321, username="other")
+        test_db.add(other_user)
+        test_db.commit()
+        other_session = PaperTradingSession(
+            user_id=other_user.id, is_active=True,
+            initial_capital=500000.0, current_capital=500000.0, max_positions=15
+        )
+        test_db.add(other_session)
+        test_db.commit()
+
+        for symbol in ['RELIANCE.NS', 'TCS.NS']:
+            self._queue(test_db, test_session, test_user, symbol)
+        self._queue(test_db, other_session, other_user, 'RELIANCE.NS')
+
+        with patch('src.bot.services.pending_trade_executor.get_multiple_prices') as mock_prices:
+            mock_prices.return_value = {'RELIANCE.NS': 1000.0, 'TCS.NS': 1000.0}
+            result = await PendingTradeBatchExecutor(test_db).execute_all()
+
+        mock_prices.assert_called_once_with(['RELIANCE.NS', 'TCS.NS'])
+        assert result['executed'] == 3
+        assert result['failed'] == 0
+        assert len(result['opened']) == 3
+
+        statuses = {p.status for p in test_db.query(PendingPaperTrade).all()}
+        assert statuses == {'EXECUTED'}
+
+        test_db.refresh(test_session)
+        assert test_session.current_positions == 2
+        assert test_session.current_capital < 500000.0
+        # Pending trades no longer leak synthetic rows into today's signals
+        assert test_db.query(DailyBuySignal).count() == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_cancels_held_and_duplicate_symbols(self, test_db, test_session, test_user):
+        """Symbols already open, or queued twice, are cancelled"""
+        from src.bot.services.pending_trade_executor import PendingTradeBatchExecutor
+
+        test_db.add(PaperPosition(
+            session_id=test_session.id, symbol='INFY.NS', entry_price=1000.0,
+            shares=10.0, position_value=10000.0, target_price=1100.0,
+            stop_loss_price=950.0, recommendation_type='BUY', entry_confidence=75.0,
+            entry_score_pct=80.0, initial_risk_reward=2.0, is_open=True
+        ))
+        test_session.current_positions = 1
+        test_db.commit()
+
+        held = self._queue(test_db, test_session, test_user, 'INFY.NS')
+        first = self._queue(test_db, test_session, test_user, 'TCS.NS')
+        dup = self._queue(test_db, test_session, test_user, 'TCS.NS')
+
+        with patch('src.bot.services.pending_trade_executor.get_multiple_prices',
+                   return_value={'TCS.NS': 1000.0}):
+            result = await PendingTradeBatchExecutor(test_db).execute_all()
+
+        assert result['executed'] == 1
+        assert result['cancelled'] == 2
+        assert test_db.get(PendingPaperTrade, held.id).status == 'CANCELLED'
+        assert test_db.get(PendingPaperTrade, first.id).status == 'EXECUTED'
+        assert test_db.get(PendingPaperTrade, dup.id).error_message == "Already have position"
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_position_limit_and_drift(self, test_db, test_session, test_user):
+        """Validation runs against in-memory session state"""
+        from src.bot.services.pending_trade_executor import PendingTradeBatchExecutor
+
+        test_session.max_positions = 2
+        test_db.commit()
+
+        ok = self._queue(test_db, test_session, test_user, 'TCS.NS')
+        drifted = self._queue(test_db, test_session, test_user, 'WIPRO.NS')
+        second = self._queue(test_db, test_session, test_user, 'HDFCBANK.NS')
+        over_limit = self._queue(test_db, test_session, test_user, 'INFY.NS')
+
+        prices = {'TCS.NS': 1000.0, 'WIPRO.NS': 1100.0, 'HDFCBANK.NS': 1000.0, 'INFY.NS': 1000.0}
+        with patch('src.bot.services.pending_trade_executor.get_multiple_prices', return_value=prices):
+            result = await PendingTradeBatchExecutor(test_db).execute_all()
+
+        assert result['executed'] == 2
+        assert result['failed'] == 2
+        assert test_db.get(PendingPaperTrade, ok.id).status == 'EXECUTED'
+        assert test_db.get(PendingPaperTrade, second.id).status == 'EXECUTED'
+        assert 'Price moved' in test_db.get(PendingPaperTrade, drifted.id).error_message
+        limited = test_db.get(PendingPaperTrade, over_limit.id)
+        assert limited.status == 'FAILED'
+        assert limited.execution_attempts == 1
+        assert 'Position limit' in limited.error_message
@@ -9,6 +9,7 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+import numpy as np
 
 from src.bot.services.paper_portfolio_service import PaperPortfolioService
 from src.bot.services.paper_trade_execution_service import PaperTradeExecutionService
@@ -250,6 +251,176 @@ class TestPaperTradingService:
         assert active_session.id == session.id
         assert active_session.is_active is True
 
+    def _open_position(self, test_db, session, symbol, stop, target, trailing=None, rec='BUY'):
+        position = PaperPosition(
+            session_id=session.id, symbol=symbol, entry_date=datetime.utcnow() - timedelta(days=2),
+            entry_price=100.0, shares=10.0, position_value=1000.0,
+            target_price=target, stop_loss_price=stop, trailing_stop=trailing,
+            initial_risk_reward=2.0, recommendation_type=rec, entry_confidence=75.0,
+            entry_score_pct=80.0, highest_price=100.0, is_open=True
+        )
+        test_db.add(position)
+        session.current_positions += 1
+        session.current_capital -= 1000.0
+        test_db.commit()
+        return position
+
+    @pytest.mark.asyncio
+    async def test_monitor_positions_exits_only_crossed(self, test_db, trading_service, test_user):
+        """Crossed thresholds exit, others are marked to market in bulk"""
+        session = await trading_service.start_session(test_user.id, 100000.0, 15)
+
+        stopped = self._open_position(test_db, session, 'AAA.NS', stop=95.0, target=120.0)
+        targeted = self._open_position(test_db, session, 'BBB.NS', stop=90.0, target=110.0)
+        trailed = self._open_position(test_db, session, 'CCC.NS', stop=90.0, target=150.0, trailing=108.0)
+        winner = self._open_position(test_db, session, 'DDD.NS', stop=90.0, target=150.0)
+
+        prices = {'AAA.NS': 94.0, 'BBB.NS': 111.0, 'CCC.NS': 107.0, 'DDD.NS': 125.0}
+        with patch('src.bot.services.paper_trading_service.get_multiple_prices') as mock_prices:
+            mock_prices.return_value = prices
+            result = await trading_service.monitor_positions()
+
+        mock_prices.assert_called_once_with(['AAA.NS', 'BBB.NS', 'CCC.NS', 'DDD.NS'])
+        assert result['positions_monitored'] == 4
+        assert result['positions_exited'] == 3
+        assert result['trailing_stops_updated'] == 1
+
+        trades = {t.symbol: t.exit_reason for t in test_db.query(PaperTrade).all()}
+        assert trades == {'AAA.NS': 'STOP_LOSS', 'BBB.NS': 'TARGET_HIT', 'CCC.NS': 'TRAILING_STOP'}
+        for position in (stopped, targeted, trailed):
+            test_db.refresh(position)
+            assert position.is_open is False
+
+        test_db.refresh(winner)
+        assert winner.is_open is True
+        assert winner.current_price == 125.0
+        assert winner.unrealized_pnl == pytest.approx(250.0)
+        assert winner.highest_price == 125.0
+        assert winner.trailing_stop == pytest.approx(125.0 * 0.80)
+        assert winner.days_held == 2
+
+        test_db.refresh(session)
+        assert session.current_positions == 1
+        assert session.total_trades == 3
+
+    @pytest.mark.asyncio
+    async def test_monitor_keeps_index_between_ticks(self, test_db, trading_service, test_user):
+        """Later ticks reuse the index and only write changed stop state until the next P&L mark"""
+        session = await trading_service.start_session(test_user.id, 100000.0, 15)
+        winner = self._open_position(test_db, session, 'DDD.NS', stop=90.0, target=150.0)
+        flat = self._open_position(test_db, session, 'EEE.NS', stop=90.0, target=150.0)
+        monitor = trading_service.exit_monitor
+
+        async def tick(prices):
+            with patch('src.bot.services.paper_trading_service.get_multiple_prices', return_value=prices), \
+                    patch.object(monitor, 'load', wraps=monitor.load) as load, \
+                    patch.object(trading_service, '_bulk_update_positions',
+                                 wraps=trading_service._bulk_update_positions) as bulk:
+                result = await trading_service.monitor_positions()
+            return result, load.call_count, bulk.call_args[0][0]
+
+        # First tick loads the index and marks every position
+        _, loads, updates = await tick({'DDD.NS': 105.0, 'EEE.NS': 99.0})
+        assert loads == 1
+        assert {u['id'] for u in updates} == {winner.id, flat.id}
+
+        # Second tick: no reload, only the new high is written
+        result, loads, updates = await tick({'DDD.NS': 110.0, 'EEE.NS': 98.0})
+        assert loads == 0
+        assert result['positions_monitored'] == 2
+        assert updates == [{'id': winner.id, 'highest_price': 110.0}]
+        test_db.refresh(flat)
+        assert flat.current_price == 99.0
+
+        # Exits drop out of the index without a reload
+        await trading_service.execution_service.exit_position(winner, 110.0, 'MANUAL')
+        assert monitor.position_count == 1
+        result, loads, _ = await tick({'EEE.NS': 98.0})
+        assert (loads, result['positions_monitored']) == (0, 1)
+
+        # Positions opened behind the monitor's back trigger a reload
+        self._open_position(test_db, session, 'FFF.NS', stop=90.0, target=150.0)
+        result, loads, _ = await tick({'EEE.NS': 98.0, 'FFF.NS': 101.0})
+        assert (loads, result['positions_monitored']) == (1, 2)
+
+        # So do stop/target edits made elsewhere; the edited stop is then live
+        test_db.query(PaperPosition).filter(PaperPosition.id == flat.id).update({'stop_loss_price': 99.0})
+        test_db.commit()
+        result, loads, _ = await tick({'EEE.NS': 98.0, 'FFF.NS': 101.0})
+        assert (loads, result['positions_exited']) == (1, 1)
+
+
+class TestPositionExitMonitor:
+    """Test threshold-indexed exit monitor"""
+
+    def _row(self, pid, stop, target, trailing=None, highest=None, rec='BUY', symbol='AAA.NS'):
+        return Mock(
+            id=pid, session_id=1, symbol=symbol, shares=10.0, position_value=1000.0,
+            stop_loss_price=stop, target_price=target, trailing_stop=trailing,
+            highest_price=highest, recommendation_type=rec, entry_date=datetime.utcnow()
+        )
+
+    def test_exit_priority_matches_sequential_checks(self):
+        """Stop loss wins over target and trailing when several are crossed"""
+        from src.bot.services.position_exit_monitor import PositionExitMonitor
+
+        monitor = PositionExitMonitor(PaperTradeExecutionService.TRAILING_STOP_PCT)
+        monitor.load([
+            self._row(1, stop=95.0, target=120.0),
+            self._row(2, stop=80.0, target=90.0, trailing=100.0),
+            self._row(3, stop=80.0, target=140.0, trailing=96.0),
+            self._row(4, stop=80.0, target=140.0),
+        ])
+
+        evaluation = monitor.evaluate('AAA.NS', 95.0)
+
+        assert evaluation['exits'] == {1: 'STOP_LOSS', 2: 'TARGET_HIT', 3: 'TRAILING_STOP'}
+        assert [u['id'] for u in evaluation['updates']] == [4]
+
+    def test_trailing_stop_only_ratchets_up(self):
+        """Trailing stop activates above the stop loss and never moves down"""
+        from src.bot.services.position_exit_monitor import PositionExitMonitor
+
+        monitor = PositionExitMonitor(PaperTradeExecutionService.TRAILING_STOP_PCT)
+        monitor.load([self._row(1, stop=90.0, target=200.0, highest=100.0, rec='STRONG BUY')])
+
+        first = monitor.evaluate('AAA.NS', 120.0)
+        assert first['trailing_updated'] == [1]
+        assert first['updates'][0]['trailing_stop'] == pytest.approx(102.0)
+
+        lower = monitor.evaluate('AAA.NS', 110.0)
+        assert lower['trailing_updated'] == []
+        assert 'trailing_stop' not in lower['updates'][0]
+
+        # The ratcheted stop is now part of the index
+        assert monitor.evaluate('AAA.NS', 101.0)['exits'] == {1: 'TRAILING_STOP'}
+
+    def test_remove_and_unknown_symbol(self):
+        """Removed positions drop out of the index"""
+        from src.bot.services.position_exit_monitor import PositionExitMonitor
+
+        monitor = PositionExitMonitor(PaperTradeExecutionService.TRAILING_STOP_PCT)
+        monitor.load([self._row(1, 95.0, 120.0), self._row(2, 90.0, 130.0)])
+        monitor.remove([1])
+
+        assert monitor.position_count == 1
+        assert monitor.evaluate('AAA.NS', 94.0)['exits'] == {}
+        assert monitor.evaluate('ZZZ.NS', 94.0)['exits'] == {}
+
+    def test_add_and_unmarked_updates(self):
+        """New positions join the index; unmarked ticks only report stop state changes"""
+        from src.bot.services.position_exit_monitor import PositionExitMonitor
+
+        monitor = PositionExitMonitor(PaperTradeExecutionService.TRAILING_STOP_PCT)
+        monitor.load([self._row(1, stop=90.0, target=200.0, highest=100.0)])
+        monitor.add([self._row(1, stop=90.0, target=200.0), self._row(2, stop=95.0, target=130.0, symbol='BBB.NS')])
+
+        assert monitor.fingerprint == (2, 3, 185.0, 330.0)
+        assert monitor.symbols == ['AAA.NS', 'BBB.NS']
+        assert monitor.evaluate('AAA.NS', 105.0, mark=False)['updates'] == [{'id': 1, 'highest_price': 105.0}]
+        assert monitor.evaluate('AAA.NS', 104.0, mark=False)['updates'] == []
+        assert monitor.evaluate('BBB.NS', 94.0, session_ids=[2])['exits'] == {}
+
 
 class TestPaperTradeAnalysisService:
     """Test paper trade analysis service"""
@@ -415,3 +586,96 @@ class TestPaperTradeAnalysisService:
         insufficient = [r for r in recommendations if r.get('category') == 'INSUFFICIENT_DATA']
         assert len(insufficient) > 0
 
+
+    def _trade(self, session, i, pnl, rec='BUY', reason='TARGET_HIT', max_gain=0.0, days_ago=0):
+        return PaperTrade(
+            session_id=session.id,
+            symbol=f'STOCK{i}.NS',
+            entry_date=datetime.utcnow() - timedelta(days=10 + days_ago),
+            entry_price=100.0,
+            shares=10.0,
+            entry_value=1000.0,
+            exit_date=datetime.utcnow() - timedelta(days=days_ago),
+            exit_price=100.0 + pnl / 10.0,
+            exit_value=1000.0 + pnl,
+            exit_reason=reason,
+            target_price=110.0,
+            stop_loss_price=95.0,
+            pnl=pnl,
+            pnl_pct=pnl / 10.0,
+            days_held=3 + i,
+            r_multiple=pnl / 50.0,
+            is_winner=pnl > 0,
+            met_target=reason == 'TARGET_HIT',
+            hit_stop_loss=reason == 'STOP_LOSS',
+            recommendation_type=rec,
+            entry_confidence=60.0 + i,
+            entry_score_pct=70.0,
+            initial_risk_reward=2.0,
+            max_unrealized_gain=max_gain
+        )
+
+    def test_incremental_aggregates_match_rebuild(self, analysis_service, test_session):
+        """Aggregates updated trade by trade equal a full recompute from history"""
+        specs = [
+            (80.0, 'STRONG BUY', 'TARGET_HIT', 0.0),
+            (-40.0, 'WEAK BUY', 'STOP_LOSS', 15.0),
+            (30.0, 'BUY', 'TRAILING_STOP', 0.0),
+            (-55.0, 'WEAK BUY', 'STOP_LOSS', 0.0),
+            (120.0, 'STRONG BUY', 'TARGET_HIT', 0.0),
+            (-20.0, 'BUY', 'SELL_SIGNAL', 5.0),
+        ]
+        db = analysis_service.db
+        for i, (pnl, rec, reason, max_gain) in enumerate(specs):
+            trade = self._trade(test_session, i, pnl, rec, reason, max_gain, days_ago=i % 2)
+            db.add(trade)
+            analysis_service.record_trade(trade)
+            db.commit()
+
+        incremental = (
+            analysis_service.analyze_winning_trades(test_session),
+            analysis_service.analyze_losing_trades(test_session),
+        )
+
+        analysis_service.rebuild_aggregates(test_session.id)
+        db.commit()
+        rebuilt = (
+            analysis_service.analyze_winning_trades(test_session),
+            analysis_service.analyze_losing_trades(test_session),
+        )
+
+        assert incremental == rebuilt
+        winners, losers = incremental
+        assert winners['total_winners'] == 3
+        assert winners['best_signal_type'] == 'STRONG BUY'
+        assert winners['signal_stats']['STRONG BUY']['avg_pnl'] == pytest.approx(100.0)
+        assert winners['avg_hold_days'] == pytest.approx((3 + 5 + 7) / 3)
+        assert losers['total_losers'] == 3
+        assert losers['premature_stops'] == 1
+        assert losers['exit_reasons'] == {'STOP_LOSS': 2, 'SELL_SIGNAL': 1}
+        assert losers['avg_loss_pct'] == pytest.approx((4.0 + 5.5 + 2.0) / 3)
+
+    def test_period_analytics_from_daily_buckets(self, analysis_service, test_session):
+        """Daily and weekly analytics read the day buckets and can be recalculated"""
+        db = analysis_service.db
+        for i, pnl in enumerate([60.0, -30.0, 90.0]):
+            trade = self._trade(test_session, i, pnl, reason='TARGET_HIT' if pnl > 0 else 'STOP_LOSS')
+            db.add(trade)
+        db.commit()
+
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        daily = analysis_service.calculate_daily_analytics(test_session, today)
+        daily = analysis_service.calculate_daily_analytics(test_session, today)
+
+        assert daily.trades_count == 3
+        assert daily.win_rate_pct == pytest.approx(200.0 / 3)
+        assert daily.profit_factor == pytest.approx(150.0 / 30.0)
+        assert daily.best_trade_pnl == 90.0
+        assert daily.worst_trade_pnl == -30.0
+        assert daily.exit_breakdown == {'TARGET_HIT': 2, 'STOP_LOSS': 1}
+        assert daily.insights_data['pnl_std'] == pytest.approx(float(np.std([60.0, -30.0, 90.0])))
+
+        week_start = today - timedelta(days=today.weekday())
+        weekly = analysis_service.calculate_weekly_analytics(test_session, week_start)
+        assert weekly.trades_count == 3
+        assert weekly.net_pnl == pytest.approx(120.0)
@@ -107,6 +107,33 @@ class TestPortfolioService(unittest.TestCase):
         self.assertEqual(pos1_data['symbol'], 'STOCK1')
         self.assertEqual(pos1_data['pnl'], 1000.0)  # 100 * (110 - 100)
 
+    @patch('src.bot.services.portfolio_service.get_user_portfolio')
+    @patch('src.bot.services.portfolio_service.get_multiple_prices')
+    @patch('src.bot.services.portfolio_service.get_current_price')
+    def test_calculate_portfolio_summary_missing_prefetched_price(self, mock_get_price, mock_get_prices, mock_get_portfolio):
+        """Symbols missing from prefetched prices are fetched individually or flagged"""
+        positions = []
+        for symbol in ('STOCK1', 'STOCK2', 'STOCK3'):
+            pos = Mock()
+            pos.symbol = symbol
+            pos.shares = 10
+            pos.avg_buy_price = 100.0
+            positions.append(pos)
+
+        mock_get_portfolio.return_value = positions
+        mock_get_price.side_effect = lambda symbol: 120.0 if symbol == 'STOCK2' else None
+
+        summary = calculate_portfolio_summary(Mock(), 123456, prices={'STOCK1': 110.0})
+
+        mock_get_prices.assert_not_called()
+        self.assertEqual([c.args[0] for c in mock_get_price.call_args_list], ['STOCK2', 'STOCK3'])
+        by_symbol = {p['symbol']: p for p in summary['positions']}
+        self.assertEqual(by_symbol['STOCK2']['pnl'], 200.0)
+        self.assertTrue(by_symbol['STOCK2']['price_available'])
+        self.assertFalse(by_symbol['STOCK3']['price_available'])
+        self.assertEqual(summary['prices_unavailable'], ['STOCK3'])
+        self.assertEqual(summary['total_pnl'], 300.0)
+
 
 if __name__ == '__main__':
     unittest.main()
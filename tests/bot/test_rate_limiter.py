@@ -0,0 +1,179 @@
+"""
+Tests for Rate Limiting Middleware
+Token buckets, cost weights, persistence and update classification
+
+Author: Harsh Kandhway
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from telegram.ext import ApplicationHandlerStop
+
+from src.bot.middleware.rate_limiter import (
+    RateLimiter, charge_update, classify_update, rate_limit_middleware
+)
+from src.bot.services.on_demand_analysis_service import OnDemandAnalysisService
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+LIMITS = {
+    'analyze': {'max_calls': 3, 'per_minutes': 60},
+    'scan': {'max_calls': 5, 'per_minutes': 60},
+    'global': {'max_calls': 20, 'per_minutes': 60},
+}
+COSTS = {'analyze': 2, 'scan': 10}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(limits=LIMITS, costs=COSTS, exempt_user_ids=[99], clock=clock)
+
+
+class TestRateLimiter:
+    """Test token bucket limiting"""
+
+    def test_per_action_limit_and_refill(self, limiter, clock):
+        """Per-action bucket rejects the 4th call and refills over time"""
+        for _ in range(3):
+            assert limiter.check(1, 'analyze').allowed
+
+        result = limiter.check(1, 'analyze')
+        assert not result.allowed
+        assert result.limit == 'analyze'
+        assert result.retry_after == pytest.approx(1200.0)  # 1 call per 20 min
+
+        clock.now += 1200
+        assert limiter.check(1, 'analyze').allowed
+
+    def test_cost_weights_share_global_budget(self, limiter):
+        """Two scans use the whole global budget and block cheaper actions"""
+        assert limiter.check(1, 'scan').allowed
+        assert limiter.check(1, 'scan').allowed
+
+        result = limiter.check(1, 'quote')
+        assert not result.allowed
+        assert result.limit == 'global'
+
+        # Other users are unaffected, admins are never limited
+        assert limiter.check(2, 'scan').allowed
+        for _ in range(10):
+            assert limiter.check(99, 'scan').allowed
+
+    def test_rejection_charges_nothing(self, limiter):
+        """A rejected call does not drain the buckets that still had room"""
+        assert limiter.check(1, 'scan').allowed
+        for _ in range(3):
+            assert limiter.check(1, 'analyze').allowed
+
+        # Global has 20 - 10 - 3 * 2 = 4 left; the analyze bucket is empty
+        assert limiter.check(1, 'analyze').limit == 'analyze'
+        assert limiter._buckets[(1, 'global')].tokens == pytest.approx(4.0)
+
+    def test_save_and_load(self, limiter, clock, tmp_path):
+        """Persisted buckets survive a new limiter instance"""
+        path = str(tmp_path / 'limits.json')
+        for _ in range(3):
+            limiter.check(1, 'analyze')
+        limiter.save(path)
+
+        restored = RateLimiter(limits=LIMITS, costs=COSTS, clock=clock)
+        restored.load(path)
+        assert not restored.check(1, 'analyze').allowed
+        assert restored.check(2, 'analyze').allowed
+
+        # Missing files are ignored
+        RateLimiter(limits=LIMITS, clock=clock).load(str(tmp_path / 'missing.json'))
+
+
+class TestRateLimitMiddleware:
+    """Test update classification and handler short-circuit"""
+
+    def _command(self, text, user_id=1):
+        update = Mock()
+        update.callback_query = None
+        update.message.text = text
+        update.effective_user.id = user_id
+        update.effective_message.reply_text = AsyncMock()
+        return update
+
+    def test_classify_update(self):
+        """Commands map to their name; only expensive callbacks are charged"""
+        assert classify_update(self._command('/analyze TCS.NS')) == 'analyze'
+        assert classify_update(self._command('/compare@MyBot A B')) == 'compare'
+        assert classify_update(self._command('hello')) is None
+
+        callback = Mock()
+        callback.callback_query.data = 'analyze_full:TCS.NS'
+        assert classify_update(callback) == 'analyze'
+        callback.callback_query.data = 'scan_analyze'
+        assert classify_update(callback) == 'scan'
+        callback.callback_query.data = 'watchlist_menu'
+        assert classify_update(callback) is None
+
+    @pytest.mark.asyncio
+    async def test_blocks_with_message(self, limiter):
+        """Over-limit commands get a reply and stop handler processing"""
+        with patch('src.bot.middleware.rate_limiter.get_rate_limiter', return_value=limiter):
+            for _ in range(3):
+                await rate_limit_middleware(self._command('/analyze TCS.NS'), Mock())
+
+            update = self._command('/analyze TCS.NS')
+            with pytest.raises(ApplicationHandlerStop):
+                await rate_limit_middleware(update, Mock())
+
+        update.effective_message.reply_text.assert_awaited_once()
+        assert 'Rate limit' in update.effective_message.reply_text.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_plain_text_routes_charge_same_bucket(self, limiter):
+        """Menu buttons charge the bucket of the command they route to"""
+        with patch('src.bot.middleware.rate_limiter.get_rate_limiter', return_value=limiter):
+            await rate_limit_middleware(self._command('/analyze TCS.NS'), Mock())
+            assert await charge_update(self._command('📊 Analyze Stock'), 'analyze')
+            assert await charge_update(self._command('📊 Analyze Stock'), 'analyze')
+
+            update = self._command('📊 Analyze Stock')
+            assert not await charge_update(update, 'analyze')
+            update.effective_message.reply_text.assert_awaited_once()
+
+            with patch('src.bot.middleware.rate_limiter.ENABLE_RATE_LIMITING', False):
+                assert await charge_update(self._command('📊 Analyze Stock'), 'analyze')
+
+
+class TestScanCooldown:
+    """Test the scan service's own throttle"""
+
+    @pytest.mark.asyncio
+    async def test_scan_cooldown_without_middleware(self, clock):
+        """Uncached scans are limited even when ENABLE_RATE_LIMITING is off"""
+        scan_limiter = RateLimiter(
+            limits={'scan': {'max_calls': 1, 'per_minutes': 60}}, costs={}, exempt_user_ids=[], clock=clock
+        )
+        service = OnDemandAnalysisService(Mock())
+        service._get_cached_result = Mock(return_value=None)
+        service._filter_stocks = Mock(return_value=[])
+
+        with patch('src.bot.middleware.rate_limiter.ENABLE_RATE_LIMITING', False), \
+                patch('src.bot.services.on_demand_analysis_service.get_scan_limiter', return_value=scan_limiter):
+            with pytest.raises(ValueError, match='No stocks'):
+                await service.analyze_on_demand(user_id=1)
+            with pytest.raises(ValueError, match='Rate limit'):
+                await service.analyze_on_demand(user_id=1)
+            clock.now += 3600
+            with pytest.raises(ValueError, match='No stocks'):
+                await service.analyze_on_demand(user_id=1)
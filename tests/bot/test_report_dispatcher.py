@@ -0,0 +1,200 @@
+"""
+Tests for the Scheduled Report Dispatcher
+Schedule math, batched quoting, claim-before-send and send pacing
+
+Author: Harsh Kandhway
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.bot.config import CURRENCY_SYMBOL
+from src.bot.database.db import next_report_time
+from src.bot.database.models import Base, Portfolio, ScheduledReport, User, Watchlist
+from src.bot.services.report_dispatcher import ReportDispatcher, SendThrottle
+from src.bot.services.watchlist_digest_service import WatchlistDigestService
+
+# 09:00 IST on Monday 2 March 2026
+DUE = datetime(2026, 3, 2, 3, 30)
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory over an in-memory database with four users and their reports"""
+    engine = create_engine(
+        'sqlite:///:memory:',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+        echo=False
+    )
+    Base.metadata.create_all(engine)
+    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = TestSessionLocal()
+    users = {}
+    for telegram_id in (1001, 2002, 3003, 4004):
+        users[telegram_id] = User(telegram_id=telegram_id)
+        db.add(users[telegram_id])
+    db.flush()
+    db.add_all([
+        Watchlist(user_id=users[1001].id, symbol='AAA.NS'),
+        Watchlist(user_id=users[1001].id, symbol='BBB.NS'),
+        Portfolio(user_id=users[2002].id, symbol='BBB.NS', shares=10, avg_buy_price=90.0),
+        Portfolio(user_id=users[2002].id, symbol='CCC.NS', shares=5, avg_buy_price=200.0),
+        Watchlist(user_id=users[3003].id, symbol='DDD.NS'),
+        Portfolio(user_id=users[3003].id, symbol='AAA.NS', shares=2, avg_buy_price=50.0),
+        Watchlist(user_id=users[4004].id, symbol='EEE.NS'),
+    ])
+    db.add_all([
+        ScheduledReport(user_id=users[1001].id, report_type='watchlist', frequency='09:00', next_scheduled=DUE),
+        ScheduledReport(user_id=users[2002].id, report_type='portfolio', frequency='09:00', next_scheduled=DUE),
+        ScheduledReport(user_id=users[3003].id, report_type='combined', frequency='09:00', next_scheduled=DUE),
+        # Missed while the bot was down
+        ScheduledReport(user_id=users[4004].id, report_type='watchlist', frequency='Monday 06:00',
+                        next_scheduled=DUE - timedelta(hours=3)),
+        # Not due yet
+        ScheduledReport(user_id=users[4004].id, report_type='watchlist', frequency='09:05',
+                        next_scheduled=DUE + timedelta(minutes=5)),
+    ])
+    db.commit()
+    db.close()
+
+    @contextmanager
+    def factory():
+        session = TestSessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    with patch('src.bot.services.report_service.get_watchlist_digest_service',
+               return_value=WatchlistDigestService(factory)):
+        yield factory
+
+
+PRICES = {'AAA.NS': 55.0, 'BBB.NS': 100.0, 'CCC.NS': 210.0, 'DDD.NS': 12.5}
+
+
+def _dispatch(session_factory, bot, now=DUE + timedelta(seconds=1)):
+    dispatcher = ReportDispatcher(bot, session_factory, sends_per_second=100)
+    with patch('src.bot.services.report_dispatcher.get_multiple_prices', return_value=PRICES) as quotes, \
+            patch('src.bot.services.portfolio_service.get_multiple_prices') as portfolio_quotes, \
+            patch('src.bot.services.report_service.get_multiple_prices') as watchlist_quotes:
+        stats = asyncio.run(dispatcher.dispatch_due(now))
+    portfolio_quotes.assert_not_called()
+    watchlist_quotes.assert_not_called()
+    return stats, quotes
+
+
+class TestNextReportTime:
+    """Test schedule parsing (IST wall clock, stored as UTC)"""
+
+    def test_daily(self):
+        assert next_report_time('09:00', DUE - timedelta(minutes=1)) == DUE
+        assert next_report_time('09:00', DUE) == DUE + timedelta(days=1)
+        assert next_report_time('9:00', DUE - timedelta(minutes=1)) == DUE
+
+    def test_weekly(self):
+        assert next_report_time('Monday 09:00', DUE - timedelta(minutes=1)) == DUE
+        assert next_report_time('monday 09:00', DUE) == DUE + timedelta(days=7)
+        assert next_report_time('Friday 18:00', DUE) == datetime(2026, 3, 6, 12, 30)
+
+    def test_invalid(self):
+        assert next_report_time('') is None
+        assert next_report_time('noon') is None
+        assert next_report_time('Someday 09:00') is None
+
+
+class TestReportDispatcher:
+    """Test one dispatch pass"""
+
+    def test_due_batch_shares_one_quote_call(self, session_factory):
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        stats, quotes = _dispatch(session_factory, bot)
+
+        assert stats == {'due': 4, 'sent': 3, 'failed': 0, 'skipped': 1, 'symbols': 4}
+        quotes.assert_called_once_with(['AAA.NS', 'BBB.NS', 'CCC.NS', 'DDD.NS'])
+
+        sent = {call.kwargs['chat_id']: call.kwargs['text'] for call in bot.send_message.call_args_list}
+        assert set(sent) == {1001, 2002, 3003}
+        assert f'*AAA.NS*: {CURRENCY_SYMBOL}55.00' in sent[1001]
+        assert 'Portfolio Performance Report' in sent[2002]
+        assert 'Watchlist Report' in sent[3003] and 'Portfolio Performance Report' in sent[3003]
+
+        with session_factory() as db:
+            reports = {r.id: r for r in db.query(ScheduledReport)}
+            for report_id in (1, 2, 3):
+                assert reports[report_id].next_scheduled == DUE + timedelta(days=1)
+                assert reports[report_id].last_sent is not None
+            assert reports[4].next_scheduled == DUE + timedelta(days=7) - timedelta(hours=3)
+            assert reports[4].last_sent is None
+            assert reports[5].next_scheduled == DUE + timedelta(minutes=5)
+
+    def test_missed_report_is_skipped(self, session_factory):
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+        stats, quotes = _dispatch(session_factory, bot, now=DUE - timedelta(seconds=1))
+
+        assert stats == {'due': 1, 'sent': 0, 'failed': 0, 'skipped': 1, 'symbols': 0}
+        quotes.assert_not_called()
+        bot.send_message.assert_not_called()
+
+    def test_failed_send_is_not_retried(self, session_factory):
+        async def send_message(chat_id, text, parse_mode):
+            if chat_id == 2002:
+                raise RuntimeError('Forbidden: bot was blocked by the user')
+
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=send_message)
+        stats, _ = _dispatch(session_factory, bot)
+
+        assert stats['sent'] == 2
+        assert stats['failed'] == 1
+        with session_factory() as db:
+            report = db.get(ScheduledReport, 2)
+            assert report.last_sent is None
+            assert report.next_scheduled == DUE + timedelta(days=1)
+
+        bot.send_message.reset_mock()
+        stats, _ = _dispatch(session_factory, bot)
+        assert stats['due'] == 0
+
+    def test_backfill_schedules(self, session_factory):
+        with session_factory() as db:
+            db.query(ScheduledReport).update({ScheduledReport.next_scheduled: None})
+            db.query(ScheduledReport).filter(ScheduledReport.id == 5).update({ScheduledReport.is_active: False})
+            db.commit()
+
+        dispatcher = ReportDispatcher(MagicMock(), session_factory)
+        assert dispatcher.backfill_schedules(DUE - timedelta(minutes=1)) == 4
+
+        with session_factory() as db:
+            reports = {r.id: r for r in db.query(ScheduledReport)}
+            assert reports[1].next_scheduled == DUE
+            assert reports[4].next_scheduled == DUE + timedelta(days=7) - timedelta(hours=3)
+            assert reports[5].next_scheduled is None
+
+
+class TestSendThrottle:
+    """Test pacing of concurrent senders"""
+
+    def test_bursts_then_paces(self):
+        throttle = SendThrottle(20)
+
+        async def send_many():
+            start = time.monotonic()
+            await asyncio.gather(*(throttle.acquire() for _ in range(30)))
+            return time.monotonic() - start
+
+        # 20 go out at once, the next 10 at 20 per second
+        assert asyncio.run(send_many()) >= 0.45
@@ -0,0 +1,267 @@
+"""
+Tests for Watchlist Digest Service
+Shared after-close digests, change detection and the per-user join
+
+Author: Harsh Kandhway
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.bot.config import CURRENCY_SYMBOL
+from src.bot.database.models import Base, User, UserSettings, Watchlist, WatchlistDigest
+from src.bot.services import watchlist_digest_service as digest_module
+from src.bot.services.analysis_service import clear_variant_cache
+from src.bot.services.report_service import generate_watchlist_report
+from src.bot.services.watchlist_digest_service import (
+    WatchlistDigestService, describe_change, diff_snapshots, summarize_digest
+)
+from src.core.formatters import format_watchlist
+
+DAY_1 = datetime(2026, 3, 2)
+DAY_2 = datetime(2026, 3, 3)
+DAY_1_EVENING = datetime(2026, 3, 2, 17, 0)
+USERS = {1001: ['AAA.NS', 'BBB.NS'], 2002: ['BBB.NS', 'CCC.NS'], 3003: ['AAA.NS', 'CCC.NS', 'DDD.NS']}
+
+
+def _history(seed, bars=300):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(0.015 * rng.standard_normal(bars)))
+    open_ = close * (1 + 0.004 * rng.standard_normal(bars))
+    spread = close * 0.01
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(100000, 1000000, bars).astype(float)
+    }, index=pd.date_range('2025-01-01', periods=bars, freq='B'))
+
+
+HISTORIES = {symbol: _history(seed) for seed, symbol in enumerate(['AAA.NS', 'BBB.NS', 'CCC.NS', 'DDD.NS'])}
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory over an in-memory database with three users' watchlists"""
+    engine = create_engine(
+        'sqlite:///:memory:',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+        echo=False
+    )
+    Base.metadata.create_all(engine)
+    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = TestSessionLocal()
+    for telegram_id, symbols in USERS.items():
+        user = User(telegram_id=telegram_id)
+        db.add(user)
+        db.flush()
+        db.add(UserSettings(user_id=user.id, risk_mode='aggressive' if telegram_id == 1001 else 'balanced'))
+        for i, symbol in enumerate(symbols):
+            db.add(Watchlist(user_id=user.id, symbol=symbol, added_at=datetime(2026, 1, 1, 10, i)))
+    db.commit()
+    db.close()
+
+    @contextmanager
+    def factory():
+        session = TestSessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    clear_variant_cache()
+    yield factory
+    clear_variant_cache()
+
+
+def _build(service, digest_date, histories):
+    with patch.object(digest_module, 'fetch_multiple_stock_data', return_value=histories) as fetch, \
+            patch.object(digest_module, 'analyze_stock_variants', wraps=digest_module.analyze_stock_variants) as analyze:
+        stats = service.build_digests(digest_date)
+    return stats, fetch, analyze
+
+
+def _snapshot(**overrides):
+    snapshot = {
+        'price': 100.0, 'change_pct': 1.0,
+        'modes': {
+            'balanced': {'recommendation': 'HOLD', 'recommendation_type': 'HOLD', 'confidence': 50.0},
+            'aggressive': {'recommendation': 'BUY', 'recommendation_type': 'BUY', 'confidence': 65.0},
+        },
+        'rsi': 55.0, 'rsi_zone': 'neutral',
+        'ema_above': {'EMA 20': True, 'EMA 50': True, 'EMA 200': False},
+        'macd_above_signal': True, 'ema_alignment': 'mixed', 'market_phase': 'accumulation',
+        'patterns': ['Doji'], 'support': 95.0, 'resistance': 110.0,
+    }
+    snapshot.update(overrides)
+    return snapshot
+
+
+class TestDiffSnapshots:
+    """Test change detection between consecutive digests"""
+
+    def test_first_digest_has_no_changes(self):
+        assert diff_snapshots(None, _snapshot()) == []
+
+    def test_unchanged(self):
+        assert diff_snapshots(_snapshot(), _snapshot()) == []
+
+    def test_detects_every_change_type(self):
+        current = _snapshot(
+            modes={
+                'balanced': {'recommendation': 'BUY', 'recommendation_type': 'BUY', 'confidence': 62.0},
+                'aggressive': {'recommendation': 'BUY', 'recommendation_type': 'BUY', 'confidence': 70.0},
+            },
+            ema_above={'EMA 20': True, 'EMA 50': True, 'EMA 200': True},
+            macd_above_signal=False,
+            rsi_zone='overbought',
+            patterns=['Doji', 'Hammer'],
+        )
+        changes = diff_snapshots(_snapshot(), current)
+
+        assert changes == [
+            {'type': 'recommendation', 'mode': 'balanced', 'from': 'HOLD', 'to': 'BUY'},
+            {'type': 'ema_cross', 'ema': 'EMA 200', 'direction': 'above'},
+            {'type': 'macd_cross', 'direction': 'bearish'},
+            {'type': 'rsi_zone', 'from': 'neutral', 'to': 'overbought'},
+            {'type': 'pattern', 'name': 'Hammer'},
+        ]
+        assert [describe_change(change) for change in changes] == [
+            'HOLD → BUY', 'Closed above EMA 200', 'MACD bearish crossover',
+            'RSI neutral → overbought', 'New pattern: Hammer',
+        ]
+
+    def test_summary_keeps_only_the_users_mode(self):
+        digest = {
+            'digest_date': DAY_1, 'current_price': 100.0, 'change_pct': 1.0, 'rsi': 55.0, 'snapshot': _snapshot(),
+            'changes': [
+                {'type': 'recommendation', 'mode': 'balanced', 'from': 'HOLD', 'to': 'BUY'},
+                {'type': 'pattern', 'name': 'Hammer'},
+            ],
+        }
+        summary = summarize_digest(digest, 'aggressive')
+        assert summary['recommendation'] == 'BUY'
+        assert summary['confidence'] == 65.0
+        assert summary['highlights'] == ['New pattern: Hammer']
+        assert summarize_digest(digest, 'balanced')['highlights'] == ['HOLD → BUY', 'New pattern: Hammer']
+
+
+class TestWatchlistDigestService:
+    """Test the shared build and the per-user join"""
+
+    def test_build_analyzes_each_distinct_symbol_once(self, session_factory):
+        service = WatchlistDigestService(session_factory, workers=2)
+        stats, fetch, analyze = _build(service, DAY_1, HISTORIES)
+
+        assert fetch.call_count == 1
+        assert sorted(fetch.call_args.args[0]) == ['AAA.NS', 'BBB.NS', 'CCC.NS', 'DDD.NS']
+        assert analyze.call_count == 4
+        assert stats == {'symbols': 4, 'stored': 4, 'failed': [], 'changes': 0}
+
+        with session_factory() as db:
+            rows = db.query(WatchlistDigest).all()
+            assert len(rows) == 4
+            row = next(r for r in rows if r.symbol == 'AAA.NS')
+            assert row.digest_date == DAY_1
+            assert row.changes == []
+            assert set(row.snapshot['modes']) == {'conservative', 'balanced', 'aggressive'}
+            assert row.recommendation == row.snapshot['modes']['balanced']['recommendation']
+            assert row.current_price == pytest.approx(HISTORIES['AAA.NS']['close'].iloc[-1], abs=0.01)
+
+    def test_rebuild_replaces_day_and_diffs_previous(self, session_factory):
+        service = WatchlistDigestService(session_factory, workers=2)
+        earlier = {symbol: df.iloc[:-15] for symbol, df in HISTORIES.items()}
+        _build(service, DAY_1, earlier)
+        _build(service, DAY_2, HISTORIES)
+        stats, _, _ = _build(service, DAY_2, HISTORIES)
+
+        with session_factory() as db:
+            assert db.query(WatchlistDigest).count() == 8
+            by_key = {(r.symbol, r.digest_date): r for r in db.query(WatchlistDigest)}
+            total = 0
+            for symbol in HISTORIES:
+                expected = diff_snapshots(by_key[(symbol, DAY_1)].snapshot, by_key[(symbol, DAY_2)].snapshot)
+                assert by_key[(symbol, DAY_2)].changes == expected
+                total += len(expected)
+        assert stats['changes'] == total
+
+    def test_failed_symbol_is_reported(self, session_factory):
+        service = WatchlistDigestService(session_factory, workers=2)
+        partial = {symbol: df for symbol, df in HISTORIES.items() if symbol != 'DDD.NS'}
+        stats, _, _ = _build(service, DAY_1, partial)
+
+        assert stats['failed'] == ['DDD.NS']
+        assert stats['stored'] == 3
+
+        with session_factory() as db:
+            digest = service.get_user_digest(db, 3003, DAY_1_EVENING)
+        assert digest['digest_date'] == DAY_1
+        assert [entry['symbol'] for entry in digest['entries']] == ['CCC.NS', 'AAA.NS']
+        assert digest['missing'] == ['DDD.NS']
+
+    def test_user_join_and_report(self, session_factory):
+        service = WatchlistDigestService(session_factory, workers=2)
+        _build(service, DAY_1, HISTORIES)
+
+        with session_factory() as db:
+            summaries = service.get_user_summaries(db, 1001, 'aggressive', DAY_1_EVENING)
+            assert set(summaries) == {'AAA.NS', 'BBB.NS'}
+
+            with patch('src.bot.services.report_service.get_watchlist_digest_service', return_value=service), \
+                    patch.object(service, 'current_session_day', return_value=DAY_1), \
+                    patch('src.bot.services.report_service.get_multiple_prices') as prices:
+                report = generate_watchlist_report(db, 1001)
+
+        prices.assert_not_called()
+        assert '(close of 02 Mar)' in report
+        for symbol, summary in summaries.items():
+            assert f"*{symbol}*" in report
+            assert summary['recommendation'] in report
+
+        view = format_watchlist([{'symbol': 'AAA.NS'}, {'symbol': 'EEE.NS'}], digests=summaries)
+        assert f"{summaries['AAA.NS']['change_pct']:+.2f}% | {summaries['AAA.NS']['recommendation']}" in view
+        assert view.count('%') == 1
+        assert '| close of 02 Mar\n' in view
+        assert '\\n' not in view
+
+    def test_stale_digest_is_ignored(self, session_factory):
+        service = WatchlistDigestService(session_factory, workers=2)
+        _build(service, DAY_1, HISTORIES)
+
+        # Before DAY_2's digest is due, DAY_1's is still current
+        assert service.current_session_day(datetime(2026, 3, 3, 12, 0)) == DAY_1
+        assert service.current_session_day(DAY_1_EVENING) == DAY_1
+        assert service.current_session_day(datetime(2026, 3, 2, 9, 0)) == datetime(2026, 2, 27)
+
+        with session_factory() as db:
+            current = service.get_user_digest(db, 1001, datetime(2026, 3, 3, 12, 0))
+            stale = service.get_user_digest(db, 1001, datetime(2026, 3, 3, 17, 0))
+        assert current['digest_date'] == DAY_1
+        assert stale['digest_date'] is None
+        assert stale['entries'] == []
+        assert stale['missing'] == ['BBB.NS', 'AAA.NS']
+
+    def test_report_prices_symbols_without_digest(self, session_factory):
+        service = WatchlistDigestService(session_factory, workers=2)
+
+        with session_factory() as db:
+            with patch('src.bot.services.report_service.get_watchlist_digest_service', return_value=service), \
+                    patch('src.bot.services.report_service.get_multiple_prices',
+                          return_value={'BBB.NS': 250.5}) as prices:
+                report = generate_watchlist_report(db, 2002)
+
+        prices.assert_called_once_with(['CCC.NS', 'BBB.NS'])
+        assert f'*BBB.NS*: {CURRENCY_SYMBOL}250.50' in report
+        assert '*CCC.NS*: Price unavailable' in report
@@ -0,0 +1,244 @@
+"""
+Unit tests for risk-aware portfolio allocation
+"""
+
+import unittest
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.allocation import (
+    allocate, cap_weights, inverse_volatility_weights, mean_variance_weights,
+    project_capped_simplex, risk_parity_weights, round_to_shares, shrunk_covariance
+)
+from src.core.formatters import format_allocation
+from src.core.risk_management import calculate_portfolio_allocation
+
+
+def _random_returns(n_days, n_stocks, seed=3):
+    """Daily returns driven by one market factor plus stock noise with mixed volatility"""
+    rng = np.random.default_rng(seed)
+    market = 0.01 * rng.standard_normal((n_days, 1))
+    betas = rng.uniform(0.5, 1.5, n_stocks)
+    noise = rng.standard_normal((n_days, n_stocks)) * rng.uniform(0.005, 0.03, n_stocks)
+    return market * betas + noise
+
+
+class TestShrunkCovariance(unittest.TestCase):
+    """Test Ledoit-Wolf shrinkage"""
+
+    def test_matches_reference_formula(self):
+        returns = _random_returns(60, 8)
+        cov, shrinkage = shrunk_covariance(returns)
+
+        # Loop form of the Ledoit-Wolf (2004) estimator
+        t, n = returns.shape
+        x = returns - returns.mean(axis=0)
+        sample = x.T @ x / t
+        mu = np.trace(sample) / n
+        d2 = np.linalg.norm(sample - mu * np.eye(n), 'fro') ** 2 / n
+        b2 = sum(np.linalg.norm(np.outer(row, row) - sample, 'fro') ** 2 for row in x) / t ** 2 / n
+        expected = min(b2, d2) / d2
+
+        self.assertAlmostEqual(shrinkage, expected)
+        np.testing.assert_allclose(cov, expected * mu * np.eye(n) + (1 - expected) * sample)
+
+    def test_more_stocks_than_days_is_invertible(self):
+        cov, shrinkage = shrunk_covariance(_random_returns(30, 80))
+        self.assertGreater(shrinkage, 0)
+        self.assertGreater(np.linalg.eigvalsh(cov)[0], 0)
+
+
+class TestWeighting(unittest.TestCase):
+    """Test the weighting schemes"""
+
+    def setUp(self):
+        self.cov, _ = shrunk_covariance(_random_returns(250, 12))
+
+    def test_inverse_volatility(self):
+        cov = np.diag([0.01, 0.04, 0.16])
+        np.testing.assert_allclose(inverse_volatility_weights(cov), [4 / 7, 2 / 7, 1 / 7])
+        np.testing.assert_allclose(inverse_volatility_weights(cov, np.array([1.0, 2.0, 4.0])), [1 / 3] * 3)
+
+    def test_risk_parity_equalizes_contributions(self):
+        weights = risk_parity_weights(self.cov)
+        contributions = weights * (self.cov @ weights)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        np.testing.assert_allclose(contributions / contributions.sum(), np.full(12, 1 / 12), atol=1e-8)
+
+    def test_risk_parity_budgets(self):
+        budgets = np.arange(1.0, 13.0)
+        weights = risk_parity_weights(self.cov, budgets)
+        contributions = weights * (self.cov @ weights)
+        np.testing.assert_allclose(contributions / contributions.sum(), budgets / budgets.sum(), atol=1e-8)
+
+    def test_capped_simplex_projection(self):
+        projected = project_capped_simplex(np.array([0.9, 0.5, 0.1, -0.3]), 0.4)
+        self.assertAlmostEqual(projected.sum(), 1.0)
+        self.assertLessEqual(projected.max(), 0.4 + 1e-12)
+        self.assertGreaterEqual(projected.min(), 0.0)
+
+    def test_mean_variance_respects_cap_and_prefers_return(self):
+        expected = np.linspace(0.0, 0.2, 12)
+        weights = mean_variance_weights(expected, self.cov * 63, max_weight=0.2)
+        self.assertAlmostEqual(weights.sum(), 1.0, places=6)
+        self.assertLessEqual(weights.max(), 0.2 + 1e-9)
+        self.assertAlmostEqual(weights[-1], 0.2, places=6)
+        self.assertGreater(weights[6:].sum(), weights[:6].sum())
+
+    def test_cap_weights(self):
+        np.testing.assert_allclose(cap_weights(np.array([0.6, 0.2, 0.1, 0.1]), 0.4), [0.4, 0.3, 0.15, 0.15])
+        # Too few names to invest everything under the cap: the rest stays cash
+        np.testing.assert_allclose(cap_weights(np.array([0.5, 0.5]), 0.2), [0.2, 0.2])
+
+
+class TestAllocate(unittest.TestCase):
+    """Test share rounding and the full allocation"""
+
+    def test_round_to_shares(self):
+        weights = np.array([0.2, 0.2, 0.2, 0.2, 0.2])
+        prices = np.array([333.0, 1250.0, 77.7, 5000.0, 12.0])
+        shares = round_to_shares(weights, prices, 100000.0, 0.2)
+        self.assertTrue(np.issubdtype(shares.dtype, np.integer))
+        self.assertLessEqual(shares @ prices, 100000.0)
+        self.assertTrue(np.all(shares * prices <= 20000.0))
+        np.testing.assert_array_equal(shares, [60, 16, 257, 4, 1666])
+
+    def test_round_to_shares_does_not_overshoot(self):
+        """An extra share is only bought when it lands closer to the target"""
+        # 856 short of a 1775.42 share: buying it would put 83% of capital in S2
+        shares = round_to_shares(np.array([0.6, 0.4]), np.array([5000.0, 1775.42]), 2141.0)
+        np.testing.assert_array_equal(shares, [0, 0])
+
+        # 600 short of a 700 share: 100 over beats 600 under; 200 short of a 400 share is a tie
+        shares = round_to_shares(np.array([0.5, 0.5]), np.array([400.0, 700.0]), 1200.0)
+        np.testing.assert_array_equal(shares, [1, 1])
+
+    def test_hundreds_of_candidates(self):
+        n = 400
+        returns = _random_returns(250, n)
+        rng = np.random.default_rng(5)
+        prices = rng.uniform(20, 3000, n)
+        scores = rng.uniform(50, 90, n)
+
+        for method in ('inverse_vol', 'risk_parity', 'mean_variance'):
+            with self.subTest(method=method):
+                start = time.perf_counter()
+                result = allocate(prices, 10_000_000.0, method, returns=returns, scores=scores,
+                                  max_position_pct=2.0, horizon_days=63)
+                elapsed = time.perf_counter() - start
+
+                self.assertLess(elapsed, 2.0)
+                self.assertLessEqual(result['amounts'].sum(), 10_000_000.0)
+                self.assertTrue(np.all(result['amounts'] <= 200_000.0 + 1e-6))
+                self.assertAlmostEqual(result['risk_contribution'].sum(), 1.0)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            allocate(np.array([100.0]), 1000.0, 'equal')
+        with self.assertRaises(ValueError):
+            allocate(np.array([100.0]), 1000.0, 'risk_parity')
+
+
+class TestPortfolioAllocation(unittest.TestCase):
+    """Test calculate_portfolio_allocation with daily histories"""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        index = pd.date_range('2025-01-01', periods=200, freq='B')
+        shared = 0.02 * rng.standard_normal(200)
+
+        def history(returns):
+            return pd.DataFrame({'close': 100 * np.exp(np.cumsum(returns))}, index=index)
+
+        # TWIN_A and TWIN_B move together; CALM is independent and quiet
+        self.histories = {
+            'TWIN_A': history(shared + 0.002 * rng.standard_normal(200)),
+            'TWIN_B': history(shared + 0.002 * rng.standard_normal(200)),
+            'CALM': history(0.008 * rng.standard_normal(200)),
+        }
+        self.analyses = [
+            {
+                'symbol': symbol, 'confidence': 75, 'recommendation': 'BUY', 'recommendation_type': 'BUY',
+                'rr_valid': True, 'risk_reward': 2.5, 'current_price': float(df['close'].iloc[-1]),
+                'stop_loss': float(df['close'].iloc[-1]) * 0.95, 'target': float(df['close'].iloc[-1]) * 1.1,
+                'horizon': '3months',
+            }
+            for symbol, df in self.histories.items()
+        ]
+
+    def test_correlated_names_share_one_risk_budget(self):
+        allocation = calculate_portfolio_allocation(self.analyses, 1_000_000.0, histories=self.histories)
+        weights = {a['symbol']: a['weight_pct'] for a in allocation['investable']}
+
+        self.assertEqual(allocation['method'], 'risk_parity')
+        self.assertGreater(weights['CALM'], 50.0)
+        self.assertLess(weights['TWIN_A'] + weights['TWIN_B'], 50.0)
+        self.assertGreater(allocation['avg_correlation'], 0.0)
+        self.assertLessEqual(allocation['total_allocated'], 1_000_000.0)
+        for position in allocation['investable']:
+            self.assertIsInstance(position['shares'], int)
+
+    def test_position_cap(self):
+        allocation = calculate_portfolio_allocation(
+            self.analyses, 1_000_000.0, histories=self.histories, method='inverse_vol', max_position_pct=20.0
+        )
+        for position in allocation['investable']:
+            self.assertLessEqual(position['allocated_amount'], 200_000.0)
+        self.assertGreaterEqual(allocation['cash_remaining'], 400_000.0 - 1e-6)
+
+    def test_falls_back_without_histories(self):
+        allocation = calculate_portfolio_allocation(self.analyses, 1_000_000.0)
+        self.assertEqual(allocation['method'], 'confidence')
+        self.assertIsNone(allocation['investable'][0]['risk_contribution_pct'])
+
+        allocation = calculate_portfolio_allocation(self.analyses, 1_000_000.0, histories={'CALM': self.histories['CALM']})
+        self.assertEqual(allocation['method'], 'confidence')
+
+    def test_confidence_fallback_matches_original_split(self):
+        """Without histories the shares are exactly the original floor-only confidence split"""
+        rng = np.random.default_rng(17)
+        for _ in range(200):
+            n = int(rng.integers(1, 8))
+            analyses = [
+                {
+                    'symbol': f"S{i}", 'confidence': float(rng.uniform(50, 95)), 'recommendation': 'BUY',
+                    'recommendation_type': 'BUY', 'rr_valid': True, 'risk_reward': 2.0,
+                    'current_price': float(rng.uniform(10, 3000)), 'stop_loss': 1.0, 'target': 2.0,
+                    'horizon': 'unknown',
+                }
+                for i in range(n)
+            ]
+            capital = float(rng.uniform(1000, 200000))
+            allocation = calculate_portfolio_allocation(analyses, capital)
+
+            # Baseline loop before the allocator existed
+            total_confidence = sum(a['confidence'] for a in analyses)
+            expected = [int(capital * (a['confidence'] / total_confidence) / a['current_price']) for a in analyses]
+            self.assertEqual([p['shares'] for p in allocation['investable']], expected)
+
+    def test_unknown_horizon_uses_default(self):
+        for analysis in self.analyses:
+            analysis['horizon'] = '5years'
+        allocation = calculate_portfolio_allocation(
+            self.analyses, 1_000_000.0, histories=self.histories, method='mean_variance'
+        )
+        self.assertEqual(allocation['method'], 'mean_variance')
+
+    def test_format(self):
+        allocation = calculate_portfolio_allocation(self.analyses, 1_000_000.0, histories=self.histories)
+        text = format_allocation(allocation, 1_000_000.0, 'cli')
+        self.assertIn('risk parity', text)
+        self.assertIn('Portfolio volatility', text)
+        for symbol in self.histories:
+            self.assertIn(symbol, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
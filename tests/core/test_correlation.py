@@ -0,0 +1,106 @@
+"""
+Unit tests for cross-stock return statistics
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.correlation import MIN_OVERLAP_BARS, align_closes, calculate_relative_metrics
+
+
+def _history(close, start='2025-01-01'):
+    return pd.DataFrame({'close': close}, index=pd.date_range(start, periods=len(close), freq='B'))
+
+
+class TestAlignCloses(unittest.TestCase):
+    """Test the shared date index"""
+
+    def test_inner_join_and_lookback(self):
+        a = _history(np.linspace(100, 200, 100))
+        b = _history(np.linspace(50, 60, 80), start=a.index[20])
+        closes = align_closes({'A': a, 'B': b}, lookback=30)
+        self.assertEqual(list(closes.columns), ['A', 'B'])
+        self.assertEqual(len(closes), 31)
+        self.assertEqual(closes.index[-1], a.index[-1])
+
+        full = align_closes({'A': a, 'B': b}, lookback=None)
+        self.assertEqual(len(full), 80)
+
+    def test_live_bar_lines_up(self):
+        """A timestamped intraday bar counts as that day"""
+        a = _history(np.arange(1.0, 41.0))
+        b = a.copy()
+        b.index = b.index[:-1].append(pd.DatetimeIndex([b.index[-1] + pd.Timedelta(hours=10)]))
+        self.assertEqual(len(align_closes({'A': a, 'B': b}, lookback=None)), 40)
+
+    def test_too_little_overlap(self):
+        a = _history(np.arange(1.0, 41.0))
+        b = _history(np.arange(1.0, 41.0), start=a.index[-MIN_OVERLAP_BARS])
+        with self.assertRaises(ValueError):
+            align_closes({'A': a, 'B': b})
+
+
+class TestRelativeMetrics(unittest.TestCase):
+    """Test relative strength, correlation and beta"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.market = 0.01 * rng.standard_normal(200)
+        noise = 0.005 * rng.standard_normal(200)
+        index = pd.date_range('2025-01-01', periods=201, freq='B')
+
+        def prices(returns):
+            return 100 * np.exp(np.r_[0, np.cumsum(returns)])
+
+        self.closes = pd.DataFrame({
+            'HIGH_BETA': prices(2 * self.market + noise),
+            'LOW_BETA': prices(0.5 * self.market - noise),
+            'INDEX': prices(self.market),
+        }, index=index)
+
+    def test_against_benchmark(self):
+        relative = calculate_relative_metrics(self.closes, benchmark='INDEX')
+        self.assertEqual(relative['symbols'], ['HIGH_BETA', 'LOW_BETA'])
+        self.assertEqual(relative['bars'], 200)
+        self.assertEqual(relative['correlation'].shape, (2, 2))
+
+        returns = np.diff(np.log(self.closes.to_numpy()), axis=0)
+        for i, symbol in enumerate(relative['symbols']):
+            with self.subTest(symbol=symbol):
+                metrics = relative['metrics'][symbol]
+                expected_beta = np.cov(returns[:, i], returns[:, 2])[0, 1] / np.var(returns[:, 2], ddof=1)
+                self.assertAlmostEqual(metrics['beta'], round(expected_beta, 2))
+                self.assertAlmostEqual(
+                    metrics['benchmark_correlation'], round(np.corrcoef(returns[:, i], returns[:, 2])[0, 1], 2)
+                )
+                total = self.closes[symbol].iloc[-1] / self.closes[symbol].iloc[0]
+                benchmark_total = self.closes['INDEX'].iloc[-1] / self.closes['INDEX'].iloc[0]
+                self.assertAlmostEqual(metrics['relative_strength'], round(total / benchmark_total, 3))
+
+        self.assertAlmostEqual(relative['metrics']['HIGH_BETA']['beta'], 2.0, delta=0.15)
+        self.assertAlmostEqual(relative['metrics']['LOW_BETA']['beta'], 0.5, delta=0.15)
+
+    def test_basket_benchmark(self):
+        relative = calculate_relative_metrics(self.closes)
+        self.assertEqual(relative['benchmark'], 'basket')
+        self.assertEqual(len(relative['metrics']), 3)
+        np.testing.assert_allclose(np.diag(relative['correlation']), 1.0)
+
+    def test_flat_series(self):
+        """A constant price has no defined correlation; nothing raises"""
+        closes = self.closes.assign(FLAT=100.0)
+        relative = calculate_relative_metrics(closes, benchmark='INDEX')
+        self.assertEqual(relative['metrics']['FLAT']['beta'], 0.0)
+        self.assertIsNone(relative['metrics']['FLAT']['benchmark_correlation'])
+        self.assertEqual(relative['metrics']['FLAT']['return_pct'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Unit tests for the correlation / sector exposure matrix
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.exposure import (
+    CORRELATION_SCALE, UNKNOWN_CORRELATION, ExposureMatrix, check_admission, quantized_correlation
+)
+
+
+def _closes(returns, symbols, start='2025-01-01'):
+    """Close prices from daily log returns"""
+    index = pd.date_range(start, periods=len(returns) + 1, freq='B')
+    prices = 100 * np.exp(np.vstack([np.zeros(len(symbols)), np.cumsum(returns, axis=0)]))
+    return pd.DataFrame(prices, index=index, columns=symbols)
+
+
+def _universe(seed=7, days=150):
+    """Two lockstep banks, an independent IT name and a quiet small cap"""
+    rng = np.random.default_rng(seed)
+    shared = 0.015 * rng.standard_normal(days)
+    returns = np.column_stack([
+        shared + 0.003 * rng.standard_normal(days),
+        shared + 0.003 * rng.standard_normal(days),
+        0.015 * rng.standard_normal(days),
+        0.010 * rng.standard_normal(days),
+    ])
+    closes = _closes(returns, ['BANK_A.NS', 'BANK_B.NS', 'SOFT.NS', 'TINY.NS'])
+    labels = {
+        'BANK_A.NS': ('Financial Services', 'Large Cap'),
+        'BANK_B.NS': ('Financial Services', 'Large Cap'),
+        'SOFT.NS': ('Information Technology', 'Large Cap'),
+        'TINY.NS': ('Others', 'Small Cap'),
+        'NEW.NS': ('Financial Services', 'Small Cap'),  # Listed, no history yet
+    }
+    return closes, labels
+
+
+class TestQuantizedCorrelation(unittest.TestCase):
+    """Test the pairwise correlation build"""
+
+    def test_matches_pandas_on_full_history(self):
+        closes, _ = _universe()
+        matrix = quantized_correlation(closes)
+        expected = np.log(closes).diff().dropna().corr().to_numpy()
+        np.testing.assert_allclose(matrix / CORRELATION_SCALE, expected, atol=1.0 / CORRELATION_SCALE)
+        self.assertEqual(matrix.dtype, np.int8)
+
+    def test_pairs_use_shared_days_only(self):
+        closes, _ = _universe()
+        # SOFT.NS only started trading 80 days ago
+        closes.iloc[:70, 2] = np.nan
+        matrix = quantized_correlation(closes)
+        shared = np.log(closes).diff().iloc[71:]
+        self.assertAlmostEqual(
+            matrix[0, 2] / CORRELATION_SCALE, shared['BANK_A.NS'].corr(shared['SOFT.NS']), delta=0.05
+        )
+
+    def test_late_listing_matches_corrcoef_on_shared_rows(self):
+        """Each pair equals np.corrcoef over the returns both symbols have"""
+        rng = np.random.default_rng(3)
+        shared = 0.015 * rng.standard_normal(150)
+        returns = np.column_stack([shared + 0.004 * rng.standard_normal(150) for _ in range(4)])
+        returns[:90, :2] += 0.02 * rng.standard_normal((90, 1))  # Volatile regime only the old listings saw
+        closes = _closes(returns, ['OLD_A.NS', 'OLD_B.NS', 'LATE.NS', 'LATER.NS'])
+        closes.iloc[:90, 2] = np.nan
+        closes.iloc[:110, 3] = np.nan
+
+        matrix = quantized_correlation(closes)
+        log_returns = np.log(closes).diff().to_numpy()[1:]
+        for i in range(4):
+            for j in range(4):
+                rows = np.isfinite(log_returns[:, i]) & np.isfinite(log_returns[:, j])
+                expected = np.corrcoef(log_returns[rows, i], log_returns[rows, j])[0, 1]
+                self.assertAlmostEqual(matrix[i, j] / CORRELATION_SCALE, expected, delta=0.51 / CORRELATION_SCALE)
+
+    def test_short_history_is_unknown(self):
+        closes, _ = _universe()
+        closes.iloc[:-30, 3] = np.nan
+        matrix = quantized_correlation(closes, min_pair_bars=40)
+        self.assertTrue(np.all(matrix[3] == UNKNOWN_CORRELATION))
+        self.assertTrue(np.all(matrix[:, 3] == UNKNOWN_CORRELATION))
+        self.assertEqual(matrix[0, 0], CORRELATION_SCALE)
+
+    def test_blocks_match_single_pass(self):
+        rng = np.random.default_rng(1)
+        closes = _closes(0.01 * rng.standard_normal((60, 25)), [f"S{i}" for i in range(25)])
+        np.testing.assert_array_equal(quantized_correlation(closes, block_rows=7), quantized_correlation(closes))
+
+
+class TestExposureMatrix(unittest.TestCase):
+    """Test lookups and storage"""
+
+    def setUp(self):
+        closes, labels = _universe()
+        self.matrix = ExposureMatrix.build(closes, labels, lookback=126)
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_lookups(self):
+        self.assertGreater(self.matrix.correlation('BANK_A.NS', 'BANK_B.NS'), 0.9)
+        self.assertLess(abs(self.matrix.correlation('BANK_A.NS', 'SOFT.NS')), 0.3)
+        self.assertIsNone(self.matrix.correlation('BANK_A.NS', 'NEW.NS'))
+        self.assertIsNone(self.matrix.correlation('BANK_A.NS', 'MISSING.NS'))
+        self.assertEqual(self.matrix.sector('NEW.NS'), 'Financial Services')
+        self.assertEqual(self.matrix.market_cap('TINY.NS'), 'Small Cap')
+        self.assertEqual(self.matrix.sector('MISSING.NS'), '')
+        self.assertEqual(self.matrix.meta['bars'], 126)
+
+    def test_exposure_table(self):
+        table = self.matrix.exposure({'BANK_A.NS': 100.0, 'SOFT.NS': 50.0, 'NEW.NS': 25.0})
+        self.assertEqual(table['sector'], {'Financial Services': 125.0, 'Information Technology': 50.0})
+        self.assertEqual(table['market_cap'], {'Large Cap': 150.0, 'Small Cap': 25.0})
+
+    def test_save_and_load_memory_maps(self):
+        self.matrix.save(self.root)
+        loaded = ExposureMatrix.load(self.root)
+
+        self.assertIsInstance(loaded.correlation_codes, np.memmap)
+        np.testing.assert_array_equal(loaded.correlation_codes, self.matrix.correlation_codes)
+        self.assertEqual(loaded.symbols, self.matrix.symbols)
+        self.assertEqual(loaded.sector('BANK_B.NS'), 'Financial Services')
+        self.assertEqual(loaded.meta['bars'], 126)
+
+    def test_generations_are_pruned(self):
+        for _ in range(4):
+            self.matrix.save(self.root)
+        generations = [name for name in os.listdir(self.root) if name != 'CURRENT']
+        self.assertEqual(len(generations), 2)
+        with open(os.path.join(self.root, 'CURRENT')) as f:
+            self.assertEqual(f.read(), max(generations))
+
+    def test_load_without_build(self):
+        self.assertIsNone(ExposureMatrix.load(self.root))
+        self.assertIsNone(ExposureMatrix.load(os.path.join(self.root, 'missing')))
+
+
+class TestCheckAdmission(unittest.TestCase):
+    """Test concentration limits"""
+
+    def setUp(self):
+        closes, labels = _universe()
+        self.matrix = ExposureMatrix.build(closes, labels)
+
+    def test_correlated_holdings_reject(self):
+        result = check_admission(
+            self.matrix, 'BANK_B.NS', 50_000.0, {'BANK_A.NS': 50_000.0}, 1_000_000.0, max_correlated=1
+        )
+        self.assertFalse(result['allowed'])
+        self.assertIn('BANK_A.NS', result['correlated'])
+        self.assertIn('BANK_A.NS', result['reason'])
+
+        result = check_admission(
+            self.matrix, 'BANK_B.NS', 50_000.0, {'BANK_A.NS': 50_000.0}, 1_000_000.0, max_correlated=2
+        )
+        self.assertTrue(result['allowed'])
+
+    def test_sector_limit_downsizes(self):
+        result = check_admission(
+            self.matrix, 'NEW.NS', 100_000.0, {'BANK_A.NS': 220_000.0}, 1_000_000.0, max_sector_pct=30.0
+        )
+        self.assertTrue(result['allowed'])
+        self.assertAlmostEqual(result['value'], 80_000.0)
+        self.assertIn('Financial Services', result['reason'])
+
+    def test_sector_limit_rejects_when_little_room(self):
+        result = check_admission(
+            self.matrix, 'NEW.NS', 100_000.0, {'BANK_A.NS': 290_000.0}, 1_000_000.0,
+            max_sector_pct=30.0, min_fraction=0.25
+        )
+        self.assertFalse(result['allowed'])
+        self.assertEqual(result['value'], 0.0)
+
+    def test_market_cap_limit(self):
+        result = check_admission(
+            self.matrix, 'SOFT.NS', 100_000.0, {'BANK_A.NS': 300_000.0, 'TINY.NS': 50_000.0}, 1_000_000.0,
+            max_sector_pct=100.0, max_market_cap_pct=35.0
+        )
+        self.assertAlmostEqual(result['value'], 50_000.0)
+
+    def test_unclassified_and_unknown_pass(self):
+        holdings = {'TINY.NS': 900_000.0}
+        result = check_admission(self.matrix, 'TINY.NS', 100_000.0, {}, 100_000.0, max_sector_pct=10.0)
+        self.assertTrue(result['allowed'])
+        self.assertEqual(result['value'], 100_000.0)
+
+        result = check_admission(self.matrix, 'MISSING.NS', 100_000.0, holdings, 1_000_000.0, max_sector_pct=10.0)
+        self.assertTrue(result['allowed'])
+        self.assertEqual(result['value'], 100_000.0)
+
+    def test_check_is_cheap(self):
+        rng = np.random.default_rng(2)
+        symbols = [f"S{i}.NS" for i in range(2000)]
+        closes = _closes(0.01 * rng.standard_normal((126, 2000)), symbols)
+        labels = {symbol: (f"Sector {i % 12}", 'Small Cap') for i, symbol in enumerate(symbols)}
+        matrix = ExposureMatrix.build(closes, labels)
+        holdings = {symbol: 30_000.0 for symbol in symbols[:15]}
+
+        start = time.perf_counter()
+        for symbol in symbols[15:1015]:
+            check_admission(matrix, symbol, 30_000.0, holdings, 1_000_000.0)
+        self.assertLess((time.perf_counter() - start) / 1000, 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
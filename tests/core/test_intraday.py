@@ -0,0 +1,145 @@
+"""
+Unit tests for intraday bar store and resampling
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.indicators import calculate_all_indicators
+from src.core.intraday import BarRingBuffer, IntradayStore, bucket_starts, resample_bars
+
+
+def _session_bars(days=3, minutes=5, seed=1):
+    """Synthetic NSE session bars (09:15-15:30 IST) as naive UTC"""
+    rng = np.random.default_rng(seed)
+    index = []
+    for day in pd.bdate_range('2026-01-05', periods=days):
+        start = day + pd.Timedelta(hours=3, minutes=45)  # 09:15 IST in UTC
+        index.extend(pd.date_range(start, periods=375 // minutes, freq=f'{minutes}min'))
+    index = pd.DatetimeIndex(index)
+    close = 100 + np.cumsum(rng.normal(0, 0.2, len(index)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = rng.uniform(0, 0.3, len(index))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(100, 1000, len(index)).astype(float),
+    }, index=index)
+
+
+def _reference_resample(df, rule, offset):
+    """pandas resample used as the reference aggregation"""
+    agg = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    return df.resample(rule, offset=offset).agg(agg).dropna(subset=['close'])
+
+
+class TestResampling(unittest.TestCase):
+    """Test cases for vectorized resampling"""
+
+    def test_matches_pandas_resample(self):
+        """15m and 1h bars anchored at 09:15 IST match pandas resample"""
+        df = _session_bars()
+        for timeframe, rule in (('15m', '15min'), ('1h', '60min')):
+            with self.subTest(timeframe=timeframe):
+                expected = _reference_resample(df, rule, '45min' if timeframe == '1h' else '0min')
+                pd.testing.assert_frame_equal(resample_bars(df, timeframe), expected, check_freq=False)
+
+    def test_daily_bars_use_ist_date(self):
+        """Daily bars are labelled with the trading date and span the session"""
+        df = _session_bars(days=2)
+        daily = resample_bars(df, '1d')
+        self.assertEqual(list(daily.index), list(pd.to_datetime(['2026-01-05', '2026-01-06'])))
+        first_day = df.loc['2026-01-05']
+        self.assertEqual(daily['open'].iloc[0], first_day['open'].iloc[0])
+        self.assertEqual(daily['close'].iloc[0], first_day['close'].iloc[-1])
+        self.assertEqual(daily['high'].iloc[0], first_day['high'].max())
+        self.assertEqual(daily['volume'].iloc[0], first_day['volume'].sum())
+
+    def test_hour_buckets_start_at_session_open(self):
+        """10:20 IST falls into the 10:15 hourly bar"""
+        ts = pd.Timestamp('2026-01-05 04:50').value // 10**9  # 10:20 IST
+        start = pd.Timestamp(int(bucket_starts(np.array([ts]), '1h')[0]), unit='s')
+        self.assertEqual(start, pd.Timestamp('2026-01-05 04:45'))
+
+    def test_invalid_timeframe(self):
+        """Unknown timeframes are rejected"""
+        with self.assertRaises(ValueError):
+            resample_bars(_session_bars(days=1), '7m')
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Test cases for append-only ring buffers"""
+
+    def _arrays(self, df):
+        return df.index.as_unit('s').asi8, df.to_numpy(dtype=float).T
+
+    def test_append_only_and_live_bar_replaced(self):
+        """Older bars are ignored and the newest bar is replaced in place"""
+        df = _session_bars(days=1)
+        buffer = BarRingBuffer(1000)
+        self.assertEqual(buffer.append(*self._arrays(df.iloc[:50])), 50)
+
+        overlap = df.iloc[40:60].copy()
+        overlap.iloc[9, overlap.columns.get_loc('close')] = 999.0  # bar 49 updated
+        self.assertEqual(buffer.append(*self._arrays(overlap)), 10)
+
+        frame = buffer.to_frame()
+        self.assertEqual(len(frame), 60)
+        self.assertEqual(frame['close'].iloc[49], 999.0)
+        self.assertEqual(buffer.last_close, df['close'].iloc[59])
+
+    def test_wraps_when_full(self):
+        """Only the newest `capacity` bars are kept, in order"""
+        df = _session_bars(days=2)
+        buffer = BarRingBuffer(100)
+        for start in range(0, len(df), 37):
+            buffer.append(*self._arrays(df.iloc[start:start + 37]))
+
+        pd.testing.assert_frame_equal(buffer.to_frame(), df.iloc[-100:], check_freq=False)
+
+
+class TestIntradayStore(unittest.TestCase):
+    """Test cases for the per-symbol store"""
+
+    def test_freshness(self):
+        """Prices are stale once the newest bar ended longer ago than the allowed age"""
+        df = _session_bars(days=1)
+        bar_end = df.index[-1].timestamp() + 300
+        now = [bar_end + 60]
+        store = IntradayStore(capacity=500, clock=lambda: now[0], bar_seconds=300)
+        store.ingest('TCS.NS', df)
+
+        self.assertIsNotNone(store.latest_price('TCS.NS', max_age_seconds=60))
+        now[0] += 1
+        self.assertEqual(store.latest_prices(['TCS.NS', 'INFY.NS'], max_age_seconds=60), {})
+        self.assertIn('TCS.NS', store.latest_prices(['TCS.NS']))
+
+        # Re-ingesting the same last bar (a feed that stopped updating) keeps it stale
+        store.ingest('TCS.NS', df.iloc[-3:])
+        self.assertIsNone(store.latest_price('TCS.NS', max_age_seconds=60))
+
+    def test_indicators_on_intraday_timeframe(self):
+        """calculate_all_indicators runs on resampled bars with the intraday config"""
+        store = IntradayStore(capacity=2000)
+        store.ingest('TCS.NS', _session_bars(days=6))
+        bars = store.bars('TCS.NS', '15m')
+
+        indicators = calculate_all_indicators(bars, timeframe='intraday')
+        self.assertEqual(indicators['timeframe'], 'intraday')
+        self.assertAlmostEqual(indicators['current_price'], bars['close'].iloc[-1])
+
+        with self.assertRaises(ValueError):
+            calculate_all_indicators(bars.iloc[:50], timeframe='intraday')
+
+
+if __name__ == '__main__':
+    unittest.main()
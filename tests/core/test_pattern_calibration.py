@@ -0,0 +1,155 @@
+"""
+Unit tests for pattern reliability calibration
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config import PATTERN_HORIZONS
+from src.core.pattern_calibration import (
+    EXPIRED, FAILED, HIT, INVALID, OPEN,
+    calibrate_patterns, clear_calibration_cache, collect_pattern_events,
+    load_calibration, resolve_pattern_outcome, save_calibration, summarize_events
+)
+from src.core.patterns import detect_all_patterns, get_pattern_horizon
+
+
+def _daily_bars(n=260, seed=5):
+    """Synthetic daily OHLCV data"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, n))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = rng.uniform(0, 1.5, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=pd.date_range('2020-01-01', periods=n, freq='B'))
+
+
+class TestOutcomes(unittest.TestCase):
+    """Test following a pattern forward"""
+
+    def setUp(self):
+        self.high = np.array([101.0, 102.0, 104.0, 99.0, 103.0])
+        self.low = np.array([99.0, 100.0, 101.0, 95.0, 97.0])
+
+    def test_bullish_hit(self):
+        self.assertEqual(resolve_pattern_outcome(self.high, self.low, 0, 103.5, 96.0, True), (HIT, 2))
+
+    def test_bearish_hit(self):
+        self.assertEqual(resolve_pattern_outcome(self.high, self.low, 0, 96.0, 105.0, False), (HIT, 3))
+
+    def test_invalidation_first(self):
+        """Invalidation on the same bar as the target counts as a failure"""
+        self.assertEqual(resolve_pattern_outcome(self.high, self.low, 1, 103.0, 101.0, True), (FAILED, 1))
+
+    def test_expired_and_open(self):
+        self.assertEqual(resolve_pattern_outcome(self.high, self.low, 0, 120.0, 80.0, True, max_bars=3), (EXPIRED, 3))
+        self.assertEqual(resolve_pattern_outcome(self.high, self.low, 0, 120.0, 80.0, True, max_bars=10), (OPEN, None))
+
+
+class TestEvents(unittest.TestCase):
+    """Test pattern event collection"""
+
+    def test_events_match_detection(self):
+        """Each event is a pattern detect_all_patterns reports on that day"""
+        df = _daily_bars()
+        events = collect_pattern_events(df, 'TEST.NS')
+        self.assertTrue(events)
+        positions = {str(date.date()): i for i, date in enumerate(df.index)}
+        for event in events[:15]:
+            with self.subTest(event=event['pattern'], date=event['date']):
+                detected = detect_all_patterns(df.iloc[:positions[event['date']] + 1])['chart_patterns']
+                match = [p for p in detected if p.name == event['pattern']]
+                self.assertEqual(len(match), 1)
+                self.assertEqual(match[0].measured_target, event['target'])
+                self.assertEqual(match[0].invalidation_level, event['invalidation'])
+                self.assertIn(event['outcome'], (HIT, FAILED, EXPIRED, OPEN, INVALID))
+
+    def test_repeated_detections_counted_once(self):
+        """A pattern detected on consecutive bars is one event"""
+        events = collect_pattern_events(_daily_bars())
+        dates = {}
+        for event in events:
+            dates.setdefault(event['pattern'], []).append(event['date'])
+        for pattern, pattern_dates in dates.items():
+            self.assertEqual(len(pattern_dates), len(set(pattern_dates)), pattern)
+
+    def test_missing_columns(self):
+        with self.assertRaises(ValueError):
+            collect_pattern_events(_daily_bars().drop(columns=['low']))
+
+
+class TestCalibrationTable(unittest.TestCase):
+    """Test summaries, versioned files and the get_pattern_horizon lookup"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(clear_calibration_cache)
+
+    def _event(self, outcome, days=None):
+        return {'pattern': 'Double Bottom', 'outcome': outcome, 'days': days}
+
+    def test_summarize(self):
+        events = [self._event(HIT, d) for d in (10, 20, 30, 40)] + [self._event(FAILED, 5)] * 3 + [self._event(OPEN)]
+        stats = summarize_events(events, min_events=5)['Double Bottom']
+        self.assertEqual((stats['events'], stats['resolved'], stats['open']), (8, 7, 1))
+        self.assertAlmostEqual(stats['reliability'], 4 / 7, places=4)
+        self.assertEqual((stats['min_days'], stats['max_days'], stats['median_days']), (17, 33, 25.0))
+        self.assertTrue(stats['calibrated'])
+        self.assertFalse(summarize_events(events, min_events=10)['Double Bottom']['calibrated'])
+
+    def test_versions_and_lookup(self):
+        """Saves add versions; the newest calibrated values reach get_pattern_horizon"""
+        table = {'patterns': summarize_events([self._event(HIT, 12)] * 3 + [self._event(FAILED, 2)], min_events=4)}
+        first = save_calibration(table, self.tmp.name)
+        table['patterns']['Double Bottom']['reliability'] = 0.42
+        second = save_calibration(table, self.tmp.name)
+        self.assertTrue(first.endswith('pattern_calibration_v0001.json'))
+        self.assertTrue(second.endswith('pattern_calibration_v0002.json'))
+        with open(second) as f:
+            self.assertEqual(json.load(f)['version'], 2)
+
+        self.assertEqual(load_calibration(self.tmp.name)['version'], 2)
+        horizon = get_pattern_horizon('Double Bottom')
+        self.assertEqual((horizon['reliability'], horizon['min_days'], horizon['max_days']), (0.42, 12, 12))
+        self.assertEqual(horizon['recommended_horizon'], PATTERN_HORIZONS['Double Bottom']['recommended_horizon'])
+        self.assertEqual(get_pattern_horizon('Double Top'), PATTERN_HORIZONS['Double Top'])
+
+        load_calibration(self.tmp.name, version=1)
+        self.assertEqual(get_pattern_horizon('Double Bottom')['reliability'], 0.75)
+        with self.assertRaises(ValueError):
+            load_calibration(self.tmp.name, version=7)
+
+    def test_uncalibrated_patterns_keep_static_values(self):
+        table = {'patterns': summarize_events([self._event(HIT, 12)], min_events=30)}
+        save_calibration(table, self.tmp.name)
+        load_calibration(self.tmp.name)
+        self.assertEqual(get_pattern_horizon('Double Bottom'), PATTERN_HORIZONS['Double Bottom'])
+
+    def test_missing_directory(self):
+        self.assertEqual(load_calibration(os.path.join(self.tmp.name, 'none'))['patterns'], {})
+
+    def test_calibrate_universe(self):
+        histories = {'AAA.NS': _daily_bars(seed=5), 'BBB.NS': _daily_bars(seed=6), 'BAD.NS': _daily_bars()[['close']]}
+        table, events = calibrate_patterns(histories, min_events=1)
+        self.assertEqual(table['symbols'], 2)
+        self.assertEqual({e['symbol'] for e in events}, {'AAA.NS', 'BBB.NS'})
+        self.assertEqual(sum(s['events'] for s in table['patterns'].values()), len(events))
+
+
+if __name__ == '__main__':
+    unittest.main()
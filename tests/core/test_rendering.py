@@ -0,0 +1,165 @@
+"""
+Unit tests for report rendering layer
+"""
+
+import hashlib
+import random
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.formatters import (
+    chunk_message, format_analysis_comprehensive, format_comparison_table,
+    format_position_sizing
+)
+from src.core.patterns import PatternResult, PatternStrength, PatternType
+from src.core.rendering import BOT_EMOJI, CLI_EMOJI, EMOJI_PAIRS, chunk_text
+
+
+def _reference_chunks(text, max_length):
+    """Line-by-line concatenation the single-pass chunker must reproduce"""
+    if len(text) <= max_length:
+        return [text]
+    chunks = []
+    current = ""
+    for line in text.split('\n'):
+        if len(current) + len(line) + 1 <= max_length:
+            current += line + '\n'
+        else:
+            if current:
+                chunks.append(current.rstrip())
+            current = line + '\n'
+    if current:
+        chunks.append(current.rstrip())
+    return chunks
+
+
+def _sample_analysis(rec_type, recommendation, blocked=False, pattern_type=PatternType.BULLISH):
+    """Deterministic analysis dictionary covering every report section"""
+    pattern = PatternResult(
+        name='Double Bottom', type=pattern_type, strength=PatternStrength.STRONG,
+        confidence=78, description='W shape', action='Buy on breakout'
+    )
+    return {
+        'symbol': 'TEST.NS',
+        'current_price': 1234.5,
+        'recommendation': recommendation,
+        'recommendation_type': rec_type,
+        'confidence': 67.4,
+        'mode': 'balanced',
+        'horizon': '3months',
+        'overall_score_pct': 64.0,
+        'risk_reward': 2.4,
+        'rr_valid': not blocked,
+        'is_buy_blocked': blocked,
+        'buy_block_reasons': ['Price below 200 EMA'] if blocked else [],
+        'indicators': {
+            'price_vs_trend_ema': 'above', 'market_phase': 'strong_uptrend',
+            'ema_alignment': 'bullish', 'rsi': 58.2, 'rsi_zone': 'neutral',
+            'macd_hist': 1.2345, 'adx': 28.7, 'adx_strength': 'strong_trend',
+            'volume_ratio': 1.6, 'support': 1180.0, 'resistance': 1300.0,
+            'divergence': 'bullish', 'rsi_period': 14, 'strongest_pattern': pattern,
+            'pattern_bias': 'bullish', 'pattern_bullish_count': 2, 'pattern_bearish_count': 0,
+            'candlestick_patterns': [], 'chart_patterns': [pattern],
+        },
+        'target_data': {
+            'recommended_target': 1400.0, 'recommended_timeframe': 90,
+            'horizon_targets': {
+                '1month': {'horizon_name': '1 Month', 'target': 1300.0, 'target_pct': 5.3,
+                           'timeframe': 30, 'emoji': '🗓️'},
+                '3months': {'horizon_name': '3 Months', 'target': 1400.0, 'target_pct': 13.4,
+                            'timeframe': 90, 'emoji': '📅', 'is_recommended': True},
+            },
+            'has_pattern_target': True, 'pattern_name': 'Double Bottom',
+            'pattern_target': 1420.0, 'pattern_target_pct': 15.0, 'pattern_reliability': 0.78,
+            'pattern_invalidation': 1150.0, 'pattern_min_days': 20, 'pattern_max_days': 60,
+            'pattern_horizon_warning': 'Pattern may need longer than your horizon',
+        },
+        'stop_data': {'recommended_stop': 1170.0},
+        'safety_score': {'stars': 4, 'rating': 'SAFE', 'advice': 'Low risk',
+                         'risk_factors': ['Sector volatility'], 'suitable_for': 'All investors'},
+        'time_estimate': {
+            'trading_days': 42,
+            'earliest_date': datetime(2026, 3, 2),
+            'estimated_date': datetime(2026, 3, 30),
+            'latest_date': datetime(2026, 5, 4),
+        },
+    }
+
+
+SAMPLES = {
+    'buy': _sample_analysis('BUY', 'STRONG BUY'),
+    'hold': _sample_analysis('HOLD', 'HOLD', pattern_type=PatternType.NEUTRAL),
+    'blocked': _sample_analysis('BLOCKED', 'AVOID - BUY BLOCKED', blocked=True),
+}
+
+# SHA-256 of the output rendered by the concatenation-based formatters
+# before the rendering layer was introduced
+EXPECTED_DIGESTS = {
+    ('buy', 'bot'): '21d9d466c948d07da1c5ee10cd83202bd7d7bcb76365f95c4fc8c6391410f979',
+    ('buy', 'cli'): '482a3c16527338398fd21e091760c8b50771e0232fa8a6ce13f9b7c2476069a0',
+    ('hold', 'bot'): 'ee06be1ed0add4897817a79fbc04d8ca04d397cf477ad26f33a66f99b03dd573',
+    ('hold', 'cli'): 'cb50df636cad26b843437632b32bcb9ccf04d5ba938bfd31b86f1e8149e0d4f9',
+    ('blocked', 'bot'): '560266bd4e047f4b4ee60ce8a349fae59859bd0401e723e447823b25b305084b',
+    ('blocked', 'cli'): '4d88fa28f25c0bc8a1dbed9fc7adbbe83bf646d94b704753508306c6593de4e5',
+}
+POSITION_SIZING_DIGESTS = {
+    'bot': '2ced5fbbcf1b2ec53a4eebc6f396507b1cc9a0e7d0927ef180f40f78b94ab462',
+    'cli': '87511c4cc3304c1eecde7f9a7bdb500dbd1c5114b2fbc5aed528a800c6f86c96',
+}
+COMPARISON_DIGESTS = {
+    'bot': '349e682e8dcc29e8405aa99b2dee444a1938fe7827b86279ebb0e4a1405ce3ed',
+    'cli': '5c468230f59660a5fd594b7038db3c3ae6ee1d5a18b53d0e381663e79f533b17',
+}
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TestRendering(unittest.TestCase):
+    """Test cases for emoji tables, chunking and byte-identical output"""
+
+    def test_emoji_tables(self):
+        """Per-mode tables cover every emoji name"""
+        self.assertEqual(set(BOT_EMOJI), set(EMOJI_PAIRS))
+        self.assertEqual(CLI_EMOJI['check'], '[Y]')
+        self.assertEqual(BOT_EMOJI['check'], '✅')
+
+    def test_chunk_text_matches_reference(self):
+        """Single-pass chunking is identical to line-by-line concatenation"""
+        rng = random.Random(7)
+        for _ in range(5000):
+            text = ''.join(rng.choice('ab \n') for _ in range(rng.randint(0, 60)))
+            max_length = rng.randint(0, 20)
+            self.assertEqual(chunk_text(text, max_length), _reference_chunks(text, max_length))
+
+    def test_chunk_message_respects_limit(self):
+        """Chunks of a long report stay within the limit and keep every line"""
+        report = format_analysis_comprehensive(SAMPLES['buy'], 'bot')
+        text = '\n'.join([report] * 8)
+        chunks = chunk_message(text, 1000)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        self.assertEqual(chunks, _reference_chunks(text, 1000))
+
+    def test_reports_are_byte_identical(self):
+        """Rendered reports match the pre-template output exactly"""
+        for (sample, mode), expected in EXPECTED_DIGESTS.items():
+            with self.subTest(sample=sample, mode=mode):
+                self.assertEqual(_digest(format_analysis_comprehensive(SAMPLES[sample], mode)), expected)
+
+        for mode in ('bot', 'cli'):
+            with self.subTest(mode=mode):
+                sizing = format_position_sizing(SAMPLES['buy'], 50000, mode)
+                self.assertEqual(_digest(sizing), POSITION_SIZING_DIGESTS[mode])
+                table = format_comparison_table(list(SAMPLES.values()), mode)
+                self.assertEqual(_digest(table), COMPARISON_DIGESTS[mode])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.core.risk_management import (
     calculate_targets, calculate_stoploss, validate_risk_reward,
     calculate_trailing_stops, calculate_position_size,
-    calculate_portfolio_allocation
+    calculate_portfolio_allocation, select_horizon_target
 )
 
 
@@ -57,6 +57,26 @@ class TestRiskManagement(unittest.TestCase):
         # Targets should be below current price for short
         self.assertLess(targets['recommended_target'], self.current_price)
     
+    def test_select_horizon_target(self):
+        """Re-selecting a horizon matches calculating targets for it"""
+        targets = calculate_targets(
+            self.current_price, self.atr, self.resistance, self.support,
+            self.fib_extensions, 'balanced', 'long', '3months'
+        )
+        expected = calculate_targets(
+            self.current_price, self.atr, self.resistance, self.support,
+            self.fib_extensions, 'balanced', 'long', '1year'
+        )
+        
+        selected = select_horizon_target(targets, '1year', 'balanced')
+        self.assertEqual(selected, expected)
+        self.assertTrue(selected['horizon_targets']['1year']['is_recommended'])
+        
+        # The original selection is untouched
+        self.assertEqual(targets['selected_horizon'], '3months')
+        self.assertTrue(targets['horizon_targets']['3months']['is_recommended'])
+        self.assertFalse(targets['horizon_targets']['1year']['is_recommended'])
+    
     def test_calculate_stoploss_long(self):
         """Test stop loss calculation for long positions"""
         stops = calculate_stoploss(
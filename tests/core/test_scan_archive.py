@@ -0,0 +1,171 @@
+"""
+Unit tests for the columnar scan result archive
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date, datetime
+from unittest.mock import patch
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.scan_archive import COLUMNS, ScanArchive, ScanArchiveWriter, record_from_analysis
+
+
+def _analysis(symbol, confidence, recommendation_type='BUY', **extra):
+    """Minimal analyze_stock-style result"""
+    return {
+        'symbol': symbol,
+        'mode': 'balanced',
+        'horizon': '3months',
+        'recommendation': f'{recommendation_type} (test)',
+        'recommendation_type': recommendation_type,
+        'confidence': confidence,
+        'overall_score_pct': confidence - 5,
+        'risk_reward': 2.5,
+        'rr_valid': True,
+        'current_price': 100.0,
+        'target': 110.0,
+        'stop_loss': 96.0,
+        'is_buy_blocked': False,
+        'buy_block_reasons': [],
+        'indicators': {'rsi': 55.0, 'adx': 30.0, 'market_phase': 'uptrend'},
+        **extra,
+    }
+
+
+class TestRecords(unittest.TestCase):
+    """Test conversion of analysis results to rows"""
+
+    def test_missing_fields(self):
+        record = record_from_analysis({'symbol': 'X.NS'}, 'test', datetime(2026, 1, 5))
+        self.assertEqual(set(record), set(COLUMNS))
+        self.assertTrue(np.isnan(record['confidence']))
+        self.assertTrue(np.isnan(record['rsi']))
+        self.assertFalse(record['rr_valid'])
+        self.assertEqual(record['recommendation'], '')
+        self.assertEqual(record['source'], 'test')
+
+    def test_block_reasons_joined(self):
+        record = record_from_analysis(
+            _analysis('X.NS', 80, is_buy_blocked=True, buy_block_reasons=['ADX weak', 'RSI high']), 'test'
+        )
+        self.assertTrue(record['is_buy_blocked'])
+        self.assertEqual(record['block_reasons'], 'ADX weak | RSI high')
+
+
+class TestArchive(unittest.TestCase):
+    """Test writing segments and querying them back"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        self.archive = ScanArchive(self.root)
+
+    def _write(self, source, rows, day=date(2026, 1, 5), flush_rows=500):
+        with ScanArchiveWriter(self.root, source, flush_rows=flush_rows) as writer:
+            for symbol, confidence, rec_type in rows:
+                writer.add(_analysis(symbol, confidence, rec_type), datetime(day.year, day.month, day.day, 10))
+        return writer
+
+    def test_round_trip(self):
+        writer = self._write('daily_scan', [('A.NS', 80, 'BUY'), ('B.NS', 40, 'SELL'), ('C.NS', 60, 'HOLD')],
+                             flush_rows=2)
+        self.assertEqual((writer.rows, writer.segments, writer.dropped), (3, 2, 0))
+
+        data = self.archive.query()
+        self.assertEqual(list(data['symbol']), ['A.NS', 'B.NS', 'C.NS'])
+        self.assertEqual(data['confidence'].dtype, np.float32)
+        np.testing.assert_allclose(data['confidence'], [80, 40, 60])
+        self.assertEqual(list(data['recommendation_type']), ['BUY', 'SELL', 'HOLD'])
+        self.assertEqual(list(data['market_phase']), ['uptrend'] * 3)
+        self.assertTrue(data['rr_valid'].all())
+        self.assertEqual(str(data['timestamp'][0]), '2026-01-05T10:00:00')
+
+    def test_categories_across_segments(self):
+        """Each segment has its own dictionary; queries map them to one"""
+        self._write('daily_scan', [('A.NS', 80, 'BUY'), ('B.NS', 40, 'SELL')])
+        self._write('on_demand', [('B.NS', 45, 'SELL'), ('D.NS', 65, 'HOLD')])
+        data = self.archive.query(['symbol', 'source'], decode=False)
+        symbols = data['categories']['symbol'][data['symbol']]
+        self.assertEqual(sorted(symbols), ['A.NS', 'B.NS', 'B.NS', 'D.NS'])
+        self.assertEqual(self.archive.value_counts('recommendation_type'), {'SELL': 2, 'BUY': 1, 'HOLD': 1})
+
+    def test_filters(self):
+        self._write('daily_scan', [('A.NS', 80, 'BUY'), ('B.NS', 40, 'SELL')], day=date(2026, 1, 5))
+        self._write('on_demand', [('A.NS', 70, 'BUY')], day=date(2026, 2, 9))
+        self.assertEqual(self.archive.partitions(), [date(2026, 1, 5), date(2026, 2, 9)])
+        self.assertEqual(len(self.archive.query(['symbol'], start='2026-02-01')['symbol']), 1)
+        self.assertEqual(len(self.archive.query(['symbol'], end=date(2026, 1, 31))['symbol']), 2)
+        self.assertEqual(list(self.archive.query(['source'], symbols=['A.NS'])['source']), ['daily_scan', 'on_demand'])
+        self.assertEqual(list(self.archive.query(['symbol'], sources=['daily_scan'])['symbol']), ['A.NS', 'B.NS'])
+        self.assertEqual(len(self.archive.query(['symbol'], symbols=['Z.NS'])['symbol']), 0)
+        with self.assertRaises(ValueError):
+            self.archive.query(['nope'])
+
+    def test_period_stats(self):
+        self._write('daily_scan', [('A.NS', 80, 'BUY'), ('B.NS', 40, 'SELL')], day=date(2026, 1, 5))
+        self._write('daily_scan', [('A.NS', 70, 'BUY')], day=date(2026, 2, 9))
+        stats = self.archive.period_stats('confidence', 'M', percentiles=(50,))
+        self.assertEqual([str(p) for p in stats['period']], ['2026-01', '2026-02'])
+        self.assertEqual(list(stats['count']), [2, 1])
+        np.testing.assert_allclose(stats['mean'], [60, 70])
+        np.testing.assert_allclose(stats['p50'], [60, 70])
+        with self.assertRaises(ValueError):
+            self.archive.period_stats('symbol')
+
+    def test_midnight_split(self):
+        """Rows buffered across midnight IST (18:30 UTC) land in their own day's partition"""
+        with ScanArchiveWriter(self.root, 'daily_scan') as writer:
+            writer.add(_analysis('A.NS', 80), datetime(2026, 1, 5, 18, 29))
+            writer.add(_analysis('B.NS', 60), datetime(2026, 1, 5, 18, 31))
+        self.assertEqual(self.archive.partitions(), [date(2026, 1, 5), date(2026, 1, 6)])
+        self.assertEqual(list(self.archive.query(['symbol'], start='2026-01-06')['symbol']), ['B.NS'])
+
+    def test_pre_open_scan_uses_exchange_date(self):
+        """The 04:15 IST daily scan (22:45 UTC the day before) is filed under the IST date"""
+        with ScanArchiveWriter(self.root, 'daily_scan') as writer:
+            writer.add(_analysis('A.NS', 80), datetime(2026, 1, 4, 22, 45))
+        self.assertEqual(self.archive.partitions(), [date(2026, 1, 5)])
+        self.assertEqual(str(self.archive.query(['timestamp'])['timestamp'][0]), '2026-01-04T22:45:00')
+        stats = self.archive.period_stats('confidence', 'D')
+        self.assertEqual([str(p) for p in stats['period']], ['2026-01-05'])
+
+    def test_compact(self):
+        for i in range(3):
+            self._write('daily_scan', [(f'S{i}.NS', 50 + i, 'HOLD')])
+        before = self.archive.query()
+        self.assertEqual(self.archive.compact('2026-01-05'), 3)
+        self.assertEqual(len(self.archive.segments()), 1)
+        after = self.archive.query()
+        for column in COLUMNS:
+            np.testing.assert_array_equal(before[column], after[column])
+        self.assertEqual(self.archive.compact('2026-01-05'), 0)
+
+    def test_empty_archive(self):
+        self.assertEqual(self.archive.partitions(), [])
+        self.assertEqual(len(self.archive.query(['confidence'])['confidence']), 0)
+        self.assertEqual(self.archive.value_counts('symbol'), {})
+
+    def test_write_failure_does_not_raise(self):
+        with patch('src.core.scan_archive.np.save', side_effect=OSError('disk full')):
+            writer = self._write('daily_scan', [('A.NS', 80, 'BUY')])
+        self.assertEqual((writer.rows, writer.dropped), (0, 1))
+        self.assertEqual(self.archive.segments(), [])
+
+    def test_rows_flushed_when_scan_fails(self):
+        with self.assertRaises(RuntimeError):
+            with ScanArchiveWriter(self.root, 'daily_scan') as writer:
+                writer.add(_analysis('A.NS', 80), datetime(2026, 1, 5, 10))
+                raise RuntimeError('scan aborted')
+        self.assertEqual(list(self.archive.query(['symbol'])['symbol']), ['A.NS'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for streaming indicator state
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.indicators import calculate_all_indicators
+from src.core.streaming_indicators import IndicatorEngine, IndicatorState, build_state
+
+# Recursive indicators replay the `ta` arithmetic exactly
+EXACT_KEYS = (
+    'current_price', 'ema_fast', 'ema_medium', 'ema_slow', 'ema_trend',
+    'rsi', 'macd', 'macd_signal', 'macd_hist', 'adx', 'plus_di', 'minus_di',
+    'atr', 'atr_percent', 'stoch_k', 'volume_ratio', 'avg_volume', 'latest_volume',
+)
+# Windowed statistics differ from pandas' running sums by rounding only
+WINDOWED_KEYS = ('bb_upper', 'bb_middle', 'bb_lower', 'bb_percent', 'bb_bandwidth', 'stoch_d')
+LABEL_KEYS = (
+    'rsi_zone', 'rsi_direction', 'macd_crossover', 'macd_above_zero', 'macd_above_signal',
+    'hist_direction', 'adx_strength', 'adx_trend_direction', 'trend_exists',
+    'volatility_level', 'bb_position', 'stoch_zone', 'volume_level', 'obv_trend',
+)
+
+
+def _daily_bars(n=320, seed=7):
+    """Synthetic daily OHLCV data"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.2, n))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = rng.uniform(0, 1.5, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=pd.date_range('2025-01-01', periods=n, freq='B'))
+
+
+class TestMatchesBatch(unittest.TestCase):
+    """Streaming snapshots agree with calculate_all_indicators"""
+
+    def assertMatches(self, snapshot, expected):
+        for key in EXACT_KEYS:
+            self.assertEqual(snapshot[key], expected[key], key)
+        for key in WINDOWED_KEYS:
+            self.assertAlmostEqual(snapshot[key], expected[key], delta=abs(expected[key]) * 1e-9, msg=key)
+        for key in LABEL_KEYS:
+            self.assertEqual(snapshot[key], expected[key], key)
+
+    def test_every_timeframe(self):
+        """Replayed state matches the batch calculation for each config"""
+        df = _daily_bars()
+        for timeframe in ('short', 'medium', 'intraday'):
+            with self.subTest(timeframe=timeframe):
+                self.assertMatches(build_state(df, timeframe).snapshot(), calculate_all_indicators(df, timeframe))
+
+    def test_matches_after_each_bar(self):
+        """Bar-by-bar updates track the batch result at every step"""
+        df = _daily_bars(n=260)
+        state = build_state(df.iloc[:200])
+        for end in range(201, len(df) + 1, 15):
+            for i in range(state.bars, end):
+                row = df.iloc[i]
+                state.update(row['high'], row['low'], row['close'], row['volume'])
+            with self.subTest(bars=end):
+                self.assertMatches(state.snapshot(), calculate_all_indicators(df.iloc[:end]))
+
+    def test_flat_prices(self):
+        """Zero ranges fall back to the batch defaults"""
+        df = _daily_bars(n=220)
+        df[['open', 'high', 'low', 'close']] = 50.0
+        self.assertMatches(build_state(df).snapshot(), calculate_all_indicators(df))
+
+
+class TestStatePersistence(unittest.TestCase):
+    """Test state copies and checkpoints"""
+
+    def test_round_trip_continues_identically(self):
+        """A restored state produces the same values as the original"""
+        df = _daily_bars()
+        original = build_state(df.iloc[:250])
+        restored = IndicatorState.from_state(original.to_state())
+        for i in range(250, len(df)):
+            row = df.iloc[i]
+            original.update(row['high'], row['low'], row['close'], row['volume'])
+            restored.update(row['high'], row['low'], row['close'], row['volume'])
+        self.assertEqual(restored.snapshot(), original.snapshot())
+
+    def test_preview_does_not_mutate(self):
+        """Previewing a forming bar leaves the state untouched"""
+        df = _daily_bars()
+        state = build_state(df.iloc[:-1])
+        before = state.snapshot()
+        row = df.iloc[-1]
+        preview = state.preview(row['high'], row['low'], row['close'], row['volume'])
+
+        self.assertEqual(state.snapshot(), before)
+        self.assertEqual(preview['ema_fast'], calculate_all_indicators(df)['ema_fast'])
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    """Test per-symbol incremental feeding"""
+
+    def test_applies_only_new_bars(self):
+        """Later calls feed only the bars after the state's last bar"""
+        df = _daily_bars()
+        engine = IndicatorEngine('medium')
+        engine.update('TCS.NS', df.iloc[:300])
+        snapshot = engine.update('TCS.NS', df)
+
+        self.assertEqual(engine.rebuilds, 1)
+        self.assertEqual(engine.bars_applied, 20)
+        self.assertEqual(snapshot['macd'], calculate_all_indicators(df)['macd'])
+
+    def test_rebuilds_when_history_diverges(self):
+        """A history that no longer contains the last bar triggers a rebuild"""
+        df = _daily_bars()
+        engine = IndicatorEngine('medium')
+        engine.update('TCS.NS', df)
+        shifted = df.copy()
+        shifted.index = shifted.index + pd.Timedelta(hours=1)
+        engine.update('TCS.NS', shifted)
+        self.assertEqual(engine.rebuilds, 2)
+
+    def test_checkpoint(self):
+        """Saved states are restored and resume incrementally"""
+        df = _daily_bars()
+        engine = IndicatorEngine('medium')
+        engine.update('TCS.NS', df.iloc[:300])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state', 'indicators.json')
+            engine.save(path)
+            restored = IndicatorEngine('medium')
+            self.assertEqual(restored.load(path), 1)
+            self.assertEqual(IndicatorEngine('short').load(path), 0)
+
+        snapshot = restored.update('TCS.NS', df)
+        self.assertEqual(restored.rebuilds, 0)
+        self.assertEqual(snapshot['adx'], calculate_all_indicators(df)['adx'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Unit tests for the strategy parameter sweep engine
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config import HARD_FILTERS, RISK_MODES, TIMEFRAME_CONFIGS
+from src.core.indicators import calculate_all_indicators
+from src.core.sweep import (
+    ParameterSweep, build_indicator_rows, evaluate_parameters, expand_grid,
+    override_parameters, rank_results, sample_parameters, trade_outcome
+)
+
+
+def _daily_bars(n=240, seed=3):
+    """Synthetic daily OHLCV data"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.2, n))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = rng.uniform(0, 1.5, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=pd.date_range('2025-01-01', periods=n, freq='B'))
+
+
+class TestIndicatorRows(unittest.TestCase):
+    """Per-bar rows agree with calculate_all_indicators on each prefix"""
+
+    def assertRowMatches(self, row, expected):
+        for key, value in row.items():
+            if key == 'strongest_pattern':
+                self.assertEqual(getattr(value, 'name', None), getattr(expected[key], 'name', None))
+            else:
+                self.assertEqual(value, expected[key], key)
+
+    def test_rows_match_prefixes(self):
+        """Every sampled row equals the batch calculation up to that bar"""
+        df = _daily_bars()
+        for timeframe in ('medium', 'short'):
+            matrix = build_indicator_rows(df, timeframe)
+            self.assertEqual(matrix['start'], TIMEFRAME_CONFIGS[timeframe]['min_bars'] - 1)
+            self.assertEqual(len(matrix['rows']), len(df) - matrix['start'])
+            for offset in range(0, len(matrix['rows']), 13):
+                position = matrix['start'] + offset
+                with self.subTest(timeframe=timeframe, bar=position):
+                    self.assertRowMatches(
+                        matrix['rows'][offset], calculate_all_indicators(df.iloc[:position + 1], timeframe)
+                    )
+
+    def test_timeframe_override(self):
+        """Rows are built with the overridden timeframe config"""
+        df = _daily_bars()
+        with override_parameters({'TIMEFRAME_CONFIGS.medium.rsi_period': 21}):
+            row = build_indicator_rows(df)['rows'][-1]
+            expected = calculate_all_indicators(df)
+        self.assertEqual(row['rsi'], expected['rsi'])
+        self.assertEqual(row['rsi_period'], 21)
+
+    def test_pattern_rows_reused(self):
+        """Pattern rows passed in are not detected again"""
+        df = _daily_bars()
+        patterns = {}
+        build_indicator_rows(df, 'short', patterns)
+        self.assertEqual(len(patterns), len(df) - TIMEFRAME_CONFIGS['short']['min_bars'] + 1)
+        cached = patterns[len(df) - 1]
+        build_indicator_rows(df, 'medium', patterns)
+        self.assertIs(patterns[len(df) - 1], cached)
+
+    def test_insufficient_data(self):
+        """Histories shorter than min_bars are rejected"""
+        with self.assertRaises(ValueError):
+            build_indicator_rows(_daily_bars(n=150))
+
+
+class TestParameters(unittest.TestCase):
+    """Test parameter overrides and set generation"""
+
+    def test_override_restores(self):
+        """Values are set inside the block and restored after, even on errors"""
+        original_stop = RISK_MODES['balanced']['atr_stop_multiplier']
+        original_rsi = HARD_FILTERS['block_buy'][0]['value']
+        with self.assertRaises(RuntimeError):
+            with override_parameters({
+                'RISK_MODES.balanced.atr_stop_multiplier': 9.0,
+                'HARD_FILTERS.block_buy.0.value': 70,
+            }):
+                self.assertEqual(RISK_MODES['balanced']['atr_stop_multiplier'], 9.0)
+                self.assertEqual(HARD_FILTERS['block_buy'][0]['value'], 70)
+                raise RuntimeError
+        self.assertEqual(RISK_MODES['balanced']['atr_stop_multiplier'], original_stop)
+        self.assertEqual(HARD_FILTERS['block_buy'][0]['value'], original_rsi)
+
+    def test_unknown_parameters(self):
+        """Paths that do not name an existing value are rejected"""
+        for key in ('RISK_MODES.balanced.typo', 'HARD_FILTERS.block_buy.99.value', 'CURRENCY_SYMBOL', 'RISK_MODES'):
+            with self.subTest(key=key):
+                with self.assertRaises(ValueError):
+                    with override_parameters({key: 1}):
+                        pass
+
+    def test_grid_and_sample(self):
+        """Grids cover every combination; samples are distinct and seeded"""
+        space = {'a.x': [1, 2, 3], 'b.y': [10, 20], 'c.z': ['p', 'q']}
+        grid = expand_grid(space)
+        self.assertEqual(len(grid), 12)
+        self.assertEqual(grid[0], {'a.x': 1, 'b.y': 10, 'c.z': 'p'})
+
+        sample = sample_parameters(space, 5, seed=1)
+        self.assertEqual(len(sample), 5)
+        self.assertEqual(len({tuple(s.values()) for s in sample}), 5)
+        self.assertTrue(all(s in grid for s in sample))
+        self.assertEqual(sample, sample_parameters(space, 5, seed=1))
+        self.assertEqual(len(sample_parameters(space, 50)), 12)
+
+
+class TestOutcomes(unittest.TestCase):
+    """Test trade scoring"""
+
+    def setUp(self):
+        self.close = np.array([100.0, 101.0, 102.0, 103.0, 104.0])
+        self.high = self.close + 1
+        self.low = self.close - 1
+
+    def test_target_hit(self):
+        result, pct = trade_outcome(self.high, self.low, self.close, 0, 103.5, 95.0, 4)
+        self.assertEqual(result, 'win')
+        self.assertAlmostEqual(pct, 3.5)
+
+    def test_stop_first_on_same_bar(self):
+        """A bar touching both levels counts as a loss"""
+        result, _ = trade_outcome(self.high, self.low, self.close, 0, 101.5, 100.0, 4)
+        self.assertEqual(result, 'loss')
+
+    def test_timeout_and_unresolved(self):
+        result, pct = trade_outcome(self.high, self.low, self.close, 0, 200.0, 50.0, 2)
+        self.assertEqual(result, 'timeout')
+        self.assertAlmostEqual(pct, 2.0)
+        self.assertIsNone(trade_outcome(self.high, self.low, self.close, 2, 200.0, 50.0, 5))
+
+
+class TestParameterSweep(unittest.TestCase):
+    """Test sweeping parameter sets"""
+
+    def test_sequential_sweep(self):
+        """Results come back in input order and rows are shared by timeframe overrides"""
+        histories = {'AAA.NS': _daily_bars(seed=3), 'BBB.NS': _daily_bars(seed=4), 'SHORT.NS': _daily_bars(n=100)}
+        sets = expand_grid({
+            'RISK_MODES.balanced.atr_stop_multiplier': [1.5, 2.5],
+            'TIMEFRAME_CONFIGS.medium.rsi_period': [14, 21],
+        })
+        sweep = ParameterSweep(histories, horizon='1month', timeframe='medium')
+        results = sweep.run(sets)
+
+        self.assertEqual([r['index'] for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[2]['parameters'], sets[2])
+        self.assertEqual(len(sweep._matrices), 2)
+        self.assertIn('SHORT.NS', sweep.skipped)
+        for result in results:
+            self.assertEqual(sum(result['signals'].values()), 2 * (240 - 199))
+            self.assertEqual(result['trades'], result['wins'] + result['losses'] + result['timeouts'])
+
+        matrices = sweep.matrices()
+        self.assertEqual(results[0], {**evaluate_parameters(matrices, sets[0], 'balanced', '1month'), 'index': 0})
+        self.assertEqual(RISK_MODES['balanced']['atr_stop_multiplier'], 2.0)
+
+    def test_rank_results(self):
+        results = [
+            {'index': 0, 'trades': 5, 'expectancy_pct': 1.0, 'hit_rate': 50.0},
+            {'index': 1, 'trades': 20, 'expectancy_pct': 2.0, 'hit_rate': 40.0},
+            {'index': 2, 'trades': 30, 'expectancy_pct': 0.5, 'hit_rate': 60.0},
+        ]
+        self.assertEqual([r['index'] for r in rank_results(results, min_trades=10)], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for stage timing module
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core import timing
+
+
+class TestStageTiming(unittest.TestCase):
+    """Test cases for stage timers and histograms"""
+
+    def setUp(self):
+        timing.reset()
+
+    def tearDown(self):
+        timing.disable()
+        timing.reset()
+
+    def test_disabled_is_noop(self):
+        """Disabled timers share one no-op context and record nothing"""
+        timing.disable()
+        self.assertIs(timing.stage('a'), timing.stage('b'))
+
+        @timing.timed('decorated')
+        def work():
+            return 42
+
+        with timing.stage('block'):
+            self.assertEqual(work(), 42)
+        self.assertEqual(timing.snapshot(), {})
+
+    def test_records_counts_and_errors(self):
+        """Enabled timers count calls and exceptions per stage"""
+        timing.enable()
+
+        for _ in range(3):
+            with timing.stage('analysis.fetch'):
+                pass
+        with self.assertRaises(ValueError):
+            with timing.stage('analysis.fetch'):
+                raise ValueError("boom")
+
+        stats = timing.snapshot()['analysis.fetch']
+        self.assertEqual(stats['count'], 4)
+        self.assertEqual(stats['errors'], 1)
+
+    def test_timed_async(self):
+        """Decorator works on coroutines and keeps the return value"""
+        timing.enable()
+
+        @timing.timed('job')
+        async def job():
+            return 'done'
+
+        self.assertEqual(asyncio.run(job()), 'done')
+        self.assertEqual(timing.snapshot('job')['job']['count'], 1)
+
+    def test_mark_failed_in_swallowing_job(self):
+        """A job that logs its own exception is still recorded as an error"""
+        timing.enable()
+
+        @timing.timed('scheduler.job')
+        async def job(fail):
+            with timing.stage('scheduler.job.inner'):
+                pass
+            try:
+                if fail:
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                timing.mark_failed()
+            return 'handled'
+
+        self.assertEqual(asyncio.run(job(True)), 'handled')
+        asyncio.run(job(False))
+        timing.mark_failed()  # Outside any stage: no-op
+
+        stats = timing.snapshot('scheduler.job')
+        self.assertEqual(stats['scheduler.job']['count'], 2)
+        self.assertEqual(stats['scheduler.job']['errors'], 1)
+        self.assertEqual(stats['scheduler.job.inner']['errors'], 0)
+
+    def test_percentiles(self):
+        """Percentiles fall in the right bucket and never exceed the max"""
+        histogram = timing.StageHistogram('x')
+        for _ in range(90):
+            histogram.record(0.010)
+        for _ in range(10):
+            histogram.record(1.0)
+
+        self.assertAlmostEqual(histogram.percentile(50), 0.010, delta=0.010 * 0.2)
+        self.assertAlmostEqual(histogram.percentile(99), 1.0, delta=0.2)
+        self.assertLessEqual(histogram.percentile(100), histogram.max)
+
+        stats = histogram.snapshot()
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['mean_ms'], 109.0, places=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Unit tests for trading calendar module
+"""
+
+import unittest
+import sys
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.trading_calendar import EXTRA_YEARS, IST, NSE_HOLIDAYS, TradingCalendar, get_trading_calendar
+
+
+def _is_session_day(day):
+    """Reference day-by-day check"""
+    return day.weekday() < 5 and (day.month, day.day) not in NSE_HOLIDAYS.get(day.year, ())
+
+
+class TestTradingCalendar(unittest.TestCase):
+    """Test cases for the precomputed session calendar"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.calendar = get_trading_calendar()
+
+    def test_sessions_match_reference(self):
+        """Every day in the holiday years agrees with a day-by-day walk"""
+        day = date(min(NSE_HOLIDAYS), 1, 1)
+        while day.year <= max(NSE_HOLIDAYS):
+            self.assertEqual(self.calendar.is_trading_day(day), _is_session_day(day), str(day))
+            day += timedelta(days=1)
+
+    def test_is_open_boundaries(self):
+        """Open and close are inclusive; holidays and weekends are closed"""
+        self.assertTrue(self.calendar.is_open(datetime(2026, 1, 13, 9, 15)))
+        self.assertTrue(self.calendar.is_open(datetime(2026, 1, 13, 15, 30)))
+        self.assertFalse(self.calendar.is_open(datetime(2026, 1, 13, 9, 14, 59)))
+        self.assertFalse(self.calendar.is_open(datetime(2026, 1, 13, 15, 30, 1)))
+        self.assertFalse(self.calendar.is_open(datetime(2026, 1, 26, 10, 0)))  # Republic Day
+        self.assertFalse(self.calendar.is_open(datetime(2026, 1, 17, 10, 0)))  # Saturday
+
+    def test_next_open_and_close(self):
+        """Next open skips the running session; next close is today's while open"""
+        during = datetime(2026, 1, 13, 10, 0, tzinfo=IST)
+        self.assertEqual(self.calendar.next_open(during), datetime(2026, 1, 14, 9, 15, tzinfo=IST))
+        self.assertEqual(self.calendar.next_close(during), datetime(2026, 1, 13, 15, 30, tzinfo=IST))
+
+        # Friday evening before a Monday holiday
+        friday = datetime(2026, 1, 23, 16, 0, tzinfo=IST)
+        self.assertEqual(self.calendar.next_open(friday), datetime(2026, 1, 27, 9, 15, tzinfo=IST))
+        self.assertEqual(self.calendar.next_close(friday), datetime(2026, 1, 27, 15, 30, tzinfo=IST))
+
+    def test_add_trading_days(self):
+        """Offsets count sessions and skip weekends and holidays"""
+        self.assertEqual(self.calendar.add_trading_days(date(2026, 1, 23), 1), date(2026, 1, 27))
+        self.assertEqual(self.calendar.add_trading_days(date(2026, 1, 24), 0), date(2026, 1, 27))
+        self.assertEqual(self.calendar.add_trading_days(date(2026, 1, 24), 1), date(2026, 1, 27))
+        self.assertEqual(self.calendar.add_trading_days(date(2026, 1, 27), -1), date(2026, 1, 23))
+        self.assertEqual(self.calendar.add_trading_days(date(2026, 1, 23), 0), date(2026, 1, 23))
+        self.assertEqual(self.calendar.trading_days_between(date(2026, 1, 23), date(2026, 1, 27)), 1)
+
+        start = date(2026, 3, 2)
+        for n in (1, 5, 22, 63):
+            end = self.calendar.add_trading_days(start, n)
+            self.assertEqual(self.calendar.trading_days_between(start, end), n)
+
+    def test_next_session_time(self):
+        """Scheduler helper picks the next trading day at the requested time"""
+        at = time(9, 20)
+        before = datetime(2026, 1, 23, 8, 0, tzinfo=IST)
+        after = datetime(2026, 1, 23, 9, 20, tzinfo=IST)
+        self.assertEqual(self.calendar.next_session_time(before, at), datetime(2026, 1, 23, 9, 20, tzinfo=IST))
+        self.assertEqual(self.calendar.next_session_time(after, at), datetime(2026, 1, 27, 9, 20, tzinfo=IST))
+
+    def test_vectorized_matches_scalar(self):
+        """Array queries give the same answers as scalar ones"""
+        rng = np.random.default_rng(7)
+        start = datetime(2025, 1, 1, tzinfo=IST).timestamp()
+        stamps = start + rng.uniform(0, 365 * 86400, size=500)
+
+        opens = self.calendar.is_open_many(stamps)
+        next_opens = self.calendar.next_open_many(stamps)
+        next_closes = self.calendar.next_close_many(stamps)
+        for ts, is_open, next_open, next_close in zip(stamps, opens, next_opens, next_closes):
+            self.assertEqual(bool(is_open), self.calendar.is_open(ts))
+            self.assertEqual(int(next_open), int(self.calendar.next_open(ts).timestamp()))
+            self.assertEqual(int(next_close), int(self.calendar.next_close(ts).timestamp()))
+
+        days = np.arange('2025-06-01', '2025-07-01', dtype='datetime64[D]')
+        shifted = self.calendar.add_trading_days_many(days, 10)
+        for day, result in zip(days, shifted):
+            self.assertEqual(result.item(), self.calendar.add_trading_days(day.item(), 10))
+        np.testing.assert_array_equal(
+            self.calendar.is_trading_day_many(days),
+            [self.calendar.is_trading_day(d.item()) for d in days]
+        )
+
+    def test_queries_past_range_extend_calendar(self):
+        """Queries past the calendar end extend it with weekday-only sessions"""
+        calendar = TradingCalendar(start_year=2026, end_year=2026)
+
+        self.assertEqual(calendar.next_open(datetime(2026, 12, 31, 16, 0)),
+                         datetime(2027, 1, 1, 9, 15, tzinfo=IST))
+        self.assertFalse(calendar.is_trading_day(date(2033, 1, 1)))  # Saturday
+        self.assertTrue(calendar.is_trading_day(date(2033, 1, 3)))
+        self.assertTrue(calendar.is_open(datetime(2040, 3, 5, 10, 0)))
+        self.assertEqual(calendar.next_session_time(datetime(2040, 3, 9, 18, 0), time(16, 15)),
+                         datetime(2040, 3, 12, 16, 15, tzinfo=IST))
+
+        # A one-year horizon from far past the last holiday list
+        target = calendar.add_trading_days(date(2029, 1, 2), 352)
+        self.assertEqual(target, np.busday_offset('2029-01-02', 352, roll='forward').item())
+        self.assertGreaterEqual(calendar.end_year, 2030)
+        self.assertEqual(calendar.add_trading_days(target, -352), date(2029, 1, 2))
+        self.assertEqual(calendar.trading_days_between(date(2029, 1, 2), target), 352)
+
+        # Published holidays still apply after extending
+        self.assertFalse(calendar.is_trading_day(date(2026, 1, 26)))
+        days = np.array(['2050-06-01', '2050-06-06'], dtype='datetime64[D]')
+        np.testing.assert_array_equal(calendar.is_trading_day_many(days), [True, True])
+        np.testing.assert_array_equal(calendar.add_trading_days_many(days, 1),
+                                      np.array(['2050-06-02', '2050-06-07'], dtype='datetime64[D]'))
+
+    def test_extension_swaps_whole_snapshot(self):
+        """Extending publishes new arrays together; readers racing it get consistent answers"""
+        calendar = TradingCalendar(start_year=2026, end_year=2026)
+        before = calendar._sessions
+        calendar.is_trading_day(date(2010, 1, 4))
+        self.assertEqual((before.start_year, before.end_year, len(before.dates)), (2026, 2026, len(before.opens)))
+        self.assertIsNot(calendar._sessions, before)
+
+        calendar = TradingCalendar(start_year=2026, end_year=2026)
+        reference = TradingCalendar(start_year=1990, end_year=2070)
+        moments = [datetime(year, 3, 5, 10, 0) for year in range(1991, 2070, 3)]
+        errors = []
+
+        def query(offset):
+            try:
+                for when in moments[offset::4]:
+                    assert calendar.is_open(when) == reference.is_open(when)
+                    assert calendar.next_close(when) == reference.next_close(when)
+                    assert calendar.add_trading_days(when, -5) == reference.add_trading_days(when, -5)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=query, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_default_range_covers_current_year(self):
+        """The default calendar always reaches a few years past today"""
+        calendar = TradingCalendar()
+        self.assertGreaterEqual(calendar.end_year, datetime.now(IST).year + EXTRA_YEARS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -130,7 +130,7 @@ class TestCompareHandler:
         with patch('src.bot.handlers.compare.get_db_context') as mock_db, \
              patch('src.bot.handlers.compare.get_or_create_user'), \
              patch('src.bot.handlers.compare.get_user_settings') as mock_settings, \
-             patch('src.bot.handlers.compare.analyze_multiple_stocks') as mock_analyze, \
+             patch('src.bot.handlers.compare.compare_stocks') as mock_analyze, \
              patch('src.bot.handlers.compare.validate_stock_symbol') as mock_validate:
             
             mock_db.return_value.__enter__.return_value = Mock()
@@ -139,10 +139,13 @@ class TestCompareHandler:
             mock_settings.return_value.timeframe = 'medium'
             mock_validate.return_value = (True, None)
             
-            mock_analyze.return_value = [
-                {'symbol': 'RELIANCE.NS', 'confidence': 75},
-                {'symbol': 'TCS.NS', 'confidence': 80}
-            ]
+            mock_analyze.return_value = {
+                'results': [
+                    {'symbol': 'RELIANCE.NS', 'confidence': 75},
+                    {'symbol': 'TCS.NS', 'confidence': 80}
+                ],
+                'relative': None
+            }
             
             mock_msg = Mock()
             mock_msg.edit_text = AsyncMock()